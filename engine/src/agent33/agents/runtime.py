@@ -11,6 +11,8 @@ from typing import TYPE_CHECKING, Any
 
 from agent33.agents.trajectory import save_trajectory
 from agent33.llm.base import ChatMessage, LLMResponse
+from agent33.llm.prompt_caching import PromptSection, assemble_prompt, prompt_cache_prefix
+from agent33.observability.sampling_profiler import profiled
 from agent33.state_paths import RuntimeStatePaths
 
 if TYPE_CHECKING:
@@ -309,12 +311,18 @@ class AgentRuntime:
         self._metrics_collector = metrics_collector
         self._pack_registry = pack_registry
         self._ppack_variant = ppack_variant or ""
+        self._prompt_prefix_hash = ""
         self._evaluation_mode = evaluation_mode
 
     @property
     def definition(self) -> AgentDefinition:
         return self._definition
 
+    @property
+    def prompt_prefix_hash(self) -> str:
+        """Hash of the cacheable system-prompt prefix from the last invocation."""
+        return self._prompt_prefix_hash
+
     @property
     def routing_decision_metadata(self) -> dict[str, Any] | None:
         return self._routing_decision_metadata
@@ -472,18 +480,13 @@ class AgentRuntime:
             if param.required and name not in inputs:
                 raise ValueError(f"Missing required input: {name}")
 
-    def _inject_pack_addenda(self, system_prompt: str) -> str:
-        """Append prompt addenda from session-scoped packs.
-
-        If a :class:`PackRegistry` is available and the current session has
-        enabled packs with prompt addenda, those strings are concatenated
-        and appended to the system prompt.
-        """
+    def _pack_addenda_block(self) -> str:
+        """Return the ``# Pack Addenda`` block for the session, or ``""``."""
         if self._pack_registry is None:
-            return system_prompt
+            return ""
         session_id = self._session_id
         if not session_id:
-            return system_prompt
+            return ""
         try:
             addenda = self._pack_registry.get_session_prompt_addenda(
                 session_id,
@@ -491,11 +494,64 @@ class AgentRuntime:
             )
         except Exception:
             logger.debug("failed to retrieve pack addenda", exc_info=True)
-            return system_prompt
+            return ""
         if not addenda:
-            return system_prompt
-        system_prompt += "\n\n# Pack Addenda\n" + "\n".join(addenda)
-        return system_prompt
+            return ""
+        return "# Pack Addenda\n" + "\n".join(addenda)
+
+    async def _memory_context_block(self, inputs: dict[str, Any]) -> str:
+        """Return recalled memory for *inputs* as a ``# Prior Context`` block, or ``""``."""
+        if self._progressive_recall is None:
+            return ""
+        try:
+            user_query = json.dumps(inputs) if inputs else ""
+            recall_results = await self._progressive_recall.search(
+                user_query, level="index", top_k=5
+            )
+        except Exception:
+            logger.debug("failed to retrieve memory context", exc_info=True)
+            return ""
+        if not recall_results:
+            return ""
+        memory_lines = ["# Prior Context (from memory)"]
+        for rr in recall_results:
+            memory_lines.append(f"- {rr.content}")
+        return "\n".join(memory_lines)
+
+    async def _assemble_system_prompt(self, inputs: dict[str, Any]) -> str:
+        """Build the system prompt with its cacheable prefix first.
+
+        The agent definition, skill blocks and pack addenda only change when
+        the agent, its skills or the session's packs change, so they form a
+        prefix that providers can serve from their prompt cache.  Recalled
+        memory depends on the inputs and always goes last.
+        """
+        sections = [PromptSection(_build_system_prompt(self._definition))]
+
+        # Inject skill context if injector is available
+        if self._skill_injector is not None:
+            # L0: list all preloaded skills for this agent
+            if self._definition.skills:
+                sections.append(
+                    PromptSection(
+                        self._skill_injector.build_skill_metadata_block(self._definition.skills)
+                    )
+                )
+            # L1: inject full instructions for actively invoked skills
+            for skill_name in self._active_skills:
+                sections.append(
+                    PromptSection(self._skill_injector.build_skill_instructions_block(skill_name))
+                )
+
+        # Inject prompt addenda from session-scoped packs
+        sections.append(PromptSection(self._pack_addenda_block()))
+
+        # Inject memory context if progressive recall is available
+        sections.append(PromptSection(await self._memory_context_block(inputs), stable=False))
+
+        assembled = assemble_prompt(sections)
+        self._prompt_prefix_hash = assembled.prefix_hash
+        return assembled.text
 
     def _get_pack_tool_config(self) -> dict[str, dict[str, object]]:
         """Return merged tool config from session-scoped packs.
@@ -608,40 +664,10 @@ class AgentRuntime:
         """Convert ChatMessage list to plain dicts for trajectory saving."""
         return [{"role": m.role, "content": m.text_content} for m in messages]
 
+    @profiled("agent", "_definition.name")
     async def invoke(self, inputs: dict[str, Any]) -> AgentResult:
         """Run the agent with the given inputs and return a result."""
-        system_prompt = _build_system_prompt(self._definition)
-
-        # Inject skill context if injector is available
-        if self._skill_injector is not None:
-            # L0: list all preloaded skills for this agent
-            if self._definition.skills:
-                system_prompt += "\n\n" + self._skill_injector.build_skill_metadata_block(
-                    self._definition.skills
-                )
-            # L1: inject full instructions for actively invoked skills
-            for skill_name in self._active_skills:
-                system_prompt += "\n\n" + self._skill_injector.build_skill_instructions_block(
-                    skill_name
-                )
-
-        # Inject memory context if progressive recall is available
-        if self._progressive_recall is not None:
-            try:
-                user_query = json.dumps(inputs) if inputs else ""
-                recall_results = await self._progressive_recall.search(
-                    user_query, level="index", top_k=5
-                )
-                if recall_results:
-                    memory_lines = ["\n# Prior Context (from memory)"]
-                    for rr in recall_results:
-                        memory_lines.append(f"- {rr.content}")
-                    system_prompt += "\n" + "\n".join(memory_lines)
-            except Exception:
-                logger.debug("failed to retrieve memory context", exc_info=True)
-
-        # Inject prompt addenda from session-scoped packs
-        system_prompt = self._inject_pack_addenda(system_prompt)
+        system_prompt = await self._assemble_system_prompt(inputs)
 
         inputs, system_prompt = await self._run_pre_invoke_hook(
             inputs=inputs,
@@ -674,25 +700,26 @@ class AgentRuntime:
         last_exc: Exception | None = None
         response: LLMResponse | None = None
         try:
-            for attempt in range(max_retries + 1):
-                try:
-                    response = await self._router.complete(
-                        messages,
-                        model=routed_model,
-                        temperature=self._temperature,
-                        max_tokens=max_tokens,
-                        allow_fallback=self._requested_model is None,
-                    )
-                    break
-                except Exception as exc:
-                    last_exc = exc
-                    logger.warning(
-                        "agent %s invoke attempt %d/%d failed: %s",
-                        self._definition.name,
-                        attempt + 1,
-                        max_retries + 1,
-                        exc,
-                    )
+            with prompt_cache_prefix(self._prompt_prefix_hash):
+                for attempt in range(max_retries + 1):
+                    try:
+                        response = await self._router.complete(
+                            messages,
+                            model=routed_model,
+                            temperature=self._temperature,
+                            max_tokens=max_tokens,
+                            allow_fallback=self._requested_model is None,
+                        )
+                        break
+                    except Exception as exc:
+                        last_exc = exc
+                        logger.warning(
+                            "agent %s invoke attempt %d/%d failed: %s",
+                            self._definition.name,
+                            attempt + 1,
+                            max_retries + 1,
+                            exc,
+                        )
 
             if response is None:
                 raise RuntimeError(
@@ -789,6 +816,7 @@ class AgentRuntime:
             )
             raise
 
+    @profiled("agent", "_definition.name")
     async def invoke_iterative(
         self,
         inputs: dict[str, Any],
@@ -822,36 +850,7 @@ class AgentRuntime:
         iterative_tool_registry = self._iterative_tool_registry()
 
         # --- Build system prompt (same as invoke) ---
-        system_prompt = _build_system_prompt(self._definition)
-
-        # Inject skill context if injector is available
-        if self._skill_injector is not None:
-            if self._definition.skills:
-                system_prompt += "\n\n" + self._skill_injector.build_skill_metadata_block(
-                    self._definition.skills
-                )
-            for skill_name in self._active_skills:
-                system_prompt += "\n\n" + self._skill_injector.build_skill_instructions_block(
-                    skill_name
-                )
-
-        # Inject memory context if progressive recall is available
-        if self._progressive_recall is not None:
-            try:
-                user_query = json.dumps(inputs) if inputs else ""
-                recall_results = await self._progressive_recall.search(
-                    user_query, level="index", top_k=5
-                )
-                if recall_results:
-                    memory_lines = ["\n# Prior Context (from memory)"]
-                    for rr in recall_results:
-                        memory_lines.append(f"- {rr.content}")
-                    system_prompt += "\n" + "\n".join(memory_lines)
-            except Exception:
-                logger.debug("failed to retrieve memory context", exc_info=True)
-
-        # Inject prompt addenda from session-scoped packs
-        system_prompt = self._inject_pack_addenda(system_prompt)
+        system_prompt = await self._assemble_system_prompt(inputs)
 
         inputs, system_prompt = await self._run_pre_invoke_hook(
             inputs=inputs,
@@ -908,15 +907,16 @@ class AgentRuntime:
             )
 
             task_input = json.dumps(inputs, indent=2)
-            reasoning_result = await self._reasoning_protocol.run(
-                task_input=task_input,
-                tool_loop=tool_loop,
-                model=routed_model,
-                router=self._router,
-                temperature=self._temperature,
-                max_tokens=routed_max_tokens,
-                system_prompt=system_prompt,
-            )
+            with prompt_cache_prefix(self._prompt_prefix_hash):
+                reasoning_result = await self._reasoning_protocol.run(
+                    task_input=task_input,
+                    tool_loop=tool_loop,
+                    model=routed_model,
+                    router=self._router,
+                    temperature=self._temperature,
+                    max_tokens=routed_max_tokens,
+                    system_prompt=system_prompt,
+                )
 
             if reasoning_result.termination_reason != "degraded_phase_dispatch_failure":
                 self._update_routing_outcome(
@@ -981,12 +981,13 @@ class AgentRuntime:
         )
 
         try:
-            loop_result = await loop.run(
-                messages=messages,
-                model=routed_model,
-                temperature=self._temperature,
-                max_tokens=routed_max_tokens,
-            )
+            with prompt_cache_prefix(self._prompt_prefix_hash):
+                loop_result = await loop.run(
+                    messages=messages,
+                    model=routed_model,
+                    temperature=self._temperature,
+                    max_tokens=routed_max_tokens,
+                )
         except Exception as exc:
             # Save failed trajectory — messages is mutated in-place by loop.run()
             # so it may contain partial conversation even on failure.
@@ -1112,36 +1113,7 @@ class AgentRuntime:
         iterative_tool_registry = self._iterative_tool_registry()
 
         # --- Build system prompt (same as invoke_iterative) ---
-        system_prompt = _build_system_prompt(self._definition)
-
-        # Inject skill context if injector is available
-        if self._skill_injector is not None:
-            if self._definition.skills:
-                system_prompt += "\n\n" + self._skill_injector.build_skill_metadata_block(
-                    self._definition.skills
-                )
-            for skill_name in self._active_skills:
-                system_prompt += "\n\n" + self._skill_injector.build_skill_instructions_block(
-                    skill_name
-                )
-
-        # Inject memory context if progressive recall is available
-        if self._progressive_recall is not None:
-            try:
-                user_query = json.dumps(inputs) if inputs else ""
-                recall_results = await self._progressive_recall.search(
-                    user_query, level="index", top_k=5
-                )
-                if recall_results:
-                    memory_lines = ["\n# Prior Context (from memory)"]
-                    for rr in recall_results:
-                        memory_lines.append(f"- {rr.content}")
-                    system_prompt += "\n" + "\n".join(memory_lines)
-            except Exception:
-                logger.debug("failed to retrieve memory context", exc_info=True)
-
-        # Inject prompt addenda from session-scoped packs
-        system_prompt = self._inject_pack_addenda(system_prompt)
+        system_prompt = await self._assemble_system_prompt(inputs)
 
         inputs, system_prompt = await self._run_pre_invoke_hook(
             inputs=inputs,
@@ -1192,24 +1164,25 @@ class AgentRuntime:
         # Stream events from the tool loop
         stream_failed = False
         try:
-            async for event in loop.run_stream(
-                messages,
-                model=routed_model,
-                temperature=self._temperature,
-                max_tokens=routed_max_tokens,
-            ):
-                if event.event_type == "completed":
-                    completion_data = event.data if isinstance(event.data, dict) else {}
-                    self._update_routing_outcome(
-                        actual_model=routed_model,
-                        tokens_used=completion_data.get("total_tokens"),
-                        iterations=event.iteration,
-                        tool_calls_made=completion_data.get("tool_calls_made"),
-                        tools_used=completion_data.get("tools_used"),
-                        termination_reason=completion_data.get("termination_reason"),
-                        completion_status="completed",
-                    )
-                yield event
+            with prompt_cache_prefix(self._prompt_prefix_hash):
+                async for event in loop.run_stream(
+                    messages,
+                    model=routed_model,
+                    temperature=self._temperature,
+                    max_tokens=routed_max_tokens,
+                ):
+                    if event.event_type == "completed":
+                        completion_data = event.data if isinstance(event.data, dict) else {}
+                        self._update_routing_outcome(
+                            actual_model=routed_model,
+                            tokens_used=completion_data.get("total_tokens"),
+                            iterations=event.iteration,
+                            tool_calls_made=completion_data.get("tool_calls_made"),
+                            tools_used=completion_data.get("tools_used"),
+                            termination_reason=completion_data.get("termination_reason"),
+                            completion_status="completed",
+                        )
+                    yield event
         except Exception:
             stream_failed = True
             # Save partial trajectory on stream failure
@@ -2,6 +2,8 @@
 
 Phase 59: Uses the cheapest available model (LOW effort) to generate
 a concise 3-7 word title from the first user/assistant exchange.
+:func:`generate_titles` titles many sessions at once through a
+:class:`~agent33.llm.batching.UtilityBatcher`.
 """
 
 from __future__ import annotations
@@ -13,6 +15,7 @@ from typing import TYPE_CHECKING
 from agent33.llm.base import ChatMessage
 
 if TYPE_CHECKING:
+    from agent33.llm.batching import UtilityBatcher
     from agent33.llm.router import ModelRouter
 
 logger = logging.getLogger(__name__)
@@ -51,15 +54,9 @@ async def generate_title(
     str | None
         A 3-7 word title string, or *None* if generation fails.
     """
-    truncated_user = user_msg[:_MAX_INPUT_CHARS]
-    truncated_assistant = assistant_msg[:_MAX_INPUT_CHARS]
-
     messages = [
         ChatMessage(role="system", content=_TITLE_PROMPT),
-        ChatMessage(
-            role="user",
-            content=(f"User: {truncated_user}\n\nAssistant: {truncated_assistant}"),
-        ),
+        ChatMessage(role="user", content=_exchange_text(user_msg, assistant_msg)),
     ]
 
     resolved_model = model or "llama3.2"
@@ -81,6 +78,40 @@ async def generate_title(
     return title
 
 
+async def generate_titles(
+    exchanges: list[tuple[str, str]],
+    batcher: UtilityBatcher,
+    model: str | None = None,
+) -> list[str | None]:
+    """Generate titles for many ``(user_msg, assistant_msg)`` exchanges.
+
+    Results are returned in input order; an entry is *None* when that
+    exchange could not be titled.  A failure on one exchange never affects
+    the others.
+    """
+    results = await batcher.run(
+        _TITLE_PROMPT,
+        [_exchange_text(user_msg, assistant_msg) for user_msg, assistant_msg in exchanges],
+        model=model or "llama3.2",
+        temperature=0.3,
+        max_tokens_per_item=30,
+    )
+    titles: list[str | None] = []
+    for result in results:
+        if result.content is None:
+            logger.debug("batched title generation failed: %s", result.error)
+            titles.append(None)
+        else:
+            titles.append(_clean_title(result.content))
+    return titles
+
+
+def _exchange_text(user_msg: str, assistant_msg: str) -> str:
+    truncated_user = user_msg[:_MAX_INPUT_CHARS]
+    truncated_assistant = assistant_msg[:_MAX_INPUT_CHARS]
+    return f"User: {truncated_user}\n\nAssistant: {truncated_assistant}"
+
+
 def _clean_title(raw: str) -> str | None:
     """Clean and validate LLM output as a short title.
 
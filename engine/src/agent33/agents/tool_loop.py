@@ -17,6 +17,7 @@ import re
 from typing import TYPE_CHECKING, Any, cast
 
 from agent33.llm.base import ChatMessage, LLMResponse, ToolCallDelta
+from agent33.llm.prompt_caching import sort_tool_schemas
 from agent33.llm.stream_assembler import ToolCallAssembler
 from agent33.tools.base import ToolResult
 from agent33.tools.schema import generate_tool_description
@@ -1011,8 +1012,10 @@ class ToolLoop:
     ) -> AsyncGenerator[ToolLoopEvent, None]:
         """Yield token events while constructing the effective LLM response."""
         from agent33.agents.events import ToolLoopEvent
+        from agent33.security.redaction import StreamingRedactor
 
         assembler = ToolCallAssembler()
+        redactor = StreamingRedactor(enabled=self._redact_secrets)
         saw_stream_chunks = False
         saw_tool_delta = False
         content_parts: list[str] = []
@@ -1050,11 +1053,13 @@ class ToolLoop:
                             saw_stream_chunks = True
                             if chunk.delta_content:
                                 content_parts.append(chunk.delta_content)
-                                yield ToolLoopEvent(
-                                    event_type="llm_token",
-                                    iteration=iteration,
-                                    data={"token": chunk.delta_content},
-                                )
+                                safe_token = redactor.feed(chunk.delta_content)
+                                if safe_token:
+                                    yield ToolLoopEvent(
+                                        event_type="llm_token",
+                                        iteration=iteration,
+                                        data={"token": safe_token},
+                                    )
                             if chunk.tool_call_delta is not None:
                                 assembler.add_delta(chunk.tool_call_delta)
                                 saw_tool_delta = True
@@ -1097,6 +1102,14 @@ class ToolLoop:
             )
             return
 
+        trailing_token = redactor.flush()
+        if trailing_token:
+            yield ToolLoopEvent(
+                event_type="llm_token",
+                iteration=iteration,
+                data={"token": trailing_token},
+            )
+
         tool_calls = assembler.close()
         response = LLMResponse(
             content="".join(content_parts),
@@ -1137,12 +1150,17 @@ class ToolLoop:
         )
 
     def _collect_tool_descriptions(self) -> list[dict[str, Any]]:
-        """Build OpenAI-style tool descriptions from the registry."""
-        descriptions: list[dict[str, Any]] = []
-        for tool in self._tool_registry.list_all():
-            entry = self._tool_registry.get_entry(tool.name)
-            descriptions.append(generate_tool_description(tool, entry))
-        return descriptions
+        """Build OpenAI-style tool descriptions from the registry.
+
+        Tools are listed by name so the schemas form a stable, cacheable
+        prefix regardless of registration order.
+        """
+        return sort_tool_schemas(
+            [
+                generate_tool_description(tool, self._tool_registry.get_entry(tool.name))
+                for tool in self._tool_registry.list_all()
+            ]
+        )
 
     def _check_doom_loop(
         self,
@@ -27,6 +27,7 @@ class CreateBackupRequest(BaseModel):
 
     mode: BackupMode = BackupMode.FULL
     label: str = ""
+    incremental: bool = False
 
 
 def get_backup_service(request: Request) -> BackupService:
@@ -88,6 +89,7 @@ async def create_backup(
         mode=body.mode,
         label=body.label,
         creator=_requested_by(request),
+        incremental=body.incremental,
     )
 
 
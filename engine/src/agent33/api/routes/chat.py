@@ -5,7 +5,6 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, cast
 
-import httpx
 from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
@@ -14,6 +13,7 @@ from agent33.connectors.boundary import (
     build_connector_boundary_executor,
     map_connector_exception,
 )
+from agent33.connectors.http_pool import pooled_client
 from agent33.connectors.models import ConnectorRequest
 from agent33.llm.default_models import resolve_openrouter_default_fallback_models
 from agent33.llm.openai import (
@@ -24,6 +24,8 @@ from agent33.llm.runtime_config import build_model_router, resolve_default_model
 from agent33.security.injection import scan_input
 
 if TYPE_CHECKING:
+    import httpx
+
     from agent33.llm.router import ModelRouter
 
 router = APIRouter(prefix="/v1", tags=["chat"])
@@ -92,7 +94,7 @@ async def chat_completions(request: Request) -> Response:
         return headers
 
     try:
-        async with httpx.AsyncClient(timeout=120) as client:
+        async with pooled_client("api:chat_proxy") as client:
             boundary_executor = build_connector_boundary_executor(
                 default_timeout_seconds=120.0,
                 retry_attempts=1,
@@ -126,6 +128,7 @@ async def chat_completions(request: Request) -> Response:
                     f"{base_url.rstrip('/')}/chat/completions",
                     json=payload,
                     headers=headers,
+                    timeout=120,
                 )
                 connector = "api:chat_proxy"
                 operation = "POST /chat/completions"
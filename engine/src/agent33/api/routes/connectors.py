@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Request
 from agent33.connectors.models import (
     CircuitBreakerSnapshot,
     CircuitEvent,
+    ConcurrencyLimitSnapshot,
     ConnectorHealthSummary,
     ConnectorMetricsSummary,
     ConnectorStatus,
@@ -27,6 +28,21 @@ def _get_connector_metrics(request: Request) -> Any:
     return getattr(request.app.state, "connector_metrics", None)
 
 
+def _get_limiter_registry(request: Request) -> Any:
+    """Return the ConcurrencyLimiterRegistry from app.state, or None."""
+    return getattr(request.app.state, "concurrency_limiter_registry", None)
+
+
+def _attach_concurrency(statuses: list[ConnectorStatus], limiter_registry: Any) -> None:
+    """Attach concurrency limiter snapshots to statuses that have a limiter."""
+    if limiter_registry is None:
+        return
+    for status in statuses:
+        limiter = limiter_registry.get(status.connector_id)
+        if limiter is not None:
+            status.concurrency = ConcurrencyLimitSnapshot(**limiter.snapshot())
+
+
 def _build_circuit_snapshot(breaker: Any) -> CircuitBreakerSnapshot:
     """Return a normalized circuit-breaker snapshot for API responses."""
     if hasattr(breaker, "snapshot"):
@@ -161,6 +177,7 @@ async def list_connectors(
 
     boundary_statuses = _build_boundary_statuses(connector_metrics, proxy_ids)
     all_statuses = proxy_statuses + boundary_statuses
+    _attach_concurrency(all_statuses, _get_limiter_registry(request))
     summary = _compute_health_summary(all_statuses)
 
     return {
@@ -226,6 +243,7 @@ async def get_connector(request: Request, connector_id: str) -> dict[str, Any]:
                 state="active" if raw["total_calls"] > 0 else "idle",
                 metrics=ConnectorMetricsSummary(**raw),
             )
+            _attach_concurrency([status], _get_limiter_registry(request))
             return status.model_dump()
 
     raise HTTPException(status_code=404, detail=f"Connector '{connector_id}' not found")
@@ -100,6 +100,7 @@ class HookStatsResponse(BaseModel):
     total_definitions: int
     by_event_type: dict[str, int]
     event_types_active: int
+    script_hooks: dict[str, dict[str, Any]] = Field(default_factory=dict)
 
 
 # ---------------------------------------------------------------------------
@@ -7,6 +7,7 @@ builder (Phase 58).
 
 from __future__ import annotations
 
+import uuid
 from typing import Any
 
 import structlog
@@ -15,6 +16,7 @@ from pydantic import BaseModel, Field
 
 from agent33.security.permissions import require_scope
 from agent33.workflows.executor import WorkflowExecutor
+from agent33.workflows.step_workers import get_step_dispatcher
 from agent33.workflows.templates.mixture_of_agents import (
     build_moa_workflow,
     estimate_moa_cost,
@@ -202,6 +204,8 @@ async def execute_workflow(req: MoAExecuteRequest) -> dict[str, Any]:
     executor = WorkflowExecutor(
         definition=wf,
         tenant_id=req.tenant_id,
+        run_id=f"moa-{uuid.uuid4().hex}",
+        step_dispatcher=get_step_dispatcher(),
     )
 
     try:
@@ -0,0 +1,201 @@
+"""Admin endpoints for the hot-path sampling profiler and event-loop watchdog."""
+
+from __future__ import annotations
+
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+
+from agent33.observability.sampling_profiler import ProfilingError, SamplingProfiler
+from agent33.security.permissions import require_scope
+
+router = APIRouter(prefix="/v1/admin/profiling", tags=["profiling"])
+
+
+# ---------------------------------------------------------------------------
+# Dependency injection
+# ---------------------------------------------------------------------------
+
+
+def get_sampling_profiler(request: Request) -> SamplingProfiler:
+    """Return the app-scoped sampling profiler."""
+    profiler: SamplingProfiler | None = getattr(request.app.state, "sampling_profiler", None)
+    if profiler is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sampling profiler not enabled",
+        )
+    return profiler
+
+
+ProfilerDependency = Annotated[SamplingProfiler, Depends(get_sampling_profiler)]
+
+
+# ---------------------------------------------------------------------------
+# Request / response models
+# ---------------------------------------------------------------------------
+
+
+class StartSessionRequest(BaseModel):
+    """Request body for starting a profiling window."""
+
+    duration_seconds: float = Field(default=30.0, gt=0)
+    interval_ms: float | None = Field(default=None, ge=1.0, le=1000.0)
+    targets: list[str] = Field(
+        default_factory=list,
+        description=(
+            "kind:pattern globs such as 'route:/v1/agents/*', 'agent:code-worker' or "
+            "'workflow:*'. Empty profiles everything on the event loop."
+        ),
+    )
+    include_threads: bool = False
+
+
+class SessionSummaryResponse(BaseModel):
+    """Aggregated view of one profiling session."""
+
+    session_id: str
+    state: str
+    mode: str
+    targets: list[str]
+    interval_ms: float
+    duration_seconds: float
+    started_at: float
+    ended_at: float | None
+    total_samples: int
+    matched_samples: int
+    idle_samples: int
+    distinct_stacks: int
+    dropped_stacks: int
+    labels: dict[str, int]
+    top_functions: dict[str, int]
+
+
+class SessionListResponse(BaseModel):
+    """Recent profiling sessions, newest first."""
+
+    sessions: list[SessionSummaryResponse]
+
+
+class LoopStatsResponse(BaseModel):
+    """Event-loop lag percentiles and recent slow callbacks."""
+
+    running: bool
+    heartbeat_interval_ms: float
+    slow_callback_threshold_ms: float
+    lag_p50_ms: float
+    lag_p95_ms: float
+    lag_p99_ms: float
+    lag_max_ms: float
+    slow_callbacks_total: int
+    slow_callbacks: list[dict[str, Any]]
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+
+@router.post(
+    "/sessions",
+    response_model=SessionSummaryResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[require_scope("admin")],
+)
+async def start_session(
+    body: StartSessionRequest,
+    profiler: ProfilerDependency,
+) -> SessionSummaryResponse:
+    """Start a sampling window, optionally scoped to routes/agents/workflows."""
+    try:
+        session = profiler.start_session(
+            duration_seconds=body.duration_seconds,
+            interval_ms=body.interval_ms,
+            targets=body.targets,
+            include_threads=body.include_threads,
+        )
+    except ProfilingError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    return SessionSummaryResponse(**session.summary())
+
+
+@router.get(
+    "/sessions",
+    response_model=SessionListResponse,
+    dependencies=[require_scope("admin")],
+)
+async def list_sessions(profiler: ProfilerDependency) -> SessionListResponse:
+    """List the running session (if any) and recently finished ones."""
+    return SessionListResponse(
+        sessions=[
+            SessionSummaryResponse(**session.summary()) for session in profiler.list_sessions()
+        ]
+    )
+
+
+@router.get(
+    "/sessions/{session_id}",
+    response_model=SessionSummaryResponse,
+    dependencies=[require_scope("admin")],
+)
+async def get_session(
+    session_id: str,
+    profiler: ProfilerDependency,
+    top: int = Query(default=20, ge=1, le=500),
+) -> SessionSummaryResponse:
+    """Return sample counts, per-label totals and the hottest leaf functions."""
+    try:
+        session = profiler.get_session(session_id)
+    except ProfilingError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return SessionSummaryResponse(**session.summary(top=top))
+
+
+@router.get(
+    "/sessions/{session_id}/collapsed",
+    response_class=PlainTextResponse,
+    dependencies=[require_scope("admin")],
+)
+async def get_collapsed_stacks(
+    session_id: str,
+    profiler: ProfilerDependency,
+    label: str | None = Query(default=None, description="Glob filter, e.g. 'agent:*'"),
+) -> PlainTextResponse:
+    """Return collapsed stacks (``frame;frame count``) for flame-graph tools."""
+    try:
+        session = profiler.get_session(session_id)
+    except ProfilingError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return PlainTextResponse(session.collapsed(label))
+
+
+@router.post(
+    "/sessions/{session_id}/stop",
+    response_model=SessionSummaryResponse,
+    dependencies=[require_scope("admin")],
+)
+async def stop_session(
+    session_id: str,
+    profiler: ProfilerDependency,
+) -> SessionSummaryResponse:
+    """Stop a running session early; finished sessions are returned unchanged."""
+    try:
+        session = profiler.stop_session(session_id)
+    except ProfilingError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return SessionSummaryResponse(**session.summary())
+
+
+@router.get(
+    "/event-loop",
+    response_model=LoopStatsResponse,
+    dependencies=[require_scope("admin")],
+)
+async def get_event_loop_stats(
+    profiler: ProfilerDependency,
+    recent: int = Query(default=10, ge=0, le=100),
+) -> LoopStatsResponse:
+    """Return event-loop lag percentiles and the most recent slow callbacks."""
+    return LoopStatsResponse(**profiler.loop_stats(recent=recent))
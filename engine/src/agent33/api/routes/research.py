@@ -28,6 +28,14 @@ def set_research_service(service: WebResearchService | None) -> None:
     _research_service = service
 
 
+def _tenant_id(request: Request) -> str:
+    """Extract tenant ID from authenticated principal."""
+    user = getattr(request.state, "user", None)
+    if user is None:
+        return ""
+    return getattr(user, "tenant_id", "") or ""
+
+
 def _get_research_service(request: Request) -> WebResearchService:
     if _research_service is not None:
         return _research_service
@@ -77,6 +85,7 @@ async def search_research(
             provider_id=body.provider,
             limit=body.limit,
             categories=body.categories,
+            tenant_id=_tenant_id(request),
         )
     except ValueError as exc:
         message = str(exc)
@@ -105,6 +114,7 @@ async def fetch_research(
             body=body.body,
             method=body.method,
             timeout=body.timeout,
+            tenant_id=_tenant_id(request),
         )
     except ValueError as exc:
         message = str(exc)
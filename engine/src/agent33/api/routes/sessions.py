@@ -952,6 +952,32 @@ async def get_session_title(session_id: str, request: Request) -> dict[str, str]
     return {"session_id": session_id, "title": title, "source": "generated"}
 
 
+@router.post(
+    "/titles",
+    dependencies=[require_scope("sessions:write")],
+)
+async def generate_missing_titles(request: Request) -> dict[str, Any]:
+    """Generate titles for every tracked session that does not have one yet.
+
+    The titles are generated together, so an LLM-backed generator packs them
+    into a few batched requests instead of one request per session.
+    """
+    tracker = _get_trajectory_tracker(request)
+    untitled = [
+        trajectory
+        for trajectory in (tracker.get(sid) for sid in tracker.list_sessions())
+        if not trajectory.title and trajectory.first_user_message
+    ]
+    generator = _get_title_generator(request)
+    titles = await generator.generate_many([t.first_user_message for t in untitled])
+    generated: dict[str, str] = {}
+    for trajectory, title in zip(untitled, titles, strict=True):
+        if title:
+            tracker.set_title(trajectory.session_id, title)
+            generated[trajectory.session_id] = title
+    return {"generated": generated, "count": len(generated)}
+
+
 @router.patch(
     "/{session_id}/title",
     dependencies=[require_scope("sessions:write")],
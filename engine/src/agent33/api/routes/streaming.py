@@ -23,6 +23,7 @@ from starlette.websockets import WebSocket, WebSocketDisconnect
 from agent33.config import settings
 from agent33.security.auth import validate_api_key, verify_token
 from agent33.security.permissions import check_permission
+from agent33.security.redaction import redact_secrets
 
 if TYPE_CHECKING:
     from agent33.security.auth import TokenPayload
@@ -337,6 +338,12 @@ async def stream_agent(websocket: WebSocket, agent_id: str) -> None:
                     tenant_id=payload.tenant_id,
                 )
                 result = await runtime.invoke({"query": user_input, **context})
+                output = {
+                    key: redact_secrets(value, enabled=settings.redact_secrets_enabled)
+                    if isinstance(value, str)
+                    else value
+                    for key, value in result.output.items()
+                }
 
                 seq += 1
                 await websocket.send_text(
@@ -344,7 +351,7 @@ async def stream_agent(websocket: WebSocket, agent_id: str) -> None:
                         event="response",
                         data={
                             "agent": agent_def.name,
-                            "output": result.output,
+                            "output": output,
                             "tokens_used": result.tokens_used,
                             "model": result.model,
                         },
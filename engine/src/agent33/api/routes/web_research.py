@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field
 
 from agent33.security.permissions import require_scope
 from agent33.web_research.models import (
+    ProviderSearchOutcome,
     ResearchProviderStatus,
     TrustedDomainEntry,
     TrustLabel,
@@ -58,6 +59,7 @@ class WebSearchResponse(BaseModel):
     provider_id: str | None = None
     all_providers: bool = False
     results: list[WebResearchResult] = Field(default_factory=list)
+    provider_outcomes: list[ProviderSearchOutcome] = Field(default_factory=list)
 
 
 class TrustClassificationResponse(BaseModel):
@@ -94,17 +96,25 @@ async def execute_search(
     provider: str | None = Query(None, description="Provider ID filter"),
     limit: int = Query(10, ge=1, le=25, description="Max results"),
     all_providers: bool = Query(False, description="Query all providers"),
+    quorum: int | None = Query(
+        None,
+        ge=1,
+        description="With all_providers, return once this many providers have answered",
+    ),
 ) -> WebSearchResponse:
     """Execute a web search with optional provider filter."""
     registry = _get_registry(request)
 
     try:
         if all_providers:
-            results = await registry.search_all(q, limit=limit, categories="general")
+            fan_out = await registry.search_fan_out(
+                q, limit=limit, categories="general", quorum=quorum
+            )
             return WebSearchResponse(
                 query=q,
                 all_providers=True,
-                results=results,
+                results=fan_out.results,
+                provider_outcomes=fan_out.outcomes,
             )
         else:
             results = await registry.search(
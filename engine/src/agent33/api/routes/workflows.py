@@ -20,6 +20,7 @@ from agent33.workflows.dag_layout import compute_dag_layout
 from agent33.workflows.definition import WorkflowDefinition
 from agent33.workflows.executor import WorkflowExecutor, WorkflowResult
 from agent33.workflows.history import WorkflowExecutionRecord, normalize_execution_record
+from agent33.workflows.step_workers import get_step_dispatcher
 
 if TYPE_CHECKING:
     from agent33.workflows.run_archive import WorkflowRunArchiveService
@@ -88,6 +89,12 @@ def _persist_workflow_state() -> None:
         _workflow_state_service.persist_state()
 
 
+def set_scheduler(scheduler: WorkflowScheduler | None) -> None:
+    """Install the lifespan-managed scheduler (started and paused by leadership)."""
+    global _scheduler
+    _scheduler = scheduler
+
+
 def set_ws_manager(manager: Any | None) -> None:
     """Register the shared workflow WS manager for non-request code paths."""
     global _ws_manager
@@ -120,7 +127,7 @@ def _start_workflow_run_archive(
     )
 
 
-def _record_workflow_run_archive(
+async def _record_workflow_run_archive(
     *,
     run_id: str,
     history_record: WorkflowExecutionRecord,
@@ -129,7 +136,7 @@ def _record_workflow_run_archive(
     archive_service = get_workflow_run_archive_service()
     if archive_service is None:
         return
-    archive_service.record_result(
+    await archive_service.record_result_async(
         run_id,
         result_payload or {},
         history_record=history_record.model_dump(mode="json"),
@@ -692,6 +699,7 @@ async def _execute_single(
         tenant_id=tenant_id,
         run_id=run_id,
         event_sink=event_sink,
+        step_dispatcher=get_step_dispatcher(),
     )
     start_ts = time.time()
     start_monotonic = time.monotonic()
@@ -739,7 +747,7 @@ async def _execute_single(
         )
         get_execution_history().append(failed_record.model_dump(mode="json"))
         _persist_workflow_state()
-        _record_workflow_run_archive(
+        await _record_workflow_run_archive(
             run_id=run_id,
             history_record=failed_record,
             result_payload={
@@ -785,7 +793,7 @@ async def _execute_single(
     response = result.model_dump()
     response["run_id"] = run_id
     response["workflow_name"] = name
-    _record_workflow_run_archive(
+    await _record_workflow_run_archive(
         run_id=run_id,
         history_record=success_record,
         result_payload=response,
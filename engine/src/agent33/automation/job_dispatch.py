@@ -0,0 +1,228 @@
+"""Hand scheduled job fires from the scheduler leader to any replica.
+
+Only the leader runs triggers (see
+:class:`~agent33.scaling.leader_election.LeaderElection`), but the work a
+trigger starts should not pile up on that one process.  When a job fires the
+leader pushes a :class:`JobFire` onto a shared queue; every replica runs a
+:class:`ScheduledJobDispatcher` consumer that pops fires and calls the handler
+registered for the fire's *surface* (``"workflow"``, ``"evaluation_gate"``,
+...).
+
+Fires carry the fencing token of the leader's term.  A consumer drops fires
+whose token is older than the election's latest one, so a leader that lost
+its lease without noticing cannot double-trigger jobs next to its successor.
+
+Delivery is at-most-once: a replica that crashes while running a fire does
+not hand it to another replica.  A missed run is cheaper than a duplicate
+one for scheduled work, and the next trigger fires as usual.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from agent33.observability.metrics import MetricsCollector
+    from agent33.scaling.leader_election import LeaderElection
+
+logger = logging.getLogger(__name__)
+
+_REDIS_FIRE_QUEUE_KEY = "agent33:scheduler:fires"
+
+
+@dataclass(frozen=True, slots=True)
+class JobFire:
+    """One trigger of a scheduled job, as handed to the executing replica."""
+
+    surface: str
+    job_id: str
+    payload: dict[str, Any]
+    fencing_token: int | None
+    fire_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    fired_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> JobFire:
+        return cls(**json.loads(raw))
+
+
+class JobFireQueue(Protocol):
+    """Shared queue of job fires."""
+
+    async def push(self, fire: JobFire) -> None: ...
+
+    async def pop(self, block_seconds: float) -> JobFire | None:
+        """Take the oldest fire, waiting up to *block_seconds* for one."""
+        ...
+
+
+class InProcessJobFireQueue:
+    """Single-process queue used when Redis is not configured."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[JobFire] = asyncio.Queue()
+
+    async def push(self, fire: JobFire) -> None:
+        self._queue.put_nowait(fire)
+
+    async def pop(self, block_seconds: float) -> JobFire | None:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=block_seconds)
+        except TimeoutError:
+            return None
+
+
+class RedisJobFireQueue:
+    """Redis list shared by all replicas (``LPUSH`` / ``BRPOP``)."""
+
+    def __init__(self, redis: Any, *, key: str = _REDIS_FIRE_QUEUE_KEY) -> None:
+        self._redis = redis
+        self._key = key
+
+    async def push(self, fire: JobFire) -> None:
+        await self._redis.lpush(self._key, fire.to_json())
+
+    async def pop(self, block_seconds: float) -> JobFire | None:
+        item = await self._redis.brpop([self._key], timeout=block_seconds)
+        if item is None:
+            return None
+        return JobFire.from_json(item[1])
+
+
+def create_job_fire_queue(redis: Any | None = None) -> RedisJobFireQueue | InProcessJobFireQueue:
+    """Factory: Redis-backed queue when a client is given, in-process otherwise."""
+    if redis is not None:
+        return RedisJobFireQueue(redis)
+    return InProcessJobFireQueue()
+
+
+class ScheduledJobDispatcher:
+    """Queues fires on the leader and executes them on every replica.
+
+    Parameters
+    ----------
+    queue:
+        The shared fire queue.
+    election:
+        The scheduler leader election; supplies and validates fencing tokens.
+    concurrency:
+        Number of fires this replica runs at the same time.
+    """
+
+    def __init__(
+        self,
+        queue: JobFireQueue,
+        election: LeaderElection,
+        *,
+        concurrency: int = 2,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self._queue = queue
+        self._election = election
+        self._concurrency = max(1, concurrency)
+        self._metrics = metrics
+        self._handlers: dict[str, Callable[[str, dict[str, Any]], Awaitable[Any]]] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def register(
+        self, surface: str, handler: Callable[[str, dict[str, Any]], Awaitable[Any]]
+    ) -> None:
+        """Route fires of *surface* to ``handler(job_id, payload)``."""
+        self._handlers[surface] = handler
+
+    async def dispatch(self, surface: str, job_id: str, payload: dict[str, Any]) -> bool:
+        """Queue a fire; only the current leader may dispatch."""
+        token = self._election.fencing_token
+        if token is None:
+            logger.warning(
+                "scheduled_job_fire_dropped_not_leader surface=%s job=%s", surface, job_id
+            )
+            self._count(surface, "not_leader")
+            return False
+        await self._queue.push(JobFire(surface, job_id, payload, token))
+        self._count(surface, "queued")
+        return True
+
+    # -- consumer -------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._loop(), name=f"scheduled-job-consumer-{slot}")
+            for slot in range(self._concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                fire = await self._queue.pop(block_seconds=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("scheduled_job_fire_pop_failed", exc_info=True)
+                await asyncio.sleep(1.0)
+                continue
+            if fire is not None:
+                await self.handle(fire)
+
+    async def handle(self, fire: JobFire) -> None:
+        """Run one fire unless it is stale or nobody handles its surface."""
+        handler = self._handlers.get(fire.surface)
+        if handler is None:
+            logger.warning(
+                "scheduled_job_fire_unhandled surface=%s job=%s", fire.surface, fire.job_id
+            )
+            self._count(fire.surface, "unhandled")
+            return
+        if not await self._election.is_current(fire.fencing_token):
+            logger.warning(
+                "scheduled_job_fire_stale surface=%s job=%s fencing_token=%s",
+                fire.surface,
+                fire.job_id,
+                fire.fencing_token,
+            )
+            self._count(fire.surface, "stale")
+            return
+        try:
+            await handler(fire.job_id, fire.payload)
+        except Exception:
+            logger.error(
+                "scheduled_job_fire_failed surface=%s job=%s",
+                fire.surface,
+                fire.job_id,
+                exc_info=True,
+            )
+            self._count(fire.surface, "failed")
+            return
+        self._count(fire.surface, "executed")
+
+    def _count(self, surface: str, outcome: str) -> None:
+        if self._metrics is not None:
+            self._metrics.increment(
+                "scheduler_job_fires_total", {"surface": surface, "outcome": outcome}
+            )
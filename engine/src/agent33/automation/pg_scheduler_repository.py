@@ -26,14 +26,19 @@ class SqliteSchedulerJobRepository:
     db_path:
         Path to the SQLite database file, or ``":memory:"`` for an
         ephemeral in-memory database (useful in tests).
+    table:
+        Table name, so other scheduler surfaces (e.g. scheduled evaluation
+        gates) can keep their jobs in the same database.
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, *, table: str = "scheduled_jobs") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+        self._table = table
         self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute(
-            "CREATE TABLE IF NOT EXISTS scheduled_jobs "
-            "(job_id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            f"CREATE TABLE IF NOT EXISTS {table} (job_id TEXT PRIMARY KEY, data TEXT NOT NULL)"
         )
         self._conn.commit()
 
@@ -42,7 +47,7 @@ class SqliteSchedulerJobRepository:
     def get_job(self, job_id: str) -> ScheduledJob | None:
         """Get a scheduled job by ID."""
         row = self._conn.execute(
-            "SELECT data FROM scheduled_jobs WHERE job_id = ?", (job_id,)
+            f"SELECT data FROM {self._table} WHERE job_id = ?", (job_id,)
         ).fetchone()
         if row is None:
             return None
@@ -50,20 +55,20 @@ class SqliteSchedulerJobRepository:
 
     def list_jobs(self) -> list[ScheduledJob]:
         """List all scheduled jobs."""
-        rows = self._conn.execute("SELECT data FROM scheduled_jobs").fetchall()
+        rows = self._conn.execute(f"SELECT data FROM {self._table}").fetchall()
         return [self._deserialize(r[0]) for r in rows]
 
     def add_job(self, job: ScheduledJob) -> None:
         """Store a scheduled job (insert-or-replace)."""
         self._conn.execute(
-            "INSERT OR REPLACE INTO scheduled_jobs (job_id, data) VALUES (?, ?)",
+            f"INSERT OR REPLACE INTO {self._table} (job_id, data) VALUES (?, ?)",
             (job.job_id, self._serialize(job)),
         )
         self._conn.commit()
 
     def remove_job(self, job_id: str) -> bool:
         """Remove a scheduled job by ID. Returns True if found and removed."""
-        cursor = self._conn.execute("DELETE FROM scheduled_jobs WHERE job_id = ?", (job_id,))
+        cursor = self._conn.execute(f"DELETE FROM {self._table} WHERE job_id = ?", (job_id,))
         self._conn.commit()
         return cursor.rowcount > 0
 
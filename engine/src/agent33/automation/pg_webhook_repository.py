@@ -1,17 +1,32 @@
-"""SQLite-backed webhook registration repository.
+"""SQLite-backed webhook registration repository and delivery store.
 
 Provides a durable, file-based implementation of :class:`WebhookRepository`
+and of :class:`~agent33.automation.webhook_delivery.WebhookDeliveryStore`
 using the standard library ``sqlite3`` module.  Named with the ``pg_`` prefix to
 reserve the filename for a future PostgreSQL implementation while providing the
 SQLite stepping-stone that can run without an external database server.
+
+The delivery store's owner leases only coordinate replicas that open the same
+database file (one host or a shared volume).
 """
 
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
 from datetime import UTC, datetime
 from typing import Any
 
+from agent33.automation.webhook_delivery import WebhookDeliveryRecord, WebhookDeliveryStatus
+
+_UNFINISHED = (
+    WebhookDeliveryStatus.PENDING.value,
+    WebhookDeliveryStatus.IN_FLIGHT.value,
+    WebhookDeliveryStatus.RETRYING.value,
+    WebhookDeliveryStatus.FAILED.value,
+)
+
 
 class SqliteWebhookRepository:
     """SQLite-backed implementation of the webhook registration repository protocol.
@@ -100,3 +115,114 @@ class SqliteWebhookRepository:
     def close(self) -> None:
         """Close the underlying database connection."""
         self._conn.close()
+
+
+class SqliteWebhookDeliveryStore:
+    """SQLite-backed durable store for webhook delivery records.
+
+    Records live in a ``webhook_deliveries`` table with the full record as a
+    JSON blob plus the columns needed to query it.  Every replica writes its
+    records under its own *owner* id and refreshes ``lease_until`` on its
+    unfinished records; a replica that stops refreshing has its unfinished
+    deliveries taken over by the next :meth:`claim_unfinished` of another
+    replica.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite database file, or ``":memory:"``.
+    owner:
+        Identity of this replica (e.g. the instance registry id).
+    lease_seconds:
+        How long unfinished records stay with an owner that stopped
+        refreshing them.
+    """
+
+    def __init__(self, db_path: str, *, owner: str, lease_seconds: float = 60.0) -> None:
+        self._owner = owner
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS webhook_deliveries ("
+            "  delivery_id TEXT PRIMARY KEY,"
+            "  status TEXT NOT NULL,"
+            "  owner TEXT NOT NULL,"
+            "  lease_until REAL NOT NULL,"
+            "  created_at REAL NOT NULL,"
+            "  data TEXT NOT NULL"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_status "
+            "ON webhook_deliveries (status, lease_until)"
+        )
+        self._conn.commit()
+
+    def save_many(self, records: list[WebhookDeliveryRecord]) -> None:
+        """Upsert a batch of records in a single transaction."""
+        lease_until = time.time() + self._lease_seconds
+        rows = [
+            (
+                record.delivery_id,
+                record.status.value,
+                self._owner,
+                lease_until,
+                record.created_at,
+                record.model_dump_json(),
+            )
+            for record in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO webhook_deliveries "
+                "(delivery_id, status, owner, lease_until, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete_many(self, delivery_ids: list[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM webhook_deliveries WHERE delivery_id = ?",
+                [(delivery_id,) for delivery_id in delivery_ids],
+            )
+
+    def claim_unfinished(self) -> list[WebhookDeliveryRecord]:
+        """Take over this owner's unfinished records and those of stale owners."""
+        now = time.time()
+        marks = ", ".join("?" for _ in _UNFINISHED)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "UPDATE webhook_deliveries SET owner = ?, lease_until = ? "
+                f"WHERE status IN ({marks}) AND (owner = ? OR lease_until < ?) "
+                "RETURNING data",
+                (self._owner, now + self._lease_seconds, *_UNFINISHED, self._owner, now),
+            ).fetchall()
+        records = [WebhookDeliveryRecord.model_validate_json(row[0]) for row in rows]
+        records.sort(key=lambda record: record.created_at)
+        return records
+
+    def touch(self) -> None:
+        """Extend the lease on this owner's unfinished records."""
+        marks = ", ".join("?" for _ in _UNFINISHED)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE webhook_deliveries SET lease_until = ? "
+                f"WHERE owner = ? AND status IN ({marks})",
+                (time.time() + self._lease_seconds, self._owner, *_UNFINISHED),
+            )
+
+    def load_dead_letters(self, limit: int) -> list[WebhookDeliveryRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM webhook_deliveries WHERE status = ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (WebhookDeliveryStatus.DEAD_LETTERED.value, limit),
+            ).fetchall()
+        return [WebhookDeliveryRecord.model_validate_json(row[0]) for row in reversed(rows)]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -2,20 +2,30 @@
 
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import logging
 import uuid
 from typing import TYPE_CHECKING, Any
 
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_RUNNING
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 if TYPE_CHECKING:
+    from apscheduler.triggers.base import BaseTrigger
+
+    from agent33.automation.job_dispatch import ScheduledJobDispatcher
     from agent33.automation.scheduler_repository import SchedulerJobRepository
 
 logger = logging.getLogger(__name__)
 
+# Surface name of workflow jobs on the scheduled-job dispatcher.
+WORKFLOW_JOB_SURFACE = "workflow"
+_SYNC_JOB_ID = "__agent33_scheduler_sync__"
+
 
 @dataclasses.dataclass(frozen=True, slots=True)
 class ScheduledJob:
@@ -37,26 +47,58 @@ class WorkflowScheduler:
 
     A callback must be provided at construction time; it is invoked with
     ``(job_id, workflow_name, inputs)`` whenever a job fires.
+
+    With several replicas only the scheduler leader should fire jobs: start
+    every replica with ``start(paused=True)`` and let leadership call
+    :meth:`resume` / :meth:`pause`.  Jobs created on any replica live in the
+    shared repository; the active scheduler loads them on resume and, with
+    *sync_interval_seconds*, keeps reconciling with the repository.  With a
+    *dispatcher*, fired jobs are queued for whichever replica picks them up
+    instead of running in the leader process.
     """
 
     def __init__(
         self,
         on_trigger: Any | None = None,
         job_repository: SchedulerJobRepository | None = None,
+        *,
+        dispatcher: ScheduledJobDispatcher | None = None,
+        sync_interval_seconds: float | None = None,
     ) -> None:
         from agent33.automation.scheduler_repository import get_scheduler_job_repository
 
-        self._scheduler = AsyncIOScheduler()
+        # Coalesce runs missed while paused (standby) into a single catch-up run.
+        # No misfire grace limit: a run that fell due during a leader handover
+        # (up to a lease plus a renew interval) would otherwise be dropped.
+        self._scheduler = AsyncIOScheduler(
+            job_defaults={"coalesce": True, "misfire_grace_time": None}
+        )
         self._job_repo = job_repository or get_scheduler_job_repository()
         self._on_trigger = on_trigger
+        self._dispatcher = dispatcher
+        self._sync_interval = sync_interval_seconds
+        if dispatcher is not None:
+            dispatcher.register(WORKFLOW_JOB_SURFACE, self._run_dispatched)
 
     # -- lifecycle ------------------------------------------------------------
 
-    def start(self) -> None:
-        """Start the underlying APScheduler."""
+    def start(self, *, paused: bool = False) -> None:
+        """Start the underlying APScheduler with the jobs in the repository.
+
+        A paused scheduler keeps its jobs but fires nothing until
+        :meth:`resume` (the standby state of a non-leader replica).
+        """
         if not self._scheduler.running:
-            self._scheduler.start()
-            logger.info("WorkflowScheduler started")
+            self.sync_jobs()
+            if self._sync_interval:
+                self._scheduler.add_job(
+                    self.sync_jobs,
+                    trigger=IntervalTrigger(seconds=self._sync_interval),
+                    id=_SYNC_JOB_ID,
+                    replace_existing=True,
+                )
+            self._scheduler.start(paused=paused)
+            logger.info("WorkflowScheduler started (paused=%s)", paused)
 
     def stop(self) -> None:
         """Shut down the underlying APScheduler."""
@@ -64,6 +106,52 @@ class WorkflowScheduler:
             self._scheduler.shutdown(wait=False)
             logger.info("WorkflowScheduler stopped")
 
+    def pause(self) -> None:
+        """Stop firing jobs (this replica lost scheduler leadership)."""
+        if self.active:
+            self._scheduler.pause()
+            logger.info("WorkflowScheduler paused")
+
+    def resume(self) -> None:
+        """Reload jobs from the repository and start firing them again."""
+        if not self._scheduler.running:
+            self.start()
+            return
+        self.sync_jobs()
+        self._scheduler.resume()
+        logger.info("WorkflowScheduler resumed")
+
+    @property
+    def active(self) -> bool:
+        """Whether triggers are currently firing on this replica."""
+        return bool(self._scheduler.state == STATE_RUNNING)
+
+    def sync_jobs(self) -> int:
+        """Reconcile APScheduler triggers with the job repository.
+
+        Adds triggers for jobs created on other replicas and drops triggers
+        for jobs removed there.  Returns the number of triggers changed.
+        """
+        stored = {job.job_id: job for job in self._job_repo.list_jobs()}
+        loaded = {job.id for job in self._scheduler.get_jobs()} - {_SYNC_JOB_ID}
+        changed = 0
+        for job_id in loaded - stored.keys():
+            with contextlib.suppress(JobLookupError):
+                self._scheduler.remove_job(job_id)
+                changed += 1
+        for job_id in stored.keys() - loaded:
+            job = stored[job_id]
+            try:
+                trigger = self._build_trigger(job.schedule_type, job.schedule_expr)
+            except ValueError:
+                logger.warning("Skipping scheduled job %s with invalid schedule", job_id)
+                continue
+            self._add_trigger(job.job_id, job.workflow_name, job.inputs, trigger)
+            changed += 1
+        if changed:
+            logger.info("Synchronised %d scheduled job trigger(s) from repository", changed)
+        return changed
+
     # -- scheduling -----------------------------------------------------------
 
     def schedule_cron(
@@ -81,24 +169,8 @@ class WorkflowScheduler:
         """
         inputs = inputs or {}
         job_id = str(uuid.uuid4())
-        parts = cron_expr.strip().split()
-        if len(parts) != 5:
-            raise ValueError(f"Expected 5-field cron expression, got: {cron_expr!r}")
-
-        trigger = CronTrigger(
-            minute=parts[0],
-            hour=parts[1],
-            day=parts[2],
-            month=parts[3],
-            day_of_week=parts[4],
-        )
-
-        self._scheduler.add_job(
-            self._execute,
-            trigger=trigger,
-            id=job_id,
-            args=[job_id, workflow_name, inputs],
-        )
+        trigger = self._build_trigger("cron", cron_expr)
+        self._add_trigger(job_id, workflow_name, inputs, trigger)
 
         self._job_repo.add_job(
             ScheduledJob(
@@ -124,15 +196,7 @@ class WorkflowScheduler:
         """
         inputs = inputs or {}
         job_id = str(uuid.uuid4())
-
-        trigger = IntervalTrigger(seconds=seconds)
-
-        self._scheduler.add_job(
-            self._execute,
-            trigger=trigger,
-            id=job_id,
-            args=[job_id, workflow_name, inputs],
-        )
+        self._add_trigger(job_id, workflow_name, inputs, IntervalTrigger(seconds=seconds))
 
         self._job_repo.add_job(
             ScheduledJob(
@@ -150,7 +214,9 @@ class WorkflowScheduler:
         """Remove a scheduled job by ID. Returns True if the job existed."""
         if self._job_repo.get_job(job_id) is None:
             return False
-        self._scheduler.remove_job(job_id)
+        # The trigger only exists locally if this replica created or synced it.
+        with contextlib.suppress(JobLookupError):
+            self._scheduler.remove_job(job_id)
         self._job_repo.remove_job(job_id)
         logger.info("Removed scheduled job %s", job_id)
         return True
@@ -161,8 +227,51 @@ class WorkflowScheduler:
 
     # -- internal -------------------------------------------------------------
 
+    @staticmethod
+    def _build_trigger(schedule_type: str, schedule_expr: str) -> BaseTrigger:
+        """Build a trigger from the stored ``schedule_type`` / ``schedule_expr``."""
+        if schedule_type == "interval":
+            return IntervalTrigger(seconds=int(schedule_expr.rstrip("s")))
+        parts = schedule_expr.strip().split()
+        if len(parts) != 5:
+            raise ValueError(f"Expected 5-field cron expression, got: {schedule_expr!r}")
+        return CronTrigger(
+            minute=parts[0],
+            hour=parts[1],
+            day=parts[2],
+            month=parts[3],
+            day_of_week=parts[4],
+        )
+
+    def _add_trigger(
+        self,
+        job_id: str,
+        workflow_name: str,
+        inputs: dict[str, Any],
+        trigger: BaseTrigger,
+    ) -> None:
+        self._scheduler.add_job(
+            self._execute,
+            trigger=trigger,
+            id=job_id,
+            args=[job_id, workflow_name, inputs],
+            replace_existing=True,
+        )
+
     async def _execute(self, job_id: str, workflow_name: str, inputs: dict[str, Any]) -> None:
-        """Fire the callback when a scheduled job triggers."""
+        """Fire the callback (or hand the fire to a replica) when a job triggers."""
         logger.info("Triggering scheduled workflow %s (%s)", workflow_name, job_id)
+        if self._dispatcher is not None:
+            await self._dispatcher.dispatch(
+                WORKFLOW_JOB_SURFACE,
+                job_id,
+                {"workflow_name": workflow_name, "inputs": inputs},
+            )
+            return
         if self._on_trigger is not None:
             await self._on_trigger(job_id, workflow_name, inputs)
+
+    async def _run_dispatched(self, job_id: str, payload: dict[str, Any]) -> None:
+        """Run a fire handed over by the dispatcher on this replica."""
+        if self._on_trigger is not None:
+            await self._on_trigger(job_id, payload["workflow_name"], payload["inputs"])
@@ -1,4 +1,14 @@
-"""Webhook delivery reliability: retries with exponential backoff, receipts, dead-lettering."""
+"""Webhook delivery reliability: retries with exponential backoff, receipts, dead-lettering.
+
+:class:`WebhookDeliveryManager` owns the delivery records and the retry
+policy.  The HTTP side lives in
+:class:`~agent33.automation.webhook_engine.WebhookDeliveryEngine`, which
+listens for enqueued deliveries, posts them and feeds results back through
+:meth:`WebhookDeliveryManager.process_result`.  With a
+:class:`WebhookDeliveryStore` the manager remembers which records changed and
+:meth:`WebhookDeliveryManager.flush` writes them in one batch, so pending
+retries and dead letters survive restarts.
+"""
 
 from __future__ import annotations
 
@@ -9,11 +19,16 @@ import time
 import uuid
 from collections import OrderedDict
 from enum import StrEnum
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Protocol
+from urllib.parse import urlparse
 
 from pydantic import BaseModel, Field
 
+from agent33.workflows.actions.http_request import is_private_url
+
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from agent33.observability.metrics import MetricsCollector
 
 logger = logging.getLogger(__name__)
@@ -30,6 +45,22 @@ def set_metrics(collector: MetricsCollector) -> None:
     _metrics = collector
 
 
+def validate_webhook_url(url: str, *, allow_private: bool = False) -> None:
+    """Reject webhook targets that are not http(s) or that point inside the network.
+
+    Raises ``ValueError`` for private, loopback and link-local addresses
+    (and ``localhost``) unless *allow_private* is set.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+        raise ValueError(f"Webhook URL must be an absolute http(s) URL: {url!r}")
+    if not allow_private and is_private_url(url):
+        raise ValueError(
+            "SSRF protection: webhook deliveries to private/reserved addresses "
+            f"are blocked ({url})"
+        )
+
+
 # ---------------------------------------------------------------------------
 # Models
 # ---------------------------------------------------------------------------
@@ -84,6 +115,35 @@ class DeliveryStats(BaseModel):
     avg_latency_ms: float = 0.0
 
 
+_TERMINAL_STATUSES = frozenset(
+    {WebhookDeliveryStatus.DELIVERED, WebhookDeliveryStatus.DEAD_LETTERED}
+)
+
+
+class WebhookDeliveryStore(Protocol):
+    """Durable storage for delivery records (see ``pg_webhook_repository``)."""
+
+    def save_many(self, records: list[WebhookDeliveryRecord]) -> None:
+        """Upsert a batch of records in one transaction."""
+        ...
+
+    def delete_many(self, delivery_ids: list[str]) -> None:
+        """Delete records by ID."""
+        ...
+
+    def claim_unfinished(self) -> list[WebhookDeliveryRecord]:
+        """Take over unfinished records of this owner and of stale owners."""
+        ...
+
+    def touch(self) -> None:
+        """Refresh this owner's lease on its unfinished records."""
+        ...
+
+    def load_dead_letters(self, limit: int) -> list[WebhookDeliveryRecord]:
+        """Return the most recent dead-lettered records."""
+        ...
+
+
 # ---------------------------------------------------------------------------
 # Manager
 # ---------------------------------------------------------------------------
@@ -93,7 +153,8 @@ class WebhookDeliveryManager:
     """Thread-safe, bounded in-memory webhook delivery manager.
 
     Supports exponential backoff with jitter, delivery receipts,
-    dead-letter queue, and admin purge.
+    dead-letter queue, and admin purge.  Records changed since the last
+    :meth:`flush` are written to the optional *store* in one batch.
     """
 
     def __init__(
@@ -102,13 +163,42 @@ class WebhookDeliveryManager:
         base_delay_seconds: float = 1.0,
         max_delay_seconds: float = 300.0,
         max_records: int = 10_000,
+        *,
+        store: WebhookDeliveryStore | None = None,
+        allow_private_targets: bool = False,
     ) -> None:
         self._max_retries = max_retries
+        self._allow_private_targets = allow_private_targets
         self._base_delay_seconds = base_delay_seconds
         self._max_delay_seconds = max_delay_seconds
         self._max_records = max_records
         self._records: OrderedDict[str, WebhookDeliveryRecord] = OrderedDict()
         self._lock = threading.Lock()
+        self._store = store
+        self._dirty: set[str] = set()
+        self._purged: list[str] = []
+        self._ready_listeners: list[Callable[[str], None]] = []
+
+    @property
+    def store(self) -> WebhookDeliveryStore | None:
+        return self._store
+
+    @property
+    def allow_private_targets(self) -> bool:
+        return self._allow_private_targets
+
+    def add_ready_listener(self, listener: Callable[[str], None]) -> None:
+        """Call *listener(delivery_id)* whenever a delivery becomes ready to send."""
+        self._ready_listeners.append(listener)
+
+    def _notify_ready(self, delivery_id: str) -> None:
+        for listener in self._ready_listeners:
+            listener(delivery_id)
+
+    def _mark_dirty(self, delivery_id: str) -> None:
+        """Remember a changed record for the next flush (caller holds lock)."""
+        if self._store is not None:
+            self._dirty.add(delivery_id)
 
     # -- backoff calculation --------------------------------------------------
 
@@ -148,7 +238,11 @@ class WebhookDeliveryManager:
         payload: dict[str, Any],
         headers: dict[str, str] | None = None,
     ) -> str:
-        """Queue a webhook delivery and return its delivery_id."""
+        """Queue a webhook delivery and return its delivery_id.
+
+        Raises ``ValueError`` when *url* is rejected by :func:`validate_webhook_url`.
+        """
+        validate_webhook_url(url, allow_private=self._allow_private_targets)
         record = WebhookDeliveryRecord(
             webhook_id=webhook_id,
             url=url,
@@ -159,31 +253,46 @@ class WebhookDeliveryManager:
         with self._lock:
             self._evict_if_needed()
             self._records[record.delivery_id] = record
+            self._mark_dirty(record.delivery_id)
         logger.info(
             "Webhook delivery enqueued: delivery_id=%s webhook_id=%s url=%s",
             record.delivery_id,
             webhook_id,
             url,
         )
+        self._notify_ready(record.delivery_id)
         return record.delivery_id
 
-    # -- attempt delivery -----------------------------------------------------
+    def restore(self, records: list[WebhookDeliveryRecord]) -> None:
+        """Load records recovered from the store (no ready notifications)."""
+        with self._lock:
+            for record in records:
+                if record.status == WebhookDeliveryStatus.IN_FLIGHT:
+                    # The previous owner died mid-attempt; send it again.
+                    record.status = WebhookDeliveryStatus.PENDING
+                self._evict_if_needed()
+                self._records[record.delivery_id] = record
 
-    def attempt_delivery(self, delivery_id: str) -> DeliveryAttempt:
-        """Execute one delivery attempt (simulated -- real HTTP in production).
+    # -- attempt delivery -----------------------------------------------------
 
-        This method performs a simulated delivery for the in-memory-only
-        implementation.  Production integrations override or wrap this method
-        with real ``httpx`` calls.
-        """
+    def begin_attempt(self, delivery_id: str) -> WebhookDeliveryRecord:
+        """Mark a delivery in flight and return a snapshot for the sender."""
         with self._lock:
             record = self._records.get(delivery_id)
             if record is None:
                 raise KeyError(f"Delivery record not found: {delivery_id}")
             record.status = WebhookDeliveryStatus.IN_FLIGHT
-            attempt_number = record.current_retry + 1
+            return record.model_copy()
+
+    def attempt_delivery(self, delivery_id: str) -> DeliveryAttempt:
+        """Execute one simulated delivery attempt.
+
+        Kept for callers that drive attempts by hand; real HTTP delivery is
+        done by :class:`~agent33.automation.webhook_engine.WebhookDeliveryEngine`.
+        """
+        attempt_number = self.begin_attempt(delivery_id).current_retry + 1
 
-        # Simulate delivery -- actual HTTP call would go here
+        # Simulated delivery -- no request is sent
         start = time.monotonic()
         attempt = DeliveryAttempt(attempt_number=attempt_number)
         try:
@@ -202,8 +311,13 @@ class WebhookDeliveryManager:
 
     # -- process result -------------------------------------------------------
 
-    def process_result(self, delivery_id: str, attempt: DeliveryAttempt) -> None:
-        """Update delivery record based on an attempt result."""
+    def process_result(
+        self, delivery_id: str, attempt: DeliveryAttempt, *, final: bool = False
+    ) -> None:
+        """Update delivery record based on an attempt result.
+
+        A failed attempt marked *final* is dead-lettered without retries.
+        """
         with self._lock:
             record = self._records.get(delivery_id)
             if record is None:
@@ -211,6 +325,7 @@ class WebhookDeliveryManager:
 
             record.attempts.append(attempt)
             record.current_retry = attempt.attempt_number
+            self._mark_dirty(delivery_id)
 
             success = 200 <= attempt.status_code < 300
             webhook_id = record.webhook_id
@@ -224,7 +339,7 @@ class WebhookDeliveryManager:
                     attempt.attempt_number,
                     attempt.status_code,
                 )
-            elif record.current_retry >= record.max_retries:
+            elif final or record.current_retry >= record.max_retries:
                 record.status = WebhookDeliveryStatus.DEAD_LETTERED
                 record.next_retry_at = None
                 logger.warning(
@@ -364,7 +479,9 @@ class WebhookDeliveryManager:
             record.current_retry = 0
             record.attempts = []
             record.next_retry_at = None
+            self._mark_dirty(delivery_id)
             logger.info("Dead-lettered delivery re-enqueued: delivery_id=%s", delivery_id)
+        self._notify_ready(delivery_id)
 
     def purge_delivered(self, older_than_hours: float = 24.0) -> int:
         """Remove successfully delivered records older than the given threshold.
@@ -380,6 +497,9 @@ class WebhookDeliveryManager:
             ]
             for did in to_remove:
                 del self._records[did]
+                self._dirty.discard(did)
+            if self._store is not None:
+                self._purged.extend(to_remove)
 
         if to_remove:
             logger.info(
@@ -388,3 +508,36 @@ class WebhookDeliveryManager:
                 older_than_hours,
             )
         return len(to_remove)
+
+    # -- persistence ------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Write every record changed since the last flush in one batch.
+
+        Returns the number of records written.  Records that fail to write
+        stay dirty and are retried by the next flush.
+        """
+        if self._store is None:
+            return 0
+        with self._lock:
+            dirty = [self._records[d].model_copy() for d in self._dirty if d in self._records]
+            self._dirty.clear()
+            purged, self._purged = self._purged, []
+        try:
+            if dirty:
+                self._store.save_many(dirty)
+            if purged:
+                self._store.delete_many(purged)
+        except Exception:
+            logger.warning("Webhook delivery flush failed; will retry", exc_info=True)
+            with self._lock:
+                self._dirty.update(record.delivery_id for record in dirty)
+                self._purged.extend(purged)
+            return 0
+        return len(dirty)
+
+    def is_terminal(self, delivery_id: str) -> bool:
+        """Whether a delivery has finished (delivered or dead-lettered)."""
+        with self._lock:
+            record = self._records.get(delivery_id)
+            return record is None or record.status in _TERMINAL_STATUSES
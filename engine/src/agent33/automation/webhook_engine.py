@@ -0,0 +1,498 @@
+"""Asynchronous webhook delivery engine: HTTP workers, endpoint lanes, timer wheel.
+
+:class:`WebhookDeliveryEngine` sends the deliveries held by a
+:class:`~agent33.automation.webhook_delivery.WebhookDeliveryManager`:
+
+* **Workers** -- a fixed pool of asyncio tasks posts payloads through the
+  process-wide pooled ``httpx.AsyncClient`` for ``webhook:delivery`` (see
+  :mod:`agent33.connectors.http_pool`) inside the connector boundary, with one
+  boundary executor (and so one circuit breaker) per endpoint host.  Targets
+  that are or resolve to private, loopback or link-local addresses are
+  dead-lettered without a request.
+* **Endpoint lanes** -- deliveries are grouped by URL.  A lane admits at most
+  ``endpoint_concurrency`` in-flight requests, so one slow receiver cannot
+  occupy every worker.  With ``ordered=True`` a lane sends one delivery at a
+  time in enqueue order and a delivery waiting for its retry holds back the
+  ones behind it.
+* **Timer wheel** -- retries wait in a hashed timing wheel instead of being
+  found by scanning records: scheduling is O(1) and the wheel task sleeps
+  until the next occupied slot (or indefinitely when nothing waits).
+* **Batched receipts** -- results are applied to the manager in memory and a
+  flusher writes all changed records to the store in one transaction every
+  ``flush_interval_seconds``.  The same task refreshes this replica's lease on
+  its unfinished deliveries and adopts those of replicas that stopped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ipaddress
+import logging
+import math
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+from agent33.automation.webhook_delivery import (
+    DeliveryAttempt,
+    WebhookDeliveryStatus,
+    validate_webhook_url,
+)
+from agent33.connectors.boundary import build_connector_boundary_executor
+from agent33.connectors.http_pool import get_http_client_pool
+from agent33.connectors.models import ConnectorRequest
+from agent33.workflows.actions.http_request import is_blocked_address
+
+if TYPE_CHECKING:
+    from agent33.automation.webhook_delivery import WebhookDeliveryManager
+    from agent33.connectors.executor import ConnectorExecutor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MAX_RESPONSE_BODY = 1024
+_CONNECTOR = "webhook:delivery"
+
+
+class TimerWheel(Generic[T]):
+    """Hashed timing wheel holding items until their due time.
+
+    Time is divided into ``tick_seconds`` ticks mapped onto ``slots`` buckets;
+    an item due further out than one rotation carries a remaining-rounds
+    count.  :meth:`advance` moves the wheel to *now* and returns the items
+    that became due.
+    """
+
+    def __init__(self, *, tick_seconds: float = 0.05, slots: int = 512) -> None:
+        self._tick = tick_seconds
+        self._slots: list[list[tuple[int, T]]] = [[] for _ in range(slots)]
+        self._current = 0  # absolute index of the next tick to process
+        self._origin: float | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, item: T, due_at: float, now: float) -> None:
+        """Add *item* to fire at *due_at* (both on the caller's clock)."""
+        if self._origin is None:
+            self._origin = now
+            self._current = 0
+        target = max(self._current, math.ceil((due_at - self._origin) / self._tick))
+        slots = len(self._slots)
+        rounds = (target - self._current) // slots
+        self._slots[target % slots].append((rounds, item))
+        self._size += 1
+
+    def advance(self, now: float) -> list[T]:
+        """Process all ticks up to *now*; return the items that became due."""
+        if self._origin is None:
+            return []
+        due: list[T] = []
+        last = math.floor((now - self._origin) / self._tick)
+        slots = len(self._slots)
+        # Ticks without items cost nothing; skip whole empty rotations.
+        if last - self._current > slots and self._size == 0:
+            self._current = last + 1
+            return due
+        while self._current <= last and self._size:
+            bucket = self._slots[self._current % slots]
+            if bucket:
+                keep: list[tuple[int, T]] = []
+                for rounds, item in bucket:
+                    if rounds <= 0:
+                        due.append(item)
+                        self._size -= 1
+                    else:
+                        keep.append((rounds - 1, item))
+                bucket[:] = keep
+            self._current += 1
+        if not self._size:
+            self._current = max(self._current, last + 1)
+        return due
+
+    def next_due_in(self, now: float) -> float | None:
+        """Seconds until the next non-empty slot is reached (None if empty)."""
+        if not self._size or self._origin is None:
+            return None
+        slots = len(self._slots)
+        for offset in range(slots):
+            bucket = self._slots[(self._current + offset) % slots]
+            if any(rounds == 0 for rounds, _ in bucket):
+                due_at = self._origin + (self._current + offset) * self._tick
+                return max(0.0, due_at - now)
+        # Only items more than one rotation away: wake after a rotation.
+        return slots * self._tick
+
+
+@dataclass
+class _Lane:
+    """Deliveries for one endpoint."""
+
+    pending: deque[str] = field(default_factory=deque)
+    in_flight: int = 0
+    waiting: bool = False  # ordered lane holding its head back for a retry
+
+
+class WebhookDeliveryEngine:
+    """Delivers webhooks over HTTP with retries, lanes and batched receipts.
+
+    Parameters
+    ----------
+    manager:
+        Holds the records and the retry policy.
+    client:
+        HTTP client.  When omitted the engine uses the installed HTTP client
+        pool, or creates (and closes) its own client if no pool is installed.
+    workers:
+        Number of concurrent requests across all endpoints.
+    endpoint_concurrency:
+        Maximum in-flight requests per endpoint URL.
+    ordered:
+        Deliver each endpoint's webhooks one at a time in enqueue order.
+    timeout_seconds:
+        Per-request timeout.
+    flush_interval_seconds:
+        How often changed records are written to the manager's store.
+    lease_refresh_seconds:
+        How often this replica renews its lease on unfinished deliveries and
+        looks for deliveries left behind by stopped replicas.  Keep it well
+        below the store's lease.
+    """
+
+    def __init__(
+        self,
+        manager: WebhookDeliveryManager,
+        *,
+        client: httpx.AsyncClient | None = None,
+        workers: int = 16,
+        endpoint_concurrency: int = 4,
+        ordered: bool = False,
+        timeout_seconds: float = 10.0,
+        flush_interval_seconds: float = 0.5,
+        lease_refresh_seconds: float = 20.0,
+        tick_seconds: float = 0.05,
+    ) -> None:
+        self._manager = manager
+        self._client = client
+        self._owns_client = False
+        self._workers = max(1, workers)
+        self._endpoint_concurrency = 1 if ordered else max(1, endpoint_concurrency)
+        self._ordered = ordered
+        self._timeout = timeout_seconds
+        self._flush_interval = flush_interval_seconds
+        self._lease_refresh = lease_refresh_seconds
+        self._wheel: TimerWheel[str] = TimerWheel(tick_seconds=tick_seconds)
+        self._wheel_changed = asyncio.Event()
+        self._lanes: dict[str, _Lane] = {}
+        self._lane_of: dict[str, str] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._boundaries: dict[str, ConnectorExecutor | None] = {}
+        self.sent = 0
+        manager.add_ready_listener(self._on_ready_threadsafe)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    # -- lifecycle ------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Recover stored deliveries and start workers, timer and flusher."""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        if self._client is None and get_http_client_pool() is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=self._workers),
+                follow_redirects=False,
+            )
+            self._owns_client = True
+        await self._recover()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-worker-{i}")
+            for i in range(self._workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._timer(), name="webhook-timer"))
+        if self._manager.store is not None:
+            self._tasks.append(asyncio.create_task(self._flusher(), name="webhook-flusher"))
+        logger.info(
+            "webhook_delivery_engine_started workers=%d endpoint_concurrency=%d ordered=%s",
+            self._workers,
+            self._endpoint_concurrency,
+            self._ordered,
+        )
+
+    async def stop(self) -> None:
+        """Stop sending and write outstanding receipts."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        if self._manager.store is not None:
+            await asyncio.to_thread(self._manager.flush)
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._owns_client = False
+
+    async def wait_idle(self, timeout: float | None = None) -> None:
+        """Wait until no delivery is queued, in flight or waiting for a retry."""
+
+        async def _idle() -> None:
+            while self._lane_of:
+                await asyncio.sleep(0.005)
+
+        await asyncio.wait_for(_idle(), timeout)
+
+    # -- scheduling -----------------------------------------------------------
+
+    def _on_ready_threadsafe(self, delivery_id: str) -> None:
+        loop = self._loop
+        if loop is None:
+            return  # picked up by recovery when the engine starts
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._admit(delivery_id)
+        else:
+            loop.call_soon_threadsafe(self._admit, delivery_id)
+
+    def _admit(self, delivery_id: str) -> None:
+        """Append a ready delivery to its endpoint lane."""
+        record = self._manager.get_delivery(delivery_id)
+        if record is None:
+            return
+        lane_key = record.url
+        self._lane_of[delivery_id] = lane_key
+        self._lanes.setdefault(lane_key, _Lane()).pending.append(delivery_id)
+        self._pump(lane_key)
+
+    def _pump(self, lane_key: str) -> None:
+        lane = self._lanes.get(lane_key)
+        if lane is None:
+            return
+        while lane.pending and not lane.waiting and lane.in_flight < self._endpoint_concurrency:
+            lane.in_flight += 1
+            self._ready.put_nowait(lane.pending.popleft())
+        if not lane.pending and not lane.in_flight and not lane.waiting:
+            del self._lanes[lane_key]
+
+    def _schedule_retry(self, delivery_id: str, due_at: float) -> None:
+        self._wheel.schedule(delivery_id, due_at, time.time())
+        self._wheel_changed.set()
+
+    async def _recover(self) -> None:
+        store = self._manager.store
+        if store is None:
+            return
+        records = await asyncio.to_thread(store.claim_unfinished)
+        dead = await asyncio.to_thread(store.load_dead_letters, 1000)
+        self._manager.restore([*dead, *records])
+        now = time.time()
+        for record in records:
+            if record.next_retry_at is not None and record.next_retry_at > now:
+                self._lane_of[record.delivery_id] = record.url
+                if self._ordered:
+                    lane = self._lanes.setdefault(record.url, _Lane())
+                    lane.pending.append(record.delivery_id)
+                    lane.waiting = True
+                self._schedule_retry(record.delivery_id, record.next_retry_at)
+            else:
+                self._admit(record.delivery_id)
+        if records:
+            logger.info("webhook_deliveries_recovered count=%d", len(records))
+
+    # -- tasks ----------------------------------------------------------------
+
+    async def _timer(self) -> None:
+        while True:
+            delay = self._wheel.next_due_in(time.time())
+            self._wheel_changed.clear()
+            if delay is None:
+                await self._wheel_changed.wait()
+                continue
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wheel_changed.wait(), timeout=delay)
+            for delivery_id in self._wheel.advance(time.time()):
+                self._retry_due(delivery_id)
+
+    def _retry_due(self, delivery_id: str) -> None:
+        lane_key = self._lane_of.get(delivery_id)
+        if lane_key is None:
+            return
+        if self._ordered:
+            lane = self._lanes.setdefault(lane_key, _Lane())
+            lane.waiting = False
+            self._pump(lane_key)
+        else:
+            self._lanes.setdefault(lane_key, _Lane()).pending.append(delivery_id)
+            self._pump(lane_key)
+
+    async def _worker(self) -> None:
+        while True:
+            delivery_id = await self._ready.get()
+            try:
+                await self._deliver(delivery_id)
+            except Exception:
+                logger.error("webhook_delivery_worker_failed id=%s", delivery_id, exc_info=True)
+                self._finish(delivery_id)
+
+    async def _flusher(self) -> None:
+        store = self._manager.store
+        assert store is not None
+        next_refresh = time.monotonic() + self._lease_refresh
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await asyncio.to_thread(self._manager.flush)
+                if time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + self._lease_refresh
+                    await asyncio.to_thread(store.touch)
+                    await self._adopt_orphans()
+            except Exception:
+                logger.warning("webhook_delivery_flush_loop_failed", exc_info=True)
+
+    async def _adopt_orphans(self) -> None:
+        """Take over unfinished deliveries of replicas whose lease ran out."""
+        store = self._manager.store
+        assert store is not None
+        claimed = await asyncio.to_thread(store.claim_unfinished)
+        # Records this replica already holds may be newer in memory than in
+        # the store; only records it has never seen are adopted.
+        orphans = [r for r in claimed if self._manager.get_delivery(r.delivery_id) is None]
+        if not orphans:
+            return
+        self._manager.restore(orphans)
+        for record in orphans:
+            self._admit(record.delivery_id)
+        logger.info("webhook_deliveries_adopted count=%d", len(orphans))
+
+    # -- delivery -------------------------------------------------------------
+
+    async def _deliver(self, delivery_id: str) -> None:
+        try:
+            record = self._manager.begin_attempt(delivery_id)
+        except KeyError:
+            self._finish(delivery_id)
+            return
+        blocked = await self._blocked_reason(record.url)
+        if blocked is not None:
+            attempt = DeliveryAttempt(attempt_number=0, error_message=blocked)
+        else:
+            attempt = await self._post(record.url, record.payload, record.headers)
+        attempt.attempt_number = record.current_retry + 1
+        self._manager.process_result(delivery_id, attempt, final=blocked is not None)
+        self.sent += 1
+
+        updated = self._manager.get_delivery(delivery_id)
+        lane_key = self._lane_of.get(delivery_id, record.url)
+        lane = self._lanes.setdefault(lane_key, _Lane())
+        if updated is not None and updated.status == WebhookDeliveryStatus.RETRYING:
+            lane.in_flight -= 1
+            if self._ordered:
+                lane.pending.appendleft(delivery_id)
+                lane.waiting = True
+            self._schedule_retry(delivery_id, updated.next_retry_at or time.time())
+            self._pump(lane_key)
+            return
+        self._finish(delivery_id)
+
+    def _finish(self, delivery_id: str) -> None:
+        lane_key = self._lane_of.pop(delivery_id, None)
+        if lane_key is None:
+            return
+        lane = self._lanes.get(lane_key)
+        if lane is not None:
+            lane.in_flight -= 1
+            self._pump(lane_key)
+
+    async def _blocked_reason(self, url: str) -> str | None:
+        """Re-check the target before each attempt, including what it resolves to."""
+        allow_private = self._manager.allow_private_targets
+        try:
+            validate_webhook_url(url, allow_private=allow_private)
+        except ValueError as exc:
+            return str(exc)
+        if allow_private:
+            return None
+        parsed = urlparse(url)
+        host = parsed.hostname or ""
+        assert self._loop is not None
+        try:
+            infos = await self._loop.getaddrinfo(host, parsed.port or 0, type=socket.SOCK_STREAM)
+        except OSError:
+            return None  # unresolvable: the request itself fails and is retried
+        for info in infos:
+            addr = ipaddress.ip_address(str(info[4][0]).split("%", 1)[0])
+            if is_blocked_address(addr):
+                return (
+                    "SSRF protection: webhook host resolves to a private/reserved "
+                    f"address ({host} -> {addr})"
+                )
+        return None
+
+    def _boundary(self, url: str) -> ConnectorExecutor | None:
+        # One executor per host so a failing receiver opens only its own breaker.
+        host = urlparse(url).netloc
+        if host not in self._boundaries:
+            self._boundaries[host] = build_connector_boundary_executor(
+                default_timeout_seconds=self._timeout, retry_attempts=1
+            )
+        return self._boundaries[host]
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is not None:
+            return self._client
+        pool = get_http_client_pool()
+        if pool is None or pool.closed:
+            raise RuntimeError("No HTTP client available for webhook delivery")
+        return pool.client(_CONNECTOR)
+
+    async def _post(
+        self, url: str, payload: dict[str, Any], headers: dict[str, str]
+    ) -> DeliveryAttempt:
+        attempt = DeliveryAttempt(attempt_number=0)
+
+        async def _send(_request: ConnectorRequest) -> httpx.Response:
+            return await self._http_client().post(
+                url,
+                json=payload,
+                headers=headers,
+                timeout=self._timeout,
+                follow_redirects=False,
+            )
+
+        start = time.monotonic()
+        try:
+            boundary = self._boundary(url)
+            if boundary is None:
+                response = await _send(ConnectorRequest(connector=_CONNECTOR, operation="POST"))
+            else:
+                request = ConnectorRequest(
+                    connector=_CONNECTOR,
+                    operation="POST",
+                    payload={"url": url},
+                    metadata={"timeout_seconds": self._timeout},
+                )
+                response = await boundary.execute(request, _send)
+            attempt.status_code = response.status_code
+            attempt.response_body = response.text[:_MAX_RESPONSE_BODY]
+        except Exception as exc:
+            attempt.error_message = f"{type(exc).__name__}: {exc}"
+        attempt.duration_ms = (time.monotonic() - start) * 1000.0
+        return attempt
@@ -73,6 +73,9 @@ class AutonomyService:
         self._escalations: dict[str, EscalationRecord] = {}
         self._checker = PreflightChecker()
         self._load_state()
+        if state_store is not None:
+            # Pick up budgets and escalations changed on other replicas.
+            state_store.add_listener("autonomy", self._load_state)
 
     def _persist_state(self) -> None:
         if self._state_store is None:
@@ -99,13 +102,16 @@ class AutonomyService:
         if self._state_store is None:
             return
         payload = self._state_store.read_namespace("autonomy")
+        budgets: dict[str, AutonomyBudget] = {}
+        enforcers: dict[str, RuntimeEnforcer] = {}
+        escalations: dict[str, EscalationRecord] = {}
         budgets_payload = payload.get("budgets", {})
         if isinstance(budgets_payload, dict):
             for budget_id, budget_data in budgets_payload.items():
                 if not isinstance(budget_id, str):
                     continue
                 try:
-                    self._budgets[budget_id] = AutonomyBudget.model_validate(budget_data)
+                    budgets[budget_id] = AutonomyBudget.model_validate(budget_data)
                 except ValidationError:
                     logger.warning("autonomy_budget_restore_failed id=%s", budget_id)
 
@@ -115,16 +121,14 @@ class AutonomyService:
                 if not isinstance(escalation_id, str):
                     continue
                 try:
-                    self._escalations[escalation_id] = EscalationRecord.model_validate(
-                        escalation_data
-                    )
+                    escalations[escalation_id] = EscalationRecord.model_validate(escalation_data)
                 except ValidationError:
                     logger.warning("autonomy_escalation_restore_failed id=%s", escalation_id)
 
         enforcers_payload = payload.get("enforcers", {})
         if isinstance(enforcers_payload, dict):
             for budget_id, enforcer_data in enforcers_payload.items():
-                budget = self._budgets.get(budget_id)
+                budget = budgets.get(budget_id)
                 if budget is None or not isinstance(enforcer_data, dict):
                     continue
                 enforcer = RuntimeEnforcer(budget)
@@ -136,7 +140,9 @@ class AutonomyService:
                 except ValidationError:
                     logger.warning("autonomy_enforcer_restore_failed budget_id=%s", budget_id)
                     continue
-                self._enforcers[budget_id] = enforcer
+                enforcers[budget_id] = enforcer
+        # Swap whole dicts: reloads run on the state backend's notification thread.
+        self._budgets, self._enforcers, self._escalations = budgets, enforcers, escalations
 
     # ------------------------------------------------------------------
     # Budget CRUD
@@ -2,12 +2,53 @@
 
 from __future__ import annotations
 
+import gzip
+import os
 import tarfile
+from contextlib import contextmanager
 from datetime import datetime  # noqa: TC003
+from importlib.util import find_spec
 from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 MANIFEST_FILENAME = "manifest.json"
 
+# Archive suffix per compression codec. ``gzip`` is always available; ``zstd``
+# needs the optional ``zstandard`` package (``pip install agent33[backup]``).
+ARCHIVE_SUFFIXES = {"gzip": ".tar.gz", "zstd": ".tar.zst"}
+_DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def zstd_available() -> bool:
+    """Return True when the optional ``zstandard`` package is importable."""
+    return find_spec("zstandard") is not None
+
+
+def resolve_compression_level(compression: str, level: int = 0) -> int:
+    """Return *level* for *compression*, or the codec default when it is ``0``."""
+    return level or _DEFAULT_LEVELS[compression]
+
+
+def resolve_compression(requested: str) -> str:
+    """Return the codec to use for *requested*, falling back to gzip."""
+    normalized = requested.strip().lower()
+    if normalized == "zstd" and zstd_available():
+        return "zstd"
+    return "gzip"
+
+
+def archive_compression(path: Path) -> str:
+    """Return the codec implied by an archive file name."""
+    return "zstd" if path.name.endswith(ARCHIVE_SUFFIXES["zstd"]) else "gzip"
+
+
+def is_archive_path(path: Path) -> bool:
+    """Return True when *path* looks like a backup archive."""
+    return any(path.name.endswith(suffix) for suffix in ARCHIVE_SUFFIXES.values())
+
 
 def build_archive_stem(created_at: datetime, mode: str, short_id: str) -> str:
     """Return the lexical archive stem for a backup."""
@@ -23,6 +64,70 @@ def write_tar_gz(source_dir: Path, destination: Path) -> None:
     tmp_path.replace(destination)
 
 
+@contextmanager
+def open_archive_writer(
+    destination: Path,
+    *,
+    compression: str = "gzip",
+    level: int = 0,
+    threads: int = 0,
+) -> Iterator[tarfile.TarFile]:
+    """Yield a streaming tar writer that replaces *destination* atomically on success.
+
+    Members are compressed as they are added, so callers can tar straight from
+    their sources without staging a copy. ``level`` ``0`` picks the codec
+    default; ``threads`` only applies to zstd (``0`` uses every core).
+    """
+    level = resolve_compression_level(compression, level)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(f"{destination.name}.tmp")
+    try:
+        with tmp_path.open("wb") as raw:
+            if compression == "zstd":
+                import zstandard
+
+                compressor = zstandard.ZstdCompressor(
+                    level=level, threads=threads if threads > 0 else -1
+                )
+                with (
+                    compressor.stream_writer(raw, closefd=False) as zstd_writer,
+                    tarfile.open(
+                        fileobj=zstd_writer, mode="w|", format=tarfile.PAX_FORMAT
+                    ) as archive,
+                ):
+                    yield archive
+            else:
+                with (
+                    gzip.GzipFile(
+                        fileobj=raw, mode="wb", compresslevel=level, mtime=0
+                    ) as gzip_writer,
+                    tarfile.open(
+                        fileobj=gzip_writer, mode="w|", format=tarfile.PAX_FORMAT
+                    ) as archive,
+                ):
+                    yield archive
+            raw.flush()
+            os.fsync(raw.fileno())
+        tmp_path.replace(destination)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+@contextmanager
+def open_archive_reader(path: Path) -> Iterator[tarfile.TarFile]:
+    """Yield a forward-only tar reader for *path* that never seeks or extracts to disk."""
+    with path.open("rb") as raw:
+        if archive_compression(path) == "zstd":
+            import zstandard
+
+            reader: Any = zstandard.ZstdDecompressor().stream_reader(raw)
+            with reader, tarfile.open(fileobj=reader, mode="r|") as archive:
+                yield archive
+        else:
+            with tarfile.open(fileobj=raw, mode="r|gz") as archive:
+                yield archive
+
+
 def is_safe_archive_member(name: str) -> bool:
     """Return True when a tar member path is safe to inspect."""
     path = PurePosixPath(name)
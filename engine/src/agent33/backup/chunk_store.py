@@ -0,0 +1,172 @@
+"""Content-addressed object store backing incremental platform backups.
+
+Every backed-up file is stored once under its SHA-256 digest, compressed on
+its own. An incremental backup archive then only carries the manifest and a
+path -> digest index; files whose digest is already in the store are not
+read, compressed, or written again.
+
+Objects are hashed while they are written and stored under the digest of the
+bytes actually written, so a file that changed after it was inventoried can
+never leave wrong content under its old digest.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Protocol
+from uuid import uuid4
+
+from agent33.backup.archive import resolve_compression_level
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+_READ_CHUNK = 1024 * 1024
+_OBJECT_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class _Readable(Protocol):
+    def read(self, size: int = ..., /) -> bytes: ...
+
+
+class _HashingReader:
+    """Wrap a binary reader, hashing every byte read through it."""
+
+    def __init__(self, handle: _Readable) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1, /) -> bytes:
+        chunk = self._handle.read(size)
+        self.digest.update(chunk)
+        return chunk
+
+
+def hash_stream(handle: _Readable) -> str:
+    """Return the SHA-256 hex digest of *handle*, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: handle.read(_READ_CHUNK), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChunkStore:
+    """Append-only directory of compressed, content-addressed file objects.
+
+    Objects live at ``<root>/<digest[:2]>/<digest><suffix>`` where the suffix
+    names the codec, so a store can hold objects written with either codec.
+    New objects are compressed on a thread pool; both zlib and zstd release
+    the GIL, so compression scales across cores.
+    """
+
+    def __init__(
+        self, root: Path, *, compression: str = "gzip", level: int = 0, workers: int = 0
+    ) -> None:
+        self._root = root
+        self._compression = compression
+        self._level = resolve_compression_level(compression, level)
+        self._workers = workers if workers > 0 else (os.cpu_count() or 1)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _object_path(self, digest: str, compression: str) -> Path:
+        return self._root / digest[:2] / f"{digest}{_OBJECT_SUFFIXES[compression]}"
+
+    def find(self, digest: str) -> Path | None:
+        """Return the stored object path for *digest*, if any."""
+        for compression in _OBJECT_SUFFIXES:
+            path = self._object_path(digest, compression)
+            if path.is_file():
+                return path
+        return None
+
+    def has(self, digest: str) -> bool:
+        return self.find(digest) is not None
+
+    def put_files(self, files: Iterable[tuple[str, Path]]) -> tuple[int, dict[Path, str]]:
+        """Store each ``(digest, source)`` whose digest is not already present.
+
+        Returns the number of objects written and ``{source: stored digest}``
+        for sources whose content no longer matched the given digest.
+        """
+        entries = list(files)
+        written = 0
+        changed: dict[Path, str] = {}
+        # A source that changed leaves its old digest without an object, so
+        # other sources expected to share that digest are written next round.
+        while True:
+            pending: dict[str, Path] = {}
+            for digest, source in entries:
+                if source not in changed and digest not in pending and not self.has(digest):
+                    pending[digest] = source
+            if not pending:
+                return written, changed
+            with ThreadPoolExecutor(max_workers=min(self._workers, len(pending))) as pool:
+                # list() surfaces the first worker exception, if any.
+                results = list(pool.map(self._write_object, pending.values()))
+            for (digest, source), (actual, stored) in zip(pending.items(), results, strict=True):
+                written += stored
+                if actual != digest:
+                    changed[source] = actual
+
+    def _write_object(self, source: Path) -> tuple[str, bool]:
+        """Compress *source* into the store; returns its digest and whether it was new."""
+        self._root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._root / f".{uuid4().hex}.tmp"
+        try:
+            with source.open("rb") as src, tmp_path.open("wb") as raw:
+                reader = _HashingReader(src)
+                if self._compression == "zstd":
+                    import zstandard
+
+                    compressor = zstandard.ZstdCompressor(level=self._level)
+                    with compressor.stream_writer(raw, closefd=False) as writer:
+                        shutil.copyfileobj(reader, writer, _READ_CHUNK)
+                else:
+                    with gzip.GzipFile(
+                        fileobj=raw, mode="wb", compresslevel=self._level, mtime=0
+                    ) as gz:
+                        shutil.copyfileobj(reader, gz, _READ_CHUNK)
+            digest = reader.digest.hexdigest()
+            if self.has(digest):
+                return digest, False
+            target = self._object_path(digest, self._compression)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.replace(target)
+            return digest, True
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def hash_object(self, digest: str) -> str | None:
+        """Stream-decompress the object for *digest* and return its actual digest."""
+        path = self.find(digest)
+        if path is None:
+            return None
+        with path.open("rb") as raw:
+            if path.suffix == _OBJECT_SUFFIXES["zstd"]:
+                import zstandard
+
+                reader: Any = zstandard.ZstdDecompressor().stream_reader(raw)
+                with reader:
+                    return hash_stream(reader)
+            with gzip.GzipFile(fileobj=raw, mode="rb") as gz:
+                return hash_stream(gz)
+
+    def prune(self, referenced: set[str]) -> int:
+        """Delete objects whose digest is not in *referenced*. Returns objects removed."""
+        removed = 0
+        if not self._root.is_dir():
+            return removed
+        for path in self._root.glob("*/*"):
+            digest = path.name.split(".", 1)[0]
+            if path.is_file() and digest not in referenced and not path.name.startswith("."):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
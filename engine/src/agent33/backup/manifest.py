@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 from enum import StrEnum
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -43,6 +43,11 @@ class BackupManifest(BaseModel):
     assets: list[BackupAsset] = Field(default_factory=list)
     checksums: dict[str, str] = Field(default_factory=dict)
     metadata: dict[str, Any] = Field(default_factory=dict)
+    # "archive" backups carry file contents in the tarball. "chunked"
+    # (incremental) backups carry only this manifest; ``file_index`` maps each
+    # archive-relative file path to its object digest in the chunk store.
+    storage: Literal["archive", "chunked"] = "archive"
+    file_index: dict[str, str] = Field(default_factory=dict)
 
 
 class BackupProvenance(BaseModel):
@@ -81,6 +86,7 @@ class BackupSummary(BaseModel):
     label: str = ""
     size_bytes: int = 0
     asset_count: int = 0
+    incremental: bool = False
     warnings: list[str] = Field(default_factory=list)
 
 
@@ -117,6 +123,10 @@ class BackupResult(BaseModel):
     manifest: BackupManifest | None = None
     size_bytes: int = 0
     asset_count: int = 0
+    incremental: bool = False
+    files_written: int = 0  # files compressed and written by this run
+    files_reused: int = 0  # files already present in the chunk store
+    duration_ms: float = 0.0
     errors: list[str] = Field(default_factory=list)
     warnings: list[str] = Field(default_factory=list)
     provenance: BackupProvenance | None = None
@@ -2,18 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import io
 import json
 import platform
-import shutil
 import tarfile
-import tempfile
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path, PurePosixPath
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from agent33.backup.archive import MANIFEST_FILENAME, build_archive_stem, is_safe_archive_member
+from agent33.backup.archive import (
+    ARCHIVE_SUFFIXES,
+    MANIFEST_FILENAME,
+    build_archive_stem,
+    is_archive_path,
+    is_safe_archive_member,
+    open_archive_reader,
+    open_archive_writer,
+    resolve_compression,
+)
+from agent33.backup.chunk_store import ChunkStore, hash_stream
 from agent33.backup.manifest import (
     BackupAsset,
     BackupDetailResponse,
@@ -32,7 +45,10 @@ from agent33.state_paths import RuntimeStatePaths
 if TYPE_CHECKING:
     from agent33.config import Settings
 
-SUPPORTED_SCHEMA_VERSIONS = frozenset({"1.0"})
+SUPPORTED_SCHEMA_VERSIONS = frozenset({"1.0", "1.1"})
+# Incremental (chunk-store backed) manifests bump the schema so older
+# runtimes refuse them instead of reporting every asset missing.
+CHUNKED_SCHEMA_VERSION = "1.1"
 
 
 class BackupError(RuntimeError):
@@ -48,6 +64,24 @@ class _AssetCandidate:
     missing_reason: str = "Asset source not found"
 
 
+@dataclass(frozen=True)
+class _FileEntry:
+    """One regular file of an included asset, hashed during inventory."""
+
+    relative_path: str  # archive-relative, e.g. ``config/skills/skill.md``
+    source: Path
+    digest: str
+
+
+@dataclass
+class _ArchiveScan:
+    """Everything ``verify`` needs from one forward pass over an archive."""
+
+    member_names: list[str] = field(default_factory=list)
+    file_digests: dict[str, str] = field(default_factory=dict)
+    manifest_payload: bytes | None = None
+
+
 class BackupService:
     """Creates and verifies platform-level backups."""
 
@@ -59,6 +93,7 @@ class BackupService:
         app_root: Path,
         workspace_dir: Path | None = None,
         state_paths: RuntimeStatePaths | None = None,
+        chunk_store_dir: Path | None = None,
     ) -> None:
         self._state_paths = state_paths or RuntimeStatePaths.from_app_root(app_root)
         self._backup_dir = self._state_paths.ensure_approved(backup_dir)
@@ -66,6 +101,16 @@ class BackupService:
         self._app_root = app_root.resolve()
         self._workspace_dir = workspace_dir
         self._backup_dir.mkdir(parents=True, exist_ok=True)
+        self._compression = resolve_compression(settings.backup_compression)
+        self._chunk_store = ChunkStore(
+            chunk_store_dir or self._backup_dir / "chunks",
+            compression=self._compression,
+            level=settings.backup_compression_level,
+            workers=settings.backup_compression_threads,
+        )
+        # Serializes chunk-store writes with pruning: a backup's objects must
+        # not be pruned before the archive that references them exists.
+        self._chunk_lock = threading.Lock()
 
     @property
     def runtime_version(self) -> str:
@@ -74,22 +119,28 @@ class BackupService:
 
     def inventory(self, *, mode: BackupMode = BackupMode.FULL) -> BackupInventoryResponse:
         """Preview the assets that would be included in a backup."""
-        normalized_mode = BackupMode(mode)
+        inventory, _ = self._collect(BackupMode(mode))
+        return inventory
+
+    def _collect(self, mode: BackupMode) -> tuple[BackupInventoryResponse, list[_FileEntry]]:
+        """Build the inventory and hash every included file exactly once."""
         warnings: list[str] = []
         assets: list[BackupAsset] = []
+        files: list[_FileEntry] = []
 
         for candidate in self._asset_candidates():
-            asset = self._materialize_asset(candidate, normalized_mode)
+            asset = self._materialize_asset(candidate, mode, files)
             if asset.exclusion_reason:
                 warnings.append(f"{asset.relative_path}: {asset.exclusion_reason}")
             assets.append(asset)
 
-        return BackupInventoryResponse(
-            mode=normalized_mode,
+        inventory = BackupInventoryResponse(
+            mode=mode,
             assets=assets,
             count=len(assets),
             warnings=warnings,
         )
+        return inventory, files
 
     async def create(
         self,
@@ -97,10 +148,17 @@ class BackupService:
         mode: BackupMode = BackupMode.FULL,
         label: str = "",
         creator: str = "",
+        incremental: bool = False,
     ) -> BackupResult:
-        """Create a new platform backup archive and verify it."""
+        """Create a new platform backup archive and verify it.
+
+        Full backups stream every included file straight into the compressed
+        archive. Incremental backups write only files whose content is not
+        already in the chunk store and archive just the manifest.
+        """
+        started = time.perf_counter()
         normalized_mode = BackupMode(mode)
-        inventory = self.inventory(mode=normalized_mode)
+        inventory, files = await asyncio.to_thread(self._collect, normalized_mode)
         created_at = BackupProvenance().created_at
         short_id = uuid4().hex[:6]
         backup_id = f"{created_at.strftime('%Y%m%d-%H%M%S')}-{short_id}"
@@ -120,32 +178,28 @@ class BackupService:
             },
             metadata={"label": label},
         )
-        archive_path = self._backup_dir / f"{archive_stem}.tar.gz"
-
-        with tempfile.TemporaryDirectory(dir=str(self._backup_dir)) as tmp_dir:
-            staging_root = Path(tmp_dir) / archive_stem
-            staging_root.mkdir(parents=True, exist_ok=True)
-            for asset in inventory.assets:
-                if not asset.included:
-                    continue
-                source = Path(asset.source_path)
-                target = staging_root / PurePosixPath(asset.relative_path)
-                target.parent.mkdir(parents=True, exist_ok=True)
-                if source.is_dir():
-                    shutil.copytree(source, target)
-                else:
-                    shutil.copy2(source, target)
-
-            (staging_root / MANIFEST_FILENAME).write_text(
-                json.dumps(manifest.model_dump(mode="json"), indent=2, sort_keys=True),
-                encoding="utf-8",
+        if incremental:
+            manifest.schema_version = CHUNKED_SCHEMA_VERSION
+            manifest.storage = "chunked"
+            manifest.file_index = {entry.relative_path: entry.digest for entry in files}
+        archive_path = self._backup_dir / f"{archive_stem}{ARCHIVE_SUFFIXES[self._compression]}"
+
+        files_written, changed = await asyncio.to_thread(
+            self._write_backup, archive_path, archive_stem, manifest, files
+        )
+        warnings = list(inventory.warnings)
+        if changed:
+            warnings.append(
+                f"{len(changed)} file(s) changed while the backup ran; "
+                f"their current content was stored: {', '.join(changed)}"
             )
-            from agent33.backup.archive import write_tar_gz
-
-            write_tar_gz(staging_root, archive_path)
 
         verify_result = await self.verify(archive_path)
         errors = [check.message for check in verify_result.checks if not check.passed]
+        if verify_result.valid:
+            removed = await asyncio.to_thread(self.apply_retention)
+            if removed:
+                warnings.append(f"Retention removed {removed} older backup(s)")
         return BackupResult(
             success=verify_result.valid,
             backup_id=backup_id,
@@ -153,8 +207,14 @@ class BackupService:
             manifest=manifest,
             size_bytes=archive_path.stat().st_size if archive_path.exists() else 0,
             asset_count=sum(1 for asset in inventory.assets if asset.included),
+            incremental=incremental,
+            files_written=files_written,
+            files_reused=len(set(manifest.file_index.values())) - files_written
+            if incremental
+            else 0,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
             errors=errors,
-            warnings=inventory.warnings + verify_result.warnings,
+            warnings=warnings + verify_result.warnings,
             provenance=BackupProvenance(
                 creator=creator or label,
                 source_roots=[
@@ -167,8 +227,77 @@ class BackupService:
             ),
         )
 
+    def _write_backup(
+        self,
+        archive_path: Path,
+        archive_stem: str,
+        manifest: BackupManifest,
+        files: list[_FileEntry],
+    ) -> tuple[int, list[str]]:
+        """Write the archive (and chunk objects when incremental).
+
+        Returns the files written and the paths of files whose content changed
+        since the inventory hashed them (incremental only).
+        """
+        with self._chunk_lock:
+            return self._write_backup_locked(archive_path, archive_stem, manifest, files)
+
+    def _write_backup_locked(
+        self,
+        archive_path: Path,
+        archive_stem: str,
+        manifest: BackupManifest,
+        files: list[_FileEntry],
+    ) -> tuple[int, list[str]]:
+        changed_paths: list[str] = []
+        if manifest.storage == "chunked":
+            # Objects first: an archive must never reference missing objects.
+            written, changed = self._chunk_store.put_files(
+                (entry.digest, entry.source) for entry in files
+            )
+            if changed:
+                changed_paths = _record_stored_digests(manifest, files, changed)
+        else:
+            written = len(files)
+
+        with open_archive_writer(
+            archive_path,
+            compression=self._compression,
+            level=self._settings.backup_compression_level,
+            threads=self._settings.backup_compression_threads,
+        ) as archive:
+            # The manifest goes first so listing backups can stop reading early.
+            payload = json.dumps(
+                manifest.model_dump(mode="json"), indent=2, sort_keys=True
+            ).encode("utf-8")
+            info = tarfile.TarInfo(f"{archive_stem}/{MANIFEST_FILENAME}")
+            info.size = len(payload)
+            info.mtime = int(manifest.created_at.timestamp())
+            info.mode = 0o644
+            archive.addfile(info, io.BytesIO(payload))
+            if manifest.storage == "chunked":
+                return written, changed_paths
+
+            for asset in manifest.assets:
+                if asset.included and asset.is_directory:
+                    archive.add(
+                        asset.source_path,
+                        arcname=f"{archive_stem}/{asset.relative_path}",
+                        recursive=False,
+                    )
+            for entry in files:
+                archive.add(entry.source, arcname=f"{archive_stem}/{entry.relative_path}")
+        return written, changed_paths
+
     async def verify(self, archive_path: Path) -> VerifyResult:
-        """Verify a backup archive."""
+        """Verify a backup archive.
+
+        The archive is read in one forward pass, hashing file members as they
+        stream by; nothing is extracted to disk or buffered whole in memory.
+        """
+        return await asyncio.to_thread(self._verify, archive_path)
+
+    def _verify(self, archive_path: Path) -> VerifyResult:
         checks: list[VerifyCheck] = []
         warnings: list[str] = []
 
@@ -186,132 +315,92 @@ class BackupService:
             )
 
         try:
-            with tarfile.open(archive_path, "r:gz") as archive:
-                members = archive.getmembers()
-                checks.append(
-                    VerifyCheck(
-                        name="archive_readable",
-                        passed=True,
-                        message="Archive is readable",
-                    )
+            scan = _scan_archive(archive_path)
+            names = scan.member_names
+            checks.append(
+                VerifyCheck(
+                    name="archive_readable",
+                    passed=True,
+                    message="Archive is readable",
                 )
-                safe_paths = all(is_safe_archive_member(member.name) for member in members)
-                checks.append(
-                    VerifyCheck(
-                        name="archive_member_paths",
-                        passed=safe_paths,
-                        message=(
-                            "Archive members are contained"
-                            if safe_paths
-                            else "Archive contains unsafe member paths"
-                        ),
-                    )
+            )
+            safe_paths = all(is_safe_archive_member(name) for name in names)
+            checks.append(
+                VerifyCheck(
+                    name="archive_member_paths",
+                    passed=safe_paths,
+                    message=(
+                        "Archive members are contained"
+                        if safe_paths
+                        else "Archive contains unsafe member paths"
+                    ),
                 )
-                if not safe_paths:
-                    return VerifyResult(valid=False, checks=checks, warnings=warnings)
-
-                top_levels = {
-                    PurePosixPath(member.name).parts[0] for member in members if member.name
-                }
-                single_root = len(top_levels) == 1
-                checks.append(
-                    VerifyCheck(
-                        name="single_archive_root",
-                        passed=single_root,
-                        message=(
-                            "Archive uses a single top-level root"
-                            if single_root
-                            else "Archive contains multiple top-level roots"
-                        ),
-                    )
+            )
+            if not safe_paths:
+                return VerifyResult(valid=False, checks=checks, warnings=warnings)
+
+            top_levels = {PurePosixPath(name).parts[0] for name in names if name}
+            single_root = len(top_levels) == 1
+            checks.append(
+                VerifyCheck(
+                    name="single_archive_root",
+                    passed=single_root,
+                    message=(
+                        "Archive uses a single top-level root"
+                        if single_root
+                        else "Archive contains multiple top-level roots"
+                    ),
                 )
-                if not single_root:
-                    return VerifyResult(valid=False, checks=checks, warnings=warnings)
-
-                archive_root = next(iter(top_levels))
-                normalized_members = [
-                    _strip_archive_root(member.name, archive_root) for member in members
-                ]
-                duplicates = _find_duplicates([name for name in normalized_members if name])
-                checks.append(
-                    VerifyCheck(
-                        name="duplicate_members",
-                        passed=not duplicates,
-                        message=(
-                            "No duplicate normalized entries"
-                            if not duplicates
-                            else f"Duplicate entries detected: {', '.join(duplicates)}"
-                        ),
-                    )
+            )
+            if not single_root:
+                return VerifyResult(valid=False, checks=checks, warnings=warnings)
+
+            archive_root = next(iter(top_levels))
+            normalized_members = [_strip_archive_root(name, archive_root) for name in names]
+            duplicates = _find_duplicates([name for name in normalized_members if name])
+            checks.append(
+                VerifyCheck(
+                    name="duplicate_members",
+                    passed=not duplicates,
+                    message=(
+                        "No duplicate normalized entries"
+                        if not duplicates
+                        else f"Duplicate entries detected: {', '.join(duplicates)}"
+                    ),
                 )
+            )
 
-                manifest_member = archive.getmember(f"{archive_root}/{MANIFEST_FILENAME}")
-                manifest_payload = archive.extractfile(manifest_member)
-                if manifest_payload is None:
-                    raise BackupError("Manifest payload is missing")
-                manifest = BackupManifest.model_validate(
-                    json.loads(manifest_payload.read().decode("utf-8"))
-                )
-                checks.append(
-                    VerifyCheck(
-                        name="manifest_parseable",
-                        passed=True,
-                        message="Manifest parsed successfully",
-                    )
+            if scan.manifest_payload is None:
+                raise BackupError("Manifest payload is missing")
+            manifest = BackupManifest.model_validate(
+                json.loads(scan.manifest_payload.decode("utf-8"))
+            )
+            checks.append(
+                VerifyCheck(
+                    name="manifest_parseable",
+                    passed=True,
+                    message="Manifest parsed successfully",
                 )
-                schema_ok = manifest.schema_version in SUPPORTED_SCHEMA_VERSIONS
-                checks.append(
-                    VerifyCheck(
-                        name="schema_supported",
-                        passed=schema_ok,
-                        message=(
-                            "Manifest schema version supported"
-                            if schema_ok
-                            else f"Unsupported schema version: {manifest.schema_version}"
-                        ),
-                    )
+            )
+            schema_ok = manifest.schema_version in SUPPORTED_SCHEMA_VERSIONS
+            checks.append(
+                VerifyCheck(
+                    name="schema_supported",
+                    passed=schema_ok,
+                    message=(
+                        "Manifest schema version supported"
+                        if schema_ok
+                        else f"Unsupported schema version: {manifest.schema_version}"
+                    ),
                 )
-                if not schema_ok:
-                    return VerifyResult(valid=False, checks=checks, warnings=warnings)
-
-                for asset in manifest.assets:
-                    if not asset.included:
-                        continue
-                    members_for_asset = _matching_asset_members(
-                        members,
-                        archive_root,
-                        asset.relative_path,
-                    )
-                    present = bool(members_for_asset)
-                    checks.append(
-                        VerifyCheck(
-                            name=f"asset_present:{asset.relative_path}",
-                            passed=present,
-                            message=(
-                                "Asset entries present in archive"
-                                if present
-                                else f"Asset missing from archive: {asset.relative_path}"
-                            ),
-                        )
-                    )
-                    if not present:
-                        continue
-                    checksum = _compute_archive_checksum(
-                        archive=archive,
-                        archive_root=archive_root,
-                        asset=asset,
-                    )
-                    checks.append(
-                        VerifyCheck(
-                            name=f"checksum:{asset.relative_path}",
-                            passed=checksum == asset.checksum,
-                            message=(
-                                "Asset checksum verified"
-                                if checksum == asset.checksum
-                                else f"Checksum mismatch for {asset.relative_path}"
-                            ),
-                        )
-                    )
+            )
+            if not schema_ok:
+                return VerifyResult(valid=False, checks=checks, warnings=warnings)
+
+            if manifest.storage == "chunked":
+                checks.extend(self._verify_chunked_assets(manifest))
+            else:
+                checks.extend(_verify_archived_assets(scan, archive_root, manifest))
         except (
             OSError,
             tarfile.TarError,
@@ -329,12 +418,86 @@ class BackupService:
             warnings=warnings,
         )
 
+    def _verify_chunked_assets(self, manifest: BackupManifest) -> list[VerifyCheck]:
+        """Re-hash every referenced chunk-store object (in parallel) and check assets."""
+        digests = sorted(set(manifest.file_index.values()))
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(digests)))) as pool:
+            actual = dict(
+                zip(digests, pool.map(self._chunk_store.hash_object, digests), strict=True)
+            )
+
+        checks: list[VerifyCheck] = []
+        for asset in manifest.assets:
+            if not asset.included:
+                continue
+            entries = _asset_entries(manifest.file_index, asset.relative_path)
+            missing = sorted(path for path, digest in entries.items() if actual[digest] is None)
+            present = not missing
+            checks.append(
+                VerifyCheck(
+                    name=f"asset_present:{asset.relative_path}",
+                    passed=present,
+                    message=(
+                        "Asset objects present in chunk store"
+                        if present
+                        else f"Asset objects missing from chunk store: {', '.join(missing)}"
+                    ),
+                )
+            )
+            if not present:
+                continue
+            checksum = _aggregate_checksum(
+                asset,
+                {path: actual[digest] or "" for path, digest in entries.items()},
+            )
+            checks.append(
+                VerifyCheck(
+                    name=f"checksum:{asset.relative_path}",
+                    passed=checksum == asset.checksum,
+                    message=(
+                        "Asset checksum verified"
+                        if checksum == asset.checksum
+                        else f"Checksum mismatch for {asset.relative_path}"
+                    ),
+                )
+            )
+        return checks
+
+    def prune_chunk_store(self) -> int:
+        """Delete chunk-store objects no longer referenced by any backup.
+
+        Returns the number of objects removed. Nothing is pruned when any
+        archive manifest cannot be read, since its references are unknown.
+        """
+        with self._chunk_lock:
+            referenced: set[str] = set()
+            for archive_path in self._archive_paths():
+                manifest = self._load_manifest(archive_path)
+                referenced.update(manifest.file_index.values())
+            return self._chunk_store.prune(referenced)
+
+    def apply_retention(self) -> int:
+        """Keep the newest ``backup_retention_count`` archives and prune the chunk store.
+
+        Returns the number of archives removed; ``0`` keeps every archive.
+        """
+        keep = self._settings.backup_retention_count
+        if keep <= 0:
+            return 0
+        # Names only order archives to the second; the write time breaks ties.
+        newest_first = sorted(
+            self._archive_paths(), key=lambda path: path.stat().st_mtime_ns, reverse=True
+        )
+        expired = newest_first[keep:]
+        for archive_path in expired:
+            archive_path.unlink(missing_ok=True)
+        if expired:
+            self.prune_chunk_store()
+        return len(expired)
+
     def list_backups(self) -> BackupListResponse:
         """List known backup archives from disk."""
-        backups = [
-            self._load_summary(path)
-            for path in sorted(self._backup_dir.glob("*.tar.gz"), reverse=True)
-        ]
+        backups = [self._load_summary(path) for path in self._archive_paths()]
         return BackupListResponse(backups=backups, count=len(backups))
 
     def get_backup_detail(self, backup_id: str) -> BackupDetailResponse | None:
@@ -360,7 +523,7 @@ class BackupService:
 
     def resolve_backup_path(self, backup_id: str) -> Path | None:
         """Resolve a backup ID to an archive path."""
-        for archive_path in sorted(self._backup_dir.glob("*.tar.gz"), reverse=True):
+        for archive_path in self._archive_paths():
             try:
                 manifest = self._load_manifest(archive_path)
             except (OSError, tarfile.TarError, KeyError, json.JSONDecodeError, ValueError):
@@ -369,7 +532,23 @@ class BackupService:
                 return archive_path
         return None
 
-    def _materialize_asset(self, candidate: _AssetCandidate, mode: BackupMode) -> BackupAsset:
+    def _archive_paths(self) -> list[Path]:
+        """Return backup archives in the backup directory, newest name first."""
+        return sorted(
+            (
+                path
+                for path in self._backup_dir.iterdir()
+                if path.is_file() and is_archive_path(path)
+            ),
+            reverse=True,
+        )
+
+    def _materialize_asset(
+        self,
+        candidate: _AssetCandidate,
+        mode: BackupMode,
+        files: list[_FileEntry] | None = None,
+    ) -> BackupAsset:
         if candidate.source_path is None:
             return BackupAsset(
                 relative_path=candidate.relative_path,
@@ -411,11 +590,14 @@ class BackupService:
                 source_path=str(source),
             )
 
+        entries = _file_entries(source, candidate.relative_path)
+        if files is not None:
+            files.extend(entries)
         return BackupAsset(
             relative_path=candidate.relative_path,
             asset_type=candidate.asset_type,
             size_bytes=_compute_size(source),
-            checksum=_compute_checksum(source),
+            checksum=_checksum_from_entries(source, candidate.relative_path, entries),
             included=True,
             is_directory=source.is_dir(),
             source_path=str(source),
@@ -433,6 +615,7 @@ class BackupService:
                 label=str(manifest.metadata.get("label", "")),
                 size_bytes=archive_path.stat().st_size,
                 asset_count=sum(1 for asset in manifest.assets if asset.included),
+                incremental=manifest.storage == "chunked",
             )
         except (OSError, tarfile.TarError, KeyError, json.JSONDecodeError, ValueError) as exc:
             return BackupSummary(
@@ -444,17 +627,19 @@ class BackupService:
             )
 
     def _load_manifest(self, archive_path: Path) -> BackupManifest:
-        with tarfile.open(archive_path, "r:gz") as archive:
-            members = archive.getmembers()
-            roots = {PurePosixPath(member.name).parts[0] for member in members if member.name}
-            if len(roots) != 1:
-                raise BackupError("Archive must contain exactly one top-level root")
-            root = next(iter(roots))
-            manifest_member = archive.getmember(f"{root}/{MANIFEST_FILENAME}")
-            payload = archive.extractfile(manifest_member)
-            if payload is None:
-                raise BackupError("Manifest payload is missing")
-            return BackupManifest.model_validate(json.loads(payload.read().decode("utf-8")))
+        # Streams members until the manifest appears. Archives written by
+        # this service store it first; older staged archives may need a
+        # longer read.
+        with open_archive_reader(archive_path) as archive:
+            for member in archive:
+                if _is_manifest_member(member):
+                    payload = archive.extractfile(member)
+                    if payload is None:
+                        raise BackupError("Manifest payload is missing")
+                    return BackupManifest.model_validate(
+                        json.loads(payload.read().decode("utf-8"))
+                    )
+        raise KeyError(f"{MANIFEST_FILENAME} not found in {archive_path.name}")
 
     def _asset_candidates(self) -> list[_AssetCandidate]:
         return [
@@ -610,25 +795,83 @@ def _compute_size(path: Path) -> int:
     return sum(child.stat().st_size for child in sorted(path.rglob("*")) if child.is_file())
 
 
-def _compute_checksum(path: Path) -> str:
-    if path.is_file():
-        digest = hashlib.sha256()
-        with path.open("rb") as handle:
-            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-                digest.update(chunk)
-        return digest.hexdigest()
+def _file_digest(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hash_stream(handle)
+
 
+def _file_entries(source: Path, relative_path: str) -> list[_FileEntry]:
+    """Hash every regular file under *source* in deterministic path order."""
+    if source.is_file():
+        return [_FileEntry(relative_path, source, _file_digest(source))]
+    base = PurePosixPath(relative_path)
+    return [
+        _FileEntry(
+            (base / child.relative_to(source).as_posix()).as_posix(), child, _file_digest(child)
+        )
+        for child in sorted(source.rglob("*"))
+        if child.is_file()
+    ]
+
+
+def _directory_checksum(base: str, digests: dict[str, str]) -> str:
+    """Fold per-file digests under *base* into one directory checksum.
+
+    Files are ordered by path components, matching ``sorted(Path.rglob())``.
+    """
+    base_path = PurePosixPath(base)
     digest = hashlib.sha256()
-    files = [child for child in sorted(path.rglob("*")) if child.is_file()]
-    for child in files:
-        relative = child.relative_to(path).as_posix()
-        digest.update(relative.encode("utf-8"))
+    for path in sorted(digests, key=PurePosixPath):
+        digest.update(PurePosixPath(path).relative_to(base_path).as_posix().encode("utf-8"))
         digest.update(b"\0")
-        digest.update(_compute_checksum(child).encode("ascii"))
+        digest.update(digests[path].encode("ascii"))
         digest.update(b"\0")
     return digest.hexdigest()
 
 
+def _checksum_from_entries(source: Path, relative_path: str, entries: list[_FileEntry]) -> str:
+    if source.is_file():
+        return entries[0].digest
+    return _directory_checksum(
+        relative_path, {entry.relative_path: entry.digest for entry in entries}
+    )
+
+
+def _compute_checksum(path: Path) -> str:
+    return _checksum_from_entries(path, path.name, _file_entries(path, path.name))
+
+
+def _record_stored_digests(
+    manifest: BackupManifest, files: list[_FileEntry], changed: dict[Path, str]
+) -> list[str]:
+    """Point *manifest* at the digests actually stored for files that changed.
+
+    Returns the archive-relative paths of the changed files.
+    """
+    changed_paths: list[str] = []
+    for entry in files:
+        digest = changed.get(entry.source)
+        if digest is not None:
+            manifest.file_index[entry.relative_path] = digest
+            changed_paths.append(entry.relative_path)
+    for asset in manifest.assets:
+        if asset.included and asset.checksum:
+            entries = _asset_entries(manifest.file_index, asset.relative_path)
+            asset.checksum = _aggregate_checksum(asset, entries)
+            manifest.checksums[asset.relative_path] = asset.checksum
+    return sorted(changed_paths)
+
+
+def _aggregate_checksum(asset: BackupAsset, digests: dict[str, str]) -> str:
+    """Checksum for *asset* from ``{archive-relative path: file digest}``."""
+    if asset.is_directory:
+        return _directory_checksum(asset.relative_path, digests)
+    file_digest = digests.get(asset.relative_path)
+    if file_digest is None:
+        raise BackupError(f"Missing file member for asset: {asset.relative_path}")
+    return file_digest
+
+
 def _strip_archive_root(name: str, archive_root: str) -> str:
     path = PurePosixPath(name)
     if not path.parts or path.parts[0] != archive_root:
@@ -648,52 +891,81 @@ def _find_duplicates(items: list[str]) -> list[str]:
     return duplicates
 
 
-def _matching_asset_members(
-    members: list[tarfile.TarInfo], archive_root: str, relative_path: str
-) -> list[tarfile.TarInfo]:
-    expected = PurePosixPath(relative_path)
-    matches: list[tarfile.TarInfo] = []
-    for member in members:
-        normalized = _strip_archive_root(member.name, archive_root)
-        if not normalized:
-            continue
-        normalized_path = PurePosixPath(normalized)
-        if normalized_path == expected or expected in normalized_path.parents:
-            matches.append(member)
-    return matches
-
-
-def _compute_archive_checksum(
-    *,
-    archive: tarfile.TarFile,
-    archive_root: str,
-    asset: BackupAsset,
-) -> str:
-    members = _matching_asset_members(archive.getmembers(), archive_root, asset.relative_path)
-    if asset.is_directory:
-        digest = hashlib.sha256()
-        base = PurePosixPath(asset.relative_path)
-        for member in sorted(
-            (candidate for candidate in members if candidate.isfile()),
-            key=lambda item: item.name,
-        ):
-            normalized = PurePosixPath(_strip_archive_root(member.name, archive_root))
+def _is_manifest_member(member: tarfile.TarInfo) -> bool:
+    parts = PurePosixPath(member.name).parts
+    return member.isfile() and len(parts) == 2 and parts[1] == MANIFEST_FILENAME
+
+
+def _scan_archive(archive_path: Path) -> _ArchiveScan:
+    """Read an archive once, hashing each file member as it streams past."""
+    scan = _ArchiveScan()
+    with open_archive_reader(archive_path) as archive:
+        for member in archive:
+            scan.member_names.append(member.name)
+            if not member.isfile() or not is_safe_archive_member(member.name):
+                continue
             payload = archive.extractfile(member)
             if payload is None:
                 raise BackupError(f"Could not read archive member: {member.name}")
-            file_digest = hashlib.sha256(payload.read()).hexdigest()
-            digest.update(str(normalized.relative_to(base)).encode("utf-8"))
-            digest.update(b"\0")
-            digest.update(file_digest.encode("ascii"))
-            digest.update(b"\0")
-        return digest.hexdigest()
-
-    file_member = next((member for member in members if member.isfile()), None)
-    if file_member is None:
-        raise BackupError(f"Missing file member for asset: {asset.relative_path}")
-    payload = archive.extractfile(file_member)
-    if payload is None:
-        raise BackupError(f"Could not read archive member: {file_member.name}")
-    digest = hashlib.sha256()
-    digest.update(payload.read())
-    return digest.hexdigest()
+            if _is_manifest_member(member):
+                scan.manifest_payload = payload.read()
+                continue
+            scan.file_digests[member.name] = hash_stream(payload)
+    return scan
+
+
+def _asset_entries(index: dict[str, str], relative_path: str) -> dict[str, str]:
+    """Return the ``index`` entries that belong to the asset at *relative_path*."""
+    expected = PurePosixPath(relative_path)
+    return {
+        path: digest
+        for path, digest in index.items()
+        if PurePosixPath(path) == expected or expected in PurePosixPath(path).parents
+    }
+
+
+def _verify_archived_assets(
+    scan: _ArchiveScan, archive_root: str, manifest: BackupManifest
+) -> list[VerifyCheck]:
+    normalized_names = {
+        normalized
+        for normalized in (_strip_archive_root(name, archive_root) for name in scan.member_names)
+        if normalized
+    }
+    normalized_digests = {
+        _strip_archive_root(name, archive_root): digest
+        for name, digest in scan.file_digests.items()
+    }
+    checks: list[VerifyCheck] = []
+    for asset in manifest.assets:
+        if not asset.included:
+            continue
+        present = bool(_asset_entries(dict.fromkeys(normalized_names, ""), asset.relative_path))
+        checks.append(
+            VerifyCheck(
+                name=f"asset_present:{asset.relative_path}",
+                passed=present,
+                message=(
+                    "Asset entries present in archive"
+                    if present
+                    else f"Asset missing from archive: {asset.relative_path}"
+                ),
+            )
+        )
+        if not present:
+            continue
+        checksum = _aggregate_checksum(
+            asset, _asset_entries(normalized_digests, asset.relative_path)
+        )
+        checks.append(
+            VerifyCheck(
+                name=f"checksum:{asset.relative_path}",
+                passed=checksum == asset.checksum,
+                message=(
+                    "Asset checksum verified"
+                    if checksum == asset.checksum
+                    else f"Checksum mismatch for {asset.relative_path}"
+                ),
+            )
+        )
+    return checks
@@ -274,6 +274,33 @@ def bench_report(
         _append_github_step_summary(markdown)
 
 
+@bench_app.command(
+    "stub",
+    add_help_option=False,
+    context_settings={"allow_extra_args": True, "ignore_unknown_options": True},
+)
+def bench_stub(ctx: typer.Context) -> None:
+    """Serve the deterministic stub model server (Ollama and OpenAI APIs).
+
+    Point OLLAMA_BASE_URL at http://HOST:PORT, or an OpenAI-compatible
+    provider at http://HOST:PORT/v1, to benchmark the engine without a model.
+    Options are those of ``python -m agent33.testing.stub_server``; see --help.
+    """
+    import argparse
+
+    from agent33.testing.stub_server import behavior_from_args, build_parser, serve
+
+    try:
+        args = build_parser(prog="agent33 bench stub", exit_on_error=False).parse_args(ctx.args)
+        behavior = behavior_from_args(args)
+    except (argparse.ArgumentError, OSError, ValueError, KeyError) as exc:
+        typer.echo(f"[error] Invalid stub configuration: {exc}", err=True)
+        raise typer.Exit(code=1) from exc
+
+    typer.echo(f"Stub model server on http://{args.host}:{args.port} (OpenAI API under /v1)")
+    serve(behavior, host=args.host, port=args.port)
+
+
 def _load_optional_report(path: Path | None) -> dict[str, Any] | None:
     if path is None:
         return None
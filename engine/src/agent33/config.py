@@ -58,6 +58,11 @@ class Settings(BaseSettings):
     default_model: str = ""
     ollama_base_url: str = "http://ollama:11434"
     ollama_default_model: str = "llama3.2:3b"
+    # Comma-separated Ollama hosts shared by chat and embeddings; requests go to
+    # a host that has the model loaded (least outstanding requests first).
+    ollama_pool_urls: str = ""
+    ollama_pool_spill_threshold: int = 4
+    ollama_pool_probe_interval_seconds: float = 15.0
     lm_studio_base_url: str = "http://localhost:1234/v1"
     lm_studio_default_model: str = "local-model"
 
@@ -117,6 +122,18 @@ class Settings(BaseSettings):
     brave_api_key: SecretStr = SecretStr("")
     web_search_max_results: int = 10
     web_search_default_provider: str | None = None
+    web_search_provider_timeout_seconds: float = 10.0  # per provider in search_all
+    web_search_all_deadline_seconds: float = 15.0  # overall search_all budget
+    web_search_all_quorum: int = 0  # return after N providers answer; 0 waits for all
+    web_research_cache_enabled: bool = True
+    web_research_cache_backend: str = "memory"  # memory | redis | sqlite
+    web_research_cache_sqlite_path: str = "var/web_research_cache.sqlite3"
+    web_research_cache_max_entries: int = 1024
+    web_research_cache_max_bytes: int = 64 * 1024 * 1024
+    web_research_cache_search_ttl_seconds: int = 600
+    web_research_cache_fetch_ttl_seconds: int = 300  # when no Cache-Control max-age
+    web_research_cache_max_ttl_seconds: int = 86400
+    web_research_cache_cross_tenant: bool = True  # share uncredentialed results
 
     # Optional cloud LLM
     openai_api_key: SecretStr = SecretStr("")
@@ -127,6 +144,30 @@ class Settings(BaseSettings):
     openrouter_app_name: str = "AGENT-33"
     openrouter_app_category: str = "cli-agent"
     openrouter_default_fallback_models: str = ""
+    # Equivalent model routes ("a,b;c,d") scored by latency/error rate, with
+    # optional hedging: fire the next-best route after the primary's p95 latency.
+    llm_route_equivalents: str = ""
+    llm_route_min_samples: int = 5
+    llm_route_exploration_rate: float = 0.05  # share of calls sent to unscored routes
+    llm_hedging_enabled: bool = False
+    llm_hedge_quantile: float = 0.95
+    llm_hedge_default_delay_seconds: float = 2.0
+    llm_hedge_min_delay_seconds: float = 0.1
+    # Response cache in front of ModelRouter.complete (exact match; utility calls
+    # may also use the embedding-similarity tier when it is enabled). Opt-in: a
+    # cached reply is replayed to anyone who sends the same prompt.
+    llm_response_cache_enabled: bool = False
+    llm_response_cache_max_entries: int = 2048
+    llm_response_cache_ttl_seconds: float = 3600.0
+    llm_response_cache_max_temperature: float = 0.0
+    llm_response_cache_semantic_enabled: bool = False
+    llm_response_cache_semantic_threshold: float = 0.97
+    # Bulk utility calls (titles, summaries, query expansion): "packed" sends
+    # several items per request, "concurrent" one bounded request per item,
+    # "auto" packs until a model keeps returning unusable packed output.
+    llm_utility_batch_mode: str = "auto"
+    llm_utility_batch_size: int = 16
+    llm_utility_batch_concurrency: int = 4
     elevenlabs_api_key: SecretStr = SecretStr("")
     elevenlabs_voice_id: str = "21m00Tcm4TlvDq8ikWAM"
     voice_daemon_enabled: bool = True
@@ -188,6 +229,12 @@ class Settings(BaseSettings):
     # Embedding cache
     embedding_cache_enabled: bool = True
     embedding_cache_max_size: int = 1024
+    # Lower tiers behind the in-process LRU: Redis shared by replicas and a
+    # local memory-mapped store that survives restarts (empty dir disables).
+    embedding_cache_redis_enabled: bool = False
+    embedding_cache_redis_ttl_seconds: int = 7 * 24 * 3600
+    embedding_cache_disk_dir: str = ""
+    embedding_cache_disk_max_mb: int = 512
 
     # Embedding hot-swap (S44)
     embedding_hot_swap_enabled: bool = False
@@ -217,6 +264,7 @@ class Settings(BaseSettings):
 
     # Knowledge ingestion (P70)
     knowledge_default_tenant_id: str = "system"
+    knowledge_embed_batch_size: int = 32
 
     # Training (self-evolving loop)
     training_enabled: bool = True
@@ -264,6 +312,13 @@ class Settings(BaseSettings):
     """Optional JSON array of pricing override entries applied at startup."""
     # Rolling-window metrics (P3.6)
     metrics_rolling_window_seconds: int = 300  # 5-minute rolling window for observations
+    # Hot-path sampling profiler + event-loop watchdog (admin API, opt-in)
+    sampling_profiler_enabled: bool = False
+    sampling_profiler_max_duration_seconds: float = 300.0
+    sampling_profiler_default_interval_ms: float = 10.0
+    sampling_profiler_max_stacks: int = 10000
+    sampling_profiler_slow_callback_ms: float = 100.0
+    sampling_profiler_lag_interval_ms: float = 100.0
 
     observability_effort_alerts_enabled: bool = True
     observability_effort_alert_high_effort_count_threshold: int = 25
@@ -367,6 +422,20 @@ class Settings(BaseSettings):
     connector_circuit_recovery_seconds: float = 30.0
     connector_circuit_half_open_successes: int = 2
     connector_circuit_max_recovery_seconds: float = 300.0
+    # Adaptive per-connector concurrency limit (queue + shed instead of timeouts)
+    connector_concurrency_limit_enabled: bool = False
+    connector_concurrency_initial_limit: int = 8
+    connector_concurrency_min_limit: int = 1
+    connector_concurrency_max_limit: int = 64
+    connector_concurrency_max_queue: int = 128
+    connector_concurrency_max_queue_wait_seconds: float = 30.0
+    # Shared outbound HTTP client pool (one keep-alive client per connector)
+    http_pool_enabled: bool = True
+    http_pool_max_connections: int = 100
+    http_pool_max_keepalive_connections: int = 20
+    http_pool_keepalive_expiry_seconds: float = 30.0
+    http_pool_http2: bool = True  # used only when the optional h2 package is installed
+    http_pool_connector_limits: str = ""  # comma-separated connector=max, globs allowed
 
     # Jupyter kernel execution
     jupyter_kernel_enabled: bool = False
@@ -454,10 +523,26 @@ class Settings(BaseSettings):
     synthetic_env_bundle_retention: int = 100
     synthetic_env_bundle_persistence_path: str = "var/synthetic_environment_bundles.json"
     orchestration_state_store_path: str = ""
+    # "file" (orchestration_state_store_path), "sqlite" or "redis" (shared by replicas)
+    orchestration_state_backend: str = "file"
+    orchestration_state_db_path: str = "var/orchestration_state.db"
+    orchestration_state_poll_interval_seconds: float = 1.0  # sqlite change detection
     workflow_run_archive_dir: str = "var/workflow-runs"
+    workflow_run_archive_batch_interval_seconds: float = 0.05
+    # 0 = fsync every batch, negative = never fsync (rely on the OS page cache)
+    workflow_run_archive_fsync_interval_seconds: float = 1.0
+    workflow_run_archive_artifact_workers: int = 2
     process_manager_log_dir: str = "var/process-manager"
     process_manager_max_processes: int = 10
     backup_dir: str = "var/backups"
+    # "gzip" or "zstd" (multithreaded; needs the optional ``zstandard`` package,
+    # falls back to gzip when it is missing)
+    backup_compression: str = "gzip"
+    backup_compression_level: int = 0  # 0 = codec default
+    backup_compression_threads: int = 0  # 0 = one per core
+    # Archives kept after each successful backup (older ones are deleted and
+    # the chunk store is pruned of objects nothing references); 0 keeps all.
+    backup_retention_count: int = 0
 
     # Workflow template marketplace (S41)
     workflow_marketplace_enabled: bool = True
@@ -526,9 +611,20 @@ class Settings(BaseSettings):
     operator_session_max_replay_file_mb: int = 50
     operator_session_max_retained: int = 100
     operator_session_crash_recovery_enabled: bool = True
-
-    # Phase 51: Anthropic prompt caching
+    # "file" (operator_session_base_dir), "sqlite" (replicas sharing a volume)
+    # or "redis" (replicas on separate hosts, via redis_url)
+    operator_session_backend: str = "file"
+    operator_session_db_path: str = "var/operator_sessions.db"
+    operator_session_lease_seconds: float = 30.0
+    operator_session_event_flush_interval_seconds: float = 0.05
+    operator_session_poll_interval_seconds: float = 0.5
+    operator_session_hot_cache_size: int = 256
+
+    # Phase 51: provider prompt caching (Anthropic breakpoints, OpenAI
+    # prompt_cache_key, llama.cpp cache_prompt, Ollama keep_alive)
     prompt_cache_enabled: bool = True
+    # Sent as Ollama's keep_alive (e.g. "30m"); empty keeps Ollama's default
+    prompt_cache_ollama_keep_alive: str = ""
 
     # Phase 50: Context compression engine
     context_compression_enabled: bool = False
@@ -551,6 +647,9 @@ class Settings(BaseSettings):
     script_hooks_user_dir: str = ""  # default: ~/.agent33/hooks/
     script_hooks_default_timeout_ms: float = 5000.0
     script_hooks_max_timeout_ms: float = 30000.0
+    # Scripts declaring "agent33-hook-protocol: jsonl" run as persistent workers
+    script_hooks_worker_mode_enabled: bool = True
+    script_hooks_worker_pool_size: int = 2
 
     # Scheduled evaluation gates (S45)
     scheduled_gates_enabled: bool = False
@@ -561,6 +660,12 @@ class Settings(BaseSettings):
     alembic_config_path: str = "alembic.ini"
     alembic_auto_check_on_startup: bool = False
 
+    # Scheduler leader election (P1.2): one replica fires cron/interval triggers.
+    scheduler_lease_seconds: int = 15  # a standby takes over within one lease
+    scheduler_job_sync_seconds: float = 10.0  # leader reloads jobs added on other replicas
+    scheduler_dispatch_enabled: bool = True  # queue fired jobs for any replica to run
+    scheduler_dispatch_concurrency: int = 2
+
     # Control-plane repository backend (P4.5)
     control_plane_backend: str = "memory"  # "memory" or "sqlite"
     control_plane_db_path: str = "agent33_control_plane.db"
@@ -570,6 +675,14 @@ class Settings(BaseSettings):
     webhook_delivery_base_delay: float = 1.0
     webhook_delivery_max_delay: float = 300.0
     webhook_delivery_max_records: int = 10_000
+    webhook_delivery_engine_enabled: bool = True  # send enqueued deliveries over HTTP
+    webhook_delivery_workers: int = 16
+    webhook_delivery_endpoint_concurrency: int = 4  # in-flight requests per endpoint URL
+    webhook_delivery_ordered: bool = False  # one at a time, in order, per endpoint
+    webhook_delivery_timeout_seconds: float = 10.0
+    webhook_delivery_flush_interval_seconds: float = 0.5  # batched receipt writes
+    webhook_delivery_lease_seconds: float = 60.0  # orphaned deliveries adopted after this
+    webhook_delivery_allow_private_targets: bool = False  # SSRF guard; enable for local receivers
 
     # SLO thresholds (P3.3)
     slo_availability_target: float = 0.999  # 99.9%
@@ -587,6 +700,20 @@ class Settings(BaseSettings):
     workflow_transport_preferred: str = "auto"  # auto | websocket | sse
     workflow_ws_ping_interval: float = 30.0
     workflow_ws_ping_timeout: float = 10.0
+    workflow_ws_lock_shards: int = 64  # per-run lock shards in WorkflowWSManager
+    # Cross-replica workflow event fan-out over NATS JetStream (needs a real NATS bus).
+    workflow_events_distributed: bool = False
+    workflow_events_subject_prefix: str = "agent33.workflow.events"
+    workflow_events_stream: str = "AGENT33_WORKFLOW_EVENTS"
+    workflow_events_retention_seconds: float = 86400.0
+    # Distributed step execution: DAG steps run on leased step workers (Redis streams).
+    workflow_distributed_steps_enabled: bool = False
+    workflow_step_worker_enabled: bool = True  # run a step worker on this replica
+    workflow_step_worker_concurrency: int = 4
+    workflow_step_lease_seconds: float = 30.0
+    workflow_step_max_deliveries: int = 3
+    workflow_step_result_timeout_seconds: float = 3600.0
+    workflow_step_result_ttl_seconds: int = 86400
     # SSE schema v2 rollout (backend foundation only; v1 remains the default).
     # Kill switch: /tmp/agent33_disable_sse_v2
     sse_schema_v2_enabled: bool = False
@@ -3,6 +3,7 @@
 from agent33.connectors.boundary import (
     build_connector_boundary_executor,
     get_policy_pack,
+    limiter_registry_from_settings,
     map_connector_exception,
 )
 from agent33.connectors.circuit_breaker import (
@@ -11,6 +12,14 @@ from agent33.connectors.circuit_breaker import (
     CircuitOpenError,
     CircuitState,
 )
+from agent33.connectors.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterRegistry,
+    ConcurrencyLimitExceededError,
+    ConcurrencyLimitMiddleware,
+    configure_concurrency_limiter_registry,
+    get_concurrency_limiter_registry,
+)
 from agent33.connectors.executor import ConnectorExecutor
 from agent33.connectors.governance import (
     AllowAllConnectorPolicy,
@@ -18,6 +27,13 @@ from agent33.connectors.governance import (
     ConnectorGovernancePolicy,
     GovernanceDecision,
 )
+from agent33.connectors.http_pool import (
+    ConnectorPoolLimits,
+    HTTPClientPool,
+    configure_http_client_pool,
+    get_http_client_pool,
+    pooled_client,
+)
 from agent33.connectors.middleware import (
     CircuitBreakerMiddleware,
     ConnectorMiddleware,
@@ -29,6 +45,7 @@ from agent33.connectors.middleware import (
 from agent33.connectors.models import (
     CircuitBreakerSnapshot,
     CircuitEvent,
+    ConcurrencyLimitSnapshot,
     ConnectorHealthSummary,
     ConnectorMetricsSummary,
     ConnectorRequest,
@@ -37,6 +54,7 @@ from agent33.connectors.models import (
 from agent33.connectors.monitoring import ConnectorMetricsCollector
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
     "AllowAllConnectorPolicy",
     "BlocklistConnectorPolicy",
     "build_connector_boundary_executor",
@@ -48,18 +66,30 @@ __all__ = [
     "CircuitEvent",
     "CircuitOpenError",
     "CircuitState",
+    "ConcurrencyLimitExceededError",
+    "ConcurrencyLimitMiddleware",
+    "ConcurrencyLimitSnapshot",
+    "ConcurrencyLimiterRegistry",
     "ConnectorExecutor",
     "ConnectorGovernancePolicy",
     "ConnectorHealthSummary",
     "ConnectorMetricsCollector",
     "ConnectorMetricsSummary",
     "ConnectorMiddleware",
+    "ConnectorPoolLimits",
     "ConnectorRequest",
     "ConnectorStatus",
     "GovernanceDecision",
     "GovernanceMiddleware",
+    "HTTPClientPool",
     "MetricsMiddleware",
     "RetryMiddleware",
     "TimeoutMiddleware",
+    "configure_concurrency_limiter_registry",
+    "configure_http_client_pool",
+    "get_concurrency_limiter_registry",
+    "get_http_client_pool",
+    "limiter_registry_from_settings",
     "map_connector_exception",
+    "pooled_client",
 ]
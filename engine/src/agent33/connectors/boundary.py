@@ -44,6 +44,13 @@ import structlog
 
 from agent33.config import settings
 from agent33.connectors.circuit_breaker import CircuitBreaker, CircuitOpenError
+from agent33.connectors.concurrency import (
+    ConcurrencyLimiterRegistry,
+    ConcurrencyLimitExceededError,
+    ConcurrencyLimitMiddleware,
+    configure_concurrency_limiter_registry,
+    get_concurrency_limiter_registry,
+)
 from agent33.connectors.executor import ConnectorExecutor
 from agent33.connectors.governance import BlocklistConnectorPolicy
 from agent33.connectors.middleware import (
@@ -59,6 +66,7 @@ from agent33.connectors.models import ConnectorRequest
 if TYPE_CHECKING:
     from agent33.connectors.circuit_breaker import CircuitBreakerRegistry
     from agent33.connectors.monitoring import ConnectorMetricsCollector
+    from agent33.observability.metrics import MetricsCollector
 
 logger = structlog.get_logger()
 
@@ -146,6 +154,31 @@ def enforce_connector_governance(
         raise PermissionError(reason)
 
 
+def limiter_registry_from_settings(
+    metrics: MetricsCollector | None = None,
+) -> ConcurrencyLimiterRegistry:
+    """Build a concurrency limiter registry from the ``connector_concurrency_*`` settings."""
+    return ConcurrencyLimiterRegistry(
+        metrics=metrics,
+        initial_limit=settings.connector_concurrency_initial_limit,
+        min_limit=settings.connector_concurrency_min_limit,
+        max_limit=settings.connector_concurrency_max_limit,
+        max_queue=settings.connector_concurrency_max_queue,
+    )
+
+
+def _resolve_limiter_registry(
+    registry: ConcurrencyLimiterRegistry | None,
+) -> ConcurrencyLimiterRegistry:
+    if registry is not None:
+        return registry
+    shared = get_concurrency_limiter_registry()
+    if shared is None:
+        shared = limiter_registry_from_settings()
+        configure_concurrency_limiter_registry(shared)
+    return shared
+
+
 def build_connector_boundary_executor(
     *,
     default_timeout_seconds: float | None = None,
@@ -154,6 +187,7 @@ def build_connector_boundary_executor(
     metrics_collector: ConnectorMetricsCollector | None = None,
     breaker_registry: CircuitBreakerRegistry | None = None,
     connector_name: str | None = None,
+    limiter_registry: ConcurrencyLimiterRegistry | None = None,
 ) -> ConnectorExecutor | None:
     """Build the default connector boundary middleware chain.
 
@@ -168,6 +202,9 @@ def build_connector_boundary_executor(
     connector_name:
         Logical connector identity used to look up shared breakers in
         *breaker_registry*.
+    limiter_registry:
+        Registry of per-connector concurrency limiters.  Defaults to the
+        process-wide registry so limits are shared across executors.
     """
     if not settings.connector_boundary_enabled:
         return None
@@ -179,6 +216,15 @@ def build_connector_boundary_executor(
         blocked_operations=blocked_operations,
     )
     middlewares.append(GovernanceMiddleware(policy))
+    if settings.connector_concurrency_limit_enabled:
+        middlewares.append(
+            ConcurrencyLimitMiddleware(
+                _resolve_limiter_registry(limiter_registry),
+                connector_name=connector_name,
+                default_timeout_seconds=default_timeout_seconds,
+                max_queue_wait_seconds=settings.connector_concurrency_max_queue_wait_seconds,
+            )
+        )
     if default_timeout_seconds is not None:
         middlewares.append(TimeoutMiddleware(default_timeout_seconds))
     if retry_attempts > 1:
@@ -244,6 +290,15 @@ def map_connector_exception(exc: Exception, connector: str, operation: str) -> R
             operation=operation,
         )
         return RuntimeError(f"Connector circuit open for {connector}/{operation}: {exc}")
+    if isinstance(exc, ConcurrencyLimitExceededError):
+        logger.warning(
+            "connector_error_mapped",
+            error_type="overloaded",
+            connector=connector,
+            operation=operation,
+            reason=exc.reason,
+        )
+        return RuntimeError(f"Connector overloaded for {connector}/{operation}: {exc}")
     if isinstance(exc, httpx.HTTPError):
         logger.warning(
             "connector_error_mapped",
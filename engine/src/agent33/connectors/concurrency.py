@@ -0,0 +1,397 @@
+"""Adaptive per-connector concurrency limiting for the connector boundary.
+
+Each connector identity gets one :class:`AdaptiveConcurrencyLimiter` that
+bounds in-flight calls.  The limit adapts Vegas-style to observed latency:
+while latency stays close to the best latency seen recently the limit grows
+additively, when latency inflates (requests are queueing downstream) it
+shrinks additively, and on timeouts or explicit overload responses (HTTP 429 /
+503) it backs off multiplicatively.
+
+Calls beyond the limit wait in a bounded FIFO queue.  A call is shed with
+:class:`ConcurrencyLimitExceededError` when the queue is full, when the
+estimated wait already exceeds the call's timeout budget, or when the budget
+runs out while queued, so downstream saturation turns into bounded queueing
+instead of timeouts and breaker trips.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from agent33.connectors.middleware import ConnectorHandler
+    from agent33.connectors.models import ConnectorRequest
+    from agent33.observability.metrics import MetricsCollector
+
+logger = structlog.get_logger()
+
+# Upstream status codes that mean "slow down" rather than "bad request".
+_OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+
+class ConcurrencyLimitExceededError(RuntimeError):
+    """Raised when a call is shed by a connector's concurrency limiter."""
+
+    def __init__(self, connector: str, reason: str, message: str) -> None:
+        super().__init__(message)
+        self.connector = connector
+        self.reason = reason
+
+
+def is_overload_signal(exc: BaseException) -> bool:
+    """Return True when *exc* indicates downstream saturation."""
+    if isinstance(exc, (TimeoutError, httpx.TimeoutException)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _OVERLOAD_STATUS_CODES
+    return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """Latency-driven concurrency limit with a bounded, deadline-aware queue.
+
+    The limiter is driven from the event loop and takes no locks.  Queued
+    callers are woken in FIFO order; a freed slot is handed directly to the
+    next waiter so newly arriving calls cannot jump the queue.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        max_queue: int = 128,
+        backoff_ratio: float = 0.9,
+        probe_interval: int = 500,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.max_queue = max(0, max_queue)
+        self.backoff_ratio = min(max(backoff_ratio, 0.1), 0.99)
+        self.probe_interval = max(1, probe_interval)
+        self.smoothing = min(max(smoothing, 0.01), 1.0)
+        self._clock = clock
+        self._metrics = metrics
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._min_latency: float | None = None
+        self._avg_latency: float | None = None
+        self._samples_since_probe = 0
+        self.total_admitted = 0
+        self.total_queued = 0
+        self.total_overloads = 0
+        self.shed_by_reason: dict[str, int] = {}
+
+    @property
+    def limit(self) -> int:
+        """Current whole-number concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait_seconds(self, position: int) -> float | None:
+        """Estimate how long the caller at queue *position* (1-based) will wait."""
+        if self._avg_latency is None:
+            return None
+        return position / max(self.limit, 1) * self._avg_latency
+
+    # -- admission ------------------------------------------------------------
+
+    async def acquire(self, *, timeout: float | None = None) -> float:
+        """Take a slot, queueing for at most *timeout* seconds.
+
+        Returns the time spent queued.  Raises
+        :class:`ConcurrencyLimitExceededError` when the call is shed.
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self.total_admitted += 1
+            return 0.0
+        position = len(self._waiters) + 1
+        if position > self.max_queue:
+            raise self._shed("queue_full", f"{position - 1} calls already queued")
+        if timeout is not None:
+            estimate = self.estimated_wait_seconds(position)
+            if timeout <= 0 or (estimate is not None and estimate > timeout):
+                raise self._shed(
+                    "deadline",
+                    f"estimated queue wait exceeds the {max(timeout, 0.0):.2f}s budget",
+                )
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.total_queued += 1
+        started = self._clock()
+        try:
+            if timeout is None:
+                await waiter
+            else:
+                async with asyncio.timeout(timeout):
+                    await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                self.release()
+            else:
+                waiter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                raise self._shed(
+                    "deadline", f"no slot freed within the {timeout:.2f}s budget"
+                ) from exc
+            raise
+        waited = self._clock() - started
+        self.total_admitted += 1
+        if self._metrics is not None:
+            self._metrics.observe("connector_queue_wait_seconds", waited, {"connector": self.name})
+        return waited
+
+    def release(
+        self,
+        latency_seconds: float | None = None,
+        *,
+        overloaded: bool = False,
+    ) -> None:
+        """Free a slot and feed the call outcome into the limit.
+
+        ``latency_seconds`` is ``None`` when the call produced no usable
+        latency sample (cancelled, or failed for reasons unrelated to load).
+        """
+        if overloaded:
+            self.total_overloads += 1
+            self._set_limit(self._limit * self.backoff_ratio)
+        elif latency_seconds is not None and latency_seconds > 0:
+            self._on_latency(latency_seconds)
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake()
+
+    def _on_latency(self, latency: float) -> None:
+        self._avg_latency = (
+            latency
+            if self._avg_latency is None
+            else self._avg_latency + self.smoothing * (latency - self._avg_latency)
+        )
+        self._samples_since_probe += 1
+        if self._samples_since_probe >= self.probe_interval:
+            # Forget the old baseline periodically so a permanently slower
+            # upstream does not pin the limit at its floor.
+            self._samples_since_probe = 0
+            self._min_latency = latency
+        elif self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        # Only grow when the current limit is actually being used.
+        if self._in_flight * 2 < self._limit:
+            return
+        min_latency = self._min_latency or latency
+        estimated_queue = self._limit * (1.0 - min_latency / latency)
+        scale = max(1.0, math.log10(self._limit))
+        if estimated_queue < 3 * scale:
+            self._set_limit(self._limit + scale)
+        elif estimated_queue > 6 * scale:
+            self._set_limit(self._limit - scale)
+
+    def _set_limit(self, value: float) -> None:
+        previous = self.limit
+        self._limit = min(max(value, float(self.min_limit)), float(self.max_limit))
+        if self.limit != previous:
+            logger.debug(
+                "connector_concurrency_limit_changed",
+                connector=self.name,
+                old_limit=previous,
+                new_limit=self.limit,
+            )
+            if self._metrics is not None:
+                self._metrics.observe(
+                    "connector_concurrency_limit", float(self.limit), {"connector": self.name}
+                )
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _shed(self, reason: str, detail: str) -> ConcurrencyLimitExceededError:
+        self.shed_by_reason[reason] = self.shed_by_reason.get(reason, 0) + 1
+        logger.warning(
+            "connector_concurrency_shed",
+            connector=self.name,
+            reason=reason,
+            limit=self.limit,
+            in_flight=self._in_flight,
+            queued=len(self._waiters),
+        )
+        if self._metrics is not None:
+            self._metrics.increment(
+                "connector_requests_shed_total", {"connector": self.name, "reason": reason}
+            )
+        return ConcurrencyLimitExceededError(
+            self.name, reason, f"connector {self.name} overloaded: {detail}"
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current limiter state for diagnostics."""
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "min_latency_ms": (
+                round(self._min_latency * 1000, 2) if self._min_latency is not None else None
+            ),
+            "avg_latency_ms": (
+                round(self._avg_latency * 1000, 2) if self._avg_latency is not None else None
+            ),
+            "total_admitted": self.total_admitted,
+            "total_queued": self.total_queued,
+            "total_overloads": self.total_overloads,
+            "total_shed": sum(self.shed_by_reason.values()),
+            "shed_by_reason": dict(self.shed_by_reason),
+        }
+
+
+class ConcurrencyLimiterRegistry:
+    """Shared registry of per-connector concurrency limiters.
+
+    Connector executors are usually built per call, so limiters must be
+    shared by connector identity for the limit to mean anything.
+    """
+
+    def __init__(
+        self,
+        *,
+        metrics: MetricsCollector | None = None,
+        **defaults: Any,
+    ) -> None:
+        self._metrics = metrics
+        self._defaults = defaults
+        self._limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+
+    def get_or_create(self, name: str, **kwargs: Any) -> AdaptiveConcurrencyLimiter:
+        """Return the limiter for *name*, creating one if absent."""
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            options = {**self._defaults, **kwargs}
+            limiter = AdaptiveConcurrencyLimiter(name, metrics=self._metrics, **options)
+            self._limiters[name] = limiter
+            logger.info("connector_concurrency_limiter_created", connector=name)
+        return limiter
+
+    def get(self, name: str) -> AdaptiveConcurrencyLimiter | None:
+        """Return the limiter for *name* or ``None``."""
+        return self._limiters.get(name)
+
+    def all(self) -> dict[str, AdaptiveConcurrencyLimiter]:
+        """Return a shallow copy of all registered limiters."""
+        return dict(self._limiters)
+
+
+class ConcurrencyLimitMiddleware:
+    """Bound in-flight calls per connector and queue the overflow.
+
+    Sits outside the timeout middleware: queue time is charged against the
+    call's timeout budget and the remaining budget is handed downstream, so
+    a queued call never outlives its original deadline.  Latency samples come
+    from the ``boundary_metrics`` that :class:`MetricsMiddleware` records.
+    """
+
+    def __init__(
+        self,
+        registry: ConcurrencyLimiterRegistry,
+        *,
+        connector_name: str | None = None,
+        default_timeout_seconds: float | None = None,
+        max_queue_wait_seconds: float | None = None,
+    ) -> None:
+        self._registry = registry
+        self._connector_name = connector_name
+        self._default_timeout_seconds = default_timeout_seconds
+        self._max_queue_wait_seconds = max_queue_wait_seconds
+
+    def _budget(self, request: ConnectorRequest) -> float | None:
+        timeout = request.metadata.get("timeout_seconds", self._default_timeout_seconds)
+        budget = float(timeout) if timeout is not None and float(timeout) > 0 else None
+        if self._max_queue_wait_seconds is not None and self._max_queue_wait_seconds > 0:
+            cap = self._max_queue_wait_seconds
+            return cap if budget is None else min(budget, cap)
+        return budget
+
+    async def __call__(
+        self,
+        request: ConnectorRequest,
+        call_next: ConnectorHandler,
+    ) -> Any:
+        limiter = self._registry.get_or_create(self._connector_name or request.connector)
+        waited = await limiter.acquire(timeout=self._budget(request))
+        if waited > 0:
+            request.metadata["concurrency_wait_ms"] = round(waited * 1000, 2)
+            timeout = request.metadata.get("timeout_seconds", self._default_timeout_seconds)
+            if timeout is not None and float(timeout) > 0:
+                request.metadata["timeout_seconds"] = max(float(timeout) - waited, 0.001)
+        started = time.monotonic()
+        try:
+            result = await call_next(request)
+        except Exception as exc:
+            if is_overload_signal(exc):
+                limiter.release(overloaded=True)
+            else:
+                limiter.release()
+            raise
+        except BaseException:
+            limiter.release()
+            raise
+        limiter.release(_observed_latency(request, started))
+        return result
+
+
+def _observed_latency(request: ConnectorRequest, started: float) -> float:
+    metrics = request.metadata.get("boundary_metrics")
+    if isinstance(metrics, dict) and metrics.get("latency_ms") is not None:
+        return float(metrics["latency_ms"]) / 1000
+    return time.monotonic() - started
+
+
+# ---------------------------------------------------------------------------
+# Process-wide accessor (installed by the lifespan)
+# ---------------------------------------------------------------------------
+
+_registry: ConcurrencyLimiterRegistry | None = None
+
+
+def configure_concurrency_limiter_registry(registry: ConcurrencyLimiterRegistry | None) -> None:
+    """Install (or clear, with ``None``) the process-wide limiter registry."""
+    global _registry
+    _registry = registry
+
+
+def get_concurrency_limiter_registry() -> ConcurrencyLimiterRegistry | None:
+    """Return the installed limiter registry, if any."""
+    return _registry
@@ -0,0 +1,229 @@
+"""App-scoped pooled HTTP clients keyed by connector identity.
+
+Outbound connectors (web search/fetch, the reader tool, the ``http_request``
+workflow action, the chat proxy) historically opened a fresh
+``httpx.AsyncClient`` per call, paying TCP/TLS setup every time and never
+reusing a keep-alive connection.  :class:`HTTPClientPool` hands out one
+long-lived client per connector identity (the same ``connector`` string used
+in :class:`~agent33.connectors.models.ConnectorRequest`), each with its own
+connection limits, and closes them all on lifespan shutdown.
+
+Callers use :func:`pooled_client`, which yields the shared client when a pool
+is installed and falls back to a throwaway per-call client otherwise (tests,
+scripts, or ``http_pool_enabled=False``).  Timeouts and redirect behaviour are
+per-request options so one pooled client can serve every call site of a
+connector.
+
+Pooled clients never store cookies: a ``Set-Cookie`` from one call must not be
+replayed on later calls from other callers or tenants sharing the client.
+Callers that need a cookie session pass their own jar to
+:func:`pooled_client`, which then yields a per-call client bound to it.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import importlib.util
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+logger = structlog.get_logger()
+
+
+def http2_available() -> bool:
+    """Return ``True`` when the optional ``h2`` package is importable."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _cookieless_jar() -> CookieJar:
+    """Return a jar whose policy refuses to store or send any cookie."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectorPoolLimits:
+    """Connection limits for one connector's pooled client."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+
+    def to_httpx(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+
+def parse_connector_limits(spec: str) -> dict[str, int]:
+    """Parse ``"tool:web_fetch=20,search:*=10"`` into a pattern -> max map.
+
+    Malformed entries are skipped with a warning rather than failing startup.
+    """
+    limits: dict[str, int] = {}
+    for raw in spec.split(","):
+        entry = raw.strip()
+        if not entry:
+            continue
+        pattern, sep, value = entry.rpartition("=")
+        try:
+            if not sep or not pattern.strip():
+                raise ValueError(entry)
+            limit = int(value)
+            if limit < 1:
+                raise ValueError(entry)
+        except ValueError:
+            logger.warning("http_pool_invalid_connector_limit", entry=entry)
+            continue
+        limits[pattern.strip()] = limit
+    return limits
+
+
+class HTTPClientPool:
+    """Registry of shared ``httpx.AsyncClient`` instances per connector.
+
+    Mirrors :class:`~agent33.connectors.circuit_breaker.CircuitBreakerRegistry`:
+    callers using the same connector identity share one client (and therefore
+    one connection pool) instead of creating independent instances.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_limits: ConnectorPoolLimits | None = None,
+        connector_limits: dict[str, int] | None = None,
+        http2: bool = True,
+    ) -> None:
+        self._default_limits = default_limits or ConnectorPoolLimits()
+        self._connector_limits = dict(connector_limits or {})
+        self._http2 = http2 and http2_available()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._requests: dict[str, int] = {}
+        self._closed = False
+        if http2 and not self._http2:
+            logger.info("http_pool_http2_unavailable", reason="h2 package not installed")
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def limits_for(self, connector: str) -> ConnectorPoolLimits:
+        """Resolve limits for *connector*; exact names win over glob patterns."""
+        max_connections = self._connector_limits.get(connector)
+        if max_connections is None:
+            for pattern, limit in self._connector_limits.items():
+                if fnmatch.fnmatchcase(connector, pattern):
+                    max_connections = limit
+                    break
+        if max_connections is None:
+            return self._default_limits
+        return ConnectorPoolLimits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(
+                max_connections, self._default_limits.max_keepalive_connections
+            ),
+            keepalive_expiry_seconds=self._default_limits.keepalive_expiry_seconds,
+        )
+
+    def client(self, connector: str) -> httpx.AsyncClient:
+        """Return the shared client for *connector*, creating one if absent."""
+        if self._closed:
+            raise RuntimeError("HTTP client pool is closed")
+        client = self._clients.get(connector)
+        if client is None or client.is_closed:
+            limits = self.limits_for(connector)
+            client = httpx.AsyncClient(
+                limits=limits.to_httpx(),
+                http2=self._http2,
+                follow_redirects=False,
+                cookies=_cookieless_jar(),
+            )
+            self._clients[connector] = client
+            logger.info(
+                "http_pool_client_created",
+                connector=connector,
+                max_connections=limits.max_connections,
+                http2=self._http2,
+            )
+        self._requests[connector] = self._requests.get(connector, 0) + 1
+        return client
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return per-connector limits and checkout counts for diagnostics."""
+        return {
+            "http2": self._http2,
+            "closed": self._closed,
+            "connectors": {
+                name: {
+                    "max_connections": self.limits_for(name).max_connections,
+                    "checkouts": self._requests.get(name, 0),
+                    "closed": client.is_closed,
+                }
+                for name, client in sorted(self._clients.items())
+            },
+        }
+
+    async def aclose(self) -> None:
+        """Close every pooled client; further checkouts raise."""
+        self._closed = True
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception:
+                logger.warning("http_pool_client_close_failed", connector=name, exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide accessor (installed by the lifespan)
+# ---------------------------------------------------------------------------
+
+_pool: HTTPClientPool | None = None
+
+
+def configure_http_client_pool(pool: HTTPClientPool | None) -> None:
+    """Install (or clear, with ``None``) the process-wide client pool."""
+    global _pool
+    _pool = pool
+
+
+def get_http_client_pool() -> HTTPClientPool | None:
+    """Return the installed client pool, if any."""
+    return _pool
+
+
+@asynccontextmanager
+async def pooled_client(
+    connector: str, *, cookies: httpx.Cookies | None = None
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield a client for *connector*, shared when a pool is installed.
+
+    The per-call fallback keeps the original semantics (no redirects,
+    closed on exit); callers pass ``timeout=`` and ``follow_redirects=`` per
+    request so both paths behave identically.  Passing *cookies* always
+    yields a per-call client that sends and stores cookies in that jar only.
+    """
+    if cookies is not None:
+        # Bind the caller's jar itself; httpx copies a Cookies instance.
+        async with httpx.AsyncClient(follow_redirects=False, cookies=cookies.jar) as client:
+            yield client
+        return
+    pool = _pool
+    if pool is not None and not pool.closed:
+        yield pool.client(connector)
+        return
+    async with httpx.AsyncClient(follow_redirects=False) as client:
+        yield client
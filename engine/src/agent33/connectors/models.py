@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 @dataclass(slots=True)
@@ -50,6 +50,24 @@ class ConnectorMetricsSummary(BaseModel):
     error_rate: float = 0.0
 
 
+class ConcurrencyLimitSnapshot(BaseModel):
+    """Serializable snapshot of a connector's adaptive concurrency limiter."""
+
+    limit: int
+    min_limit: int = 1
+    max_limit: int = 64
+    in_flight: int = 0
+    queued: int = 0
+    max_queue: int = 128
+    min_latency_ms: float | None = None
+    avg_latency_ms: float | None = None
+    total_admitted: int = 0
+    total_queued: int = 0
+    total_overloads: int = 0
+    total_shed: int = 0
+    shed_by_reason: dict[str, int] = Field(default_factory=dict)
+
+
 class ConnectorStatus(BaseModel):
     """Combined status for a single connector in the fleet."""
 
@@ -59,6 +77,7 @@ class ConnectorStatus(BaseModel):
     state: str = "unknown"
     circuit: CircuitBreakerSnapshot | None = None
     metrics: ConnectorMetricsSummary | None = None
+    concurrency: ConcurrencyLimitSnapshot | None = None
 
 
 class ConnectorHealthSummary(BaseModel):
@@ -2,6 +2,12 @@
 
 Provides periodic evaluation runs that check gate thresholds and detect
 regressions automatically, serving as an early-warning monitoring layer.
+
+Across replicas, schedules are kept in a :class:`SchedulerJobRepository`
+(one :class:`ScheduledJob` per gate schedule) so whichever replica leads the
+scheduler can load them, and gate runs can be handed to any replica through a
+:class:`~agent33.automation.job_dispatch.ScheduledJobDispatcher`.  Run
+history stays on the replica that executed the run.
 """
 
 from __future__ import annotations
@@ -16,6 +22,7 @@ from typing import TYPE_CHECKING
 from apscheduler.triggers.cron import CronTrigger
 from pydantic import BaseModel, Field
 
+from agent33.automation.scheduler import ScheduledJob
 from agent33.evaluation.models import (
     GateResult,
     GateType,
@@ -24,10 +31,15 @@ from agent33.evaluation.models import (
 )
 
 if TYPE_CHECKING:
+    from agent33.automation.job_dispatch import ScheduledJobDispatcher
+    from agent33.automation.scheduler_repository import SchedulerJobRepository
     from agent33.evaluation.service import EvaluationService
 
 logger = logging.getLogger(__name__)
 
+# Surface name of gate runs on the scheduled-job dispatcher.
+GATE_JOB_SURFACE = "evaluation_gate"
+
 
 # ---------------------------------------------------------------------------
 # Models
@@ -89,7 +101,8 @@ class ScheduledGateService:
     """Manages scheduled evaluation gate runs via APScheduler.
 
     Each service instance owns its own ``AsyncIOScheduler`` to avoid coupling
-    with the workflow scheduler lifecycle.
+    with the workflow scheduler lifecycle.  Like the workflow scheduler it can
+    be started paused on standby replicas and resumed by scheduler leadership.
     """
 
     def __init__(
@@ -97,25 +110,36 @@ class ScheduledGateService:
         evaluation_service: EvaluationService,
         max_schedules: int = 50,
         history_retention: int = 100,
+        *,
+        job_repository: SchedulerJobRepository | None = None,
+        dispatcher: ScheduledJobDispatcher | None = None,
     ) -> None:
         from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
         self._evaluation_service = evaluation_service
-        self._scheduler = AsyncIOScheduler()
+        # One catch-up run for gates that fell due while this replica was standby.
+        self._scheduler = AsyncIOScheduler(
+            job_defaults={"coalesce": True, "misfire_grace_time": None}
+        )
         self._max_schedules = max_schedules
         self._history_retention = history_retention
         self._schedules: dict[str, ScheduledGateConfig] = {}
         self._histories: dict[str, ScheduledGateHistory] = {}
         self._running = False
+        self._job_repo = job_repository
+        self._dispatcher = dispatcher
+        if dispatcher is not None:
+            dispatcher.register(GATE_JOB_SURFACE, self._run_dispatched)
 
     # -- lifecycle ------------------------------------------------------------
 
-    async def start(self) -> None:
-        """Start the internal APScheduler."""
+    async def start(self, *, paused: bool = False) -> None:
+        """Start the internal APScheduler with every enabled schedule."""
         if not self._running:
-            self._scheduler.start()
+            self.sync_schedules()
+            self._scheduler.start(paused=paused)
             self._running = True
-            logger.info("scheduled_gate_service_started")
+            logger.info("scheduled_gate_service_started paused=%s", paused)
 
     async def stop(self) -> None:
         """Shut down the internal APScheduler."""
@@ -124,10 +148,42 @@ class ScheduledGateService:
             self._running = False
             logger.info("scheduled_gate_service_stopped")
 
+    async def pause(self) -> None:
+        """Stop firing gate runs (this replica lost scheduler leadership)."""
+        if self._running:
+            self._scheduler.pause()
+
+    async def resume(self) -> None:
+        """Reload schedules and fire gate runs again."""
+        if not self._running:
+            await self.start()
+            return
+        self.sync_schedules()
+        self._scheduler.resume()
+
     @property
     def running(self) -> bool:
         return self._running
 
+    def sync_schedules(self) -> None:
+        """Load schedules from the repository and reconcile APScheduler jobs."""
+        if self._job_repo is not None:
+            stored = {
+                job.job_id: ScheduledGateConfig.model_validate(job.inputs)
+                for job in self._job_repo.list_jobs()
+            }
+            for schedule_id in self._schedules.keys() - stored.keys():
+                self._forget(schedule_id)
+            for config in stored.values():
+                self._remember(config)
+        registered = {job.id for job in self._scheduler.get_jobs()}
+        for schedule_id in registered - self._schedules.keys():
+            with contextlib.suppress(Exception):
+                self._scheduler.remove_job(schedule_id)
+        for schedule_id, config in self._schedules.items():
+            if config.enabled and schedule_id not in registered:
+                self._register_job(config)
+
     # -- CRUD -----------------------------------------------------------------
 
     def create_schedule(self, config: ScheduledGateConfig) -> ScheduledGateConfig:
@@ -157,11 +213,9 @@ class ScheduledGateService:
             if config.cron_expr is not None:
                 raise ValueError("cron_expr must not be set for INTERVAL schedule type")
 
-        self._schedules[config.schedule_id] = config
-        self._histories[config.schedule_id] = ScheduledGateHistory(
-            schedule_id=config.schedule_id,
-            max_history=self._history_retention,
-        )
+        self._remember(config)
+        if self._job_repo is not None:
+            self._job_repo.add_job(self._to_job(config))
 
         # Register with APScheduler if enabled and running
         if config.enabled and self._running:
@@ -177,25 +231,33 @@ class ScheduledGateService:
 
     def remove_schedule(self, schedule_id: str) -> bool:
         """Remove a schedule. Returns True if the schedule existed."""
-        if schedule_id not in self._schedules:
+        if self.get_schedule(schedule_id) is None:
             return False
 
-        # Remove from APScheduler (job may not be registered, e.g. disabled schedule)
-        with contextlib.suppress(Exception):
-            self._scheduler.remove_job(schedule_id)
-
-        del self._schedules[schedule_id]
-        self._histories.pop(schedule_id, None)
+        self._forget(schedule_id)
+        if self._job_repo is not None:
+            self._job_repo.remove_job(schedule_id)
         logger.info("scheduled_gate_removed id=%s", schedule_id)
         return True
 
     def list_schedules(self) -> list[ScheduledGateConfig]:
         """Return all registered schedule configurations."""
+        if self._job_repo is not None:
+            return [
+                ScheduledGateConfig.model_validate(job.inputs)
+                for job in self._job_repo.list_jobs()
+            ]
         return list(self._schedules.values())
 
     def get_schedule(self, schedule_id: str) -> ScheduledGateConfig | None:
-        """Retrieve a schedule by ID."""
-        return self._schedules.get(schedule_id)
+        """Retrieve a schedule by ID (reading through to the repository)."""
+        config = self._schedules.get(schedule_id)
+        if config is None and self._job_repo is not None:
+            job = self._job_repo.get_job(schedule_id)
+            if job is not None:
+                config = ScheduledGateConfig.model_validate(job.inputs)
+                self._remember(config)
+        return config
 
     # -- execution ------------------------------------------------------------
 
@@ -204,7 +266,7 @@ class ScheduledGateService:
 
         Raises ``ValueError`` if the schedule does not exist.
         """
-        config = self._schedules.get(schedule_id)
+        config = self.get_schedule(schedule_id)
         if config is None:
             raise ValueError(f"Schedule not found: {schedule_id}")
         return await self._execute_gate(schedule_id)
@@ -226,27 +288,71 @@ class ScheduledGateService:
 
     # -- internal -------------------------------------------------------------
 
+    def _remember(self, config: ScheduledGateConfig) -> None:
+        self._schedules[config.schedule_id] = config
+        self._histories.setdefault(
+            config.schedule_id,
+            ScheduledGateHistory(
+                schedule_id=config.schedule_id,
+                max_history=self._history_retention,
+            ),
+        )
+
+    def _forget(self, schedule_id: str) -> None:
+        # Remove from APScheduler (job may not be registered, e.g. disabled schedule)
+        with contextlib.suppress(Exception):
+            self._scheduler.remove_job(schedule_id)
+        self._schedules.pop(schedule_id, None)
+        self._histories.pop(schedule_id, None)
+
+    @staticmethod
+    def _to_job(config: ScheduledGateConfig) -> ScheduledJob:
+        return ScheduledJob(
+            job_id=config.schedule_id,
+            workflow_name=f"gate:{config.gate_type.value}",
+            schedule_type=config.schedule_type.value,
+            schedule_expr=(
+                config.cron_expr
+                if config.schedule_type == ScheduleType.CRON
+                else f"{config.interval_seconds}s"
+            )
+            or "",
+            inputs=config.model_dump(mode="json"),
+        )
+
     def _register_job(self, config: ScheduledGateConfig) -> None:
         """Add an APScheduler job for the given config."""
         if config.schedule_type == ScheduleType.CRON:
             trigger = self._build_cron_trigger(config.cron_expr or "")
             self._scheduler.add_job(
-                self._execute_gate,
+                self._fire,
                 trigger=trigger,
                 id=config.schedule_id,
                 args=[config.schedule_id],
+                replace_existing=True,
             )
         elif config.schedule_type == ScheduleType.INTERVAL:
             from apscheduler.triggers.interval import IntervalTrigger
 
             trigger = IntervalTrigger(seconds=config.interval_seconds or 60)
             self._scheduler.add_job(
-                self._execute_gate,
+                self._fire,
                 trigger=trigger,
                 id=config.schedule_id,
                 args=[config.schedule_id],
+                replace_existing=True,
             )
 
+    async def _fire(self, schedule_id: str) -> None:
+        """APScheduler callback: run the gate here or hand it to a replica."""
+        if self._dispatcher is not None:
+            await self._dispatcher.dispatch(GATE_JOB_SURFACE, schedule_id, {})
+            return
+        await self._execute_gate(schedule_id)
+
+    async def _run_dispatched(self, schedule_id: str, payload: dict[str, object]) -> None:
+        await self._execute_gate(schedule_id)
+
     @staticmethod
     def _build_cron_trigger(cron_expr: str) -> CronTrigger:
         """Build and validate an APScheduler cron trigger from a 5-field expression."""
@@ -254,7 +360,7 @@ class ScheduledGateService:
 
     async def _execute_gate(self, schedule_id: str) -> ScheduledGateResult:
         """Internal callback: run an evaluation gate and record the result."""
-        config = self._schedules.get(schedule_id)
+        config = self.get_schedule(schedule_id)
         if config is None:
             result = ScheduledGateResult(
                 schedule_id=schedule_id,
@@ -5,7 +5,7 @@ Public API:
     WorkflowHookContext, RequestHookContext, HookResult, HookChainResult,
     HookDefinition, HookExecutionLog, Hook, HookAbortError, BaseHook,
     HookChainRunner, ConcurrentHookChainRunner, HookRegistry,
-    ScriptHook, ScriptHookDiscovery.
+    ScriptHook, ScriptHookDiscovery, ScriptHookWorkerPool.
 """
 
 from agent33.hooks.chain import ConcurrentHookChainRunner, HookChainRunner
@@ -25,6 +25,7 @@ from agent33.hooks.protocol import BaseHook, HookAbortError
 from agent33.hooks.registry import HookRegistry
 from agent33.hooks.script_discovery import ScriptHookDiscovery
 from agent33.hooks.script_hook import ScriptHook
+from agent33.hooks.script_worker import ScriptHookWorkerPool
 
 __all__ = [
     "AgentHookContext",
@@ -42,6 +43,7 @@ __all__ = [
     "RequestHookContext",
     "ScriptHook",
     "ScriptHookDiscovery",
+    "ScriptHookWorkerPool",
     "ToolHookContext",
     "WorkflowHookContext",
 ]
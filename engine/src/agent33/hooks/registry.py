@@ -8,6 +8,7 @@ from collections import defaultdict
 from typing import TYPE_CHECKING, Any
 
 from agent33.hooks.chain import HookChainRunner
+from agent33.hooks.script_hook import ScriptHook
 
 if TYPE_CHECKING:
     from agent33.hooks.models import HookDefinition
@@ -318,9 +319,15 @@ class HookRegistry:
         for et, hooks in self._hooks.items():
             if hooks:
                 by_event[et] = len(hooks)
+        script_hooks: dict[str, dict[str, Any]] = {}
+        for hooks in self._hooks.values():
+            for hook in hooks:
+                if isinstance(hook, ScriptHook):
+                    script_hooks[hook.name] = hook.stats()
         return {
             "total_hooks": total,
             "total_definitions": len(self._definitions),
             "by_event_type": by_event,
             "event_types_active": len(by_event),
+            "script_hooks": script_hooks,
         }
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 from typing import TYPE_CHECKING
 
 from agent33.hooks.script_hook import ScriptHook
+from agent33.hooks.script_worker import uses_worker_protocol
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -37,6 +39,10 @@ class ScriptHookDiscovery:
     For example:
         session.start--purpose-gate.py
         tool.execute.pre--damage-control.sh
+
+    Scripts containing the ``agent33-hook-protocol: jsonl`` marker are run as
+    persistent worker pools (*worker_pool_size* workers each) when
+    *worker_mode_enabled* is set; all others are spawned per event.
     """
 
     def __init__(
@@ -46,13 +52,18 @@ class ScriptHookDiscovery:
         user_hooks_dir: Path | None = None,
         default_timeout_ms: float = 5000.0,
         max_timeout_ms: float = 30000.0,
+        worker_mode_enabled: bool = True,
+        worker_pool_size: int = 2,
     ) -> None:
         self._registry = hook_registry
         self._project_dir = project_hooks_dir
         self._user_dir = user_hooks_dir
         self._default_timeout_ms = default_timeout_ms
         self._max_timeout_ms = max_timeout_ms
+        self._worker_mode_enabled = worker_mode_enabled
+        self._worker_pool_size = worker_pool_size
         self._discovered: dict[str, ScriptHook] = {}
+        self._retiring: set[asyncio.Task[None]] = set()
 
     @property
     def discovered_hooks(self) -> dict[str, ScriptHook]:
@@ -98,6 +109,11 @@ class ScriptHookDiscovery:
                     timeout_ms=min(self._default_timeout_ms, self._max_timeout_ms),
                     fail_mode="open",
                     priority=200,
+                    worker_pool_size=(
+                        self._worker_pool_size
+                        if self._worker_mode_enabled and uses_worker_protocol(script_path)
+                        else 0
+                    ),
                 )
                 self._registry.register(hook)
                 self._discovered[hook_name] = hook
@@ -122,13 +138,46 @@ class ScriptHookDiscovery:
         """Re-scan filesystem and re-register hooks.
 
         Deregisters previously discovered hooks first, then re-discovers.
+        Worker pools of the replaced hooks are closed on the running loop.
         """
         # Deregister previously discovered hooks
         for _hook_name, hook in self._discovered.items():
             self._registry.deregister(hook.name, hook.event_type)
+        retired = [hook for hook in self._discovered.values() if hook.worker_pool is not None]
         self._discovered.clear()
+        self._retire(retired)
         return self.discover()
 
+    async def aclose(self) -> None:
+        """Stop persistent workers of all discovered (and retired) hooks."""
+        for hook in self._discovered.values():
+            await hook.aclose()
+        if self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+
+    def _retire(self, hooks: list[ScriptHook]) -> None:
+        if not hooks:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to reap on: the workers can only be signalled.
+            for hook in hooks:
+                if hook.worker_pool is not None:
+                    hook.worker_pool.terminate()
+            return
+        task = loop.create_task(self._close_retired(hooks))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    @staticmethod
+    async def _close_retired(hooks: list[ScriptHook]) -> None:
+        for hook in hooks:
+            try:
+                await hook.aclose()
+            except Exception:
+                logger.warning("script_hook_close_failed name=%s", hook.name, exc_info=True)
+
     @staticmethod
     def _parse_hook_filename(path: Path) -> tuple[str, str] | None:
         """Parse '<event-type>--<hook-name>[.ext]' -> (event_type, name).
@@ -9,9 +9,11 @@ import os
 import shutil
 import subprocess
 import sys
+import time
 from typing import TYPE_CHECKING, Any, Literal
 
 from agent33.hooks.protocol import BaseHook
+from agent33.hooks.script_worker import HookLatencyStats, ScriptHookWorkerPool
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
@@ -29,6 +31,10 @@ class ScriptHook(BaseHook):
     and reading modified context from stdout. Enforces per-hook timeout.
     Fail-open by default: if the script crashes, returns exit code != 0,
     or times out, the chain continues.
+
+    When *worker_pool_size* is positive the script runs as a pool of
+    persistent workers speaking the line-delimited JSON protocol (see
+    :mod:`agent33.hooks.script_worker`) instead of being spawned per event.
     """
 
     def __init__(
@@ -41,6 +47,7 @@ class ScriptHook(BaseHook):
         fail_mode: Literal["open", "closed"] = "open",
         priority: int = 200,
         tenant_id: str = "",
+        worker_pool_size: int = 0,
     ) -> None:
         super().__init__(
             name=name,
@@ -53,6 +60,21 @@ class ScriptHook(BaseHook):
         self._timeout_ms = timeout_ms
         self._fail_mode = fail_mode
         self._execution_log: list[dict[str, Any]] = []
+        self._worker_pool: ScriptHookWorkerPool | None = None
+        if worker_pool_size > 0:
+            try:
+                self._worker_pool = ScriptHookWorkerPool(
+                    _build_command(script_path),
+                    env=dict(os.environ),
+                    max_workers=worker_pool_size,
+                )
+            except (ValueError, FileNotFoundError) as exc:
+                logger.warning(
+                    "script_hook_worker_mode_unavailable name=%s error=%s",
+                    name,
+                    exc,
+                )
+        self._latency = HookLatencyStats()
 
     @property
     def script_path(self) -> Path:
@@ -67,12 +89,33 @@ class ScriptHook(BaseHook):
         """Recent execution log entries for diagnostics."""
         return list(self._execution_log[-50:])
 
+    @property
+    def worker_pool(self) -> ScriptHookWorkerPool | None:
+        """Persistent worker pool, or ``None`` when running spawn-per-event."""
+        return self._worker_pool
+
+    def stats(self) -> dict[str, Any]:
+        """Latency/outcome counters (and worker pool state in worker mode)."""
+        stats: dict[str, Any] = {
+            "mode": "worker" if self._worker_pool is not None else "spawn",
+            "event_type": self._event_type,
+            **self._latency.snapshot(),
+        }
+        if self._worker_pool is not None:
+            stats["pool"] = self._worker_pool.stats()
+        return stats
+
+    async def aclose(self) -> None:
+        """Stop persistent workers, if any."""
+        if self._worker_pool is not None:
+            await self._worker_pool.aclose()
+
     async def execute(
         self,
         context: HookContext,
         call_next: Callable[[HookContext], Awaitable[HookContext]],
     ) -> HookContext:
-        """Run the script subprocess, enforce timeout, parse output."""
+        """Run the script (subprocess or worker), enforce timeout, parse output."""
         if not self._script_path.exists():
             logger.warning(
                 "script_hook_missing path=%s name=%s",
@@ -81,39 +124,36 @@ class ScriptHook(BaseHook):
             )
             return await call_next(context)
 
-        # Build environment for subprocess
-        env = dict(os.environ)
-        env["AGENT33_EVENT_TYPE"] = context.event_type
-        env["AGENT33_TENANT_ID"] = context.tenant_id
+        # Per-event variables: exported as env in spawn mode, sent inline to workers
+        event_env = {
+            "AGENT33_EVENT_TYPE": context.event_type,
+            "AGENT33_TENANT_ID": context.tenant_id,
+        }
         session_id = context.metadata.get("session_id", "")
         if session_id:
-            env["AGENT33_SESSION_ID"] = str(session_id)
+            event_env["AGENT33_SESSION_ID"] = str(session_id)
         session_base_dir = context.metadata.get("session_base_dir", "")
         if session_base_dir:
-            env["AGENT33_SESSION_BASE_DIR"] = str(session_base_dir)
-
-        # Serialize context to JSON for stdin
-        stdin_data = json.dumps(
-            {
-                "event_type": context.event_type,
-                "tenant_id": context.tenant_id,
-                "metadata": context.metadata,
-            }
-        )
+            event_env["AGENT33_SESSION_BASE_DIR"] = str(session_base_dir)
+
+        request = {
+            "event_type": context.event_type,
+            "tenant_id": context.tenant_id,
+            "metadata": context.metadata,
+        }
 
         log_entry: dict[str, Any] = {
             "hook_name": self._name,
             "script_path": str(self._script_path),
             "event_type": context.event_type,
         }
+        started = time.perf_counter()
 
         try:
-            cmd = _build_command(self._script_path)
-            result = await asyncio.wait_for(
-                _run_subprocess(cmd, stdin_data, env),
+            output, stderr, returncode = await asyncio.wait_for(
+                self._invoke(request, event_env),
                 timeout=self._timeout_ms / 1000.0,
             )
-            stdout, stderr, returncode = result
 
             log_entry["returncode"] = returncode
             log_entry["stderr"] = stderr or ""
@@ -132,7 +172,7 @@ class ScriptHook(BaseHook):
                     _stderr_excerpt(stderr, limit=200),
                 )
                 log_entry["success"] = False
-                self._execution_log.append(log_entry)
+                self._record(log_entry, started)
                 if self._fail_mode == "closed":
                     context.abort = True
                     context.abort_reason = (
@@ -141,30 +181,22 @@ class ScriptHook(BaseHook):
                     return context
                 return await call_next(context)
 
-            # Parse stdout for context modifications
-            if stdout and stdout.strip():
-                try:
-                    output = json.loads(stdout)
-                    if isinstance(output, dict):
-                        if output.get("abort"):
-                            context.abort = True
-                            context.abort_reason = output.get(
-                                "abort_reason",
-                                f"Script hook '{self._name}' requested abort",
-                            )
-                            log_entry["abort"] = True
-                            self._execution_log.append(log_entry)
-                            return context
-                        if "metadata" in output and isinstance(output["metadata"], dict):
-                            context.metadata.update(output["metadata"])
-                except json.JSONDecodeError:
-                    logger.debug(
-                        "script_hook_stdout_not_json name=%s",
-                        self._name,
+            # Apply context modifications
+            if output is not None:
+                if output.get("abort"):
+                    context.abort = True
+                    context.abort_reason = output.get(
+                        "abort_reason",
+                        f"Script hook '{self._name}' requested abort",
                     )
+                    log_entry["abort"] = True
+                    self._record(log_entry, started, success=True)
+                    return context
+                if "metadata" in output and isinstance(output["metadata"], dict):
+                    context.metadata.update(output["metadata"])
 
             log_entry["success"] = True
-            self._execution_log.append(log_entry)
+            self._record(log_entry, started)
             return await call_next(context)
 
         except TimeoutError:
@@ -175,7 +207,7 @@ class ScriptHook(BaseHook):
             )
             log_entry["success"] = False
             log_entry["error"] = "timeout"
-            self._execution_log.append(log_entry)
+            self._record(log_entry, started, timed_out=True)
             if self._fail_mode == "closed":
                 context.abort = True
                 context.abort_reason = (
@@ -191,13 +223,58 @@ class ScriptHook(BaseHook):
             )
             log_entry["success"] = False
             log_entry["error"] = str(exc)
-            self._execution_log.append(log_entry)
+            self._record(log_entry, started)
             if self._fail_mode == "closed":
                 context.abort = True
                 context.abort_reason = f"Script hook '{self._name}' failed: {exc}"
                 return context
             return await call_next(context)
 
+    async def _invoke(
+        self,
+        request: dict[str, Any],
+        event_env: dict[str, str],
+    ) -> tuple[dict[str, Any] | None, str, int]:
+        """Run one hook invocation, returning ``(output, stderr, returncode)``."""
+        if self._worker_pool is not None:
+            response = await self._worker_pool.call({**request, "env": event_env})
+            error = response.get("error")
+            if error:
+                return None, str(error), int(response.get("returncode") or 1)
+            return response, "", 0
+
+        cmd = _build_command(self._script_path)
+        env = {**os.environ, **event_env}
+        stdout, stderr, returncode = await _run_subprocess(cmd, json.dumps(request), env)
+        output: dict[str, Any] | None = None
+        if returncode == 0 and stdout and stdout.strip():
+            try:
+                parsed = json.loads(stdout)
+            except json.JSONDecodeError:
+                logger.debug(
+                    "script_hook_stdout_not_json name=%s",
+                    self._name,
+                )
+            else:
+                if isinstance(parsed, dict):
+                    output = parsed
+        return output, stderr, returncode
+
+    def _record(
+        self,
+        log_entry: dict[str, Any],
+        started: float,
+        *,
+        success: bool | None = None,
+        timed_out: bool = False,
+    ) -> None:
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        log_entry["duration_ms"] = round(duration_ms, 3)
+        self._execution_log.append(log_entry)
+        del self._execution_log[:-50]
+        ok = bool(log_entry.get("success")) if success is None else success
+        self._latency.record(duration_ms, success=ok, timed_out=timed_out)
+
 
 def _build_command(script_path: Path) -> list[str]:
     """Build the subprocess command based on script extension."""
@@ -0,0 +1,289 @@
+"""Persistent worker pools for script hooks speaking a line-delimited JSON protocol.
+
+Spawning a fresh interpreter for every hook firing adds tens of milliseconds
+to hot events such as ``tool.execute.pre``.  Scripts that opt in by including
+the :data:`WORKER_PROTOCOL_MARKER` comment near the top of the file are
+instead started once and kept alive.  Each request is a single JSON line on
+the worker's stdin::
+
+    {"id": 1, "event_type": "...", "tenant_id": "...", "metadata": {...}, "env": {...}}
+
+and the worker answers with a single JSON line on stdout carrying the same
+``id`` plus the usual script hook output keys (``metadata``, ``abort``,
+``abort_reason``).  A worker may report a failure with ``"error": "..."``
+(treated like a non-zero exit code in spawn mode).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import subprocess
+import sys
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+WORKER_PROTOCOL_MARKER = "agent33-hook-protocol: jsonl"
+"""Comment marker that opts a script hook into persistent worker mode."""
+
+_MARKER_SCAN_BYTES = 2048
+_STREAM_LIMIT = 1024 * 1024  # max bytes for a single protocol line
+
+
+class HookWorkerError(RuntimeError):
+    """Raised when a hook worker crashes or violates the protocol."""
+
+
+def uses_worker_protocol(script_path: Path) -> bool:
+    """Return True when *script_path* declares the JSONL worker protocol."""
+    try:
+        with script_path.open("rb") as handle:
+            head = handle.read(_MARKER_SCAN_BYTES)
+    except OSError:
+        return False
+    return WORKER_PROTOCOL_MARKER.encode() in head
+
+
+class HookLatencyStats:
+    """Rolling latency and outcome counters for a single script hook."""
+
+    def __init__(self, window: int = 512) -> None:
+        self._samples: deque[float] = deque(maxlen=max(1, window))
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float, *, success: bool, timed_out: bool = False) -> None:
+        self.calls += 1
+        if not success:
+            self.failures += 1
+        if timed_out:
+            self.timeouts += 1
+        self.max_ms = max(self.max_ms, duration_ms)
+        self._samples.append(duration_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        ordered = sorted(self._samples)
+
+        def _pct(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+            return round(ordered[index], 3)
+
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "avg_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+            "p50_ms": _pct(0.50),
+            "p95_ms": _pct(0.95),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class _HookWorker:
+    """One long-lived script process handling one request at a time."""
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self._proc = proc
+        self._next_id = 0
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+    @classmethod
+    async def start(cls, cmd: list[str], env: dict[str, str]) -> _HookWorker:
+        if sys.platform == "win32":
+            proc = await asyncio.create_subprocess_shell(
+                subprocess.list2cmdline(cmd),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                limit=_STREAM_LIMIT,
+            )
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                limit=_STREAM_LIMIT,
+            )
+        return cls(proc)
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.returncode is None
+
+    async def request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Send one request line and wait for the matching response line."""
+        assert self._proc.stdin is not None
+        assert self._proc.stdout is not None
+        self._next_id += 1
+        request_id = self._next_id
+        line = json.dumps({"id": request_id, **payload}) + "\n"
+        try:
+            self._proc.stdin.write(line.encode())
+            await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise HookWorkerError(f"worker stdin closed: {exc}") from exc
+
+        raw = await self._proc.stdout.readline()
+        if not raw:
+            raise HookWorkerError(f"worker exited with code {self._proc.returncode}")
+        try:
+            response = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise HookWorkerError("worker emitted a non-JSON response line") from exc
+        if not isinstance(response, dict) or response.get("id") != request_id:
+            raise HookWorkerError("worker response id does not match request")
+        return response
+
+    async def _drain_stderr(self) -> None:
+        if self._proc.stderr is None:
+            return
+        while True:
+            raw = await self._proc.stderr.readline()
+            if not raw:
+                return
+            logger.debug(
+                "script_hook_worker_stderr pid=%s line=%s",
+                self._proc.pid,
+                raw.decode("utf-8", errors="replace").rstrip(),
+            )
+
+    def signal_kill(self) -> None:
+        """Send SIGKILL without reaping (only for teardown without a running loop)."""
+        if self.alive:
+            with contextlib.suppress(ProcessLookupError):
+                self._proc.kill()
+        self._stderr_task.cancel()
+
+    async def kill(self) -> None:
+        """Terminate the process immediately and reap it."""
+        self.signal_kill()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._stderr_task
+        await self._proc.wait()
+
+    async def close(self, grace_seconds: float = 1.0) -> None:
+        """Close stdin so the worker can exit cleanly, then kill stragglers."""
+        if self.alive and self._proc.stdin is not None:
+            with contextlib.suppress(Exception):
+                self._proc.stdin.close()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._proc.wait(), timeout=grace_seconds)
+        await self.kill()
+
+
+class ScriptHookWorkerPool:
+    """Pool of persistent workers for one script hook.
+
+    Workers are spawned lazily up to *max_workers*; each handles a single
+    in-flight request, so *max_workers* is also the hook's concurrency limit
+    and additional callers queue.  A worker that crashes, times out, or
+    breaks the protocol is killed and replaced on the next call.
+    """
+
+    def __init__(
+        self,
+        cmd: list[str],
+        *,
+        env: dict[str, str],
+        max_workers: int = 2,
+    ) -> None:
+        self._cmd = list(cmd)
+        self._env = {**env, "AGENT33_HOOK_PROTOCOL": "jsonl"}
+        self._max_workers = max(1, max_workers)
+        self._slots = asyncio.Semaphore(self._max_workers)
+        self._idle: list[_HookWorker] = []
+        self._busy: set[_HookWorker] = set()
+        self._started = 0
+        self._restarts = 0
+        self._crashes = 0
+        self._pending_replacements = 0
+        self._closed = False
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    async def call(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Run one request on an idle (or freshly spawned) worker."""
+        if self._closed:
+            raise HookWorkerError("worker pool is closed")
+        async with self._slots:
+            worker = await self._checkout()
+            try:
+                response = await worker.request(payload)
+            except BaseException:
+                # Timeout/cancellation or protocol failure: the worker's state is
+                # unknown, so it is never reused.
+                self._busy.discard(worker)
+                self._crashes += 1
+                self._pending_replacements += 1
+                # Shielded so a second cancellation cannot leave it unreaped.
+                await asyncio.shield(worker.kill())
+                raise
+            self._busy.discard(worker)
+            if worker.alive and not self._closed:
+                self._idle.append(worker)
+            else:
+                await worker.kill()
+            return response
+
+    async def _checkout(self) -> _HookWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                self._busy.add(worker)
+                return worker
+            self._crashes += 1
+            self._pending_replacements += 1
+            await worker.kill()
+        if self._pending_replacements:
+            self._pending_replacements -= 1
+            self._restarts += 1
+        worker = await _HookWorker.start(self._cmd, self._env)
+        self._started += 1
+        self._busy.add(worker)
+        return worker
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_workers": self._max_workers,
+            "idle_workers": len(self._idle),
+            "busy_workers": len(self._busy),
+            "workers_started": self._started,
+            "worker_restarts": self._restarts,
+            "worker_crashes": self._crashes,
+        }
+
+    def terminate(self) -> None:
+        """Kill all workers without reaping them.
+
+        Only for teardown when no event loop is running; use :meth:`aclose`
+        otherwise.
+        """
+        self._closed = True
+        for worker in [*self._idle, *self._busy]:
+            worker.signal_kill()
+        self._idle.clear()
+        self._busy.clear()
+
+    async def aclose(self) -> None:
+        """Gracefully stop all workers."""
+        self._closed = True
+        workers = [*self._idle, *self._busy]
+        self._idle.clear()
+        self._busy.clear()
+        await asyncio.gather(*(worker.close() for worker in workers), return_exceptions=True)
@@ -8,6 +8,7 @@ via regex.
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import re
 from pathlib import Path
@@ -131,12 +132,21 @@ class GitHubAdapter:
     """Fetches README and top-level markdown files from a GitHub repo.
 
     Uses the GitHub REST API. The ``source.url`` should be in the format
-    ``https://github.com/{owner}/{repo}`` or just ``{owner}/{repo}``.
+    ``https://github.com/{owner}/{repo}`` or just ``{owner}/{repo}``. The
+    README, the tree listing, and the individual markdown files are fetched
+    concurrently (at most ``max_concurrency`` requests in flight); chunk order
+    stays README first, then files in tree order.
     """
 
-    def __init__(self, timeout: float = 30.0, max_chars_per_file: int = 2000) -> None:
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_chars_per_file: int = 2000,
+        max_concurrency: int = 4,
+    ) -> None:
         self._timeout = timeout
         self._max_chars = max_chars_per_file
+        self._max_concurrency = max(1, max_concurrency)
 
     def _parse_owner_repo(self, url: str) -> tuple[str, str]:
         """Extract (owner, repo) from a GitHub URL or shorthand."""
@@ -158,38 +168,47 @@ class GitHubAdapter:
 
         raise ValueError(f"Cannot parse GitHub owner/repo from: {url!r}")
 
+    def _decode_content(self, resp: httpx.Response) -> str | None:
+        if resp.status_code != 200:
+            return None
+        content_b64 = resp.json().get("content", "")
+        if not content_b64:
+            return None
+        decoded = base64.b64decode(content_b64).decode("utf-8", errors="replace")
+        return decoded[: self._max_chars]
+
     async def fetch(self, source: KnowledgeSource) -> list[str]:
         if not source.url:
             return []
 
         owner, repo = self._parse_owner_repo(source.url)
-        chunks: list[str] = []
         headers = {"Accept": "application/vnd.github.v3+json"}
+        api = f"https://api.github.com/repos/{owner}/{repo}"
+        semaphore = asyncio.Semaphore(self._max_concurrency)
 
         async with httpx.AsyncClient(timeout=self._timeout) as client:
-            # Fetch README
-            readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-            try:
-                resp = await client.get(readme_url, headers=headers)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    content_b64 = data.get("content", "")
-                    if content_b64:
-                        decoded = base64.b64decode(content_b64).decode("utf-8", errors="replace")
-                        chunks.append(decoded[: self._max_chars])
-            except Exception as exc:
-                logger.warning(
-                    "github_readme_fetch_failed",
-                    owner=owner,
-                    repo=repo,
-                    error=str(exc),
-                )
 
-            # Fetch tree to find additional .md files
-            tree_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/HEAD?recursive=1"
-            try:
-                resp = await client.get(tree_url, headers=headers)
-                if resp.status_code == 200:
+            async def _get(url: str) -> httpx.Response:
+                async with semaphore:
+                    return await client.get(url, headers=headers)
+
+            async def _readme() -> str | None:
+                try:
+                    return self._decode_content(await _get(f"{api}/readme"))
+                except Exception as exc:
+                    logger.warning(
+                        "github_readme_fetch_failed",
+                        owner=owner,
+                        repo=repo,
+                        error=str(exc),
+                    )
+                    return None
+
+            async def _markdown_files() -> list[str]:
+                try:
+                    resp = await _get(f"{api}/git/trees/HEAD?recursive=1")
+                    if resp.status_code != 200:
+                        return []
                     tree = resp.json().get("tree", [])
                     md_paths = [
                         entry["path"]
@@ -199,27 +218,26 @@ class GitHubAdapter:
                         and "/" not in entry["path"]  # top-level only
                         and entry["path"].upper() != "README.MD"
                     ]
-                    for md_path in md_paths[:10]:  # limit to 10 files
-                        file_url = (
-                            f"https://api.github.com/repos/{owner}/{repo}/contents/{md_path}"
-                        )
-                        file_resp = await client.get(file_url, headers=headers)
-                        if file_resp.status_code == 200:
-                            file_data = file_resp.json()
-                            content_b64 = file_data.get("content", "")
-                            if content_b64:
-                                decoded = base64.b64decode(content_b64).decode(
-                                    "utf-8", errors="replace"
-                                )
-                                chunks.append(decoded[: self._max_chars])
-            except Exception as exc:
-                logger.warning(
-                    "github_tree_fetch_failed",
-                    owner=owner,
-                    repo=repo,
-                    error=str(exc),
-                )
-
+                    responses = await asyncio.gather(
+                        *(_get(f"{api}/contents/{path}") for path in md_paths[:10])
+                    )
+                    return [
+                        content
+                        for content in map(self._decode_content, responses)
+                        if content is not None
+                    ]
+                except Exception as exc:
+                    logger.warning(
+                        "github_tree_fetch_failed",
+                        owner=owner,
+                        repo=repo,
+                        error=str(exc),
+                    )
+                    return []
+
+            readme, files = await asyncio.gather(_readme(), _markdown_files())
+
+        chunks = ([readme] if readme is not None else []) + files
         logger.info("github_fetched", source_id=source.id, chunks=len(chunks))
         return chunks
 
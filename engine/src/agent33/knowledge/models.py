@@ -40,5 +40,9 @@ class IngestionResult(BaseModel):
     source_id: str
     status: Literal["success", "skipped", "error"]
     chunks_ingested: int = 0
+    chunks_skipped: int = 0  # unchanged chunks whose embeddings were reused
+    chunks_removed: int = 0  # chunks no longer present in the source
+    skip_ratio: float = 0.0
+    duration_ms: float = 0.0
     error: str | None = None
     ingested_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
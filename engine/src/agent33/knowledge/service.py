@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import hashlib
 import re
+import time
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -16,6 +18,7 @@ from agent33.knowledge.scheduler import KnowledgeIngestionScheduler
 if TYPE_CHECKING:
     from agent33.memory.embeddings import EmbeddingProvider
     from agent33.memory.long_term import LongTermMemory
+    from agent33.observability.metrics import MetricsCollector
 
 logger = structlog.get_logger()
 
@@ -27,6 +30,21 @@ def _slugify(name: str) -> str:
     return _SLUG_RE.sub("-", name.lower()).strip("-")[:64]
 
 
+def _chunk_hash(chunk: str) -> str:
+    """Content address of a single chunk."""
+    return hashlib.sha256(chunk.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class _ChunkDiff:
+    """Outcome of reconciling one fetch against the stored chunk index."""
+
+    stored: int = 0
+    skipped: int = 0
+    removed: int = 0
+    complete: bool = True
+
+
 class KnowledgeIngestionService:
     """Orchestrates knowledge source management, scheduling, and ingestion.
 
@@ -36,7 +54,9 @@ class KnowledgeIngestionService:
 
     1. Fetches raw chunks via the appropriate adapter.
     2. Computes a content hash for staleness detection.
-    3. If content changed, embeds each chunk and stores in long-term memory.
+    3. If content changed, diffs per-chunk content hashes against the chunks
+       already stored for the source, embeds only new chunks (in batches),
+       and deletes records for chunks that disappeared.
     4. Records the result in the source's last_ingested_at / last_content_hash.
     """
 
@@ -45,12 +65,21 @@ class KnowledgeIngestionService:
         long_term_memory: LongTermMemory | None,
         embedding_provider: EmbeddingProvider | None,
         default_tenant_id: str = "system",
+        *,
+        embed_batch_size: int = 32,
+        metrics: MetricsCollector | None = None,
     ) -> None:
         self._ltm = long_term_memory
         self._embedder = embedding_provider
         self._default_tenant = default_tenant_id
+        self._embed_batch_size = max(1, embed_batch_size)
+        self._metrics = metrics
         self._sources: dict[str, KnowledgeSource] = {}
         self._results: dict[str, IngestionResult] = {}
+        self._chunk_indexes: dict[str, dict[str, int]] = {}
+        # Stored records of a source that no chunk hash points at (stored
+        # before chunks were hashed, or duplicates); deleted on the next sync.
+        self._chunk_orphans: dict[str, list[int]] = {}
         self._scheduler = KnowledgeIngestionScheduler(on_ingest=self.ingest_source)
 
     # -- lifecycle -----------------------------------------------------------
@@ -117,6 +146,8 @@ class KnowledgeIngestionService:
         self._scheduler.remove_source(source_id)
         del self._sources[source_id]
         self._results.pop(source_id, None)
+        self._chunk_indexes.pop(source_id, None)
+        self._chunk_orphans.pop(source_id, None)
         logger.info("knowledge_source_removed", source_id=source_id)
         return True
 
@@ -140,6 +171,7 @@ class KnowledgeIngestionService:
         This is called both by the scheduler (on cron) and by the manual
         trigger API endpoint.
         """
+        started = time.perf_counter()
         source = self._sources.get(source_id)
         if source is None:
             result = IngestionResult(
@@ -160,8 +192,7 @@ class KnowledgeIngestionService:
                     status="skipped",
                     error="No content fetched",
                 )
-                self._results[source_id] = result
-                return result
+                return self._finish(result, started)
 
             # Staleness detection via content hash
             raw_content = "\n".join(chunks)
@@ -171,35 +202,43 @@ class KnowledgeIngestionService:
                 result = IngestionResult(
                     source_id=source_id,
                     status="skipped",
+                    chunks_skipped=len(chunks),
+                    skip_ratio=1.0,
                 )
-                self._results[source_id] = result
                 logger.info(
                     "knowledge_ingestion_skipped_stale",
                     source_id=source_id,
                 )
-                return result
+                return self._finish(result, started)
 
-            # Write chunks to long-term memory
-            chunks_stored = await self._store_chunks(chunks, source)
+            # Diff chunks against what is already stored and apply the delta
+            diff = await self._sync_chunks(chunks, source)
 
-            # Update source metadata
+            # Update source metadata. A partial sync leaves the source hash
+            # untouched so the next run retries only the chunks that failed.
             now = datetime.now(UTC)
             source.last_ingested_at = now
-            source.last_content_hash = content_hash
+            if diff.complete:
+                source.last_content_hash = content_hash
 
+            total = diff.stored + diff.skipped
             result = IngestionResult(
                 source_id=source_id,
                 status="success",
-                chunks_ingested=chunks_stored,
+                chunks_ingested=diff.stored,
+                chunks_skipped=diff.skipped,
+                chunks_removed=diff.removed,
+                skip_ratio=round(diff.skipped / total, 4) if total else 0.0,
                 ingested_at=now,
             )
-            self._results[source_id] = result
             logger.info(
                 "knowledge_ingestion_success",
                 source_id=source_id,
-                chunks=chunks_stored,
+                chunks=diff.stored,
+                skipped=diff.skipped,
+                removed=diff.removed,
             )
-            return result
+            return self._finish(result, started)
 
         except Exception as exc:
             result = IngestionResult(
@@ -207,48 +246,144 @@ class KnowledgeIngestionService:
                 status="error",
                 error=str(exc),
             )
-            self._results[source_id] = result
             logger.warning(
                 "knowledge_ingestion_error",
                 source_id=source_id,
                 error=str(exc),
             )
-            return result
+            return self._finish(result, started)
+
+    def _finish(self, result: IngestionResult, started: float) -> IngestionResult:
+        """Stamp duration, record per-source metrics, and remember *result*."""
+        elapsed = time.perf_counter() - started
+        result.duration_ms = round(elapsed * 1000, 3)
+        self._results[result.source_id] = result
+        if self._metrics is not None:
+            labels = {"source_id": result.source_id}
+            self._metrics.observe(
+                "knowledge_ingestion_duration_seconds",
+                elapsed,
+                {**labels, "status": result.status},
+            )
+            if result.status != "error":
+                self._metrics.observe("knowledge_ingestion_skip_ratio", result.skip_ratio, labels)
+            if result.chunks_ingested and elapsed > 0:
+                self._metrics.observe(
+                    "knowledge_ingestion_chunks_per_second",
+                    result.chunks_ingested / elapsed,
+                    labels,
+                )
+        return result
+
+    async def _chunk_index(self, source: KnowledgeSource) -> dict[str, int]:
+        """Return ``{chunk_hash: record_id}`` for chunks stored from *source*.
 
-    async def _store_chunks(self, chunks: list[str], source: KnowledgeSource) -> int:
-        """Embed and store chunks in long-term memory. Returns count stored."""
+        The index is rebuilt from memory-record metadata the first time a
+        source is synced in this process, so restarts do not re-embed.  If
+        the records cannot be listed the error propagates: syncing against an
+        empty index would store every chunk a second time.
+        """
+        index = self._chunk_indexes.get(source.id)
+        if index is not None:
+            return index
+        index = {}
+        orphans: list[int] = []
+        if self._ltm is not None:
+            try:
+                records = await self._ltm.find_by_metadata(
+                    {"source_id": source.id, "tenant_id": source.tenant_id}
+                )
+            except Exception as exc:
+                logger.warning(
+                    "knowledge_chunk_index_load_failed",
+                    source_id=source.id,
+                    error=str(exc),
+                )
+                raise
+            for record_id, metadata in records.items():
+                chunk_hash = metadata.get("chunk_hash")
+                if isinstance(chunk_hash, str) and chunk_hash not in index:
+                    index[chunk_hash] = record_id
+                else:
+                    orphans.append(record_id)
+        self._chunk_indexes[source.id] = index
+        self._chunk_orphans[source.id] = orphans
+        return index
+
+    async def _sync_chunks(self, chunks: list[str], source: KnowledgeSource) -> _ChunkDiff:
+        """Embed new chunks in batches and tombstone chunks that disappeared."""
         if self._ltm is None or self._embedder is None:
             logger.warning(
                 "knowledge_store_skipped",
                 reason="no LTM or embedder",
                 source_id=source.id,
             )
-            return 0
+            return _ChunkDiff()
 
-        stored = 0
+        wanted: dict[str, str] = {}
         for chunk in chunks:
-            if not chunk.strip():
-                continue
+            if chunk.strip():
+                wanted.setdefault(_chunk_hash(chunk), chunk)
+
+        index = await self._chunk_index(source)
+        new_hashes = [chunk_hash for chunk_hash in wanted if chunk_hash not in index]
+        gone = {chunk_hash: index[chunk_hash] for chunk_hash in index if chunk_hash not in wanted}
+        diff = _ChunkDiff(skipped=len(wanted) - len(new_hashes))
+
+        for offset in range(0, len(new_hashes), self._embed_batch_size):
+            batch = new_hashes[offset : offset + self._embed_batch_size]
+            texts = [wanted[chunk_hash] for chunk_hash in batch]
             try:
-                embedding = await self._embedder.embed(chunk)
-                metadata: dict[str, Any] = {
-                    "source": f"knowledge:{source.source_type}",
-                    "source_id": source.id,
-                    "source_name": source.name,
-                    "tenant_id": source.tenant_id,
-                }
-                if source.url:
-                    metadata["url"] = source.url
-                await self._ltm.store(
-                    content=chunk,
-                    embedding=embedding,
-                    metadata=metadata,
+                embeddings = await self._embedder.embed_batch(texts)
+                record_ids = await self._ltm.store_many(
+                    [
+                        (text, embedding, self._chunk_metadata(source, chunk_hash))
+                        for chunk_hash, text, embedding in zip(
+                            batch, texts, embeddings, strict=True
+                        )
+                    ]
                 )
-                stored += 1
             except Exception as exc:
+                diff.complete = False
                 logger.warning(
                     "knowledge_chunk_store_failed",
                     source_id=source.id,
+                    batch_size=len(batch),
+                    error=str(exc),
+                )
+                continue
+            index.update(zip(batch, record_ids, strict=True))
+            diff.stored += len(batch)
+
+        orphans = self._chunk_orphans.get(source.id, [])
+        if gone or orphans:
+            try:
+                await self._ltm.delete([*gone.values(), *orphans])
+            except Exception as exc:
+                # Keep the hashes indexed so the next run retries the delete.
+                diff.complete = False
+                logger.warning(
+                    "knowledge_chunk_tombstone_failed",
+                    source_id=source.id,
+                    count=len(gone) + len(orphans),
                     error=str(exc),
                 )
-        return stored
+            else:
+                for chunk_hash in gone:
+                    del index[chunk_hash]
+                diff.removed = len(gone) + len(orphans)
+                self._chunk_orphans[source.id] = []
+        return diff
+
+    @staticmethod
+    def _chunk_metadata(source: KnowledgeSource, chunk_hash: str) -> dict[str, Any]:
+        metadata: dict[str, Any] = {
+            "source": f"knowledge:{source.source_type}",
+            "source_id": source.id,
+            "source_name": source.name,
+            "tenant_id": source.tenant_id,
+            "chunk_hash": chunk_hash,
+        }
+        if source.url:
+            metadata["url"] = source.url
+        return metadata
@@ -62,7 +62,10 @@ async def stream_lines_through_boundary(
                 await boundary_executor.execute(request, _execute_stream)
         except Exception as exc:
             if boundary_executor is not None:
-                exc = map_exception(exc, connector, operation)
+                mapped = map_exception(exc, connector, operation)
+                if mapped is not exc:
+                    mapped.__cause__ = exc
+                exc = mapped
             await queue.put(exc)
         finally:
             await queue.put(done)
@@ -36,6 +36,9 @@ class LLMResponse:
     tool_calls: list[ToolCall] | None = None
     finish_reason: str = "stop"
     usage_available: bool = True
+    # Prompt tokens the provider served from its prefix cache; ``None`` when
+    # the provider does not report cache usage.
+    cached_prompt_tokens: int | None = None
 
     @property
     def total_tokens(self) -> int:
@@ -69,6 +72,7 @@ class LLMStreamChunk:
     prompt_tokens: int = 0
     completion_tokens: int = 0
     usage_available: bool = False
+    cached_prompt_tokens: int | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,275 @@
+"""Batching service for small utility completions.
+
+Title generation, session summarisation and query expansion each send one
+tiny prompt per item.  Bulk paths (session backfills, ingestion, archive
+summarisation) turn that into thousands of round-trips that are dominated by
+per-request overhead rather than tokens.
+
+:class:`UtilityBatcher` takes one shared instruction plus many per-item
+inputs.  In ``packed`` mode it sends up to ``max_batch_size`` inputs in a
+single request, asking for a JSON ``{"results": [{"id", "output"}]}`` answer,
+and demultiplexes the outputs by id.  Items the model drops or garbles are
+retried individually, so one bad item never fails its neighbours.  In
+``concurrent`` mode (providers that do not follow structured multi-item
+instructions) every item is its own request, bounded by ``max_concurrency``.
+``auto`` packs until a model keeps returning unusable packed output, then
+switches that model to concurrent calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import structlog
+
+from agent33.llm.base import ChatMessage
+from agent33.llm.response_cache import response_cache_policy
+
+if TYPE_CHECKING:
+    from agent33.llm.router import ModelRouter
+    from agent33.observability.metrics import MetricsCollector
+
+logger = structlog.get_logger()
+
+_MODES = frozenset({"auto", "packed", "concurrent"})
+
+_PACK_INSTRUCTION = """\
+You will receive {count} independent inputs as a JSON array of objects with \
+"id" and "input" fields. Apply the task below to each input separately.
+
+Respond ONLY with valid JSON in this exact format:
+{{"results": [{{"id": <id>, "output": <result for that input>}}, ...]}}
+Include exactly one result per id. If the task asks for JSON, put that JSON \
+object as the "output" value; otherwise "output" is a string.
+
+Task:
+{instruction}"""
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\n(.*?)\n?```$", re.DOTALL)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    """Outcome of one item in a batch: its output text, or the error that stopped it."""
+
+    content: str | None = None
+    error: str | None = None
+    tokens: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.content is not None
+
+
+def _strip_fences(raw: str) -> str:
+    stripped = raw.strip()
+    match = _FENCE_RE.match(stripped)
+    return match.group(1).strip() if match else stripped
+
+
+def _parse_packed(raw: str, count: int) -> dict[int, str]:
+    """Return ``{index: output}`` for every well-formed result in a packed answer."""
+    data = json.loads(_strip_fences(raw))
+    results = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(results, list):
+        raise ValueError("packed response has no results list")
+    outputs: dict[int, str] = {}
+    for row in results:
+        if not isinstance(row, dict) or "output" not in row:
+            continue
+        try:
+            index = int(row.get("id"))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= index < count or index in outputs:
+            continue
+        output = row["output"]
+        if output is None:
+            continue
+        outputs[index] = output if isinstance(output, str) else json.dumps(output)
+    return outputs
+
+
+class UtilityBatcher:
+    """Run one instruction over many small inputs with as few requests as possible."""
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        *,
+        mode: str = "auto",
+        max_batch_size: int = 16,
+        max_concurrency: int = 4,
+        max_pack_failures: int = 3,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        if mode not in _MODES:
+            raise ValueError(f"Unknown batching mode: {mode}")
+        self._router = router
+        self._mode = mode
+        self._max_batch_size = max(1, max_batch_size)
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._max_pack_failures = max(1, max_pack_failures)
+        self._metrics = metrics
+        self._pack_failures: dict[str, int] = {}
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def packs(self, model: str) -> bool:
+        """Whether inputs for *model* are currently sent as packed requests."""
+        if self._mode == "concurrent":
+            return False
+        if self._mode == "packed":
+            return True
+        return self._pack_failures.get(model, 0) < self._max_pack_failures
+
+    async def run(
+        self,
+        instruction: str,
+        inputs: list[str],
+        *,
+        model: str,
+        temperature: float = 0.3,
+        max_tokens_per_item: int | None = None,
+    ) -> list[BatchResult]:
+        """Apply *instruction* to every input and return results in input order."""
+        if not inputs:
+            return []
+        results: list[BatchResult | None] = [None] * len(inputs)
+        if self.packs(model) and len(inputs) > 1:
+            chunks = [
+                list(range(start, min(start + self._max_batch_size, len(inputs))))
+                for start in range(0, len(inputs), self._max_batch_size)
+            ]
+            await asyncio.gather(
+                *(
+                    self._run_packed(
+                        instruction,
+                        inputs,
+                        chunk,
+                        results,
+                        model=model,
+                        temperature=temperature,
+                        max_tokens_per_item=max_tokens_per_item,
+                    )
+                    for chunk in chunks
+                )
+            )
+        pending = [index for index, result in enumerate(results) if result is None]
+        if pending:
+            single = await asyncio.gather(
+                *(
+                    self._run_single(
+                        instruction,
+                        inputs[index],
+                        model=model,
+                        temperature=temperature,
+                        max_tokens=max_tokens_per_item,
+                    )
+                    for index in pending
+                )
+            )
+            for index, result in zip(pending, single, strict=True):
+                results[index] = result
+        return [
+            result if result is not None else BatchResult(error="missing") for result in results
+        ]
+
+    async def _run_packed(
+        self,
+        instruction: str,
+        inputs: list[str],
+        chunk: list[int],
+        results: list[BatchResult | None],
+        *,
+        model: str,
+        temperature: float,
+        max_tokens_per_item: int | None,
+    ) -> None:
+        if len(chunk) == 1:
+            return
+        payload = [{"id": local, "input": inputs[index]} for local, index in enumerate(chunk)]
+        messages = [
+            ChatMessage(
+                role="system",
+                content=_PACK_INSTRUCTION.format(count=len(chunk), instruction=instruction),
+            ),
+            ChatMessage(role="user", content=json.dumps(payload, ensure_ascii=False)),
+        ]
+        max_tokens = (
+            max_tokens_per_item * len(chunk) + 16 * len(chunk)
+            if max_tokens_per_item is not None
+            else None
+        )
+        try:
+            # A packed prompt that embeds close to another pack may still differ
+            # in one item, so only exact reuse is safe here.
+            async with self._semaphore:
+                with response_cache_policy("exact"):
+                    response = await self._router.complete(
+                        messages, model=model, temperature=temperature, max_tokens=max_tokens
+                    )
+            outputs = _parse_packed(response.content, len(chunk))
+        except Exception as exc:
+            self._pack_failed(model, len(chunk), exc)
+            return
+        if not outputs:
+            self._pack_failed(model, len(chunk), ValueError("no usable results"))
+            return
+        self._pack_failures.pop(model, None)
+        share = response.total_tokens // len(chunk)
+        for local, index in enumerate(chunk):
+            if local in outputs:
+                results[index] = BatchResult(content=outputs[local], tokens=share)
+        self._count("packed", len(outputs))
+        if len(outputs) < len(chunk):
+            self._count("unpacked", len(chunk) - len(outputs))
+
+    async def _run_single(
+        self,
+        instruction: str,
+        item: str,
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int | None,
+    ) -> BatchResult:
+        messages = [
+            ChatMessage(role="system", content=instruction),
+            ChatMessage(role="user", content=item),
+        ]
+        try:
+            # The instruction is the system message, so only the item is embedded.
+            async with self._semaphore:
+                with response_cache_policy("semantic"):
+                    response = await self._router.complete(
+                        messages, model=model, temperature=temperature, max_tokens=max_tokens
+                    )
+        except Exception as exc:
+            self._count("failed", 1)
+            return BatchResult(error=f"{type(exc).__name__}: {exc}")
+        self._count("single", 1)
+        return BatchResult(content=response.content, tokens=response.total_tokens)
+
+    def _pack_failed(self, model: str, size: int, exc: Exception) -> None:
+        self._pack_failures[model] = self._pack_failures.get(model, 0) + 1
+        self._count("unpacked", size)
+        logger.warning(
+            "utility_batch_pack_failed",
+            model=model,
+            size=size,
+            failures=self._pack_failures[model],
+            error=str(exc),
+        )
+
+    def _count(self, outcome: str, items: int) -> None:
+        if self._metrics is None:
+            return
+        for _ in range(items):
+            self._metrics.increment("llm_utility_batch_items_total", {"outcome": outcome})
@@ -0,0 +1,267 @@
+"""Model-server pool: send each request to the Ollama host that has its model warm.
+
+When several Ollama hosts sit behind the engine, each keeps a few models in
+VRAM.  If requests go to hosts at random, every host keeps evicting and
+reloading models.  :class:`ModelServerPool` polls each host's ``/api/ps``
+(the list of loaded models, from the same native API the readiness probes in
+:mod:`agent33.services.ollama_readiness` call) and picks a backend for each
+request:
+
+1. The least busy host that already has the model loaded.
+2. The least busy host overall, when no host has the model loaded or every
+   warm host has ``spill_threshold`` more outstanding requests than it.  That
+   host is then recorded as warm for the model, so later requests go there too.
+
+A backend that fails at the transport level is skipped until a probe reaches
+it again.  The outstanding requests of each backend are reported as the
+``llm_backend_queue_depth`` observation, and dispatches as
+``llm_backend_requests_total`` labelled ``affinity=warm|cold``.
+
+The Ollama chat and embedding providers take a pool instead of a base URL and
+share its HTTP client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from agent33.services.ollama_readiness import normalize_ollama_base_url
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from agent33.observability.metrics import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+
+def model_key(name: str) -> str:
+    """Return the name Ollama reports for a model (``llama3.2`` -> ``llama3.2:latest``)."""
+    name = name.strip()
+    return name if ":" in name.rsplit("/", 1)[-1] else f"{name}:latest"
+
+
+@dataclass(slots=True)
+class ModelBackend:
+    """One model server and what the pool knows about it."""
+
+    base_url: str
+    loaded: set[str] = field(default_factory=set)
+    outstanding: int = 0
+    requests: int = 0
+    healthy: bool = True
+    probed_at: float = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "loaded_models": sorted(self.loaded),
+            "probed_at": self.probed_at,
+        }
+
+
+class ModelServerPool:
+    """Route requests over several model servers with model affinity.
+
+    Parameters
+    ----------
+    base_urls:
+        Root URLs of the model servers (a trailing ``/v1`` is dropped).
+    name:
+        Label for metrics and logs.
+    spill_threshold:
+        How many more outstanding requests a warm backend may have than the
+        least busy backend before a request goes to the cold one instead.
+    probe_interval_seconds:
+        How often :meth:`start`'s background task refreshes loaded models.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        *,
+        name: str = "ollama",
+        spill_threshold: int = 4,
+        probe_interval_seconds: float = 15.0,
+        timeout: float = 120.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        client: httpx.AsyncClient | None = None,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        urls = list(dict.fromkeys(normalize_ollama_base_url(url) for url in base_urls if url))
+        if not urls:
+            raise ValueError("ModelServerPool needs at least one base URL")
+        self._name = name
+        self._backends = [ModelBackend(url) for url in urls]
+        self._spill_threshold = max(1, spill_threshold)
+        self._probe_interval = probe_interval_seconds
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections * len(urls),
+                max_keepalive_connections=max_keepalive_connections * len(urls),
+            ),
+        )
+        self._metrics = metrics
+        self._next = 0
+        self._probe_task: asyncio.Task[None] | None = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client shared by every provider that routes through the pool."""
+        return self._client
+
+    @property
+    def backends(self) -> list[ModelBackend]:
+        return list(self._backends)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Per-backend health, queue depth and loaded models."""
+        return [backend.snapshot() for backend in self._backends]
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def select(self, model: str | None = None) -> ModelBackend:
+        """Pick the backend for a request (without counting it as outstanding)."""
+        return self._select(model)[0]
+
+    def _select(self, model: str | None) -> tuple[ModelBackend, bool]:
+        candidates = [b for b in self._backends if b.healthy] or self._backends
+        # Rotate the scan start so ties spread over the backends.
+        start = self._next % len(candidates)
+        self._next += 1
+        ordered = candidates[start:] + candidates[:start]
+        least = min(ordered, key=lambda b: b.outstanding)
+        if not model:
+            return least, False
+        key = model_key(model)
+        warm = [b for b in ordered if key in b.loaded]
+        if warm:
+            best = min(warm, key=lambda b: b.outstanding)
+            if best.outstanding - least.outstanding < self._spill_threshold:
+                return best, True
+        return least, False
+
+    @asynccontextmanager
+    async def lease(self, model: str | None = None) -> AsyncIterator[ModelBackend]:
+        """Hold a backend for the duration of one request."""
+        backend, warm = self._select(model)
+        if model and not warm:
+            # The cold backend is about to load the model: route its peers there.
+            backend.loaded.add(model_key(model))
+        backend.outstanding += 1
+        backend.requests += 1
+        if self._metrics is not None:
+            self._metrics.increment(
+                "llm_backend_requests_total",
+                {
+                    "pool": self._name,
+                    "backend": backend.base_url,
+                    "affinity": "warm" if warm else "cold",
+                },
+            )
+        self._record_depth(backend)
+        try:
+            yield backend
+        except Exception as exc:
+            # The connector boundary maps transport errors to RuntimeError and
+            # keeps the original as the cause.
+            transport = exc if isinstance(exc, httpx.TransportError) else exc.__cause__
+            if isinstance(transport, httpx.TransportError):
+                if backend.healthy:
+                    logger.warning(
+                        "model_backend_unreachable pool=%s backend=%s error=%s",
+                        self._name,
+                        backend.base_url,
+                        transport,
+                    )
+                backend.healthy = False
+            raise
+        finally:
+            backend.outstanding -= 1
+            self._record_depth(backend)
+
+    def _record_depth(self, backend: ModelBackend) -> None:
+        if self._metrics is not None:
+            self._metrics.observe(
+                "llm_backend_queue_depth",
+                backend.outstanding,
+                {"pool": self._name, "backend": backend.base_url},
+            )
+
+    # ------------------------------------------------------------------
+    # Probes
+    # ------------------------------------------------------------------
+
+    async def probe(self) -> None:
+        """Refresh health and loaded models of every backend."""
+        await asyncio.gather(*(self._probe(backend) for backend in self._backends))
+
+    async def _probe(self, backend: ModelBackend) -> None:
+        try:
+            response = await self._client.get(f"{backend.base_url}/api/ps", timeout=5.0)
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            if backend.healthy:
+                logger.warning(
+                    "model_backend_probe_failed pool=%s backend=%s error=%s",
+                    self._name,
+                    backend.base_url,
+                    exc,
+                )
+            backend.healthy = False
+            return
+        raw_models = payload.get("models") if isinstance(payload, dict) else None
+        loaded: set[str] = set()
+        for item in raw_models if isinstance(raw_models, list) else []:
+            if isinstance(item, dict) and (item.get("name") or item.get("model")):
+                loaded.add(model_key(str(item.get("name") or item.get("model"))))
+        if not backend.healthy:
+            logger.info("model_backend_recovered pool=%s backend=%s", self._name, backend.base_url)
+        backend.loaded = loaded
+        backend.healthy = True
+        backend.probed_at = time.time()
+
+    async def start(self) -> None:
+        """Probe once, then keep probing in the background."""
+        await self.probe()
+        if self._probe_task is None:
+            self._probe_task = asyncio.create_task(self._probe_loop(), name="model-pool-probe")
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._probe_interval)
+            try:
+                await self.probe()
+            except Exception:
+                logger.warning("model_pool_probe_failed pool=%s", self._name, exc_info=True)
+
+    async def close(self) -> None:
+        """Stop probing and close the shared HTTP client if the pool created it."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._probe_task
+            self._probe_task = None
+        if self._owns_client:
+            await self._client.aclose()
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any, cast
 
 import httpx
@@ -27,7 +28,9 @@ from agent33.llm.base import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, AsyncIterator
+
+    from agent33.llm.model_pool import ModelServerPool
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +41,11 @@ _DEFAULT_TIMEOUT = 120.0
 
 
 class OllamaProvider:
-    """LLM provider that talks to a local or remote Ollama instance."""
+    """LLM provider that talks to a local or remote Ollama instance.
+
+    With a :class:`~agent33.llm.model_pool.ModelServerPool` each request goes
+    to the pool's choice of host for its model, over the pool's HTTP client.
+    """
 
     def __init__(
         self,
@@ -47,16 +54,26 @@ class OllamaProvider:
         timeout: float = _DEFAULT_TIMEOUT,
         max_connections: int = 20,
         max_keepalive_connections: int = 10,
+        keep_alive: str | None = None,
+        pool: ModelServerPool | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
+        self._pool = pool
+        # Keeping the model resident lets Ollama reuse the KV cache of the
+        # previous prompt's shared prefix instead of re-evaluating it.
+        self._keep_alive = keep_alive
         self._default_model = default_model
         self._timeout = timeout
-        self._client = httpx.AsyncClient(
-            timeout=timeout,
-            limits=httpx.Limits(
-                max_connections=max_connections,
-                max_keepalive_connections=max_keepalive_connections,
-            ),
+        self._client = (
+            pool.client
+            if pool is not None
+            else httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+            )
         )
         self._boundary_executor = build_connector_boundary_executor(
             default_timeout_seconds=timeout,
@@ -64,18 +81,29 @@ class OllamaProvider:
         )
 
     async def close(self) -> None:
-        """Close the underlying HTTP client."""
-        await self._client.aclose()
+        """Close the underlying HTTP client (a pool closes its own)."""
+        if self._pool is None:
+            await self._client.aclose()
 
     # -- helpers ----------------------------------------------------------
 
+    @asynccontextmanager
+    async def _backend_url(self, model: str | None) -> AsyncIterator[str]:
+        """Base URL for one request: the configured host or the pool's pick."""
+        if self._pool is None:
+            yield self._base_url
+            return
+        async with self._pool.lease(model) as backend:
+            yield backend.base_url
+
     async def _post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
         """POST with exponential-backoff retry."""
         connector = "llm:ollama"
         operation = f"POST {path}"
 
         async def _perform_post() -> dict[str, Any]:
-            response = await self._client.post(f"{self._base_url}{path}", json=payload)
+            async with self._backend_url(payload.get("model")) as base_url:
+                response = await self._client.post(f"{base_url}{path}", json=payload)
             response.raise_for_status()
             return response.json()  # type: ignore[no-any-return]
 
@@ -122,7 +150,8 @@ class OllamaProvider:
         operation = f"GET {path}"
 
         async def _perform_get() -> dict[str, Any]:
-            response = await self._client.get(f"{self._base_url}{path}")
+            async with self._backend_url(None) as base_url:
+                response = await self._client.get(f"{base_url}{path}")
             response.raise_for_status()
             return response.json()  # type: ignore[no-any-return]
 
@@ -170,19 +199,20 @@ class OllamaProvider:
         """Yield streamed response lines through the connector boundary executor."""
         connector = "llm:ollama"
         operation = f"POST {path}"
-        async for line in stream_lines_through_boundary(
-            client=self._client,
-            url=f"{self._base_url}{path}",
-            payload=payload,
-            headers=None,
-            timeout=self._timeout,
-            connector=connector,
-            operation=operation,
-            metadata={"base_url": self._base_url},
-            boundary_executor=self._boundary_executor,
-            map_exception=map_connector_exception,
-        ):
-            yield line
+        async with self._backend_url(payload.get("model")) as base_url:
+            async for line in stream_lines_through_boundary(
+                client=self._client,
+                url=f"{base_url}{path}",
+                payload=payload,
+                headers=None,
+                timeout=self._timeout,
+                connector=connector,
+                operation=operation,
+                metadata={"base_url": base_url},
+                boundary_executor=self._boundary_executor,
+                map_exception=map_connector_exception,
+            ):
+                yield line
 
     # -- public API -------------------------------------------------------
 
@@ -270,6 +300,8 @@ class OllamaProvider:
             payload["tools"] = [
                 t if "type" in t else {"type": "function", "function": t} for t in tools
             ]
+        if self._keep_alive:
+            payload["keep_alive"] = self._keep_alive
 
         data = await self._post("/api/chat", payload)
 
@@ -327,6 +359,8 @@ class OllamaProvider:
             body["tools"] = [
                 t if "type" in t else {"type": "function", "function": t} for t in tools
             ]
+        if self._keep_alive:
+            body["keep_alive"] = self._keep_alive
 
         async for line in self._stream_lines("/api/chat", body):
             line = line.strip()
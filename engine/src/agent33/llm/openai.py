@@ -27,7 +27,12 @@ from agent33.llm.base import (
     ToolCallDelta,
     ToolCallFunction,
 )
-from agent33.llm.prompt_caching import apply_anthropic_cache_control, is_anthropic_model
+from agent33.llm.prompt_caching import (
+    apply_anthropic_cache_control,
+    cached_prompt_tokens,
+    is_anthropic_model,
+    prompt_cache_key,
+)
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
@@ -38,6 +43,9 @@ _DEFAULT_BASE_URL = "https://api.openai.com/v1"
 _MAX_ATTEMPTS = 3
 _BACKOFF_BASE = 1.0
 _DEFAULT_TIMEOUT = 120.0
+# "openai" sends a prompt_cache_key, "llamacpp" asks the server to keep its KV
+# cache (cache_prompt); None leaves the request untouched for other backends.
+_PROMPT_CACHE_HINTS = frozenset({None, "openai", "llamacpp"})
 _OPENROUTER_PROVIDER_UNAVAILABLE_MARKERS = (
     "no allowed providers are available",
     "no providers are available",
@@ -100,8 +108,12 @@ class OpenAIProvider:
         max_connections: int = 20,
         max_keepalive_connections: int = 10,
         extra_headers: dict[str, str] | None = None,
+        prompt_cache_hints: str | None = None,
     ) -> None:
+        if prompt_cache_hints not in _PROMPT_CACHE_HINTS:
+            raise ValueError(f"Unknown prompt cache hint style: {prompt_cache_hints}")
         self._api_key = api_key
+        self._prompt_cache_hints = prompt_cache_hints
         self._base_url = base_url.rstrip("/")
         self._default_model = default_model
         self._timeout = timeout
@@ -340,6 +352,20 @@ class OpenAIProvider:
             )
         return result
 
+    def _apply_prompt_cache_hints(self, payload: dict[str, Any], model: str) -> None:
+        """Add the provider-specific hints that let the server reuse a cached prefix."""
+        if not settings.prompt_cache_enabled:
+            return
+        # Phase 51: inject Anthropic prompt-cache breakpoints
+        if is_anthropic_model(model):
+            payload["messages"] = apply_anthropic_cache_control(payload["messages"])
+        elif self._prompt_cache_hints == "openai":
+            payload["prompt_cache_key"] = prompt_cache_key(
+                payload["messages"], payload.get("tools")
+            )
+        elif self._prompt_cache_hints == "llamacpp":
+            payload["cache_prompt"] = True
+
     async def complete(
         self,
         messages: list[ChatMessage],
@@ -361,10 +387,7 @@ class OpenAIProvider:
         if tools is not None:
             # Wrap each tool dict in the OpenAI function tool format
             payload["tools"] = [{"type": "function", "function": tool_def} for tool_def in tools]
-
-        # Phase 51: inject Anthropic prompt-cache breakpoints
-        if is_anthropic_model(resolved_model) and settings.prompt_cache_enabled:
-            payload["messages"] = apply_anthropic_cache_control(payload["messages"])
+        self._apply_prompt_cache_hints(payload, resolved_model)
 
         data = await self._post("/chat/completions", payload)
 
@@ -399,6 +422,7 @@ class OpenAIProvider:
             if usage_available and usage_dict is not None
             else 0
         )
+        cached_tokens = cached_prompt_tokens(usage_dict)
         if not choices:
             return LLMResponse(
                 content="",
@@ -406,6 +430,7 @@ class OpenAIProvider:
                 prompt_tokens=prompt_token_count,
                 completion_tokens=completion_token_count,
                 usage_available=usage_available,
+                cached_prompt_tokens=cached_tokens,
             )
 
         choice = choices[0]
@@ -430,6 +455,7 @@ class OpenAIProvider:
             tool_calls=parsed_tool_calls,
             finish_reason=finish,
             usage_available=usage_available,
+            cached_prompt_tokens=cached_tokens,
         )
 
     async def list_models(self) -> list[str]:
@@ -459,10 +485,7 @@ class OpenAIProvider:
             body["max_tokens"] = max_tokens
         if tools is not None:
             body["tools"] = [{"type": "function", "function": t} for t in tools]
-
-        # Phase 51: inject Anthropic prompt-cache breakpoints
-        if is_anthropic_model(resolved_model) and settings.prompt_cache_enabled:
-            body["messages"] = apply_anthropic_cache_control(body["messages"])
+        self._apply_prompt_cache_hints(body, resolved_model)
 
         async for line in self._stream_lines("/chat/completions", body):
             line = line.strip()
@@ -491,6 +514,7 @@ class OpenAIProvider:
             )
             prompt_tokens = usage.get("prompt_tokens", 0) if usage_available else 0
             completion_tokens = usage.get("completion_tokens", 0) if usage_available else 0
+            cached_tokens = cached_prompt_tokens(usage) if usage_available else None
 
             # Log Anthropic cache usage when available (mirrors complete())
             if usage_available and isinstance(usage, dict):
@@ -512,6 +536,7 @@ class OpenAIProvider:
                     prompt_tokens=prompt_tokens,
                     completion_tokens=completion_tokens,
                     usage_available=usage_available,
+                    cached_prompt_tokens=cached_tokens,
                 )
 
             for raw_tool_call in delta.get("tool_calls", []) or []:
@@ -528,4 +553,5 @@ class OpenAIProvider:
                     prompt_tokens=prompt_tokens,
                     completion_tokens=completion_tokens,
                     usage_available=usage_available,
+                    cached_prompt_tokens=cached_tokens,
                 )
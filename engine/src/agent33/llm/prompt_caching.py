@@ -1,5 +1,25 @@
-"""Anthropic prompt caching support.
+"""Provider-side prompt caching support.
 
+Every provider we talk to can skip recomputing a prompt prefix it has seen
+recently, but only if the prefix is byte-identical from request to request:
+
+* Anthropic needs explicit ``cache_control`` breakpoints (below).
+* OpenAI caches automatically and routes on ``prompt_cache_key``.
+* llama.cpp servers reuse their KV cache when ``cache_prompt`` is set.
+* Ollama reuses the loaded model's KV cache while the model stays resident
+  (``keep_alive``).
+
+:func:`assemble_prompt` puts stable sections (agent definition, skills, pack
+addenda) ahead of volatile ones (recalled memory) so the cacheable prefix is
+as long as possible, and :func:`stable_prefix_hash` identifies that prefix
+together with the tool schemas.  Callers that know where their stable
+sections end (the agent runtime) bind that hash with
+:func:`prompt_cache_prefix`, and :func:`prompt_cache_key` prefers it over
+hashing the whole leading system message.  :func:`cached_prompt_tokens` reads the
+provider's cache-hit count back out of the usage block.
+
+Anthropic breakpoints
+---------------------
 Injects ``cache_control`` breakpoints into serialized message payloads so the
 Anthropic API can reuse cached prefixes across multi-turn conversations.
 
@@ -16,14 +36,26 @@ the upstream specification.
 
 from __future__ import annotations
 
+import contextvars
 import copy
+import hashlib
+import json
 import logging
-from typing import Any
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
 
 logger = logging.getLogger(__name__)
 
 _MAX_BREAKPOINTS = 4
 
+_prefix_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "agent33_prompt_cache_prefix", default=""
+)
+
 
 def _ensure_content_blocks(content: Any) -> list[dict[str, Any]]:
     """Normalise message content to a list of content blocks.
@@ -129,3 +161,127 @@ def apply_anthropic_cache_control(
 def is_anthropic_model(model_name: str) -> bool:
     """Return ``True`` if *model_name* looks like an Anthropic Claude model."""
     return model_name.startswith("claude-")
+
+
+# ---------------------------------------------------------------------------
+# Cache-friendly prompt layout
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class PromptSection:
+    """One block of a system prompt.
+
+    ``stable`` sections must render identically across invocations of the
+    same agent in the same session; everything else is ``stable=False``.
+    """
+
+    text: str
+    stable: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class AssembledPrompt:
+    """A system prompt with its stable prefix identified."""
+
+    text: str
+    prefix_hash: str
+    stable_length: int
+
+
+def assemble_prompt(sections: Iterable[PromptSection], separator: str = "\n\n") -> AssembledPrompt:
+    """Join *sections* with every stable section ahead of every volatile one.
+
+    Relative order within each group is preserved, so the result is
+    deterministic for a given list of sections.  Empty sections are dropped.
+    """
+    kept = [section for section in sections if section.text]
+    stable = separator.join(section.text for section in kept if section.stable)
+    volatile = separator.join(section.text for section in kept if not section.stable)
+    text = separator.join(part for part in (stable, volatile) if part)
+    return AssembledPrompt(
+        text=text,
+        prefix_hash=hashlib.sha256(stable.encode("utf-8")).hexdigest()[:32],
+        stable_length=len(stable),
+    )
+
+
+def sort_tool_schemas(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return tool schemas in a stable order (by name) so they cache as a prefix."""
+    return sorted(tools, key=lambda tool: str(tool.get("name", "")))
+
+
+def stable_prefix_hash(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None = None,
+) -> str:
+    """Hash the leading system messages and tool schemas of a serialized request.
+
+    Requests sharing this hash share the prefix a provider can cache, which
+    makes it a good ``prompt_cache_key``.
+    """
+    prefix: list[Any] = []
+    for message in messages:
+        if message.get("role") != "system":
+            break
+        prefix.append(message.get("content"))
+    encoded = json.dumps(
+        {"system": prefix, "tools": tools or []},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+@contextmanager
+def prompt_cache_prefix(prefix_hash: str) -> Iterator[None]:
+    """Key provider prompt caches on *prefix_hash* for completions inside the block.
+
+    *prefix_hash* is :attr:`AssembledPrompt.prefix_hash`, which covers only the
+    stable sections of a system prompt that also carries volatile ones.
+    """
+    token = _prefix_var.set(prefix_hash)
+    try:
+        yield
+    finally:
+        _prefix_var.reset(token)
+
+
+def prompt_cache_key(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None = None,
+) -> str:
+    """Return the ``prompt_cache_key`` for a serialized request.
+
+    Uses the prefix bound by :func:`prompt_cache_prefix` when there is one, so
+    recalled memory at the end of the system prompt does not change the key.
+    """
+    prefix = _prefix_var.get()
+    if not prefix:
+        return stable_prefix_hash(messages, tools)
+    encoded = json.dumps(
+        {"prefix": prefix, "tools": tools or []},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def cached_prompt_tokens(usage: dict[str, Any] | None) -> int | None:
+    """Return the prompt tokens served from the provider cache, if reported.
+
+    Understands OpenAI's ``prompt_tokens_details.cached_tokens`` and the
+    ``cache_read_input_tokens`` field Anthropic-compatible gateways return.
+    ``None`` means the provider did not report cache usage at all.
+    """
+    if not isinstance(usage, dict):
+        return None
+    details = usage.get("prompt_tokens_details")
+    if isinstance(details, dict) and isinstance(details.get("cached_tokens"), int):
+        return int(details["cached_tokens"])
+    cache_read = usage.get("cache_read_input_tokens")
+    if isinstance(cache_read, int):
+        return cache_read
+    return None
@@ -0,0 +1,395 @@
+"""Exact-match and semantic response cache in front of :class:`ModelRouter`.
+
+Evaluation gates, golden-task runs and the memory utilities (title
+generation, summarisation, context compression) send byte-identical or
+near-identical low-temperature prompts over and over.  The cache keys a
+completion on the normalised ``(model, messages, tools, temperature,
+max_tokens)`` tuple and returns the stored response instead of calling the
+provider again.
+
+Utility callers can opt into a second, embedding-similarity tier with
+:func:`response_cache_policy`.  Only the variable part of the final message
+(the *subject*, by default the whole message) is embedded; the conversation
+prefix, the rest of the final message and the parameters must match exactly,
+and the subject must embed within ``semantic_threshold`` cosine similarity of
+a cached one.  The tier is limited to deterministic calls (at or below the
+configured temperature) with short subjects, where a near-identical input
+can stand in for the exact one.
+
+Entries are always scoped to the tenant bound with
+:func:`response_cache_tenant` (the auth middleware binds it per request),
+expire after ``ttl_seconds`` and are evicted LRU beyond ``max_entries``.
+Every hit is reported to :class:`~agent33.observability.metrics.CostTracker`
+as saved spend.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import dataclasses
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Protocol
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from agent33.llm.base import ChatMessage, LLMResponse
+    from agent33.observability.metrics import CostTracker, MetricsCollector
+
+logger = structlog.get_logger()
+
+_tenant_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "agent33_response_cache_tenant", default=""
+)
+_policy_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "agent33_response_cache_policy", default="default"
+)
+_subject_var: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "agent33_response_cache_subject", default=None
+)
+
+_POLICIES = frozenset({"default", "off", "exact", "semantic"})
+
+
+class _Embedder(Protocol):
+    async def embed(self, text: str) -> list[float]: ...
+
+
+@contextmanager
+def response_cache_tenant(tenant_id: str) -> Iterator[None]:
+    """Scope response-cache entries created or read inside the block to *tenant_id*."""
+    token = _tenant_var.set(tenant_id)
+    try:
+        yield
+    finally:
+        _tenant_var.reset(token)
+
+
+def bind_response_cache_tenant(tenant_id: str) -> contextvars.Token[str]:
+    """Bind *tenant_id* until :func:`reset_response_cache_tenant` is called with the token."""
+    return _tenant_var.set(tenant_id)
+
+
+def reset_response_cache_tenant(token: contextvars.Token[str]) -> None:
+    _tenant_var.reset(token)
+
+
+@contextmanager
+def response_cache_policy(policy: str, *, subject: str | None = None) -> Iterator[None]:
+    """Override cache behaviour for completions made inside the block.
+
+    ``off`` bypasses the cache and ``exact`` caches regardless of temperature.
+    ``default`` caches only calls at or below the configured temperature, and
+    ``semantic`` additionally enables the embedding-similarity tier for them.
+    *subject* is the variable text inside the final message that the semantic
+    tier embeds; the rest of the message is matched exactly.
+    """
+    if policy not in _POLICIES:
+        raise ValueError(f"Unknown response cache policy: {policy}")
+    token = _policy_var.set(policy)
+    subject_token = _subject_var.set(subject)
+    try:
+        yield
+    finally:
+        _subject_var.reset(subject_token)
+        _policy_var.reset(token)
+
+
+def _message_payload(message: ChatMessage) -> dict[str, Any]:
+    content: Any
+    if isinstance(message.content, str):
+        content = message.content.strip()
+    else:
+        content = [
+            {"type": type(part).__name__, **dataclasses.asdict(part)} for part in message.content
+        ]
+    payload: dict[str, Any] = {"role": message.role, "content": content}
+    if message.tool_calls:
+        payload["tool_calls"] = [
+            {"id": call.id, "name": call.function.name, "arguments": call.function.arguments}
+            for call in message.tool_calls
+        ]
+    if message.tool_call_id:
+        payload["tool_call_id"] = message.tool_call_id
+    if message.name:
+        payload["name"] = message.name
+    return payload
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b, strict=False))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+@dataclasses.dataclass(slots=True)
+class _Entry:
+    response: LLMResponse
+    provider: str
+    expires_at: float
+
+
+@dataclasses.dataclass(slots=True)
+class _SemanticEntry:
+    key: str
+    vector: list[float]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CacheRequest:
+    """Normalised identity of one completion request."""
+
+    tenant_id: str
+    key: str
+    semantic_bucket: str
+    semantic_text: str
+    policy: str
+
+
+class LLMResponseCache:
+    """Bounded TTL cache of LLM completions with an optional semantic tier."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600.0,
+        max_temperature: float = 0.0,
+        embedder: _Embedder | None = None,
+        semantic_threshold: float = 0.97,
+        semantic_max_entries: int = 512,
+        semantic_max_chars: int = 1024,
+        cost_tracker: CostTracker | None = None,
+        metrics: MetricsCollector | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl_seconds = ttl_seconds
+        self._max_temperature = max_temperature
+        self._embedder = embedder
+        self._semantic_threshold = semantic_threshold
+        self._semantic_max_entries = max(1, semantic_max_entries)
+        self._semantic_max_chars = semantic_max_chars
+        self._cost_tracker = cost_tracker
+        self._metrics = metrics
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Buckets in LRU order; semantic_max_entries bounds all buckets together.
+        self._semantic: OrderedDict[str, OrderedDict[str, _SemanticEntry]] = OrderedDict()
+        self._semantic_size = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def attach_embedder(self, embedder: _Embedder | None) -> None:
+        """Enable (or disable, with ``None``) the embedding-similarity tier."""
+        self._embedder = embedder
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self._embedder is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- keys -------------------------------------------------------------
+
+    def prepare(
+        self,
+        messages: list[ChatMessage],
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+    ) -> CacheRequest | None:
+        """Return the cache identity for a request, or ``None`` if it is not cacheable."""
+        policy = _policy_var.get()
+        if policy == "off" or not messages:
+            return None
+        if policy != "exact" and temperature > self._max_temperature:
+            return None
+        tenant_id = _tenant_var.get()
+        params = {
+            "model": model,
+            "temperature": round(temperature, 4),
+            "max_tokens": max_tokens,
+            "tools": tools or [],
+        }
+        payloads = [_message_payload(message) for message in messages]
+        key = _digest({"tenant": tenant_id, **params, "messages": payloads})
+        last = payloads[-1]
+        content = last["content"] if isinstance(last["content"], str) else ""
+        subject = _subject_var.get()
+        if subject is None:
+            template, text = "", content
+        else:
+            subject = subject.strip()
+            # The subject must occur in the message, or there is nothing to embed.
+            template = content.replace(subject, "\x00") if subject else content
+            text = subject if subject and subject in content else ""
+        if len(text) > self._semantic_max_chars:
+            text = ""
+        bucket = _digest(
+            {
+                "tenant": tenant_id,
+                **params,
+                "prefix": payloads[:-1],
+                "role": last["role"],
+                "template": template,
+                "extra": {k: v for k, v in last.items() if k not in {"role", "content"}},
+            }
+        )
+        return CacheRequest(tenant_id, key, bucket, text, policy)
+
+    # -- lookup / store ---------------------------------------------------
+
+    async def get(self, request: CacheRequest) -> LLMResponse | None:
+        """Return a cached response for *request*, trying the semantic tier if enabled."""
+        entry = self._live_entry(request.key)
+        tier = "exact"
+        if entry is None and self._semantic_eligible(request):
+            entry = await self._semantic_lookup(request)
+            tier = "semantic"
+        if entry is None:
+            self.misses += 1
+            self._count("miss")
+            return None
+        if tier == "exact":
+            self.hits += 1
+        else:
+            self.semantic_hits += 1
+        self._count(tier)
+        self._record_savings(entry, request.tenant_id)
+        # Nothing was spent on this call, so report zero usage to callers
+        # that account tokens from the response.
+        return dataclasses.replace(entry.response, prompt_tokens=0, completion_tokens=0)
+
+    async def put(self, request: CacheRequest, response: LLMResponse, *, provider: str) -> None:
+        """Store *response*; responses that request tool calls are never cached."""
+        if response.tool_calls:
+            return
+        self._entries[request.key] = _Entry(
+            response=response,
+            provider=provider,
+            expires_at=self._clock() + self._ttl_seconds,
+        )
+        self._entries.move_to_end(request.key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        if self._semantic_eligible(request):
+            await self._semantic_store(request)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._semantic.clear()
+        self._semantic_size = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+        }
+
+    # -- internals --------------------------------------------------------
+
+    def _live_entry(self, key: str) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _semantic_eligible(self, request: CacheRequest) -> bool:
+        return (
+            request.policy == "semantic"
+            and self._embedder is not None
+            and bool(request.semantic_text)
+        )
+
+    async def _embed(self, text: str) -> list[float] | None:
+        assert self._embedder is not None
+        try:
+            return await self._embedder.embed(text)
+        except Exception:
+            logger.warning("llm_response_cache_embed_failed", exc_info=True)
+            return None
+
+    async def _semantic_lookup(self, request: CacheRequest) -> _Entry | None:
+        bucket = self._semantic.get(request.semantic_bucket)
+        if not bucket:
+            return None
+        vector = await self._embed(request.semantic_text)
+        if vector is None:
+            return None
+        best_key: str | None = None
+        best_score = self._semantic_threshold
+        for candidate in list(bucket.values()):
+            score = _cosine(vector, candidate.vector)
+            if score >= best_score:
+                best_key, best_score = candidate.key, score
+        if best_key is None:
+            return None
+        entry = self._live_entry(best_key)
+        if entry is None and bucket.pop(best_key, None) is not None:
+            self._semantic_size -= 1
+            if not bucket:
+                del self._semantic[request.semantic_bucket]
+        return entry
+
+    async def _semantic_store(self, request: CacheRequest) -> None:
+        vector = await self._embed(request.semantic_text)
+        if vector is None:
+            return
+        bucket = self._semantic.setdefault(request.semantic_bucket, OrderedDict())
+        self._semantic.move_to_end(request.semantic_bucket)
+        if request.key not in bucket:
+            self._semantic_size += 1
+        bucket[request.key] = _SemanticEntry(key=request.key, vector=vector)
+        bucket.move_to_end(request.key)
+        while self._semantic_size > self._semantic_max_entries:
+            oldest_name, oldest = next(iter(self._semantic.items()))
+            if oldest:
+                oldest.popitem(last=False)
+                self._semantic_size -= 1
+            if not oldest:
+                del self._semantic[oldest_name]
+
+    def _count(self, outcome: str) -> None:
+        if self._metrics is not None:
+            self._metrics.increment("llm_response_cache_total", {"outcome": outcome})
+
+    def _record_savings(self, entry: _Entry, tenant_id: str) -> None:
+        if self._cost_tracker is None:
+            return
+        scope = f"tenant:{tenant_id}" if tenant_id else "global"
+        try:
+            self._cost_tracker.record_cache_savings(
+                model=entry.response.model,
+                tokens_in=entry.response.prompt_tokens,
+                tokens_out=entry.response.completion_tokens,
+                scope=scope,
+                provider=entry.provider,
+            )
+        except Exception:
+            logger.debug("llm_response_cache_savings_failed", exc_info=True)
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+import random
+import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from agent33.llm.default_models import resolve_openrouter_default_fallback_models
 from agent33.llm.openai import is_openrouter_provider_unavailable_error
+from agent33.llm.scoreboard import RouteScoreboard
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Sequence
 
     from agent33.llm.base import ChatMessage, LLMProvider, LLMResponse, LLMStreamChunk
+    from agent33.llm.response_cache import LLMResponseCache
+    from agent33.observability.metrics import MetricsCollector
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +36,16 @@ _DEFAULT_PREFIX_MAP: list[tuple[str, str]] = [
 _DEFAULT_PROVIDER = "ollama"
 
 
+def parse_route_equivalents(spec: str) -> list[list[str]]:
+    """Parse ``a,b;c,d`` into groups of interchangeable model refs."""
+    groups: list[list[str]] = []
+    for raw_group in spec.split(";"):
+        group = [item.strip() for item in raw_group.split(",") if item.strip()]
+        if len(group) > 1:
+            groups.append(group)
+    return groups
+
+
 @dataclass(frozen=True, slots=True)
 class RouteResolution:
     """Resolved provider + model name for an LLM request."""
@@ -39,17 +56,53 @@ class RouteResolution:
 
 
 class ModelRouter:
-    """Routes completion requests to the appropriate LLM provider."""
+    """Routes completion requests to the appropriate LLM provider.
+
+    Model refs listed together in *equivalent_routes* are treated as
+    interchangeable: once the requested route has a track record, the router
+    sends the call to the equivalent with the best latency/error score.  With
+    *hedging_enabled*, a completion that has not returned after the primary
+    route's p95 latency also fires at the next-best equivalent, and the first
+    response wins.  With *exploration_rate*, that fraction of calls goes to an
+    equivalent that has no usable score yet (too few calls, or only failures)
+    so it is measured and can recover.
+    """
 
     def __init__(
         self,
         providers: dict[str, Any] | None = None,
         prefix_map: list[tuple[str, str]] | None = None,
         default_provider: str = _DEFAULT_PROVIDER,
+        *,
+        equivalent_routes: Sequence[Sequence[str]] | None = None,
+        hedging_enabled: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_default_delay_seconds: float = 2.0,
+        hedge_min_delay_seconds: float = 0.1,
+        exploration_rate: float = 0.0,
+        rng: random.Random | None = None,
+        scoreboard: RouteScoreboard | None = None,
+        metrics: MetricsCollector | None = None,
+        response_cache: LLMResponseCache | None = None,
     ) -> None:
         self._providers: dict[str, LLMProvider] = dict(providers or {})
         self._prefix_map = prefix_map if prefix_map is not None else list(_DEFAULT_PREFIX_MAP)
         self._default_provider = default_provider
+        self._equivalents: dict[str, list[str]] = {}
+        for group in equivalent_routes or ():
+            for member in group:
+                self._equivalents[member] = [m for m in group if m != member]
+        self._hedging_enabled = hedging_enabled
+        self._hedge_quantile = hedge_quantile
+        self._hedge_default_delay = hedge_default_delay_seconds
+        self._hedge_min_delay = hedge_min_delay_seconds
+        self._exploration_rate = min(max(exploration_rate, 0.0), 1.0)
+        self._rng = rng or random.Random()
+        self._scoreboard = scoreboard or RouteScoreboard()
+        self._metrics = metrics
+        self._response_cache = response_cache
+        # provider -> [requests reporting cache usage, prompt tokens, cached tokens]
+        self._prompt_cache_usage: dict[str, list[int]] = {}
 
     # -- provider management ----------------------------------------------
 
@@ -67,6 +120,33 @@ class ModelRouter:
         """Read-only view of registered providers."""
         return dict(self._providers)
 
+    def attach_response_cache(self, cache: LLMResponseCache | None) -> None:
+        """Serve cacheable completions from *cache* (``None`` detaches it)."""
+        self._response_cache = cache
+
+    @property
+    def response_cache(self) -> LLMResponseCache | None:
+        return self._response_cache
+
+    @property
+    def scoreboard(self) -> RouteScoreboard:
+        """Per-route latency/error statistics used for route selection."""
+        return self._scoreboard
+
+    def prompt_cache_stats(self) -> dict[str, dict[str, Any]]:
+        """Return provider prefix-cache usage per provider that reports it."""
+        stats: dict[str, dict[str, Any]] = {}
+        for provider, (requests, prompt_tokens, cached_tokens) in sorted(
+            self._prompt_cache_usage.items()
+        ):
+            stats[provider] = {
+                "requests": requests,
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "hit_rate": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+            }
+        return stats
+
     # -- routing ----------------------------------------------------------
 
     def _known_provider_names(self) -> set[str]:
@@ -130,6 +210,205 @@ class ModelRouter:
         """Pick the right provider for *model_name* based on prefix rules."""
         return self.resolve(model_name).provider
 
+    def ranked_routes(self, model_name: str) -> list[RouteResolution]:
+        """Return *model_name* and its registered equivalents, best route first.
+
+        Routes keep their configured order until the requested route has
+        enough samples; after that, scored routes are ordered by expected time
+        to a successful response and unscored equivalents go last.  A route
+        that has only failed scores worst.  With an exploration rate, an
+        unscored or failing route is occasionally put first instead.
+        """
+        primary = self.resolve(model_name)
+        routes = [primary]
+        for candidate in self._equivalents.get(model_name, ()):
+            try:
+                routes.append(self.resolve(candidate))
+            except ValueError:
+                continue
+        if len(routes) == 1:
+            return routes
+        if self._scoreboard.score(primary.provider_name, primary.model_name) is None:
+            return routes
+        scored: list[tuple[float, int, RouteResolution]] = []
+        unscored: list[RouteResolution] = []
+        for index, route in enumerate(routes):
+            score = self._scoreboard.score(route.provider_name, route.model_name)
+            if score is None:
+                unscored.append(route)
+            else:
+                scored.append((score, index, route))
+        ranked = [route for _, _, route in sorted(scored, key=lambda item: item[:2])]
+        ranked += unscored
+        untrusted = unscored + [route for score, _, route in scored if math.isinf(score)]
+        if untrusted and self._rng.random() < self._exploration_rate:
+            explored = self._rng.choice(untrusted)
+            ranked.remove(explored)
+            ranked.insert(0, explored)
+            if self._metrics is not None:
+                self._metrics.increment(
+                    "llm_route_explorations_total",
+                    {"provider": explored.provider_name, "model": explored.model_name},
+                )
+        if ranked[0] is not primary:
+            logger.debug(
+                "llm route reordered requested=%s selected=%s/%s",
+                model_name,
+                ranked[0].provider_name,
+                ranked[0].model_name,
+            )
+        return ranked
+
+    # -- scoring & hedging ------------------------------------------------
+
+    def _record_route(self, route: RouteResolution, elapsed: float, *, success: bool) -> None:
+        self._scoreboard.record(route.provider_name, route.model_name, elapsed, success=success)
+        if self._metrics is None:
+            return
+        labels = {"provider": route.provider_name, "model": route.model_name}
+        self._metrics.increment(
+            "llm_route_requests_total",
+            {**labels, "outcome": "success" if success else "error"},
+        )
+        if success:
+            self._metrics.observe("llm_route_duration_seconds", elapsed, labels)
+
+    def _record_cancelled(self, route: RouteResolution, elapsed: float) -> None:
+        """Keep a cancelled call (a hedge loser) in the latency window.
+
+        Its true latency is at least *elapsed*.  Dropping it would leave only
+        winners' latencies, so the p95 that sets the hedge delay would drift
+        down and hedges would fire ever more often.  A call cancelled before
+        reaching the route's hedge delay says nothing about that tail and is
+        not recorded.
+        """
+        if elapsed >= self._hedge_delay(route):
+            self._scoreboard.record_censored(route.provider_name, route.model_name, elapsed)
+        if self._metrics is not None:
+            self._metrics.increment(
+                "llm_route_requests_total",
+                {
+                    "provider": route.provider_name,
+                    "model": route.model_name,
+                    "outcome": "cancelled",
+                },
+            )
+
+    def _record_prompt_cache(
+        self, route: RouteResolution, response: LLMResponse | LLMStreamChunk
+    ) -> None:
+        cached = getattr(response, "cached_prompt_tokens", None)
+        prompt_tokens = getattr(response, "prompt_tokens", 0)
+        if not isinstance(cached, int) or not isinstance(prompt_tokens, int) or prompt_tokens <= 0:
+            return
+        usage = self._prompt_cache_usage.setdefault(route.provider_name, [0, 0, 0])
+        usage[0] += 1
+        usage[1] += prompt_tokens
+        usage[2] += cached
+        if self._metrics is None:
+            return
+        labels = {"provider": route.provider_name, "model": route.model_name}
+        self._metrics.increment(
+            "llm_prompt_cache_requests_total",
+            {**labels, "outcome": "hit" if cached > 0 else "miss"},
+        )
+        self._metrics.observe(
+            "llm_prompt_cache_hit_ratio", min(1.0, cached / prompt_tokens), labels
+        )
+
+    def _record_hedge(self, outcome: str) -> None:
+        if self._metrics is not None:
+            self._metrics.increment("llm_hedge_total", {"outcome": outcome})
+
+    def _hedge_delay(self, route: RouteResolution) -> float:
+        observed = self._scoreboard.quantile(
+            route.provider_name, route.model_name, self._hedge_quantile
+        )
+        delay = observed if observed is not None else self._hedge_default_delay
+        return max(delay, self._hedge_min_delay)
+
+    async def _complete_route(
+        self,
+        route: RouteResolution,
+        messages: list[ChatMessage],
+        *,
+        temperature: float,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+    ) -> LLMResponse:
+        started = time.monotonic()
+        try:
+            response = await route.provider.complete(
+                messages,
+                model=route.model_name,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+            )
+        except asyncio.CancelledError:
+            self._record_cancelled(route, time.monotonic() - started)
+            raise
+        except Exception:
+            self._record_route(route, time.monotonic() - started, success=False)
+            raise
+        self._record_route(route, time.monotonic() - started, success=True)
+        self._record_prompt_cache(route, response)
+        return response
+
+    async def _complete_hedged(
+        self,
+        primary: RouteResolution,
+        backup: RouteResolution,
+        messages: list[ChatMessage],
+        *,
+        temperature: float,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+    ) -> tuple[LLMResponse, RouteResolution]:
+        """Race *backup* against a slow *primary*; the first success wins.
+
+        Returns the winning response together with the route that produced
+        it.  The backup only fires once the primary has been outstanding
+        longer than its hedge delay, so hedging costs roughly
+        ``1 - quantile`` extra calls.  The losing call is cancelled.  When
+        both fail, the primary's error is raised so fallback handling sees
+        the same exception it would without hedging.
+        """
+        kwargs: dict[str, Any] = {
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "tools": tools,
+        }
+        primary_task = asyncio.create_task(self._complete_route(primary, messages, **kwargs))
+        tasks = [primary_task]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary))
+            if primary_task in done:
+                return primary_task.result(), primary
+            self._record_hedge("fired")
+            logger.info(
+                "llm hedge fired primary=%s/%s backup=%s/%s",
+                primary.provider_name,
+                primary.model_name,
+                backup.provider_name,
+                backup.model_name,
+            )
+            tasks.append(asyncio.create_task(self._complete_route(backup, messages, **kwargs)))
+            pending: set[asyncio.Task[LLMResponse]] = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        won = task is primary_task
+                        self._record_hedge("primary_won" if won else "backup_won")
+                        return task.result(), primary if won else backup
+            return primary_task.result(), primary
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     # -- convenience ------------------------------------------------------
 
     async def complete(
@@ -142,7 +421,51 @@ class ModelRouter:
         tools: list[dict[str, Any]] | None = None,
         allow_fallback: bool = False,
     ) -> LLMResponse:
-        """Route to the correct provider and generate a completion."""
+        """Route to the correct provider and generate a completion.
+
+        With a response cache attached, cacheable requests are answered from
+        it and successful responses are stored for later calls.
+        """
+        cache = self._response_cache
+        cache_request = (
+            cache.prepare(
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+            )
+            if cache is not None
+            else None
+        )
+        if cache is not None and cache_request is not None:
+            cached = await cache.get(cache_request)
+            if cached is not None:
+                return cached
+
+        response, provider_name = await self._complete_with_fallback(
+            messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            tools=tools,
+            allow_fallback=allow_fallback,
+        )
+        if cache is not None and cache_request is not None:
+            await cache.put(cache_request, response, provider=provider_name)
+        return response
+
+    async def _complete_with_fallback(
+        self,
+        messages: list[ChatMessage],
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int | None,
+        tools: list[dict[str, Any]] | None,
+        allow_fallback: bool,
+    ) -> tuple[LLMResponse, str]:
+        ranked = self.ranked_routes(model)
         attempts = [model]
         if allow_fallback:
             attempts.extend(
@@ -152,16 +475,26 @@ class ModelRouter:
         attempted_models: list[str] = []
         last_exc: Exception | None = None
         for index, candidate in enumerate(attempts):
-            resolved = self.resolve(candidate)
+            resolved = ranked[0] if index == 0 else self.resolve(candidate)
             attempted_models.append(candidate)
             try:
-                response = await resolved.provider.complete(
-                    messages,
-                    model=resolved.model_name,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    tools=tools,
-                )
+                if index == 0 and self._hedging_enabled and len(ranked) > 1:
+                    response, resolved = await self._complete_hedged(
+                        resolved,
+                        ranked[1],
+                        messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        tools=tools,
+                    )
+                else:
+                    response = await self._complete_route(
+                        resolved,
+                        messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        tools=tools,
+                    )
                 if index > 0:
                     logger.warning(
                         "llm fallback succeeded requested=%s actual=%s provider=%s",
@@ -169,7 +502,7 @@ class ModelRouter:
                         response.model,
                         resolved.provider_name,
                     )
-                return response
+                return response, resolved.provider_name
             except Exception as exc:
                 last_exc = exc
                 should_fallback = (
@@ -221,9 +554,10 @@ class ModelRouter:
         attempted_models: list[str] = []
         last_exc: Exception | None = None
         for index, candidate in enumerate(attempts):
-            resolved = self.resolve(candidate)
+            resolved = self.ranked_routes(candidate)[0] if index == 0 else self.resolve(candidate)
             attempted_models.append(candidate)
             yielded_chunks = False
+            usage_chunk: LLMStreamChunk | None = None
             try:
                 async for chunk in resolved.provider.stream_complete(
                     messages,
@@ -233,7 +567,11 @@ class ModelRouter:
                     tools=tools,
                 ):
                     yielded_chunks = True
+                    if chunk.usage_available:
+                        usage_chunk = chunk
                     yield chunk
+                if usage_chunk is not None:
+                    self._record_prompt_cache(resolved, usage_chunk)
                 return
             except Exception as exc:
                 last_exc = exc
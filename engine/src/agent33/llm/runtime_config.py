@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
-from agent33.config import settings
+from agent33.config import resolve_runtime_service_url, settings
 from agent33.llm.default_models import (
     llamacpp_enabled as _llamacpp_enabled,
 )
 from agent33.llm.default_models import (
     resolve_default_model as _resolve_default_model,
 )
+from agent33.llm.model_pool import ModelServerPool
 from agent33.llm.ollama import OllamaProvider
 from agent33.llm.openai import OpenAIProvider
-from agent33.llm.router import ModelRouter
+from agent33.llm.router import ModelRouter, parse_route_equivalents
+from agent33.llm.scoreboard import RouteScoreboard
+
+if TYPE_CHECKING:
+    from agent33.observability.metrics import MetricsCollector
 
 
 def llamacpp_enabled() -> bool:
@@ -51,14 +57,51 @@ def _build_openrouter_headers() -> dict[str, str]:
     return headers
 
 
-def build_model_router() -> ModelRouter:
+def build_ollama_pool(metrics: MetricsCollector | None = None) -> ModelServerPool | None:
+    """Return the Ollama model-server pool, or None when ``ollama_pool_urls`` is unset."""
+    urls = [
+        resolve_runtime_service_url(url.strip())
+        for url in settings.ollama_pool_urls.split(",")
+        if url.strip()
+    ]
+    if not urls:
+        return None
+    return ModelServerPool(
+        urls,
+        name="ollama",
+        spill_threshold=settings.ollama_pool_spill_threshold,
+        probe_interval_seconds=settings.ollama_pool_probe_interval_seconds,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive,
+        metrics=metrics,
+    )
+
+
+def build_model_router(
+    metrics: MetricsCollector | None = None,
+    ollama_pool: ModelServerPool | None = None,
+) -> ModelRouter:
     """Construct the shared runtime model router with configured providers."""
-    router = ModelRouter(default_provider="llamacpp" if llamacpp_enabled() else "ollama")
+    router = ModelRouter(
+        default_provider="llamacpp" if llamacpp_enabled() else "ollama",
+        equivalent_routes=parse_route_equivalents(settings.llm_route_equivalents),
+        hedging_enabled=settings.llm_hedging_enabled,
+        hedge_quantile=settings.llm_hedge_quantile,
+        hedge_default_delay_seconds=settings.llm_hedge_default_delay_seconds,
+        hedge_min_delay_seconds=settings.llm_hedge_min_delay_seconds,
+        exploration_rate=settings.llm_route_exploration_rate,
+        scoreboard=RouteScoreboard(min_samples=settings.llm_route_min_samples),
+        metrics=metrics,
+    )
     router.register(
         "ollama",
         OllamaProvider(
             base_url=settings.runtime_ollama_base_url,
             default_model=settings.ollama_default_model,
+            keep_alive=(
+                settings.prompt_cache_ollama_keep_alive if settings.prompt_cache_enabled else None
+            ),
+            pool=ollama_pool,
         ),
     )
     router.register(
@@ -77,6 +120,7 @@ def build_model_router() -> ModelRouter:
                 api_key="local",
                 base_url=settings.local_orchestration_base_url,
                 default_model=settings.local_orchestration_model,
+                prompt_cache_hints="llamacpp",
             ),
         )
 
@@ -88,7 +132,7 @@ def build_model_router() -> ModelRouter:
                 base_url=settings.openai_base_url,
             )
             if settings.openai_base_url
-            else OpenAIProvider(api_key=openai_api_key)
+            else OpenAIProvider(api_key=openai_api_key, prompt_cache_hints="openai")
         )
         router.register("openai", openai_provider)
 
@@ -0,0 +1,139 @@
+"""Per-route latency and error-rate scoreboard for the model router.
+
+The router records every provider call here, keyed by ``(provider, model)``.
+The scoreboard keeps an exponentially weighted latency and error rate plus a
+bounded window of recent latencies for quantiles, and ranks equivalent
+routes by expected time to a successful response.  Calls cancelled before
+they finished (the loser of a hedge) are recorded as lower-bound latencies,
+so the slow tail that triggers hedges stays in the window.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class RouteStats:
+    """Rolling latency/error statistics for one provider+model route."""
+
+    window: int = 200
+    smoothing: float = 0.2
+    calls: int = 0
+    errors: int = 0
+    ewma_latency: float | None = None
+    ewma_error_rate: float = 0.0
+    _latencies: deque[float] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._latencies = deque(maxlen=max(1, self.window))
+
+    def record(self, latency_seconds: float, *, success: bool) -> None:
+        self.calls += 1
+        failed = 0.0 if success else 1.0
+        self.ewma_error_rate += self.smoothing * (failed - self.ewma_error_rate)
+        if not success:
+            self.errors += 1
+            return
+        self._latencies.append(latency_seconds)
+        self.ewma_latency = (
+            latency_seconds
+            if self.ewma_latency is None
+            else self.ewma_latency + self.smoothing * (latency_seconds - self.ewma_latency)
+        )
+
+    def record_censored(self, latency_seconds: float) -> None:
+        """Record a call cancelled after *latency_seconds* (its latency is at least that)."""
+        self._latencies.append(latency_seconds)
+        # A lower bound can only show the route is slower than estimated.
+        if self.ewma_latency is None:
+            self.ewma_latency = latency_seconds
+        elif latency_seconds > self.ewma_latency:
+            self.ewma_latency += self.smoothing * (latency_seconds - self.ewma_latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def quantile(self, q: float) -> float | None:
+        """Return the *q* latency quantile over the recent window."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def score(self) -> float | None:
+        """Expected seconds to a successful response (lower is better).
+
+        A route whose calls have all failed scores ``inf``, the worst score.
+        """
+        if self.ewma_latency is None:
+            return math.inf if self.calls else None
+        return self.ewma_latency / max(1.0 - self.ewma_error_rate, 0.05)
+
+
+class RouteScoreboard:
+    """Latency/error scoreboard shared by one :class:`ModelRouter`."""
+
+    def __init__(self, *, window: int = 200, min_samples: int = 5) -> None:
+        self._window = window
+        self._min_samples = max(1, min_samples)
+        self._routes: dict[tuple[str, str], RouteStats] = {}
+
+    @property
+    def min_samples(self) -> int:
+        return self._min_samples
+
+    def stats(self, provider: str, model: str) -> RouteStats:
+        key = (provider, model)
+        stats = self._routes.get(key)
+        if stats is None:
+            stats = RouteStats(window=self._window)
+            self._routes[key] = stats
+        return stats
+
+    def record(self, provider: str, model: str, latency_seconds: float, *, success: bool) -> None:
+        self.stats(provider, model).record(latency_seconds, success=success)
+
+    def record_censored(self, provider: str, model: str, latency_seconds: float) -> None:
+        self.stats(provider, model).record_censored(latency_seconds)
+
+    def quantile(self, provider: str, model: str, q: float) -> float | None:
+        """Return the latency quantile once the route has enough samples."""
+        stats = self._routes.get((provider, model))
+        if stats is None or stats.samples < self._min_samples:
+            return None
+        return stats.quantile(q)
+
+    def score(self, provider: str, model: str) -> float | None:
+        """Return the route score once it has enough calls to be trusted."""
+        stats = self._routes.get((provider, model))
+        if stats is None or stats.calls < self._min_samples:
+            return None
+        return stats.score()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Return per-route statistics for diagnostics."""
+        rows: list[dict[str, Any]] = []
+        for (provider, model), stats in sorted(self._routes.items()):
+            p95 = stats.quantile(0.95)
+            rows.append(
+                {
+                    "provider": provider,
+                    "model": model,
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "error_rate": round(stats.ewma_error_rate, 4),
+                    "ewma_latency_ms": (
+                        round(stats.ewma_latency * 1000, 2)
+                        if stats.ewma_latency is not None
+                        else None
+                    ),
+                    "p95_latency_ms": round(p95 * 1000, 2) if p95 is not None else None,
+                }
+            )
+        return rows
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import time
 from contextlib import asynccontextmanager
@@ -103,6 +104,9 @@ from agent33.api.routes import (
 from agent33.api.routes import (
     plugins as plugins_routes,
 )
+from agent33.api.routes import (
+    profiling as profiling_routes,
+)
 from agent33.api.routes import (
     rate_limits as rate_limits_routes,
 )
@@ -123,6 +127,7 @@ from agent33.hooks.middleware import HookMiddleware
 from agent33.memory.long_term import LongTermMemory
 from agent33.messaging.bus import NATSMessageBus
 from agent33.observability.http_metrics import HTTPMetricsMiddleware
+from agent33.observability.sampling_profiler import ProfilingMiddleware
 from agent33.security.middleware import AuthMiddleware
 from agent33.state_paths import RuntimeStatePaths
 
@@ -184,7 +189,23 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # -- Shared orchestration state -----------------------------------------
     orchestration_state_store = None
-    if settings.orchestration_state_store_path.strip():
+    orchestration_state_backend = None
+    if settings.orchestration_state_backend != "file":
+        from agent33.services.orchestration_state import OrchestrationStateStore
+        from agent33.services.pg_orchestration_state import create_state_backend
+
+        orchestration_state_backend = create_state_backend(
+            settings.orchestration_state_backend,
+            db_path=str(state_paths.resolve_approved(settings.orchestration_state_db_path)),
+            redis_url=settings.redis_url,
+            poll_interval_seconds=settings.orchestration_state_poll_interval_seconds,
+        )
+        orchestration_state_store = OrchestrationStateStore(backend=orchestration_state_backend)
+        logger.info(
+            "orchestration_state_store_enabled",
+            backend=settings.orchestration_state_backend,
+        )
+    elif settings.orchestration_state_store_path.strip():
         from agent33.services.orchestration_state import OrchestrationStateStore
 
         orchestration_state_path = state_paths.resolve_approved(
@@ -196,6 +217,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             path=str(orchestration_state_path),
         )
     app.state.orchestration_state_store = orchestration_state_store
+    app.state.orchestration_state_backend = orchestration_state_backend
 
     from agent33.autonomy.service import AutonomyService
     from agent33.backup.service import BackupService
@@ -210,7 +232,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     review_service = ReviewService(state_store=orchestration_state_store)
     trace_collector = TraceCollector(state_store=orchestration_state_store)
     workflow_run_archive_dir = state_paths.resolve_approved(settings.workflow_run_archive_dir)
-    workflow_run_archive_service = WorkflowRunArchiveService(workflow_run_archive_dir)
+    workflow_run_archive_service = WorkflowRunArchiveService(
+        workflow_run_archive_dir,
+        batch_interval_seconds=settings.workflow_run_archive_batch_interval_seconds,
+        fsync_interval_seconds=(
+            settings.workflow_run_archive_fsync_interval_seconds
+            if settings.workflow_run_archive_fsync_interval_seconds >= 0
+            else None
+        ),
+        artifact_workers=settings.workflow_run_archive_artifact_workers,
+    )
+    await workflow_run_archive_service.start_writer()
     workflow_state_service = WorkflowStateService(
         state_store=orchestration_state_store,
         max_execution_history=1000,
@@ -275,29 +307,29 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.nats_bus = nats_bus
 
     # -- Instance registry and scaling guards (P1.2) -----------------------
-    from agent33.scaling.distributed_lock import create_lock
     from agent33.scaling.instance_registry import InstanceRegistry
-    from agent33.scaling.state_guards import SchedulerOwnershipGuard
+    from agent33.scaling.leader_election import create_leader_election
 
     instance_registry = InstanceRegistry(redis=redis_conn)
     await instance_registry.register()
     app.state.instance_registry = instance_registry
 
-    scheduler_lock = create_lock(
-        name="scheduler_ownership",
-        redis=redis_conn,
-        ttl_seconds=60,
-    )
-    scheduler_guard = SchedulerOwnershipGuard(
-        lock=scheduler_lock,
-        registry=instance_registry,
-        surface_name="scheduler",
-    )
-    app.state.scheduler_guard = scheduler_guard
+    # One replica leads the schedulers (workflow jobs, evaluation gates, tuning
+    # loop); the lease is renewed continuously and a standby takes over when it
+    # lapses.  Listeners are registered below and the election starts once every
+    # scheduler surface exists.
+    _coordination_redis = None if isinstance(redis_conn, InProcessCache) else redis_conn
+    scheduler_election = create_leader_election(
+        "scheduler_ownership",
+        redis=_coordination_redis,
+        lease_seconds=settings.scheduler_lease_seconds,
+        instance_id=instance_registry.instance_id or "",
+    )
+    app.state.scheduler_election = scheduler_election
     logger.info(
         "scaling_guards_initialized",
         instance_id=instance_registry.instance_id,
-        lock_backend="redis" if redis_conn is not None else "in-process",
+        lock_backend="redis" if _coordination_redis is not None else "in-process",
     )
 
     # -- Agent registry ----------------------------------------------------
@@ -353,6 +385,24 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     webhook_delivery_mod.set_metrics(metrics_collector)
     dead_letter_mod.set_metrics(metrics_collector)
 
+    # Count shared orchestration state writes that could not be committed.
+    from agent33.services import orchestration_state as orchestration_state_mod
+
+    orchestration_state_mod.set_metrics(metrics_collector)
+
+    # Fired scheduler jobs are queued by the leader and run on any replica.
+    from agent33.automation.job_dispatch import ScheduledJobDispatcher, create_job_fire_queue
+
+    scheduled_job_dispatcher: ScheduledJobDispatcher | None = None
+    if settings.scheduler_dispatch_enabled:
+        scheduled_job_dispatcher = ScheduledJobDispatcher(
+            create_job_fire_queue(_coordination_redis),
+            scheduler_election,
+            concurrency=settings.scheduler_dispatch_concurrency,
+            metrics=metrics_collector,
+        )
+    app.state.scheduled_job_dispatcher = scheduled_job_dispatcher
+
     # Wire metrics into evaluation subsystem (P4.7)
     from agent33.evaluation import service as evaluation_service_mod
 
@@ -363,6 +413,26 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     messaging_boundary_mod.set_metrics(metrics_collector)
 
+    # Hot-path sampling profiler: the watchdog thread and heartbeat start now,
+    # stack sampling only runs while an admin-started session is active.
+    if settings.sampling_profiler_enabled:
+        from agent33.observability.sampling_profiler import (
+            SamplingProfiler,
+            configure_sampling_profiler,
+        )
+
+        sampling_profiler = SamplingProfiler(
+            max_duration_seconds=settings.sampling_profiler_max_duration_seconds,
+            default_interval_ms=settings.sampling_profiler_default_interval_ms,
+            max_stacks=settings.sampling_profiler_max_stacks,
+            slow_callback_ms=settings.sampling_profiler_slow_callback_ms,
+            lag_interval_ms=settings.sampling_profiler_lag_interval_ms,
+        )
+        await sampling_profiler.start()
+        configure_sampling_profiler(sampling_profiler)
+        app.state.sampling_profiler = sampling_profiler
+        logger.info("sampling_profiler_started")
+
     effort_telemetry_exporter = (
         FileEffortTelemetryExporter(settings.observability_effort_export_path)
         if settings.observability_effort_export_enabled
@@ -418,6 +488,37 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.breaker_registry = breaker_registry
     logger.info("connector_metrics_and_registry_initialized")
 
+    if settings.connector_concurrency_limit_enabled:
+        from agent33.connectors.boundary import limiter_registry_from_settings
+        from agent33.connectors.concurrency import configure_concurrency_limiter_registry
+
+        concurrency_limiter_registry = limiter_registry_from_settings(metrics=metrics_collector)
+        app.state.concurrency_limiter_registry = concurrency_limiter_registry
+        configure_concurrency_limiter_registry(concurrency_limiter_registry)
+        logger.info("connector_concurrency_limiter_registry_initialized")
+
+    # -- Shared outbound HTTP client pool ----------------------------------
+    if settings.http_pool_enabled:
+        from agent33.connectors.http_pool import (
+            ConnectorPoolLimits,
+            HTTPClientPool,
+            configure_http_client_pool,
+            parse_connector_limits,
+        )
+
+        http_client_pool = HTTPClientPool(
+            default_limits=ConnectorPoolLimits(
+                max_connections=settings.http_pool_max_connections,
+                max_keepalive_connections=settings.http_pool_max_keepalive_connections,
+                keepalive_expiry_seconds=settings.http_pool_keepalive_expiry_seconds,
+            ),
+            connector_limits=parse_connector_limits(settings.http_pool_connector_limits),
+            http2=settings.http_pool_http2,
+        )
+        app.state.http_client_pool = http_client_pool
+        configure_http_client_pool(http_client_pool)
+        logger.info("http_client_pool_initialized", http2=http_client_pool.http2)
+
     # -- Agent runtime / workflow integration ------------------------------
     from agent33.workflows.actions.invoke_agent import (
         register_agent,
@@ -484,9 +585,21 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         default_image=settings.execution_default_docker_image,
     )
 
-    from agent33.llm.runtime_config import build_model_router, llamacpp_enabled
+    from agent33.llm.runtime_config import (
+        build_model_router,
+        build_ollama_pool,
+        llamacpp_enabled,
+    )
 
-    model_router = build_model_router()
+    ollama_pool = build_ollama_pool(metrics=metrics_collector)
+    if ollama_pool is not None:
+        await ollama_pool.start()
+        logger.info(
+            "ollama_model_pool_started",
+            backends=[backend.base_url for backend in ollama_pool.backends],
+        )
+    app.state.ollama_model_pool = ollama_pool
+    model_router = build_model_router(metrics=metrics_collector, ollama_pool=ollama_pool)
 
     if llamacpp_enabled():
         logger.info(
@@ -496,6 +609,31 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             model=settings.local_orchestration_model,
         )
 
+    if settings.llm_response_cache_enabled:
+        from agent33.llm.response_cache import LLMResponseCache
+
+        llm_response_cache = LLMResponseCache(
+            max_entries=settings.llm_response_cache_max_entries,
+            ttl_seconds=settings.llm_response_cache_ttl_seconds,
+            max_temperature=settings.llm_response_cache_max_temperature,
+            semantic_threshold=settings.llm_response_cache_semantic_threshold,
+            cost_tracker=cost_tracker,
+            metrics=metrics_collector,
+        )
+        model_router.attach_response_cache(llm_response_cache)
+        app.state.llm_response_cache = llm_response_cache
+
+    from agent33.llm.batching import UtilityBatcher
+
+    utility_batcher = UtilityBatcher(
+        model_router,
+        mode=settings.llm_utility_batch_mode,
+        max_batch_size=settings.llm_utility_batch_size,
+        max_concurrency=settings.llm_utility_batch_concurrency,
+        metrics=metrics_collector,
+    )
+    app.state.utility_batcher = utility_batcher
+
     app.state.model_router = model_router
     logger.info("model_router_initialized")
 
@@ -761,6 +899,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         model=settings.embedding_default_model,
         max_connections=settings.http_max_connections,
         max_keepalive_connections=settings.http_max_keepalive,
+        pool=ollama_pool,
     )
     app.state.embedding_provider = embedding_provider
 
@@ -781,13 +920,41 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             ratio=f"{compressor.compression_ratio():.1f}x",
         )
 
+    embedding_tiers: list[Any] = []
     if settings.embedding_cache_enabled:
         from agent33.memory.cache import EmbeddingCache
 
+        if settings.embedding_cache_redis_enabled and not isinstance(redis_conn, InProcessCache):
+            import redis.asyncio as aioredis
+
+            from agent33.memory.embedding_tiers import RedisEmbeddingTier
+
+            # Vectors are binary: this client must not decode responses.
+            embedding_tiers.append(
+                RedisEmbeddingTier(
+                    aioredis.from_url(  # type: ignore[no-untyped-call]
+                        settings.redis_url,
+                        max_connections=settings.redis_max_connections,
+                    ),
+                    ttl_seconds=settings.embedding_cache_redis_ttl_seconds,
+                    owns_client=True,
+                )
+            )
+        if settings.embedding_cache_disk_dir.strip():
+            from agent33.memory.embedding_tiers import DiskEmbeddingTier
+
+            embedding_tiers.append(
+                DiskEmbeddingTier(
+                    state_paths.resolve_approved(settings.embedding_cache_disk_dir),
+                    max_bytes=settings.embedding_cache_disk_max_mb * 1024 * 1024,
+                )
+            )
         embedding_cache = EmbeddingCache(
             provider=embedding_provider,
             max_size=settings.embedding_cache_max_size,
             compressor=compressor,
+            tiers=embedding_tiers,
+            metrics=metrics_collector,
         )
         active_embedder = embedding_cache
         app.state.embedding_cache = embedding_cache
@@ -795,9 +962,14 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info(
         "embedding_provider_initialized",
         cache=settings.embedding_cache_enabled,
+        cache_tiers=[tier.name for tier in embedding_tiers],
         quantized=settings.embedding_quantization_enabled,
     )
 
+    if settings.llm_response_cache_semantic_enabled and model_router.response_cache is not None:
+        model_router.response_cache.attach_embedder(active_embedder)
+        logger.info("llm_response_cache_semantic_tier_enabled")
+
     # -- Embedding hot-swap manager (S44) ----------------------------------
     embedding_swap_manager = None
     if settings.embedding_hot_swap_enabled:
@@ -896,6 +1068,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         long_term_memory=long_term_memory,
         embedding_provider=active_embedder,
         default_tenant_id=settings.knowledge_default_tenant_id,
+        embed_batch_size=settings.knowledge_embed_batch_size,
+        metrics=metrics_collector,
     )
     knowledge_service.start()
     app.state.knowledge_service = knowledge_service
@@ -1084,6 +1258,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             user_hooks_dir=user_hooks,
             default_timeout_ms=settings.script_hooks_default_timeout_ms,
             max_timeout_ms=settings.script_hooks_max_timeout_ms,
+            worker_mode_enabled=settings.script_hooks_worker_mode_enabled,
+            worker_pool_size=settings.script_hooks_worker_pool_size,
         )
         discovered = script_hook_discovery.discover()
         app.state.script_hook_discovery = script_hook_discovery
@@ -1093,23 +1269,61 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     operator_session_service = None
     if settings.operator_session_enabled:
         from agent33.sessions.service import OperatorSessionService
-        from agent33.sessions.storage import FileSessionStorage
+        from agent33.sessions.storage import FileSessionStorage, SessionStorage
+
+        session_storage: SessionStorage
+        if settings.operator_session_backend == "sqlite":
+            import uuid
+
+            from agent33.sessions.pg_storage import SqliteSessionStorage
+
+            session_db = state_paths.resolve_approved(settings.operator_session_db_path)
+            session_db.parent.mkdir(parents=True, exist_ok=True)
+            session_storage = SqliteSessionStorage(
+                str(session_db),
+                owner=instance_registry.instance_id or uuid.uuid4().hex,
+                lease_seconds=settings.operator_session_lease_seconds,
+                event_flush_interval_seconds=(
+                    settings.operator_session_event_flush_interval_seconds
+                ),
+                poll_interval_seconds=settings.operator_session_poll_interval_seconds,
+            )
+        elif settings.operator_session_backend == "redis":
+            import uuid
 
-        base_dir = (
-            state_paths.resolve_approved(settings.operator_session_base_dir)
-            if settings.operator_session_base_dir.strip()
-            else state_paths.default_user_state_dir("sessions")
-        )
-        session_storage = FileSessionStorage(
-            base_dir=base_dir,
-            max_replay_file_bytes=settings.operator_session_max_replay_file_mb * 1024 * 1024,
-        )
+            import redis as redis_sync
+
+            from agent33.sessions.redis_storage import RedisSessionStorage
+
+            session_storage = RedisSessionStorage(
+                redis_sync.Redis.from_url(settings.redis_url),
+                owner=instance_registry.instance_id or uuid.uuid4().hex,
+                base_dir=state_paths.default_user_state_dir("sessions"),
+                lease_seconds=settings.operator_session_lease_seconds,
+                event_flush_interval_seconds=(
+                    settings.operator_session_event_flush_interval_seconds
+                ),
+            )
+        elif settings.operator_session_backend == "file":
+            session_storage = FileSessionStorage(
+                base_dir=(
+                    state_paths.resolve_approved(settings.operator_session_base_dir)
+                    if settings.operator_session_base_dir.strip()
+                    else state_paths.default_user_state_dir("sessions")
+                ),
+                max_replay_file_bytes=settings.operator_session_max_replay_file_mb * 1024 * 1024,
+            )
+        else:
+            raise ValueError(
+                f"Unknown operator session backend: {settings.operator_session_backend!r}"
+            )
         operator_session_service = OperatorSessionService(
             storage=session_storage,
             hook_registry=hook_registry,
             checkpoint_interval_seconds=settings.operator_session_checkpoint_interval_seconds,
             max_sessions_retained=settings.operator_session_max_retained,
             session_cleanup_callback=pack_registry.clear_session_state,
+            hot_cache_size=settings.operator_session_hot_cache_size,
         )
         app.state.operator_session_service = operator_session_service
         sessions.set_session_service(operator_session_service)
@@ -1127,7 +1341,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             except Exception:
                 logger.warning("crash_detection_failed", exc_info=True)
 
-        logger.info("operator_session_service_initialized", base_dir=str(base_dir))
+        logger.info(
+            "operator_session_service_initialized",
+            backend=settings.operator_session_backend,
+            base_dir=str(session_storage.base_dir),
+        )
 
     # -- Track 8: Session catalog, lineage, spawn, archive -----------------
     if operator_session_service is not None:
@@ -1195,7 +1413,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         create_search_provider_registry,
     )
 
-    search_provider_registry = create_search_provider_registry()
+    search_provider_registry = create_search_provider_registry(metrics=metrics_collector)
     app.state.search_provider_registry = search_provider_registry
     web_research.set_search_provider_registry(search_provider_registry)
     logger.info(
@@ -1204,8 +1422,41 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         default=search_provider_registry.default_provider_id,
     )
 
+    web_research_cache = None
+    if settings.web_research_cache_enabled:
+        from agent33.web_research.cache import (
+            CacheTier,
+            RedisCacheTier,
+            SQLiteCacheTier,
+            WebResearchCache,
+            configure_web_research_cache,
+        )
+
+        cache_tier: CacheTier | None = None
+        if settings.web_research_cache_backend == "redis" and redis_conn is not None:
+            cache_tier = RedisCacheTier(redis_conn)
+        elif settings.web_research_cache_backend == "sqlite":
+            cache_tier = SQLiteCacheTier(settings.web_research_cache_sqlite_path)
+        web_research_cache = WebResearchCache(
+            max_entries=settings.web_research_cache_max_entries,
+            max_bytes=settings.web_research_cache_max_bytes,
+            search_ttl_seconds=settings.web_research_cache_search_ttl_seconds,
+            fetch_ttl_seconds=settings.web_research_cache_fetch_ttl_seconds,
+            max_ttl_seconds=settings.web_research_cache_max_ttl_seconds,
+            cross_tenant=settings.web_research_cache_cross_tenant,
+            tier=cache_tier,
+        )
+        app.state.web_research_cache = web_research_cache
+        configure_web_research_cache(web_research_cache)
+        logger.info(
+            "web_research_cache_initialized",
+            backend=settings.web_research_cache_backend if cache_tier is not None else "memory",
+        )
+
     web_research_service = create_default_web_research_service(
         search_registry=search_provider_registry,
+        cache=web_research_cache,
+        metrics=metrics_collector,
     )
     app.state.web_research_service = web_research_service
     research.set_research_service(web_research_service)
@@ -1244,11 +1495,80 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # -- WebSocket manager for workflow events ------------------------------
     from agent33.workflows.ws_manager import WorkflowWSManager
 
-    ws_manager = WorkflowWSManager(archive_service=workflow_run_archive_service)
+    ws_manager = WorkflowWSManager(
+        archive_service=workflow_run_archive_service,
+        lock_shards=settings.workflow_ws_lock_shards,
+    )
     app.state.ws_manager = ws_manager
     workflows.set_ws_manager(ws_manager)
     logger.info("workflow_ws_manager_initialized")
 
+    app.state.workflow_event_fanout = None
+    if settings.workflow_events_distributed:
+        if isinstance(nats_bus, NATSMessageBus) and nats_bus.is_connected:
+            import uuid
+
+            from agent33.workflows.ws_fanout import WorkflowEventFanout
+
+            workflow_event_fanout = WorkflowEventFanout(
+                nats_bus,
+                instance_id=instance_registry.instance_id or uuid.uuid4().hex,
+                subject_prefix=settings.workflow_events_subject_prefix,
+                stream_name=settings.workflow_events_stream,
+                replay_limit=ws_manager.sse_replay_buffer_size,
+                max_age_seconds=settings.workflow_events_retention_seconds,
+                metrics=metrics_collector,
+            )
+            try:
+                await workflow_event_fanout.start(ws_manager)
+                app.state.workflow_event_fanout = workflow_event_fanout
+            except Exception:
+                logger.warning("workflow_event_fanout_init_failed", exc_info=True)
+        else:
+            logger.warning(
+                "workflow_event_fanout_skipped",
+                reason="distributed workflow events require a connected NATS bus",
+            )
+
+    # -- Distributed workflow step execution --------------------------------
+    app.state.step_worker = None
+    if settings.workflow_distributed_steps_enabled:
+        from agent33.workflows.step_queue import create_step_queue
+        from agent33.workflows.step_workers import (
+            StepDispatcher,
+            StepWorker,
+            configure_step_dispatcher,
+        )
+
+        local_steps_only = isinstance(redis_conn, InProcessCache)
+        if local_steps_only:
+            logger.warning(
+                "workflow_step_queue_in_process",
+                reason="no Redis; distributed steps run on this replica only",
+            )
+        step_queue = create_step_queue(
+            None if local_steps_only else redis_conn,
+            lease_seconds=settings.workflow_step_lease_seconds,
+            max_deliveries=settings.workflow_step_max_deliveries,
+            result_ttl_seconds=settings.workflow_step_result_ttl_seconds,
+        )
+        configure_step_dispatcher(
+            StepDispatcher(
+                step_queue,
+                result_timeout_seconds=settings.workflow_step_result_timeout_seconds,
+            )
+        )
+        if settings.workflow_step_worker_enabled or local_steps_only:
+            step_worker = StepWorker(
+                step_queue,
+                worker_id=instance_registry.instance_id,
+                concurrency=settings.workflow_step_worker_concurrency,
+                lease_seconds=settings.workflow_step_lease_seconds,
+                metrics=metrics_collector,
+            )
+            step_worker.start()
+            app.state.step_worker = step_worker
+
     # -- Streaming manager for agent WebSocket transport (P2.5) -------------
     from agent33.api.routes.streaming import StreamingManager
 
@@ -1367,9 +1687,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     )
     from agent33.services.orchestration_state import OrchestrationStateStore
 
-    plugin_state_store = OrchestrationStateStore(
-        str(state_paths.resolve_approved(settings.plugin_state_store_path))
-    )
+    if orchestration_state_backend is not None:
+        # Plugin namespaces are distinct, so they share the replicas' backend.
+        plugin_state_store = OrchestrationStateStore(backend=orchestration_state_backend)
+    else:
+        plugin_state_store = OrchestrationStateStore(
+            str(state_paths.resolve_approved(settings.plugin_state_store_path))
+        )
     plugin_event_store = PluginEventStore(plugin_state_store)
     plugin_config_store = PluginConfigStore(plugin_state_store)
     _plugin_allowlist = (
@@ -1534,7 +1858,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         app.state.trajectory_tracker = trajectory_tracker
 
         # TitleGenerator uses heuristic-only until a router is wired.
-        title_gen = TitleGenerator(router=model_router)
+        title_gen = TitleGenerator(router=model_router, batcher=utility_batcher)
         app.state.title_generator = title_gen
 
         from agent33.api.routes import sessions as sessions_route_mod
@@ -1563,21 +1887,27 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         from agent33.evaluation.scheduled_gates import ScheduledGateService
 
         _eval_svc = evaluations.get_evaluation_service()
+        _gate_job_repo: Any = None
+        if settings.control_plane_backend == "sqlite":
+            from agent33.automation.pg_scheduler_repository import SqliteSchedulerJobRepository
+
+            _gate_job_repo = SqliteSchedulerJobRepository(
+                settings.control_plane_db_path, table="scheduled_gate_jobs"
+            )
         scheduled_gate_service = ScheduledGateService(
             evaluation_service=_eval_svc,
             max_schedules=settings.scheduled_gates_max_schedules,
             history_retention=settings.scheduled_gates_history_retention,
+            job_repository=_gate_job_repo,
+            dispatcher=scheduled_job_dispatcher,
         )
-        # Guard scheduler startup with distributed lock (P1.2)
-        _sched_owns = await scheduler_guard.acquire_ownership()
-        if _sched_owns:
-            await scheduled_gate_service.start()
-            logger.info("scheduled_gate_service_initialized")
-        else:
-            logger.warning(
-                "scheduled_gate_service_skipped_lock_held",
-                instance_id=instance_registry.instance_id,
-            )
+        # Every replica runs the service paused; scheduler leadership resumes it (P1.2)
+        await scheduled_gate_service.start(paused=True)
+        scheduler_election.add_listener(
+            on_elected=scheduled_gate_service.resume,
+            on_demoted=scheduled_gate_service.pause,
+        )
+        logger.info("scheduled_gate_service_initialized")
         app.state.scheduled_gate_service = scheduled_gate_service
         scheduled_gates_routes.set_service(scheduled_gate_service)
         app.include_router(scheduled_gates_routes.router)
@@ -1885,47 +2215,71 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # -- Tuning loop scheduler (Phase 31) ------------------------------------
     if settings.improvement_tuning_loop_enabled and settings.improvement_learning_enabled:
-        # Only start the tuning loop if this instance owns the scheduler lock (P1.2)
-        _tuning_owns = scheduler_guard._lock.is_held
-        if not _tuning_owns:
-            # If scheduled gates did not claim ownership, try now
-            _tuning_owns = await scheduler_guard.acquire_ownership()
-        if _tuning_owns:
-            try:
-                from agent33.improvement.tuning import TuningLoopScheduler, TuningLoopService
+        # The tuning loop only runs on the scheduler leader (P1.2)
+        try:
+            from agent33.improvement.tuning import TuningLoopScheduler, TuningLoopService
 
-                _improvement_svc = improvements.get_improvement_service()
-                _config_apply_svc = getattr(app.state, "config_apply_service", None)
-                _tuning_svc = TuningLoopService(_improvement_svc, _config_apply_svc, settings)
-                _tuning_scheduler = TuningLoopScheduler(
-                    _tuning_svc, settings.improvement_tuning_loop_interval_hours
-                )
-                app.state.tuning_loop_scheduler = _tuning_scheduler
-                await _tuning_scheduler.start()
-                logger.info("tuning_loop_scheduler_started")
-            except Exception:
-                logger.warning("tuning_loop_scheduler_init_failed", exc_info=True)
-        else:
-            logger.warning(
-                "tuning_loop_scheduler_skipped_lock_held",
-                instance_id=instance_registry.instance_id,
+            _improvement_svc = improvements.get_improvement_service()
+            _config_apply_svc = getattr(app.state, "config_apply_service", None)
+            _tuning_svc = TuningLoopService(_improvement_svc, _config_apply_svc, settings)
+            _tuning_scheduler = TuningLoopScheduler(
+                _tuning_svc, settings.improvement_tuning_loop_interval_hours
+            )
+            app.state.tuning_loop_scheduler = _tuning_scheduler
+            scheduler_election.add_listener(
+                on_elected=_tuning_scheduler.start,
+                on_demoted=_tuning_scheduler.stop,
             )
+            logger.info("tuning_loop_scheduler_initialized")
+        except Exception:
+            logger.warning("tuning_loop_scheduler_init_failed", exc_info=True)
 
     # -- Webhook delivery manager (S43) ------------------------------------
     from agent33.automation.webhook_delivery import WebhookDeliveryManager
 
+    _webhook_delivery_store = None
+    if settings.control_plane_backend == "sqlite":
+        import uuid
+
+        from agent33.automation.pg_webhook_repository import SqliteWebhookDeliveryStore
+
+        _webhook_delivery_store = SqliteWebhookDeliveryStore(
+            settings.control_plane_db_path,
+            owner=instance_registry.instance_id or uuid.uuid4().hex,
+            lease_seconds=settings.webhook_delivery_lease_seconds,
+        )
     _webhook_delivery_mgr = WebhookDeliveryManager(
         max_retries=settings.webhook_delivery_max_retries,
         base_delay_seconds=settings.webhook_delivery_base_delay,
         max_delay_seconds=settings.webhook_delivery_max_delay,
         max_records=settings.webhook_delivery_max_records,
+        store=_webhook_delivery_store,
+        allow_private_targets=settings.webhook_delivery_allow_private_targets,
     )
     app.state.webhook_delivery = _webhook_delivery_mgr
     logger.info(
         "webhook_delivery_manager_initialized",
         max_retries=settings.webhook_delivery_max_retries,
         max_records=settings.webhook_delivery_max_records,
-    )
+        durable=_webhook_delivery_store is not None,
+    )
+    if settings.webhook_delivery_engine_enabled:
+        from agent33.automation.webhook_engine import WebhookDeliveryEngine
+
+        _webhook_engine = WebhookDeliveryEngine(
+            _webhook_delivery_mgr,
+            workers=settings.webhook_delivery_workers,
+            endpoint_concurrency=settings.webhook_delivery_endpoint_concurrency,
+            ordered=settings.webhook_delivery_ordered,
+            timeout_seconds=settings.webhook_delivery_timeout_seconds,
+            flush_interval_seconds=settings.webhook_delivery_flush_interval_seconds,
+            lease_refresh_seconds=settings.webhook_delivery_lease_seconds / 3,
+        )
+        try:
+            await _webhook_engine.start()
+            app.state.webhook_delivery_engine = _webhook_engine
+        except Exception:
+            logger.warning("webhook_delivery_engine_start_failed", exc_info=True)
 
     # -- Alembic migration checker (S34) ------------------------------------
     from agent33.migrations.checker import MigrationChecker as _MigrationChecker
@@ -2021,6 +2375,32 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         ),
     )
 
+    # -- Workflow scheduler under scheduler leadership (P1.2) ------------------
+    from agent33.automation.scheduler import WorkflowScheduler
+
+    workflow_scheduler = WorkflowScheduler(
+        on_trigger=workflows._scheduled_execution_callback,
+        job_repository=scheduler_job_repo,
+        dispatcher=scheduled_job_dispatcher,
+        sync_interval_seconds=settings.scheduler_job_sync_seconds,
+    )
+    workflow_scheduler.start(paused=True)
+    scheduler_election.add_listener(
+        on_elected=workflow_scheduler.resume,
+        on_demoted=workflow_scheduler.pause,
+    )
+    workflows.set_scheduler(workflow_scheduler)
+    app.state.workflow_scheduler = workflow_scheduler
+    if scheduled_job_dispatcher is not None:
+        scheduled_job_dispatcher.start()
+    _is_scheduler_leader = await scheduler_election.start()
+    logger.info(
+        "scheduler_leader_election_started",
+        instance_id=instance_registry.instance_id,
+        leader=_is_scheduler_leader,
+        dispatch=scheduled_job_dispatcher is not None,
+    )
+
     # -- Outcomes service (P68-Lite + P72 persistence) -------------------------
     from agent33.evaluation.ppack_ab_persistence import PPackABPersistence
     from agent33.evaluation.ppack_ab_service import GitHubIssueAlertConfig, PPackABService
@@ -2098,8 +2478,44 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         except Exception:
             logger.warning("process_manager_service_shutdown_failed", exc_info=True)
 
+    _sampling_profiler: Any = getattr(app.state, "sampling_profiler", None)
+    if _sampling_profiler is not None:
+        from agent33.observability.sampling_profiler import configure_sampling_profiler
+
+        configure_sampling_profiler(None)
+        try:
+            await _sampling_profiler.aclose()
+            logger.info("sampling_profiler_shutdown")
+        except Exception:
+            logger.warning("sampling_profiler_shutdown_failed", exc_info=True)
+
+    if settings.workflow_distributed_steps_enabled:
+        from agent33.workflows.step_workers import configure_step_dispatcher
+
+        configure_step_dispatcher(None)
+    _step_worker: Any = getattr(app.state, "step_worker", None)
+    if _step_worker is not None:
+        await _step_worker.stop()
+    _workflow_event_fanout: Any = getattr(app.state, "workflow_event_fanout", None)
+    if _workflow_event_fanout is not None:
+        _workflow_event_fanout.stop()
     workflows.set_ws_manager(None)
     workflows.set_workflow_run_archive_service(None)
+    _workflow_run_archive: Any = getattr(app.state, "workflow_run_archive_service", None)
+    if _workflow_run_archive is not None:
+        try:
+            await _workflow_run_archive.aclose()
+            logger.info("workflow_run_archive_writer_shutdown")
+        except Exception:
+            logger.warning("workflow_run_archive_writer_shutdown_failed", exc_info=True)
+
+    _script_hook_discovery: Any = getattr(app.state, "script_hook_discovery", None)
+    if _script_hook_discovery is not None:
+        try:
+            await _script_hook_discovery.aclose()
+            logger.info("script_hook_workers_shutdown")
+        except Exception:
+            logger.warning("script_hook_workers_shutdown_failed", exc_info=True)
 
     _spawner_svc: Any = getattr(app.state, "spawner_service", None)
     if _spawner_svc is not None:
@@ -2168,14 +2584,53 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         await _embedder.close()
         logger.info("embedding_provider_closed")
 
-    # Release scheduler ownership and deregister instance (P1.2)
+    _ollama_pool: Any = getattr(app.state, "ollama_model_pool", None)
+    if _ollama_pool is not None:
+        await _ollama_pool.close()
+        logger.info("ollama_model_pool_closed")
+
+    # Hand scheduler leadership over and deregister instance (P1.2)
     # Must happen before Redis is closed since it uses Redis keys.
-    _sched_guard: Any = getattr(app.state, "scheduler_guard", None)
-    if _sched_guard is not None:
+    _sched_election: Any = getattr(app.state, "scheduler_election", None)
+    if _sched_election is not None:
+        try:
+            await _sched_election.stop()
+        except Exception:
+            logger.warning("scheduler_election_stop_failed", exc_info=True)
+    _job_dispatcher: Any = getattr(app.state, "scheduled_job_dispatcher", None)
+    if _job_dispatcher is not None:
+        await _job_dispatcher.stop()
+    workflows.set_scheduler(None)
+    _workflow_sched: Any = getattr(app.state, "workflow_scheduler", None)
+    if _workflow_sched is not None:
+        _workflow_sched.stop()
+
+    # Stop webhook senders and write outstanding receipts before deregistering.
+    _webhook_engine_state: Any = getattr(app.state, "webhook_delivery_engine", None)
+    if _webhook_engine_state is not None:
         try:
-            await _sched_guard.release_ownership()
+            await _webhook_engine_state.stop()
+            logger.info("webhook_delivery_engine_stopped")
         except Exception:
-            logger.warning("scheduler_guard_release_failed", exc_info=True)
+            logger.warning("webhook_delivery_engine_stop_failed", exc_info=True)
+
+    _state_backend: Any = getattr(app.state, "orchestration_state_backend", None)
+    if _state_backend is not None:
+        # Commit writes still queued on the stores' writer threads first.
+        for _state_store_attr in ("orchestration_state_store", "plugin_state_store"):
+            _queued_store: Any = getattr(app.state, _state_store_attr, None)
+            if _queued_store is None:
+                continue
+            try:
+                await asyncio.to_thread(_queued_store.flush)
+            except Exception:
+                logger.warning(
+                    "orchestration_state_flush_failed", store=_state_store_attr, exc_info=True
+                )
+        try:
+            _state_backend.close()
+        except Exception:
+            logger.warning("orchestration_state_backend_close_failed", exc_info=True)
 
     _inst_registry: Any = getattr(app.state, "instance_registry", None)
     if _inst_registry is not None:
@@ -2234,6 +2689,33 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         _security_store.close()
         logger.info("security_scan_store_closed")
 
+    _web_research_cache: Any = getattr(app.state, "web_research_cache", None)
+    if _web_research_cache is not None:
+        from agent33.web_research.cache import configure_web_research_cache
+
+        configure_web_research_cache(None)
+        try:
+            await _web_research_cache.aclose()
+            logger.info("web_research_cache_closed")
+        except Exception:
+            logger.warning("web_research_cache_close_failed", exc_info=True)
+
+    if getattr(app.state, "concurrency_limiter_registry", None) is not None:
+        from agent33.connectors.concurrency import configure_concurrency_limiter_registry
+
+        configure_concurrency_limiter_registry(None)
+
+    _http_client_pool: Any = getattr(app.state, "http_client_pool", None)
+    if _http_client_pool is not None:
+        from agent33.connectors.http_pool import configure_http_client_pool
+
+        configure_http_client_pool(None)
+        try:
+            await _http_client_pool.aclose()
+            logger.info("http_client_pool_closed")
+        except Exception:
+            logger.warning("http_client_pool_close_failed", exc_info=True)
+
     if nats_bus.is_connected:
         await nats_bus.close()
         logger.info("nats_closed")
@@ -2361,7 +2843,8 @@ app = FastAPI(
 )
 
 # -- Middleware (order matters: last added = first executed) --------------------
-# Order: SessionPod -> HTTPMetrics -> CORS -> Auth -> RateLimit -> SizeLimit -> Hooks -> Router
+# Order: SessionPod -> Profiling -> HTTPMetrics -> CORS -> Auth -> RateLimit -> SizeLimit
+#        -> Hooks -> Router
 # HookMiddleware added first so it runs last (after auth resolves tenant_id)
 app.add_middleware(HookMiddleware)
 app.add_middleware(RequestSizeLimitMiddleware)
@@ -2402,6 +2885,10 @@ app.add_middleware(
 # Collector is resolved lazily from app.state.metrics_collector (set in lifespan).
 app.add_middleware(HTTPMetricsMiddleware)
 
+# Profiling middleware: tags requests as route:<path> for sampling sessions
+# (a pass-through unless a session is running).
+app.add_middleware(ProfilingMiddleware)
+
 # Session pod identity middleware: outermost layer, adds X-Agent33-Session-Pod
 # header for debugging sticky routing in multi-replica deployments.
 app.add_middleware(SessionPodMiddleware)
@@ -2481,6 +2968,7 @@ app.include_router(commands.router)
 app.include_router(execution_routes.router)
 app.include_router(migrations.router)
 app.include_router(rate_limits_routes.router)
+app.include_router(profiling_routes.router)
 app.include_router(streaming.router)
 app.include_router(knowledge.router)
 if settings.embedding_hot_swap_enabled:
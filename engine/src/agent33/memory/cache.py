@@ -8,6 +8,16 @@ When ``compressor`` is provided, embeddings are stored in quantized form
 This trades a small amount of reconstruction error for dramatically
 higher cache capacity at the same memory budget.
 
+The in-process LRU is the first tier.  Optional lower ``tiers`` (see
+:mod:`agent33.memory.embedding_tiers`: a Redis tier shared by replicas and
+an on-disk tier that survives restarts) are consulted in order for what the
+LRU misses, with one multi-get per tier per batch; hits are copied to the
+tiers above them and provider results are written to every tier.  Keys are
+namespaced by the provider's model id and the vector encoding, so after an
+embedding model swap lookups simply land in a new namespace.  Uncompressed
+vectors are written to the tiers as float64, the precision of the in-process
+lists, so a tier hit returns exactly the vector the provider produced.
+
 The lock only protects the OrderedDict structure (fast dict reads/writes).
 CPU-bound compress/decompress work runs outside the lock via
 ``run_in_executor`` to avoid blocking the event loop.
@@ -15,14 +25,25 @@ CPU-bound compress/decompress work runs outside the lock via
 
 from __future__ import annotations
 
+import array
 import asyncio
 import hashlib
+import logging
+import struct
 from collections import OrderedDict
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from agent33.memory.embedding_tiers import EmbeddingCacheTier
     from agent33.memory.embeddings import EmbeddingProvider
     from agent33.memory.quantization import TurboQuantCompressor
+    from agent33.observability.metrics import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+_L1 = "memory"
 
 
 def _text_key(text: str) -> str:
@@ -42,6 +63,11 @@ class EmbeddingCache:
     compressor:
         Optional :class:`TurboQuantCompressor`.  When provided, embeddings
         are stored quantized (~8x smaller) and decompressed on retrieval.
+    tiers:
+        Lower cache tiers, consulted in order after the in-process LRU.
+    metrics:
+        Optional collector for ``embedding_cache_lookups_total`` by tier
+        and outcome.
     """
 
     def __init__(
@@ -49,6 +75,8 @@ class EmbeddingCache:
         provider: EmbeddingProvider,
         max_size: int = 1024,
         compressor: TurboQuantCompressor | None = None,
+        tiers: Sequence[EmbeddingCacheTier] = (),
+        metrics: MetricsCollector | None = None,
     ) -> None:
         self._provider = provider
         self._max_size = max(1, max_size)
@@ -58,12 +86,17 @@ class EmbeddingCache:
         self._hits: int = 0
         self._misses: int = 0
         self._compressor = compressor
+        self._tiers = list(tiers)
+        self._metrics = metrics
+        self._tier_counts: dict[str, list[int]] = {
+            name: [0, 0] for name in [_L1, *(tier.name for tier in self._tiers)]
+        }
 
     # -- Single embedding -------------------------------------------------
 
     async def embed(self, text: str) -> list[float]:
         """Return embedding for *text*, serving from cache when possible."""
-        key = _text_key(text)
+        key = self._key(text)
 
         # Fast cache lookup under lock (dict read only).
         cached: Any = None
@@ -72,6 +105,7 @@ class EmbeddingCache:
                 self._cache.move_to_end(key)
                 self._hits += 1
                 cached = self._cache[key]
+        self._count(_L1, hit=cached is not None)
 
         if cached is not None:
             # Decompress outside lock -- CPU-bound work in executor.
@@ -80,6 +114,11 @@ class EmbeddingCache:
                 return await loop.run_in_executor(None, self._compressor.decompress, cached)
             return cached  # type: ignore[no-any-return]
 
+        if self._tiers:
+            found = await self._lookup_tiers([key])
+            if 0 in found:
+                return found[0]
+
         # Cache miss -- call the underlying provider (already outside lock).
         embedding = await self._provider.embed(text)
 
@@ -96,6 +135,7 @@ class EmbeddingCache:
             self._misses += 1
             self._evict()
 
+        await self._write_tiers({key: to_store}, self._tiers)
         return embedding
 
     # -- Batch embedding --------------------------------------------------
@@ -109,7 +149,7 @@ class EmbeddingCache:
         if not texts:
             return []
 
-        keys = [_text_key(t) for t in texts]
+        keys = [self._key(t) for t in texts]
         results: list[list[float] | None] = [None] * len(texts)
         miss_indices: list[int] = []
         miss_texts: list[str] = []
@@ -125,6 +165,8 @@ class EmbeddingCache:
                 else:
                     miss_indices.append(i)
                     miss_texts.append(texts[i])
+        self._count(_L1, hit=True, n=len(cached_items))
+        self._count(_L1, hit=False, n=len(miss_indices))
 
         # Decompress cached items outside lock.
         for i, cached in cached_items:
@@ -134,6 +176,14 @@ class EmbeddingCache:
             else:
                 results[i] = cached
 
+        if miss_indices and self._tiers:
+            found = await self._lookup_tiers([keys[i] for i in miss_indices])
+            for j, vector in found.items():
+                results[miss_indices[j]] = vector
+            remaining = [j for j in range(len(miss_indices)) if j not in found]
+            miss_texts = [miss_texts[j] for j in remaining]
+            miss_indices = [miss_indices[j] for j in remaining]
+
         if miss_texts:
             new_embeddings = await self._provider.embed_batch(miss_texts)
 
@@ -157,10 +207,28 @@ class EmbeddingCache:
                     self._misses += 1
                 self._evict()
 
+            await self._write_tiers(
+                {keys[idx]: to_store_list[j] for j, idx in enumerate(miss_indices)},
+                self._tiers,
+            )
+
         return [r for r in results if r is not None]
 
     # -- Introspection ----------------------------------------------------
 
+    @property
+    def namespace(self) -> str:
+        """Key prefix: the provider's model id plus the vector encoding."""
+        model = getattr(self._provider, "model", "")
+        if not isinstance(model, str):
+            model = ""
+        if self._compressor is not None:
+            # The seed picks the rotation: vectors from another seed decode wrong.
+            encoding = f"q{self._compressor.bits}d{self._compressor.dim}s{self._compressor.seed}"
+        else:
+            encoding = "f64"
+        return f"{model or 'default'}.{encoding}"
+
     @property
     def size(self) -> int:
         """Number of embeddings currently cached."""
@@ -168,12 +236,12 @@ class EmbeddingCache:
 
     @property
     def hits(self) -> int:
-        """Total cache hits."""
+        """Total cache hits (any tier)."""
         return self._hits
 
     @property
     def misses(self) -> int:
-        """Total cache misses."""
+        """Total cache misses (embeddings computed by the provider)."""
         return self._misses
 
     @property
@@ -184,19 +252,118 @@ class EmbeddingCache:
             return 0.0
         return self._hits / total
 
+    def tier_stats(self) -> dict[str, dict[str, float]]:
+        """Lookups, hits and hit rate of each tier, in lookup order."""
+        stats: dict[str, dict[str, float]] = {}
+        for name, (hits, misses) in self._tier_counts.items():
+            lookups = hits + misses
+            stats[name] = {
+                "lookups": lookups,
+                "hits": hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+        return stats
+
     def clear(self) -> None:
-        """Evict all cached embeddings."""
+        """Evict all embeddings held in process (lower tiers are namespaced)."""
         self._cache.clear()
 
     # -- Delegate close to underlying provider ----------------------------
 
     async def close(self) -> None:
-        """Close the underlying embedding provider."""
+        """Close the lower tiers and the underlying embedding provider."""
+        for tier in self._tiers:
+            try:
+                await tier.close()
+            except Exception:
+                logger.warning("embedding_cache_tier_close_failed tier=%s", tier.name)
         await self._provider.close()
 
     # -- Internal ---------------------------------------------------------
 
+    def _key(self, text: str) -> str:
+        return f"{self.namespace}:{_text_key(text)}"
+
     def _evict(self) -> None:
         """Remove oldest entries until cache is within *max_size*."""
         while len(self._cache) > self._max_size:
             self._cache.popitem(last=False)
+
+    def _count(self, tier: str, *, hit: bool, n: int = 1) -> None:
+        if n <= 0:
+            return
+        self._tier_counts[tier][0 if hit else 1] += n
+        if self._metrics is not None:
+            labels = {"tier": tier, "outcome": "hit" if hit else "miss"}
+            for _ in range(n):
+                self._metrics.increment("embedding_cache_lookups_total", labels)
+
+    async def _lookup_tiers(self, keys: list[str]) -> dict[int, list[float]]:
+        """Look *keys* up tier by tier; return ``{position: vector}`` for hits.
+
+        Hits are stored in the LRU and copied to the tiers above the one that
+        had them.  A tier that fails is treated as a miss.
+        """
+        found: dict[int, list[float]] = {}
+        pending = list(range(len(keys)))
+        for level, tier in enumerate(self._tiers):
+            if not pending:
+                break
+            try:
+                raw = await tier.get_many([keys[i] for i in pending])
+            except Exception as exc:
+                logger.warning("embedding_cache_tier_failed tier=%s error=%s", tier.name, exc)
+                raw = [None] * len(pending)
+            hits: dict[str, Any] = {}
+            still: list[int] = []
+            for i, value in zip(pending, raw, strict=True):
+                stored = self._decode(value) if value is not None else None
+                if stored is None:
+                    still.append(i)
+                    continue
+                hits[keys[i]] = stored
+                if self._compressor is not None:
+                    loop = asyncio.get_event_loop()
+                    found[i] = await loop.run_in_executor(
+                        None, self._compressor.decompress, stored
+                    )
+                else:
+                    found[i] = stored
+            self._count(tier.name, hit=True, n=len(hits))
+            self._count(tier.name, hit=False, n=len(still))
+            if hits:
+                async with self._lock:
+                    for key, stored in hits.items():
+                        self._cache[key] = stored
+                        self._cache.move_to_end(key)
+                    self._hits += len(hits)
+                    self._evict()
+                await self._write_tiers(hits, self._tiers[:level])
+            pending = still
+        return found
+
+    async def _write_tiers(self, entries: dict[str, Any], tiers: Sequence[Any]) -> None:
+        if not entries or not tiers:
+            return
+        encoded = {key: self._encode(stored) for key, stored in entries.items()}
+        for tier in tiers:
+            try:
+                await tier.set_many(encoded)
+            except Exception as exc:
+                logger.warning("embedding_cache_tier_failed tier=%s error=%s", tier.name, exc)
+
+    def _encode(self, stored: Any) -> bytes:
+        if self._compressor is not None:
+            return self._compressor.serialize(stored)
+        return array.array("d", stored).tobytes()
+
+    def _decode(self, data: bytes) -> Any:
+        try:
+            if self._compressor is not None:
+                return self._compressor.deserialize(data)
+            vector = array.array("d")
+            vector.frombytes(data)
+            return vector.tolist()
+        except (ValueError, TypeError, struct.error) as exc:
+            logger.warning("embedding_cache_entry_unreadable error=%s", exc)
+            return None
@@ -0,0 +1,299 @@
+"""Shared and persistent tiers behind the in-process :class:`EmbeddingCache`.
+
+:class:`~agent33.memory.cache.EmbeddingCache` keeps its LRU as L1 and can
+consult lower tiers before calling the embedding provider:
+
+* :class:`RedisEmbeddingTier` (L2) -- shared by every replica; one ``MGET``
+  per batch, values written with a TTL in one pipeline;
+* :class:`DiskEmbeddingTier` (L3) -- a local append-only file per namespace,
+  read through ``mmap`` and indexed in memory by the text's SHA-256, so a
+  restarted process starts warm.  Processes sharing the directory append
+  under a file lock and index each other's records.  File locking and I/O
+  run in the default executor, so a lock held by another process never
+  stalls the event loop.
+
+Tiers exchange encoded vectors (``bytes``) under keys of the form
+``"<namespace>:<sha256 hex>"``.  The namespace names the embedding model and
+the encoding, so a model swap reads and writes a different namespace instead
+of flushing anything.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mmap
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "agent33:embedding:"
+_DIGEST_BYTES = 32
+_LENGTH_BYTES = 4
+_HEADER_BYTES = _DIGEST_BYTES + _LENGTH_BYTES
+
+
+class EmbeddingCacheTier(Protocol):
+    """A cache tier below the in-process LRU."""
+
+    name: str
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]: ...
+
+    async def set_many(self, items: Mapping[str, bytes]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class RedisEmbeddingTier:
+    """Encoded embeddings in Redis, shared by every replica.
+
+    Parameters
+    ----------
+    redis:
+        An ``redis.asyncio`` client created *without* ``decode_responses``
+        (values are binary).
+    ttl_seconds:
+        Expiry of each entry; ``0`` keeps entries until Redis evicts them.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        redis: Any,
+        *,
+        prefix: str = _REDIS_PREFIX,
+        ttl_seconds: int = 7 * 24 * 3600,
+        owns_client: bool = False,
+    ) -> None:
+        self._redis = redis
+        self._prefix = prefix
+        self._ttl = ttl_seconds
+        self._owns_client = owns_client
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        values = await self._redis.mget([self._prefix + key for key in keys])
+        return [bytes(value) if value is not None else None for value in values]
+
+    async def set_many(self, items: Mapping[str, bytes]) -> None:
+        if not items:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._prefix + key, value, ex=self._ttl or None)
+        await pipe.execute()
+
+    async def close(self) -> None:
+        if self._owns_client:
+            await self._redis.aclose()
+
+
+class _Segment:
+    """One namespace's append-only file: ``[sha256][u32 length][payload]...``.
+
+    Several processes (uvicorn workers, replicas on one host) may share the
+    file.  Appends hold an exclusive lock on a sidecar ``.lock`` file and go
+    to the real end of the file; records other processes appended are
+    indexed under a shared lock before this process writes, and when a
+    lookup misses.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.index: dict[bytes, tuple[int, int]] = {}
+        self._file = open(path, "a+b")  # noqa: SIM115 -- kept open for appends
+        self._lock_file = open(path.with_suffix(".lock"), "a+b")  # noqa: SIM115
+        self._map: mmap.mmap | None = None
+        self._mapped = 0
+        self.size = 0
+        with self._locked(exclusive=True):
+            self._load()
+
+    @contextmanager
+    def _locked(self, *, exclusive: bool) -> Iterator[None]:
+        fd = self._lock_file.fileno()
+        if sys.platform == "win32":
+            # msvcrt has no shared locks; lock the first byte exclusively.
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        self._catch_up()
+        size = os.fstat(self._file.fileno()).st_size
+        if self.size < size:
+            # A torn final record from a crash mid-append (no writer holds the
+            # exclusive lock now): cut it off.
+            logger.warning("embedding_disk_tier_truncated path=%s at=%d", self.path, self.size)
+            self._file.truncate(self.size)
+            self._remap(self.size)
+
+    def _catch_up(self) -> None:
+        """Index complete records appended past ``self.size`` (lock held)."""
+        size = os.fstat(self._file.fileno()).st_size
+        if size <= self.size:
+            return
+        self._remap(size)
+        offset = self.size
+        while offset + _HEADER_BYTES <= size and self._map is not None:
+            digest = bytes(self._map[offset : offset + _DIGEST_BYTES])
+            length = int.from_bytes(
+                self._map[offset + _DIGEST_BYTES : offset + _HEADER_BYTES], "little"
+            )
+            start = offset + _HEADER_BYTES
+            if start + length > size:
+                break
+            self.index[digest] = (start, length)
+            offset = start + length
+        self.size = offset
+
+    def _remap(self, size: int) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        self._mapped = size
+
+    def get(self, digest: bytes) -> bytes | None:
+        location = self.index.get(digest)
+        if location is None:
+            with self._locked(exclusive=False):
+                self._catch_up()
+            location = self.index.get(digest)
+            if location is None:
+                return None
+        start, length = location
+        if start + length > self._mapped:
+            self._remap(self.size)
+        assert self._map is not None
+        return bytes(self._map[start : start + length])
+
+    def append(self, records: list[tuple[bytes, bytes]]) -> None:
+        with self._locked(exclusive=True):
+            self._catch_up()
+            chunks: list[bytes] = []
+            offset = self.size
+            for digest, value in records:
+                if digest in self.index:
+                    continue  # another process already stored it
+                chunks += [digest, len(value).to_bytes(_LENGTH_BYTES, "little"), value]
+                self.index[digest] = (offset + _HEADER_BYTES, len(value))
+                offset += _HEADER_BYTES + len(value)
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+            self.size = offset
+
+    def close(self) -> None:
+        self._file.flush()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+        self._lock_file.close()
+
+
+class DiskEmbeddingTier:
+    """Encoded embeddings in local memory-mapped files, one per namespace.
+
+    Parameters
+    ----------
+    directory:
+        Where the segment files live (created if missing).
+    max_bytes:
+        Total size after which new entries are no longer written.
+    """
+
+    name = "disk"
+
+    def __init__(self, directory: str | Path, *, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._segments: dict[str, _Segment] = {}
+        self._full_logged = False
+        # Executor threads share the segments' indexes and maps.
+        self._io_lock = threading.Lock()
+
+    def _segment(self, namespace: str) -> _Segment:
+        segment = self._segments.get(namespace)
+        if segment is None:
+            safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in namespace)
+            segment = self._segments[namespace] = _Segment(self._dir / f"{safe}.emb")
+        return segment
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(segment.size for segment in self._segments.values())
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read, list(keys))
+
+    async def set_many(self, items: Mapping[str, bytes]) -> None:
+        if not items:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, dict(items))
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._close)
+
+    def _read(self, keys: list[str]) -> list[bytes | None]:
+        with self._io_lock:
+            results: list[bytes | None] = []
+            for key in keys:
+                namespace, _, hexdigest = key.rpartition(":")
+                results.append(self._segment(namespace).get(bytes.fromhex(hexdigest)))
+            return results
+
+    def _write(self, items: dict[str, bytes]) -> None:
+        with self._io_lock:
+            room = self._max_bytes - self.size_bytes
+            grouped: dict[str, list[tuple[bytes, bytes]]] = {}
+            for key, value in items.items():
+                if room < _HEADER_BYTES + len(value):
+                    if not self._full_logged:
+                        logger.warning("embedding_disk_tier_full max_bytes=%d", self._max_bytes)
+                        self._full_logged = True
+                    break
+                room -= _HEADER_BYTES + len(value)
+                namespace, _, hexdigest = key.rpartition(":")
+                grouped.setdefault(namespace, []).append((bytes.fromhex(hexdigest), value))
+            for namespace, records in grouped.items():
+                self._segment(namespace).append(records)
+
+    def _close(self) -> None:
+        with self._io_lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments.clear()
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import cast
+from typing import TYPE_CHECKING, cast
 
 import httpx
 
@@ -12,6 +12,9 @@ from agent33.connectors.boundary import (
 )
 from agent33.connectors.models import ConnectorRequest
 
+if TYPE_CHECKING:
+    from agent33.llm.model_pool import ModelServerPool
+
 _DEFAULT_BASE_URL = "http://localhost:11434"
 _DEFAULT_MODEL = "nomic-embed-text"
 _DEFAULT_TIMEOUT = 60.0
@@ -41,25 +44,37 @@ class EmbeddingProvider:
         timeout: float = _DEFAULT_TIMEOUT,
         max_connections: int = 20,
         max_keepalive_connections: int = 10,
+        pool: ModelServerPool | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._model = model
         self._timeout = timeout
-        self._client = httpx.AsyncClient(
-            timeout=timeout,
-            limits=httpx.Limits(
-                max_connections=max_connections,
-                max_keepalive_connections=max_keepalive_connections,
-            ),
+        self._pool = pool
+        self._client = (
+            pool.client
+            if pool is not None
+            else httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+            )
         )
         self._boundary_executor = build_connector_boundary_executor(
             default_timeout_seconds=timeout,
             retry_attempts=1,
         )
 
+    @property
+    def model(self) -> str:
+        """Name of the embedding model requests are sent for."""
+        return self._model
+
     async def close(self) -> None:
-        """Close the underlying HTTP client."""
-        await self._client.aclose()
+        """Close the underlying HTTP client (a pool closes its own)."""
+        if self._pool is None:
+            await self._client.aclose()
 
     async def embed(self, text: str) -> list[float]:
         """Generate an embedding vector for a single text."""
@@ -75,10 +90,13 @@ class EmbeddingProvider:
         payload = {"model": self._model, "input": texts}
 
         async def _perform_embed_batch() -> list[list[float]]:
-            response = await self._client.post(
-                f"{self._base_url}/api/embed",
-                json=payload,
-            )
+            if self._pool is None:
+                response = await self._client.post(f"{self._base_url}/api/embed", json=payload)
+            else:
+                async with self._pool.lease(self._model) as backend:
+                    response = await self._client.post(
+                        f"{backend.base_url}/api/embed", json=payload
+                    )
             response.raise_for_status()
             return _normalize_embed_response(response.json(), len(texts))
 
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 try:
     from sqlalchemy import Column, DateTime, Integer, Text, text
@@ -31,6 +32,9 @@ except ImportError:  # pragma: no cover
 
 from agent33.observability.query_profiling import track_query
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 try:
     from pgvector.sqlalchemy import Vector
 except ImportError:  # pragma: no cover
@@ -125,6 +129,57 @@ class LongTermMemory:
             record_id: int = record.id  # type: ignore[assignment]
         return record_id
 
+    async def store_many(
+        self,
+        items: Sequence[tuple[str, list[float], dict[str, Any]]],
+    ) -> list[int]:
+        """Store several ``(content, embedding, metadata)`` rows in one transaction.
+
+        Returns the record ids in input order.
+        """
+        if not items:
+            return []
+        records = [
+            MemoryRecord(content=content, embedding=embedding, metadata_=metadata or {})
+            for content, embedding, metadata in items
+        ]
+        async with (
+            track_query("memory_store_many", table="memory_records"),
+            self._session_factory() as session,
+            session.begin(),
+        ):
+            session.add_all(records)
+            await session.flush()
+            record_ids: list[int] = [record.id for record in records]  # type: ignore[misc]
+        return record_ids
+
+    async def find_by_metadata(self, match: dict[str, Any]) -> dict[int, dict[str, Any]]:
+        """Return ``{record_id: metadata}`` for records whose metadata contains *match*."""
+        sql = text(
+            "SELECT id, metadata FROM memory_records "
+            "WHERE metadata @> CAST(:match AS jsonb) ORDER BY id"
+        )
+        async with (
+            track_query("memory_find_by_metadata", table="memory_records"),
+            self._session_factory() as session,
+        ):
+            result = await session.execute(sql, {"match": json.dumps(match)})
+            rows = result.fetchall()
+        return {int(row[0]): row[1] or {} for row in rows}
+
+    async def delete(self, record_ids: Sequence[int]) -> int:
+        """Delete records by id. Returns the number of rows removed."""
+        if not record_ids:
+            return 0
+        sql = text("DELETE FROM memory_records WHERE id = ANY(:ids)")
+        async with (
+            track_query("memory_delete", table="memory_records"),
+            self._session_factory() as session,
+            session.begin(),
+        ):
+            result = await session.execute(sql, {"ids": list(record_ids)})
+        return int(result.rowcount or 0)  # type: ignore[attr-defined]
+
     async def search(
         self,
         query_embedding: list[float],
@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from agent33.observability.query_profiling import track_query
+from agent33.observability.sampling_profiler import profiled
 
 if TYPE_CHECKING:
     from agent33.memory.embeddings import EmbeddingProvider
@@ -46,6 +47,7 @@ class ProgressiveRecall:
         self._embeddings = embedding_provider
         self._top_k = top_k
 
+    @profiled("memory")
     async def search(
         self,
         query: str,
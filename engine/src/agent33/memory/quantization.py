@@ -177,6 +177,11 @@ class TurboQuantCompressor:
         """Quantization bit-width."""
         return self._bits
 
+    @property
+    def seed(self) -> int:
+        """Seed of the rotation matrix."""
+        return self._seed
+
     # ── Serialization helpers ────────────────────────────────────────
 
     @staticmethod
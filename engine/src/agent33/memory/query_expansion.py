@@ -2,6 +2,7 @@
 
 Generates synonyms, keywords, and alternative phrasings before search
 to improve both embedding similarity and BM25 keyword recall.
+:meth:`QueryExpander.expand_many` batches the LLM calls for bulk callers.
 """
 
 from __future__ import annotations
@@ -14,18 +15,17 @@ from typing import TYPE_CHECKING
 from pydantic import BaseModel, Field
 
 if TYPE_CHECKING:
+    from agent33.llm.batching import UtilityBatcher
     from agent33.llm.router import ModelRouter
 
 logger = logging.getLogger(__name__)
 
-_EXPANSION_PROMPT = """You are a search query expander. Given a user query, generate:
+_EXPANSION_INSTRUCTION = """You are a search query expander. Given a user query, generate:
 1. A list of 5-8 keywords and synonyms relevant to the query
 2. 2-3 alternative phrasings of the query
 
 Respond ONLY with valid JSON in this exact format:
-{{"keywords": ["kw1", "kw2", ...], "sub_queries": ["rephrased 1", "rephrased 2"]}}
-
-User query: {query}"""
+{"keywords": ["kw1", "kw2", ...], "sub_queries": ["rephrased 1", "rephrased 2"]}"""
 
 
 class ExpandedQuery(BaseModel):
@@ -47,10 +47,14 @@ class QueryExpander:
     _enabled: bool = True
     _max_tokens: int = 200
     _min_query_length: int = 10
+    _batcher: UtilityBatcher | None = None
+
+    def _should_expand(self, query: str) -> bool:
+        return self._enabled and len(query.strip()) >= self._min_query_length
 
     async def expand(self, query: str) -> ExpandedQuery:
         """Expand a query with keywords and alternative phrasings."""
-        if not self._enabled or len(query.strip()) < self._min_query_length:
+        if not self._should_expand(query):
             return ExpandedQuery(
                 original=query,
                 expanded_text=query,
@@ -60,7 +64,9 @@ class QueryExpander:
             from agent33.llm.base import ChatMessage
 
             messages = [
-                ChatMessage(role="user", content=_EXPANSION_PROMPT.format(query=query)),
+                ChatMessage(
+                    role="user", content=f"{_EXPANSION_INSTRUCTION}\n\nUser query: {query}"
+                ),
             ]
             response = await self._router.complete(
                 messages=messages,
@@ -68,22 +74,56 @@ class QueryExpander:
                 max_tokens=self._max_tokens,
                 temperature=0.3,
             )
-
-            data = json.loads(response.content)
-            keywords = data.get("keywords", [])
-            sub_queries = data.get("sub_queries", [])
-
-            # Build expanded text: original + sub_queries for richer embedding
-            expanded_parts = [query] + sub_queries
-            expanded_text = " ".join(expanded_parts)
-
-            return ExpandedQuery(
-                original=query,
-                expanded_text=expanded_text,
-                keywords=keywords,
-                sub_queries=sub_queries,
-                expansion_tokens_used=response.total_tokens,
-            )
+            return _parse_expansion(query, response.content, response.total_tokens)
         except Exception:
             logger.warning("Query expansion failed, using original query", exc_info=True)
             return ExpandedQuery(original=query, expanded_text=query)
+
+    async def expand_many(self, queries: list[str]) -> list[ExpandedQuery]:
+        """Expand many queries, batching the LLM calls.
+
+        Results are returned in input order.  A query whose expansion fails
+        or returns malformed JSON falls back to the original text on its own.
+        """
+        results = [ExpandedQuery(original=query, expanded_text=query) for query in queries]
+        indices = [i for i, query in enumerate(queries) if self._should_expand(query)]
+        if not indices:
+            return results
+        if self._batcher is None:
+            from agent33.llm.batching import UtilityBatcher
+
+            self._batcher = UtilityBatcher(self._router)
+        outputs = await self._batcher.run(
+            _EXPANSION_INSTRUCTION,
+            [f"User query: {queries[i]}" for i in indices],
+            model=self._model,
+            temperature=0.3,
+            max_tokens_per_item=self._max_tokens,
+        )
+        for index, output in zip(indices, outputs, strict=True):
+            if output.content is None:
+                logger.warning("Query expansion failed, using original query: %s", output.error)
+                continue
+            try:
+                results[index] = _parse_expansion(queries[index], output.content, output.tokens)
+            except Exception:
+                logger.warning("Query expansion failed, using original query", exc_info=True)
+        return results
+
+
+def _parse_expansion(query: str, content: str, tokens: int) -> ExpandedQuery:
+    data = json.loads(content)
+    keywords = data.get("keywords", [])
+    sub_queries = data.get("sub_queries", [])
+
+    # Build expanded text: original + sub_queries for richer embedding
+    expanded_parts = [query] + sub_queries
+    expanded_text = " ".join(expanded_parts)
+
+    return ExpandedQuery(
+        original=query,
+        expanded_text=expanded_text,
+        keywords=keywords,
+        sub_queries=sub_queries,
+        expansion_tokens_used=tokens,
+    )
@@ -9,23 +9,27 @@ from typing import TYPE_CHECKING, Any
 from agent33.security.redaction import redact_secrets
 
 if TYPE_CHECKING:
+    from agent33.llm.batching import UtilityBatcher
     from agent33.llm.router import ModelRouter
     from agent33.memory.long_term import LongTermMemory
     from agent33.memory.observation import Observation
 
 logger = logging.getLogger(__name__)
 
-_SUMMARIZE_PROMPT = """\
+_SUMMARIZE_INSTRUCTION = """\
 Summarize the following agent observations into a structured JSON object.
 Return ONLY valid JSON with these fields:
 - "summary": A 2-3 sentence summary of what happened
 - "key_facts": A list of important facts/decisions (max 10 items)
-- "tags": A list of relevant topic tags
+- "tags": A list of relevant topic tags"""
 
+_SUMMARIZE_INPUT = """\
 Observations:
 {observations}
 """
 
+_SUMMARIZE_PROMPT = _SUMMARIZE_INSTRUCTION + "\n\n" + _SUMMARIZE_INPUT
+
 
 class SessionSummarizer:
     """Compresses session observations into structured summaries via LLM."""
@@ -38,32 +42,67 @@ class SessionSummarizer:
         model: str = "llama3.2",
         *,
         redact_enabled: bool = True,
+        batcher: UtilityBatcher | None = None,
     ) -> None:
         self._router = router
         self._memory = long_term_memory
         self._embeddings = embedding_provider
         self._model = model
         self._redact_enabled = redact_enabled
+        self._batcher = batcher
 
-    async def summarize(self, observations: list[Observation]) -> dict[str, Any]:
-        """Compress a list of observations into a structured summary."""
-        from agent33.llm.base import ChatMessage
-
-        obs_text = "\n".join(
+    def _observations_text(self, observations: list[Observation]) -> str:
+        return "\n".join(
             f"[{o.event_type}] {o.agent_name}: "
             f"{redact_secrets(o.content[:500], enabled=self._redact_enabled)}"
             for o in observations
         )
-        prompt = _SUMMARIZE_PROMPT.format(observations=obs_text)
+
+    async def summarize(self, observations: list[Observation]) -> dict[str, Any]:
+        """Compress a list of observations into a structured summary."""
+        from agent33.llm.base import ChatMessage
+
+        prompt = _SUMMARIZE_PROMPT.format(observations=self._observations_text(observations))
 
         response = await self._router.complete(
             [ChatMessage(role="user", content=prompt)],
             model=self._model,
             temperature=0.3,
         )
-
+        return self._parse_summary(response.content)
+
+    async def summarize_many(self, sessions: list[list[Observation]]) -> list[dict[str, Any]]:
+        """Summarize many observation lists, batching the LLM calls.
+
+        Results are returned in input order.  A session whose summarization
+        call fails gets an empty summary with an ``"error"`` field; the other
+        sessions are unaffected.
+        """
+        if self._batcher is None:
+            from agent33.llm.batching import UtilityBatcher
+
+            self._batcher = UtilityBatcher(self._router)
+        outputs = await self._batcher.run(
+            _SUMMARIZE_INSTRUCTION,
+            [
+                _SUMMARIZE_INPUT.format(observations=self._observations_text(observations))
+                for observations in sessions
+            ],
+            model=self._model,
+            temperature=0.3,
+        )
+        results: list[dict[str, Any]] = []
+        for output in outputs:
+            if output.content is None:
+                logger.warning("batched session summarization failed: %s", output.error)
+                results.append({"summary": "", "key_facts": [], "tags": [], "error": output.error})
+            else:
+                results.append(self._parse_summary(output.content))
+        return results
+
+    def _parse_summary(self, content: str) -> dict[str, Any]:
         try:
-            raw = response.content.strip()
+            raw = content.strip()
             if raw.startswith("```"):
                 lines = raw.splitlines()
                 inner = []
@@ -80,7 +119,7 @@ class SessionSummarizer:
             result: dict[str, Any] = json.loads(raw)
         except (json.JSONDecodeError, ValueError):
             result = {
-                "summary": response.content[:500],
+                "summary": content[:500],
                 "key_facts": [],
                 "tags": [],
             }
@@ -3,7 +3,10 @@
 Provides two paths for generating concise session titles:
 
 1. **LLM-based**: Uses the ModelRouter to generate a 5-7 word title from
-   the first user message.  Preferred when a router is available.
+   the first user message.  Preferred when a router is available.  Bulk
+   callers (session backfills) go through a
+   :class:`~agent33.llm.batching.UtilityBatcher` instead of one request per
+   session.
 2. **Heuristic**: Extracts the first ~10 words from the first user message,
    cleans them, and truncates to a reasonable length.  Used as a fallback
    when the LLM is unavailable or the call fails.
@@ -16,6 +19,7 @@ import re
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from agent33.llm.batching import UtilityBatcher
     from agent33.llm.router import ModelRouter
 
 logger = logging.getLogger(__name__)
@@ -26,11 +30,12 @@ _MAX_TITLE_LENGTH = 80
 # Maximum number of words to keep in the heuristic path.
 _HEURISTIC_WORD_LIMIT = 10
 
-_TITLE_PROMPT = (
+_TITLE_INSTRUCTION = (
     "Generate a concise 5-7 word title for this conversation. "
-    "Return ONLY the title text, no quotes, no explanation.\n\n"
-    "First message: {first_message}"
+    "Return ONLY the title text, no quotes, no explanation."
 )
+_TITLE_INPUT = "First message: {first_message}"
+_TITLE_PROMPT = _TITLE_INSTRUCTION + "\n\n" + _TITLE_INPUT
 
 
 # ---------------------------------------------------------------------------
@@ -107,29 +112,23 @@ async def generate_title_llm(
         return ""
 
     from agent33.llm.base import ChatMessage
+    from agent33.llm.response_cache import response_cache_policy
 
-    prompt = _TITLE_PROMPT.format(first_message=first_message[:500])
+    subject = first_message[:500]
+    prompt = _TITLE_PROMPT.format(first_message=subject)
 
     try:
-        response = await router.complete(
-            [ChatMessage(role="user", content=prompt)],
-            model=model,
-            temperature=0.3,
-            max_tokens=30,
-        )
-
-        title = response.content.strip()
-
-        # Strip wrapping quotes if the LLM included them.
-        if (title.startswith('"') and title.endswith('"')) or (
-            title.startswith("'") and title.endswith("'")
-        ):
-            title = title[1:-1].strip()
-
-        # Truncate if the LLM returned something too long.
-        if len(title) > _MAX_TITLE_LENGTH:
-            title = title[:_MAX_TITLE_LENGTH].rstrip() + "..."
+        # Near-identical first messages may share a title; only the message
+        # itself is compared, not the instruction around it.
+        with response_cache_policy("semantic", subject=subject):
+            response = await router.complete(
+                [ChatMessage(role="user", content=prompt)],
+                model=model,
+                temperature=0.3,
+                max_tokens=30,
+            )
 
+        title = _clean_llm_title(response.content)
         if title:
             return title
 
@@ -140,6 +139,48 @@ async def generate_title_llm(
     return generate_title_heuristic(first_message)
 
 
+def _clean_llm_title(raw: str) -> str:
+    title = raw.strip()
+
+    # Strip wrapping quotes if the LLM included them.
+    if (title.startswith('"') and title.endswith('"')) or (
+        title.startswith("'") and title.endswith("'")
+    ):
+        title = title[1:-1].strip()
+
+    # Truncate if the LLM returned something too long.
+    if len(title) > _MAX_TITLE_LENGTH:
+        title = title[:_MAX_TITLE_LENGTH].rstrip() + "..."
+    return title
+
+
+async def generate_titles_llm(
+    first_messages: list[str],
+    batcher: UtilityBatcher,
+    *,
+    model: str = "llama3.2",
+) -> list[str]:
+    """Generate titles for many sessions through a :class:`UtilityBatcher`.
+
+    Results are returned in input order.  Each item that the LLM fails to
+    title falls back to the heuristic on its own, without affecting the rest
+    of the batch.
+    """
+    titles = [""] * len(first_messages)
+    indices = [i for i, message in enumerate(first_messages) if message and message.strip()]
+    results = await batcher.run(
+        _TITLE_INSTRUCTION,
+        [_TITLE_INPUT.format(first_message=first_messages[i][:500]) for i in indices],
+        model=model,
+        temperature=0.3,
+        max_tokens_per_item=30,
+    )
+    for index, result in zip(indices, results, strict=True):
+        title = _clean_llm_title(result.content) if result.content is not None else ""
+        titles[index] = title or generate_title_heuristic(first_messages[index])
+    return titles
+
+
 # ---------------------------------------------------------------------------
 # Unified title generator service
 # ---------------------------------------------------------------------------
@@ -155,15 +196,20 @@ class TitleGenerator:
         only the heuristic path is available.
     model:
         Model identifier for LLM-based generation.
+    batcher:
+        Optional batcher used by :meth:`generate_many`.  When ``None`` and a
+        router is configured, one is created with default settings.
     """
 
     def __init__(
         self,
         router: ModelRouter | None = None,
         model: str = "llama3.2",
+        batcher: UtilityBatcher | None = None,
     ) -> None:
         self._router = router
         self._model = model
+        self._batcher = batcher
 
     async def generate(self, first_message: str) -> str:
         """Generate a title for a session.
@@ -179,6 +225,16 @@ class TitleGenerator:
             )
         return generate_title_heuristic(first_message)
 
+    async def generate_many(self, first_messages: list[str]) -> list[str]:
+        """Generate titles for many sessions, batching the LLM calls."""
+        if self._router is None:
+            return [generate_title_heuristic(message) for message in first_messages]
+        if self._batcher is None:
+            from agent33.llm.batching import UtilityBatcher
+
+            self._batcher = UtilityBatcher(self._router)
+        return await generate_titles_llm(first_messages, self._batcher, model=self._model)
+
     @property
     def has_llm(self) -> bool:
         """Whether an LLM router is configured."""
@@ -20,6 +20,7 @@ from agent33.config import settings
 if TYPE_CHECKING:
     from nats.aio.client import Client as NATSClient
     from nats.aio.msg import Msg
+    from nats.js import JetStreamContext
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,7 @@ class NATSMessageBus:
             )
         self._url = url or settings.nats_url
         self._nc: NATSClient | None = None
+        self._js: JetStreamContext | None = None
         self._subscriptions: list[Any] = []
 
     @property
@@ -54,6 +56,7 @@ class NATSMessageBus:
         if self._nc is not None:
             await self._nc.drain()
             self._nc = None
+            self._js = None
             self._subscriptions.clear()
             logger.info("NATS connection closed")
 
@@ -95,3 +98,67 @@ class NATSMessageBus:
         reply: Msg = await self._nc.request(subject, payload, timeout=timeout)
         result: dict[str, Any] = json.loads(reply.data.decode())
         return result
+
+    # -- JetStream ---------------------------------------------------------
+
+    def _jetstream(self) -> JetStreamContext:
+        if self._nc is None:
+            raise RuntimeError("Not connected to NATS")
+        if self._js is None:
+            self._js = self._nc.jetstream()
+        return self._js
+
+    async def ensure_stream(
+        self,
+        name: str,
+        subjects: list[str],
+        *,
+        max_msgs_per_subject: int = -1,
+        max_age_seconds: float | None = None,
+    ) -> None:
+        """Create (or update) a file-backed JetStream stream over *subjects*."""
+        from nats.js.errors import BadRequestError
+
+        js = self._jetstream()
+        params: dict[str, Any] = {
+            "name": name,
+            "subjects": subjects,
+            "max_msgs_per_subject": max_msgs_per_subject,
+        }
+        if max_age_seconds:
+            params["max_age"] = max_age_seconds
+        try:
+            await js.add_stream(**params)
+        except BadRequestError:
+            # Already exists with a different config; bring it in line.
+            await js.update_stream(**params)
+
+    async def stream_publish(self, subject: str, data: dict[str, Any]) -> int:
+        """Persist a JSON-encoded message on a stream subject; return its sequence."""
+        ack = await self._jetstream().publish(subject, json.dumps(data).encode())
+        return int(ack.seq)
+
+    async def stream_messages(
+        self,
+        stream: str,
+        subject: str,
+        *,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the retained messages for *subject*, oldest first."""
+        from nats.js.errors import NotFoundError
+
+        js = self._jetstream()
+        messages: list[dict[str, Any]] = []
+        seq = 1
+        while limit is None or len(messages) < limit:
+            try:
+                raw = await js.get_msg(stream, seq, subject=subject, next=True)
+            except NotFoundError:
+                break
+            if raw.data is not None:
+                messages.append(json.loads(raw.data.decode()))
+            if raw.seq is None:
+                break
+            seq = raw.seq + 1
+        return messages
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import math
 import re
 import time
+from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
@@ -12,25 +14,279 @@ if TYPE_CHECKING:
     from agent33.llm.pricing import PricingCatalog
 
 
-@dataclass
-class _TimestampedValue:
-    """A single observation with a timestamp for rolling-window support."""
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Histogram bucket bounds applied to ``*_seconds`` observations by default."""
+
+_SUMMARY_QUANTILES: tuple[tuple[str, float], ...] = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch with bounded relative error (DDSketch).
+
+    Values are mapped to logarithmically sized bins, so any quantile is
+    reported within ``relative_accuracy`` of the true value while memory grows
+    with the *range* of the data rather than the number of observations.
+    When more than ``max_bins`` bins are in use the smallest-magnitude bins are
+    collapsed together, trading accuracy at the low end for a hard memory cap.
+    """
 
-    timestamp: float
-    value: float
+    __slots__ = ("_bins", "_gamma", "_log_gamma", "_max_bins", "_neg_bins", "_zero", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048) -> None:
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_bins = max(8, max_bins)
+        self._bins: dict[int, int] = {}
+        self._neg_bins: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+
+    def _index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value > 1e-12:
+            bins = self._bins
+            magnitude = value
+        elif value < -1e-12:
+            bins = self._neg_bins
+            magnitude = -value
+        else:
+            self._zero += 1
+            return
+        index = self._index(magnitude)
+        bins[index] = bins.get(index, 0) + 1
+        if len(bins) > self._max_bins:
+            self._collapse(bins)
+
+    def _collapse(self, bins: dict[int, int]) -> None:
+        ordered = sorted(bins)
+        excess = len(bins) - self._max_bins + 1
+        target = ordered[excess]
+        bins[target] += sum(bins.pop(index) for index in ordered[:excess])
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Fold *other* into this sketch (both must share the same accuracy)."""
+        self.count += other.count
+        self._zero += other._zero
+        for mine, theirs in ((self._bins, other._bins), (self._neg_bins, other._neg_bins)):
+            for index, count in theirs.items():
+                mine[index] = mine.get(index, 0) + count
+            if len(mine) > self._max_bins:
+                self._collapse(mine)
+
+    def _value(self, index: int) -> float:
+        return 2.0 * self._gamma**index / (self._gamma + 1.0)
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate *q*-quantile (``0.0``-``1.0``), or 0.0 if empty."""
+        if self.count == 0:
+            return 0.0
+        rank = max(0.0, min(1.0, q)) * (self.count - 1)
+        seen = 0
+        for index in sorted(self._neg_bins, reverse=True):
+            seen += self._neg_bins[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self._bins)) if self._bins else 0.0
+
+
+_WINDOW_SKETCH_SLOTS = 10
+_WINDOW_SKETCH_ACCURACY = 0.02
+_WINDOW_SKETCH_MAX_BINS = 256
+
+
+class _WindowSlot:
+    """Count/sum/min/max for one ring-buffer slot of the rolling window."""
+
+    __slots__ = ("count", "epoch", "maximum", "minimum", "total")
+
+    def __init__(self, epoch: int) -> None:
+        self.reset(epoch)
+
+    def reset(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
 
 
-@dataclass
 class _Observation:
-    values: list[_TimestampedValue] = field(default_factory=list)
+    """Constant-size aggregate for one metric/label set.
+
+    Lifetime statistics are running totals.  The rolling window is a ring
+    buffer of ``slots`` count/sum/min/max aggregates plus a coarser ring of
+    quantile sketches (at most ``_WINDOW_SKETCH_SLOTS``, since sketches are
+    the expensive part), so ``observe`` is O(1) and reads cost O(slots) no
+    matter how many values were recorded.  Window quantiles therefore cover
+    the window to within one sketch slot.
+    """
+
+    __slots__ = (
+        "bucket_bounds",
+        "bucket_counts",
+        "count",
+        "maximum",
+        "minimum",
+        "sketch",
+        "sketch_slots",
+        "sketch_width",
+        "slot_width",
+        "slots",
+        "total",
+    )
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float,
+        slots: int,
+        bucket_bounds: tuple[float, ...] = (),
+    ) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = QuantileSketch()
+        self.bucket_bounds = bucket_bounds
+        self.bucket_counts = [0] * len(bucket_bounds)
+        window = max(window_seconds, 1e-3)
+        self.slot_width = window / slots
+        self.slots: list[_WindowSlot | None] = [None] * slots
+        sketch_slots = min(slots, _WINDOW_SKETCH_SLOTS)
+        self.sketch_width = window / sketch_slots
+        self.sketch_slots: list[tuple[int, QuantileSketch] | None] = [None] * sketch_slots
+
+    def record(self, value: float, now: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.sketch.add(value)
+        if self.bucket_bounds:
+            index = bisect_left(self.bucket_bounds, value)
+            if index < len(self.bucket_counts):
+                self.bucket_counts[index] += 1
+
+        epoch = int(now // self.slot_width)
+        position = epoch % len(self.slots)
+        slot = self.slots[position]
+        if slot is None:
+            slot = self.slots[position] = _WindowSlot(epoch)
+        elif slot.epoch != epoch:
+            slot.reset(epoch)
+        slot.count += 1
+        slot.total += value
+        if value < slot.minimum:
+            slot.minimum = value
+        if value > slot.maximum:
+            slot.maximum = value
+
+        sketch_epoch = int(now // self.sketch_width)
+        position = sketch_epoch % len(self.sketch_slots)
+        entry = self.sketch_slots[position]
+        if entry is None or entry[0] != sketch_epoch:
+            entry = self.sketch_slots[position] = (
+                sketch_epoch,
+                QuantileSketch(_WINDOW_SKETCH_ACCURACY, _WINDOW_SKETCH_MAX_BINS),
+            )
+        entry[1].add(value)
+
+    def live_slots(self, now: float) -> list[_WindowSlot]:
+        """Return the slots that still fall inside the rolling window."""
+        current = int(now // self.slot_width)
+        oldest = current - len(self.slots)
+        return [
+            slot
+            for slot in self.slots
+            if slot is not None and oldest < slot.epoch <= current and slot.count
+        ]
+
+    def window_sketch(self, now: float) -> QuantileSketch:
+        merged = QuantileSketch(_WINDOW_SKETCH_ACCURACY, _WINDOW_SKETCH_MAX_BINS)
+        current = int(now // self.sketch_width)
+        oldest = current - len(self.sketch_slots)
+        for entry in self.sketch_slots:
+            if entry is not None and oldest < entry[0] <= current:
+                merged.merge(entry[1])
+        return merged
+
+    def window_stats(self, now: float) -> dict[str, float]:
+        live = self.live_slots(now)
+        count = sum(slot.count for slot in live)
+        if not count:
+            stats: dict[str, float] = {
+                "window_count": 0,
+                "window_sum": 0.0,
+                "window_avg": 0.0,
+                "window_min": 0.0,
+                "window_max": 0.0,
+            }
+            stats.update({f"window_{name}": 0.0 for name, _ in _SUMMARY_QUANTILES})
+            return stats
+        total = sum(slot.total for slot in live)
+        sketch = self.window_sketch(now)
+        stats = {
+            "window_count": count,
+            "window_sum": total,
+            "window_avg": total / count,
+            "window_min": min(slot.minimum for slot in live),
+            "window_max": max(slot.maximum for slot in live),
+        }
+        stats.update(
+            {f"window_{name}": sketch.quantile(fraction) for name, fraction in _SUMMARY_QUANTILES}
+        )
+        return stats
+
+    def lifetime_stats(self) -> dict[str, float]:
+        stats: dict[str, float] = {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+        stats.update({name: self.sketch.quantile(q) for name, q in _SUMMARY_QUANTILES})
+        return stats
 
 
 class MetricsCollector:
     """Tracks counters and observations for key metrics.
 
-    Observations are stored with timestamps to support rolling-window
-    statistics in addition to lifetime aggregates.  The window size is
-    configurable via ``window_seconds`` (default 300 = 5 minutes).
+    Each metric/label set keeps a fixed-size aggregate: lifetime running
+    totals, a quantile sketch, optional fixed-bucket histogram counts and a
+    ring buffer of ``window_slots`` per-interval aggregates that backs the
+    rolling-window statistics.  Memory is bounded per label set and both
+    :meth:`get_summary` and :meth:`render_prometheus` cost O(slots + buckets)
+    per series instead of O(observations).  The window size is configurable
+    via ``window_seconds`` (default 300 = 5 minutes); window boundaries are
+    resolved to ``window_seconds / window_slots``.
+
+    ``observe`` takes no lock: the collector is driven from the event loop,
+    and a rare lost update from a worker thread only skews an aggregate.
     """
 
     _PROMETHEUS_COUNTER_ALLOWLIST = frozenset(
@@ -38,6 +294,13 @@ class MetricsCollector:
             "effort_routing_decisions_total",
             "effort_routing_high_effort_total",
             "effort_routing_export_failures_total",
+            "llm_route_requests_total",
+            "llm_backend_requests_total",
+            "embedding_cache_lookups_total",
+            "llm_hedge_total",
+            "llm_response_cache_total",
+            "llm_utility_batch_items_total",
+            "llm_prompt_cache_requests_total",
             "http_requests_total",
             "webhook_delivery_total",
             "webhook_delivery_failures_total",
@@ -46,12 +309,19 @@ class MetricsCollector:
             "evaluation_gate_results_total",
             "connector_health_check_total",
             "connector_message_send_total",
+            "connector_requests_shed_total",
+            "workflow_distributed_steps_total",
+            "scheduler_job_fires_total",
         }
     )
     _PROMETHEUS_OBSERVATION_ALLOWLIST = frozenset(
         {
             "effort_routing_estimated_cost_usd",
             "effort_routing_estimated_token_budget",
+            "llm_route_duration_seconds",
+            "llm_backend_queue_depth",
+            "llm_prompt_cache_hit_ratio",
+            "workflow_event_fanout_latency_seconds",
             "db_query_duration_seconds",
             "http_request_duration_seconds",
             "health_check_result",
@@ -60,15 +330,35 @@ class MetricsCollector:
             "evaluation_score",
             "evaluation_duration_seconds",
             "connector_message_send_duration_seconds",
+            "web_search_provider_duration_seconds",
+            "knowledge_ingestion_duration_seconds",
+            "knowledge_ingestion_skip_ratio",
+            "knowledge_ingestion_chunks_per_second",
+            "connector_queue_wait_seconds",
+            "connector_concurrency_limit",
         }
     )
 
-    def __init__(self, *, window_seconds: int = 300) -> None:
+    def __init__(
+        self,
+        *,
+        window_seconds: int = 300,
+        window_slots: int = 60,
+        histogram_buckets: dict[str, tuple[float, ...]] | None = None,
+    ) -> None:
         self._counters: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._observations: dict[str, dict[str, _Observation]] = defaultdict(
-            lambda: defaultdict(_Observation)
-        )
+        self._observations: dict[str, dict[str, _Observation]] = defaultdict(dict)
         self.window_seconds = window_seconds
+        self.window_slots = max(1, window_slots)
+        self._histogram_buckets = {
+            name: tuple(sorted(bounds)) for name, bounds in (histogram_buckets or {}).items()
+        }
+
+    def _bucket_bounds(self, name: str) -> tuple[float, ...]:
+        bounds = self._histogram_buckets.get(name)
+        if bounds is not None:
+            return bounds
+        return DEFAULT_LATENCY_BUCKETS if name.endswith("_seconds") else ()
 
     @staticmethod
     def _label_key(labels: dict[str, str] | None) -> str:
@@ -93,14 +383,16 @@ class MetricsCollector:
         return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
 
     @classmethod
-    def _render_prometheus_labels(cls, label_key: str) -> str:
+    def _render_prometheus_labels(cls, label_key: str, le: str | None = None) -> str:
         labels = cls._parse_label_key(label_key)
-        if not labels:
+        if not labels and le is None:
             return ""
-        rendered = ",".join(
+        parts = [
             f'{key}="{cls._escape_label_value(value)}"' for key, value in sorted(labels.items())
-        )
-        return f"{{{rendered}}}"
+        ]
+        if le is not None:
+            parts.append(f'le="{le}"')
+        return "{" + ",".join(parts) + "}"
 
     @staticmethod
     def _sanitize_metric_name(name: str) -> str:
@@ -117,31 +409,26 @@ class MetricsCollector:
     def observe(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
         """Record an observed value (e.g. latency)."""
         key = self._label_key(labels)
-        self._observations[name][key].values.append(
-            _TimestampedValue(timestamp=time.time(), value=value)
-        )
-
-    def _prune_window(self, obs: _Observation) -> list[_TimestampedValue]:
-        """Return entries within the rolling window and prune expired ones.
-
-        Modifies the observation in-place by removing entries older than
-        ``self.window_seconds`` and returns the surviving entries.
-        """
-        cutoff = time.time() - self.window_seconds
-        # Partition: entries are appended chronologically, so we can bisect
-        # from the left to find the first entry that is within the window.
-        surviving: list[_TimestampedValue] = [tv for tv in obs.values if tv.timestamp >= cutoff]
-        obs.values[:] = surviving
-        return surviving
+        series = self._observations[name]
+        observation = series.get(key)
+        if observation is None:
+            observation = series[key] = _Observation(
+                window_seconds=self.window_seconds,
+                slots=self.window_slots,
+                bucket_bounds=self._bucket_bounds(name),
+            )
+        observation.record(value, time.time())
 
     def get_summary(self) -> dict[str, Any]:
         """Return a summary of all metrics.
 
         Each observation entry contains both lifetime statistics (``count``,
-        ``sum``, ``avg``, ``min``, ``max``) and rolling-window statistics
-        (``window_count``, ``window_sum``, ``window_avg``, ``window_min``,
-        ``window_max``).  The lifetime keys preserve backwards compatibility
-        with existing consumers such as ``AlertManager``.
+        ``sum``, ``avg``, ``min``, ``max``, ``p50``, ``p95``, ``p99``) and
+        rolling-window statistics (``window_count``, ``window_sum``,
+        ``window_avg``, ``window_min``, ``window_max``, ``window_p50``,
+        ``window_p95``, ``window_p99``).  The lifetime keys preserve backwards
+        compatibility with existing consumers such as ``AlertManager``.
+        Quantiles come from a sketch and are accurate to within ~1-2%.
         """
         summary: dict[str, Any] = {}
 
@@ -153,35 +440,15 @@ class MetricsCollector:
                 summary[name] = dict(label_map)
 
         # Observations
-        cutoff = time.time() - self.window_seconds
+        now = time.time()
         for name, obs_map in self._observations.items():
             for label_key, obs in obs_map.items():
+                if not obs.count:
+                    continue
                 display = f"{name}({label_key})" if label_key else name
-                all_vals = [tv.value for tv in obs.values]
-                if all_vals:
-                    entry: dict[str, Any] = {
-                        # Lifetime stats (backwards-compatible)
-                        "count": len(all_vals),
-                        "sum": sum(all_vals),
-                        "avg": sum(all_vals) / len(all_vals),
-                        "min": min(all_vals),
-                        "max": max(all_vals),
-                    }
-                    # Rolling-window stats
-                    window_vals = [tv.value for tv in obs.values if tv.timestamp >= cutoff]
-                    if window_vals:
-                        entry["window_count"] = len(window_vals)
-                        entry["window_sum"] = sum(window_vals)
-                        entry["window_avg"] = sum(window_vals) / len(window_vals)
-                        entry["window_min"] = min(window_vals)
-                        entry["window_max"] = max(window_vals)
-                    else:
-                        entry["window_count"] = 0
-                        entry["window_sum"] = 0.0
-                        entry["window_avg"] = 0.0
-                        entry["window_min"] = 0.0
-                        entry["window_max"] = 0.0
-                    summary[display] = entry
+                entry: dict[str, Any] = obs.lifetime_stats()
+                entry.update(obs.window_stats(now))
+                summary[display] = entry
 
         return summary
 
@@ -190,7 +457,9 @@ class MetricsCollector:
 
         Includes both lifetime and rolling-window observation gauges.
         Window gauges use a ``_window_`` infix to distinguish them from
-        lifetime gauges.
+        lifetime gauges.  Metrics with histogram buckets (``*_seconds`` by
+        default) additionally emit cumulative ``_bucket{le=...}`` series, and
+        their ``_count``/``_sum`` belong to that histogram family.
         """
         lines: list[str] = []
 
@@ -203,17 +472,26 @@ class MetricsCollector:
             for label_key, value in sorted(label_map.items()):
                 lines.append(f"{metric_name}{self._render_prometheus_labels(label_key)} {value}")
 
-        cutoff = time.time() - self.window_seconds
+        now = time.time()
         for name in sorted(self._PROMETHEUS_OBSERVATION_ALLOWLIST):
             obs_map = self._observations.get(name)
             if not obs_map:
                 continue
             metric_name = self._sanitize_metric_name(name)
-            # Lifetime TYPE declarations
+            histogram = bool(self._bucket_bounds(name))
+            # Lifetime TYPE declarations; bucketed metrics expose _count/_sum
+            # as part of a native histogram family instead of gauges.
+            if histogram:
+                lines.append(f"# TYPE {metric_name} histogram")
+            else:
+                lines.extend(
+                    [
+                        f"# TYPE {metric_name}_count gauge",
+                        f"# TYPE {metric_name}_sum gauge",
+                    ]
+                )
             lines.extend(
                 [
-                    f"# TYPE {metric_name}_count gauge",
-                    f"# TYPE {metric_name}_sum gauge",
                     f"# TYPE {metric_name}_avg gauge",
                     f"# TYPE {metric_name}_min gauge",
                     f"# TYPE {metric_name}_max gauge",
@@ -228,40 +506,49 @@ class MetricsCollector:
                     f"# TYPE {metric_name}_window_max gauge",
                 ]
             )
+            lines.extend(
+                f"# TYPE {metric_name}_window_{quantile} gauge"
+                for quantile, _ in _SUMMARY_QUANTILES
+            )
             for label_key, observation in sorted(obs_map.items()):
-                all_values = [tv.value for tv in observation.values]
-                if not all_values:
+                if not observation.count:
                     continue
                 prom_labels = self._render_prometheus_labels(label_key)
-                total = sum(all_values)
-                count = len(all_values)
-                minimum = min(all_values)
-                maximum = max(all_values)
-                average = total / count
+                lifetime = observation.lifetime_stats()
+                if histogram:
+                    cumulative = 0
+                    for bound, bucket_count in zip(
+                        observation.bucket_bounds, observation.bucket_counts, strict=True
+                    ):
+                        cumulative += bucket_count
+                        bucket_labels = self._render_prometheus_labels(label_key, le=f"{bound}")
+                        lines.append(f"{metric_name}_bucket{bucket_labels} {cumulative}")
+                    inf_labels = self._render_prometheus_labels(label_key, le="+Inf")
+                    lines.append(f"{metric_name}_bucket{inf_labels} {observation.count}")
                 # Lifetime gauges
                 lines.extend(
                     [
-                        f"{metric_name}_count{prom_labels} {count}",
-                        f"{metric_name}_sum{prom_labels} {total}",
-                        f"{metric_name}_avg{prom_labels} {average}",
-                        f"{metric_name}_min{prom_labels} {minimum}",
-                        f"{metric_name}_max{prom_labels} {maximum}",
+                        f"{metric_name}_count{prom_labels} {observation.count}",
+                        f"{metric_name}_sum{prom_labels} {observation.total}",
+                        f"{metric_name}_avg{prom_labels} {lifetime['avg']}",
+                        f"{metric_name}_min{prom_labels} {lifetime['min']}",
+                        f"{metric_name}_max{prom_labels} {lifetime['max']}",
                     ]
                 )
                 # Rolling-window gauges
-                window_values = [tv.value for tv in observation.values if tv.timestamp >= cutoff]
-                w_count = len(window_values)
-                w_avg = (sum(window_values) / w_count) if w_count else 0.0
-                w_min = min(window_values) if w_count else 0.0
-                w_max = max(window_values) if w_count else 0.0
+                window = observation.window_stats(now)
                 lines.extend(
                     [
-                        f"{metric_name}_window_count{prom_labels} {w_count}",
-                        f"{metric_name}_window_avg{prom_labels} {w_avg}",
-                        f"{metric_name}_window_min{prom_labels} {w_min}",
-                        f"{metric_name}_window_max{prom_labels} {w_max}",
+                        f"{metric_name}_window_count{prom_labels} {window['window_count']}",
+                        f"{metric_name}_window_avg{prom_labels} {window['window_avg']}",
+                        f"{metric_name}_window_min{prom_labels} {window['window_min']}",
+                        f"{metric_name}_window_max{prom_labels} {window['window_max']}",
                     ]
                 )
+                lines.extend(
+                    f"{metric_name}_window_{quantile}{prom_labels} {window[f'window_{quantile}']}"
+                    for quantile, _ in _SUMMARY_QUANTILES
+                )
 
         return "\n".join(lines) + ("\n" if lines else "# no metrics collected\n")
 
@@ -342,6 +629,11 @@ class CostTracker:
         self._pricing_catalog = pricing_catalog
         self._records: list[UsageRecord] = []
         self._max_records = max(1, max_records)
+        # Spend avoided by serving completions from the LLM response cache,
+        # aggregated per scope (bounded by the number of scopes, not calls).
+        self._cache_savings: dict[str, dict[str, float]] = defaultdict(
+            lambda: {"hits": 0, "tokens_in": 0, "tokens_out": 0, "cost": 0.0}
+        )
 
     def set_pricing(self, model: str, input_per_1k: float, output_per_1k: float) -> None:
         """Set or update pricing for a model (legacy path)."""
@@ -396,6 +688,40 @@ class CostTracker:
             del self._records[:overflow]
         return cost
 
+    def record_cache_savings(
+        self,
+        model: str,
+        tokens_in: int,
+        tokens_out: int,
+        scope: str = "global",
+        *,
+        provider: str = "",
+    ) -> float:
+        """Record a completion served from cache and return the cost it avoided.
+
+        Savings are tracked separately from usage so cost reports keep
+        reflecting actual spend.
+        """
+        saved = self._compute_cost(model, tokens_in, tokens_out, provider)
+        entry = self._cache_savings[scope]
+        entry["hits"] += 1
+        entry["tokens_in"] += tokens_in
+        entry["tokens_out"] += tokens_out
+        entry["cost"] += saved
+        return saved
+
+    def get_cache_savings(self, scope: str | None = None) -> dict[str, float]:
+        """Return cache hits, tokens and dollars saved, optionally for a scope prefix."""
+        totals = {"hits": 0, "tokens_in": 0, "tokens_out": 0, "cost": 0.0}
+        for entry_scope, entry in self._cache_savings.items():
+            if scope is not None and not (
+                entry_scope == scope or entry_scope.startswith(scope + ":")
+            ):
+                continue
+            for name, value in entry.items():
+                totals[name] += value
+        return totals
+
     def iter_records(
         self,
         scope: str | None = None,
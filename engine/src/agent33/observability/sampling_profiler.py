@@ -0,0 +1,695 @@
+"""Opt-in sampling profiler for hot paths, with event-loop lag detection.
+
+:mod:`perf_guardrails` measures wall time per registered operation and
+:mod:`query_profiling` wraps database calls, but neither shows *where* CPU
+goes inside the tool loop, the workflow executor or memory search.  This
+module adds a low-overhead, stack-aggregating sampler that can be switched on
+for a bounded time window from the admin API.
+
+How it works
+------------
+* While a :class:`ProfileSession` is running, the event-loop thread's stack is
+  sampled every ``interval_ms`` and counted by collapsed stack.  When the
+  loop runs on the main thread (uvicorn) a ``SIGPROF`` interval timer
+  (:func:`signal.setitimer`) drives the sampling: the handler sees the exact
+  interrupted frame and the timer only ticks while the process burns CPU.
+  Elsewhere (loop on a worker thread, platforms without ``setitimer``) a
+  daemon thread reads the frame via :func:`sys._current_frames` instead;
+  that mode is biased towards points where the loop releases the GIL.
+  Nothing is installed on the hot path itself, so the cost is one stack walk
+  per sample.
+* Samples are attributed to whatever asyncio task is running on the loop at
+  that instant.  :class:`ProfilingMiddleware`, :class:`AgentRuntime` and
+  :class:`WorkflowExecutor` tag their task with :func:`profile_scope`
+  (``route:<path>``, ``agent:<name>``, ``workflow:<name>``).  While a session
+  runs, a task factory copies the tag onto child tasks (``call_next`` tasks,
+  parallel tool calls), so the tag follows the work.  A session started with
+  ``targets`` only keeps samples whose tag matches one of the
+  ``kind:pattern`` globs, which is how profiling is enabled per route or agent.
+* Results are exported in Brendan Gregg's collapsed-stack format
+  (``frame;frame;frame count``), which ``flamegraph.pl``, speedscope and
+  most flame-graph viewers accept directly.
+
+The same thread doubles as an event-loop watchdog.  A heartbeat coroutine on
+the loop records how late each wake-up is (event-loop lag); when the
+heartbeat is overdue by more than ``slow_callback_ms`` the watchdog captures
+the loop thread's stack, so the callback that blocked the loop is reported
+together with how long it blocked.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import fnmatch
+import functools
+import logging
+import operator
+import signal
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from agent33.observability.http_metrics import normalize_path
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine, Iterator
+    from types import CodeType, FrameType
+
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_IDLE_FUNCTIONS = frozenset({"select", "poll", "epoll", "control", "_poll", "_run_once"})
+_UNTAGGED_LABEL = "loop"
+_TRUNCATED_STACK = "[truncated]"
+
+_scope_label: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "agent33_profile_scope", default=None
+)
+
+
+class ProfilingError(RuntimeError):
+    """Raised when a profiling session cannot be started or found."""
+
+
+@dataclass
+class ProfileSession:
+    """A bounded sampling window and its aggregated stacks.
+
+    Attributes
+    ----------
+    session_id:
+        Opaque identifier returned to the caller.
+    targets:
+        ``kind:pattern`` globs (e.g. ``"route:/v1/agents/*"``,
+        ``"agent:code-worker"``).  Empty means profile everything that runs
+        on the event loop.
+    interval_seconds:
+        Delay between samples.
+    duration_seconds:
+        Window length; the session stops itself once it elapses.
+    """
+
+    session_id: str
+    targets: list[str]
+    interval_seconds: float
+    duration_seconds: float
+    include_threads: bool = False
+    mode: str = "thread"
+    started_at: float = field(default_factory=time.time)
+    ended_at: float | None = None
+    state: str = "running"
+    total_samples: int = 0
+    matched_samples: int = 0
+    idle_samples: int = 0
+    dropped_stacks: int = 0
+    stacks: Counter[tuple[str, str]] = field(default_factory=Counter)
+
+    @property
+    def deadline(self) -> float:
+        return self.started_at + self.duration_seconds
+
+    def matches(self, label: str) -> bool:
+        if not self.targets:
+            return True
+        return any(fnmatch.fnmatchcase(label, target) for target in self.targets)
+
+    def collapsed(self, label: str | None = None) -> str:
+        """Return the session in collapsed-stack format, one stack per line."""
+        lines = []
+        for (stack_label, stack), count in self.stacks.most_common():
+            if label is not None and not fnmatch.fnmatchcase(stack_label, label):
+                continue
+            prefix = stack_label.replace(";", ":")
+            lines.append(f"{prefix};{stack} {count}" if stack else f"{prefix} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def summary(self, top: int = 20) -> dict[str, Any]:
+        by_label: Counter[str] = Counter()
+        by_leaf: Counter[str] = Counter()
+        for (stack_label, stack), count in self.stacks.items():
+            by_label[stack_label] += count
+            by_leaf[stack.rsplit(";", 1)[-1] if stack else stack_label] += count
+        return {
+            "session_id": self.session_id,
+            "state": self.state,
+            "mode": self.mode,
+            "targets": list(self.targets),
+            "interval_ms": round(self.interval_seconds * 1000.0, 3),
+            "duration_seconds": self.duration_seconds,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "total_samples": self.total_samples,
+            "matched_samples": self.matched_samples,
+            "idle_samples": self.idle_samples,
+            "distinct_stacks": len(self.stacks),
+            "dropped_stacks": self.dropped_stacks,
+            "labels": dict(by_label.most_common(top)),
+            "top_functions": dict(by_leaf.most_common(top)),
+        }
+
+
+@dataclass
+class SlowCallback:
+    """An event-loop stall caught by the watchdog."""
+
+    detected_at: float
+    blocked_ms: float
+    label: str
+    stack: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "detected_at": self.detected_at,
+            "blocked_ms": round(self.blocked_ms, 3),
+            "label": self.label,
+            "stack": self.stack,
+        }
+
+
+class SamplingProfiler:
+    """Sampling profiler and event-loop watchdog bound to one asyncio loop.
+
+    Parameters
+    ----------
+    max_duration_seconds:
+        Upper bound for a session window.
+    default_interval_ms:
+        Sampling interval used when a session does not specify one.
+    max_stacks:
+        Distinct stacks kept per session; further new stacks are counted as
+        ``[truncated]`` so memory stays bounded.
+    max_depth:
+        Frames kept per stack (innermost frames win).
+    slow_callback_ms:
+        Loop stalls longer than this are reported as slow callbacks.
+    lag_interval_ms:
+        Heartbeat period used to measure event-loop lag.
+    history:
+        Finished sessions and slow callbacks retained for inspection.
+    signal_mode:
+        Use the ``SIGPROF`` timer when the loop runs on the main thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_duration_seconds: float = 300.0,
+        default_interval_ms: float = 10.0,
+        max_stacks: int = 10_000,
+        max_depth: int = 64,
+        slow_callback_ms: float = 100.0,
+        lag_interval_ms: float = 100.0,
+        history: int = 20,
+        signal_mode: bool = True,
+    ) -> None:
+        self._max_duration = max(1.0, max_duration_seconds)
+        self._default_interval = max(0.001, default_interval_ms / 1000.0)
+        self._max_stacks = max(1, max_stacks)
+        self._max_depth = max(1, max_depth)
+        self._slow_threshold = max(0.001, slow_callback_ms / 1000.0)
+        self._lag_interval = max(0.001, lag_interval_ms / 1000.0)
+        self._signal_mode = signal_mode and hasattr(signal, "setitimer")
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+
+        self._active: ProfileSession | None = None
+        self._sessions: deque[ProfileSession] = deque(maxlen=max(1, history))
+        self._task_labels: weakref.WeakKeyDictionary[asyncio.Task[Any], list[str]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._code_names: dict[CodeType, str] = {}
+        self._previous_factory: Any = None
+        self._factory_installed = False
+        self._previous_handler: Any = None
+        self._timer_installed = False
+
+        self._heartbeat_at = 0.0
+        self._lags_ms: deque[float] = deque(maxlen=1024)
+        self._max_lag_ms = 0.0
+        self._pending_stall: tuple[float, str, str] | None = None
+        self._slow_callbacks: deque[SlowCallback] = deque(maxlen=max(1, history) * 5)
+        self._slow_callback_count = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    async def start(self) -> None:
+        """Bind to the running loop and start the heartbeat and watchdog."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat_at = time.perf_counter()
+        self._stopping.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="profiler-heartbeat")
+        self._thread = threading.Thread(
+            target=self._run, name="agent33-sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    async def aclose(self) -> None:
+        """Stop any running session, the heartbeat and the watchdog thread."""
+        with self._lock:
+            if self._active is not None:
+                self._finish(self._active, "stopped")
+        self._stopping.set()
+        self._wake.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._heartbeat_task
+            self._heartbeat_task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 2.0)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def start_session(
+        self,
+        *,
+        duration_seconds: float,
+        interval_ms: float | None = None,
+        targets: list[str] | None = None,
+        include_threads: bool = False,
+    ) -> ProfileSession:
+        """Start a sampling window; only one session may run at a time."""
+        if not self.running:
+            raise ProfilingError("Profiler is not running")
+        interval = self._default_interval if interval_ms is None else interval_ms / 1000.0
+        session = ProfileSession(
+            session_id=uuid.uuid4().hex[:12],
+            targets=[target.strip() for target in targets or [] if target.strip()],
+            interval_seconds=max(0.001, interval),
+            duration_seconds=min(max(0.1, duration_seconds), self._max_duration),
+            include_threads=include_threads,
+            mode="signal" if self._can_use_signals() else "thread",
+        )
+        with self._lock:
+            if self._active is not None:
+                raise ProfilingError(
+                    f"Profiling session {self._active.session_id} is already running"
+                )
+            self._active = session
+            self._sessions.append(session)
+        self._install_hooks(session)
+        self._wake.set()
+        logger.info(
+            "profiling_session_started id=%s mode=%s duration=%.1fs interval=%.1fms targets=%s",
+            session.session_id,
+            session.mode,
+            session.duration_seconds,
+            session.interval_seconds * 1000.0,
+            session.targets,
+        )
+        return session
+
+    def stop_session(self, session_id: str) -> ProfileSession:
+        with self._lock:
+            session = self._find(session_id)
+            if session.state == "running":
+                self._finish(session, "stopped")
+        return session
+
+    def get_session(self, session_id: str) -> ProfileSession:
+        with self._lock:
+            return self._find(session_id)
+
+    def list_sessions(self) -> list[ProfileSession]:
+        with self._lock:
+            return list(reversed(self._sessions))
+
+    @property
+    def active_session(self) -> ProfileSession | None:
+        return self._active
+
+    def _find(self, session_id: str) -> ProfileSession:
+        for session in self._sessions:
+            if session.session_id == session_id:
+                return session
+        raise ProfilingError(f"Profiling session {session_id} not found")
+
+    def _finish(self, session: ProfileSession, state: str) -> None:
+        session.state = state
+        session.ended_at = time.time()
+        if self._active is session:
+            self._active = None
+            if threading.get_ident() == self._loop_thread_id:
+                self._remove_hooks()
+            elif self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._remove_hooks)
+        logger.info(
+            "profiling_session_finished id=%s state=%s samples=%d",
+            session.session_id,
+            state,
+            session.matched_samples,
+        )
+
+    # ------------------------------------------------------------------
+    # Task tagging
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def scope(self, label: str) -> Iterator[None]:
+        """Attribute samples taken while the current task runs to *label*."""
+        task = asyncio.current_task() if self._active is not None else None
+        if task is None:
+            yield
+            return
+        token = _scope_label.set(label)
+        labels = self._task_labels.setdefault(task, [])
+        labels.append(label)
+        try:
+            yield
+        finally:
+            labels.pop()
+            if not labels:
+                self._task_labels.pop(task, None)
+            _scope_label.reset(token)
+
+    def _task_factory(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[Any, Any, Any],
+        context: contextvars.Context | None = None,
+    ) -> asyncio.Future[Any]:
+        previous = self._previous_factory
+        task: asyncio.Future[Any]
+        if previous is None:
+            task = asyncio.Task(coro, loop=loop, context=context)
+        elif context is None:
+            task = previous(loop, coro)
+        else:
+            task = previous(loop, coro, context=context)
+        label = context.get(_scope_label) if context is not None else _scope_label.get()
+        if label is not None and isinstance(task, asyncio.Task):
+            self._task_labels[task] = [label]
+        return task
+
+    def _can_use_signals(self) -> bool:
+        main = threading.main_thread()
+        return (
+            self._signal_mode
+            and threading.current_thread() is main
+            and self._loop_thread_id == main.ident
+        )
+
+    def _install_hooks(self, session: ProfileSession) -> None:
+        """Install the task factory (and SIGPROF timer); runs on the loop thread."""
+        loop = self._loop
+        if loop is not None and not self._factory_installed:
+            self._previous_factory = loop.get_task_factory()
+            loop.set_task_factory(self._task_factory)  # type: ignore[arg-type]
+            self._factory_installed = True
+        if session.mode == "signal" and not self._timer_installed:
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(
+                signal.ITIMER_PROF, session.interval_seconds, session.interval_seconds
+            )
+            self._timer_installed = True
+
+    def _remove_hooks(self) -> None:
+        if self._timer_installed:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._previous_handler = None
+            self._timer_installed = False
+        loop = self._loop
+        if loop is not None and self._factory_installed:
+            if loop.get_task_factory() == self._task_factory:
+                loop.set_task_factory(self._previous_factory)
+            self._previous_factory = None
+            self._factory_installed = False
+
+    def _on_signal(self, signum: int, frame: FrameType | None) -> None:
+        session = self._active
+        if session is None or frame is None or session.mode != "signal":
+            return
+        # Never block inside a signal handler: the interrupted code may hold the lock.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if session.state == "running":
+                self._sample(session, frame, self._current_label())
+        finally:
+            self._lock.release()
+
+    # ------------------------------------------------------------------
+    # Event-loop lag
+    # ------------------------------------------------------------------
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.perf_counter() + self._lag_interval
+            await asyncio.sleep(self._lag_interval)
+            now = time.perf_counter()
+            self._heartbeat_at = now
+            lag = max(0.0, now - expected)
+            lag_ms = lag * 1000.0
+            self._lags_ms.append(lag_ms)
+            self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+            if lag < self._slow_threshold:
+                self._pending_stall = None
+                continue
+            pending, self._pending_stall = self._pending_stall, None
+            detected_at, label, stack = pending or (time.time(), _UNTAGGED_LABEL, "")
+            self._slow_callback_count += 1
+            self._slow_callbacks.append(SlowCallback(detected_at, lag_ms, label, stack))
+            logger.warning(
+                "event_loop_blocked blocked_ms=%.1f label=%s stack=%s",
+                lag_ms,
+                label,
+                stack.rsplit(";", 3)[-3:] if stack else "unknown",
+            )
+
+    def loop_stats(self, recent: int = 10) -> dict[str, Any]:
+        ordered = sorted(self._lags_ms)
+
+        def _pct(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(fraction * (len(ordered) - 1)))], 3)
+
+        return {
+            "running": self.running,
+            "heartbeat_interval_ms": round(self._lag_interval * 1000.0, 3),
+            "slow_callback_threshold_ms": round(self._slow_threshold * 1000.0, 3),
+            "lag_p50_ms": _pct(0.50),
+            "lag_p95_ms": _pct(0.95),
+            "lag_p99_ms": _pct(0.99),
+            "lag_max_ms": round(self._max_lag_ms, 3),
+            "slow_callbacks_total": self._slow_callback_count,
+            "slow_callbacks": [item.to_dict() for item in list(self._slow_callbacks)[-recent:]]
+            if recent > 0
+            else [],
+        }
+
+    # ------------------------------------------------------------------
+    # Sampler thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        watchdog_interval = min(self._lag_interval, self._slow_threshold) / 2.0
+        while not self._stopping.is_set():
+            session = self._active
+            interval = (
+                min(session.interval_seconds, watchdog_interval)
+                if session is not None and (session.mode == "thread" or session.include_threads)
+                else watchdog_interval
+            )
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._stopping.is_set():
+                return
+            try:
+                self._tick()
+            except Exception:  # pragma: no cover - never let the sampler die
+                logger.debug("profiler_tick_failed", exc_info=True)
+
+    def _tick(self) -> None:
+        frames = sys._current_frames()
+        loop_frame = frames.get(self._loop_thread_id) if self._loop_thread_id else None
+
+        overdue = time.perf_counter() - self._heartbeat_at
+        if (
+            loop_frame is not None
+            and self._pending_stall is None
+            and overdue > self._lag_interval + self._slow_threshold
+        ):
+            label = self._current_label() or _UNTAGGED_LABEL
+            self._pending_stall = (time.time(), label, self._collapse(loop_frame))
+
+        session = self._active
+        if session is None:
+            return
+        if time.time() >= session.deadline:
+            with self._lock:
+                if session.state == "running":
+                    self._finish(session, "completed")
+            return
+
+        with self._lock:
+            if session.state != "running":
+                return
+            if loop_frame is not None and session.mode == "thread":
+                self._sample(session, loop_frame, self._current_label())
+            if session.include_threads:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                own = threading.get_ident()
+                for thread_id, frame in frames.items():
+                    if thread_id in (self._loop_thread_id, own):
+                        continue
+                    self._sample(session, frame, f"thread:{names.get(thread_id, thread_id)}")
+
+    def _sample(self, session: ProfileSession, frame: FrameType, label: str | None) -> None:
+        session.total_samples += 1
+        if label is None:
+            if frame.f_code.co_name in _IDLE_FUNCTIONS:
+                session.idle_samples += 1
+                return
+            if session.targets:
+                return
+            label = _UNTAGGED_LABEL
+        elif not session.matches(label):
+            return
+        session.matched_samples += 1
+        stack = self._collapse(frame)
+        key = (label, stack)
+        if key not in session.stacks and len(session.stacks) >= self._max_stacks:
+            session.dropped_stacks += 1
+            key = (label, _TRUNCATED_STACK)
+        session.stacks[key] += 1
+
+    def _current_label(self) -> str | None:
+        current_tasks: dict[Any, Any] = getattr(asyncio.tasks, "_current_tasks", {})
+        task = current_tasks.get(self._loop)
+        if task is None:
+            return None
+        try:
+            labels = self._task_labels.get(task)
+        except TypeError:
+            return None
+        return labels[-1] if labels else f"task:{task.get_name()}"
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        names: list[str] = []
+        while frame is not None and len(names) < self._max_depth:
+            names.append(self._frame_name(frame.f_code))
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def _frame_name(self, code: CodeType) -> str:
+        name = self._code_names.get(code)
+        if name is None:
+            filename = code.co_filename.replace("\\", "/")
+            marker = filename.rfind("/agent33/")
+            if marker >= 0:
+                module = filename[marker + 1 :].removesuffix(".py").replace("/", ".")
+            else:
+                module = filename.rsplit("/", 1)[-1].removesuffix(".py")
+            name = f"{module}:{code.co_qualname}"
+            if len(self._code_names) < 50_000:
+                self._code_names[code] = name
+        return name
+
+
+# ---------------------------------------------------------------------------
+# Module-level wiring (mirrors ``query_profiling.configure_query_profiling``)
+# ---------------------------------------------------------------------------
+
+_profiler: SamplingProfiler | None = None
+
+
+def configure_sampling_profiler(profiler: SamplingProfiler | None) -> None:
+    """Install (or clear) the process-wide profiler used by :func:`profile_scope`."""
+    global _profiler
+    _profiler = profiler
+
+
+def get_sampling_profiler() -> SamplingProfiler | None:
+    return _profiler
+
+
+@contextlib.contextmanager
+def profile_scope(kind: str, name: str) -> Iterator[None]:
+    """Tag the current task as ``kind:name`` for the running profiling session.
+
+    A no-op unless a session is running, so it is safe to leave on hot paths.
+    """
+    profiler = _profiler
+    if profiler is None or profiler.active_session is None:
+        yield
+        return
+    with profiler.scope(f"{kind}:{name}"):
+        yield
+
+
+def profiled(
+    kind: str, name_attr: str | None = None
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Decorate an async method so its samples are tagged ``kind:<name>``.
+
+    *name_attr* is a dotted attribute path resolved on ``self`` (for example
+    ``"_definition.name"``); without it the method's qualified name is used.
+    """
+    get_name = operator.attrgetter(name_attr) if name_attr else None
+
+    def decorate(fn: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        default_name = fn.__qualname__
+
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            profiler = _profiler
+            if profiler is None or profiler.active_session is None:
+                return await fn(*args, **kwargs)
+            name = get_name(args[0]) if get_name is not None and args else default_name
+            with profiler.scope(f"{kind}:{name}"):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class ProfilingMiddleware:
+    """ASGI middleware tagging each HTTP request as ``route:<normalized path>``.
+
+    Pure ASGI (no extra task per request) and a pass-through unless a
+    profiling session is running.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler = _profiler
+        if scope["type"] != "http" or profiler is None or profiler.active_session is None:
+            await self.app(scope, receive, send)
+            return
+        with profiler.scope(f"route:{normalize_path(scope['path'])}"):
+            await self.app(scope, receive, send)
@@ -40,6 +40,9 @@ class TraceCollector:
         self._traces: dict[str, TraceRecord] = {}
         self._failures: dict[str, FailureRecord] = {}
         self._load_state()
+        if state_store is not None:
+            # Pick up traces and failures recorded on other replicas.
+            state_store.add_listener("traces", self._load_state)
 
     def _persist_state(self) -> None:
         if self._state_store is None:
@@ -62,6 +65,8 @@ class TraceCollector:
         if self._state_store is None:
             return
         payload = self._state_store.read_namespace("traces")
+        traces: dict[str, TraceRecord] = {}
+        failures: dict[str, FailureRecord] = {}
 
         traces_payload = payload.get("traces", {})
         if isinstance(traces_payload, dict):
@@ -69,7 +74,7 @@ class TraceCollector:
                 if not isinstance(trace_id, str):
                     continue
                 try:
-                    self._traces[trace_id] = TraceRecord.model_validate(trace_data)
+                    traces[trace_id] = TraceRecord.model_validate(trace_data)
                 except ValidationError:
                     logger.warning("trace_restore_failed id=%s", trace_id)
 
@@ -79,9 +84,11 @@ class TraceCollector:
                 if not isinstance(failure_id, str):
                     continue
                 try:
-                    self._failures[failure_id] = FailureRecord.model_validate(failure_data)
+                    failures[failure_id] = FailureRecord.model_validate(failure_data)
                 except ValidationError:
                     logger.warning("trace_failure_restore_failed id=%s", failure_id)
+        # Swap whole dicts: reloads run on the state backend's notification thread.
+        self._traces, self._failures = traces, failures
 
     # ------------------------------------------------------------------
     # Trace CRUD
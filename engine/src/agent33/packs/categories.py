@@ -38,6 +38,10 @@ class CategoryRegistry:
         self._load()
         if not self._categories and default_categories_str.strip():
             self._seed_defaults(default_categories_str)
+        add_listener = getattr(state_store, "add_listener", None)
+        if add_listener is not None:
+            # Pick up categories changed on other replicas.
+            add_listener(namespace, self._load)
 
     def _seed_defaults(self, raw: str) -> None:
         """Create default categories from a comma-separated slug string."""
@@ -111,14 +115,16 @@ class CategoryRegistry:
         raw_cats = payload.get("categories", [])
         if not isinstance(raw_cats, list):
             return
+        categories: dict[str, MarketplaceCategory] = {}
         for item in raw_cats:
             if not isinstance(item, dict):
                 continue
             try:
                 cat = MarketplaceCategory.model_validate(item)
-                self._categories[cat.slug] = cat
+                categories[cat.slug] = cat
             except Exception:
                 continue
+        self._categories = categories
 
     def _persist(self) -> None:
         if self._state_store is None:
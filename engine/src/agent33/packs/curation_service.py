@@ -46,6 +46,10 @@ class CurationService:
         self._namespace = namespace
         self._records: dict[str, CurationRecord] = {}
         self._load()
+        add_listener = getattr(state_store, "add_listener", None)
+        if add_listener is not None:
+            # Pick up curation decisions made on other replicas.
+            add_listener(namespace, self._load)
 
     # -- Submission ---------------------------------------------------------
 
@@ -287,13 +291,15 @@ class CurationService:
         raw_records = payload.get("records", {})
         if not isinstance(raw_records, dict):
             return
+        records: dict[str, CurationRecord] = {}
         for name, entry in raw_records.items():
             if not isinstance(name, str) or not isinstance(entry, dict):
                 continue
             try:
-                self._records[name] = CurationRecord.model_validate(entry)
+                records[name] = CurationRecord.model_validate(entry)
             except Exception:
                 continue
+        self._records = records
 
     def _persist(self) -> None:
         if self._state_store is None:
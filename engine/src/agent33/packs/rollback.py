@@ -36,6 +36,10 @@ class PackRollbackManager:
         self._namespace = namespace
         self._history: dict[str, list[ArchivedPackRevision]] = {}
         self._load()
+        add_listener = getattr(state_store, "add_listener", None)
+        if add_listener is not None:
+            # Pick up packs archived on other replicas.
+            add_listener(namespace, self._load)
 
     def archive_current(self, pack_name: str) -> ArchivedPackRevision:
         pack = self._pack_registry.get(pack_name)
@@ -92,7 +96,7 @@ class PackRollbackManager:
         raw_history = payload.get("history", {})
         if not isinstance(raw_history, dict):
             return
-        self._history = {}
+        history: dict[str, list[ArchivedPackRevision]] = {}
         for pack_name, entries in raw_history.items():
             if not isinstance(pack_name, str) or not isinstance(entries, list):
                 continue
@@ -104,7 +108,8 @@ class PackRollbackManager:
                     parsed.append(ArchivedPackRevision.model_validate(entry))
                 except Exception:
                     continue
-            self._history[pack_name] = parsed
+            history[pack_name] = parsed
+        self._history = history
 
     def _persist(self) -> None:
         if self._state_store is None:
@@ -20,6 +20,10 @@ class TrustPolicyManager:
         self._namespace = namespace
         self._policy = PackTrustPolicy()
         self._load()
+        add_listener = getattr(state_store, "add_listener", None)
+        if add_listener is not None:
+            # Apply policy changes made on other replicas.
+            add_listener(namespace, self._load)
 
     def get_policy(self) -> PackTrustPolicy:
         return self._policy.model_copy(deep=True)
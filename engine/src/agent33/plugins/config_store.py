@@ -23,6 +23,10 @@ class PluginConfigStore:
         self._namespace = namespace
         self._configs: dict[str, TenantPluginConfig] = {}
         self._load()
+        add_listener = getattr(state_store, "add_listener", None)
+        if add_listener is not None:
+            # Pick up plugin configuration changed on other replicas.
+            add_listener(namespace, self._load)
 
     def get(self, plugin_name: str, *, tenant_id: str = "") -> TenantPluginConfig | None:
         """Return stored config for one plugin/tenant pair."""
@@ -91,14 +95,15 @@ class PluginConfigStore:
         raw_configs = payload.get("configs", {})
         if not isinstance(raw_configs, dict):
             return
-        self._configs = {}
+        configs: dict[str, TenantPluginConfig] = {}
         for key, value in raw_configs.items():
             if not isinstance(key, str) or not isinstance(value, dict):
                 continue
             try:
-                self._configs[key] = TenantPluginConfig.model_validate(value)
+                configs[key] = TenantPluginConfig.model_validate(value)
             except Exception:
                 continue
+        self._configs = configs
 
     def _persist(self) -> None:
         if self._state_store is None:
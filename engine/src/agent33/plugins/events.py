@@ -36,6 +36,10 @@ class PluginEventStore:
         self._max_events = max(1, max_events)
         self._events: list[PluginLifecycleEvent] = []
         self._load()
+        add_listener = getattr(state_store, "add_listener", None)
+        if add_listener is not None:
+            # Pick up lifecycle events recorded on other replicas.
+            add_listener(namespace, self._load)
 
     def record(
         self,
@@ -76,14 +80,15 @@ class PluginEventStore:
         raw_events = payload.get("events", [])
         if not isinstance(raw_events, list):
             return
-        self._events = []
+        events: list[PluginLifecycleEvent] = []
         for raw in raw_events:
             if not isinstance(raw, dict):
                 continue
             try:
-                self._events.append(PluginLifecycleEvent.model_validate(raw))
+                events.append(PluginLifecycleEvent.model_validate(raw))
             except Exception:
                 continue
+        self._events = events
 
     def _persist(self) -> None:
         if self._state_store is None:
@@ -79,6 +79,10 @@ class PluginInstaller:
         self._auto_enable = auto_enable
         self._records: dict[str, PluginInstallRecord] = {}
         self._load()
+        add_listener = getattr(state_store, "add_listener", None)
+        if add_listener is not None:
+            # Pick up plugins installed or removed on other replicas.
+            add_listener(namespace, self._load)
 
     async def install_from_local(
         self,
@@ -266,14 +270,15 @@ class PluginInstaller:
         raw_records = payload.get("records", {})
         if not isinstance(raw_records, dict):
             return
-        self._records = {}
+        records: dict[str, PluginInstallRecord] = {}
         for key, value in raw_records.items():
             if not isinstance(key, str) or not isinstance(value, dict):
                 continue
             try:
-                self._records[key] = PluginInstallRecord.model_validate(value)
+                records[key] = PluginInstallRecord.model_validate(value)
             except Exception:
                 continue
+        self._records = records
 
     def _persist(self) -> None:
         if self._state_store is None:
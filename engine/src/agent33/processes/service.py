@@ -91,6 +91,9 @@ class ProcessManagerService:
         self._log_locks: dict[str, asyncio.Lock] = {}
         self._load_state()
         self._recover_interrupted()
+        if state_store is not None:
+            # Pick up processes recorded on other replicas.
+            state_store.add_listener(self._NAMESPACE, self._reload_state)
 
     async def start(
         self,
@@ -448,7 +451,7 @@ class ProcessManagerService:
             },
         )
 
-    def _load_state(self) -> None:
+    def _load_state(self, *, persist_sanitized: bool = True) -> None:
         if self._state_store is None:
             return
         payload = self._state_store.read_namespace(self._NAMESPACE)
@@ -467,9 +470,14 @@ class ProcessManagerService:
                 changed = True
             loaded[record.process_id] = sanitized
         self._records = loaded
-        if changed:
+        if changed and persist_sanitized:
             self._persist_state()
 
+    def _reload_state(self) -> None:
+        # Runs on the state backend's notification thread; the writer that
+        # changed the namespace already persisted sanitized records.
+        self._load_state(persist_sanitized=False)
+
     def _recover_interrupted(self) -> None:
         changed = False
         for record in self._records.values():
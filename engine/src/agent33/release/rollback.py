@@ -66,15 +66,17 @@ class RollbackManager:
         """Restore internal state from a previously captured snapshot."""
         from pydantic import ValidationError
 
+        records: dict[str, RollbackRecord] = {}
         records_payload = data.get("records", {})
         if isinstance(records_payload, dict):
             for rollback_id, record_data in records_payload.items():
                 if not isinstance(rollback_id, str):
                     continue
                 try:
-                    self._records[rollback_id] = RollbackRecord.model_validate(record_data)
+                    records[rollback_id] = RollbackRecord.model_validate(record_data)
                 except ValidationError:
                     logger.warning("rollback_restore_failed id=%s", rollback_id)
+        self._records = records
 
     def recommend(self, severity: str, impact: str) -> tuple[RollbackType, str]:
         """Get recommended rollback type and approval level.
@@ -80,6 +80,9 @@ class ReleaseService:
         self._sync = SyncEngine(on_change=self._persist_state)
         self._rollback = RollbackManager(on_change=self._persist_state)
         self._load_state()
+        if state_store is not None:
+            # Pick up releases, sync rules and rollbacks changed on other replicas.
+            state_store.add_listener("release", self._load_state)
 
     def _persist_state(self) -> None:
         if self._state_store is None:
@@ -102,15 +105,18 @@ class ReleaseService:
             return
         payload = self._state_store.read_namespace("release")
 
+        releases: dict[str, Release] = {}
         releases_payload = payload.get("releases", {})
         if isinstance(releases_payload, dict):
             for release_id, release_data in releases_payload.items():
                 if not isinstance(release_id, str):
                     continue
                 try:
-                    self._releases[release_id] = Release.model_validate(release_data)
+                    releases[release_id] = Release.model_validate(release_data)
                 except ValidationError:
                     logger.warning("release_restore_failed id=%s", release_id)
+        # Swap the whole dict: reloads run on the state backend's notification thread.
+        self._releases = releases
 
         self._sync.restore_state(
             {
@@ -80,25 +80,28 @@ class SyncEngine:
         """Restore internal state from a previously captured snapshot."""
         from pydantic import ValidationError
 
+        rules: dict[str, SyncRule] = {}
         rules_payload = data.get("rules", {})
         if isinstance(rules_payload, dict):
             for rule_id, rule_data in rules_payload.items():
                 if not isinstance(rule_id, str):
                     continue
                 try:
-                    self._rules[rule_id] = SyncRule.model_validate(rule_data)
+                    rules[rule_id] = SyncRule.model_validate(rule_data)
                 except ValidationError:
                     logger.warning("sync_rule_restore_failed id=%s", rule_id)
 
+        executions: dict[str, SyncExecution] = {}
         executions_payload = data.get("executions", {})
         if isinstance(executions_payload, dict):
             for exec_id, exec_data in executions_payload.items():
                 if not isinstance(exec_id, str):
                     continue
                 try:
-                    self._executions[exec_id] = SyncExecution.model_validate(exec_data)
+                    executions[exec_id] = SyncExecution.model_validate(exec_data)
                 except ValidationError:
                     logger.warning("sync_execution_restore_failed id=%s", exec_id)
+        self._rules, self._executions = rules, executions
 
     # ------------------------------------------------------------------
     # File matching
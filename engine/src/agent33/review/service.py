@@ -59,6 +59,9 @@ class ReviewService:
         self._risk_assessor = RiskAssessor()
         self._assigner = ReviewerAssigner()
         self._load_state()
+        if state_store is not None:
+            # Pick up reviews changed on other replicas.
+            state_store.add_listener("reviews", self._load_state)
 
     def _persist_state(self) -> None:
         if self._state_store is None:
@@ -80,6 +83,7 @@ class ReviewService:
         records_payload = payload.get("records", {})
         if not isinstance(records_payload, dict):
             return
+        reviews: dict[str, ReviewRecord] = {}
         for review_id, review_data in records_payload.items():
             if not isinstance(review_id, str):
                 continue
@@ -88,7 +92,9 @@ class ReviewService:
             except ValidationError:
                 logger.warning("review_restore_failed id=%s", review_id)
                 continue
-            self._reviews[review_id] = record
+            reviews[review_id] = record
+        # Swap the whole dict: reloads run on the state backend's notification thread.
+        self._reviews = reviews
 
     # ------------------------------------------------------------------
     # CRUD
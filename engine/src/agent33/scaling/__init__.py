@@ -10,6 +10,7 @@ These primitives prepare the runtime for safe horizontal scaling in P1.3+.
 
 from agent33.scaling.distributed_lock import DistributedLock, InProcessLock, RedisDistributedLock
 from agent33.scaling.instance_registry import InstanceInfo, InstanceRegistry
+from agent33.scaling.leader_election import LeaderElection
 from agent33.scaling.state_guards import (
     InstanceConflictError,
     SchedulerOwnershipGuard,
@@ -22,6 +23,7 @@ __all__ = [
     "InstanceConflictError",
     "InstanceInfo",
     "InstanceRegistry",
+    "LeaderElection",
     "RedisDistributedLock",
     "SchedulerOwnershipGuard",
     "SingleInstanceGuard",
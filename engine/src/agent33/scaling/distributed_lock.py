@@ -5,6 +5,12 @@ in-process fallback using asyncio.Lock for single-node deployments.
 
 Both implementations share the same ``DistributedLock`` protocol so callers
 do not need to know which backend is active.
+
+Every successful acquisition is stamped with a *fencing token*: a number that
+strictly increases with each acquisition of the same lock name.  Work done on
+behalf of a lock holder can carry the token, and the receiving side rejects it
+when :meth:`current_fencing_token` has moved on (the holder lost the lock,
+e.g. after a long pause, and someone else acquired it since).
 """
 
 from __future__ import annotations
@@ -21,6 +27,8 @@ logger = logging.getLogger(__name__)
 _DEFAULT_LOCK_TTL_SECONDS = 30
 # Redis key prefix for distributed locks
 _REDIS_LOCK_PREFIX = "agent33:lock:"
+# Redis key prefix for the per-lock fencing counters
+_REDIS_FENCE_PREFIX = "agent33:fence:"
 
 
 class DistributedLock(Protocol):
@@ -52,11 +60,24 @@ class DistributedLock(Protocol):
         """
         ...
 
+    async def extend(self, additional_seconds: int | None = None) -> bool:
+        """Renew the lock lease. Returns False if the lock is no longer held."""
+        ...
+
+    async def current_fencing_token(self) -> int | None:
+        """The fencing token of the most recent acquisition by any holder."""
+        ...
+
     @property
     def is_held(self) -> bool:
         """Whether this lock instance currently holds the lock."""
         ...
 
+    @property
+    def fencing_token(self) -> int | None:
+        """Fencing token of this instance's current acquisition, if held."""
+        ...
+
     @property
     def lock_name(self) -> str:
         """The name/key of the lock."""
@@ -70,6 +91,7 @@ class RedisDistributedLock:
     - SETNX to atomically set a key only if it does not exist
     - SET with EX to apply a TTL so dead holders auto-release
     - Value is a unique token so only the holder can release
+    - INCR on a companion counter key issues the fencing token
 
     Parameters
     ----------
@@ -92,16 +114,26 @@ class RedisDistributedLock:
         self._name = name
         self._ttl = ttl_seconds
         self._token: str | None = None
+        self._fencing_token: int | None = None
         self._key = f"{_REDIS_LOCK_PREFIX}{name}"
+        self._fence_key = f"{_REDIS_FENCE_PREFIX}{name}"
 
     @property
     def lock_name(self) -> str:
         return self._name
 
+    @property
+    def ttl_seconds(self) -> int:
+        return self._ttl
+
     @property
     def is_held(self) -> bool:
         return self._token is not None
 
+    @property
+    def fencing_token(self) -> int | None:
+        return self._fencing_token
+
     async def acquire(self, timeout_seconds: float = 0) -> bool:
         """Attempt to acquire the lock via Redis SETNX.
 
@@ -116,6 +148,9 @@ class RedisDistributedLock:
             try:
                 acquired = await self._redis.set(self._key, token, nx=True, ex=self._ttl)
                 if acquired:
+                    # Nobody else can acquire until our key expires, so the
+                    # counter is bumped exactly once per acquisition.
+                    self._fencing_token = int(await self._redis.incr(self._fence_key))
                     self._token = token
                     logger.debug("lock_acquired name=%s token=%s", self._name, token[:8])
                     return True
@@ -157,10 +192,12 @@ class RedisDistributedLock:
                     self._name,
                 )
             self._token = None
+            self._fencing_token = None
             return released
         except Exception:
             logger.warning("lock_release_redis_error name=%s", self._name, exc_info=True)
             self._token = None
+            self._fencing_token = None
             return False
 
     async def extend(self, additional_seconds: int | None = None) -> bool:
@@ -193,6 +230,24 @@ class RedisDistributedLock:
             logger.warning("lock_extend_redis_error name=%s", self._name, exc_info=True)
             return False
 
+    def forget(self) -> None:
+        """Drop local ownership state after the lease was lost.
+
+        Unlike :meth:`release` this does not touch Redis: the key may already
+        belong to another holder.
+        """
+        self._token = None
+        self._fencing_token = None
+
+    async def current_fencing_token(self) -> int | None:
+        """Read the latest fencing token issued for this lock name."""
+        try:
+            raw = await self._redis.get(self._fence_key)
+        except Exception:
+            logger.warning("lock_fence_redis_error name=%s", self._name, exc_info=True)
+            return None
+        return int(raw) if raw is not None else None
+
 
 class InProcessLock:
     """In-process lock fallback using asyncio.Lock.
@@ -206,6 +261,7 @@ class InProcessLock:
         self._name = name
         self._lock = asyncio.Lock()
         self._held = False
+        self._fence = 0
 
     @property
     def lock_name(self) -> str:
@@ -215,6 +271,10 @@ class InProcessLock:
     def is_held(self) -> bool:
         return self._held
 
+    @property
+    def fencing_token(self) -> int | None:
+        return self._fence if self._held else None
+
     async def acquire(self, timeout_seconds: float = 0) -> bool:
         """Acquire the in-process lock.
 
@@ -227,6 +287,7 @@ class InProcessLock:
                 try:
                     await asyncio.wait_for(self._lock.acquire(), timeout=0.01)
                     self._held = True
+                    self._fence += 1
                     return True
                 except (TimeoutError, Exception):
                     return False
@@ -235,6 +296,7 @@ class InProcessLock:
         try:
             await asyncio.wait_for(self._lock.acquire(), timeout=timeout_seconds)
             self._held = True
+            self._fence += 1
             return True
         except TimeoutError:
             return False
@@ -252,6 +314,19 @@ class InProcessLock:
             self._held = False
             return False
 
+    async def extend(self, additional_seconds: int | None = None) -> bool:
+        """In-process locks never expire; extending succeeds while held."""
+        return self._held
+
+    def forget(self) -> None:
+        """Release local ownership (an in-process lease cannot be lost)."""
+        if self._held:
+            self._lock.release()
+            self._held = False
+
+    async def current_fencing_token(self) -> int | None:
+        return self._fence or None
+
 
 def create_lock(
     name: str,
@@ -0,0 +1,202 @@
+"""Lease-based leader election on top of the distributed lock.
+
+One replica holds the lock and is the *leader*; it renews the lease every
+``renew_interval`` (a third of the lease by default).  Every other replica is
+a *standby* that retries the acquisition at the same interval, so when the
+leader dies its lease runs out and a standby takes over within one lease
+interval plus one retry.  A leader that shuts down cleanly releases the lock
+and hands over within a single retry interval.
+
+Each term of leadership carries the lock's fencing token.  Work issued by the
+leader is stamped with it, and :meth:`LeaderElection.is_current` lets the
+executing side reject work from a leader that has since been replaced.
+
+Listeners (``on_elected`` / ``on_demoted``) are how scheduler surfaces follow
+leadership: they resume their triggers when elected and pause them when the
+lease is lost or the process stops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from agent33.scaling.distributed_lock import create_lock
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from agent33.scaling.distributed_lock import InProcessLock, RedisDistributedLock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class _Listener:
+    on_elected: Callable[[], Any] | None
+    on_demoted: Callable[[], Any] | None
+
+
+class LeaderElection:
+    """Keeps one replica in charge of a named surface.
+
+    Parameters
+    ----------
+    lock:
+        The lock that represents leadership.  Its TTL is the lease length.
+    lease_seconds:
+        Lease length, used to derive the renew/retry interval.
+    renew_interval_seconds:
+        Override for the renew/retry interval (defaults to a third of the
+        lease so two renewals can fail before the lease lapses).
+    instance_id:
+        Identity of this replica, for logs.
+    """
+
+    def __init__(
+        self,
+        lock: RedisDistributedLock | InProcessLock,
+        *,
+        lease_seconds: float,
+        renew_interval_seconds: float | None = None,
+        instance_id: str = "",
+    ) -> None:
+        self._lock = lock
+        self._interval = renew_interval_seconds or max(0.01, lease_seconds / 3)
+        self._instance_id = instance_id or "unknown"
+        self._listeners: list[_Listener] = []
+        self._leader = False
+        self._term_token: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.terms = 0
+
+    @property
+    def name(self) -> str:
+        return self._lock.lock_name
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader
+
+    @property
+    def fencing_token(self) -> int | None:
+        """Fencing token of the current term, ``None`` on a standby."""
+        return self._term_token if self._leader else None
+
+    def add_listener(
+        self,
+        *,
+        on_elected: Callable[[], Any] | None = None,
+        on_demoted: Callable[[], Any] | None = None,
+    ) -> None:
+        """Register callbacks (sync or async) for leadership changes.
+
+        Register before :meth:`start` so the first election reaches every
+        surface.
+        """
+        self._listeners.append(_Listener(on_elected, on_demoted))
+
+    # -- lifecycle ------------------------------------------------------------
+
+    async def start(self) -> bool:
+        """Campaign once, then keep renewing or retrying in the background.
+
+        Returns whether this replica is the leader after the first attempt.
+        """
+        if self._task is None:
+            await self._campaign()
+            self._task = asyncio.create_task(self._run(), name=f"leader-election-{self.name}")
+        return self._leader
+
+    async def stop(self) -> None:
+        """Stop campaigning; a leader demotes itself and releases the lock."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._leader:
+            await self._demote("shutdown")
+            await self._lock.release()
+
+    async def is_current(self, token: int | None) -> bool:
+        """Whether *token* belongs to the latest term of this election.
+
+        ``None`` (work issued without leadership) is never current.  When the
+        latest token cannot be read the work is let through rather than lost.
+        """
+        if token is None:
+            return False
+        current = await self._lock.current_fencing_token()
+        return current is None or token >= current
+
+    # -- internal -------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                if self._leader:
+                    if not await self._lock.extend():
+                        self._lock.forget()
+                        await self._demote("lease_lost")
+                else:
+                    await self._campaign()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("leader_election_tick_failed name=%s", self.name, exc_info=True)
+
+    async def _campaign(self) -> None:
+        if not await self._lock.acquire(timeout_seconds=0):
+            return
+        self._leader = True
+        self._term_token = self._lock.fencing_token
+        self.terms += 1
+        logger.info(
+            "leader_elected name=%s instance=%s fencing_token=%s",
+            self.name,
+            self._instance_id,
+            self._term_token,
+        )
+        for listener in list(self._listeners):
+            if listener.on_elected is not None:
+                await self._call(listener.on_elected, "elected")
+
+    async def _demote(self, reason: str) -> None:
+        self._leader = False
+        logger.warning(
+            "leader_demoted name=%s instance=%s reason=%s",
+            self.name,
+            self._instance_id,
+            reason,
+        )
+        for listener in reversed(self._listeners):
+            if listener.on_demoted is not None:
+                await self._call(listener.on_demoted, "demoted")
+
+    async def _call(self, callback: Callable[[], Any], event: str) -> None:
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.warning(
+                "leader_listener_failed name=%s event=%s", self.name, event, exc_info=True
+            )
+
+
+def create_leader_election(
+    name: str,
+    redis: Any | None = None,
+    *,
+    lease_seconds: int = 15,
+    instance_id: str = "",
+) -> LeaderElection:
+    """Factory: leader election over a Redis lock, or in-process without Redis."""
+    lock = create_lock(name=name, redis=redis, ttl_seconds=lease_seconds)
+    return LeaderElection(lock, lease_seconds=lease_seconds, instance_id=instance_id)
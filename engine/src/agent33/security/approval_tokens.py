@@ -68,6 +68,9 @@ class ApprovalTokenManager:
         # Emergency revocation set (jti -> revoked_at)
         self._revoked: dict[str, float] = {}
         self._load_state()
+        if state_store is not None:
+            # Pick up tokens consumed or revoked on other replicas.
+            state_store.add_listener("approval_tokens", self._reload_state)
 
     # ------------------------------------------------------------------
     # Issuance
@@ -260,6 +263,10 @@ class ApprovalTokenManager:
                 if isinstance(jti, str) and isinstance(timestamp, (int, float))
             }
 
+    def _reload_state(self) -> None:
+        with self._lock:
+            self._load_state()
+
     def _consume_locked(self, jti: str) -> None:
         self._consumed[jti] = self._clock()
         self._persist_state()
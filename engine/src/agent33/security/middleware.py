@@ -9,6 +9,7 @@ from jwt import InvalidTokenError
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import JSONResponse, Response
 
+from agent33.llm.response_cache import bind_response_cache_tenant, reset_response_cache_tenant
 from agent33.security.auth import validate_api_key, verify_token
 
 if TYPE_CHECKING:
@@ -41,9 +42,20 @@ class AuthMiddleware(BaseHTTPMiddleware):
     * ``X-API-Key: <key>``
 
     On success the decoded :class:`~agent33.security.auth.TokenPayload` is
-    attached to ``request.state.user``.
+    attached to ``request.state.user`` and its tenant is bound for the LLM
+    response cache.
     """
 
+    @staticmethod
+    async def _call_as_tenant(
+        request: Request, call_next: RequestResponseEndpoint, tenant_id: str
+    ) -> Response:
+        token = bind_response_cache_tenant(tenant_id)
+        try:
+            return await call_next(request)
+        finally:
+            reset_response_cache_tenant(token)
+
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         path = request.url.path
 
@@ -75,7 +87,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
                     content={"detail": "Invalid or expired token"},
                 )
             request.state.user = payload
-            return await call_next(request)
+            return await self._call_as_tenant(request, call_next, payload.tenant_id)
 
         # Try API key
         api_key = request.headers.get("X-API-Key")
@@ -83,7 +95,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
             api_payload = validate_api_key(api_key)
             if api_payload is not None:
                 request.state.user = api_payload
-                return await call_next(request)
+                return await self._call_as_tenant(request, call_next, api_payload.tenant_id)
             return JSONResponse(status_code=401, content={"detail": "Invalid API key"})
 
         return JSONResponse(
@@ -3,6 +3,10 @@
 Phase 52: Detects and masks secrets, API keys, tokens, private keys,
 database URIs, and other sensitive values in arbitrary text.  Compiled
 patterns are reused across calls for performance.
+
+:class:`StreamingRedactor` applies the same catalogue incrementally to LLM
+token streams: it holds back only the tail of the stream that could still
+grow into (or complete) a secret, and emits everything before it redacted.
 """
 
 from __future__ import annotations
@@ -154,3 +158,174 @@ def redact_secrets(text: str, *, enabled: bool = True) -> str:
             result = pattern.sub(lambda m: _mask_token(m.group(1)), result)
 
     return result
+
+
+# ---------------------------------------------------------------------------
+# Incremental (streaming) redaction
+# ---------------------------------------------------------------------------
+# Every token-style pattern above matches a run of non-whitespace characters
+# bounded by ``\b``, so the only part of a token stream that can still turn
+# into (or extend) one of those secrets is the trailing unterminated word.
+# The remaining patterns span whitespace between a key and its value; for
+# those we look for an *open* key context at the end of the buffer and hold
+# back from where it starts.
+
+_OPEN_CONTEXT_PATTERNS: Final[tuple[re.Pattern[str], ...]] = (
+    # API_KEY = <value...
+    re.compile(r"(?i)(?:API_KEY|SECRET|TOKEN|PASSWORD|CREDENTIAL)\s*(?:=\s*\S*)?\Z"),
+    # "token" : "<value...
+    re.compile(
+        r'(?i)"(?:apiKey|api_key|secret|token|password|credential)"'
+        r'\s*(?::\s*(?:"[^"]*)?)?\Z'
+    ),
+    # --token <value... / --token "<value...
+    re.compile(
+        r"(?i)(?:--?|/)(?:api[-_]?key|secret|token|password|credential)"
+        r"(?:(?:\s+|=)(?:\"[^\"]*|'[^']*|\S*))?\Z"
+    ),
+    # Authorization: Bearer <token...
+    re.compile(r"(?i)Authorization:\s*(?:[A-Za-z]*|(?:Bearer|Basic|Token)\s+\S*)\Z"),
+    # postgres://user:<password...
+    re.compile(
+        r"(?i)(?:postgres|postgresql|mysql|mongodb|redis)(?:\+\w+)?://[^:\s]*(?::[^@\s]*)?\Z"
+    ),
+    # DefaultEndpointsProtocol=...;AccountKey=<value...
+    re.compile(r"DefaultEndpointsProtocol=https?;AccountName=[^;]*(?:;AccountKey=[^;]*)?\Z"),
+)
+
+_PRIVATE_KEY_OPEN: Final[re.Pattern[str]] = re.compile(
+    r"-----BEGIN (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----"
+)
+_PRIVATE_KEY_CLOSE: Final[re.Pattern[str]] = re.compile(
+    r"-----END (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----"
+)
+_PRIVATE_KEY_HEADERS: Final[tuple[str, ...]] = tuple(
+    f"-----BEGIN {kind}PRIVATE KEY-----" for kind in ("", "RSA ", "EC ", "DSA ", "OPENSSH ")
+)
+# Longest END marker minus one: enough tail to spot a marker split across chunks.
+_PRIVATE_KEY_CLOSE_TAIL: Final[int] = len("-----END OPENSSH PRIVATE KEY-----") - 1
+
+_TRAILING_WORD: Final[re.Pattern[str]] = re.compile(r"\S+\Z")
+
+
+def _partial_literal_start(text: str, literal: str) -> int | None:
+    """Return where a proper prefix of *literal* starts at the end of *text*."""
+    for size in range(min(len(text), len(literal) - 1), 0, -1):
+        if text.endswith(literal[:size]):
+            return len(text) - size
+    return None
+
+
+def _holdback_start(text: str) -> int:
+    """Return the earliest index of *text* that is not yet safe to emit."""
+    start = len(text)
+
+    word = _TRAILING_WORD.search(text)
+    if word is not None:
+        start = word.start()
+
+    for pattern in _OPEN_CONTEXT_PATTERNS:
+        match = pattern.search(text)
+        if match is not None and match.start() < start:
+            start = match.start()
+
+    # An unterminated PEM block must be held in full until its END marker.
+    opens = list(_PRIVATE_KEY_OPEN.finditer(text))
+    if opens and not _PRIVATE_KEY_CLOSE.search(text, opens[-1].end()):
+        start = min(start, opens[-1].start())
+
+    # A PEM header may itself be split across chunks ("-----BEGIN RSA PRIV").
+    for header in _PRIVATE_KEY_HEADERS:
+        partial = _partial_literal_start(text, header)
+        if partial is not None:
+            start = min(start, partial)
+
+    # Never cut through a complete match (e.g. a quoted CLI value that just
+    # closed): redacting its halves separately would leak the first half.
+    moved = True
+    while moved and start > 0:
+        moved = False
+        for _name, pattern in _PATTERNS:
+            for match in pattern.finditer(text):
+                if match.start() < start < match.end():
+                    start = match.start()
+                    moved = True
+
+    return start
+
+
+class StreamingRedactor:
+    """Incrementally redact secrets from a stream of text chunks.
+
+    Feed chunks with :meth:`feed`; each call returns the redacted text that
+    is safe to emit immediately.  Only the minimal suffix that could still be
+    part of a secret (the trailing unterminated word, an open key/value
+    context such as ``Authorization: Bearer``, or an unterminated PEM block)
+    is held back.  Call :meth:`flush` once the stream ends to emit the rest.
+
+    The concatenation of everything returned equals
+    ``redact_secrets(<whole stream>)`` for all patterns whose matches do not
+    contain whitespace inside the value, which covers every pattern in the
+    catalogue except the rare multi-word database password case.
+
+    *max_holdback* bounds memory and latency: when the held suffix grows
+    beyond it, the suffix is redacted as-is and emitted.  An unterminated PEM
+    block is the exception: it is masked from ``-----BEGIN`` onward and the
+    rest of the stream is swallowed until its END marker arrives.
+    """
+
+    def __init__(self, *, enabled: bool = True, max_holdback: int = 8192) -> None:
+        self._enabled = enabled
+        self._max_holdback = max(1, max_holdback)
+        self._pending = ""
+        self._in_private_key = False
+
+    @property
+    def pending(self) -> str:
+        """Raw text currently held back (not yet emitted)."""
+        return self._pending
+
+    def feed(self, chunk: str) -> str:
+        """Add *chunk* to the stream and return the redacted text now safe to emit."""
+        if not self._enabled:
+            return chunk
+        if not chunk:
+            return ""
+
+        text = self._pending + chunk
+        if self._in_private_key:
+            close = _PRIVATE_KEY_CLOSE.search(text)
+            if close is None:
+                self._pending = text[-_PRIVATE_KEY_CLOSE_TAIL:]
+                return ""
+            self._in_private_key = False
+            text = text[close.end() :]
+
+        cut = _holdback_start(text)
+        if len(text) - cut > self._max_holdback:
+            return self._force_emit(text)
+        self._pending = text[cut:]
+        return redact_secrets(text[:cut]) if cut else ""
+
+    def flush(self) -> str:
+        """Emit whatever is still held back, redacted."""
+        text, self._pending = self._pending, ""
+        if not self._enabled:
+            return text
+        if self._in_private_key:
+            # The key body never terminated; it was already masked.
+            self._in_private_key = False
+            return ""
+        return redact_secrets(text)
+
+    def _force_emit(self, text: str) -> str:
+        """Emit *text* once the holdback overflows, masking an unterminated PEM block."""
+        opens = list(_PRIVATE_KEY_OPEN.finditer(text))
+        if not opens or _PRIVATE_KEY_CLOSE.search(text, opens[-1].end()):
+            self._pending = ""
+            return redact_secrets(text)
+
+        key_open = opens[-1]
+        self._in_private_key = True
+        self._pending = text[key_open.end() :][-_PRIVATE_KEY_CLOSE_TAIL:]
+        return redact_secrets(text[: key_open.start()]) + "[PRIVATE_KEY_REDACTED]"
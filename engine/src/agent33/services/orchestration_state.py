@@ -1,11 +1,73 @@
-"""Shared durable state store for orchestration services."""
+"""Shared durable state store for orchestration services.
+
+Services persist their state as one JSON-compatible payload per *namespace*
+(``"autonomy"``, ``"approval_tokens"``, ...).  By default the payloads live in
+a local JSON file that is loaded once per process.
+
+With a :class:`StateBackend` (see
+:mod:`agent33.services.pg_orchestration_state`) the store is shared between
+replicas instead:
+
+* every top-level key of a namespace payload is a separate *record* with a
+  version number, and :meth:`OrchestrationStateStore.write_namespace` only
+  writes the records the service changed since it last read or wrote the
+  namespace;
+* changed records are merged onto the records' current values and written
+  together in one compare-and-set commit on those values' versions
+  (retrying on conflict), so other replicas never observe a half-written
+  namespace: for
+  mapping records (``{"budgets": {budget_id: ...}}``) only the entries this
+  replica added, changed or removed are applied, and list records
+  (``{"records": [...]}``) likewise keep items appended elsewhere, so a
+  writer holding a stale copy never erases entries another replica added;
+  scalar values are last-writer-wins;
+* reads are served from a local cache that is refreshed on the backend's
+  notification thread when another replica changes the namespace.  Services
+  keep their own in-memory copy, so every namespace writer must register a
+  reload listener (:meth:`OrchestrationStateStore.add_listener`); writing a
+  namespace without one raises.
+
+A store created on a running event loop keeps backend round trips off that
+loop: commits run on a single writer thread (reads overlay the changes still
+queued there) and reload listeners are called on the loop, so they never race
+the services' own mutations.  A queued commit that finally fails is counted
+as ``orchestration_state_write_failures_total`` and the namespace is reloaded
+as after a remote change, so its services resync to the committed state.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from threading import RLock
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, Protocol, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from agent33.observability.metrics import MetricsCollector
+
+logger = logging.getLogger(__name__)
+
+# Module-level metrics collector (wired during app lifespan)
+_metrics: MetricsCollector | None = None
+
+_MAX_CAS_ATTEMPTS = 8
+
+# (key, base_value, ours, delete): one record change computed by write_namespace.
+_Change = tuple[str, Any, Any, bool]
+
+
+def set_metrics(collector: MetricsCollector) -> None:
+    """Install the global metrics collector (called during app lifespan init)."""
+    global _metrics
+    _metrics = collector
 
 
 def _deep_copy(value: dict[str, Any]) -> dict[str, Any]:
@@ -13,29 +75,415 @@ def _deep_copy(value: dict[str, Any]) -> dict[str, Any]:
     return cast("dict[str, Any]", json.loads(json.dumps(value)))
 
 
+@dataclass(frozen=True, slots=True)
+class StateRecord:
+    """One versioned record of a namespace.
+
+    ``version`` starts at 1 and grows with every write; deleted records keep
+    their version (as a tombstone) so a stale writer cannot recreate them.
+    """
+
+    version: int
+    value: Any = None
+    deleted: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class RecordWrite:
+    """One record change inside an atomic :meth:`StateBackend.compare_and_set`.
+
+    ``expected_version`` is 0 for a record that was never written.
+    """
+
+    key: str
+    value: Any
+    expected_version: int
+    delete: bool = False
+
+
+class StateBackend(Protocol):
+    """Versioned record storage shared between replicas."""
+
+    def load_namespace(self, namespace: str) -> dict[str, StateRecord]:
+        """Return all records of *namespace*, tombstones included."""
+        ...
+
+    def get_record(self, namespace: str, key: str) -> StateRecord | None:
+        """Return one record (or its tombstone), ``None`` if never written."""
+        ...
+
+    def compare_and_set(
+        self, namespace: str, writes: Sequence[RecordWrite]
+    ) -> dict[str, int] | None:
+        """Apply *writes* in one commit if every record is still at its expected version.
+
+        Other replicas are notified once, after the whole commit.  Returns
+        the new version of each written key, or ``None`` (writing nothing)
+        when another writer changed any of the records first.
+        """
+        ...
+
+    def subscribe(self, callback: Callable[[str | None], None]) -> None:
+        """Call *callback(namespace)* when another replica changes a namespace.
+
+        ``None`` means changes may have been missed and every namespace
+        should be treated as changed.
+        """
+        ...
+
+    def close(self) -> None: ...
+
+
+def merge_record(base: Any, ours: Any, theirs: Any) -> Any:
+    """Three-way merge of a record this replica changed from *base* to *ours*.
+
+    Mapping records merge entry by entry onto *theirs*; list records keep
+    *theirs* minus the items this replica removed, plus the items it added.
+    Anything else is replaced by *ours*.
+    """
+    if isinstance(ours, list) and isinstance(theirs, list):
+        return _merge_list(base if isinstance(base, list) else [], ours, theirs)
+    if not (isinstance(ours, dict) and isinstance(theirs, dict)):
+        return ours
+    base_map = base if isinstance(base, dict) else {}
+    merged = dict(theirs)
+    for entry in base_map.keys() - ours.keys():
+        merged.pop(entry, None)
+    for entry, value in ours.items():
+        if entry not in base_map or base_map[entry] != value:
+            merged[entry] = value
+    return merged
+
+
+def _merge_list(base: list[Any], ours: list[Any], theirs: list[Any]) -> list[Any]:
+    def identity(item: Any) -> str:
+        return json.dumps(item, sort_keys=True, default=str)
+
+    base_items = {identity(item) for item in base}
+    removed = base_items - {identity(item) for item in ours}
+    merged = [item for item in theirs if identity(item) not in removed]
+    skip = base_items | {identity(item) for item in merged}
+    merged.extend(item for item in ours if identity(item) not in skip)
+    return merged
+
+
+def _newer_records(
+    cached: dict[str, StateRecord], loaded: dict[str, StateRecord]
+) -> dict[str, StateRecord]:
+    """Return *loaded*, keeping cached records at a higher version (later commits)."""
+    merged = dict(loaded)
+    for key, record in cached.items():
+        known = merged.get(key)
+        if known is None or known.version < record.version:
+            merged[key] = record
+    return merged
+
+
+def _plan_write(
+    key: str,
+    current: StateRecord | None,
+    base_value: Any,
+    ours: Any,
+    delete: bool,
+) -> RecordWrite | None:
+    """Return the write applying our change of *key* (from *base_value*) to *current*.
+
+    ``None`` means the current value already reflects the change.
+    """
+    their_value = None if current is None or current.deleted else current.value
+    remove = delete
+    target: Any = None
+    if delete:
+        if current is None or current.deleted:
+            return None
+        if their_value != base_value:
+            if not (isinstance(base_value, dict) and isinstance(their_value, dict)):
+                # Changed elsewhere since we read it: that change wins.
+                return None
+            target = merge_record(base_value, {}, their_value)
+            remove = False
+    else:
+        target = merge_record(base_value, ours, their_value)
+    if not remove and current is not None and not current.deleted and target == their_value:
+        return None
+    expected = 0 if current is None else current.version
+    return RecordWrite(key, target, expected, remove)
+
+
 class OrchestrationStateStore:
-    """JSON file-backed key/value store for service namespace snapshots."""
+    """Key/value store for service namespace snapshots.
+
+    Backed by a JSON file at *path*, or by a shared *backend* when given.
+    With a backend, *loop* (default: the running loop, if any) is where reload
+    listeners are called; commits then run on a writer thread instead of the
+    calling thread.
+    """
 
-    def __init__(self, path: str, *, on_corruption: str = "reset") -> None:
+    def __init__(
+        self,
+        path: str = "",
+        *,
+        on_corruption: str = "reset",
+        backend: StateBackend | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        if backend is None and not path:
+            raise ValueError("OrchestrationStateStore needs a file path or a backend")
         self._path = Path(path)
         self._on_corruption = on_corruption.strip().lower()
         self._lock = RLock()
-        self._state: dict[str, dict[str, Any]] = self._load()
+        self._backend = backend
+        self._records: dict[str, dict[str, StateRecord]] = {}
+        # namespace -> payload the writing service last read or wrote; changes
+        # are computed against it, never against the refreshed cache.
+        self._views: dict[str, dict[str, Any]] = {}
+        self._listeners: dict[str, list[Callable[[], None]]] = defaultdict(list)
+        # namespace -> changes handed to the writer thread and not yet committed.
+        self._pending: dict[str, list[_Change]] = {}
+        self._loop = loop
+        self._writer: ThreadPoolExecutor | None = None
+        if backend is not None:
+            self._state: dict[str, dict[str, Any]] = {}
+            if self._loop is None:
+                with contextlib.suppress(RuntimeError):
+                    self._loop = asyncio.get_running_loop()
+            if self._loop is not None:
+                self._writer = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="orchestration-state-writer"
+                )
+            backend.subscribe(self._on_remote_change)
+        else:
+            self._state = self._load()
+
+    @property
+    def shared(self) -> bool:
+        """Whether state is shared with other replicas through a backend."""
+        return self._backend is not None
 
     def read_namespace(self, namespace: str) -> dict[str, Any]:
         """Return a deep copy of the namespace payload or an empty dict."""
         with self._lock:
+            if self._backend is not None:
+                records = self._cached_records(namespace)
+                payload = {key: rec.value for key, rec in records.items() if not rec.deleted}
+                self._apply_pending(namespace, payload)
+                self._views[namespace] = _deep_copy(payload)
+                return _deep_copy(payload)
             raw = self._state.get(namespace, {})
             if not isinstance(raw, dict):
                 return {}
             return _deep_copy(raw)
 
     def write_namespace(self, namespace: str, payload: dict[str, Any]) -> None:
-        """Persist a namespace payload atomically."""
+        """Persist a namespace payload atomically.
+
+        With a shared backend all changed records land in one commit, so other
+        replicas see either none or all of them.
+        """
         with self._lock:
+            if self._backend is not None:
+                if not self._listeners.get(namespace):
+                    raise RuntimeError(
+                        f"Orchestration state namespace {namespace!r} is written without a "
+                        "reload listener; register one with add_listener() so the writer "
+                        "picks up changes made on other replicas"
+                    )
+                self._write_records(namespace, _deep_copy(payload))
+                return
             self._state[namespace] = _deep_copy(payload)
             self._persist()
 
+    def add_listener(self, namespace: str, callback: Callable[[], None]) -> None:
+        """Call *callback()* after another replica changed *namespace*.
+
+        Only shared stores notify; callbacks run on the store's event loop, or
+        on the backend's notification thread when the store has none.
+        """
+        with self._lock:
+            self._listeners[namespace].append(callback)
+
+    def flush(self) -> None:
+        """Block until every write handed to the writer thread is committed."""
+        writer = self._writer
+        if writer is not None:
+            writer.submit(lambda: None).result()
+
+    def close(self) -> None:
+        """Commit queued writes and release the backend (no-op for the file store)."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._backend is not None:
+            self._backend.close()
+
+    # -- shared backend ---------------------------------------------------------
+
+    def _cached_records(self, namespace: str) -> dict[str, StateRecord]:
+        assert self._backend is not None
+        records = self._records.get(namespace)
+        if records is None:
+            records = self._backend.load_namespace(namespace)
+            self._records[namespace] = records
+        return records
+
+    def _write_records(self, namespace: str, payload: dict[str, Any]) -> None:
+        view = self._views.get(namespace, {})
+        changes: list[_Change] = []
+        for key in sorted(payload.keys() | view.keys()):
+            delete = key not in payload
+            ours = None if delete else payload[key]
+            if not delete and key in view and view[key] == ours:
+                continue
+            changes.append((key, view.get(key), ours, delete))
+        if changes and self._writer is None:
+            self._commit_changes(namespace, changes)
+        self._views[namespace] = payload
+        if not changes or self._writer is None:
+            return
+        self._pending.setdefault(namespace, []).extend(changes)
+        self._writer.submit(self._commit_queued, namespace, changes)
+
+    def _apply_pending(self, namespace: str, payload: dict[str, Any]) -> None:
+        """Overlay changes still queued for the writer thread onto *payload*."""
+        for key, base_value, ours, delete in self._pending.get(namespace, ()):
+            current = StateRecord(0, payload[key]) if key in payload else None
+            write = _plan_write(key, current, base_value, ours, delete)
+            if write is None:
+                continue
+            if write.delete:
+                payload.pop(key, None)
+            else:
+                payload[key] = write.value
+
+    def _commit_queued(self, namespace: str, changes: list[_Change]) -> None:
+        try:
+            self._commit_changes(namespace, changes, queued=True)
+        except Exception:
+            logger.warning(
+                "orchestration_state_write_failed namespace=%s", namespace, exc_info=True
+            )
+            if _metrics is not None:
+                _metrics.increment(
+                    "orchestration_state_write_failures_total", {"namespace": namespace}
+                )
+            # write_namespace already returned: reload the committed state and
+            # let the namespace's services resync to it, as after a remote change.
+            self._on_remote_change(namespace)
+
+    def _drop_pending(self, namespace: str, count: int) -> None:
+        pending = self._pending.get(namespace, [])
+        del pending[:count]
+        if not pending:
+            self._pending.pop(namespace, None)
+
+    def _load_records(self, namespace: str) -> dict[str, StateRecord]:
+        """Return the cached records, loading them without holding the lock."""
+        assert self._backend is not None
+        with self._lock:
+            records = self._records.get(namespace)
+        if records is None:
+            loaded = self._backend.load_namespace(namespace)
+            with self._lock:
+                records = self._records.setdefault(namespace, loaded)
+        return records
+
+    def _commit_changes(
+        self, namespace: str, changes: list[_Change], *, queued: bool = False
+    ) -> None:
+        """Apply this replica's record changes to their current values in one commit.
+
+        Backend calls happen outside the lock.  With *queued*, the changes are
+        dropped from the pending overlay in the same critical section that
+        caches their committed records.
+        """
+        backend = self._backend
+        assert backend is not None
+        try:
+            records = self._load_records(namespace)
+            with self._lock:
+                current = {key: records.get(key) for key, *_ in changes}
+            for attempt in range(_MAX_CAS_ATTEMPTS):
+                writes = [
+                    write
+                    for key, base_value, ours, delete in changes
+                    if (write := _plan_write(key, current[key], base_value, ours, delete))
+                    is not None
+                ]
+                if not writes:
+                    return
+                versions = backend.compare_and_set(namespace, writes)
+                if versions is not None:
+                    committed = {
+                        write.key: StateRecord(versions[write.key], write.value, write.delete)
+                        for write in writes
+                    }
+                    with self._lock:
+                        cached = self._records.get(namespace)
+                        if cached is not None:
+                            cached.update(_newer_records(committed, cached))
+                        if queued:
+                            self._drop_pending(namespace, len(changes))
+                            queued = False
+                    if attempt:
+                        logger.info(
+                            "orchestration_state_conflict_merged namespace=%s records=%s",
+                            namespace,
+                            ",".join(write.key for write in writes),
+                        )
+                    return
+                current = {key: backend.get_record(namespace, key) for key in current}
+            raise RuntimeError(
+                f"Could not write orchestration state {namespace}: "
+                f"{_MAX_CAS_ATTEMPTS} conflicting writes in a row"
+            )
+        finally:
+            if queued:
+                with self._lock:
+                    self._drop_pending(namespace, len(changes))
+
+    def _on_remote_change(self, namespace: str | None) -> None:
+        backend = self._backend
+        assert backend is not None
+        with self._lock:
+            changed = list(self._records) if namespace is None else [namespace]
+            cached = [ns for ns in changed if ns in self._records]
+        # Reload on this (notification) thread so the listeners' reads on the
+        # event loop are served from the cache.
+        loaded: dict[str, dict[str, StateRecord] | None] = {}
+        for ns in cached:
+            try:
+                loaded[ns] = backend.load_namespace(ns)
+            except Exception:
+                logger.warning(
+                    "orchestration_state_refresh_failed namespace=%s", ns, exc_info=True
+                )
+                loaded[ns] = None
+        with self._lock:
+            for ns in changed:
+                records = loaded.get(ns)
+                previous = self._records.pop(ns, None)
+                if records is not None:
+                    self._records[ns] = _newer_records(previous or {}, records)
+            callbacks = [cb for ns in changed for cb in self._listeners.get(ns, ())]
+        if not callbacks:
+            return
+        if self._loop is None:
+            self._run_listeners(callbacks)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._run_listeners, callbacks)
+        except RuntimeError:
+            # The loop is closed: the process is shutting down.
+            logger.debug("orchestration_state_listeners_skipped loop_closed")
+
+    @staticmethod
+    def _run_listeners(callbacks: list[Callable[[], None]]) -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.warning("orchestration_state_listener_failed", exc_info=True)
+
     def _load(self) -> dict[str, dict[str, Any]]:
         if not self._path.exists():
             return {}
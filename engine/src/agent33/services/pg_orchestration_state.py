@@ -0,0 +1,359 @@
+"""Shared backends for :class:`~agent33.services.orchestration_state.OrchestrationStateStore`.
+
+* :class:`SqliteStateBackend` keeps records as versioned rows, for replicas
+  that open the same database file (one host or a shared volume).  Other
+  replicas' writes are detected by polling a per-namespace revision counter,
+  which costs one ``PRAGMA data_version`` per poll while nothing changes.
+* :class:`RedisStateBackend` is the backend for replicas on separate hosts.
+  It keeps each namespace as two Redis hashes (record values and record
+  versions), updates them with a compare-and-set script and announces changes
+  on a pub/sub channel.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from agent33.services.orchestration_state import StateRecord
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from agent33.services.orchestration_state import RecordWrite
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "agent33:state:"
+_REDIS_CHANNEL = "agent33:state:changes"
+
+# KEYS[1] values hash, KEYS[2] versions hash
+# ARGV: channel, message, then per record: key, expected version, delete flag,
+# encoded value.  Returns the new versions in order, or nil on any conflict.
+_REDIS_CAS_SCRIPT = """
+for i = 3, #ARGV, 4 do
+    local version = tonumber(redis.call('HGET', KEYS[2], ARGV[i]) or '0')
+    if version ~= tonumber(ARGV[i + 1]) then
+        return nil
+    end
+end
+local versions = {}
+for i = 3, #ARGV, 4 do
+    local version = tonumber(ARGV[i + 1]) + 1
+    redis.call('HSET', KEYS[2], ARGV[i], version)
+    if ARGV[i + 2] == '1' then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    else
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 3])
+    end
+    versions[#versions + 1] = version
+end
+redis.call('PUBLISH', ARGV[1], ARGV[2])
+return versions
+"""
+
+
+class SqliteStateBackend:
+    """Versioned state records in a SQLite database shared by replicas.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite database file, or ``":memory:"``.
+    poll_interval_seconds:
+        How often :meth:`subscribe`'s watcher looks for other replicas'
+        writes.
+    """
+
+    def __init__(self, db_path: str, *, poll_interval_seconds: float = 1.0) -> None:
+        self._poll_interval = poll_interval_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS orchestration_state ("
+            "  namespace TEXT NOT NULL,"
+            "  record_key TEXT NOT NULL,"
+            "  version INTEGER NOT NULL,"
+            "  deleted INTEGER NOT NULL DEFAULT 0,"
+            "  data TEXT,"
+            "  updated_at REAL NOT NULL,"
+            "  PRIMARY KEY (namespace, record_key)"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS orchestration_state_revisions ("
+            "  namespace TEXT PRIMARY KEY,"
+            "  revision INTEGER NOT NULL"
+            ")"
+        )
+        # Namespace revisions this replica has seen (its own writes included).
+        self._seen: dict[str, int] = dict(
+            self._conn.execute("SELECT namespace, revision FROM orchestration_state_revisions")
+        )
+        self._callbacks: list[Callable[[str | None], None]] = []
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def load_namespace(self, namespace: str) -> dict[str, StateRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_key, version, deleted, data FROM orchestration_state "
+                "WHERE namespace = ?",
+                (namespace,),
+            ).fetchall()
+        return {row[0]: _sqlite_record(*row[1:]) for row in rows}
+
+    def get_record(self, namespace: str, key: str) -> StateRecord | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, deleted, data FROM orchestration_state "
+                "WHERE namespace = ? AND record_key = ?",
+                (namespace, key),
+            ).fetchone()
+        return None if row is None else _sqlite_record(*row)
+
+    def compare_and_set(
+        self, namespace: str, writes: Sequence[RecordWrite]
+    ) -> dict[str, int] | None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for write in writes:
+                    row = self._conn.execute(
+                        "SELECT version FROM orchestration_state "
+                        "WHERE namespace = ? AND record_key = ?",
+                        (namespace, write.key),
+                    ).fetchone()
+                    if (0 if row is None else row[0]) != write.expected_version:
+                        self._conn.execute("ROLLBACK")
+                        return None
+                versions = {write.key: write.expected_version + 1 for write in writes}
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO orchestration_state "
+                    "(namespace, record_key, version, deleted, data, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            namespace,
+                            write.key,
+                            versions[write.key],
+                            int(write.delete),
+                            None if write.delete else json.dumps(write.value),
+                            now,
+                        )
+                        for write in writes
+                    ],
+                )
+                (revision,) = self._conn.execute(
+                    "INSERT INTO orchestration_state_revisions (namespace, revision) "
+                    "VALUES (?, 1) ON CONFLICT(namespace) DO UPDATE "
+                    "SET revision = revision + 1 RETURNING revision",
+                    (namespace,),
+                ).fetchone()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            # Only mark the namespace seen if no other replica wrote in between;
+            # otherwise the watcher still reports that change.
+            if self._seen.get(namespace, 0) == revision - 1:
+                self._seen[namespace] = revision
+        return versions
+
+    def subscribe(self, callback: Callable[[str | None], None]) -> None:
+        self._callbacks.append(callback)
+        if self._watcher is None:
+            self._watcher = threading.Thread(
+                target=self._watch, name="orchestration-state-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self._poll_interval + 1.0)
+            self._watcher = None
+        with self._lock:
+            self._conn.close()
+
+    def poll_changes(self) -> list[str]:
+        """Return namespaces other replicas changed since the last poll."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, revision FROM orchestration_state_revisions"
+            ).fetchall()
+            changed = [ns for ns, revision in rows if self._seen.get(ns, 0) != revision]
+            for ns, revision in rows:
+                self._seen[ns] = revision
+        return changed
+
+    def _watch(self) -> None:
+        data_version = None
+        while not self._stop.wait(self._poll_interval):
+            try:
+                with self._lock:
+                    # Changes only when another connection committed.
+                    (current,) = self._conn.execute("PRAGMA data_version").fetchone()
+                if current == data_version:
+                    continue
+                data_version = current
+                for namespace in self.poll_changes():
+                    for callback in list(self._callbacks):
+                        callback(namespace)
+            except Exception:
+                logger.warning("orchestration_state_watch_failed", exc_info=True)
+
+
+def _sqlite_record(version: int, deleted: int, data: str | None) -> StateRecord:
+    if deleted or data is None:
+        return StateRecord(version, None, True)
+    return StateRecord(version, json.loads(data))
+
+
+class RedisStateBackend:
+    """Versioned state records in Redis hashes with pub/sub invalidation.
+
+    Parameters
+    ----------
+    redis:
+        A synchronous ``redis.Redis`` client.  The store calls it from its
+        writer and notification threads, not from the event loop.
+    origin:
+        Identity of this replica; its own change messages are ignored.
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        *,
+        origin: str = "",
+        prefix: str = _REDIS_PREFIX,
+        channel: str = _REDIS_CHANNEL,
+    ) -> None:
+        self._redis = redis
+        self._origin = origin or uuid.uuid4().hex
+        self._prefix = prefix
+        self._channel = channel
+        self._cas = redis.register_script(_REDIS_CAS_SCRIPT)
+        self._callbacks: list[Callable[[str | None], None]] = []
+        self._pubsub: Any = None
+        self._listener: Any = None
+
+    def _keys(self, namespace: str) -> tuple[str, str]:
+        # Hash tag keeps both hashes of a namespace in one cluster slot.
+        return f"{self._prefix}{{{namespace}}}", f"{self._prefix}{{{namespace}}}:versions"
+
+    def load_namespace(self, namespace: str) -> dict[str, StateRecord]:
+        values_key, versions_key = self._keys(namespace)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hgetall(values_key)
+        pipe.hgetall(versions_key)
+        values, versions = pipe.execute()
+        records: dict[str, StateRecord] = {}
+        for raw_key, raw_version in versions.items():
+            key = _text(raw_key)
+            raw_value = values.get(raw_key)
+            if raw_value is None:
+                records[key] = StateRecord(int(raw_version), None, True)
+            else:
+                records[key] = StateRecord(int(raw_version), json.loads(raw_value))
+        return records
+
+    def get_record(self, namespace: str, key: str) -> StateRecord | None:
+        values_key, versions_key = self._keys(namespace)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hget(values_key, key)
+        pipe.hget(versions_key, key)
+        raw_value, raw_version = pipe.execute()
+        if raw_version is None:
+            return None
+        if raw_value is None:
+            return StateRecord(int(raw_version), None, True)
+        return StateRecord(int(raw_version), json.loads(raw_value))
+
+    def compare_and_set(
+        self, namespace: str, writes: Sequence[RecordWrite]
+    ) -> dict[str, int] | None:
+        args: list[Any] = [self._channel, f"{self._origin}\n{namespace}"]
+        for write in writes:
+            args.extend(
+                [
+                    write.key,
+                    write.expected_version,
+                    "1" if write.delete else "0",
+                    "" if write.delete else json.dumps(write.value),
+                ]
+            )
+        versions = self._cas(keys=list(self._keys(namespace)), args=args)
+        if versions is None:
+            return None
+        return {write.key: int(v) for write, v in zip(writes, versions, strict=True)}
+
+    def subscribe(self, callback: Callable[[str | None], None]) -> None:
+        self._callbacks.append(callback)
+        if self._pubsub is not None:
+            return
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self._channel: self._on_message})
+        self._listener = self._pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=self._on_listener_error
+        )
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        origin, _, namespace = _text(message["data"]).partition("\n")
+        if origin != self._origin:
+            self._notify(namespace)
+
+    def _on_listener_error(self, exc: BaseException, pubsub: Any, thread: Any) -> None:
+        # Messages may have been lost while disconnected: drop every cached copy.
+        logger.warning("orchestration_state_pubsub_failed error=%s", exc)
+        self._notify(None)
+        time.sleep(1.0)
+
+    def _notify(self, namespace: str | None) -> None:
+        for callback in list(self._callbacks):
+            try:
+                callback(namespace)
+            except Exception:
+                logger.warning("orchestration_state_notify_failed", exc_info=True)
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def create_state_backend(
+    kind: str,
+    *,
+    db_path: str = "",
+    redis_url: str = "",
+    origin: str = "",
+    poll_interval_seconds: float = 1.0,
+) -> SqliteStateBackend | RedisStateBackend:
+    """Factory for ``orchestration_state_backend`` (``"sqlite"`` or ``"redis"``)."""
+    if kind == "sqlite":
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        return SqliteStateBackend(db_path, poll_interval_seconds=poll_interval_seconds)
+    if kind == "redis":
+        import redis as redis_sync
+
+        return RedisStateBackend(redis_sync.Redis.from_url(redis_url), origin=origin)
+    raise ValueError(f"Unknown orchestration state backend: {kind!r}")
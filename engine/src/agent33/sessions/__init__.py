@@ -3,7 +3,8 @@
 Public API:
     OperatorSession, OperatorSessionStatus, TaskEntry,
     SessionEvent, SessionEventType,
-    OperatorSessionService, FileSessionStorage,
+    OperatorSessionService, SessionStorage, FileSessionStorage,
+    SqliteSessionStorage, RedisSessionStorage,
     SessionCatalog, SessionLineageBuilder,
     SessionSpawnService, SessionArchiveService.
 """
@@ -18,20 +19,25 @@ from agent33.sessions.models import (
     SessionEventType,
     TaskEntry,
 )
+from agent33.sessions.pg_storage import SqliteSessionStorage
+from agent33.sessions.redis_storage import RedisSessionStorage
 from agent33.sessions.service import OperatorSessionService
 from agent33.sessions.spawn import SessionSpawnService
-from agent33.sessions.storage import FileSessionStorage
+from agent33.sessions.storage import FileSessionStorage, SessionStorage
 
 __all__ = [
     "FileSessionStorage",
     "OperatorSession",
     "OperatorSessionService",
     "OperatorSessionStatus",
+    "RedisSessionStorage",
     "SessionArchiveService",
     "SessionCatalog",
     "SessionEvent",
     "SessionEventType",
     "SessionLineageBuilder",
     "SessionSpawnService",
+    "SessionStorage",
+    "SqliteSessionStorage",
     "TaskEntry",
 ]
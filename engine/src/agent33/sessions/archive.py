@@ -71,6 +71,7 @@ class SessionArchiveService:
             if age_days >= older_than_days:
                 self._session_service.clear_terminal_session_state(session.session_id)
                 self._session_service.storage.delete_session(session.session_id)
+                self._session_service.invalidate(session.session_id)
                 removed += 1
                 logger.debug(
                     "archived_session_deleted session_id=%s age_days=%.1f",
@@ -0,0 +1,461 @@
+"""Shared operator-session storage for multi-replica deployments.
+
+:class:`SqliteSessionStorage` implements
+:class:`~agent33.sessions.storage.SessionStorage` on a relational schema that
+any replica can use:
+
+* ``operator_sessions`` -- one row per session (state as JSON plus the
+  columns needed to filter it) with the owning replica and its lease;
+* ``operator_session_events`` -- the append-only replay log;
+* ``operator_session_checkpoints`` -- the latest checkpoint per session;
+* ``operator_session_changes`` -- a feed of session writes that other
+  replicas poll to invalidate their cached copies.
+
+Leases replace PID lock files: a replica owns the sessions it started or
+resumed while it keeps renewing their lease, and crash detection treats an
+active session whose lease ran out as crashed no matter which host ran it.
+
+Event appends are buffered and written in one transaction every
+``event_flush_interval_seconds`` (or before any read of the replay log), so a
+burst of tool-call events costs one commit instead of one per event.
+
+SQLite only coordinates replicas that open the same database file (one host
+or a shared volume).  Replicas on separate hosts use
+:class:`~agent33.sessions.redis_storage.RedisSessionStorage` instead
+(``operator_session_backend = "redis"``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from agent33.sessions.models import OperatorSession, OperatorSessionStatus, SessionEvent
+from agent33.sessions.storage import FileSessionStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+_CHANGE_FEED_RETAINED = 10_000
+
+
+class SqliteSessionStorage:
+    """Session rows, append-only events and leases in a shared SQLite database.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the database file shared by the replicas.
+    owner:
+        Identity of this replica (e.g. the instance registry id).
+    lease_seconds:
+        How long a session stays owned by a replica that stopped renewing.
+    event_flush_interval_seconds:
+        Upper bound on how long an appended event waits in the buffer.
+    poll_interval_seconds:
+        How often other replicas' changes are looked for.
+    """
+
+    offload_io = True
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        owner: str,
+        lease_seconds: float = 30.0,
+        event_flush_interval_seconds: float = 0.05,
+        poll_interval_seconds: float = 0.5,
+    ) -> None:
+        self._db_path = db_path
+        self._owner = owner
+        self._lease_seconds = lease_seconds
+        self._flush_interval = event_flush_interval_seconds
+        self._poll_interval = poll_interval_seconds
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS operator_sessions (
+                session_id TEXT PRIMARY KEY,
+                tenant_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                owner TEXT,
+                owner_host TEXT,
+                lease_until REAL NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_operator_sessions_created
+                ON operator_sessions (created_at);
+            CREATE TABLE IF NOT EXISTS operator_session_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_operator_session_events_session
+                ON operator_session_events (session_id, id);
+            CREATE TABLE IF NOT EXISTS operator_session_checkpoints (
+                session_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS operator_session_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                origin TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT MAX(seq) FROM operator_session_changes").fetchone()
+        self._change_seq: int = row[0] or 0
+        self._pending: list[tuple[str, str]] = []
+        self._owned: set[str] = set()
+        self._callbacks: list[Callable[[str], None]] = []
+        self._stop = threading.Event()
+        self._worker = threading.Thread(
+            target=self._maintain, name="operator-session-storage", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def base_dir(self) -> Path:
+        return Path(self._db_path).parent
+
+    def ensure_base_dir(self) -> None:
+        """Nothing to create: the schema exists once the storage is opened."""
+
+    # ------------------------------------------------------------------
+    # Session CRUD
+    # ------------------------------------------------------------------
+
+    def save_session(self, session: OperatorSession) -> None:
+        FileSessionStorage._validate_session_id(session.session_id)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO operator_sessions "
+                "(session_id, tenant_id, status, created_at, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET "
+                "tenant_id = excluded.tenant_id, status = excluded.status, data = excluded.data",
+                (
+                    session.session_id,
+                    session.tenant_id,
+                    session.status.value,
+                    time.time(),
+                    json.dumps(session.to_dict(), default=str),
+                ),
+            )
+            self._record_change(session.session_id)
+
+    def load_session(self, session_id: str) -> OperatorSession | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM operator_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return None if row is None else _decode_session(session_id, row[0])
+
+    def delete_session(self, session_id: str) -> bool:
+        with self._lock, self._conn:
+            self._pending = [item for item in self._pending if item[0] != session_id]
+            deleted = self._conn.execute(
+                "DELETE FROM operator_sessions WHERE session_id = ?", (session_id,)
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM operator_session_events WHERE session_id = ?", (session_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM operator_session_checkpoints WHERE session_id = ?", (session_id,)
+            )
+            self._owned.discard(session_id)
+            if deleted:
+                self._record_change(session_id)
+        return bool(deleted)
+
+    def list_session_ids(self) -> list[str]:
+        """Return all session IDs, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session_id FROM operator_sessions ORDER BY created_at, rowid"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_sessions(
+        self,
+        status: OperatorSessionStatus | None = None,
+        limit: int = 50,
+        tenant_id: str | None = None,
+    ) -> list[OperatorSession]:
+        """Return the newest sessions, optionally filtered by status and tenant."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if tenant_id is not None:
+            clauses.append("tenant_id = ?")
+            params.append(tenant_id)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT session_id, data FROM operator_sessions {where}"
+                "ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        sessions = [_decode_session(sid, data) for sid, data in rows]
+        return [session for session in sessions if session is not None]
+
+    # ------------------------------------------------------------------
+    # Replay log
+    # ------------------------------------------------------------------
+
+    def append_event(self, session_id: str, event: SessionEvent) -> None:
+        """Buffer an event; it is written with the next batch."""
+        FileSessionStorage._validate_session_id(session_id)
+        line = json.dumps(event.to_dict(), default=str)
+        with self._lock:
+            self._pending.append((session_id, line))
+
+    def flush_events(self) -> int:
+        """Write buffered events in one transaction; return how many."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO operator_session_events (session_id, data) VALUES (?, ?)",
+                        batch,
+                    )
+            except sqlite3.Error:
+                self._pending[:0] = batch
+                raise
+        return len(batch)
+
+    def read_events(
+        self,
+        session_id: str,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[SessionEvent]:
+        with self._lock:
+            self.flush_events()
+            rows = self._conn.execute(
+                "SELECT data FROM operator_session_events WHERE session_id = ? "
+                "ORDER BY id LIMIT ? OFFSET ?",
+                (session_id, limit, offset),
+            ).fetchall()
+        events: list[SessionEvent] = []
+        for (data,) in rows:
+            try:
+                events.append(SessionEvent.from_dict(json.loads(data)))
+            except (json.JSONDecodeError, KeyError, ValueError) as exc:
+                logger.warning("corrupt replay row session=%s error=%s", session_id, exc)
+        return events
+
+    def event_count(self, session_id: str) -> int:
+        with self._lock:
+            self.flush_events()
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM operator_session_events WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        return int(count)
+
+    def rotate_replay_log(self, session_id: str) -> bool:
+        """Events are rows, so there is no log file to rotate."""
+        return False
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def save_checkpoint(self, session: OperatorSession) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO operator_session_checkpoints (session_id, data) "
+                "VALUES (?, ?)",
+                (session.session_id, json.dumps(session.to_dict(), default=str)),
+            )
+
+    # ------------------------------------------------------------------
+    # Ownership leases
+    # ------------------------------------------------------------------
+
+    def write_lock(self, session_id: str) -> bool:
+        """Take the session's lease unless another live replica holds it."""
+        now = time.time()
+        with self._lock, self._conn:
+            taken = self._conn.execute(
+                "UPDATE operator_sessions SET owner = ?, owner_host = ?, lease_until = ? "
+                "WHERE session_id = ? AND (owner IS NULL OR owner = ? OR lease_until < ?)",
+                (
+                    self._owner,
+                    platform.node(),
+                    now + self._lease_seconds,
+                    session_id,
+                    self._owner,
+                    now,
+                ),
+            ).rowcount
+            if taken:
+                self._owned.add(session_id)
+        return bool(taken)
+
+    def remove_lock(self, session_id: str) -> None:
+        with self._lock, self._conn:
+            self._owned.discard(session_id)
+            self._conn.execute(
+                "UPDATE operator_sessions SET owner = NULL, owner_host = NULL, lease_until = 0 "
+                "WHERE session_id = ? AND owner = ?",
+                (session_id, self._owner),
+            )
+
+    def read_lock(self, session_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owner, owner_host, lease_until FROM operator_sessions "
+                "WHERE session_id = ? AND owner IS NOT NULL",
+                (session_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"owner": row[0], "hostname": row[1], "lease_until": row[2]}
+
+    def is_process_alive(self, session_id: str) -> bool:
+        """Whether some replica still holds an unexpired lease on the session."""
+        lock = self.read_lock(session_id)
+        return lock is not None and float(lock["lease_until"]) > time.time()
+
+    def renew_leases(self) -> list[str]:
+        """Extend this replica's leases; return sessions whose lease was lost."""
+        with self._lock:
+            owned = sorted(self._owned)
+            if not owned:
+                return []
+            marks = ", ".join("?" for _ in owned)
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE operator_sessions SET lease_until = ? "
+                    f"WHERE owner = ? AND session_id IN ({marks})",
+                    (time.time() + self._lease_seconds, self._owner, *owned),
+                )
+                kept = {
+                    row[0]
+                    for row in self._conn.execute(
+                        f"SELECT session_id FROM operator_sessions WHERE owner = ? "
+                        f"AND session_id IN ({marks})",
+                        (self._owner, *owned),
+                    )
+                }
+            lost = [sid for sid in owned if sid not in kept]
+            self._owned.difference_update(lost)
+        for sid in lost:
+            logger.warning("operator_session_lease_lost session_id=%s", sid)
+        return lost
+
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        self._callbacks.append(callback)
+
+    def poll_changes(self) -> list[str]:
+        """Return sessions other replicas changed since the last poll."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, session_id FROM operator_session_changes "
+                "WHERE seq > ? AND origin != ? ORDER BY seq",
+                (self._change_seq, self._owner),
+            ).fetchall()
+            (latest,) = self._conn.execute(
+                "SELECT MAX(seq) FROM operator_session_changes"
+            ).fetchone()
+            self._change_seq = max(self._change_seq, latest or 0)
+        return list(dict.fromkeys(sid for _, sid in rows))
+
+    def _record_change(self, session_id: str) -> None:
+        # Caller holds the lock inside a transaction.
+        cursor = self._conn.execute(
+            "INSERT INTO operator_session_changes (session_id, origin) VALUES (?, ?)",
+            (session_id, self._owner),
+        )
+        seq = cursor.lastrowid or 0
+        if seq % 1000 == 0:
+            self._conn.execute(
+                "DELETE FROM operator_session_changes WHERE seq <= ?",
+                (seq - _CHANGE_FEED_RETAINED,),
+            )
+
+    # ------------------------------------------------------------------
+    # Background maintenance
+    # ------------------------------------------------------------------
+
+    def _maintain(self) -> None:
+        next_poll = next_renew = 0.0
+        data_version = None
+        while not self._stop.wait(self._flush_interval):
+            try:
+                self.flush_events()
+                now = time.monotonic()
+                if now >= next_renew:
+                    next_renew = now + self._lease_seconds / 3
+                    for sid in self.renew_leases():
+                        self._notify(sid)
+                if now >= next_poll:
+                    next_poll = now + self._poll_interval
+                    with self._lock:
+                        (current,) = self._conn.execute("PRAGMA data_version").fetchone()
+                    if current != data_version:
+                        data_version = current
+                        for sid in self.poll_changes():
+                            self._notify(sid)
+            except Exception:
+                logger.warning("operator_session_storage_maintenance_failed", exc_info=True)
+
+    def _notify(self, session_id: str) -> None:
+        for callback in list(self._callbacks):
+            try:
+                callback(session_id)
+            except Exception:
+                logger.warning("operator_session_change_callback_failed", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+
+    def cleanup_old_sessions(self, max_retained: int) -> int:
+        ids = self.list_session_ids()
+        if len(ids) <= max_retained:
+            return 0
+        removed = sum(self.delete_session(sid) for sid in ids[: len(ids) - max_retained])
+        logger.info("sessions_cleaned up removed=%d retained=%d", removed, max_retained)
+        return removed
+
+    def close(self) -> None:
+        """Stop background work, write buffered events and close the database."""
+        self._stop.set()
+        self._worker.join(timeout=5.0)
+        with self._lock:
+            self.flush_events()
+            self._conn.close()
+
+
+def _decode_session(session_id: str, data: str) -> OperatorSession | None:
+    try:
+        return OperatorSession.from_dict(json.loads(data))
+    except (json.JSONDecodeError, KeyError, ValueError) as exc:
+        logger.warning("corrupt session row session_id=%s error=%s", session_id, exc)
+        return None
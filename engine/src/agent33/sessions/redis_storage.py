@@ -0,0 +1,415 @@
+"""Operator-session storage in Redis for replicas on separate hosts.
+
+:class:`RedisSessionStorage` implements
+:class:`~agent33.sessions.storage.SessionStorage` with the same semantics as
+:class:`~agent33.sessions.pg_storage.SqliteSessionStorage`, over keys under
+one prefix:
+
+* ``index`` -- sorted set of session ids scored by creation time;
+* ``session:<id>`` -- the session state as JSON;
+* ``events:<id>`` -- the append-only replay log (a list);
+* ``checkpoint:<id>`` -- the latest checkpoint;
+* ``lease:<id>`` -- owner, host and lease deadline, expiring with the lease.
+
+Leases are taken, renewed and released with scripts that check the owner, so
+only one replica drives a session at a time.  Session writes are announced on
+a pub/sub channel so other replicas drop their cached copies.  Event appends
+are buffered and pushed in one pipeline like the SQLite backend.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from agent33.sessions.models import OperatorSession, OperatorSessionStatus, SessionEvent
+from agent33.sessions.pg_storage import _decode_session
+from agent33.sessions.storage import FileSessionStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "agent33:sessions:"
+_LIST_PAGE = 200
+
+# KEYS[1] lease hash, KEYS[2] session key
+# ARGV: owner, hostname, lease deadline, lease ttl in ms
+_ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return 0
+end
+local owner = redis.call('HGET', KEYS[1], 'owner')
+if owner and owner ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'owner', ARGV[1], 'hostname', ARGV[2], 'lease_until', ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# KEYS[1] lease hash; ARGV: owner, lease deadline, lease ttl in ms
+_RENEW_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'lease_until', ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# KEYS[1] lease hash; ARGV: owner
+_RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisSessionStorage:
+    """Session state, replay logs and leases in Redis shared by replicas.
+
+    Parameters
+    ----------
+    redis:
+        A synchronous ``redis.Redis`` client (the storage API is synchronous;
+        the session service calls it from worker threads, see ``offload_io``).
+    owner:
+        Identity of this replica (e.g. the instance registry id).
+    base_dir:
+        Directory reported to session hooks; nothing is written there.
+    lease_seconds:
+        How long a session stays owned by a replica that stopped renewing.
+    event_flush_interval_seconds:
+        Upper bound on how long an appended event waits in the buffer.
+    """
+
+    offload_io = True
+
+    def __init__(
+        self,
+        redis: Any,
+        *,
+        owner: str,
+        base_dir: str | Path = ".",
+        lease_seconds: float = 30.0,
+        event_flush_interval_seconds: float = 0.05,
+        prefix: str = _REDIS_PREFIX,
+    ) -> None:
+        self._redis = redis
+        self._owner = owner
+        self._base_dir = Path(base_dir)
+        self._lease_seconds = lease_seconds
+        self._flush_interval = event_flush_interval_seconds
+        self._prefix = prefix
+        self._channel = f"{prefix}changes"
+        self._acquire = redis.register_script(_ACQUIRE_SCRIPT)
+        self._renew = redis.register_script(_RENEW_SCRIPT)
+        self._release = redis.register_script(_RELEASE_SCRIPT)
+        self._lock = threading.RLock()
+        self._pending: list[tuple[str, str]] = []
+        self._owned: set[str] = set()
+        self._callbacks: list[Callable[[str], None]] = []
+        self._pubsub: Any = None
+        self._listener: Any = None
+        self._stop = threading.Event()
+        self._worker = threading.Thread(
+            target=self._maintain, name="operator-session-storage", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def base_dir(self) -> Path:
+        return self._base_dir
+
+    def ensure_base_dir(self) -> None:
+        """Nothing to create: keys are written on first use."""
+
+    def _key(self, kind: str, session_id: str = "") -> str:
+        return f"{self._prefix}{kind}:{session_id}" if session_id else f"{self._prefix}{kind}"
+
+    # ------------------------------------------------------------------
+    # Session CRUD
+    # ------------------------------------------------------------------
+
+    def save_session(self, session: OperatorSession) -> None:
+        FileSessionStorage._validate_session_id(session.session_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.set(
+            self._key("session", session.session_id),
+            json.dumps(session.to_dict(), default=str),
+        )
+        pipe.zadd(self._key("index"), {session.session_id: time.time()}, nx=True)
+        pipe.publish(self._channel, f"{self._owner}\n{session.session_id}")
+        pipe.execute()
+
+    def load_session(self, session_id: str) -> OperatorSession | None:
+        data = self._redis.get(self._key("session", session_id))
+        return None if data is None else _decode_session(session_id, _text(data))
+
+    def delete_session(self, session_id: str) -> bool:
+        with self._lock:
+            self._pending = [item for item in self._pending if item[0] != session_id]
+            self._owned.discard(session_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zrem(self._key("index"), session_id)
+        pipe.delete(
+            self._key("session", session_id),
+            self._key("events", session_id),
+            self._key("checkpoint", session_id),
+            self._key("lease", session_id),
+        )
+        removed, _ = pipe.execute()
+        if removed:
+            self._redis.publish(self._channel, f"{self._owner}\n{session_id}")
+        return bool(removed)
+
+    def list_session_ids(self) -> list[str]:
+        """Return all session IDs, oldest first."""
+        return [_text(sid) for sid in self._redis.zrange(self._key("index"), 0, -1)]
+
+    def list_sessions(
+        self,
+        status: OperatorSessionStatus | None = None,
+        limit: int = 50,
+        tenant_id: str | None = None,
+    ) -> list[OperatorSession]:
+        """Return the newest sessions, optionally filtered by status and tenant."""
+        sessions: list[OperatorSession] = []
+        start = 0
+        while len(sessions) < limit:
+            ids = [
+                _text(sid)
+                for sid in self._redis.zrevrange(self._key("index"), start, start + _LIST_PAGE - 1)
+            ]
+            if not ids:
+                break
+            start += len(ids)
+            values = self._redis.mget([self._key("session", sid) for sid in ids])
+            for sid, data in zip(ids, values, strict=True):
+                session = None if data is None else _decode_session(sid, _text(data))
+                if session is None:
+                    continue
+                if status is not None and session.status != status:
+                    continue
+                if tenant_id is not None and session.tenant_id != tenant_id:
+                    continue
+                sessions.append(session)
+        return sessions[:limit]
+
+    # ------------------------------------------------------------------
+    # Replay log
+    # ------------------------------------------------------------------
+
+    def append_event(self, session_id: str, event: SessionEvent) -> None:
+        """Buffer an event; it is written with the next batch."""
+        FileSessionStorage._validate_session_id(session_id)
+        line = json.dumps(event.to_dict(), default=str)
+        with self._lock:
+            self._pending.append((session_id, line))
+
+    def flush_events(self) -> int:
+        """Push buffered events in one pipeline; return how many."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            by_session: dict[str, list[str]] = defaultdict(list)
+            for session_id, line in batch:
+                by_session[session_id].append(line)
+            pipe = self._redis.pipeline(transaction=False)
+            for session_id, lines in by_session.items():
+                pipe.rpush(self._key("events", session_id), *lines)
+            try:
+                pipe.execute()
+            except Exception:
+                self._pending[:0] = batch
+                raise
+        return len(batch)
+
+    def read_events(
+        self,
+        session_id: str,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[SessionEvent]:
+        self.flush_events()
+        if limit <= 0:
+            return []
+        rows = self._redis.lrange(self._key("events", session_id), offset, offset + limit - 1)
+        events: list[SessionEvent] = []
+        for data in rows:
+            try:
+                events.append(SessionEvent.from_dict(json.loads(data)))
+            except (json.JSONDecodeError, KeyError, ValueError) as exc:
+                logger.warning("corrupt replay entry session=%s error=%s", session_id, exc)
+        return events
+
+    def event_count(self, session_id: str) -> int:
+        self.flush_events()
+        return int(self._redis.llen(self._key("events", session_id)))
+
+    def rotate_replay_log(self, session_id: str) -> bool:
+        """Events are list entries, so there is no log file to rotate."""
+        return False
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def save_checkpoint(self, session: OperatorSession) -> None:
+        self._redis.set(
+            self._key("checkpoint", session.session_id),
+            json.dumps(session.to_dict(), default=str),
+        )
+
+    # ------------------------------------------------------------------
+    # Ownership leases
+    # ------------------------------------------------------------------
+
+    def write_lock(self, session_id: str) -> bool:
+        """Take the session's lease unless another live replica holds it."""
+        taken = self._acquire(
+            keys=[self._key("lease", session_id), self._key("session", session_id)],
+            args=[
+                self._owner,
+                platform.node(),
+                time.time() + self._lease_seconds,
+                int(self._lease_seconds * 1000),
+            ],
+        )
+        if taken:
+            with self._lock:
+                self._owned.add(session_id)
+        return bool(taken)
+
+    def remove_lock(self, session_id: str) -> None:
+        with self._lock:
+            self._owned.discard(session_id)
+        self._release(keys=[self._key("lease", session_id)], args=[self._owner])
+
+    def read_lock(self, session_id: str) -> dict[str, Any] | None:
+        lease = self._redis.hgetall(self._key("lease", session_id))
+        if not lease:
+            return None
+        fields = {_text(k): _text(v) for k, v in lease.items()}
+        return {
+            "owner": fields.get("owner"),
+            "hostname": fields.get("hostname"),
+            "lease_until": float(fields.get("lease_until", 0)),
+        }
+
+    def is_process_alive(self, session_id: str) -> bool:
+        """Whether some replica still holds an unexpired lease on the session."""
+        lock = self.read_lock(session_id)
+        return lock is not None and float(lock["lease_until"]) > time.time()
+
+    def renew_leases(self) -> list[str]:
+        """Extend this replica's leases; return sessions whose lease was lost."""
+        with self._lock:
+            owned = sorted(self._owned)
+        if not owned:
+            return []
+        deadline = time.time() + self._lease_seconds
+        ttl_ms = int(self._lease_seconds * 1000)
+        pipe = self._redis.pipeline(transaction=False)
+        for sid in owned:
+            self._renew(
+                keys=[self._key("lease", sid)], args=[self._owner, deadline, ttl_ms], client=pipe
+            )
+        results = pipe.execute()
+        lost = [sid for sid, kept in zip(owned, results, strict=True) if not kept]
+        with self._lock:
+            self._owned.difference_update(lost)
+        for sid in lost:
+            logger.warning("operator_session_lease_lost session_id=%s", sid)
+        return lost
+
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        self._callbacks.append(callback)
+        if self._pubsub is not None:
+            return
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self._channel: self._on_message})
+        self._listener = self._pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=self._on_listener_error
+        )
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        origin, _, session_id = _text(message["data"]).partition("\n")
+        if origin != self._owner:
+            self._notify(session_id)
+
+    def _on_listener_error(self, exc: BaseException, pubsub: Any, thread: Any) -> None:
+        # Messages may have been lost while disconnected: mark every session changed.
+        logger.warning("operator_session_pubsub_failed error=%s", exc)
+        try:
+            for sid in self.list_session_ids():
+                self._notify(sid)
+        except Exception:
+            logger.warning("operator_session_resync_failed", exc_info=True)
+        time.sleep(1.0)
+
+    def _notify(self, session_id: str) -> None:
+        for callback in list(self._callbacks):
+            try:
+                callback(session_id)
+            except Exception:
+                logger.warning("operator_session_change_callback_failed", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Background maintenance
+    # ------------------------------------------------------------------
+
+    def _maintain(self) -> None:
+        next_renew = 0.0
+        while not self._stop.wait(self._flush_interval):
+            try:
+                self.flush_events()
+                now = time.monotonic()
+                if now >= next_renew:
+                    next_renew = now + self._lease_seconds / 3
+                    for sid in self.renew_leases():
+                        self._notify(sid)
+            except Exception:
+                logger.warning("operator_session_storage_maintenance_failed", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+
+    def cleanup_old_sessions(self, max_retained: int) -> int:
+        ids = self.list_session_ids()
+        if len(ids) <= max_retained:
+            return 0
+        removed = sum(self.delete_session(sid) for sid in ids[: len(ids) - max_retained])
+        logger.info("sessions_cleaned up removed=%d retained=%d", removed, max_retained)
+        return removed
+
+    def close(self) -> None:
+        """Stop background work and push buffered events."""
+        self._stop.set()
+        self._worker.join(timeout=5.0)
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+        self.flush_events()
+
+
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections import OrderedDict
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 from uuid import uuid4
 
 from agent33.sessions.models import (
@@ -18,10 +20,12 @@ from agent33.sessions.models import (
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
 
-    from agent33.sessions.storage import FileSessionStorage
+    from agent33.sessions.storage import SessionStorage
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 class OperatorSessionService:
     """Manages operator session lifecycle, persistence, and replay logging.
@@ -29,15 +33,20 @@ class OperatorSessionService:
     This service owns the durable session state. It is separate from the
     existing SessionManager (which handles encrypted runtime sessions for
     agent conversations).
+
+    Sessions this process is not driving are kept in a small LRU hot cache.
+    When the storage is shared between replicas, its change notifications
+    mark cached (and active) copies stale so the next lookup reloads them.
     """
 
     def __init__(
         self,
-        storage: FileSessionStorage,
+        storage: SessionStorage,
         hook_registry: Any | None = None,
         checkpoint_interval_seconds: float = 60.0,
         max_sessions_retained: int = 100,
         session_cleanup_callback: Callable[[str], None] | None = None,
+        hot_cache_size: int = 256,
     ) -> None:
         self._storage = storage
         self._hook_registry = hook_registry
@@ -46,12 +55,18 @@ class OperatorSessionService:
         self._session_cleanup_callback = session_cleanup_callback
         # In-memory cache of active sessions for fast lookup
         self._active: dict[str, OperatorSession] = {}
+        # LRU of recently read sessions that are not active here
+        self._cache: OrderedDict[str, OperatorSession] = OrderedDict()
+        self._cache_size = hot_cache_size
+        # Sessions another replica changed since they were cached
+        self._stale: set[str] = set()
+        storage.subscribe(self._stale.add)
         self._status_snapshot_builder: (
             Callable[[OperatorSession], Awaitable[dict[str, Any]]] | None
         ) = None
 
     @property
-    def storage(self) -> FileSessionStorage:
+    def storage(self) -> SessionStorage:
         return self._storage
 
     def set_status_snapshot_builder(
@@ -101,9 +116,9 @@ class OperatorSessionService:
             tenant_id=tenant_id,
             context=context or {},
         )
-        self._storage.ensure_base_dir()
-        self._storage.save_session(session)
-        self._storage.write_lock(session_id)
+        await self._io(self._storage.ensure_base_dir)
+        await self._io(self._storage.save_session, session)
+        await self._io(self._storage.write_lock, session_id)
 
         # Log the start event
         event = SessionEvent(
@@ -114,7 +129,7 @@ class OperatorSessionService:
         self._storage.append_event(session_id, event)
         session.event_count = 1
         await self._refresh_status_cache(session)
-        self._storage.save_session(session)
+        await self._io(self._storage.save_session, session)
 
         self._active[session_id] = session
 
@@ -173,16 +188,17 @@ class OperatorSessionService:
             data={"status": status.value, "task_summary": session.task_summary},
         )
         self._storage.append_event(session_id, event)
-        session.event_count = self._storage.event_count(session_id)
+        session.event_count = await self._io(self._storage.event_count, session_id)
         await self._refresh_status_cache(session)
 
         # Fire hooks, save, clean up
         await self._fire_hooks("session.end", session)
-        self._storage.save_session(session)
-        self._storage.save_checkpoint(session)
-        self._storage.remove_lock(session_id)
+        await self._io(self._storage.save_session, session)
+        await self._io(self._storage.save_checkpoint, session)
+        await self._io(self._storage.remove_lock, session_id)
 
         self._active.pop(session_id, None)
+        self._remember(session)
         if status == OperatorSessionStatus.COMPLETED:
             self.clear_terminal_session_state(session_id)
 
@@ -203,7 +219,8 @@ class OperatorSessionService:
 
         Raises:
             KeyError: If the session is not found.
-            ValueError: If the session is not resumable.
+            ValueError: If the session is not resumable or another replica
+                holds its lease.
         """
         session = await self.get_session(session_id)
         if session is None:
@@ -216,6 +233,14 @@ class OperatorSessionService:
                 f"Cannot resume session in status '{session.status}'; "
                 f"expected 'crashed' or 'suspended'"
             )
+        # Take the lease before touching the session so two replicas cannot
+        # both resume it; the one that loses gets a conflict.
+        if not await self._io(self._storage.write_lock, session_id):
+            lock = await self._io(self._storage.read_lock, session_id) or {}
+            raise ValueError(
+                f"Session {session_id} is being resumed by another replica "
+                f"({lock.get('owner', 'unknown')})"
+            )
 
         now = datetime.now(UTC)
         session.status = OperatorSessionStatus.ACTIVE
@@ -229,11 +254,11 @@ class OperatorSessionService:
             data={"previous_status": session.status.value},
         )
         self._storage.append_event(session_id, event)
-        session.event_count = self._storage.event_count(session_id)
+        session.event_count = await self._io(self._storage.event_count, session_id)
         await self._refresh_status_cache(session)
 
-        self._storage.save_session(session)
-        self._storage.write_lock(session_id)
+        await self._io(self._storage.save_session, session)
+        self._cache.pop(session_id, None)
         self._active[session_id] = session
 
         await self._fire_hooks("session.resume", session)
@@ -255,7 +280,7 @@ class OperatorSessionService:
         now = datetime.now(UTC)
         session.last_checkpoint_at = now
         session.updated_at = now
-        session.event_count = self._storage.event_count(session_id)
+        session.event_count = await self._io(self._storage.event_count, session_id)
         session.task_summary = self._build_task_summary(session)
 
         # Log checkpoint event
@@ -265,12 +290,12 @@ class OperatorSessionService:
             data={"event_count": session.event_count},
         )
         self._storage.append_event(session_id, event)
-        session.event_count = self._storage.event_count(session_id)
+        session.event_count = await self._io(self._storage.event_count, session_id)
         await self._refresh_status_cache(session)
 
-        self._storage.save_session(session)
-        self._storage.save_checkpoint(session)
-        self._storage.rotate_replay_log(session_id)
+        await self._io(self._storage.save_session, session)
+        await self._io(self._storage.save_checkpoint, session)
+        await self._io(self._storage.rotate_replay_log, session_id)
 
         if session_id in self._active:
             self._active[session_id] = session
@@ -297,7 +322,7 @@ class OperatorSessionService:
         )
         session.tasks.append(task)
         session.updated_at = datetime.now(UTC)
-        self._storage.save_session(session)
+        await self._io(self._storage.save_session, session)
 
         event = SessionEvent(
             event_type=SessionEventType.TASK_ADDED,
@@ -342,7 +367,7 @@ class OperatorSessionService:
         if status == "done":
             task.completed_at = datetime.now(UTC)
         session.updated_at = datetime.now(UTC)
-        self._storage.save_session(session)
+        await self._io(self._storage.save_session, session)
 
         event = SessionEvent(
             event_type=SessionEventType.TASK_UPDATED,
@@ -369,10 +394,12 @@ class OperatorSessionService:
     async def append_event(self, session_id: str, event: SessionEvent) -> None:
         """Append an event to the replay log."""
         event.session_id = session_id
+        # Called inline everywhere: shared backends only buffer the event and
+        # write it from their own maintenance thread.
         self._storage.append_event(session_id, event)
         session = self._active.get(session_id)
         if session is not None:
-            session.event_count = self._storage.event_count(session_id)
+            session.event_count += 1
 
     async def get_replay(
         self,
@@ -381,11 +408,11 @@ class OperatorSessionService:
         limit: int = 100,
     ) -> list[SessionEvent]:
         """Read events from the replay log with pagination."""
-        return self._storage.read_events(session_id, offset=offset, limit=limit)
+        return await self._io(self._storage.read_events, session_id, offset=offset, limit=limit)
 
     async def get_replay_summary(self, session_id: str) -> dict[str, Any]:
         """Generate a summary of the replay log for the session."""
-        events = self._storage.read_events(session_id, offset=0, limit=10000)
+        events = await self._io(self._storage.read_events, session_id, offset=0, limit=10000)
         if not events:
             return {"total_events": 0, "by_type": {}, "duration_seconds": 0.0}
 
@@ -411,10 +438,26 @@ class OperatorSessionService:
     # ------------------------------------------------------------------
 
     async def get_session(self, session_id: str) -> OperatorSession | None:
-        """Get a session by ID (from memory cache or filesystem)."""
+        """Get a session by ID (from memory cache or storage)."""
+        if session_id in self._stale:
+            self._stale.discard(session_id)
+            self._cache.pop(session_id, None)
+            if session_id in self._active:
+                reloaded = await self._io(self._storage.load_session, session_id)
+                if reloaded is None:
+                    self._active.pop(session_id)
+                else:
+                    self._active[session_id] = reloaded
         if session_id in self._active:
             return self._active[session_id]
-        return self._storage.load_session(session_id)
+        cached = self._cache.get(session_id)
+        if cached is not None:
+            self._cache.move_to_end(session_id)
+            return cached
+        session = await self._io(self._storage.load_session, session_id)
+        if session is not None:
+            self._remember(session)
+        return session
 
     async def list_sessions(
         self,
@@ -423,7 +466,9 @@ class OperatorSessionService:
         tenant_id: str | None = None,
     ) -> list[OperatorSession]:
         """List sessions with optional status filter."""
-        return self._storage.list_sessions(status=status, limit=limit, tenant_id=tenant_id)
+        return await self._io(
+            self._storage.list_sessions, status=status, limit=limit, tenant_id=tenant_id
+        )
 
     # ------------------------------------------------------------------
     # Crash detection
@@ -442,8 +487,8 @@ class OperatorSessionService:
         Returns sessions marked as CRASHED (status is updated).
         """
         crashed: list[OperatorSession] = []
-        for sid in self._storage.list_session_ids():
-            session = self._storage.load_session(sid)
+        for sid in await self._io(self._storage.list_session_ids):
+            session = await self._io(self._storage.load_session, sid)
             if session is None:
                 continue
             if tenant_id is not None and session.tenant_id != tenant_id:
@@ -451,13 +496,14 @@ class OperatorSessionService:
             if session.status != OperatorSessionStatus.ACTIVE:
                 continue
             # Check if process is still alive
-            if self._storage.is_process_alive(sid):
+            if await self._io(self._storage.is_process_alive, sid):
                 continue
             # Mark as crashed
             session.status = OperatorSessionStatus.CRASHED
             session.updated_at = datetime.now(UTC)
-            self._storage.save_session(session)
-            self._storage.remove_lock(sid)
+            await self._io(self._storage.save_session, session)
+            await self._io(self._storage.remove_lock, sid)
+            self.invalidate(sid)
             crashed.append(session)
             logger.warning(
                 "incomplete_session_detected session_id=%s purpose=%s",
@@ -472,7 +518,14 @@ class OperatorSessionService:
 
     async def cleanup_old_sessions(self) -> int:
         """Remove sessions beyond max_sessions_retained."""
-        return self._storage.cleanup_old_sessions(self._max_retained)
+        removed = await self._io(self._storage.cleanup_old_sessions, self._max_retained)
+        if removed:
+            self._cache.clear()
+        return removed
+
+    def invalidate(self, session_id: str) -> None:
+        """Drop the hot-cache copy of a session changed outside this service."""
+        self._cache.pop(session_id, None)
 
     # ------------------------------------------------------------------
     # Shutdown
@@ -489,10 +542,10 @@ class OperatorSessionService:
             try:
                 session.updated_at = datetime.now(UTC)
                 session.last_checkpoint_at = datetime.now(UTC)
-                session.event_count = self._storage.event_count(session_id)
-                self._storage.save_session(session)
-                self._storage.save_checkpoint(session)
-                self._storage.remove_lock(session_id)
+                session.event_count = await self._io(self._storage.event_count, session_id)
+                await self._io(self._storage.save_session, session)
+                await self._io(self._storage.save_checkpoint, session)
+                await self._io(self._storage.remove_lock, session_id)
             except Exception:
                 logger.warning(
                     "session_shutdown_flush_failed session_id=%s",
@@ -500,12 +553,28 @@ class OperatorSessionService:
                     exc_info=True,
                 )
         self._active.clear()
+        self._cache.clear()
+        await self._io(self._storage.close)
         logger.info("operator_session_service_shutdown")
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    async def _io(self, call: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """Run a storage call, off the event loop when the backend does round trips."""
+        if self._storage.offload_io:
+            return await asyncio.to_thread(call, *args, **kwargs)
+        return call(*args, **kwargs)
+
+    def _remember(self, session: OperatorSession) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[session.session_id] = session
+        self._cache.move_to_end(session.session_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
     async def _fire_hooks(self, event_type: str, session: OperatorSession) -> None:
         """Fire hooks for the given session event type."""
         if self._hook_registry is None:
@@ -8,9 +8,10 @@ import os
 import platform
 import re
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from pathlib import Path
 
 from agent33.sessions.models import (
@@ -24,6 +25,71 @@ logger = logging.getLogger(__name__)
 _SAFE_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
 
 
+class SessionStorage(Protocol):
+    """Storage backend used by :class:`~agent33.sessions.service.OperatorSessionService`.
+
+    :class:`FileSessionStorage` keeps sessions in per-session directories on
+    one host; :class:`~agent33.sessions.pg_storage.SqliteSessionStorage`
+    shares them between replicas.
+
+    ``offload_io`` tells the service to call the backend from a worker thread
+    because its calls are database or network round trips.  ``append_event``
+    is always called inline, so such backends must only buffer it.
+    """
+
+    offload_io: bool
+
+    @property
+    def base_dir(self) -> Path: ...
+
+    def ensure_base_dir(self) -> None: ...
+
+    def save_session(self, session: OperatorSession) -> None: ...
+
+    def load_session(self, session_id: str) -> OperatorSession | None: ...
+
+    def delete_session(self, session_id: str) -> bool: ...
+
+    def list_session_ids(self) -> list[str]: ...
+
+    def list_sessions(
+        self,
+        status: OperatorSessionStatus | None = None,
+        limit: int = 50,
+        tenant_id: str | None = None,
+    ) -> list[OperatorSession]: ...
+
+    def append_event(self, session_id: str, event: SessionEvent) -> None: ...
+
+    def read_events(
+        self, session_id: str, offset: int = 0, limit: int = 100
+    ) -> list[SessionEvent]: ...
+
+    def event_count(self, session_id: str) -> int: ...
+
+    def rotate_replay_log(self, session_id: str) -> bool: ...
+
+    def save_checkpoint(self, session: OperatorSession) -> None: ...
+
+    def write_lock(self, session_id: str) -> bool:
+        """Take ownership of a session; False if another owner holds it."""
+        ...
+
+    def remove_lock(self, session_id: str) -> None: ...
+
+    def read_lock(self, session_id: str) -> dict[str, Any] | None: ...
+
+    def is_process_alive(self, session_id: str) -> bool: ...
+
+    def cleanup_old_sessions(self, max_retained: int) -> int: ...
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Call *callback(session_id)* when another replica changes a session."""
+        ...
+
+    def close(self) -> None: ...
+
+
 class FileSessionStorage:
     """Filesystem storage backend for operator sessions.
 
@@ -35,6 +101,8 @@ class FileSessionStorage:
             process.lock        -- PID-based lock file
     """
 
+    offload_io = False
+
     def __init__(
         self,
         base_dir: Path,
@@ -243,7 +311,7 @@ class FileSessionStorage:
     # Process lock
     # ------------------------------------------------------------------
 
-    def write_lock(self, session_id: str) -> None:
+    def write_lock(self, session_id: str) -> bool:
         """Write a PID-based process lock file."""
         sdir = self.session_dir(session_id)
         sdir.mkdir(parents=True, exist_ok=True)
@@ -254,6 +322,7 @@ class FileSessionStorage:
             "hostname": platform.node(),
         }
         lock_file.write_text(json.dumps(lock_data), encoding="utf-8")
+        return True
 
     def remove_lock(self, session_id: str) -> None:
         """Remove the process lock file."""
@@ -281,6 +350,16 @@ class FileSessionStorage:
             return False
         return _pid_is_alive(int(pid))
 
+    # ------------------------------------------------------------------
+    # Change notifications
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """No-op: file sessions are only used by the local process."""
+
+    def close(self) -> None:
+        """No-op: every write goes straight to disk."""
+
     # ------------------------------------------------------------------
     # Cleanup
     # ------------------------------------------------------------------
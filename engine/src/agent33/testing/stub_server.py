@@ -0,0 +1,547 @@
+"""Deterministic stand-in for Ollama and OpenAI-compatible model servers.
+
+Serves the Ollama API (``/api/chat`` plain and NDJSON streaming,
+``/api/embed``, ``/api/tags``, ``/api/ps``) and the OpenAI API
+(``/v1/chat/completions`` plain and SSE streaming, ``/v1/embeddings``,
+``/v1/models``) so engine overhead can be measured without a real model.
+Replies and embeddings depend only on the request text: the same prompt
+always yields the same reply and the same text always yields the same unit
+vector.
+
+How the stub behaves is set by a :class:`StubBehavior`: a latency
+distribution before the first token, a token rate for the rest of the
+reply, a tool-call script, and failure injection.  Random draws (latency,
+injected failures) come from one generator seeded by ``StubBehavior.seed``,
+so a sequential benchmark sees the same sequence on every run.
+
+Run standalone::
+
+    python -m agent33.testing.stub_server --port 11500 --latency lognormal:200:0.5
+
+or in-process from a test or benchmark::
+
+    with running_stub_server(StubBehavior(latency=LatencyDistribution.parse("fixed:20"))) as url:
+        provider = OllamaProvider(base_url=url)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import struct
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+    from starlette.requests import Request
+
+STUB_MODELS = ("llama3.2:3b", "nomic-embed-text:latest")
+
+_LATENCY_KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyDistribution:
+    """A delay distribution in milliseconds.
+
+    ``fixed:M`` always waits *M*; ``uniform:LOW:HIGH`` draws between the
+    bounds; ``normal:MEAN:STDDEV`` is clamped at zero; ``lognormal:MEDIAN:SIGMA``
+    gives the long right tail typical of model servers; ``exponential:MEAN``
+    models queueing delay.
+    """
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.0,)
+
+    def __post_init__(self) -> None:
+        if self.kind not in _LATENCY_KINDS:
+            raise ValueError(f"unknown latency distribution {self.kind!r}")
+        if len(self.params) != _LATENCY_KINDS[self.kind]:
+            raise ValueError(f"{self.kind} latency takes {_LATENCY_KINDS[self.kind]} parameter(s)")
+        if any(p < 0 for p in self.params):
+            raise ValueError("latency parameters must not be negative")
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyDistribution:
+        """Parse ``kind:param[:param]``; a bare number means ``fixed``."""
+        kind, _, rest = spec.strip().partition(":")
+        try:
+            if not rest:
+                return cls("fixed", (float(kind),))
+            return cls(kind, tuple(float(part) for part in rest.split(":")))
+        except ValueError as exc:
+            raise ValueError(f"invalid latency spec {spec!r}: {exc}") from exc
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay in milliseconds."""
+        p = self.params
+        if self.kind == "fixed":
+            return p[0]
+        if self.kind == "uniform":
+            return rng.uniform(p[0], p[1])
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(p[0], p[1]))
+        if self.kind == "lognormal":
+            return p[0] * math.exp(rng.gauss(0.0, p[1])) if p[0] > 0 else 0.0
+        return rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class ScriptStep:
+    """One scripted assistant turn: tool calls, a fixed reply, or both."""
+
+    content: str | None = None
+    tool_calls: tuple[tuple[str, dict[str, Any]], ...] = ()
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> ScriptStep:
+        calls = tuple(
+            (str(call["name"]), dict(call.get("arguments") or {}))
+            for call in raw.get("tool_calls") or ()
+        )
+        content = raw.get("content")
+        return cls(content=None if content is None else str(content), tool_calls=calls)
+
+
+def load_tool_script(path: str | Path) -> tuple[ScriptStep, ...]:
+    """Load a tool-call script: a JSON list of ``{"tool_calls": [...], "content": ...}``."""
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(raw, list):
+        raise ValueError("a tool script is a JSON list of steps")
+    return tuple(ScriptStep.from_dict(step) for step in raw)
+
+
+@dataclass(frozen=True, slots=True)
+class StubBehavior:
+    """How the stub answers.
+
+    Parameters
+    ----------
+    latency:
+        Delay before the first token of a chat reply, and before every
+        embedding response.
+    tokens_per_second:
+        Rate at which the remaining reply tokens are produced; ``0`` sends
+        the whole reply at once.
+    reply_tokens:
+        Number of words in every unscripted chat reply.
+    embedding_dim:
+        Length of every embedding vector.
+    tool_script:
+        Scripted assistant turns.  The turn a request gets is the number of
+        assistant messages already in its conversation, so concurrent
+        conversations each walk the script from the start.  Past the end of
+        the script the stub gives its normal reply.
+    error_rate:
+        Fraction of chat and embedding requests answered with *error_status*.
+    abort_rate:
+        Fraction of streamed replies cut off halfway, without a final chunk.
+    seed:
+        Seed for latency draws and injected failures.
+    """
+
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    tokens_per_second: float = 0.0
+    reply_tokens: int = 32
+    embedding_dim: int = 768
+    tool_script: tuple[ScriptStep, ...] = ()
+    error_rate: float = 0.0
+    error_status: int = 503
+    abort_rate: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        for name in ("error_rate", "abort_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.tokens_per_second < 0:
+            raise ValueError("tokens_per_second must not be negative")
+
+
+@dataclass(slots=True)
+class _Reply:
+    words: list[str]
+    tool_calls: tuple[tuple[str, dict[str, Any]], ...]
+    prompt_tokens: int
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.words)
+
+
+def stub_reply(prompt: str, tokens: int) -> list[str]:
+    """Return the *tokens* reply words for *prompt*."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return [digest[(i * 4) % 60 :][:4] for i in range(tokens)]
+
+
+def stub_embedding(text: str, dim: int) -> list[float]:
+    """Return a deterministic unit vector of *dim* floats for *text*."""
+    values: list[float] = []
+    counter = 0
+    while len(values) < dim:
+        block = hashlib.sha256(f"{counter}:{text}".encode()).digest()
+        values.extend(v / 2**31 - 1.0 for v in struct.unpack("<8I", block))
+        counter += 1
+    values = values[:dim]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+def _text(content: Any) -> str:
+    return content if isinstance(content, str) else json.dumps(content)
+
+
+def _last_user_text(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return _text(message.get("content", ""))
+    return ""
+
+
+def create_app(behavior: StubBehavior | None = None) -> Starlette:
+    """Build the stub server application.
+
+    ``GET /stub/stats`` reports request counts per route and the number of
+    injected errors and aborted streams.
+    """
+    behavior = behavior or StubBehavior()
+    rng = random.Random(behavior.seed)  # noqa: S311 -- reproducible load, not security
+    stats: Counter[str] = Counter()
+    token_gap = 1.0 / behavior.tokens_per_second if behavior.tokens_per_second else 0.0
+
+    async def first_token_delay() -> None:
+        delay_ms = behavior.latency.sample(rng)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    def injected_error(route: str) -> JSONResponse | None:
+        stats[route] += 1
+        if not behavior.error_rate or rng.random() >= behavior.error_rate:
+            return None
+        stats["injected_errors"] += 1
+        message = f"stub injected failure ({behavior.error_status})"
+        error: Any = message
+        if route.startswith("/v1/"):
+            error = {"message": message, "type": "server_error", "code": behavior.error_status}
+        headers = {"Retry-After": "1"} if behavior.error_status == 429 else None
+        return JSONResponse({"error": error}, behavior.error_status, headers=headers)
+
+    def plan_reply(body: dict[str, Any]) -> _Reply:
+        messages: list[dict[str, Any]] = body.get("messages") or []
+        prompt_tokens = sum(len(_text(m.get("content") or "").split()) for m in messages)
+        turn = sum(1 for m in messages if m.get("role") == "assistant")
+        if turn < len(behavior.tool_script):
+            step = behavior.tool_script[turn]
+            words = step.content.split() if step.content else []
+            return _Reply(words, step.tool_calls, prompt_tokens)
+        words = stub_reply(_last_user_text(messages), behavior.reply_tokens)
+        return _Reply(words, (), prompt_tokens)
+
+    def aborts() -> bool:
+        if behavior.abort_rate and rng.random() < behavior.abort_rate:
+            stats["aborted_streams"] += 1
+            return True
+        return False
+
+    async def paced(words: list[str], abort: bool) -> AsyncIterator[tuple[int, str]]:
+        await first_token_delay()
+        stop = len(words) // 2 if abort else len(words)
+        for i, word in enumerate(words[:stop]):
+            if i and token_gap:
+                await asyncio.sleep(token_gap)
+            yield i, word if i == 0 else f" {word}"
+
+    async def full_reply_delay(reply: _Reply) -> None:
+        await first_token_delay()
+        if token_gap and len(reply.words) > 1:
+            await asyncio.sleep(token_gap * (len(reply.words) - 1))
+
+    # -- Ollama ---------------------------------------------------------------
+
+    async def ollama_chat(request: Request) -> JSONResponse | StreamingResponse:
+        body = await request.json()
+        if (failure := injected_error("/api/chat")) is not None:
+            return failure
+        model = body.get("model") or STUB_MODELS[0]
+        reply = plan_reply(body)
+        usage = {"prompt_eval_count": reply.prompt_tokens, "eval_count": len(reply.words)}
+        tool_calls = [
+            {"function": {"name": name, "arguments": arguments}}
+            for name, arguments in reply.tool_calls
+        ]
+        if not body.get("stream", True):
+            await full_reply_delay(reply)
+            message: dict[str, Any] = {"role": "assistant", "content": reply.text}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return JSONResponse(
+                {"model": model, "message": message, "done": True, "done_reason": "stop", **usage}
+            )
+
+        abort = aborts()
+
+        async def lines() -> AsyncIterator[bytes]:
+            async for _, piece in paced(reply.words, abort):
+                chunk = {"model": model, "message": {"role": "assistant", "content": piece}}
+                yield json.dumps({**chunk, "done": False}).encode() + b"\n"
+            if abort:
+                return
+            if tool_calls:
+                message = {"role": "assistant", "content": "", "tool_calls": tool_calls}
+                yield json.dumps({"model": model, "message": message, "done": False}).encode()
+                yield b"\n"
+            final = {"model": model, "message": {"role": "assistant", "content": ""}}
+            yield json.dumps({**final, "done": True, "done_reason": "stop", **usage}).encode()
+            yield b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    async def ollama_embed(request: Request) -> JSONResponse:
+        body = await request.json()
+        if (failure := injected_error("/api/embed")) is not None:
+            return failure
+        texts = body.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        await first_token_delay()
+        return JSONResponse(
+            {
+                "model": body.get("model") or STUB_MODELS[1],
+                "embeddings": [stub_embedding(text, behavior.embedding_dim) for text in texts],
+            }
+        )
+
+    async def ollama_models(request: Request) -> JSONResponse:
+        return JSONResponse({"models": [{"name": name, "model": name} for name in STUB_MODELS]})
+
+    # -- OpenAI ---------------------------------------------------------------
+
+    async def openai_chat(request: Request) -> JSONResponse | StreamingResponse:
+        body = await request.json()
+        if (failure := injected_error("/v1/chat/completions")) is not None:
+            return failure
+        model = body.get("model") or STUB_MODELS[0]
+        reply = plan_reply(body)
+        completion_id = f"chatcmpl-stub-{stats['/v1/chat/completions']}"
+        created = int(time.time())
+        finish_reason = "tool_calls" if reply.tool_calls else "stop"
+        usage = {
+            "prompt_tokens": reply.prompt_tokens,
+            "completion_tokens": len(reply.words),
+            "total_tokens": reply.prompt_tokens + len(reply.words),
+        }
+        tool_calls = [
+            {
+                "id": f"call_{index}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(arguments)},
+            }
+            for index, (name, arguments) in enumerate(reply.tool_calls)
+        ]
+        envelope = {"id": completion_id, "created": created, "model": model}
+        if not body.get("stream", False):
+            await full_reply_delay(reply)
+            message: dict[str, Any] = {"role": "assistant", "content": reply.text or None}
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            choice = {"index": 0, "message": message, "finish_reason": finish_reason}
+            return JSONResponse(
+                {**envelope, "object": "chat.completion", "choices": [choice], "usage": usage}
+            )
+
+        abort = aborts()
+
+        def event(delta: dict[str, Any], finish: str | None = None, **extra: Any) -> bytes:
+            choice = {"index": 0, "delta": delta, "finish_reason": finish}
+            chunk = {**envelope, "object": "chat.completion.chunk", "choices": [choice], **extra}
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        async def events() -> AsyncIterator[bytes]:
+            async for i, piece in paced(reply.words, abort):
+                yield event(
+                    {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+                )
+            if abort:
+                return
+            for index, call in enumerate(tool_calls):
+                yield event({"tool_calls": [{"index": index, **call}]})
+            yield event({}, finish_reason, usage=usage)
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def openai_embeddings(request: Request) -> JSONResponse:
+        body = await request.json()
+        if (failure := injected_error("/v1/embeddings")) is not None:
+            return failure
+        texts = body.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        await first_token_delay()
+        tokens = sum(len(text.split()) for text in texts)
+        return JSONResponse(
+            {
+                "object": "list",
+                "model": body.get("model") or STUB_MODELS[1],
+                "data": [
+                    {
+                        "object": "embedding",
+                        "index": index,
+                        "embedding": stub_embedding(text, behavior.embedding_dim),
+                    }
+                    for index, text in enumerate(texts)
+                ],
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            }
+        )
+
+    async def openai_models(request: Request) -> JSONResponse:
+        return JSONResponse(
+            {
+                "object": "list",
+                "data": [
+                    {"id": name, "object": "model", "owned_by": "stub"} for name in STUB_MODELS
+                ],
+            }
+        )
+
+    async def stub_stats(request: Request) -> JSONResponse:
+        return JSONResponse(dict(stats))
+
+    return Starlette(
+        routes=[
+            Route("/api/chat", ollama_chat, methods=["POST"]),
+            Route("/api/embed", ollama_embed, methods=["POST"]),
+            Route("/api/tags", ollama_models, methods=["GET"]),
+            Route("/api/ps", ollama_models, methods=["GET"]),
+            Route("/v1/chat/completions", openai_chat, methods=["POST"]),
+            Route("/v1/embeddings", openai_embeddings, methods=["POST"]),
+            Route("/v1/models", openai_models, methods=["GET"]),
+            Route("/stub/stats", stub_stats, methods=["GET"]),
+        ]
+    )
+
+
+@contextmanager
+def running_stub_server(
+    behavior: StubBehavior | None = None,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    startup_timeout: float = 10.0,
+) -> Iterator[str]:
+    """Serve the stub on a background thread and yield its base URL.
+
+    With ``port=0`` the operating system picks a free port.  Point Ollama
+    clients at the yielded URL and OpenAI clients at ``<url>/v1``.
+    """
+    import uvicorn
+
+    config = uvicorn.Config(
+        create_app(behavior), host=host, port=port, log_level="warning", lifespan="off"
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, name="stub-model-server", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + startup_timeout
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            server.should_exit = True
+            raise RuntimeError(f"stub model server did not start on {host}:{port}")
+        time.sleep(0.01)
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=startup_timeout)
+
+
+def serve(behavior: StubBehavior, *, host: str = "127.0.0.1", port: int = 11500) -> None:
+    """Serve the stub in the foreground until interrupted."""
+    import uvicorn
+
+    uvicorn.run(create_app(behavior), host=host, port=port, log_level="warning")
+
+
+def build_parser(
+    *, prog: str | None = None, exit_on_error: bool = True
+) -> argparse.ArgumentParser:
+    """Return the parser shared by ``main``, ``agent33 bench stub`` and load-test hooks."""
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description=(__doc__ or "").splitlines()[0],
+        exit_on_error=exit_on_error,
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=11500, help="Port to listen on.")
+    parser.add_argument(
+        "--latency",
+        type=LatencyDistribution.parse,
+        default=LatencyDistribution(),
+        help="Time to first token in ms: N, uniform:LOW:HIGH, normal:MEAN:SD, "
+        "lognormal:MEDIAN:SIGMA or exponential:MEAN",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=0.0,
+        help="Token rate after the first (0 = instant).",
+    )
+    parser.add_argument("--reply-tokens", type=int, default=32, help="Words per unscripted reply.")
+    parser.add_argument("--embedding-dim", type=int, default=768, help="Embedding vector length.")
+    parser.add_argument(
+        "--tool-script", type=Path, default=None, help="JSON list of scripted assistant turns."
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests that fail."
+    )
+    parser.add_argument(
+        "--error-status", type=int, default=503, help="HTTP status of injected failures."
+    )
+    parser.add_argument(
+        "--abort-rate", type=float, default=0.0, help="Fraction of streams cut off halfway."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and failures.")
+    return parser
+
+
+def behavior_from_args(args: argparse.Namespace) -> StubBehavior:
+    """Build a :class:`StubBehavior` from parsed :func:`build_parser` arguments."""
+    return StubBehavior(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        reply_tokens=args.reply_tokens,
+        embedding_dim=args.embedding_dim,
+        tool_script=load_tool_script(args.tool_script) if args.tool_script else (),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        abort_rate=args.abort_rate,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve the stub until interrupted."""
+    args = build_parser().parse_args(argv)
+    serve(behavior_from_args(args), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -77,6 +77,9 @@ class ToolApprovalService:
         self._default_ttl_minutes = max(1, default_ttl_minutes)
         self._requests: dict[str, ToolApprovalRequest] = {}
         self._load_state()
+        if state_store is not None:
+            # Pick up approvals requested or decided on other replicas.
+            state_store.add_listener("tool_approvals", self._load_state)
 
     def request(
         self,
@@ -238,10 +241,13 @@ class ToolApprovalService:
         requests_payload = payload.get("requests", {})
         if not isinstance(requests_payload, dict):
             return
+        requests: dict[str, ToolApprovalRequest] = {}
         for approval_id, request_data in requests_payload.items():
             if not isinstance(approval_id, str):
                 continue
             try:
-                self._requests[approval_id] = ToolApprovalRequest.model_validate(request_data)
+                requests[approval_id] = ToolApprovalRequest.model_validate(request_data)
             except ValidationError:
                 continue
+        # Swap the whole dict: reloads run on the state backend's notification thread.
+        self._requests = requests
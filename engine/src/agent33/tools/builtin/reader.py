@@ -13,6 +13,7 @@ from agent33.connectors.boundary import (
     build_connector_boundary_executor,
     map_connector_exception,
 )
+from agent33.connectors.http_pool import pooled_client
 from agent33.connectors.models import ConnectorRequest
 from agent33.tools.base import ToolContext, ToolResult
 
@@ -107,8 +108,8 @@ class ReaderTool:
         }
 
         async def _perform_jina_fetch(_request: ConnectorRequest) -> httpx.Response:
-            async with httpx.AsyncClient(timeout=_TIMEOUT, follow_redirects=False) as client:
-                return await client.get(jina_url, headers=headers)
+            async with pooled_client("tool:reader") as client:
+                return await client.get(jina_url, headers=headers, timeout=_TIMEOUT)
 
         if boundary_executor is None:
             try:
@@ -159,8 +160,8 @@ class ReaderTool:
         boundary_executor: Any,
     ) -> ToolResult:
         async def _perform_local_fetch(_request: ConnectorRequest) -> httpx.Response:
-            async with httpx.AsyncClient(timeout=_TIMEOUT, follow_redirects=False) as client:
-                return await client.get(url)
+            async with pooled_client("tool:reader") as client:
+                return await client.get(url, timeout=_TIMEOUT)
 
         if boundary_executor is None:
             try:
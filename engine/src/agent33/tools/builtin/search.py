@@ -116,7 +116,12 @@ class SearchTool:
             else:
                 # Legacy fallback: use the default service
                 service = create_default_web_research_service()
-                response = await service.search(query, limit=num_results, categories=categories)
+                response = await service.search(
+                    query,
+                    limit=num_results,
+                    categories=categories,
+                    tenant_id=context.tenant_id,
+                )
                 results = response.results
 
         except ValueError as exc:
@@ -54,6 +54,7 @@ class WebFetchTool:
                 body=body,
                 method=method,
                 timeout=timeout,
+                tenant_id=context.tenant_id,
             )
         except ValueError as exc:
             return ToolResult.fail(str(exc))
@@ -60,6 +60,9 @@ class MutationAuditStore:
         self._max_records = max(1, max_records)
         self._records: list[MutationAuditRecord] = []
         self._load_state()
+        if state_store is not None:
+            # Pick up mutations audited on other replicas.
+            state_store.add_listener(self._NAMESPACE, self._load_state)
 
     def record(self, record: MutationAuditRecord) -> MutationAuditRecord:
         """Append and persist a mutation record."""
@@ -1,5 +1,10 @@
 """Provider-aware web research services."""
 
+from agent33.web_research.cache import (
+    WebResearchCache,
+    configure_web_research_cache,
+    get_web_research_cache,
+)
 from agent33.web_research.models import (
     ProviderStatusInfo,
     ResearchFetchRequest,
@@ -40,10 +45,13 @@ __all__ = [
     "TrustLabel",
     "TrustedDomainEntry",
     "WebFetchArtifact",
+    "WebResearchCache",
     "WebResearchCitation",
     "WebResearchResult",
     "WebResearchService",
     "classify_domain_trust",
+    "configure_web_research_cache",
     "create_default_web_research_service",
     "create_search_provider_registry",
+    "get_web_research_cache",
 ]
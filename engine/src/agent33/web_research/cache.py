@@ -0,0 +1,520 @@
+"""TTL result cache for web research search and fetch calls.
+
+Agents in the same session (and across tenants) routinely issue identical
+queries and fetch the same URLs minutes apart.  :class:`WebResearchCache`
+keeps recent results in a bounded in-memory LRU, optionally backed by a
+shared tier (Redis, or a local SQLite file) so cached results survive
+restarts and are visible to every worker.
+
+Fetch entries honour ``Cache-Control`` (``no-store``, ``private``,
+``no-cache``, ``max-age``/``s-maxage``) and keep ``ETag``/``Last-Modified``
+validators so an expired entry can be revalidated with a conditional GET
+instead of being downloaded again.
+
+Keys are shared across tenants only when the result cannot depend on the
+caller: requests sending any header outside a small content-negotiation
+allowlist (``Authorization``, ``Cookie``, ``X-Auth-Token``, custom session
+headers, ...) and responses marked ``private`` are always scoped to the
+tenant.  Fetch keys also include every request header except the
+conditional validators, so a response stored under one ``Accept-Language``
+or other header named in its ``Vary`` is never served for another;
+``Vary: *`` responses are not cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlsplit, urlunsplit
+
+import structlog
+
+logger = structlog.get_logger()
+
+_KEY_PREFIX = "agent33:web_research:"
+# Request headers that cannot identify the caller; anything else is treated
+# as a credential and scopes the entry to the tenant.
+_SHAREABLE_HEADERS = frozenset(
+    {
+        "accept",
+        "accept-charset",
+        "accept-encoding",
+        "accept-language",
+        "cache-control",
+        "if-modified-since",
+        "if-none-match",
+        "pragma",
+        "user-agent",
+    }
+)
+_VALIDATOR_HEADERS = frozenset({"if-modified-since", "if-none-match"})
+
+
+# ---------------------------------------------------------------------------
+# Cache entries
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class CachedResult:
+    """One cached search response or fetch artifact (as JSON-ready data)."""
+
+    payload: dict[str, Any]
+    stored_at: float
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "payload": self.payload,
+                "stored_at": self.stored_at,
+                "expires_at": self.expires_at,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> CachedResult:
+        data = json.loads(raw)
+        return cls(
+            payload=data["payload"],
+            stored_at=float(data["stored_at"]),
+            expires_at=float(data["expires_at"]),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FetchCachePolicy:
+    """How a fetched response may be cached, derived from its headers."""
+
+    store: bool
+    ttl_seconds: float
+    tenant_scoped: bool
+
+
+def parse_cache_control(header: str | None) -> dict[str, str | None]:
+    """Parse a ``Cache-Control`` header into lower-cased directives."""
+    directives: dict[str, str | None] = {}
+    if not header:
+        return directives
+    for part in header.split(","):
+        token = part.strip()
+        if not token:
+            continue
+        name, sep, value = token.partition("=")
+        directives[name.strip().lower()] = value.strip().strip('"') if sep else None
+    return directives
+
+
+def fetch_cache_policy(
+    cache_control: str | None,
+    *,
+    default_ttl_seconds: float,
+    max_ttl_seconds: float,
+    vary: str | None = None,
+) -> FetchCachePolicy:
+    """Decide whether and for how long a fetch response may be cached."""
+    directives = parse_cache_control(cache_control)
+    if "no-store" in directives or "*" in vary_headers(vary):
+        return FetchCachePolicy(store=False, ttl_seconds=0.0, tenant_scoped=True)
+    tenant_scoped = "private" in directives
+    if "no-cache" in directives:
+        return FetchCachePolicy(store=True, ttl_seconds=0.0, tenant_scoped=tenant_scoped)
+    ttl = default_ttl_seconds
+    for name in ("s-maxage", "max-age"):
+        raw = directives.get(name)
+        if name == "s-maxage" and tenant_scoped:
+            continue
+        if raw is None:
+            continue
+        try:
+            ttl = max(0.0, float(raw))
+        except ValueError:
+            continue
+        break
+    return FetchCachePolicy(
+        store=True, ttl_seconds=min(ttl, max_ttl_seconds), tenant_scoped=tenant_scoped
+    )
+
+
+def vary_headers(vary: str | None) -> frozenset[str]:
+    """Parse a ``Vary`` header into lower-cased header names."""
+    return frozenset(name.strip().lower() for name in (vary or "").split(",") if name.strip())
+
+
+def has_credentials(headers: dict[str, str] | None) -> bool:
+    """Return ``True`` when request *headers* may identify the caller.
+
+    Only headers on the content-negotiation allowlist are shareable; an
+    unknown header (``X-Auth-Token``, a session header) counts as a credential.
+    """
+    return any(name.lower() not in _SHAREABLE_HEADERS for name in headers or {})
+
+
+def request_variant(headers: dict[str, str] | None) -> str:
+    """Canonical form of the request headers that select a representation."""
+    return "\n".join(
+        sorted(
+            f"{name.lower()}:{' '.join(value.split())}"
+            for name, value in (headers or {}).items()
+            if name.lower() not in _VALIDATOR_HEADERS
+        )
+    )
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def normalize_url(url: str) -> str:
+    """Lower-case scheme/host, drop the fragment and a bare trailing slash."""
+    parts = urlsplit(url.strip())
+    path = parts.path if parts.path not in ("", "/") else ""
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Shared tiers
+# ---------------------------------------------------------------------------
+
+
+class CacheTier(Protocol):
+    """Secondary key/value tier shared between workers."""
+
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+class RedisCacheTier:
+    """Tier backed by the app Redis client (or its in-process fallback)."""
+
+    def __init__(self, redis: Any) -> None:
+        self._redis = redis
+
+    async def get(self, key: str) -> str | None:
+        value = await self._redis.get(_KEY_PREFIX + key)
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value if isinstance(value, str) else None
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self._redis.set(_KEY_PREFIX + key, value, ex=max(1, ttl_seconds))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(_KEY_PREFIX + key)
+
+    async def aclose(self) -> None:
+        """The Redis connection is owned by the lifespan, not the cache."""
+
+
+class SQLiteCacheTier:
+    """Tier persisted to a local SQLite file for single-node deployments."""
+
+    def __init__(self, path: str | Path) -> None:
+        db_path = Path(path)
+        if str(db_path) != ":memory:":
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS web_research_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM web_research_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                self._conn.execute("DELETE FROM web_research_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return str(row[0])
+
+    def _set(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO web_research_cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, now + max(1, ttl_seconds)),
+            )
+            self._conn.execute("DELETE FROM web_research_cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM web_research_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class _ProviderCacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    stores: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        served = self.hits + self.revalidations
+        total = served + self.misses
+        return served / total if total else 0.0
+
+
+@dataclass(slots=True)
+class _MemoryEntry:
+    result: CachedResult
+    size: int
+
+
+class WebResearchCache:
+    """Two-tier TTL cache for search responses and fetch artifacts.
+
+    The memory tier is an LRU bounded by entry count and serialized bytes.
+    Expired entries that carry validators are retained (up to
+    ``stale_retention_seconds``) so they can be revalidated with a
+    conditional request.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        search_ttl_seconds: float = 600.0,
+        fetch_ttl_seconds: float = 300.0,
+        max_ttl_seconds: float = 86_400.0,
+        stale_retention_seconds: float = 86_400.0,
+        cross_tenant: bool = True,
+        tier: CacheTier | None = None,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = max(1, max_bytes)
+        self.search_ttl_seconds = search_ttl_seconds
+        self.fetch_ttl_seconds = fetch_ttl_seconds
+        self.max_ttl_seconds = max_ttl_seconds
+        self._stale_retention = stale_retention_seconds
+        self._cross_tenant = cross_tenant
+        self._tier = tier
+        self._entries: OrderedDict[str, _MemoryEntry] = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._tier_errors = 0
+        self._stats: dict[str, _ProviderCacheStats] = {}
+
+    # -- Keys ---------------------------------------------------------------
+
+    def search_key(
+        self,
+        query: str,
+        *,
+        provider_id: str,
+        limit: int,
+        categories: str,
+        tenant_id: str = "",
+    ) -> str:
+        scope = "" if self._cross_tenant else tenant_id
+        return "search:" + _digest(
+            scope, provider_id, categories, str(limit), normalize_query(query)
+        )
+
+    def fetch_key(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        tenant_id: str = "",
+        tenant_scoped: bool = False,
+    ) -> str:
+        scope = tenant_id if (tenant_scoped or not self._cross_tenant) else ""
+        return "fetch:" + _digest(scope, normalize_url(url), request_variant(headers))
+
+    # -- Lookup / store -----------------------------------------------------
+
+    async def get(self, key: str) -> CachedResult | None:
+        """Return the entry for *key* (possibly stale), or ``None``."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry.result
+        if self._tier is None:
+            return None
+        try:
+            raw = await self._tier.get(key)
+        except Exception:
+            self._tier_errors += 1
+            logger.warning("web_research_cache_tier_get_failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        try:
+            result = CachedResult.from_json(raw)
+        except (ValueError, KeyError, TypeError):
+            return None
+        self._remember(key, result, len(raw))
+        return result
+
+    async def put(self, key: str, result: CachedResult) -> None:
+        """Store *result* in memory and, when configured, the shared tier."""
+        raw = result.to_json()
+        self._remember(key, result, len(raw))
+        if self._tier is None:
+            return
+        retention = self._stale_retention if result.has_validators else 0.0
+        ttl = int(max(0.0, result.expires_at - time.time()) + retention)
+        if ttl <= 0:
+            return
+        try:
+            await self._tier.set(key, raw, ttl)
+        except Exception:
+            self._tier_errors += 1
+            logger.warning("web_research_cache_tier_set_failed", exc_info=True)
+
+    def _remember(self, key: str, result: CachedResult, size: int) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        if size > self._max_bytes:
+            return
+        self._entries[key] = _MemoryEntry(result=result, size=size)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        if len(self._entries) <= self._max_entries and self._bytes <= self._max_bytes:
+            return
+        # Under pressure, first drop entries that are expired and cannot be
+        # revalidated, then fall back to plain LRU order.
+        now = time.time()
+        for key in [
+            k
+            for k, e in self._entries.items()
+            if not e.result.is_fresh(now)
+            and (not e.result.has_validators or now - e.result.expires_at > self._stale_retention)
+        ]:
+            self._bytes -= self._entries.pop(key).size
+            self._evictions += 1
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            _, oldest = self._entries.popitem(last=False)
+            self._bytes -= oldest.size
+            self._evictions += 1
+
+    # -- Statistics -----------------------------------------------------------
+
+    def _provider_stats(self, provider_id: str) -> _ProviderCacheStats:
+        stats = self._stats.get(provider_id)
+        if stats is None:
+            stats = self._stats[provider_id] = _ProviderCacheStats()
+        return stats
+
+    def record_hit(self, provider_id: str) -> None:
+        self._provider_stats(provider_id).hits += 1
+
+    def record_miss(self, provider_id: str) -> None:
+        self._provider_stats(provider_id).misses += 1
+
+    def record_revalidation(self, provider_id: str) -> None:
+        self._provider_stats(provider_id).revalidations += 1
+
+    def record_store(self, provider_id: str) -> None:
+        self._provider_stats(provider_id).stores += 1
+
+    def provider_stats(self, provider_id: str) -> dict[str, float | int]:
+        stats = self._stats.get(provider_id) or _ProviderCacheStats()
+        return {
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "revalidations": stats.revalidations,
+            "stores": stats.stores,
+            "hit_rate": round(stats.hit_rate, 4),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "evictions": self._evictions,
+            "tier": type(self._tier).__name__ if self._tier is not None else None,
+            "tier_errors": self._tier_errors,
+            "providers": {pid: self.provider_stats(pid) for pid in sorted(self._stats)},
+        }
+
+    async def aclose(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        if self._tier is not None:
+            await self._tier.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide accessor (installed by the lifespan)
+# ---------------------------------------------------------------------------
+
+_cache: WebResearchCache | None = None
+
+
+def configure_web_research_cache(cache: WebResearchCache | None) -> None:
+    """Install (or clear, with ``None``) the process-wide research cache."""
+    global _cache
+    _cache = cache
+
+
+def get_web_research_cache() -> WebResearchCache | None:
+    """Return the installed research cache, if any."""
+    return _cache
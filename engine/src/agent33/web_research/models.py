@@ -196,6 +196,18 @@ class WebResearchResult(BaseModel):
     trust_label_reason: str = ""
     published_date: str | None = None
     relevance_score: float = 0.0
+    fused_score: float = 0.0
+    providers: list[str] = Field(default_factory=list)
+
+
+class ProviderSearchOutcome(BaseModel):
+    """Per-provider result of one multi-provider search fan-out."""
+
+    provider_id: str
+    status: str  # ok | error | timeout | cancelled
+    latency_ms: float = 0.0
+    result_count: int = 0
+    error: str = ""
 
 
 class ResearchProviderStatus(BaseModel):
@@ -221,6 +233,10 @@ class ProviderStatusInfo(BaseModel):
     last_check: datetime | None = None
     total_calls: int = 0
     success_rate: float = 1.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_revalidations: int = 0
+    cache_hit_rate: float = 0.0
 
 
 class ResearchSearchRequest(BaseModel):
@@ -238,6 +254,7 @@ class ResearchSearchResponse(BaseModel):
     query: str
     provider_id: str
     results: list[WebResearchResult] = Field(default_factory=list)
+    cached: bool = False
 
 
 class ResearchFetchRequest(BaseModel):
@@ -262,3 +279,8 @@ class WebFetchArtifact(BaseModel):
     trust_level: ResearchTrustLevel
     trust_reason: str
     citation: WebResearchCitation
+    etag: str | None = None
+    last_modified: str | None = None
+    cache_control: str | None = None
+    vary: str | None = None
+    cache_status: str | None = None  # hit | revalidated | miss | bypass
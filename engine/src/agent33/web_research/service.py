@@ -7,12 +7,17 @@ API key as a zero-config fallback.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Protocol
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol, TypeVar
 from urllib.parse import quote_plus, urlparse
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Awaitable, Sequence
+
+    from agent33.observability.metrics import MetricsCollector
 
 import httpx
 
@@ -21,9 +26,18 @@ from agent33.connectors.boundary import (
     build_connector_boundary_executor,
     map_connector_exception,
 )
+from agent33.connectors.http_pool import pooled_client
 from agent33.connectors.models import ConnectorRequest
+from agent33.web_research.cache import (
+    CachedResult,
+    WebResearchCache,
+    fetch_cache_policy,
+    get_web_research_cache,
+    has_credentials,
+)
 from agent33.web_research.models import (
     ProviderAuthState,
+    ProviderSearchOutcome,
     ProviderStatusInfo,
     ResearchProviderKind,
     ResearchProviderStatus,
@@ -39,6 +53,8 @@ from agent33.web_research.models import (
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 _SEARCH_TIMEOUT_SECONDS = 15.0
 _FETCH_TIMEOUT_SECONDS = 30.0
 _MAX_FETCH_BYTES = 5 * 1024 * 1024
@@ -101,6 +117,16 @@ def _domain(url: str) -> str:
     return urlparse(url).hostname or ""
 
 
+def _check_allowed_domain(url: str, allowed_domains: Sequence[str]) -> str:
+    """Return the URL's domain, raising ``ValueError`` if it is not allowlisted."""
+    domain = _domain(url)
+    if not allowed_domains:
+        raise ValueError("Domain allowlist not configured — all requests denied by default")
+    if not any(domain == allowed or domain.endswith(f".{allowed}") for allowed in allowed_domains):
+        raise ValueError(f"Domain '{domain}' is not in the allowlist: {list(allowed_domains)}")
+    return domain
+
+
 def _search_citation(title: str, url: str, provider_id: str) -> WebResearchCitation:
     return WebResearchCitation(
         title=title,
@@ -194,8 +220,10 @@ class SearXNGSearchProvider:
         }
 
         async def _perform_search(_request: ConnectorRequest) -> httpx.Response:
-            async with httpx.AsyncClient(timeout=_SEARCH_TIMEOUT_SECONDS) as client:
-                return await client.get(url, params=request_params)
+            async with pooled_client("search:searxng") as client:
+                return await client.get(
+                    url, params=request_params, timeout=_SEARCH_TIMEOUT_SECONDS
+                )
 
         boundary_executor = build_connector_boundary_executor(
             default_timeout_seconds=_SEARCH_TIMEOUT_SECONDS,
@@ -300,11 +328,13 @@ class DuckDuckGoSearchProvider:
         }
 
         try:
-            async with httpx.AsyncClient(
-                timeout=_SEARCH_TIMEOUT_SECONDS,
-                follow_redirects=True,
-            ) as client:
-                response = await client.get(url, headers=headers)
+            async with pooled_client("search:duckduckgo") as client:
+                response = await client.get(
+                    url,
+                    headers=headers,
+                    timeout=_SEARCH_TIMEOUT_SECONDS,
+                    follow_redirects=True,
+                )
                 response.raise_for_status()
         except httpx.ConnectError as exc:
             raise ValueError("Could not connect to DuckDuckGo.") from exc
@@ -428,8 +458,8 @@ class TavilySearchProvider:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=_SEARCH_TIMEOUT_SECONDS) as client:
-                response = await client.post(url, json=payload)
+            async with pooled_client("search:tavily") as client:
+                response = await client.post(url, json=payload, timeout=_SEARCH_TIMEOUT_SECONDS)
                 response.raise_for_status()
         except httpx.ConnectError as exc:
             raise ValueError("Could not connect to Tavily API.") from exc
@@ -517,8 +547,10 @@ class BraveSearchProvider:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=_SEARCH_TIMEOUT_SECONDS) as client:
-                response = await client.get(url, headers=headers, params=params)
+            async with pooled_client("search:brave") as client:
+                response = await client.get(
+                    url, headers=headers, params=params, timeout=_SEARCH_TIMEOUT_SECONDS
+                )
                 response.raise_for_status()
         except httpx.ConnectError as exc:
             raise ValueError("Could not connect to Brave Search API.") from exc
@@ -580,19 +612,13 @@ class GovernedFetchProvider:
         timeout: int,
         allowed_domains: Sequence[str],
     ) -> WebFetchArtifact:
-        domain = _domain(url)
-        if not allowed_domains:
-            raise ValueError("Domain allowlist not configured — all requests denied by default")
-        if not any(
-            domain == allowed or domain.endswith(f".{allowed}") for allowed in allowed_domains
-        ):
-            raise ValueError(f"Domain '{domain}' is not in the allowlist: {list(allowed_domains)}")
+        domain = _check_allowed_domain(url, allowed_domains)
 
         async def _perform_fetch(_request: ConnectorRequest) -> httpx.Response:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=False) as client:
+            async with pooled_client("tool:web_fetch") as client:
                 if method == "GET":
-                    return await client.get(url, headers=headers)
-                return await client.post(url, headers=headers, content=body)
+                    return await client.get(url, headers=headers, timeout=timeout)
+                return await client.post(url, headers=headers, content=body, timeout=timeout)
 
         boundary_executor = build_connector_boundary_executor(
             default_timeout_seconds=float(timeout),
@@ -611,8 +637,9 @@ class GovernedFetchProvider:
                     metadata={"timeout_seconds": float(timeout)},
                 )
                 response = await boundary_executor.execute(req, _perform_fetch)
-            response.raise_for_status()
-            if 300 <= response.status_code < 400:
+            if response.status_code != 304:
+                response.raise_for_status()
+            if 300 <= response.status_code < 400 and response.status_code != 304:
                 raise ValueError("Redirect responses are blocked by policy")
             if len(response.content) > _MAX_FETCH_BYTES:
                 raise ValueError(
@@ -653,7 +680,74 @@ class GovernedFetchProvider:
             trust_level=ResearchTrustLevel.FETCH_VERIFIED,
             trust_reason=citation.trust_reason,
             citation=citation,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            cache_control=response.headers.get("cache-control"),
+            vary=response.headers.get("vary"),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Multi-provider rank fusion
+# ---------------------------------------------------------------------------
+
+_RRF_K = 60
+
+
+@dataclass(slots=True)
+class SearchFanOut:
+    """Fused results plus per-provider outcomes from one ``search_all`` call."""
+
+    results: list[WebResearchResult]
+    outcomes: list[ProviderSearchOutcome] = field(default_factory=list)
+
+
+def _normalize_result_url(url: str) -> str:
+    return url.rstrip("/").lower()
+
+
+def fuse_rankings(
+    ranked_lists: Sequence[Sequence[WebResearchResult]],
+    *,
+    limit: int,
+    k: int = _RRF_K,
+) -> list[WebResearchResult]:
+    """Merge per-provider rankings with reciprocal rank fusion.
+
+    Each URL scores ``sum(1 / (k + position))`` over the providers that
+    returned it, so results several providers agree on rise above any single
+    provider's top hit.  The representative result comes from the first list
+    that contained the URL; ties keep that provider order.
+    """
+    scores: dict[str, float] = {}
+    representatives: dict[str, WebResearchResult] = {}
+    providers: dict[str, list[str]] = {}
+    for results in ranked_lists:
+        seen_in_list: set[str] = set()
+        for position, result in enumerate(results, start=1):
+            key = _normalize_result_url(result.url)
+            if key in seen_in_list:
+                continue
+            seen_in_list.add(key)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + position)
+            representatives.setdefault(key, result)
+            providers.setdefault(key, [])
+            if result.provider_id not in providers[key]:
+                providers[key].append(result.provider_id)
+
+    # dicts keep first-seen order, and sorted() is stable, so equal scores
+    # stay in provider order.
+    ordered = sorted(scores, key=lambda key: scores[key], reverse=True)[:limit]
+    return [
+        representatives[key].model_copy(
+            update={
+                "rank": rank,
+                "fused_score": round(scores[key], 6),
+                "providers": providers[key],
+            }
         )
+        for rank, key in enumerate(ordered, start=1)
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -668,9 +762,10 @@ class SearchProviderRegistry:
     DuckDuckGo is always available as a zero-config fallback.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, metrics: MetricsCollector | None = None) -> None:
         self._providers: dict[str, SearchProvider] = {}
         self._default_provider_id: str = "duckduckgo"
+        self._metrics = metrics
 
     def register(self, provider: SearchProvider) -> None:
         """Register a search provider."""
@@ -733,36 +828,155 @@ class SearchProviderRegistry:
         *,
         limit: int = 10,
         categories: str = "general",
+        quorum: int | None = None,
+        provider_timeout_seconds: float | None = None,
+        deadline_seconds: float | None = None,
     ) -> list[WebResearchResult]:
-        """Query all configured providers and aggregate + deduplicate results.
+        """Query all configured providers concurrently and fuse their rankings.
 
-        Results are deduplicated by URL, keeping the first occurrence (from
-        the provider encountered first). Trust labels are applied during
-        result construction.
+        See :meth:`search_fan_out` for the deadline and quorum semantics.
         """
-        all_results: list[WebResearchResult] = []
-        seen_urls: set[str] = set()
+        fan_out = await self.search_fan_out(
+            query,
+            limit=limit,
+            categories=categories,
+            quorum=quorum,
+            provider_timeout_seconds=provider_timeout_seconds,
+            deadline_seconds=deadline_seconds,
+        )
+        return fan_out.results
 
-        for provider in self._providers.values():
-            diag = provider.diagnostics()
-            if not diag.configured:
-                continue
-            try:
-                results = await provider.search(query, limit=limit, categories=categories)
-                for r in results:
-                    normalized_url = r.url.rstrip("/").lower()
-                    if normalized_url not in seen_urls:
-                        seen_urls.add(normalized_url)
-                        all_results.append(r)
-            except Exception:
-                logger.warning(
-                    "Provider '%s' failed during search_all",
-                    provider.provider_id,
-                    exc_info=True,
+    async def search_fan_out(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        categories: str = "general",
+        quorum: int | None = None,
+        provider_timeout_seconds: float | None = None,
+        deadline_seconds: float | None = None,
+    ) -> SearchFanOut:
+        """Fan a query out to every configured provider at once.
+
+        Each provider gets its own ``provider_timeout_seconds`` budget and the
+        whole call is bounded by ``deadline_seconds``.  With ``quorum=N`` the
+        call returns as soon as N providers have answered successfully and
+        cancels the stragglers.  Failed, timed-out and cancelled providers are
+        skipped; their outcome is reported alongside the fused results.
+        """
+        per_provider = (
+            provider_timeout_seconds
+            if provider_timeout_seconds is not None
+            else settings.web_search_provider_timeout_seconds
+        )
+        deadline = (
+            deadline_seconds
+            if deadline_seconds is not None
+            else settings.web_search_all_deadline_seconds
+        )
+        wanted = quorum if quorum is not None else settings.web_search_all_quorum
+
+        providers = [p for p in self._providers.values() if p.diagnostics().configured]
+        outcomes: dict[str, ProviderSearchOutcome] = {}
+        answered: dict[str, list[WebResearchResult]] = {}
+        if not providers:
+            return SearchFanOut(results=[], outcomes=[])
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tasks: dict[asyncio.Task[list[WebResearchResult]], SearchProvider] = {
+            asyncio.create_task(
+                asyncio.wait_for(
+                    provider.search(query, limit=limit, categories=categories),
+                    timeout=per_provider,
                 )
-                continue
+            ): provider
+            for provider in providers
+        }
+        pending: set[asyncio.Task[list[WebResearchResult]]] = set(tasks)
+        straggler_status = "timeout"
+        try:
+            while pending:
+                remaining = deadline - (loop.time() - started)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider = tasks[task]
+                    outcome = self._record_outcome(provider.provider_id, task, started, loop)
+                    outcomes[provider.provider_id] = outcome
+                    if outcome.status == "ok":
+                        answered[provider.provider_id] = task.result()
+                if wanted > 0 and len(answered) >= wanted:
+                    straggler_status = "cancelled"
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in pending:
+                    provider = tasks[task]
+                    outcomes[provider.provider_id] = self._observe(
+                        provider.provider_id,
+                        straggler_status,
+                        loop.time() - started,
+                        error="deadline exceeded" if straggler_status == "timeout" else "",
+                    )
+
+        ordered = [p.provider_id for p in providers if p.provider_id in answered]
+        return SearchFanOut(
+            results=fuse_rankings([answered[pid] for pid in ordered], limit=limit),
+            outcomes=[outcomes[p.provider_id] for p in providers if p.provider_id in outcomes],
+        )
+
+    def _record_outcome(
+        self,
+        provider_id: str,
+        task: asyncio.Task[list[WebResearchResult]],
+        started: float,
+        loop: asyncio.AbstractEventLoop,
+    ) -> ProviderSearchOutcome:
+        elapsed = loop.time() - started
+        if task.cancelled():
+            return self._observe(provider_id, "cancelled", elapsed)
+        exc = task.exception()
+        if exc is None:
+            return self._observe(provider_id, "ok", elapsed, result_count=len(task.result()))
+        if isinstance(exc, TimeoutError):
+            logger.warning("Provider '%s' timed out during search_all", provider_id)
+            return self._observe(provider_id, "timeout", elapsed, error="timed out")
+        logger.warning(
+            "Provider '%s' failed during search_all",
+            provider_id,
+            exc_info=exc,
+        )
+        return self._observe(provider_id, "error", elapsed, error=str(exc))
 
-        return all_results
+    def _observe(
+        self,
+        provider_id: str,
+        status: str,
+        elapsed_seconds: float,
+        *,
+        result_count: int = 0,
+        error: str = "",
+    ) -> ProviderSearchOutcome:
+        if self._metrics is not None:
+            self._metrics.observe(
+                "web_search_provider_duration_seconds",
+                elapsed_seconds,
+                {"provider": provider_id, "outcome": status},
+            )
+        return ProviderSearchOutcome(
+            provider_id=provider_id,
+            status=status,
+            latency_ms=round(elapsed_seconds * 1000, 3),
+            result_count=result_count,
+            error=error,
+        )
 
     def get_trust_domain_entries(self) -> list[TrustedDomainEntry]:
         """Return the domain trust heuristic patterns for API exposure."""
@@ -794,7 +1008,10 @@ class SearchProviderRegistry:
         return entries
 
 
-def create_search_provider_registry() -> SearchProviderRegistry:
+def create_search_provider_registry(
+    *,
+    metrics: MetricsCollector | None = None,
+) -> SearchProviderRegistry:
     """Build and populate a SearchProviderRegistry from current settings.
 
     Providers are registered based on configuration:
@@ -810,7 +1027,7 @@ def create_search_provider_registry() -> SearchProviderRegistry:
     4. SearXNG, if configured
     5. DuckDuckGo (always available)
     """
-    registry = SearchProviderRegistry()
+    registry = SearchProviderRegistry(metrics=metrics)
 
     # Always register DuckDuckGo as the free fallback
     registry.register(DuckDuckGoSearchProvider())
@@ -860,17 +1077,28 @@ class WebResearchService:
         default_search_provider: str,
         default_fetch_provider: str,
         search_registry: SearchProviderRegistry | None = None,
+        cache: WebResearchCache | None = None,
+        metrics: MetricsCollector | None = None,
     ) -> None:
         self._search_providers = {provider.provider_id: provider for provider in search_providers}
         self._fetch_providers = {provider.provider_id: provider for provider in fetch_providers}
         self._default_search_provider = default_search_provider
         self._default_fetch_provider = default_fetch_provider
         self._search_registry = search_registry
+        self._cache = cache
+        self._metrics = metrics
+        self._calls: dict[str, int] = {}
+        self._failures: dict[str, int] = {}
 
     @property
     def search_registry(self) -> SearchProviderRegistry | None:
         return self._search_registry
 
+    @property
+    def cache(self) -> WebResearchCache | None:
+        """The explicit cache, else the process-wide one installed at startup."""
+        return self._cache if self._cache is not None else get_web_research_cache()
+
     def list_providers(self) -> list[ResearchProviderStatus]:
         providers = [provider.diagnostics() for provider in self._search_providers.values()]
         providers.extend(provider.diagnostics() for provider in self._fetch_providers.values())
@@ -878,20 +1106,51 @@ class WebResearchService:
 
     def provider_status_summary(self) -> list[ProviderStatusInfo]:
         """Build a dashboard-friendly health summary for each provider."""
+        cache = self.cache
         summaries: list[ProviderStatusInfo] = []
         for diag in self.list_providers():
+            calls = self._calls.get(diag.provider_id, 0)
+            failures = self._failures.get(diag.provider_id, 0)
+            cache_stats = cache.provider_stats(diag.provider_id) if cache is not None else {}
             summaries.append(
                 ProviderStatusInfo(
                     name=diag.display_name,
                     enabled=diag.configured,
                     status=diag.status,
                     last_check=None,
-                    total_calls=0,
-                    success_rate=1.0,
+                    total_calls=calls,
+                    success_rate=(calls - failures) / calls if calls else 1.0,
+                    cache_hits=int(cache_stats.get("hits", 0)),
+                    cache_misses=int(cache_stats.get("misses", 0)),
+                    cache_revalidations=int(cache_stats.get("revalidations", 0)),
+                    cache_hit_rate=float(cache_stats.get("hit_rate", 0.0)),
                 )
             )
         return summaries
 
+    async def _tracked(
+        self, provider_id: str, call: Awaitable[_T], *, metric: str | None = None
+    ) -> _T:
+        self._calls[provider_id] = self._calls.get(provider_id, 0) + 1
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call
+            outcome = "ok"
+            return result
+        except Exception as exc:
+            self._failures[provider_id] = self._failures.get(provider_id, 0) + 1
+            if isinstance(exc, TimeoutError):
+                outcome = "timeout"
+            raise
+        finally:
+            if metric is not None and self._metrics is not None:
+                self._metrics.observe(
+                    metric,
+                    time.perf_counter() - started,
+                    {"provider": provider_id, "outcome": outcome},
+                )
+
     async def search(
         self,
         query: str,
@@ -899,17 +1158,52 @@ class WebResearchService:
         provider_id: str | None = None,
         limit: int = 10,
         categories: str = "general",
+        tenant_id: str = "",
     ) -> ResearchSearchResponse:
         resolved_provider_id = provider_id or self._default_search_provider
         provider = self._search_providers.get(resolved_provider_id)
         if provider is None:
             raise ValueError(f"Unknown research search provider '{resolved_provider_id}'")
-        results = await provider.search(query, limit=limit, categories=categories)
-        return ResearchSearchResponse(
+
+        cache = self.cache
+        cache_key: str | None = None
+        if cache is not None:
+            cache_key = cache.search_key(
+                query,
+                provider_id=resolved_provider_id,
+                limit=limit,
+                categories=categories,
+                tenant_id=tenant_id,
+            )
+            entry = await cache.get(cache_key)
+            if entry is not None and entry.is_fresh(time.time()):
+                cache.record_hit(resolved_provider_id)
+                cached = ResearchSearchResponse.model_validate(entry.payload)
+                return cached.model_copy(update={"query": query, "cached": True})
+            cache.record_miss(resolved_provider_id)
+
+        results = await self._tracked(
+            resolved_provider_id,
+            provider.search(query, limit=limit, categories=categories),
+            metric="web_search_provider_duration_seconds",
+        )
+        response = ResearchSearchResponse(
             query=query,
             provider_id=resolved_provider_id,
             results=results,
         )
+        if cache is not None and cache_key is not None:
+            now = time.time()
+            await cache.put(
+                cache_key,
+                CachedResult(
+                    payload=response.model_dump(mode="json"),
+                    stored_at=now,
+                    expires_at=now + cache.search_ttl_seconds,
+                ),
+            )
+            cache.record_store(resolved_provider_id)
+        return response
 
     async def fetch(
         self,
@@ -921,24 +1215,136 @@ class WebResearchService:
         body: str | None = None,
         method: str = "GET",
         timeout: int = int(_FETCH_TIMEOUT_SECONDS),
+        tenant_id: str = "",
     ) -> WebFetchArtifact:
         resolved_provider_id = provider_id or self._default_fetch_provider
         provider = self._fetch_providers.get(resolved_provider_id)
         if provider is None:
             raise ValueError(f"Unknown research fetch provider '{resolved_provider_id}'")
-        return await provider.fetch(
-            url,
-            headers=headers or {},
-            body=body,
-            method=method,
-            timeout=timeout,
-            allowed_domains=allowed_domains,
+        request_headers = dict(headers or {})
+
+        cache = self.cache
+        if cache is None or method != "GET" or body is not None:
+            artifact = await self._tracked(
+                resolved_provider_id,
+                provider.fetch(
+                    url,
+                    headers=request_headers,
+                    body=body,
+                    method=method,
+                    timeout=timeout,
+                    allowed_domains=allowed_domains,
+                ),
+            )
+            if cache is not None:
+                artifact = artifact.model_copy(update={"cache_status": "bypass"})
+            return artifact
+
+        # Requests with caller-identifying headers never share entries; otherwise
+        # check the shared key first and then the tenant key used for
+        # ``private`` responses.  Both keys include the request headers.
+        credentialed = has_credentials(request_headers)
+        candidates = [
+            cache.fetch_key(url, headers=request_headers, tenant_id=tenant_id, tenant_scoped=True)
+        ]
+        if not credentialed:
+            candidates.insert(
+                0, cache.fetch_key(url, headers=request_headers, tenant_id=tenant_id)
+            )
+        entry: CachedResult | None = None
+        entry_key = candidates[0]
+        for candidate in dict.fromkeys(candidates):
+            entry = await cache.get(candidate)
+            if entry is not None:
+                entry_key = candidate
+                break
+
+        if entry is not None and entry.is_fresh(time.time()):
+            # Re-check the allowlist: cached entries may come from a caller
+            # with a broader allowlist.
+            _check_allowed_domain(url, allowed_domains)
+            cache.record_hit(resolved_provider_id)
+            return WebFetchArtifact.model_validate(entry.payload).model_copy(
+                update={"cache_status": "hit"}
+            )
+
+        caller_conditional = any(
+            name.lower() in ("if-none-match", "if-modified-since") for name in request_headers
         )
+        if entry is not None and entry.has_validators and not caller_conditional:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        artifact = await self._tracked(
+            resolved_provider_id,
+            provider.fetch(
+                url,
+                headers=request_headers,
+                body=body,
+                method=method,
+                timeout=timeout,
+                allowed_domains=allowed_domains,
+            ),
+        )
+        now = time.time()
+
+        if artifact.status_code == 304 and entry is not None and not caller_conditional:
+            cached_artifact = WebFetchArtifact.model_validate(entry.payload)
+            policy = fetch_cache_policy(
+                artifact.cache_control or cached_artifact.cache_control,
+                default_ttl_seconds=cache.fetch_ttl_seconds,
+                max_ttl_seconds=cache.max_ttl_seconds,
+            )
+            await cache.put(
+                entry_key,
+                CachedResult(
+                    payload=entry.payload,
+                    stored_at=now,
+                    expires_at=now + policy.ttl_seconds,
+                    etag=artifact.etag or entry.etag,
+                    last_modified=artifact.last_modified or entry.last_modified,
+                ),
+            )
+            cache.record_revalidation(resolved_provider_id)
+            return cached_artifact.model_copy(update={"cache_status": "revalidated"})
+
+        cache.record_miss(resolved_provider_id)
+        if artifact.status_code == 200:
+            policy = fetch_cache_policy(
+                artifact.cache_control,
+                default_ttl_seconds=cache.fetch_ttl_seconds,
+                max_ttl_seconds=cache.max_ttl_seconds,
+                vary=artifact.vary,
+            )
+            validators = bool(artifact.etag or artifact.last_modified)
+            if policy.store and (policy.ttl_seconds > 0 or validators):
+                store_key = cache.fetch_key(
+                    url,
+                    headers=request_headers,
+                    tenant_id=tenant_id,
+                    tenant_scoped=credentialed or policy.tenant_scoped,
+                )
+                await cache.put(
+                    store_key,
+                    CachedResult(
+                        payload=artifact.model_dump(mode="json"),
+                        stored_at=now,
+                        expires_at=now + policy.ttl_seconds,
+                        etag=artifact.etag,
+                        last_modified=artifact.last_modified,
+                    ),
+                )
+                cache.record_store(resolved_provider_id)
+        return artifact.model_copy(update={"cache_status": "miss"})
 
 
 def create_default_web_research_service(
     *,
     search_registry: SearchProviderRegistry | None = None,
+    cache: WebResearchCache | None = None,
+    metrics: MetricsCollector | None = None,
 ) -> WebResearchService:
     """Create the default Track 7 research service graph.
 
@@ -961,4 +1367,6 @@ def create_default_web_research_service(
         default_search_provider=default_search,
         default_fetch_provider="web_fetch",
         search_registry=search_registry,
+        cache=cache,
+        metrics=metrics,
     )
@@ -13,6 +13,7 @@ from agent33.connectors.boundary import (
     build_connector_boundary_executor,
     map_connector_exception,
 )
+from agent33.connectors.http_pool import pooled_client
 from agent33.connectors.models import ConnectorRequest
 
 logger = structlog.get_logger()
@@ -30,7 +31,12 @@ _BLOCKED_NETWORKS = [
 ]
 
 
-def _is_private_url(url: str) -> bool:
+def is_blocked_address(addr: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    """Return True if *addr* is unspecified or in a private/reserved range."""
+    return addr.is_unspecified or any(addr in net for net in _BLOCKED_NETWORKS)
+
+
+def is_private_url(url: str) -> bool:
     """Return True if the URL targets a private/reserved IP range."""
     parsed = urlparse(url)
     hostname = parsed.hostname
@@ -38,7 +44,7 @@ def _is_private_url(url: str) -> bool:
         return False
     try:
         addr = ipaddress.ip_address(hostname)
-        return any(addr in net for net in _BLOCKED_NETWORKS)
+        return is_blocked_address(addr)
     except ValueError:
         # Not an IP literal — allow DNS names (could still resolve
         # to private IPs but DNS resolution happens at the HTTP
@@ -82,7 +88,7 @@ async def execute(
     if not url:
         raise ValueError("http-request action requires a 'url' field")
 
-    if _is_private_url(url):
+    if is_private_url(url):
         raise ValueError(
             f"SSRF protection: requests to private/reserved addresses are blocked ({url})"
         )
@@ -139,11 +145,8 @@ async def _perform_request(
     timeout_seconds: int,
 ) -> dict[str, Any]:
     try:
-        async with httpx.AsyncClient(
-            timeout=timeout_seconds,
-            follow_redirects=False,
-        ) as client:
-            kwargs: dict[str, Any] = {"headers": headers or {}}
+        async with pooled_client("workflow:http_request") as client:
+            kwargs: dict[str, Any] = {"headers": headers or {}, "timeout": timeout_seconds}
             if body is not None:
                 if isinstance(body, (dict, list)):
                     kwargs["json"] = body
@@ -5,12 +5,14 @@ from __future__ import annotations
 import asyncio
 import inspect
 import time
+import uuid
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any
 
 import structlog
 from pydantic import BaseModel, Field
 
+from agent33.observability.sampling_profiler import profiled
 from agent33.workflows.actions import (
     conditional,
     execute_code,
@@ -38,6 +40,7 @@ if TYPE_CHECKING:
     from collections.abc import Callable
 
     from agent33.workflows.events import WorkflowEvent
+    from agent33.workflows.step_workers import StepDispatcher
 
 logger = structlog.get_logger()
 
@@ -87,6 +90,7 @@ class WorkflowExecutor:
         model_router: Any | None = None,
         run_id: str | None = None,
         event_sink: Callable[[WorkflowEvent], Any] | None = None,
+        step_dispatcher: StepDispatcher | None = None,
     ) -> None:
         self._definition = definition
         self._evaluator = ExpressionEvaluator()
@@ -96,8 +100,13 @@ class WorkflowExecutor:
         self._agent_registry = agent_registry
         self._model_router = model_router
         self._run_id = run_id or definition.name
+        # Scopes remote step outcomes to one execution of this run id.
+        self._run_nonce = uuid.uuid4().hex
         self._event_sink = event_sink
         self._schema_version = resolve_active_schema_version()
+        # Ready DAG steps go to shared step workers when a dispatcher is set.
+        self._step_dispatcher = step_dispatcher
+        self._definition_payload: dict[str, Any] | None = None
 
     async def _emit_event(
         self,
@@ -124,6 +133,7 @@ class WorkflowExecutor:
         if inspect.isawaitable(result):
             await result
 
+    @profiled("workflow", "_definition.name")
     async def execute(self, inputs: dict[str, Any] | None = None) -> WorkflowResult:
         """Execute the workflow with the given inputs.
 
@@ -134,6 +144,7 @@ class WorkflowExecutor:
             A WorkflowResult with outputs, executed steps, duration, and status.
         """
         start = time.monotonic()
+        self._run_nonce = uuid.uuid4().hex
         state: dict[str, Any] = dict(inputs or {})
         step_results: list[StepResult] = []
         steps_executed: list[str] = []
@@ -170,7 +181,7 @@ class WorkflowExecutor:
                 for group in groups:
                     if len(group) == 1:
                         for sid in group:
-                            result = await self._execute_step(
+                            result = await self._run_step(
                                 self._steps[sid], state, execution.dry_run
                             )
                             step_results.append(result)
@@ -192,7 +203,7 @@ class WorkflowExecutor:
                             semaphore: asyncio.Semaphore = _sem,
                         ) -> StepResult:
                             async with semaphore:
-                                return await self._execute_step(
+                                return await self._run_step(
                                     self._steps[sid], state, execution.dry_run
                                 )
 
@@ -274,6 +285,51 @@ class WorkflowExecutor:
             status=status,
         )
 
+    async def run_step_locally(
+        self,
+        step_id: str,
+        state: dict[str, Any],
+        *,
+        dry_run: bool = False,
+    ) -> StepResult:
+        """Execute one step of this workflow in-process against *state*.
+
+        Used by step workers; sub-step outputs are written into *state*.
+        """
+        return await self._execute_step(self._steps[step_id], state, dry_run)
+
+    async def _run_step(
+        self,
+        step: WorkflowStep,
+        state: dict[str, Any],
+        dry_run: bool,
+    ) -> StepResult:
+        """Execute *step* locally, or on a step worker when distributed."""
+        if self._step_dispatcher is None:
+            return await self._execute_step(step, state, dry_run)
+
+        from agent33.workflows.step_queue import StepTask
+
+        if self._definition_payload is None:
+            self._definition_payload = self._definition.model_dump(mode="json")
+        outcome = await self._step_dispatcher.dispatch(
+            StepTask(
+                run_id=self._run_id,
+                step_id=step.id,
+                definition=self._definition_payload,
+                state=dict(state),
+                dry_run=dry_run,
+                tenant_id=self._tenant_id,
+                run_nonce=self._run_nonce,
+            )
+        )
+        for record in outcome.events:
+            await self._emit_event(
+                record["type"], step_id=record.get("step_id"), data=record.get("data")
+            )
+        state.update(outcome.state_updates)
+        return StepResult.model_validate(outcome.result)
+
     async def _execute_step(
         self,
         step: WorkflowStep,
@@ -1,31 +1,88 @@
-"""File-backed archive helpers for durable workflow run inspection."""
+"""File-backed archive helpers for durable workflow run inspection.
+
+Writes can run in two modes.  Until :meth:`WorkflowRunArchiveService.start_writer`
+is awaited every call writes synchronously (the historical behaviour).  Once the
+writer is running, :meth:`~WorkflowRunArchiveService.submit_event` only queues the
+normalized event in memory and a dedicated writer task batches appends per run on
+a single I/O thread, updating ``run.json`` once per batch and fsyncing on a
+configurable cadence.  Reads merge queued events so callers always observe their
+own writes.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import mimetypes
+import os
 import re
 import shutil
+import threading
 import time
 from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, TypeGuard
+from typing import Any, TextIO, TypeGuard
+
+import structlog
 
 from agent33.workflows.events import WorkflowEvent
 from agent33.workflows.executor import WorkflowResult
 from agent33.workflows.history import WorkflowExecutionRecord, normalize_execution_record
 
+logger = structlog.get_logger()
+
 _RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
 _SAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+_MAX_KNOWN_RUNS = 4096
 
 
 class WorkflowRunArchiveService:
     """Persist per-run workflow metadata, events, results, and artifacts."""
 
-    def __init__(self, base_path: str | Path, *, preview_chars: int = 400) -> None:
+    def __init__(
+        self,
+        base_path: str | Path,
+        *,
+        preview_chars: int = 400,
+        batch_interval_seconds: float = 0.05,
+        fsync_interval_seconds: float | None = 1.0,
+        artifact_workers: int = 2,
+    ) -> None:
         self._base_path = Path(base_path)
         self._preview_chars = max(0, preview_chars)
         self._base_path.mkdir(parents=True, exist_ok=True)
+        self._batch_interval_seconds = max(0.0, batch_interval_seconds)
+        self._fsync_interval_seconds = fsync_interval_seconds
+        self._artifact_workers = max(1, artifact_workers)
+        # Guards run.json read-modify-write cycles and event-log appends.  The
+        # writer releases it before fsyncing, so readers never wait on a flush.
+        self._io_lock = threading.RLock()
+        # Guards only the queued-event buffer; never held across file I/O.
+        # Lock order is ``_io_lock`` then ``_queue_lock``.
+        self._queue_lock = threading.Lock()
+        self._unwritten: dict[str, list[dict[str, Any]]] = {}
+        # Runs whose run.json is known to exist, so submit_event can reject
+        # unknown runs without a stat per event; guarded by ``_queue_lock``.
+        self._known_runs: set[str] = set()
+        self._last_fsync: dict[str, float] = {}
+        # run_id -> monotonic time of the oldest appended but not yet fsynced
+        # batch; guarded by ``_queue_lock``.
+        self._unsynced: dict[str, float] = {}
+        self._writer_task: asyncio.Task[None] | None = None
+        self._writer_wake: asyncio.Event | None = None
+        self._writer_stop: asyncio.Event | None = None
+        self._writer_closing = False
+        self._io_executor: ThreadPoolExecutor | None = None
+        self._artifact_executor: ThreadPoolExecutor | None = None
+        self._writer_stats = {
+            "batches": 0,
+            "events_written": 0,
+            "events_dropped": 0,
+            "max_batch": 0,
+            "fsyncs": 0,
+        }
 
     @property
     def base_path(self) -> Path:
@@ -89,34 +146,132 @@ class WorkflowRunArchiveService:
         self._write_json_atomic(self._run_path(safe_run_id), payload)
         self._events_path(safe_run_id).touch(exist_ok=True)
         self._write_json_atomic(self._artifacts_manifest_path(safe_run_id), [])
+        self._remember_run(safe_run_id)
         return dict(payload)
 
     def has_run(self, run_id: str) -> bool:
         """Return ``True`` when archive metadata exists for ``run_id``."""
         return self._run_path(run_id).is_file()
 
+    @property
+    def writer_running(self) -> bool:
+        """Return ``True`` while the background batch writer is active."""
+        return self._writer_task is not None and not self._writer_task.done()
+
+    async def start_writer(self) -> None:
+        """Start the background writer task that batches event appends."""
+        if self.writer_running:
+            return
+        self._writer_closing = False
+        self._writer_wake = asyncio.Event()
+        self._writer_stop = asyncio.Event()
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="workflow-archive-io"
+        )
+        self._artifact_executor = ThreadPoolExecutor(
+            max_workers=self._artifact_workers,
+            thread_name_prefix="workflow-archive-artifacts",
+        )
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def aclose(self) -> None:
+        """Drain queued events and stop the background writer."""
+        if self._writer_task is not None:
+            self._writer_closing = True
+            if self._writer_wake is not None:
+                self._writer_wake.set()
+            if self._writer_stop is not None:
+                self._writer_stop.set()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+        # Anything left over (e.g. writer crashed) is written synchronously.
+        self._drain_unwritten(force_fsync=True)
+        for executor in (self._io_executor, self._artifact_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._io_executor = None
+        self._artifact_executor = None
+
+    async def flush(self) -> None:
+        """Write all queued events now and wait for completion."""
+        if self._io_executor is None:
+            self._drain_unwritten(force_fsync=True)
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._io_executor, self._drain_unwritten, True)
+
+    def writer_stats(self) -> dict[str, Any]:
+        """Return batch writer counters for diagnostics."""
+        with self._queue_lock:
+            pending = sum(len(events) for events in self._unwritten.values())
+        return {**self._writer_stats, "pending_events": pending, "running": self.writer_running}
+
+    def submit_event(
+        self,
+        run_id: str,
+        event: WorkflowEvent | Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Queue one event for the batch writer (or append it inline when stopped).
+
+        Queuing performs no file I/O for runs this service has seen and only
+        takes the short queue lock, never the lock the writer holds across
+        appends, so it is safe to call from the event loop.  Like
+        :meth:`append_event`, it raises ``FileNotFoundError`` for unknown runs.
+        """
+        if not self.writer_running:
+            return self.append_event(run_id, event)
+        safe_run_id = self._validate_run_id(run_id)
+        with self._queue_lock:
+            known = safe_run_id in self._known_runs
+        if not known:
+            if not self.has_run(safe_run_id):
+                raise FileNotFoundError(f"Workflow archive not found for run_id={run_id!r}")
+            self._remember_run(safe_run_id)
+        event_payload = self._normalize_event(safe_run_id, event, workflow_name="")
+        with self._queue_lock:
+            self._unwritten.setdefault(safe_run_id, []).append(event_payload)
+        assert self._writer_wake is not None
+        self._writer_wake.set()
+        return event_payload
+
     def append_event(
         self,
         run_id: str,
         event: WorkflowEvent | Mapping[str, Any],
     ) -> dict[str, Any]:
         """Append one serialized event to the run event log."""
-        run_payload = self._load_required_run(run_id)
-        event_payload = self._normalize_event(
-            run_id,
-            event,
-            workflow_name=str(run_payload.get("workflow_name", "")),
-        )
+        with self._io_lock:
+            run_payload = self._load_required_run(run_id)
+            event_payload = self._normalize_event(
+                run_id,
+                event,
+                workflow_name=str(run_payload.get("workflow_name", "")),
+            )
 
-        with self._events_path(run_id).open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(event_payload, sort_keys=True))
-            handle.write("\n")
+            with self._events_path(run_id).open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(event_payload, sort_keys=True))
+                handle.write("\n")
 
-        run_payload["event_count"] = int(run_payload.get("event_count", 0)) + 1
-        run_payload["updated_at"] = time.time()
-        self._write_json_atomic(self._run_path(run_id), run_payload)
+            run_payload["event_count"] = int(run_payload.get("event_count", 0)) + 1
+            run_payload["updated_at"] = time.time()
+            self._write_json_atomic(self._run_path(run_id), run_payload)
         return event_payload
 
+    async def record_result_async(
+        self,
+        run_id: str,
+        result: WorkflowResult | Mapping[str, Any],
+        *,
+        history_record: WorkflowExecutionRecord | Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Run :meth:`record_result` (including artifact extraction) off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._artifact_executor,
+            lambda: self.record_result(run_id, result, history_record=history_record),
+        )
+
     def record_result(
         self,
         run_id: str,
@@ -125,7 +280,7 @@ class WorkflowRunArchiveService:
         history_record: WorkflowExecutionRecord | Mapping[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Persist the final workflow result, history record, and artifacts."""
-        run_payload = self._load_required_run(run_id)
+        self._load_required_run(run_id)
         result_payload = self._normalize_result(result)
         self._write_json_atomic(self._result_path(run_id), result_payload)
 
@@ -140,32 +295,43 @@ class WorkflowRunArchiveService:
 
         manifest = self._extract_artifacts(run_id, result_payload)
         completed_at = self._resolve_completed_at(result_payload, normalized_history)
-        run_payload.update(
-            {
-                "status": self._resolve_status(result_payload, normalized_history),
-                "completed_at": completed_at,
-                "updated_at": time.time(),
-                "artifact_count": len(manifest),
-            }
-        )
-        if normalized_history is not None:
-            run_payload["duration_ms"] = normalized_history.get("duration_ms", 0.0)
-            run_payload["error"] = normalized_history.get("error")
-            run_payload["timestamp"] = normalized_history.get("timestamp")
-        elif "duration_ms" in result_payload:
-            run_payload["duration_ms"] = result_payload.get("duration_ms", 0.0)
-            run_payload["error"] = self._extract_result_error(result_payload)
-
-        self._write_json_atomic(self._run_path(run_id), run_payload)
+        with self._io_lock:
+            # Re-read so concurrent batch-writer event counts are not lost.
+            run_payload = self._load_required_run(run_id)
+            run_payload.update(
+                {
+                    "status": self._resolve_status(result_payload, normalized_history),
+                    "completed_at": completed_at,
+                    "updated_at": time.time(),
+                    "artifact_count": len(manifest),
+                }
+            )
+            if normalized_history is not None:
+                run_payload["duration_ms"] = normalized_history.get("duration_ms", 0.0)
+                run_payload["error"] = normalized_history.get("error")
+                run_payload["timestamp"] = normalized_history.get("timestamp")
+            elif "duration_ms" in result_payload:
+                run_payload["duration_ms"] = result_payload.get("duration_ms", 0.0)
+                run_payload["error"] = self._extract_result_error(result_payload)
+
+            self._write_json_atomic(self._run_path(run_id), run_payload)
         return dict(result_payload)
 
     def load_summary(self, run_id: str) -> dict[str, Any] | None:
         """Load the persisted run summary if it exists."""
         path = self._run_path(run_id)
-        if not path.is_file():
-            return None
-        payload = self._load_json_file(path)
-        return dict(payload) if isinstance(payload, Mapping) else None
+        with self._io_lock:
+            if not path.is_file():
+                return None
+            payload = self._load_json_file(path)
+            if not isinstance(payload, Mapping):
+                return None
+            summary = dict(payload)
+            with self._queue_lock:
+                queued = len(self._unwritten.get(str(run_id).strip(), ()))
+        if queued:
+            summary["event_count"] = int(summary.get("event_count", 0)) + queued
+        return summary
 
     def load_detail(self, run_id: str) -> dict[str, Any] | None:
         """Load a full run record with summary, result, events, and artifacts."""
@@ -193,21 +359,32 @@ class WorkflowRunArchiveService:
     ) -> list[dict[str, Any]]:
         """Return archived events for one run with optional pagination."""
         path = self._events_path(run_id)
-        if not path.is_file():
-            return []
-        events: list[dict[str, Any]] = []
-        with path.open("r", encoding="utf-8") as handle:
-            for index, raw_line in enumerate(handle):
-                if index < max(0, offset):
-                    continue
-                line = raw_line.strip()
-                if not line:
-                    continue
-                payload = json.loads(line)
-                if isinstance(payload, Mapping):
-                    events.append(dict(payload))
-                if limit is not None and limit >= 0 and len(events) >= limit:
-                    break
+        with self._io_lock:
+            with self._queue_lock:
+                queued = [dict(item) for item in self._unwritten.get(str(run_id).strip(), ())]
+            if not path.is_file():
+                return []
+            events: list[dict[str, Any]] = []
+            index = -1
+            with path.open("r", encoding="utf-8") as handle:
+                for index, raw_line in enumerate(handle):
+                    if index < max(0, offset):
+                        continue
+                    line = raw_line.strip()
+                    if not line:
+                        continue
+                    payload = json.loads(line)
+                    if isinstance(payload, Mapping):
+                        events.append(dict(payload))
+                    if limit is not None and limit >= 0 and len(events) >= limit:
+                        return events
+        written = index + 1
+        for position, payload in enumerate(queued, start=written):
+            if position < max(0, offset):
+                continue
+            events.append(payload)
+            if limit is not None and limit >= 0 and len(events) >= limit:
+                break
         return events
 
     def read_events(
@@ -243,6 +420,162 @@ class WorkflowRunArchiveService:
         """Compatibility alias for reading one archived artifact."""
         return self.read_artifact(run_id, relative_path)
 
+    async def _writer_loop(self) -> None:
+        assert self._writer_wake is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._writer_wake.wait(), timeout=self._next_sync_in())
+            except TimeoutError:
+                # Idle runs get no batch that would trigger their fsync: sweep
+                # them so the durability window stays bounded.
+                try:
+                    await loop.run_in_executor(self._io_executor, self._sync_overdue, False)
+                except Exception:
+                    logger.warning("workflow_archive_fsync_sweep_failed", exc_info=True)
+                continue
+            self._writer_wake.clear()
+            if self._batch_interval_seconds and not self._writer_closing:
+                # Coalesce bursts of events into one write per run; close() cuts
+                # the window short.
+                assert self._writer_stop is not None
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._writer_stop.wait(), timeout=self._batch_interval_seconds
+                    )
+            try:
+                await loop.run_in_executor(self._io_executor, self._drain_unwritten, False)
+            except Exception:
+                logger.warning("workflow_archive_batch_write_failed", exc_info=True)
+            if self._writer_closing:
+                return
+
+    def _drain_unwritten(self, force_fsync: bool = False) -> None:
+        with self._queue_lock:
+            run_ids = list(self._unwritten)
+        for run_id in run_ids:
+            try:
+                self._write_event_batch(run_id, force_fsync=force_fsync)
+            except Exception:
+                logger.warning("workflow_archive_append_failed", run_id=run_id, exc_info=True)
+        if force_fsync:
+            self._sync_overdue(True)
+
+    def _next_sync_in(self) -> float | None:
+        """Seconds until the oldest unsynced run is due, ``None`` if none is."""
+        interval = self._fsync_interval_seconds
+        with self._queue_lock:
+            if interval is None or not self._unsynced:
+                return None
+            oldest = min(self._unsynced.values())
+        return max(0.0, oldest + interval - time.monotonic())
+
+    def _sync_overdue(self, force: bool = False) -> None:
+        """fsync the event logs of runs whose unsynced writes outlived the interval."""
+        interval = self._fsync_interval_seconds
+        if interval is None:
+            return
+        now = time.monotonic()
+        with self._queue_lock:
+            due = [
+                run_id
+                for run_id, since in self._unsynced.items()
+                if force or now - since >= interval
+            ]
+        for run_id in due:
+            with self._queue_lock:
+                self._unsynced.pop(run_id, None)
+            self._last_fsync[run_id] = time.monotonic()
+            try:
+                with self._events_path(run_id).open("a", encoding="utf-8") as handle:
+                    os.fsync(handle.fileno())
+            except OSError:
+                logger.warning("workflow_archive_fsync_failed", run_id=run_id, exc_info=True)
+                continue
+            self._writer_stats["fsyncs"] += 1
+
+    def _write_event_batch(self, run_id: str, *, force_fsync: bool) -> None:
+        handle: TextIO | None = None
+        try:
+            with self._io_lock:
+                with self._queue_lock:
+                    events = self._unwritten.pop(run_id, [])
+                if not events:
+                    return
+                try:
+                    run_payload = self._load_required_run(run_id)
+                except FileNotFoundError:
+                    # No run.json means the run was never started (or was
+                    # removed); retrying cannot succeed, so drop the batch
+                    # instead of requeueing it on every drain.
+                    self._writer_stats["events_dropped"] += len(events)
+                    logger.warning(
+                        "workflow_archive_events_dropped_unknown_run",
+                        run_id=run_id,
+                        events=len(events),
+                    )
+                    return
+                except Exception:
+                    # Nothing reached the log: put the batch back ahead of
+                    # anything queued since so the next drain retries it in order.
+                    self._requeue(run_id, events)
+                    raise
+                workflow_name = str(run_payload.get("workflow_name", ""))
+                lines: list[str] = []
+                for event_payload in events:
+                    if not event_payload.get("workflow_name"):
+                        event_payload["workflow_name"] = workflow_name
+                    lines.append(json.dumps(event_payload, sort_keys=True))
+                appended = False
+                try:
+                    handle = self._events_path(run_id).open("a", encoding="utf-8")
+                    handle.write("\n".join(lines) + "\n")
+                    handle.flush()
+                    appended = True
+                finally:
+                    if not appended:
+                        self._requeue(run_id, events)
+                run_payload["event_count"] = int(run_payload.get("event_count", 0)) + len(events)
+                run_payload["updated_at"] = time.time()
+                self._write_json_atomic(self._run_path(run_id), run_payload)
+                fsync = self._fsync_due(run_id, force=force_fsync)
+            # fsync outside ``_io_lock`` so readers only ever wait on page-cache
+            # writes, never on the disk flush.
+            if fsync:
+                with self._queue_lock:
+                    self._unsynced.pop(run_id, None)
+                os.fsync(handle.fileno())
+                self._writer_stats["fsyncs"] += 1
+            elif self._fsync_interval_seconds is not None:
+                with self._queue_lock:
+                    self._unsynced.setdefault(run_id, time.monotonic())
+        finally:
+            if handle is not None:
+                handle.close()
+        self._writer_stats["batches"] += 1
+        self._writer_stats["events_written"] += len(events)
+        self._writer_stats["max_batch"] = max(self._writer_stats["max_batch"], len(events))
+
+    def _remember_run(self, run_id: str) -> None:
+        with self._queue_lock:
+            if len(self._known_runs) >= _MAX_KNOWN_RUNS:
+                self._known_runs.clear()
+            self._known_runs.add(run_id)
+
+    def _requeue(self, run_id: str, events: list[dict[str, Any]]) -> None:
+        with self._queue_lock:
+            self._unwritten[run_id] = events + self._unwritten.get(run_id, [])
+
+    def _fsync_due(self, run_id: str, *, force: bool) -> bool:
+        interval = self._fsync_interval_seconds
+        if interval is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_fsync.get(run_id, 0.0) < interval:
+            return False
+        self._last_fsync[run_id] = now
+        return True
+
     def _extract_artifacts(
         self,
         run_id: str,
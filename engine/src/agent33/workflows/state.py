@@ -52,6 +52,9 @@ class WorkflowStateService:
         )
         self._trim_execution_history()
         self._load_state()
+        if state_store is not None:
+            # Pick up workflows and runs recorded on other replicas.
+            state_store.add_listener(namespace, self._load_state)
 
     @property
     def registry(self) -> dict[str, WorkflowDefinition]:
@@ -172,7 +175,7 @@ class WorkflowStateService:
 
         history_payload = payload.get("execution_history")
         if isinstance(history_payload, list):
-            self._execution_history.clear()
+            loaded_history: list[dict[str, Any]] = []
             for entry in history_payload:
                 if not isinstance(entry, Mapping):
                     logger.warning(
@@ -188,7 +191,10 @@ class WorkflowStateService:
                         entry.get("run_id", ""),
                     )
                     continue
-                self._execution_history.append(record.model_dump(mode="json"))
+                loaded_history.append(record.model_dump(mode="json"))
+            # The containers are shared live with callers, so refill them in place.
+            self._execution_history.clear()
+            self._execution_history.extend(loaded_history)
             self._trim_execution_history()
 
     def _normalize_registry_in_place(self) -> dict[str, WorkflowDefinition]:
@@ -0,0 +1,417 @@
+"""Leased step queue for distributed workflow execution.
+
+A coordinator (the replica running :class:`~agent33.workflows.executor.WorkflowExecutor`)
+submits ready steps as :class:`StepTask` entries; step workers on any replica
+claim them under a time-limited lease, execute them and store a
+:class:`StepOutcome`.  A task whose lease runs out (crashed or stalled worker)
+is redelivered to another worker, up to ``max_deliveries`` times.
+
+Outcomes are keyed by tenant, run id, a nonce drawn for each run and step
+id (:attr:`StepTask.key`) and written only once, so a step
+that is redelivered while its first worker is still running still resolves to
+a single result, and a coordinator that resubmits a finished step gets the
+stored outcome back without re-running it.
+
+Two backends share the :class:`StepQueue` protocol: :class:`RedisStepQueue`
+(Redis streams with a consumer group, for multi-replica deployments) and
+:class:`InProcessStepQueue` (single node, lite mode and tests).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_LEASE_SECONDS = 30.0
+_DEFAULT_MAX_DELIVERIES = 3
+_DEFAULT_RESULT_TTL_SECONDS = 86400
+_MAX_LOCAL_OUTCOMES = 10000
+_REDIS_PREFIX = "agent33:steps:"
+
+
+@dataclass(frozen=True, slots=True)
+class StepTask:
+    """One workflow step ready to run, with the state it reads."""
+
+    run_id: str
+    step_id: str
+    definition: dict[str, Any]
+    state: dict[str, Any]
+    dry_run: bool = False
+    tenant_id: str = ""
+    # Drawn per run: run ids are only unique within one coordinator process.
+    run_nonce: str = ""
+
+    @property
+    def key(self) -> str:
+        return f"{self.tenant_id}:{self.run_id}:{self.run_nonce}:{self.step_id}"
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> StepTask:
+        return cls(**json.loads(raw))
+
+
+@dataclass(frozen=True, slots=True)
+class StepOutcome:
+    """Result of a step run remotely, plus what it changed in workflow state.
+
+    ``events`` are the workflow events the worker emitted for the step, as
+    ``{"type", "step_id", "data", "timestamp"}`` dicts, so the coordinator can
+    publish them on the run's own event stream.
+    """
+
+    result: dict[str, Any]
+    state_updates: dict[str, Any] = field(default_factory=dict)
+    events: list[dict[str, Any]] = field(default_factory=list)
+    worker_id: str = ""
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> StepOutcome:
+        return cls(**json.loads(raw))
+
+
+@dataclass(frozen=True, slots=True)
+class StepLease:
+    """A worker's claim on a task, valid until the lease expires."""
+
+    task: StepTask
+    lease_id: str
+    worker_id: str
+    deliveries: int = 1
+
+
+def abandoned_outcome(task: StepTask, deliveries: int) -> StepOutcome:
+    """Outcome recorded for a task whose leases kept expiring."""
+    return StepOutcome(
+        result={
+            "step_id": task.step_id,
+            "status": "failed",
+            "error": f"Step abandoned after {deliveries} expired leases",
+        },
+    )
+
+
+class StepQueue(Protocol):
+    """Protocol shared by the step queue backends."""
+
+    async def submit(self, task: StepTask) -> None:
+        """Enqueue *task* for any worker."""
+        ...
+
+    async def claim(self, worker_id: str, *, block_seconds: float = 1.0) -> StepLease | None:
+        """Lease the next task (an expired lease first), or ``None`` after blocking."""
+        ...
+
+    async def extend(self, lease: StepLease) -> bool:
+        """Renew *lease*; ``False`` when it expired and was handed to another worker."""
+        ...
+
+    async def complete(self, lease: StepLease, outcome: StepOutcome) -> bool:
+        """Store *outcome* unless one exists and retire the task; ``True`` if stored."""
+        ...
+
+    async def get_outcome(self, key: str) -> StepOutcome | None:
+        """Return the stored outcome for a :attr:`StepTask.key` if there is one."""
+        ...
+
+    async def wait_outcome(self, key: str, timeout_seconds: float) -> StepOutcome | None:
+        """Wait up to *timeout_seconds* for the outcome of a :attr:`StepTask.key`."""
+        ...
+
+
+@dataclass(slots=True)
+class _LocalLease:
+    lease_id: str
+    worker_id: str
+    expires_at: float
+
+
+class InProcessStepQueue:
+    """Single-process step queue with the same lease semantics as Redis."""
+
+    def __init__(
+        self,
+        *,
+        lease_seconds: float = _DEFAULT_LEASE_SECONDS,
+        max_deliveries: int = _DEFAULT_MAX_DELIVERIES,
+    ) -> None:
+        self._lease_seconds = lease_seconds
+        self._max_deliveries = max(1, max_deliveries)
+        self._ready: deque[str] = deque()
+        self._tasks: dict[str, StepTask] = {}
+        self._leases: dict[str, _LocalLease] = {}
+        self._deliveries: dict[str, int] = {}
+        self._outcomes: dict[str, StepOutcome] = {}
+        self._done: dict[str, asyncio.Event] = {}
+        self._wakeup = asyncio.Event()
+
+    async def submit(self, task: StepTask) -> None:
+        if task.key in self._outcomes or task.key in self._tasks:
+            return
+        self._tasks[task.key] = task
+        self._ready.append(task.key)
+        self._wakeup.set()
+
+    async def claim(self, worker_id: str, *, block_seconds: float = 1.0) -> StepLease | None:
+        deadline = time.monotonic() + block_seconds
+        while True:
+            lease = self._claim_now(worker_id)
+            if lease is not None:
+                return lease
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            expiries = [lease.expires_at for lease in self._leases.values()]
+            if expiries:
+                remaining = min(remaining, max(0.0, min(expiries) - time.monotonic()) + 0.001)
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+
+    def _claim_now(self, worker_id: str) -> StepLease | None:
+        now = time.monotonic()
+        for key, current in list(self._leases.items()):
+            if current.expires_at > now:
+                continue
+            del self._leases[key]
+            if self._deliveries.get(key, 0) >= self._max_deliveries:
+                abandoned = self._tasks.pop(key)
+                self._store(key, abandoned_outcome(abandoned, self._deliveries[key]))
+                continue
+            self._ready.appendleft(key)
+        while self._ready:
+            key = self._ready.popleft()
+            task = self._tasks.get(key)
+            if task is None:
+                continue
+            deliveries = self._deliveries.get(key, 0) + 1
+            self._deliveries[key] = deliveries
+            lease_id = f"{key}#{deliveries}"
+            self._leases[key] = _LocalLease(lease_id, worker_id, now + self._lease_seconds)
+            return StepLease(task, lease_id, worker_id, deliveries)
+        return None
+
+    async def extend(self, lease: StepLease) -> bool:
+        current = self._leases.get(lease.task.key)
+        if current is None or current.lease_id != lease.lease_id:
+            return False
+        current.expires_at = time.monotonic() + self._lease_seconds
+        return True
+
+    async def complete(self, lease: StepLease, outcome: StepOutcome) -> bool:
+        key = lease.task.key
+        current = self._leases.get(key)
+        if current is not None and current.lease_id == lease.lease_id:
+            del self._leases[key]
+        if key in self._outcomes:
+            return False
+        self._tasks.pop(key, None)
+        self._leases.pop(key, None)
+        self._store(key, outcome)
+        return True
+
+    def _store(self, key: str, outcome: StepOutcome) -> None:
+        self._outcomes[key] = outcome
+        self._deliveries.pop(key, None)
+        self._done.setdefault(key, asyncio.Event()).set()
+        while len(self._outcomes) > _MAX_LOCAL_OUTCOMES:
+            oldest = next(iter(self._outcomes))
+            del self._outcomes[oldest]
+            self._done.pop(oldest, None)
+
+    async def get_outcome(self, key: str) -> StepOutcome | None:
+        return self._outcomes.get(key)
+
+    async def wait_outcome(self, key: str, timeout_seconds: float) -> StepOutcome | None:
+        done = self._done.setdefault(key, asyncio.Event())
+        try:
+            await asyncio.wait_for(done.wait(), timeout=timeout_seconds)
+        except TimeoutError:
+            return None
+        return self._outcomes.get(key)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._tasks)
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RedisStepQueue:
+    """Step queue on a Redis stream consumed by one consumer group.
+
+    Each worker is a consumer.  Pending entries idle for longer than the lease
+    are taken over with ``XAUTOCLAIM``; workers renew their lease by
+    re-claiming their own entry.  Outcomes live in ``SET NX`` keys with a TTL.
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        *,
+        stream: str = f"{_REDIS_PREFIX}tasks",
+        group: str = "agent33-step-workers",
+        lease_seconds: float = _DEFAULT_LEASE_SECONDS,
+        max_deliveries: int = _DEFAULT_MAX_DELIVERIES,
+        result_ttl_seconds: int = _DEFAULT_RESULT_TTL_SECONDS,
+        poll_interval_seconds: float = 0.05,
+    ) -> None:
+        self._redis = redis
+        self._stream = stream
+        self._group = group
+        self._lease_ms = max(1, int(lease_seconds * 1000))
+        self._max_deliveries = max(1, max_deliveries)
+        self._result_ttl = result_ttl_seconds
+        self._poll_interval = poll_interval_seconds
+        self._group_ready = False
+
+    def _result_key(self, key: str) -> str:
+        return f"{_REDIS_PREFIX}result:{key}"
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self._redis.xgroup_create(self._stream, self._group, id="0", mkstream=True)
+        except Exception as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    async def submit(self, task: StepTask) -> None:
+        await self._ensure_group()
+        if await self._redis.exists(self._result_key(task.key)):
+            return
+        await self._redis.xadd(self._stream, {"task": task.to_json()})
+
+    async def claim(self, worker_id: str, *, block_seconds: float = 1.0) -> StepLease | None:
+        await self._ensure_group()
+        cursor = "0-0"
+        while True:
+            reclaimed = await self._redis.xautoclaim(
+                self._stream, self._group, worker_id, self._lease_ms, start_id=cursor, count=1
+            )
+            if not reclaimed:
+                break
+            for entry_id, fields in reclaimed[1]:
+                lease = await self._lease(entry_id, fields, worker_id, redelivered=True)
+                if lease is not None:
+                    return lease
+            cursor = _text(reclaimed[0])
+            if cursor == "0-0":
+                break
+
+        response = await self._redis.xreadgroup(
+            self._group,
+            worker_id,
+            {self._stream: ">"},
+            count=1,
+            block=max(1, int(block_seconds * 1000)),
+        )
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                return await self._lease(entry_id, fields, worker_id, redelivered=False)
+        return None
+
+    async def _lease(
+        self,
+        entry_id: Any,
+        fields: dict[Any, Any] | None,
+        worker_id: str,
+        *,
+        redelivered: bool,
+    ) -> StepLease | None:
+        entry = _text(entry_id)
+        raw = None
+        for name, value in (fields or {}).items():
+            if _text(name) == "task":
+                raw = value
+        if raw is None:
+            await self._retire(entry)
+            return None
+        task = StepTask.from_json(raw)
+        deliveries = 1
+        if redelivered:
+            pending = await self._redis.xpending_range(
+                self._stream, self._group, min=entry, max=entry, count=1
+            )
+            if pending:
+                deliveries = int(pending[0]["times_delivered"])
+            if deliveries > self._max_deliveries:
+                await self._store(task.key, abandoned_outcome(task, deliveries - 1))
+                await self._retire(entry)
+                return None
+        return StepLease(task, entry, worker_id, deliveries)
+
+    async def extend(self, lease: StepLease) -> bool:
+        pending = await self._redis.xpending_range(
+            self._stream, self._group, min=lease.lease_id, max=lease.lease_id, count=1
+        )
+        if not pending or _text(pending[0]["consumer"]) != lease.worker_id:
+            return False
+        await self._redis.xclaim(
+            self._stream, self._group, lease.worker_id, 0, [lease.lease_id], justid=True
+        )
+        return True
+
+    async def complete(self, lease: StepLease, outcome: StepOutcome) -> bool:
+        stored = await self._store(lease.task.key, outcome)
+        await self._retire(lease.lease_id)
+        return stored
+
+    async def _store(self, key: str, outcome: StepOutcome) -> bool:
+        return bool(
+            await self._redis.set(
+                self._result_key(key), outcome.to_json(), nx=True, ex=self._result_ttl
+            )
+        )
+
+    async def _retire(self, entry_id: str) -> None:
+        await self._redis.xack(self._stream, self._group, entry_id)
+        await self._redis.xdel(self._stream, entry_id)
+
+    async def get_outcome(self, key: str) -> StepOutcome | None:
+        raw = await self._redis.get(self._result_key(key))
+        return StepOutcome.from_json(raw) if raw is not None else None
+
+    async def wait_outcome(self, key: str, timeout_seconds: float) -> StepOutcome | None:
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            outcome = await self.get_outcome(key)
+            if outcome is not None or time.monotonic() >= deadline:
+                return outcome
+            await asyncio.sleep(min(self._poll_interval, max(0.0, deadline - time.monotonic())))
+
+
+def create_step_queue(
+    redis: Any | None = None,
+    *,
+    lease_seconds: float = _DEFAULT_LEASE_SECONDS,
+    max_deliveries: int = _DEFAULT_MAX_DELIVERIES,
+    result_ttl_seconds: int = _DEFAULT_RESULT_TTL_SECONDS,
+) -> RedisStepQueue | InProcessStepQueue:
+    """Factory: Redis-backed queue when a client is given, in-process otherwise."""
+    if redis is not None:
+        return RedisStepQueue(
+            redis,
+            lease_seconds=lease_seconds,
+            max_deliveries=max_deliveries,
+            result_ttl_seconds=result_ttl_seconds,
+        )
+    return InProcessStepQueue(lease_seconds=lease_seconds, max_deliveries=max_deliveries)
@@ -0,0 +1,227 @@
+"""Step workers and the coordinator-side dispatcher for distributed workflows.
+
+:class:`StepDispatcher` is handed to
+:class:`~agent33.workflows.executor.WorkflowExecutor`: instead of running a
+ready step in the calling process it submits a
+:class:`~agent33.workflows.step_queue.StepTask` and waits for the outcome.
+
+:class:`StepWorker` runs on every replica (or in dedicated worker processes).
+It claims tasks, rebuilds the workflow definition, runs the step through a
+regular executor with the task's state, and stores the step result together
+with the state entries the step wrote and the events it emitted.  While a
+step runs the worker renews its lease, so only crashed or stalled workers
+lose their tasks to redelivery.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import uuid
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from agent33.workflows.definition import WorkflowDefinition
+from agent33.workflows.step_queue import StepOutcome, StepTask
+
+if TYPE_CHECKING:
+    from agent33.observability.metrics import MetricsCollector
+    from agent33.workflows.events import WorkflowEvent
+    from agent33.workflows.step_queue import StepLease, StepQueue
+
+logger = structlog.get_logger()
+
+_step_dispatcher: StepDispatcher | None = None
+
+
+def configure_step_dispatcher(dispatcher: StepDispatcher | None) -> None:
+    """Install (or clear) the process-wide dispatcher used for workflow runs."""
+    global _step_dispatcher
+    _step_dispatcher = dispatcher
+
+
+def get_step_dispatcher() -> StepDispatcher | None:
+    return _step_dispatcher
+
+
+def event_to_record(event: WorkflowEvent) -> dict[str, Any]:
+    return {
+        "type": event.event_type.value,
+        "step_id": event.step_id,
+        "data": event.data,
+        "timestamp": event.timestamp,
+    }
+
+
+class StepDispatcher:
+    """Submits steps to a :class:`StepQueue` and waits for their outcome."""
+
+    def __init__(
+        self,
+        queue: StepQueue,
+        *,
+        result_timeout_seconds: float = 3600.0,
+    ) -> None:
+        self.queue = queue
+        self._result_timeout = result_timeout_seconds
+
+    async def dispatch(self, task: StepTask) -> StepOutcome:
+        """Run *task* on some worker; an already finished step is not re-run."""
+        outcome = await self.queue.get_outcome(task.key)
+        if outcome is not None:
+            return outcome
+        await self.queue.submit(task)
+        outcome = await self.queue.wait_outcome(task.key, self._result_timeout)
+        if outcome is None:
+            return StepOutcome(
+                result={
+                    "step_id": task.step_id,
+                    "status": "failed",
+                    "error": (
+                        f"No step worker finished the step within {self._result_timeout:g}s"
+                    ),
+                }
+            )
+        return outcome
+
+
+class StepWorker:
+    """Claims and executes workflow steps from a shared queue."""
+
+    def __init__(
+        self,
+        queue: StepQueue,
+        *,
+        worker_id: str | None = None,
+        concurrency: int = 4,
+        lease_seconds: float = 30.0,
+        executor_kwargs: dict[str, Any] | None = None,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self._queue = queue
+        self.worker_id = worker_id or f"worker-{uuid.uuid4().hex[:12]}"
+        self._concurrency = max(1, concurrency)
+        self._renew_interval = max(0.01, lease_seconds / 3)
+        self._executor_kwargs = executor_kwargs or {}
+        self._metrics = metrics
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stopping = False
+        self.executed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._loop(slot), name=f"{self.worker_id}-{slot}")
+            for slot in range(self._concurrency)
+        ]
+        logger.info("step_worker_started", worker_id=self.worker_id, slots=self._concurrency)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def _loop(self, slot: int) -> None:
+        consumer = f"{self.worker_id}-{slot}"
+        while not self._stopping:
+            try:
+                lease = await self._queue.claim(consumer, block_seconds=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("step_worker_claim_failed", worker_id=consumer, exc_info=True)
+                await asyncio.sleep(1.0)
+                continue
+            if lease is None:
+                continue
+            try:
+                await self.handle(lease)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # The lease expires unacknowledged and is redelivered; keep the
+                # slot alive instead of shrinking the worker's concurrency.
+                logger.warning(
+                    "step_worker_handle_failed",
+                    worker_id=consumer,
+                    key=lease.task.key,
+                    exc_info=True,
+                )
+                await asyncio.sleep(1.0)
+
+    async def handle(self, lease: StepLease) -> None:
+        """Execute one leased task and store its outcome."""
+        task = lease.task
+        if await self._queue.get_outcome(task.key) is not None:
+            # Finished by a previous delivery; just retire the entry.
+            await self._queue.complete(lease, StepOutcome(result={}))
+            self._count("duplicate")
+            return
+
+        renew = asyncio.create_task(self._renew(lease))
+        try:
+            outcome = await self._execute(task)
+        except Exception as exc:
+            logger.warning("step_worker_execute_failed", key=task.key, exc_info=True)
+            outcome = StepOutcome(
+                result={"step_id": task.step_id, "status": "failed", "error": str(exc)},
+                worker_id=self.worker_id,
+            )
+        finally:
+            renew.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await renew
+
+        stored = await self._queue.complete(lease, outcome)
+        self.executed += 1
+        if not stored:
+            self._count("duplicate")
+        else:
+            self._count("redelivered" if lease.deliveries > 1 else "executed")
+
+    async def _renew(self, lease: StepLease) -> None:
+        while True:
+            await asyncio.sleep(self._renew_interval)
+            if not await self._queue.extend(lease):
+                logger.warning("step_worker_lease_lost", key=lease.task.key)
+                return
+
+    async def _execute(self, task: StepTask) -> StepOutcome:
+        from agent33.workflows.executor import WorkflowExecutor
+
+        events: list[WorkflowEvent] = []
+        executor = WorkflowExecutor(
+            WorkflowDefinition.model_validate(task.definition),
+            tenant_id=task.tenant_id,
+            run_id=task.run_id,
+            event_sink=events.append,
+            **self._executor_kwargs,
+        )
+        state = dict(task.state)
+        result = await executor.run_step_locally(task.step_id, state, dry_run=task.dry_run)
+        updates = {
+            key: value
+            for key, value in state.items()
+            if key not in task.state or task.state[key] != value
+        }
+        return StepOutcome(
+            result=result.model_dump(mode="json"),
+            state_updates=updates,
+            events=[event_to_record(event) for event in events],
+            worker_id=self.worker_id,
+        )
+
+    def _count(self, outcome: str) -> None:
+        if self._metrics is not None:
+            self._metrics.increment("workflow_distributed_steps_total", {"outcome": outcome})
@@ -0,0 +1,160 @@
+"""Cross-replica fan-out of workflow events over NATS JetStream.
+
+Each event published by :class:`~agent33.workflows.ws_manager.WorkflowWSManager`
+is persisted to the per-run subject ``<subject_prefix>.<run token>`` together
+with the run snapshot it produced.  Every replica subscribes to the whole
+prefix, skips its own messages and hands the rest to
+:meth:`WorkflowWSManager.ingest_remote_event`, which delivers to locally
+connected WebSocket and SSE clients.
+
+The stream keeps the last ``replay_limit`` messages per run, so a replica that
+has never seen a run (a client reconnecting through a different replica)
+rebuilds its snapshot and SSE replay buffer from the stream on first access.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from agent33.workflows.events import WorkflowEvent, WorkflowEventType
+
+if TYPE_CHECKING:
+    from agent33.messaging.bus import NATSMessageBus
+    from agent33.observability.metrics import MetricsCollector
+    from agent33.workflows.ws_manager import WorkflowWSManager
+
+logger = structlog.get_logger()
+
+_SAFE_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+def run_subject_token(run_id: str) -> str:
+    """Return a NATS-safe subject token for *run_id*."""
+    if _SAFE_TOKEN_RE.match(run_id):
+        return run_id
+    return "h" + hashlib.sha256(run_id.encode("utf-8")).hexdigest()[:32]
+
+
+def event_to_payload(event: WorkflowEvent) -> dict[str, Any]:
+    """Serialize *event* including its replay cursor."""
+    payload = event.to_dict()
+    if event.event_id is not None:
+        payload["event_id"] = event.event_id
+    return payload
+
+
+def event_from_payload(payload: dict[str, Any]) -> WorkflowEvent:
+    """Rebuild an event produced by :func:`event_to_payload`."""
+    data = payload.get("data", {})
+    return WorkflowEvent(
+        event_type=WorkflowEventType(str(payload["type"])),
+        run_id=str(payload["run_id"]),
+        workflow_name=str(payload.get("workflow_name", "")),
+        timestamp=float(payload.get("timestamp", 0.0)),
+        step_id=str(payload["step_id"]) if payload.get("step_id") is not None else None,
+        data=data if isinstance(data, dict) else {},
+        event_id=str(payload["event_id"]) if payload.get("event_id") is not None else None,
+        schema_version=int(payload.get("schema_version", 1)),
+    )
+
+
+class WorkflowEventFanout:
+    """Replicates workflow events between manager instances through NATS."""
+
+    def __init__(
+        self,
+        bus: NATSMessageBus,
+        *,
+        instance_id: str,
+        subject_prefix: str = "agent33.workflow.events",
+        stream_name: str = "AGENT33_WORKFLOW_EVENTS",
+        replay_limit: int = 200,
+        max_age_seconds: float = 86400.0,
+        metrics: MetricsCollector | None = None,
+    ) -> None:
+        self._bus = bus
+        self.instance_id = instance_id
+        self._prefix = subject_prefix.rstrip(".")
+        self._stream = stream_name
+        self._replay_limit = max(1, replay_limit)
+        self._max_age_seconds = max_age_seconds
+        self._metrics = metrics
+        self._manager: WorkflowWSManager | None = None
+        self.published = 0
+        self.received = 0
+
+    def subject(self, run_id: str) -> str:
+        return f"{self._prefix}.{run_subject_token(run_id)}"
+
+    async def start(self, manager: WorkflowWSManager) -> None:
+        """Create the shared stream, subscribe, and attach to *manager*."""
+        await self._bus.ensure_stream(
+            self._stream,
+            [f"{self._prefix}.>"],
+            max_msgs_per_subject=self._replay_limit,
+            max_age_seconds=self._max_age_seconds,
+        )
+        await self._bus.subscribe(f"{self._prefix}.>", self._on_message)
+        self._manager = manager
+        manager.set_fanout(self)
+        logger.info(
+            "workflow_event_fanout_started",
+            instance_id=self.instance_id,
+            subject=f"{self._prefix}.>",
+            stream=self._stream,
+        )
+
+    def stop(self) -> None:
+        """Detach from the manager; the bus itself is closed by its owner."""
+        if self._manager is not None:
+            self._manager.set_fanout(None)
+            self._manager = None
+
+    async def publish(self, event: WorkflowEvent, state: dict[str, Any]) -> None:
+        """Persist *event* and the resulting run *state* for other replicas."""
+        await self._bus.stream_publish(
+            self.subject(event.run_id),
+            {
+                "origin": self.instance_id,
+                "published_at": time.time(),
+                "event": event_to_payload(event),
+                "snapshot": state,
+            },
+        )
+        self.published += 1
+
+    async def load_run(
+        self,
+        run_id: str,
+    ) -> tuple[dict[str, Any], list[WorkflowEvent]] | None:
+        """Return ``(snapshot, replay events)`` for *run_id* from the stream."""
+        messages = await self._bus.stream_messages(self._stream, self.subject(run_id))
+        messages = [m for m in messages if m.get("event", {}).get("run_id") == run_id]
+        if not messages:
+            return None
+        events = [event_from_payload(m["event"]) for m in messages[-self._replay_limit :]]
+        return messages[-1]["snapshot"], events
+
+    async def _on_message(self, message: dict[str, Any]) -> None:
+        manager = self._manager
+        if manager is None or message.get("origin") == self.instance_id:
+            return
+        try:
+            event = event_from_payload(message["event"])
+            state = message["snapshot"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning("workflow_event_fanout_malformed", origin=message.get("origin"))
+            return
+        if await manager.ingest_remote_event(event, state):
+            self.received += 1
+            published_at = message.get("published_at")
+            if self._metrics is not None and isinstance(published_at, int | float):
+                self._metrics.observe(
+                    "workflow_event_fanout_latency_seconds",
+                    max(0.0, time.time() - published_at),
+                )
@@ -1,10 +1,24 @@
-"""WebSocket connection manager for run-scoped workflow event streaming."""
+"""WebSocket connection manager for run-scoped workflow event streaming.
+
+Per-run state (snapshot, replay buffer, subscribers) is guarded by one of
+``lock_shards`` locks chosen by run id, so busy runs do not serialize each
+other; the WebSocket connection registry has its own lock.  When a shard
+lock and the connection lock are both needed, the shard lock is taken first.
+
+With a :class:`~agent33.workflows.ws_fanout.WorkflowEventFanout` attached,
+events published on one replica are delivered to sockets connected to any
+replica, and runs started elsewhere are hydrated from the shared stream the
+first time a local client asks for them.  Each run's events are handed to
+the fan-out in cursor order, so other replicas never see a lower cursor after
+a higher one and drop it as stale.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import contextlib
 import time
+import zlib
 from collections import deque
 from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING, Any
@@ -21,8 +35,15 @@ from agent33.workflows.events import (
 if TYPE_CHECKING:
     from starlette.websockets import WebSocket
 
+    from agent33.workflows.ws_fanout import WorkflowEventFanout
+
 logger = structlog.get_logger()
 
+# How long a run id the shared stream did not know is answered locally before
+# the stream is asked again, and how many such ids are remembered.
+_HYDRATE_MISS_TTL_SECONDS = 5.0
+_MAX_HYDRATE_MISSES = 4096
+
 
 @dataclass
 class WorkflowRunSnapshot:
@@ -57,6 +78,43 @@ class WorkflowRunSnapshot:
             data["duration_ms"] = self.duration_ms
         return data
 
+    def to_state(self) -> dict[str, Any]:
+        """Return the full snapshot, including access fields, for replication."""
+        return {
+            "run_id": self.run_id,
+            "workflow_name": self.workflow_name,
+            "owner_subject": self.owner_subject,
+            "tenant_id": self.tenant_id,
+            "status": self.status,
+            "step_statuses": dict(self.step_statuses),
+            "last_event_type": self.last_event_type,
+            "updated_at": self.updated_at,
+            "terminal": self.terminal,
+            "error": self.error,
+            "duration_ms": self.duration_ms,
+            "last_event_id": self.last_event_id,
+            "schema_version": self.schema_version,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> WorkflowRunSnapshot:
+        """Rebuild a snapshot produced by :meth:`to_state`."""
+        return cls(
+            run_id=str(state["run_id"]),
+            workflow_name=str(state.get("workflow_name", "")),
+            owner_subject=state.get("owner_subject"),
+            tenant_id=state.get("tenant_id"),
+            status=str(state.get("status", "pending")),
+            step_statuses=dict(state.get("step_statuses") or {}),
+            last_event_type=state.get("last_event_type"),
+            updated_at=float(state.get("updated_at") or time.time()),
+            terminal=bool(state.get("terminal", False)),
+            error=state.get("error"),
+            duration_ms=_coerce_float(state.get("duration_ms")),
+            last_event_id=int(state.get("last_event_id") or 0),
+            schema_version=int(state.get("schema_version") or resolve_active_schema_version()),
+        )
+
 
 @dataclass
 class _PendingMessage:
@@ -79,6 +137,7 @@ class WorkflowWSManager:
         sse_queue_maxsize: int = 100,
         sse_replay_buffer_size: int = 200,
         archive_service: Any | None = None,
+        lock_shards: int = 64,
     ) -> None:
         self._subscriptions: dict[str, set[Any]] = {}
         self._reverse: dict[Any, set[str]] = {}
@@ -86,16 +145,61 @@ class WorkflowWSManager:
         self._sse_subscriptions: dict[str, set[asyncio.Queue[WorkflowEvent]]] = {}
         self._sse_replay_buffers: dict[str, deque[WorkflowEvent]] = {}
         self._snapshots: dict[str, WorkflowRunSnapshot] = {}
+        # Guards the connection registry (_connections/_reverse).
         self._lock = asyncio.Lock()
+        self._shard_locks = [asyncio.Lock() for _ in range(max(1, lock_shards))]
         self.heartbeat_interval_seconds = heartbeat_interval_seconds
         self.sse_queue_maxsize = max(1, sse_queue_maxsize)
         self.sse_replay_buffer_size = max(1, sse_replay_buffer_size)
         self._archive_service = archive_service
+        self._fanout: WorkflowEventFanout | None = None
+        # run_id -> future completed once that run's latest event is published;
+        # each publish waits for the previous one to keep cursor order.
+        self._publish_tails: dict[str, asyncio.Future[None]] = {}
+        # run_id -> monotonic time the shared stream last had no such run.
+        self._hydrate_misses: dict[str, float] = {}
 
     def set_archive_service(self, archive_service: Any | None) -> None:
         """Attach an optional durable archive service for workflow events."""
         self._archive_service = archive_service
 
+    def set_fanout(self, fanout: WorkflowEventFanout | None) -> None:
+        """Attach (or detach) cross-replica event fan-out."""
+        self._fanout = fanout
+
+    def _run_lock(self, run_id: str) -> asyncio.Lock:
+        return self._shard_locks[zlib.crc32(run_id.encode("utf-8")) % len(self._shard_locks)]
+
+    async def _ensure_run(self, run_id: str) -> None:
+        """Hydrate *run_id* from the shared stream if another replica owns it."""
+        if self._fanout is None or run_id in self._snapshots:
+            return
+        missed_at = self._hydrate_misses.get(run_id)
+        if missed_at is not None and time.monotonic() - missed_at < _HYDRATE_MISS_TTL_SECONDS:
+            return
+        try:
+            history = await self._fanout.load_run(run_id)
+        except Exception:
+            logger.warning("workflow_fanout_hydrate_failed", run_id=run_id, exc_info=True)
+            return
+        if history is None:
+            self._hydrate_misses.pop(run_id, None)
+            self._hydrate_misses[run_id] = time.monotonic()
+            if len(self._hydrate_misses) > _MAX_HYDRATE_MISSES:
+                del self._hydrate_misses[next(iter(self._hydrate_misses))]
+            return
+        self._hydrate_misses.pop(run_id, None)
+        state, events = history
+        async with self._run_lock(run_id):
+            if run_id in self._snapshots:
+                return
+            self._snapshots[run_id] = WorkflowRunSnapshot.from_state(state)
+            buffer = self._sse_replay_buffers.setdefault(
+                run_id,
+                deque(maxlen=self.sse_replay_buffer_size),
+            )
+            buffer.extend(events)
+
     async def register_run(
         self,
         run_id: str,
@@ -106,7 +210,7 @@ class WorkflowWSManager:
         schema_version: int | None = None,
     ) -> None:
         """Ensure a snapshot exists for *run_id*."""
-        async with self._lock:
+        async with self._run_lock(run_id):
             snapshot = self._snapshots.setdefault(
                 run_id,
                 WorkflowRunSnapshot(
@@ -129,7 +233,8 @@ class WorkflowWSManager:
 
     async def has_run(self, run_id: str) -> bool:
         """Return ``True`` when *run_id* is known to the manager."""
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             return run_id in self._snapshots
 
     async def can_access_run(
@@ -142,7 +247,8 @@ class WorkflowWSManager:
         is_admin: bool = False,
     ) -> bool:
         """Return ``True`` when the caller can access *run_id*."""
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             snapshot = self._snapshots.get(run_id)
 
         if snapshot is None:
@@ -156,18 +262,20 @@ class WorkflowWSManager:
 
     async def connect(self, ws: WebSocket, run_id: str) -> bool:
         """Subscribe *ws* to a single workflow *run_id*."""
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             if run_id not in self._snapshots:
                 return False
 
-            state = self._connections.get(ws)
-            if state is None:
-                state = _ConnectionState()
-                state.sender_task = asyncio.create_task(self._sender_loop(ws, state))
-                self._connections[ws] = state
+            async with self._lock:
+                state = self._connections.get(ws)
+                if state is None:
+                    state = _ConnectionState()
+                    state.sender_task = asyncio.create_task(self._sender_loop(ws, state))
+                    self._connections[ws] = state
+                self._reverse.setdefault(ws, set()).add(run_id)
 
             self._subscriptions.setdefault(run_id, set()).add(ws)
-            self._reverse.setdefault(ws, set()).add(run_id)
 
         logger.debug(
             "ws_run_connected",
@@ -180,16 +288,10 @@ class WorkflowWSManager:
         """Remove *ws* from all tracked subscriptions."""
         sender_task: asyncio.Task[None] | None = None
         async with self._lock:
-            run_ids = list(self._reverse.pop(ws, set()))
-            for run_id in run_ids:
-                subs = self._subscriptions.get(run_id)
-                if subs is not None:
-                    subs.discard(ws)
-                    if not subs:
-                        del self._subscriptions[run_id]
-            state = self._connections.pop(ws, None)
+            state = self._connections.get(ws)
             if state is not None:
                 sender_task = state.sender_task
+        run_ids = await self._remove_ws(ws)
 
         if sender_task is not None and sender_task is not asyncio.current_task():
             sender_task.cancel()
@@ -202,7 +304,8 @@ class WorkflowWSManager:
     async def subscribe_sse(self, run_id: str) -> asyncio.Queue[WorkflowEvent] | None:
         """Register and return an SSE queue for *run_id*."""
         queue: asyncio.Queue[WorkflowEvent] = asyncio.Queue(maxsize=self.sse_queue_maxsize)
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             if run_id not in self._snapshots:
                 return None
             self._sse_subscriptions.setdefault(run_id, set()).add(queue)
@@ -219,7 +322,8 @@ class WorkflowWSManager:
     ) -> asyncio.Queue[WorkflowEvent] | None:
         """Atomically authorize and subscribe an SSE client for *run_id*."""
         queue: asyncio.Queue[WorkflowEvent] = asyncio.Queue(maxsize=self.sse_queue_maxsize)
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             snapshot = self._snapshots.get(run_id)
             if snapshot is None:
                 return None
@@ -243,7 +347,8 @@ class WorkflowWSManager:
     ) -> tuple[asyncio.Queue[WorkflowEvent] | None, list[WorkflowEvent]]:
         """Atomically authorize, subscribe, and capture replay events."""
         queue: asyncio.Queue[WorkflowEvent] = asyncio.Queue(maxsize=self.sse_queue_maxsize)
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             snapshot = self._snapshots.get(run_id)
             if snapshot is None:
                 return None, []
@@ -262,7 +367,7 @@ class WorkflowWSManager:
         queue: asyncio.Queue[WorkflowEvent],
     ) -> None:
         """Remove a previously registered SSE queue for *run_id*."""
-        async with self._lock:
+        async with self._run_lock(run_id):
             subscribers = self._sse_subscriptions.get(run_id)
             if subscribers is None:
                 return
@@ -271,8 +376,12 @@ class WorkflowWSManager:
                 del self._sse_subscriptions[run_id]
 
     async def publish_event(self, event: WorkflowEvent) -> WorkflowEvent:
-        """Update the run snapshot and fan out *event* to subscribers."""
-        async with self._lock:
+        """Update the run snapshot and fan out *event* to subscribers.
+
+        With fan-out attached, the event (and the resulting snapshot) is also
+        published for the other replicas.
+        """
+        async with self._run_lock(event.run_id):
             snapshot = self._snapshots.setdefault(
                 event.run_id,
                 WorkflowRunSnapshot(
@@ -291,10 +400,24 @@ class WorkflowWSManager:
             targets = list(self._subscriptions.get(event.run_id, set()))
             sse_targets = list(self._sse_subscriptions.get(event.run_id, set()))
             archive_service = self._archive_service
+            fanout = self._fanout
+            state = snapshot.to_state() if fanout is not None else None
+            previous_publish: asyncio.Future[None] | None = None
+            published: asyncio.Future[None] | None = None
+            if fanout is not None:
+                previous_publish = self._publish_tails.get(event.run_id)
+                published = asyncio.get_running_loop().create_future()
+                self._publish_tails[event.run_id] = published
 
         if archive_service is not None:
             try:
-                archive_service.append_event(event.run_id, event)
+                # submit_event only queues when the archive's batch writer is running,
+                # keeping file I/O off the event loop.
+                submit = getattr(archive_service, "submit_event", None)
+                if submit is not None:
+                    submit(event.run_id, event)
+                else:
+                    archive_service.append_event(event.run_id, event)
             except Exception:
                 logger.warning(
                     "workflow_archive_append_failed",
@@ -303,12 +426,65 @@ class WorkflowWSManager:
                     exc_info=True,
                 )
 
+        if fanout is not None and state is not None and published is not None:
+            try:
+                if previous_publish is not None:
+                    await asyncio.shield(previous_publish)
+                await fanout.publish(event, state)
+            except Exception:
+                logger.warning(
+                    "workflow_fanout_publish_failed",
+                    run_id=event.run_id,
+                    event_type=event.event_type.value,
+                    exc_info=True,
+                )
+            finally:
+                published.set_result(None)
+                if self._publish_tails.get(event.run_id) is published:
+                    del self._publish_tails[event.run_id]
+
+        await self._deliver(event, targets, sse_targets)
+        return event
+
+    async def ingest_remote_event(
+        self,
+        event: WorkflowEvent,
+        state: dict[str, Any],
+    ) -> bool:
+        """Apply an event published by another replica and deliver it locally.
+
+        *state* is the publishing replica's snapshot after the event, which
+        is authoritative.  Events at or below the known cursor are ignored.
+        """
+        cursor = _parse_event_cursor(event.event_id)
+        self._hydrate_misses.pop(event.run_id, None)
+        async with self._run_lock(event.run_id):
+            snapshot = self._snapshots.get(event.run_id)
+            if snapshot is not None and cursor is not None and cursor <= snapshot.last_event_id:
+                return False
+            self._snapshots[event.run_id] = WorkflowRunSnapshot.from_state(state)
+            self._sse_replay_buffers.setdefault(
+                event.run_id,
+                deque(maxlen=self.sse_replay_buffer_size),
+            ).append(event)
+            targets = list(self._subscriptions.get(event.run_id, set()))
+            sse_targets = list(self._sse_subscriptions.get(event.run_id, set()))
+
+        await self._deliver(event, targets, sse_targets)
+        return True
+
+    async def _deliver(
+        self,
+        event: WorkflowEvent,
+        targets: list[Any],
+        sse_targets: list[asyncio.Queue[WorkflowEvent]],
+    ) -> None:
         for queue in sse_targets:
             if not self._publish_sse_event(queue, event, run_id=event.run_id):
                 logger.warning("sse_event_dropped", run_id=event.run_id)
 
         if not targets:
-            return event
+            return
 
         payload = event.to_json()
         dead: list[Any] = []
@@ -318,15 +494,14 @@ class WorkflowWSManager:
                 dead.append(ws)
 
         if dead:
-            async with self._lock:
-                for ws in dead:
-                    self._remove_ws_unlocked(ws)
+            for ws in dead:
+                await self._remove_ws(ws)
             logger.debug("ws_dead_connections_cleaned", count=len(dead))
-        return event
 
     async def build_sync_event(self, run_id: str) -> WorkflowEvent | None:
         """Build a transport-neutral snapshot event for *run_id*."""
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             snapshot = self._snapshots.get(run_id)
             if snapshot is None:
                 return None
@@ -351,7 +526,7 @@ class WorkflowWSManager:
 
     async def build_heartbeat_event(self, run_id: str) -> WorkflowEvent | None:
         """Build a transport-neutral heartbeat event for *run_id*."""
-        async with self._lock:
+        async with self._run_lock(run_id):
             snapshot = self._snapshots.get(run_id)
             if snapshot is None:
                 return None
@@ -374,7 +549,8 @@ class WorkflowWSManager:
         after_event_id: str | None,
     ) -> list[WorkflowEvent]:
         """Return buffered SSE events after the provided cursor."""
-        async with self._lock:
+        await self._ensure_run(run_id)
+        async with self._run_lock(run_id):
             return self._replay_events_unlocked(run_id, after_event_id)
 
     async def send_heartbeat(self, ws: WebSocket, run_id: str) -> bool:
@@ -386,12 +562,12 @@ class WorkflowWSManager:
 
     async def active_subscriptions(self, run_id: str) -> int:
         """Return the number of active subscribers for *run_id*."""
-        async with self._lock:
+        async with self._run_lock(run_id):
             return len(self._subscriptions.get(run_id, set()))
 
     async def active_sse_subscriptions(self, run_id: str) -> int:
         """Return the number of active SSE subscribers for *run_id*."""
-        async with self._lock:
+        async with self._run_lock(run_id):
             return len(self._sse_subscriptions.get(run_id, set()))
 
     async def connected_count(self) -> int:
@@ -455,15 +631,21 @@ class WorkflowWSManager:
             return event
         return replace(event, schema_version=snapshot.schema_version)
 
-    def _remove_ws_unlocked(self, ws: Any) -> None:
-        run_ids = list(self._reverse.pop(ws, set()))
+    async def _remove_ws(self, ws: Any, state: _ConnectionState | None = None) -> list[str]:
+        """Forget *ws* (only if its state is still *state*, when given)."""
+        async with self._lock:
+            if state is not None and self._connections.get(ws) is not state:
+                return []
+            run_ids = list(self._reverse.pop(ws, set()))
+            self._connections.pop(ws, None)
         for run_id in run_ids:
-            subs = self._subscriptions.get(run_id)
-            if subs is not None:
-                subs.discard(ws)
-                if not subs:
-                    del self._subscriptions[run_id]
-        self._connections.pop(ws, None)
+            async with self._run_lock(run_id):
+                subs = self._subscriptions.get(run_id)
+                if subs is not None:
+                    subs.discard(ws)
+                    if not subs:
+                        del self._subscriptions[run_id]
+        return run_ids
 
     async def _enqueue_text(self, ws: Any, payload: str, *, wait: bool = False) -> bool:
         async with self._lock:
@@ -526,10 +708,7 @@ class WorkflowWSManager:
                 if pending.delivered is not None and not pending.delivered.done():
                     pending.delivered.set_result(False)
                 state.queue.task_done()
-            async with self._lock:
-                current_state = self._connections.get(ws)
-                if current_state is state:
-                    self._remove_ws_unlocked(ws)
+            await self._remove_ws(ws, state)
 
     def _publish_sse_event(
         self,
@@ -0,0 +1,132 @@
+"""Benchmark -- staged vs streaming vs incremental platform backups.
+
+Builds a synthetic state directory (``AGENT33_BACKUP_BENCH_MB``, default
+256 MB, of 4 MB files mixing compressible and random data) and times:
+
+* the previous approach: copy every asset into a staging tree, gzip the tree,
+  then verify by reading each member fully into memory;
+* the streaming writer (tar straight from the sources) and streaming verify;
+* incremental backups against the content-addressed chunk store, first run
+  and after touching a single file.
+
+Run with e.g. ``AGENT33_BACKUP_BENCH_MB=4096`` for a multi-GB directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from agent33.backup.archive import write_tar_gz
+from agent33.backup.manifest import BackupMode
+from agent33.backup.service import BackupService
+from agent33.config import Settings
+
+pytestmark = [pytest.mark.benchmark]
+
+_FILE_MB = 4
+_TOTAL_MB = int(os.environ.get("AGENT33_BACKUP_BENCH_MB", "256"))
+
+
+def _seed_state(root: Path) -> Path:
+    state = root / "var" / "process-manager"
+    state.mkdir(parents=True)
+    (root / "skills").mkdir()
+    (root / "skills" / "skill.md").write_text("# Skill\n", encoding="utf-8")
+    block = (b"log line with some repetition 0123456789\n" * 1024)[: 512 * 1024]
+    for index in range(max(1, _TOTAL_MB // _FILE_MB)):
+        with (state / f"proc-{index:04d}.log").open("wb") as handle:
+            for _ in range(_FILE_MB):
+                handle.write(block)
+                handle.write(os.urandom(512 * 1024))
+    return state
+
+
+def _service(root: Path) -> BackupService:
+    settings = Settings(
+        skill_definitions_dir="skills",
+        process_manager_log_dir="var/process-manager",
+        operator_session_base_dir=str(root / "no-sessions"),
+        backup_dir=str(root / "backups"),
+    )
+    return BackupService(backup_dir=root / "backups", settings=settings, app_root=root)
+
+
+def _legacy_create(service: BackupService, backup_dir: Path) -> Path:
+    inventory = service.inventory(mode=BackupMode.NO_WORKSPACE)
+    archive_path = backup_dir / "legacy.tar.gz"
+    with tempfile.TemporaryDirectory(dir=str(backup_dir)) as tmp_dir:
+        staging_root = Path(tmp_dir) / "legacy"
+        for asset in inventory.assets:
+            if not asset.included:
+                continue
+            source = Path(asset.source_path)
+            target = staging_root / asset.relative_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if source.is_dir():
+                shutil.copytree(source, target)
+            else:
+                shutil.copy2(source, target)
+        write_tar_gz(staging_root, archive_path)
+    return archive_path
+
+
+def _legacy_verify(archive_path: Path) -> int:
+    hashed = 0
+    with tarfile.open(archive_path, "r:gz") as archive:
+        for member in archive.getmembers():
+            payload = archive.extractfile(member) if member.isfile() else None
+            if payload is not None:
+                hashlib.sha256(payload.read()).hexdigest()
+                hashed += 1
+    return hashed
+
+
+def _timed(label: str, timings: dict[str, float], func):  # type: ignore[no-untyped-def]
+    started = time.perf_counter()
+    result = func()
+    timings[label] = time.perf_counter() - started
+    return result
+
+
+async def test_streaming_and_incremental_backup_timings(tmp_path: Path) -> None:
+    state = _seed_state(tmp_path)
+    service = _service(tmp_path)
+    backup_dir = tmp_path / "backups"
+    timings: dict[str, float] = {}
+
+    legacy_archive = _timed("staged create", timings, lambda: _legacy_create(service, backup_dir))
+    _timed("staged verify", timings, lambda: _legacy_verify(legacy_archive))
+    legacy_archive.unlink()
+
+    started = time.perf_counter()
+    full = await service.create(mode=BackupMode.NO_WORKSPACE)
+    timings["streaming create+verify"] = time.perf_counter() - started
+    assert full.success is True
+    started = time.perf_counter()
+    assert (await service.verify(Path(full.archive_path))).valid
+    timings["streaming verify"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    first = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+    timings["incremental #1 create+verify"] = time.perf_counter() - started
+    assert first.success is True
+
+    with (state / "proc-0000.log").open("ab") as handle:
+        handle.write(b"one more line\n")
+    started = time.perf_counter()
+    second = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+    timings["incremental #2 create+verify"] = time.perf_counter() - started
+    assert second.success is True
+    assert second.files_written == 1
+
+    report = ", ".join(f"{label} {seconds:.2f}s" for label, seconds in timings.items())
+    assert timings["streaming verify"] < timings["staged verify"] * 1.5, report
+    assert timings["incremental #2 create+verify"] < timings["streaming create+verify"], report
@@ -0,0 +1,111 @@
+"""Benchmark -- pooled vs per-call HTTP clients against a local stub server.
+
+Issues the same sequential GET repeatedly through
+:func:`agent33.connectors.http_pool.pooled_client`, first with no pool
+installed (a fresh ``httpx.AsyncClient`` per call, which is what the web
+research providers, reader tool, ``http_request`` action and chat proxy used
+to do) and then with an :class:`HTTPClientPool`.  The stub is a keep-alive
+HTTP/1.1 server on loopback, so the difference is client construction plus
+connection setup; against real TLS endpoints the gap is larger.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+import pytest
+
+from agent33.connectors.http_pool import (
+    HTTPClientPool,
+    configure_http_client_pool,
+    pooled_client,
+)
+
+pytestmark = [pytest.mark.benchmark]
+
+_CALLS = 200
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 11\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+    b'{"ok":true}'
+)
+
+
+class _StubServer:
+    """Minimal keep-alive HTTP/1.1 server that counts accepted connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/search"
+
+    async def __aexit__(self, *_exc: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(_RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _timed_calls(url: str) -> list[float]:
+    latencies: list[float] = []
+    for _ in range(_CALLS):
+        started = time.perf_counter()
+        async with pooled_client("search:stub") as client:
+            response = await client.get(url, timeout=5.0)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+    return latencies
+
+
+def _p(values: list[float], quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def test_pooled_client_reduces_repeated_call_latency() -> None:
+    per_call_stub = _StubServer()
+    async with per_call_stub as url:
+        configure_http_client_pool(None)
+        per_call = await _timed_calls(url)
+
+    pooled_stub = _StubServer()
+    async with pooled_stub as url:
+        pool = HTTPClientPool()
+        configure_http_client_pool(pool)
+        try:
+            pooled = await _timed_calls(url)
+        finally:
+            configure_http_client_pool(None)
+            await pool.aclose()
+
+    per_call_median = statistics.median(per_call)
+    pooled_median = statistics.median(pooled)
+    # Keep-alive: the pooled run reuses a single connection.
+    assert per_call_stub.connections == _CALLS
+    assert pooled_stub.connections == 1
+    assert pooled_median < per_call_median / 2, (
+        f"per-call p50 {per_call_median:.3f} ms p95 {_p(per_call, 0.95):.3f} ms, "
+        f"pooled p50 {pooled_median:.3f} ms p95 {_p(pooled, 0.95):.3f} ms"
+    )
@@ -0,0 +1,104 @@
+"""Benchmark -- LLM provider overhead against the stub model server.
+
+Runs sequential completions through :class:`OllamaProvider` and
+:class:`OpenAIProvider` against :mod:`agent33.testing.stub_server` on
+loopback, with the stub's time-to-first-token fixed.  Subtracting that
+latency from each call leaves what the engine side costs: request
+serialization, the connector boundary, HTTP and response parsing.  A
+streamed run with a token rate separates time-to-first-token from the
+total, which is what the streaming endpoints report to users.
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from agent33.llm.base import ChatMessage
+from agent33.llm.ollama import OllamaProvider
+from agent33.llm.openai import OpenAIProvider
+from agent33.testing.stub_server import LatencyDistribution, StubBehavior, running_stub_server
+
+if TYPE_CHECKING:
+    from agent33.llm.base import LLMProvider
+
+pytestmark = [pytest.mark.benchmark]
+
+_CALLS = 100
+_LATENCY_MS = 20.0
+_MESSAGES = [
+    ChatMessage(role="system", content="You are a concise assistant."),
+    ChatMessage(role="user", content="Summarize the deployment checklist."),
+]
+
+
+def _p(values: list[float], quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def _overheads(provider: LLMProvider) -> list[float]:
+    overheads: list[float] = []
+    for _ in range(_CALLS):
+        started = time.perf_counter()
+        response = await provider.complete(_MESSAGES)
+        overheads.append((time.perf_counter() - started) * 1000 - _LATENCY_MS)
+        assert response.content
+    return overheads
+
+
+async def test_provider_overhead_is_small_next_to_model_latency() -> None:
+    behavior = StubBehavior(latency=LatencyDistribution.parse(f"fixed:{_LATENCY_MS}"))
+    with running_stub_server(behavior) as url:
+        ollama = OllamaProvider(base_url=url)
+        openai = OpenAIProvider(api_key="stub", base_url=f"{url}/v1")
+        try:
+            ollama_overhead = await _overheads(ollama)
+            openai_overhead = await _overheads(openai)
+        finally:
+            await ollama.close()
+            await openai.close()
+
+    # Loopback HTTP plus parsing should stay well under the model's own latency.
+    for name, overheads in (("ollama", ollama_overhead), ("openai", openai_overhead)):
+        report = (
+            f"{name} overhead p50 {statistics.median(overheads):.3f} ms "
+            f"p95 {_p(overheads, 0.95):.3f} ms"
+        )
+        assert min(overheads) >= -1.0, report  # the stub's latency really was applied
+        assert statistics.median(overheads) < _LATENCY_MS, report
+
+
+async def test_streaming_delivers_the_first_token_before_the_reply_finishes() -> None:
+    behavior = StubBehavior(
+        latency=LatencyDistribution.parse(f"fixed:{_LATENCY_MS}"),
+        tokens_per_second=1000,
+        reply_tokens=50,
+    )
+    with running_stub_server(behavior) as url:
+        provider = OpenAIProvider(api_key="stub", base_url=f"{url}/v1")
+        first_token: list[float] = []
+        total: list[float] = []
+        try:
+            for _ in range(20):
+                started = time.perf_counter()
+                first: float | None = None
+                async for chunk in provider.stream_complete(_MESSAGES):
+                    if first is None and chunk.delta_content:
+                        first = time.perf_counter() - started
+                total.append((time.perf_counter() - started) * 1000)
+                assert first is not None
+                first_token.append(first * 1000)
+        finally:
+            await provider.close()
+
+    # 49 paced tokens add at least 49 ms after the first one.
+    report = (
+        f"first token p50 {statistics.median(first_token):.3f} ms, "
+        f"full reply p50 {statistics.median(total):.3f} ms"
+    )
+    assert statistics.median(total) - statistics.median(first_token) >= 45, report
+    assert statistics.median(first_token) < statistics.median(total) / 2, report
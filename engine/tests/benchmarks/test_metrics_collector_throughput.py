@@ -0,0 +1,108 @@
+"""Benchmark -- MetricsCollector observe() throughput, memory and scrape cost.
+
+Simulates one minute of ``http_request_duration_seconds`` traffic at
+10k req/s (600k observations) spread over 40 route/method label sets, using
+a synthetic clock so the run takes seconds rather than a minute.  Memory is
+measured separately with :mod:`tracemalloc` (which slows allocation-heavy
+code considerably) and must stay bounded by the number of label sets and
+window slots, not by the number of observations.
+"""
+
+from __future__ import annotations
+
+import gc
+import random
+import time
+import tracemalloc
+
+import pytest
+
+from agent33.observability import metrics as metrics_mod
+from agent33.observability.metrics import MetricsCollector
+
+pytestmark = [pytest.mark.benchmark]
+
+_RATE_PER_SECOND = 10_000
+_SIMULATED_SECONDS = 60
+_LABEL_SETS = [
+    {"method": method, "path": f"/v1/route-{index}"}
+    for method in ("GET", "POST")
+    for index in range(20)
+]
+
+
+class _SyntheticClock:
+    """Stands in for the ``time`` module inside metrics.py."""
+
+    def __init__(self, start: float) -> None:
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+
+def _run_traffic(collector: MetricsCollector, clock: _SyntheticClock, seconds: int) -> float:
+    rng = random.Random(7)
+    latencies = [rng.lognormvariate(-3.0, 1.0) for _ in range(4096)]
+    step = 1.0 / _RATE_PER_SECOND
+    started = time.perf_counter()
+    for index in range(_RATE_PER_SECOND * seconds):
+        clock.now += step
+        collector.observe(
+            "http_request_duration_seconds",
+            latencies[index & 4095],
+            _LABEL_SETS[index % len(_LABEL_SETS)],
+        )
+    return time.perf_counter() - started
+
+
+def _retained_kib(window_seconds: int, seconds: int) -> float:
+    clock = _SyntheticClock(start=1_700_000_000.0)
+    collector = MetricsCollector(window_seconds=window_seconds)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        with pytest.MonkeyPatch.context() as patcher:
+            patcher.setattr(metrics_mod, "time", clock)
+            _run_traffic(collector, clock, seconds)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (retained - baseline) / 1024
+
+
+def test_observe_throughput_and_scrape_cost(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = _SyntheticClock(start=1_700_000_000.0)
+    monkeypatch.setattr(metrics_mod, "time", clock)
+    collector = MetricsCollector(window_seconds=300)
+
+    elapsed = _run_traffic(collector, clock, _SIMULATED_SECONDS)
+    observations = _RATE_PER_SECOND * _SIMULATED_SECONDS
+    throughput = observations / elapsed
+
+    scrape_started = time.perf_counter()
+    collector.render_prometheus()
+    scrape_ms = (time.perf_counter() - scrape_started) * 1000
+    summary = collector.get_summary()
+
+    # observe() must comfortably sustain the target rate on one core.
+    assert throughput > _RATE_PER_SECOND * 5, f"{throughput:,.0f} obs/s"
+    key = "http_request_duration_seconds(method=GET,path=/v1/route-0)"
+    assert summary[key]["count"] == observations // len(_LABEL_SETS)
+    assert summary[key]["window_count"] == summary[key]["count"]
+    assert scrape_ms < 250, f"render_prometheus took {scrape_ms:.2f} ms"
+
+
+def test_memory_stays_bounded_as_observations_grow() -> None:
+    # A 5s window cycles the ring buffer; doubling the traffic must not
+    # double retained memory the way one object per observation would.
+    short_run = _retained_kib(window_seconds=5, seconds=6)
+    long_run = _retained_kib(window_seconds=5, seconds=12)
+
+    # One timestamped object per value would retain roughly 100 bytes each
+    # (~11 MiB for the 12s run).
+    report = f"6s retained {short_run:,.0f} KiB, 12s retained {long_run:,.0f} KiB"
+    assert long_run < short_run * 1.3, report
+    assert long_run < 4 * 1024, report
@@ -0,0 +1,87 @@
+"""Benchmark -- operator-session start/append/resume latency per storage backend.
+
+Drives :class:`~agent33.sessions.service.OperatorSessionService` over the
+per-host :class:`~agent33.sessions.storage.FileSessionStorage` and the shared
+:class:`~agent33.sessions.pg_storage.SqliteSessionStorage`:
+
+* start -- create a session (row or directory, lease or PID lock, first event);
+* append -- add one replay event to an active session;
+* resume -- suspend a session with a long replay log and resume it, which
+  re-counts the log.
+
+The shared backend buffers appends and writes them in one transaction per
+flush interval, so an append costs a list append instead of a file open and
+write.
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from agent33.sessions.models import OperatorSessionStatus, SessionEvent, SessionEventType
+from agent33.sessions.pg_storage import SqliteSessionStorage
+from agent33.sessions.service import OperatorSessionService
+from agent33.sessions.storage import FileSessionStorage, SessionStorage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = [pytest.mark.benchmark]
+
+_SESSIONS = 50
+_EVENTS = 40
+
+
+async def _measure(storage: SessionStorage) -> dict[str, list[float]]:
+    service = OperatorSessionService(storage)
+    timings: dict[str, list[float]] = {"start": [], "append": [], "resume": []}
+    try:
+        for _ in range(_SESSIONS):
+            started = time.perf_counter()
+            session = await service.start_session(purpose="bench", tenant_id="t")
+            timings["start"].append(time.perf_counter() - started)
+
+            for n in range(_EVENTS):
+                event = SessionEvent(
+                    event_type=SessionEventType.TOOL_EXECUTED,
+                    session_id=session.session_id,
+                    data={"n": n, "output": "x" * 200},
+                )
+                started = time.perf_counter()
+                await service.append_event(session.session_id, event)
+                timings["append"].append(time.perf_counter() - started)
+
+            await service.end_session(session.session_id, OperatorSessionStatus.SUSPENDED)
+            started = time.perf_counter()
+            await service.resume_session(session.session_id)
+            timings["resume"].append(time.perf_counter() - started)
+    finally:
+        await service.shutdown()
+    return {op: [t * 1e6 for t in values] for op, values in timings.items()}
+
+
+def _p(values: list[float], quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def test_shared_store_latency_versus_file_backend(tmp_path: Path) -> None:
+    file_timings = await _measure(FileSessionStorage(base_dir=tmp_path / "files"))
+    shared_timings = await _measure(SqliteSessionStorage(str(tmp_path / "s.db"), owner="bench"))
+
+    lines = [f"{_SESSIONS} sessions x {_EVENTS} events (latency in us)"]
+    for op in ("start", "append", "resume"):
+        for name, timings in (("file", file_timings), ("sqlite", shared_timings)):
+            values = timings[op]
+            lines.append(
+                f"{op} {name}: p50 {statistics.median(values):.1f} p99 {_p(values, 0.99):.1f}"
+            )
+    report = "; ".join(lines)
+
+    for op in ("append", "resume"):
+        shared = statistics.median(shared_timings[op])
+        assert shared < statistics.median(file_timings[op]), report
@@ -0,0 +1,139 @@
+"""Benchmark -- distributed workflow step throughput vs number of worker processes.
+
+Runs a fan-out workflow of CPU-bound ``invoke-agent`` steps through
+:class:`~agent33.workflows.step_queue.RedisStepQueue` with 1, 2 and 4 worker
+processes.  Each step burns ~20 ms of CPU, so a single event loop runs them
+one at a time no matter how many are ready; throughput should grow with the
+number of worker processes up to the machine's core count.
+
+Needs a Redis server (``AGENT33_REDIS_TEST_URL``, default
+``redis://127.0.0.1:6379/15``); skipped otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from urllib.parse import urlparse
+
+import pytest
+
+from agent33.workflows.definition import WorkflowDefinition
+from agent33.workflows.executor import WorkflowExecutor, WorkflowStatus
+from agent33.workflows.step_queue import RedisStepQueue
+from agent33.workflows.step_workers import StepDispatcher
+
+_REDIS_URL = os.environ.get("AGENT33_REDIS_TEST_URL", "redis://127.0.0.1:6379/15")
+_STEPS = 48
+_BURN_SECONDS = 0.02
+
+
+def _redis_reachable() -> bool:
+    parsed = urlparse(_REDIS_URL)
+    try:
+        with socket.create_connection((parsed.hostname or "127.0.0.1", parsed.port or 6379), 0.5):
+            return True
+    except OSError:
+        return False
+
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not _redis_reachable(), reason=f"Redis not reachable at {_REDIS_URL}"),
+]
+
+_WORKER = """
+import asyncio, sys, time
+import redis.asyncio as aioredis
+from agent33.workflows.actions import invoke_agent
+from agent33.workflows.step_queue import RedisStepQueue
+from agent33.workflows.step_workers import StepWorker
+
+async def burn(inputs):
+    deadline = time.process_time() + float(inputs["seconds"])
+    while time.process_time() < deadline:
+        pass
+    return {"pid": __import__("os").getpid()}
+
+async def main(url, stream):
+    invoke_agent.register_agent("burn", burn)
+    redis = aioredis.from_url(url, decode_responses=True)
+    worker = StepWorker(RedisStepQueue(redis, stream=stream), concurrency=1)
+    worker.start()
+    print("ready", flush=True)
+    await asyncio.Event().wait()
+
+asyncio.run(main(sys.argv[1], sys.argv[2]))
+"""
+
+
+def _definition() -> WorkflowDefinition:
+    return WorkflowDefinition.model_validate(
+        {
+            "name": "burn-fanout",
+            "version": "1.0.0",
+            "steps": [
+                {
+                    "id": f"burn{i}",
+                    "action": "invoke-agent",
+                    "agent": "burn",
+                    "inputs": {"seconds": _BURN_SECONDS},
+                }
+                for i in range(_STEPS)
+            ],
+            "execution": {"mode": "parallel", "parallel_limit": _STEPS},
+        }
+    )
+
+
+async def _run_with_workers(redis: object, workers: int) -> float:
+    stream = f"agent33:steps:bench:{uuid.uuid4().hex}"
+    procs = [
+        await asyncio.create_subprocess_exec(
+            sys.executable, "-c", _WORKER, _REDIS_URL, stream, stdout=subprocess.PIPE
+        )
+        for _ in range(workers)
+    ]
+    try:
+        for proc in procs:
+            assert proc.stdout is not None
+            assert (await asyncio.wait_for(proc.stdout.readline(), timeout=30)).strip() == b"ready"
+        dispatcher = StepDispatcher(
+            RedisStepQueue(redis, stream=stream, poll_interval_seconds=0.005)
+        )
+        executor = WorkflowExecutor(
+            _definition(), run_id=f"bench-{uuid.uuid4().hex}", step_dispatcher=dispatcher
+        )
+        started = time.perf_counter()
+        result = await executor.execute({})
+        elapsed = time.perf_counter() - started
+        assert result.status == WorkflowStatus.SUCCESS
+        assert len({r.outputs["pid"] for r in result.step_results}) > (workers > 1)
+        return _STEPS / elapsed
+    finally:
+        for proc in procs:
+            proc.kill()
+            await proc.wait()
+        await redis.delete(stream)  # type: ignore[attr-defined]
+
+
+async def test_step_throughput_scales_with_worker_processes() -> None:
+    import redis.asyncio as aioredis
+
+    redis = aioredis.from_url(_REDIS_URL, decode_responses=True)  # type: ignore[no-untyped-call]
+    counts = [n for n in (1, 2, 4) if n == 1 or n <= (os.cpu_count() or 1)]
+    throughput: dict[int, float] = {}
+    try:
+        for workers in counts:
+            throughput[workers] = await _run_with_workers(redis, workers)
+    finally:
+        await redis.aclose()
+
+    if len(counts) > 1:
+        report = ", ".join(f"{n} worker(s) {rate:.1f} steps/s" for n, rate in throughput.items())
+        assert throughput[counts[-1]] > throughput[1] * 1.4, report
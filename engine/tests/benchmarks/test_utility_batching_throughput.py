@@ -0,0 +1,105 @@
+"""Benchmark -- batched vs per-item utility completions against a stub provider.
+
+Titles the same set of sessions three ways through a real
+:class:`~agent33.llm.router.ModelRouter`: one sequential request per session
+(what bulk callers did before), bounded concurrent per-item requests, and
+packed requests of 16 sessions each.  On a local inference server the
+per-request overhead (queueing, prompt setup) dominates tiny prompts, so the
+benchmark asserts on what determines throughput there: how many upstream
+requests each mode sends and how many are in flight at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from agent33.llm.base import ChatMessage, LLMResponse
+from agent33.llm.batching import UtilityBatcher
+from agent33.llm.router import ModelRouter
+from agent33.memory.title_generator import generate_title_llm, generate_titles_llm
+
+pytestmark = [pytest.mark.benchmark]
+
+_SESSIONS = 256
+_BATCH_SIZE = 16
+_CONCURRENCY = 4
+
+
+class _StubProvider:
+    """Local provider that counts requests, items and peak in-flight requests."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.items = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def complete(
+        self,
+        messages: list[ChatMessage],
+        *,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+    ) -> LLMResponse:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            # Yield so concurrently issued requests overlap as they would upstream.
+            await asyncio.sleep(0.001)
+        finally:
+            self.in_flight -= 1
+        user = str(messages[-1].content)
+        if user.startswith("[{"):
+            items = json.loads(user)
+            self.items += len(items)
+            content = json.dumps(
+                {"results": [{"id": item["id"], "output": "Session title"} for item in items]}
+            )
+        else:
+            self.items += 1
+            content = "Session title"
+        return LLMResponse(content=content, model=model, prompt_tokens=20, completion_tokens=5)
+
+
+def _messages() -> list[str]:
+    return [
+        f"Help me debug failing job number {i} in the nightly pipeline" for i in range(_SESSIONS)
+    ]
+
+
+async def _sequential(router: ModelRouter) -> list[str]:
+    return [await generate_title_llm(message, router) for message in _messages()]
+
+
+async def test_packed_batches_beat_per_item_requests() -> None:
+    providers: dict[str, _StubProvider] = {}
+
+    for label in ("sequential", "concurrent", "packed"):
+        provider = providers[label] = _StubProvider()
+        router = ModelRouter(providers={"ollama": provider})
+        if label == "sequential":
+            titles = await _sequential(router)
+        else:
+            batcher = UtilityBatcher(
+                router, mode=label, max_batch_size=_BATCH_SIZE, max_concurrency=_CONCURRENCY
+            )
+            titles = await generate_titles_llm(_messages(), batcher)
+        assert titles == ["Session title"] * _SESSIONS
+        assert provider.items == _SESSIONS
+
+    # One request per session, one at a time.
+    assert providers["sequential"].requests == _SESSIONS
+    assert providers["sequential"].peak_in_flight == 1
+    # Same request count, but overlapped up to the concurrency cap.
+    assert providers["concurrent"].requests == _SESSIONS
+    assert providers["concurrent"].peak_in_flight == _CONCURRENCY
+    # Sixteen sessions per request, never exceeding the cap.
+    assert providers["packed"].requests == _SESSIONS // _BATCH_SIZE
+    assert providers["packed"].peak_in_flight <= _CONCURRENCY
@@ -0,0 +1,127 @@
+"""Benchmark -- webhook delivery throughput and latency against a local stub receiver.
+
+Enqueues a burst of deliveries spread over a few endpoints and lets
+:class:`~agent33.automation.webhook_engine.WebhookDeliveryEngine` post them to
+a keep-alive HTTP/1.1 stub on loopback that answers after ~20 ms (a typical
+receiver doing a little work).  One worker sends the burst one request at a
+time, which is what a single delivery loop does; sixteen workers with four
+in-flight requests per endpoint overlap the receiver's latency.  The
+multi-worker run also writes receipts to a SQLite delivery store in batches.
+
+Latency is measured from enqueue to the end of the successful attempt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from agent33.automation.pg_webhook_repository import SqliteWebhookDeliveryStore
+from agent33.automation.webhook_delivery import WebhookDeliveryManager, WebhookDeliveryStatus
+from agent33.automation.webhook_engine import WebhookDeliveryEngine
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = [pytest.mark.benchmark]
+
+_DELIVERIES = 240
+_ENDPOINTS = 4
+_RECEIVER_DELAY = 0.02
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 11\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+    b'{"ok":true}'
+)
+
+
+class _StubReceiver:
+    """Keep-alive HTTP/1.1 server that reads the JSON body and answers 200."""
+
+    def __init__(self) -> None:
+        self.received = 0
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def __aexit__(self, *_exc: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                await asyncio.sleep(_RECEIVER_DELAY)
+                self.received += 1
+                writer.write(_RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _burst(
+    base_url: str, *, workers: int, store: SqliteWebhookDeliveryStore | None = None
+) -> tuple[float, list[float]]:
+    # The stub listens on loopback, which the SSRF guard rejects by default.
+    manager = WebhookDeliveryManager(
+        max_records=_DELIVERIES * 2, store=store, allow_private_targets=True
+    )
+    engine = WebhookDeliveryEngine(manager, workers=workers, endpoint_concurrency=4)
+    await engine.start()
+    started = time.perf_counter()
+    try:
+        for i in range(_DELIVERIES):
+            manager.enqueue("bench", f"{base_url}/hook/{i % _ENDPOINTS}", {"seq": i})
+        await engine.wait_idle(timeout=120.0)
+        elapsed = time.perf_counter() - started
+    finally:
+        await engine.stop()
+
+    records = manager.list_deliveries(limit=_DELIVERIES)
+    assert all(r.status == WebhookDeliveryStatus.DELIVERED for r in records)
+    latencies = [
+        (r.attempts[-1].timestamp + r.attempts[-1].duration_ms / 1000 - r.created_at) * 1000
+        for r in records
+    ]
+    return _DELIVERIES / elapsed, latencies
+
+
+def _p(values: list[float], quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def test_concurrent_workers_raise_delivery_throughput(tmp_path: Path) -> None:
+    stub = _StubReceiver()
+    async with stub as base_url:
+        serial_rate, serial_latency = await _burst(base_url, workers=1)
+        store = SqliteWebhookDeliveryStore(str(tmp_path / "deliveries.db"), owner="bench")
+        pooled_rate, pooled_latency = await _burst(base_url, workers=16, store=store)
+
+    assert stub.received == 2 * _DELIVERIES
+    assert store.claim_unfinished() == []  # every receipt reached the store
+    assert pooled_rate > serial_rate * 4, (
+        f"1 worker {serial_rate:.1f}/s p50 {statistics.median(serial_latency):.1f} ms "
+        f"p99 {_p(serial_latency, 0.99):.1f} ms; "
+        f"16 workers {pooled_rate:.1f}/s p50 {statistics.median(pooled_latency):.1f} ms "
+        f"p99 {_p(pooled_latency, 0.99):.1f} ms"
+    )
@@ -209,8 +209,9 @@ class TestHttpRequestAction:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=None)
 
-        with patch("agent33.workflows.actions.http_request.httpx") as m:
-            m.AsyncClient.return_value = mock_client
+        with patch(
+            "agent33.workflows.actions.http_request.pooled_client", return_value=mock_client
+        ):
             result = await http_request.execute(url="https://api.example.com/data")
 
         assert result["status_code"] == 200
@@ -218,7 +219,7 @@ class TestHttpRequestAction:
         assert result["body"] == '{"ok": true}'
         assert "content-type" in result["headers"]
         mock_client.request.assert_called_once_with(
-            "GET", "https://api.example.com/data", headers={}
+            "GET", "https://api.example.com/data", headers={}, timeout=30
         )
 
     async def test_http_request_post_json(self) -> None:
@@ -233,8 +234,9 @@ class TestHttpRequestAction:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=None)
 
-        with patch("agent33.workflows.actions.http_request.httpx") as m:
-            m.AsyncClient.return_value = mock_client
+        with patch(
+            "agent33.workflows.actions.http_request.pooled_client", return_value=mock_client
+        ):
             result = await http_request.execute(
                 url="https://api.example.com/items",
                 method="POST",
@@ -247,6 +249,7 @@ class TestHttpRequestAction:
             "POST",
             "https://api.example.com/items",
             headers={},
+            timeout=30,
             json={"name": "test"},
         )
 
@@ -262,8 +265,9 @@ class TestHttpRequestAction:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=None)
 
-        with patch("agent33.workflows.actions.http_request.httpx") as m:
-            m.AsyncClient.return_value = mock_client
+        with patch(
+            "agent33.workflows.actions.http_request.pooled_client", return_value=mock_client
+        ):
             result = await http_request.execute(
                 url="https://api.example.com",
                 headers={"Authorization": "Bearer tok123"},
@@ -276,6 +280,7 @@ class TestHttpRequestAction:
             "GET",
             "https://api.example.com",
             headers={"Authorization": "Bearer tok123"},
+            timeout=30,
         )
 
     async def test_http_request_text_body(self) -> None:
@@ -291,8 +296,9 @@ class TestHttpRequestAction:
         mock_client.__aenter__ = AsyncMock(return_value=mock_client)
         mock_client.__aexit__ = AsyncMock(return_value=None)
 
-        with patch("agent33.workflows.actions.http_request.httpx") as m:
-            m.AsyncClient.return_value = mock_client
+        with patch(
+            "agent33.workflows.actions.http_request.pooled_client", return_value=mock_client
+        ):
             result = await http_request.execute(
                 url="https://example.com",
                 method="PUT",
@@ -304,6 +310,7 @@ class TestHttpRequestAction:
             "PUT",
             "https://example.com",
             headers={},
+            timeout=30,
             content="raw text data",
         )
 
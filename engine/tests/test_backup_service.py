@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
 import tarfile
 from pathlib import Path
@@ -170,3 +172,191 @@ async def test_verify_detects_checksum_mismatch(tmp_path: Path) -> None:
     assert any(
         check.name.startswith("checksum:") and check.passed is False for check in verify.checks
     )
+
+
+def _service(root: Path, **settings_update: object) -> BackupService:
+    settings = _settings(root)
+    if settings_update:
+        settings = settings.model_copy(update=settings_update)
+    return BackupService(
+        backup_dir=root / "backups",
+        settings=settings,
+        app_root=root,
+        workspace_dir=None,
+    )
+
+
+@pytest.mark.asyncio()
+async def test_create_streams_without_staging_and_writes_manifest_first(tmp_path: Path) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path)
+
+    result = await service.create(mode=BackupMode.NO_WORKSPACE)
+
+    assert result.success is True
+    # Only the finished archive is left behind: no staging tree, no temp file.
+    assert [path.name for path in (tmp_path / "backups").iterdir()] == [
+        Path(result.archive_path).name
+    ]
+    with tarfile.open(result.archive_path, "r:gz") as archive:
+        names = archive.getnames()
+    assert names[0].endswith(f"/{MANIFEST_FILENAME}")
+    assert any(name.endswith("config/skills/skill.md") for name in names)
+
+
+@pytest.mark.asyncio()
+async def test_verify_accepts_legacy_staged_archives(tmp_path: Path) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path)
+    created = await service.create(mode=BackupMode.NO_WORKSPACE)
+
+    extract_dir = tmp_path / "legacy"
+    with tarfile.open(created.archive_path, "r:gz") as archive:
+        archive.extractall(extract_dir)
+    Path(created.archive_path).unlink()
+    legacy_archive = tmp_path / "backups" / "legacy.tar.gz"
+    write_tar_gz(next(extract_dir.iterdir()), legacy_archive)
+
+    verify = await service.verify(legacy_archive)
+
+    assert verify.valid is True
+    assert service.resolve_backup_path(created.backup_id) == legacy_archive
+
+
+@pytest.mark.asyncio()
+async def test_incremental_backup_only_writes_changed_files(tmp_path: Path) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path)
+
+    first = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+    assert first.success is True
+    assert first.incremental is True
+    assert first.files_written > 0
+    assert first.files_reused == 0
+
+    second = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+    assert second.success is True
+    assert second.files_written == 0
+    assert second.files_reused == first.files_written
+
+    (tmp_path / "skills" / "skill.md").write_text("# Skill v2\n", encoding="utf-8")
+    third = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+    assert third.success is True
+    assert third.files_written == 1
+
+    # The archive carries only the manifest; file data lives in the chunk store.
+    with tarfile.open(third.archive_path, "r:gz") as archive:
+        assert len(archive.getnames()) == 1
+    listing = service.list_backups()
+    assert listing.count == 3
+    assert all(backup.incremental for backup in listing.backups)
+
+
+@pytest.mark.asyncio()
+async def test_incremental_verify_detects_corrupt_and_missing_objects(tmp_path: Path) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path)
+    created = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+    assert created.manifest is not None
+    chunks = tmp_path / "backups" / "chunks"
+
+    skill_digest = created.manifest.file_index["config/skills/skill.md"]
+    skill_object = next(chunks.glob(f"*/{skill_digest}.*"))
+    skill_object.write_bytes(gzip.compress(b"tampered"))
+    corrupted = await service.verify(Path(created.archive_path))
+    assert corrupted.valid is False
+    assert any(
+        check.name == "checksum:config/skills" and not check.passed for check in corrupted.checks
+    )
+
+    skill_object.unlink()
+    missing = await service.verify(Path(created.archive_path))
+    assert any(
+        check.name == "asset_present:config/skills" and not check.passed
+        for check in missing.checks
+    )
+
+
+@pytest.mark.asyncio()
+async def test_prune_chunk_store_keeps_referenced_objects(tmp_path: Path) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path)
+    first = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+    (tmp_path / "skills" / "skill.md").write_text("# Skill v2\n", encoding="utf-8")
+    second = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+
+    assert service.prune_chunk_store() == 0
+    Path(first.archive_path).unlink()
+    assert service.prune_chunk_store() == 1
+    verify = await service.verify(Path(second.archive_path))
+    assert verify.valid is True
+
+
+@pytest.mark.asyncio()
+async def test_file_changed_after_inventory_is_stored_under_its_real_digest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path)
+    collect = service._collect
+
+    def collect_then_edit(mode: BackupMode) -> object:
+        inventory = collect(mode)
+        (tmp_path / "skills" / "skill.md").write_text("# Edited mid-backup\n", encoding="utf-8")
+        return inventory
+
+    monkeypatch.setattr(service, "_collect", collect_then_edit)
+    created = await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+
+    assert created.success is True
+    assert created.manifest is not None
+    digest = created.manifest.file_index["config/skills/skill.md"]
+    assert digest == hashlib.sha256(b"# Edited mid-backup\n").hexdigest()
+    inventoried = hashlib.sha256(b"# Skill\n").hexdigest()
+    assert not any((tmp_path / "backups" / "chunks").glob(f"*/{inventoried}.*"))
+    assert any("changed while the backup ran" in warning for warning in created.warnings)
+
+
+@pytest.mark.asyncio()
+async def test_retention_keeps_newest_archives_and_prunes_their_objects(tmp_path: Path) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path, backup_retention_count=2)
+    skill = tmp_path / "skills" / "skill.md"
+    created = []
+    for version in range(3):
+        skill.write_text(f"# Skill v{version}\n", encoding="utf-8")
+        created.append(await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True))
+
+    assert service.list_backups().count == 2
+    assert not Path(created[0].archive_path).exists()
+    first_skill = hashlib.sha256(b"# Skill v0\n").hexdigest()
+    assert not any((tmp_path / "backups" / "chunks").glob(f"*/{first_skill}.*"))
+    assert "Retention removed 1 older backup(s)" in created[2].warnings
+    assert (await service.verify(Path(created[1].archive_path))).valid is True
+
+
+@pytest.mark.asyncio()
+async def test_zstd_falls_back_to_gzip_when_unavailable(tmp_path: Path) -> None:
+    from agent33.backup.archive import zstd_available
+
+    if zstd_available():
+        pytest.skip("zstandard is installed")
+    _seed_tree(tmp_path)
+    service = _service(tmp_path, backup_compression="zstd")
+
+    result = await service.create(mode=BackupMode.CONFIG_ONLY)
+
+    assert result.success is True
+    assert result.archive_path.endswith(".tar.gz")
+
+
+@pytest.mark.asyncio()
+async def test_chunk_store_objects_use_configured_compression_level(tmp_path: Path) -> None:
+    _seed_tree(tmp_path)
+    service = _service(tmp_path, backup_compression="gzip", backup_compression_level=9)
+    await service.create(mode=BackupMode.NO_WORKSPACE, incremental=True)
+
+    objects = list((tmp_path / "backups" / "chunks").glob("*/*.gz"))
+    assert objects
+    # Byte 8 of a gzip header (XFL) is 2 only for level 9, "maximum compression".
+    assert all(path.read_bytes()[8] == 2 for path in objects)
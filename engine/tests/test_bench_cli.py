@@ -12,6 +12,8 @@ from agent33.cli.main import app
 if TYPE_CHECKING:
     from pathlib import Path
 
+    import pytest
+
 runner = CliRunner()
 
 
@@ -113,3 +115,49 @@ def test_bench_report_accepts_stdin() -> None:
 
     assert result.exit_code == 0
     assert "SkillsBench Report: stdin" in result.output
+
+
+def test_bench_stub_serves_the_configured_behavior(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from agent33.testing import stub_server
+
+    served: dict[str, object] = {}
+
+    def fake_serve(behavior: stub_server.StubBehavior, *, host: str, port: int) -> None:
+        served.update(behavior=behavior, host=host, port=port)
+
+    monkeypatch.setattr(stub_server, "serve", fake_serve)
+    script = tmp_path / "script.json"
+    script.write_text(json.dumps([{"content": "done"}]), encoding="utf-8")
+
+    result = runner.invoke(
+        app,
+        [
+            "bench",
+            "stub",
+            "--port",
+            "11600",
+            "--latency",
+            "lognormal:200:0.5",
+            "--tool-script",
+            str(script),
+            "--error-rate",
+            "0.05",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    behavior = served["behavior"]
+    assert isinstance(behavior, stub_server.StubBehavior)
+    assert behavior.latency == stub_server.LatencyDistribution("lognormal", (200.0, 0.5))
+    assert behavior.tool_script == (stub_server.ScriptStep(content="done"),)
+    assert behavior.error_rate == 0.05
+    assert served["port"] == 11600
+
+
+def test_bench_stub_rejects_a_bad_latency_spec() -> None:
+    result = runner.invoke(app, ["bench", "stub", "--latency", "gamma:3"])
+
+    assert result.exit_code == 1
+    assert "Invalid stub configuration" in result.output
@@ -36,7 +36,7 @@ def test_chat_completions_returns_openai_format(client: TestClient) -> None:
     mock_response.content = json.dumps(upstream_payload).encode("utf-8")
     mock_response.aread = AsyncMock(return_value=mock_response.content)
 
-    with patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls:
+    with patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls:
         mock_client = MagicMock()
         mock_client.build_request.return_value = mock_request
         mock_client.send = AsyncMock(return_value=mock_response)
@@ -58,7 +58,7 @@ def test_chat_completions_returns_openai_format(client: TestClient) -> None:
 def test_chat_completions_ollama_unavailable(client: TestClient) -> None:
     import httpx as _httpx
 
-    with patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls:
+    with patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls:
         mock_client = MagicMock()
         mock_client.build_request.return_value = MagicMock()
         mock_client.send = AsyncMock(side_effect=_httpx.ConnectError("refused"))
@@ -84,7 +84,7 @@ def test_chat_completions_boundary_governance_blocked_returns_503(
         "api:chat_proxy",
     )
 
-    with patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls:
+    with patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls:
         mock_client = MagicMock()
         mock_client.build_request.return_value = MagicMock()
         mock_client.send = AsyncMock()
@@ -119,7 +119,7 @@ def test_chat_completions_boundary_disabled_passes_through_when_connector_blocke
         "api:chat_proxy",
     )
 
-    with patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls:
+    with patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls:
         mock_client = MagicMock()
         mock_client.build_request.return_value = mock_request
         mock_client.send = AsyncMock(return_value=mock_response)
@@ -166,7 +166,7 @@ def test_chat_completions_openrouter_ref_uses_openrouter_proxy_settings(
     )
     monkeypatch.setattr(client.app.state, "model_router", model_router, raising=False)
 
-    with patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls:
+    with patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls:
         mock_client = MagicMock()
         mock_client.build_request.return_value = mock_request
         mock_client.send = AsyncMock(return_value=mock_response)
@@ -249,11 +249,11 @@ def test_chat_completions_server_default_openrouter_falls_back(
     )
     monkeypatch.setattr("agent33.config.settings.ollama_base_url", "http://ollama.test:11434")
 
-    with patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls:
+    with patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls:
         mock_client = MagicMock()
         captured_requests: list[tuple[str, str, dict[str, object]]] = []
 
-        def _build_request(method: str, url: str, *, json: dict[str, object], headers):  # type: ignore[no-untyped-def]
+        def _build_request(method: str, url: str, *, json: dict[str, object], headers, timeout):  # type: ignore[no-untyped-def]
             captured_requests.append((method, url, dict(json)))
             return MagicMock()
 
@@ -316,7 +316,7 @@ def test_chat_completions_explicit_openrouter_model_does_not_fallback(
         "ollama/qwen3-coder",
     )
 
-    with patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls:
+    with patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls:
         mock_client = MagicMock()
         mock_client.build_request.return_value = MagicMock()
         mock_client.send = AsyncMock(return_value=upstream_error)
@@ -381,7 +381,7 @@ def test_chat_completions_rebuilds_invalid_state_model_router(
             "agent33.api.routes.chat.build_model_router",
             return_value=rebuilt_router,
         ) as mock_build_router,
-        patch("agent33.api.routes.chat.httpx.AsyncClient") as mock_cls,
+        patch("agent33.connectors.http_pool.httpx.AsyncClient") as mock_cls,
     ):
         mock_client = MagicMock()
         mock_client.build_request.return_value = mock_request
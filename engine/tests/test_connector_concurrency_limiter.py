@@ -0,0 +1,318 @@
+"""Adaptive per-connector concurrency limiting at the connector boundary."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from agent33.config import settings
+from agent33.connectors.boundary import (
+    build_connector_boundary_executor,
+    map_connector_exception,
+)
+from agent33.connectors.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterRegistry,
+    ConcurrencyLimitExceededError,
+    ConcurrencyLimitMiddleware,
+    configure_concurrency_limiter_registry,
+    get_concurrency_limiter_registry,
+)
+from agent33.connectors.executor import ConnectorExecutor
+from agent33.connectors.middleware import MetricsMiddleware, TimeoutMiddleware
+from agent33.connectors.models import ConnectorRequest
+from agent33.observability.metrics import MetricsCollector
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry() -> Any:
+    configure_concurrency_limiter_registry(None)
+    yield
+    configure_concurrency_limiter_registry(None)
+
+
+# ======================================================================
+# Limiter admission and queueing
+# ======================================================================
+
+
+class TestLimiterAdmission:
+    async def test_admits_up_to_limit_then_queues_fifo(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=2)
+        assert await limiter.acquire() == 0.0
+        assert await limiter.acquire() == 0.0
+        assert limiter.in_flight == 2
+
+        order: list[str] = []
+
+        async def _waiter(tag: str) -> None:
+            await limiter.acquire()
+            order.append(tag)
+
+        first = asyncio.create_task(_waiter("first"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_waiter("second"))
+        await asyncio.sleep(0)
+        assert limiter.queued == 2
+
+        limiter.release()
+        await first
+        limiter.release()
+        await second
+        assert order == ["first", "second"]
+        assert limiter.in_flight == 2
+        assert limiter.queued == 0
+
+    async def test_sheds_when_queue_is_full(self) -> None:
+        metrics = MetricsCollector()
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=1, max_queue=1, metrics=metrics)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ConcurrencyLimitExceededError) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.reason == "queue_full"
+        assert limiter.snapshot()["shed_by_reason"] == {"queue_full": 1}
+        summary = metrics.get_summary()
+        assert summary["connector_requests_shed_total"] == {"connector=svc,reason=queue_full": 1}
+
+        limiter.release()
+        await waiter
+
+    async def test_sheds_when_queue_wait_exceeds_budget(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=1)
+        await limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitExceededError) as exc_info:
+            await limiter.acquire(timeout=0.02)
+        assert exc_info.value.reason == "deadline"
+        assert limiter.queued == 0
+        assert limiter.in_flight == 1
+
+    async def test_sheds_up_front_when_estimated_wait_exceeds_budget(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=1, max_limit=1)
+        await limiter.acquire()
+        limiter.release(2.0)  # average latency is now 2s
+        await limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitExceededError, match="estimated queue wait"):
+            await limiter.acquire(timeout=0.5)
+        assert limiter.total_queued == 0
+
+    async def test_cancelled_waiter_leaves_the_queue(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.in_flight == 0
+
+
+# ======================================================================
+# Limit adaptation
+# ======================================================================
+
+
+class TestLimitAdaptation:
+    def _saturate(self, limiter: AdaptiveConcurrencyLimiter, latency: float) -> None:
+        # Keep the limit in use so samples are not treated as app-limited.
+        limiter._in_flight = limiter.limit + 1
+        limiter.release(latency)
+
+    def test_grows_while_latency_stays_at_baseline(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=4, max_limit=10)
+        for _ in range(20):
+            self._saturate(limiter, 0.1)
+        assert limiter.limit == 10
+
+    def test_does_not_grow_when_limit_is_unused(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=4)
+        for _ in range(20):
+            limiter._in_flight = 1
+            limiter.release(0.1)
+        assert limiter.limit == 4
+
+    def test_shrinks_when_latency_inflates(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=20, min_limit=2)
+        self._saturate(limiter, 0.1)
+        start = limiter.limit
+        for _ in range(10):
+            self._saturate(limiter, 1.0)
+        assert limiter.limit < start
+        assert limiter.limit >= 2
+
+    def test_overload_backs_off_multiplicatively_to_floor(self) -> None:
+        metrics = MetricsCollector()
+        limiter = AdaptiveConcurrencyLimiter(
+            "svc", initial_limit=20, min_limit=3, backoff_ratio=0.5, metrics=metrics
+        )
+        limiter._in_flight = 1
+        limiter.release(overloaded=True)
+        assert limiter.limit == 10
+        for _ in range(5):
+            limiter._in_flight = 1
+            limiter.release(overloaded=True)
+        assert limiter.limit == 3
+        assert limiter.total_overloads == 6
+        assert metrics.get_summary()["connector_concurrency_limit(connector=svc)"]["min"] == 3.0
+
+    def test_raising_the_limit_wakes_queued_callers(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=1)
+        loop = asyncio.new_event_loop()
+        try:
+            waiter: asyncio.Future[None] = loop.create_future()
+            limiter._in_flight = 1
+            limiter._waiters.append(waiter)
+            limiter._set_limit(3)
+            limiter._wake()
+            assert waiter.done()
+            assert limiter.in_flight == 2
+        finally:
+            loop.close()
+
+
+# ======================================================================
+# Middleware and boundary wiring
+# ======================================================================
+
+
+class TestConcurrencyLimitMiddleware:
+    async def test_bounds_in_flight_calls_per_connector(self) -> None:
+        registry = ConcurrencyLimiterRegistry(initial_limit=2, min_limit=2, max_limit=2)
+        executor = ConnectorExecutor([ConcurrencyLimitMiddleware(registry), MetricsMiddleware()])
+        active = 0
+        peak = 0
+
+        async def _handler(_req: ConnectorRequest) -> str:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return "ok"
+
+        results = await asyncio.gather(
+            *(
+                executor.execute(
+                    ConnectorRequest(connector="llm:ollama", operation="chat"), _handler
+                )
+                for _ in range(6)
+            )
+        )
+        assert results == ["ok"] * 6
+        assert peak == 2
+        limiter = registry.get("llm:ollama")
+        assert limiter is not None
+        assert limiter.in_flight == 0
+        assert limiter.total_queued == 4
+
+    async def test_queue_time_is_charged_against_the_timeout(self) -> None:
+        registry = ConcurrencyLimiterRegistry(initial_limit=1, min_limit=1, max_limit=1)
+        executor = ConnectorExecutor(
+            [
+                ConcurrencyLimitMiddleware(registry, default_timeout_seconds=5.0),
+                TimeoutMiddleware(5.0),
+            ]
+        )
+        release = asyncio.Event()
+        seen: list[dict[str, Any]] = []
+
+        async def _handler(req: ConnectorRequest) -> str:
+            seen.append(dict(req.metadata))
+            if len(seen) == 1:
+                await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(
+            executor.execute(ConnectorRequest(connector="svc", operation="op"), _handler)
+        )
+        await asyncio.sleep(0)
+        second = asyncio.create_task(
+            executor.execute(ConnectorRequest(connector="svc", operation="op"), _handler)
+        )
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert "concurrency_wait_ms" not in seen[0]
+        assert seen[1]["concurrency_wait_ms"] > 0
+        assert seen[1]["timeout_seconds"] < 5.0
+
+    async def test_timeouts_shrink_the_limit(self) -> None:
+        registry = ConcurrencyLimiterRegistry(initial_limit=10, backoff_ratio=0.5)
+        executor = ConnectorExecutor([ConcurrencyLimitMiddleware(registry)])
+
+        async def _handler(_req: ConnectorRequest) -> str:
+            raise TimeoutError("slow upstream")
+
+        with pytest.raises(TimeoutError):
+            await executor.execute(ConnectorRequest(connector="svc", operation="op"), _handler)
+        limiter = registry.get("svc")
+        assert limiter is not None
+        assert limiter.limit == 5
+        assert limiter.in_flight == 0
+
+    async def test_rate_limit_responses_count_as_overload(self) -> None:
+        registry = ConcurrencyLimiterRegistry(initial_limit=10, backoff_ratio=0.5)
+        executor = ConnectorExecutor([ConcurrencyLimitMiddleware(registry)])
+        request = httpx.Request("POST", "http://upstream/v1/chat")
+
+        async def _rate_limited(_req: ConnectorRequest) -> str:
+            response = httpx.Response(429, request=request)
+            raise httpx.HTTPStatusError("429", request=request, response=response)
+
+        async def _bad_request(_req: ConnectorRequest) -> str:
+            response = httpx.Response(400, request=request)
+            raise httpx.HTTPStatusError("400", request=request, response=response)
+
+        req = ConnectorRequest(connector="svc", operation="op")
+        with pytest.raises(httpx.HTTPStatusError):
+            await executor.execute(req, _bad_request)
+        limiter = registry.get("svc")
+        assert limiter is not None
+        assert limiter.limit == 10
+        with pytest.raises(httpx.HTTPStatusError):
+            await executor.execute(req, _rate_limited)
+        assert limiter.limit == 5
+
+
+class TestBoundaryWiring:
+    def test_disabled_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "connector_boundary_enabled", True)
+        executor = build_connector_boundary_executor(default_timeout_seconds=5.0)
+        assert executor is not None
+        assert not any(isinstance(mw, ConcurrencyLimitMiddleware) for mw in executor._middlewares)
+
+    def test_inserted_after_governance_and_shared_across_executors(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "connector_boundary_enabled", True)
+        monkeypatch.setattr(settings, "connector_concurrency_limit_enabled", True)
+        monkeypatch.setattr(settings, "connector_concurrency_initial_limit", 3)
+
+        first = build_connector_boundary_executor(default_timeout_seconds=5.0)
+        second = build_connector_boundary_executor(default_timeout_seconds=5.0)
+        assert first is not None and second is not None
+        kinds = [type(mw).__name__ for mw in first._middlewares]
+        assert kinds[:3] == [
+            "GovernanceMiddleware",
+            "ConcurrencyLimitMiddleware",
+            "TimeoutMiddleware",
+        ]
+        registry = get_concurrency_limiter_registry()
+        assert registry is not None
+        assert second._middlewares[1]._registry is registry
+        assert registry.get_or_create("svc").limit == 3
+
+    def test_overload_errors_are_mapped(self) -> None:
+        exc = ConcurrencyLimitExceededError("svc", "queue_full", "connector svc overloaded")
+        mapped = map_connector_exception(exc, "svc", "op")
+        assert str(mapped).startswith("Connector overloaded for svc/op")
@@ -0,0 +1,267 @@
+"""Tiered embedding cache: shared and on-disk tiers, namespaces, promotion, metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import socket
+import sys
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+import pytest
+
+from agent33.memory.cache import EmbeddingCache
+from agent33.memory.embedding_tiers import DiskEmbeddingTier, RedisEmbeddingTier
+from agent33.observability.metrics import MetricsCollector
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+
+_REDIS_TEST_URL = os.environ.get("AGENT33_REDIS_TEST_URL", "redis://127.0.0.1:6379/15")
+
+
+class _Provider:
+    """Deterministic 8-dim embeddings that count provider calls."""
+
+    def __init__(self, model: str = "nomic-embed-text") -> None:
+        self.model = model
+        self.embedded: list[str] = []
+        self.closed = False
+
+    @staticmethod
+    def vector(text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode()).digest()
+        return [b / 255 for b in digest[:8]]
+
+    async def embed(self, text: str) -> list[float]:
+        self.embedded.append(text)
+        return self.vector(text)
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [self.vector(t) for t in texts]
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _DictTier:
+    """Stand-in for a shared tier (what Redis provides across replicas)."""
+
+    def __init__(self, name: str = "redis", fail: bool = False) -> None:
+        self.name = name
+        self.data: dict[str, bytes] = {}
+        self.fail = fail
+        self.gets = 0
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        self.gets += 1
+        if self.fail:
+            raise ConnectionError("tier down")
+        return [self.data.get(k) for k in keys]
+
+    async def set_many(self, items: Mapping[str, bytes]) -> None:
+        if self.fail:
+            raise ConnectionError("tier down")
+        self.data.update(items)
+
+    async def close(self) -> None:
+        pass
+
+
+def _cache(provider: _Provider, *tiers: Any, **kwargs: Any) -> EmbeddingCache:
+    return EmbeddingCache(provider, max_size=16, tiers=tiers, **kwargs)  # type: ignore[arg-type]
+
+
+def _close_to(actual: list[list[float]], texts: list[str]) -> bool:
+    return all(
+        a == pytest.approx(_Provider.vector(t), abs=1e-6)
+        for a, t in zip(actual, texts, strict=True)
+    )
+
+
+class TestSharedTier:
+    async def test_second_replica_reuses_first_replicas_embeddings(self) -> None:
+        shared = _DictTier()
+        first, second = _Provider(), _Provider()
+        await _cache(first, shared).embed_batch(["a", "b", "c"])
+
+        replica = _cache(second, shared)
+        result = await replica.embed_batch(["a", "b", "c", "d"])
+        assert second.embedded == ["d"]
+        assert shared.gets == 2  # one multi-get per batch
+        assert _close_to(result, ["a", "b", "c", "d"])
+        assert replica.tier_stats()["redis"] == {"lookups": 4, "hits": 3, "hit_rate": 0.75}
+
+        # Shared hits were promoted into the replica's in-process LRU.
+        await replica.embed("a")
+        assert replica.tier_stats()["memory"]["hits"] == 1
+        assert shared.gets == 2
+
+    async def test_failing_tier_falls_through_to_the_provider(self) -> None:
+        provider = _Provider()
+        cache = _cache(provider, _DictTier(fail=True))
+        assert _close_to([await cache.embed("x")], ["x"])
+        assert provider.embedded == ["x"]
+
+    async def test_model_swap_uses_a_new_namespace(self) -> None:
+        shared = _DictTier()
+        provider = _Provider()
+        cache = _cache(provider, shared)
+        await cache.embed("same text")
+        old_namespace = cache.namespace
+
+        provider.model = "bge-large-en"
+        cache.clear()
+        await cache.embed("same text")
+        assert provider.embedded == ["same text", "same text"]
+        assert {k.split(":")[0] for k in shared.data} == {old_namespace, cache.namespace}
+
+    async def test_lookups_are_counted_per_tier(self) -> None:
+        metrics = MetricsCollector()
+        shared = _DictTier()
+        await _cache(_Provider(), shared).embed("warm")
+        cache = _cache(_Provider(), shared, metrics=metrics)
+        await cache.embed_batch(["warm", "cold"])
+
+        counts = metrics.get_summary()["embedding_cache_lookups_total"]
+        assert counts == {
+            "outcome=miss,tier=memory": 2,
+            "outcome=hit,tier=redis": 1,
+            "outcome=miss,tier=redis": 1,
+        }
+
+
+class TestDiskTier:
+    async def test_restart_is_served_from_disk(self, tmp_path: Path) -> None:
+        first = _cache(_Provider(), DiskEmbeddingTier(tmp_path))
+        await first.embed_batch(["a", "b"])
+        await first.close()
+
+        provider = _Provider()
+        restarted = _cache(provider, DiskEmbeddingTier(tmp_path))
+        assert _close_to(await restarted.embed_batch(["a", "b"]), ["a", "b"])
+        assert provider.embedded == []
+        await restarted.close()
+
+    async def test_disk_hits_are_copied_to_the_shared_tier(self, tmp_path: Path) -> None:
+        await _cache(_Provider(), DiskEmbeddingTier(tmp_path)).embed("local")
+        shared = _DictTier()
+        cache = _cache(_Provider(), shared, DiskEmbeddingTier(tmp_path))
+        await cache.embed("local")
+        assert len(shared.data) == 1
+
+    async def test_quantized_vectors_round_trip(self, tmp_path: Path) -> None:
+        pytest.importorskip("numpy")
+        from agent33.memory.quantization import TurboQuantCompressor
+
+        compressor = TurboQuantCompressor(dim=8, bits=8)
+        first = _cache(_Provider(), DiskEmbeddingTier(tmp_path), compressor=compressor)
+        expected = await first.embed("q")
+        await first.close()
+
+        provider = _Provider()
+        restarted = _cache(provider, DiskEmbeddingTier(tmp_path), compressor=compressor)
+        assert await restarted.embed("q") == pytest.approx(expected, abs=0.05)
+        assert provider.embedded == []
+        assert restarted.namespace.endswith(".q8d8s42")
+
+        reseeded = _cache(
+            _Provider(), DiskEmbeddingTier(tmp_path), compressor=TurboQuantCompressor(8, 8, 7)
+        )
+        assert reseeded.namespace != restarted.namespace
+
+    async def test_processes_sharing_a_directory_keep_their_records_apart(
+        self, tmp_path: Path
+    ) -> None:
+        a, b = DiskEmbeddingTier(tmp_path), DiskEmbeddingTier(tmp_path)
+        await a.set_many({"m:" + "aa" * 32: b"AAAAAAAA"})
+        await b.set_many({"m:" + "bb" * 32: b"BBBBBBBB"})
+        await a.set_many({"m:" + "cc" * 32: b"CCCC"})
+
+        assert await a.get_many(["m:" + "aa" * 32, "m:" + "bb" * 32, "m:" + "cc" * 32]) == [
+            b"AAAAAAAA",
+            b"BBBBBBBB",
+            b"CCCC",
+        ]
+        assert await b.get_many(["m:" + "cc" * 32]) == [b"CCCC"]
+        await a.close()
+        await b.close()
+
+    async def test_torn_final_record_is_dropped(self, tmp_path: Path) -> None:
+        tier = DiskEmbeddingTier(tmp_path)
+        await _cache(_Provider(), tier).embed_batch(["a", "b"])
+        await tier.close()
+        [segment] = tmp_path.glob("*.emb")
+        segment.write_bytes(segment.read_bytes()[:-5])
+
+        provider = _Provider()
+        cache = _cache(provider, DiskEmbeddingTier(tmp_path))
+        await cache.embed_batch(["a", "b"])
+        assert provider.embedded == ["b"]
+
+    async def test_uncompressed_hits_match_the_provider_exactly(self, tmp_path: Path) -> None:
+        await _cache(_Provider(), DiskEmbeddingTier(tmp_path)).embed("exact")
+        restarted = _cache(_Provider(), DiskEmbeddingTier(tmp_path))
+        assert await restarted.embed("exact") == _Provider.vector("exact")
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses fcntl.flock")
+    async def test_lock_held_by_another_process_does_not_block_the_loop(
+        self, tmp_path: Path
+    ) -> None:
+        import fcntl
+
+        tier = DiskEmbeddingTier(tmp_path)
+        await tier.set_many({"m:" + "aa" * 32: b"AAAA"})
+        with open(tmp_path / "m.lock", "a+b") as other:
+            fcntl.flock(other.fileno(), fcntl.LOCK_EX)
+            release = threading.Timer(0.5, fcntl.flock, (other.fileno(), fcntl.LOCK_UN))
+            release.start()
+            loop = asyncio.get_running_loop()
+            lookup = asyncio.create_task(tier.get_many(["m:" + "bb" * 32]))
+            started = loop.time()
+            await asyncio.sleep(0.01)
+            assert loop.time() - started < 0.25
+            assert not lookup.done()
+            release.join()
+        assert await asyncio.wait_for(lookup, timeout=2.0) == [None]
+        await tier.close()
+
+    async def test_full_tier_stops_writing(self, tmp_path: Path) -> None:
+        tier = DiskEmbeddingTier(tmp_path, max_bytes=100)
+        await _cache(_Provider(), tier).embed_batch(["a", "b", "c"])
+        assert 0 < tier.size_bytes <= 100
+
+
+def _redis_reachable() -> bool:
+    parsed = urlparse(_REDIS_TEST_URL)
+    try:
+        with socket.create_connection((parsed.hostname or "127.0.0.1", parsed.port or 6379), 0.5):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not _redis_reachable(), reason=f"Redis not reachable at {_REDIS_TEST_URL}")
+async def test_redis_tier_shares_embeddings_between_caches() -> None:
+    import redis.asyncio as aioredis
+
+    prefix = f"agent33:test-embedding:{uuid.uuid4().hex}:"
+    client = aioredis.from_url(_REDIS_TEST_URL)
+    try:
+        await _cache(_Provider(), RedisEmbeddingTier(client, prefix=prefix)).embed_batch(["a"])
+        provider = _Provider()
+        cache = _cache(provider, RedisEmbeddingTier(client, prefix=prefix, ttl_seconds=60))
+        assert _close_to(await cache.embed_batch(["a"]), ["a"])
+        assert provider.embedded == []
+    finally:
+        leftovers = await client.keys(f"{prefix}*")
+        if leftovers:
+            await client.delete(*leftovers)
+        await client.aclose()
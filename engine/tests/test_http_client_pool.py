@@ -0,0 +1,138 @@
+"""Tests for the app-scoped pooled HTTP client registry."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from agent33.connectors.http_pool import (
+    ConnectorPoolLimits,
+    HTTPClientPool,
+    configure_http_client_pool,
+    get_http_client_pool,
+    parse_connector_limits,
+    pooled_client,
+)
+from agent33.workflows.actions import http_request
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+@pytest.fixture
+async def pool() -> AsyncIterator[HTTPClientPool]:
+    instance = HTTPClientPool(connector_limits={"tool:web_fetch": 4, "search:*": 8})
+    configure_http_client_pool(instance)
+    try:
+        yield instance
+    finally:
+        configure_http_client_pool(None)
+        await instance.aclose()
+
+
+class TestHTTPClientPool:
+    async def test_same_connector_shares_one_client(self, pool: HTTPClientPool) -> None:
+        first = pool.client("tool:reader")
+        assert pool.client("tool:reader") is first
+        assert pool.client("tool:web_fetch") is not first
+        snapshot = pool.snapshot()
+        assert snapshot["connectors"]["tool:reader"]["checkouts"] == 2
+
+    async def test_connector_limits_exact_then_glob_then_default(
+        self, pool: HTTPClientPool
+    ) -> None:
+        assert pool.limits_for("tool:web_fetch").max_connections == 4
+        assert pool.limits_for("tool:web_fetch").max_keepalive_connections == 4
+        assert pool.limits_for("search:brave").max_connections == 8
+        assert pool.limits_for("tool:reader") == ConnectorPoolLimits()
+
+    async def test_aclose_closes_clients_and_rejects_checkouts(self) -> None:
+        instance = HTTPClientPool()
+        client = instance.client("tool:reader")
+        await instance.aclose()
+        assert client.is_closed
+        with pytest.raises(RuntimeError):
+            instance.client("tool:reader")
+
+    async def test_http2_disabled_without_h2(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("agent33.connectors.http_pool.http2_available", lambda: False)
+        assert HTTPClientPool(http2=True).http2 is False
+
+    async def test_pooled_clients_do_not_keep_cookies(self, pool: HTTPClientPool) -> None:
+        client = pool.client("tool:web_fetch")
+        client.cookies.extract_cookies(
+            httpx.Response(
+                200,
+                headers={"set-cookie": "session=tenant-a; Path=/"},
+                request=httpx.Request("GET", "https://example.com/login"),
+            )
+        )
+        assert len(client.cookies.jar) == 0
+        request = client.build_request("GET", "https://example.com/account")
+        assert "cookie" not in request.headers
+
+    def test_parse_connector_limits_skips_malformed_entries(self) -> None:
+        parsed = parse_connector_limits("tool:web_fetch=20, search:*=5,bogus,=3,x=0,y=abc")
+        assert parsed == {"tool:web_fetch": 20, "search:*": 5}
+
+
+class TestPooledClient:
+    async def test_yields_shared_client_when_configured(self, pool: HTTPClientPool) -> None:
+        async with pooled_client("tool:reader") as client:
+            pass
+        assert client is pool.client("tool:reader")
+        assert not client.is_closed
+        assert get_http_client_pool() is pool
+
+    async def test_falls_back_to_per_call_client(self) -> None:
+        configure_http_client_pool(None)
+        async with pooled_client("tool:reader") as client:
+            assert not client.is_closed
+        assert client.is_closed
+
+    async def test_falls_back_after_pool_closed(self) -> None:
+        instance = HTTPClientPool()
+        configure_http_client_pool(instance)
+        try:
+            await instance.aclose()
+            async with pooled_client("tool:reader") as client:
+                pass
+            assert client.is_closed
+        finally:
+            configure_http_client_pool(None)
+
+    async def test_caller_jar_gets_a_per_call_client(self, pool: HTTPClientPool) -> None:
+        jar = httpx.Cookies()
+        async with pooled_client("tool:reader", cookies=jar) as client:
+            client.cookies.extract_cookies(
+                httpx.Response(
+                    200,
+                    headers={"set-cookie": "session=abc; Path=/"},
+                    request=httpx.Request("GET", "https://example.com/"),
+                )
+            )
+        assert client is not pool.client("tool:reader")
+        assert client.is_closed
+        assert jar.get("session") == "abc"
+
+    async def test_http_request_action_reuses_pooled_client(
+        self, pool: HTTPClientPool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        seen: list[httpx.Request] = []
+
+        def _handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        client = pool.client("workflow:http_request")
+        monkeypatch.setattr(client, "_transport", httpx.MockTransport(_handler))
+
+        for _ in range(3):
+            result = await http_request.execute(url="https://api.example.com/items")
+            assert result["json"] == {"ok": True}
+
+        assert len(seen) == 3
+        assert seen[0].extensions["timeout"]["read"] == 30
+        assert pool.client("workflow:http_request") is client
@@ -1,6 +1,6 @@
 """Tests for the http_request workflow action.
 
-Covers SSRF protection (_is_private_url), execute() happy/error paths,
+Covers SSRF protection (is_private_url), execute() happy/error paths,
 header handling, dry-run mode, method propagation, and edge cases.
 """
 
@@ -12,8 +12,8 @@ import httpx
 import pytest
 
 from agent33.workflows.actions.http_request import (
-    _is_private_url,
     execute,
+    is_private_url,
 )
 
 _PATCH_BOUNDARY = "agent33.workflows.actions.http_request.build_connector_boundary_executor"
@@ -21,7 +21,7 @@ _PATCH_CLIENT = "agent33.workflows.actions.http_request.httpx.AsyncClient"
 
 
 # ---------------------------------------------------------------------------
-# _is_private_url: SSRF protection
+# is_private_url: SSRF protection
 # ---------------------------------------------------------------------------
 
 
@@ -60,7 +60,7 @@ class TestIsPrivateUrl:
         ],
     )
     def test_blocks_private_addresses(self, url: str) -> None:
-        assert _is_private_url(url) is True
+        assert is_private_url(url) is True
 
     @pytest.mark.parametrize(
         "url",
@@ -76,7 +76,7 @@ class TestIsPrivateUrl:
         ],
     )
     def test_blocks_private_ipv6(self, url: str) -> None:
-        assert _is_private_url(url) is True
+        assert is_private_url(url) is True
 
     @pytest.mark.parametrize(
         "url",
@@ -94,11 +94,11 @@ class TestIsPrivateUrl:
         ],
     )
     def test_allows_public_addresses(self, url: str) -> None:
-        assert _is_private_url(url) is False
+        assert is_private_url(url) is False
 
     def test_missing_hostname_returns_false(self) -> None:
         """A URL with no hostname (e.g. relative path) is not flagged."""
-        assert _is_private_url("/relative/path") is False
+        assert is_private_url("/relative/path") is False
 
 
 # ---------------------------------------------------------------------------
@@ -196,7 +196,7 @@ class TestExecuteRequests:
         assert result["body"] == '{"result": "ok"}'
         assert "content-type" in result["headers"]
         mock_client.request.assert_called_once_with(
-            "GET", "https://api.example.com/data", headers={}
+            "GET", "https://api.example.com/data", headers={}, timeout=30
         )
 
     @patch(_PATCH_BOUNDARY, return_value=None)
@@ -293,5 +293,6 @@ class TestExecuteRequests:
         ) as mock_cls:
             await execute(url="https://example.com/api", timeout_seconds=60)
 
-        # AsyncClient was constructed with the custom timeout
-        mock_cls.assert_called_once_with(timeout=60, follow_redirects=False)
+        # The timeout travels per request so pooled clients can honour it too
+        mock_cls.assert_called_once_with(follow_redirects=False)
+        assert mock_client.request.call_args.kwargs["timeout"] == 60
@@ -0,0 +1,260 @@
+"""Exact-match and semantic LLM response cache in front of ModelRouter."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from agent33.llm.base import ChatMessage, LLMResponse, ToolCall, ToolCallFunction
+from agent33.llm.response_cache import (
+    LLMResponseCache,
+    response_cache_policy,
+    response_cache_tenant,
+)
+from agent33.llm.router import ModelRouter
+from agent33.observability.metrics import CostTracker, MetricsCollector
+
+
+class _CountingProvider:
+    def __init__(self, tool_calls: list[ToolCall] | None = None) -> None:
+        self.calls = 0
+        self.tool_calls = tool_calls
+
+    async def complete(
+        self,
+        messages: list[ChatMessage],
+        *,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+    ) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(
+            content=f"answer {self.calls}",
+            model=model,
+            prompt_tokens=1000,
+            completion_tokens=500,
+            tool_calls=self.tool_calls,
+        )
+
+
+class _KeywordEmbedder:
+    """Embeds text as a bag of known words, so near-identical prompts align."""
+
+    _VOCAB = ("deploy", "failed", "retry", "database", "login", "the", "on", "friday")
+
+    async def embed(self, text: str) -> list[float]:
+        words = text.lower().replace(".", " ").split()
+        return [float(words.count(term)) for term in self._VOCAB]
+
+
+def _router(provider: _CountingProvider, cache: LLMResponseCache) -> ModelRouter:
+    return ModelRouter(providers={"ollama": provider}, response_cache=cache)
+
+
+def _user(text: str) -> list[ChatMessage]:
+    return [
+        ChatMessage(role="system", content="Summarize."),
+        ChatMessage(role="user", content=text),
+    ]
+
+
+class TestExactTier:
+    async def test_identical_deterministic_requests_hit_cache(self) -> None:
+        provider = _CountingProvider()
+        router = _router(provider, LLMResponseCache())
+
+        first = await router.complete(_user("hello"), model="llama3", temperature=0.0)
+        second = await router.complete(_user("hello  "), model="llama3", temperature=0.0)
+
+        assert provider.calls == 1
+        assert second.content == first.content
+        assert (second.prompt_tokens, second.completion_tokens) == (0, 0)
+
+    async def test_key_covers_model_params_and_tools(self) -> None:
+        provider = _CountingProvider()
+        router = _router(provider, LLMResponseCache())
+        await router.complete(_user("hello"), model="llama3", temperature=0.0)
+        await router.complete(_user("hello"), model="llama3.1", temperature=0.0)
+        await router.complete(_user("hello"), model="llama3", temperature=0.0, max_tokens=10)
+        await router.complete(
+            _user("hello"), model="llama3", temperature=0.0, tools=[{"name": "search"}]
+        )
+        assert provider.calls == 4
+
+    async def test_sampled_requests_bypass_cache_unless_opted_in(self) -> None:
+        provider = _CountingProvider()
+        router = _router(provider, LLMResponseCache())
+        await router.complete(_user("hello"), model="llama3", temperature=0.7)
+        await router.complete(_user("hello"), model="llama3", temperature=0.7)
+        assert provider.calls == 2
+
+        with response_cache_policy("exact"):
+            await router.complete(_user("hello"), model="llama3", temperature=0.7)
+            await router.complete(_user("hello"), model="llama3", temperature=0.7)
+        assert provider.calls == 3
+
+        with response_cache_policy("off"):
+            await router.complete(_user("hello"), model="llama3", temperature=0.7)
+        assert provider.calls == 4
+
+    async def test_tenants_are_isolated(self) -> None:
+        provider = _CountingProvider()
+        router = _router(provider, LLMResponseCache())
+        with response_cache_tenant("acme"):
+            await router.complete(_user("hello"), model="llama3", temperature=0.0)
+        with response_cache_tenant("globex"):
+            await router.complete(_user("hello"), model="llama3", temperature=0.0)
+        with response_cache_tenant("acme"):
+            await router.complete(_user("hello"), model="llama3", temperature=0.0)
+        assert provider.calls == 2
+
+    async def test_ttl_and_size_eviction(self) -> None:
+        now = [0.0]
+        provider = _CountingProvider()
+        cache = LLMResponseCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        router = _router(provider, cache)
+        for text in ("a", "b", "c"):
+            await router.complete(_user(text), model="llama3", temperature=0.0)
+        assert len(cache) == 2
+        await router.complete(_user("a"), model="llama3", temperature=0.0)
+        assert provider.calls == 4
+
+        now[0] = 11.0
+        await router.complete(_user("c"), model="llama3", temperature=0.0)
+        assert provider.calls == 5
+
+    async def test_tool_call_responses_are_not_cached(self) -> None:
+        call = ToolCall(id="1", function=ToolCallFunction(name="search", arguments="{}"))
+        provider = _CountingProvider(tool_calls=[call])
+        router = _router(provider, LLMResponseCache())
+        await router.complete(_user("hello"), model="llama3", temperature=0.0)
+        await router.complete(_user("hello"), model="llama3", temperature=0.0)
+        assert provider.calls == 2
+
+
+class TestSemanticTier:
+    async def test_near_identical_utility_prompts_reuse_answer(self) -> None:
+        provider = _CountingProvider()
+        cache = LLMResponseCache(embedder=_KeywordEmbedder(), semantic_threshold=0.95)
+        router = _router(provider, cache)
+        with response_cache_policy("semantic"):
+            await router.complete(
+                _user("The deploy failed on Friday."), model="llama3", temperature=0
+            )
+            hit = await router.complete(
+                _user("the deploy failed on friday"), model="llama3", temperature=0
+            )
+            await router.complete(_user("Database login retry"), model="llama3", temperature=0)
+
+        assert provider.calls == 2
+        assert hit.content == "answer 1"
+        assert cache.stats()["semantic_hits"] == 1
+
+    async def test_semantic_tier_requires_matching_prefix(self) -> None:
+        provider = _CountingProvider()
+        cache = LLMResponseCache(embedder=_KeywordEmbedder(), semantic_threshold=0.95)
+        router = _router(provider, cache)
+        other_system = [
+            ChatMessage(role="system", content="Translate."),
+            ChatMessage(role="user", content="the deploy failed on friday"),
+        ]
+        with response_cache_policy("semantic"):
+            await router.complete(
+                _user("The deploy failed on Friday."), model="llama3", temperature=0
+            )
+            await router.complete(other_system, model="llama3", temperature=0)
+        assert provider.calls == 2
+
+    async def test_default_policy_never_uses_semantic_tier(self) -> None:
+        provider = _CountingProvider()
+        cache = LLMResponseCache(embedder=_KeywordEmbedder(), semantic_threshold=0.95)
+        router = _router(provider, cache)
+        await router.complete(_user("The deploy failed on Friday."), model="llama3", temperature=0)
+        await router.complete(_user("the deploy failed on friday"), model="llama3", temperature=0)
+        assert provider.calls == 2
+
+    async def test_only_the_subject_is_embedded(self) -> None:
+        provider = _CountingProvider()
+        cache = LLMResponseCache(embedder=_KeywordEmbedder(), semantic_threshold=0.95)
+        router = _router(provider, cache)
+
+        async def _title(subject: str, template: str = "Title this: {}") -> LLMResponse:
+            with response_cache_policy("semantic", subject=subject):
+                return await router.complete(
+                    [ChatMessage(role="user", content=template.format(subject))],
+                    model="llama3",
+                    temperature=0,
+                )
+
+        await _title("The deploy failed on Friday.")
+        hit = await _title("the deploy failed on friday")
+        # Same words in the subject, different instruction around it.
+        await _title("the deploy failed on friday", template="Summarize this: {}")
+        # Same instruction, different subject: the template alone never matches.
+        await _title("Database login retry")
+
+        assert hit.content == "answer 1"
+        assert provider.calls == 3
+
+    async def test_semantic_policy_respects_temperature_and_length(self) -> None:
+        provider = _CountingProvider()
+        cache = LLMResponseCache(
+            embedder=_KeywordEmbedder(), semantic_threshold=0.95, semantic_max_chars=40
+        )
+        router = _router(provider, cache)
+        long_text = "the deploy failed on friday " * 3
+        with response_cache_policy("semantic"):
+            for _ in range(2):
+                await router.complete(_user("the deploy failed"), model="llama3", temperature=0.3)
+            await router.complete(_user(long_text), model="llama3", temperature=0)
+            await router.complete(_user(long_text + "again"), model="llama3", temperature=0)
+        assert provider.calls == 4
+        assert len(cache) == 2
+
+    async def test_semantic_index_is_bounded_across_buckets(self) -> None:
+        provider = _CountingProvider()
+        cache = LLMResponseCache(
+            embedder=_KeywordEmbedder(), semantic_threshold=0.95, semantic_max_entries=3
+        )
+        router = _router(provider, cache)
+        with response_cache_policy("semantic"):
+            for n in range(10):
+                await router.complete(
+                    [
+                        ChatMessage(role="system", content=f"Task {n}"),
+                        ChatMessage(role="user", content="the deploy failed"),
+                    ],
+                    model="llama3",
+                    temperature=0,
+                )
+        assert sum(len(bucket) for bucket in cache._semantic.values()) == 3
+        assert len(cache._semantic) == 3
+
+
+class TestCostAccounting:
+    async def test_hits_are_recorded_as_savings_per_tenant(self) -> None:
+        tracker = CostTracker(pricing={"llama3": {"input": 1.0, "output": 2.0}})
+        metrics = MetricsCollector()
+        provider = _CountingProvider()
+        router = _router(provider, LLMResponseCache(cost_tracker=tracker, metrics=metrics))
+        with response_cache_tenant("acme"):
+            for _ in range(3):
+                await router.complete(_user("hello"), model="llama3", temperature=0.0)
+
+        savings = tracker.get_cache_savings("tenant:acme")
+        assert savings["hits"] == 2
+        assert savings["tokens_in"] == 2000
+        assert savings["cost"] == pytest.approx(2 * (1.0 + 1.0))
+        assert tracker.get_cost().total_cost == 0.0
+        assert metrics.get_summary()["llm_response_cache_total"] == {
+            "outcome=exact": 2,
+            "outcome=miss": 1,
+        }
+
+
+def test_unknown_policy_is_rejected() -> None:
+    with pytest.raises(ValueError), response_cache_policy("always"):
+        pass
@@ -0,0 +1,208 @@
+"""Batching of small utility completions (titles, summaries, query expansion)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from agent33.agents.title_generator import generate_titles
+from agent33.llm.base import ChatMessage, LLMResponse
+from agent33.llm.batching import UtilityBatcher
+from agent33.llm.router import ModelRouter
+from agent33.memory.observation import Observation
+from agent33.memory.query_expansion import QueryExpander
+from agent33.memory.summarizer import SessionSummarizer
+from agent33.memory.title_generator import TitleGenerator
+from agent33.observability.metrics import MetricsCollector
+
+
+class _StubProvider:
+    """Answers packed requests with JSON and single requests with plain text.
+
+    ``drop`` lists packed ids the stub leaves out; ``fail_on`` lists inputs
+    whose single request raises; ``garble`` makes every packed answer invalid.
+    """
+
+    def __init__(
+        self,
+        *,
+        drop: set[int] | None = None,
+        fail_on: set[str] | None = None,
+        garble: bool = False,
+        answer: str = "out",
+    ) -> None:
+        self.drop = drop or set()
+        self.fail_on = fail_on or set()
+        self.garble = garble
+        self.answer = answer
+        self.packed_calls = 0
+        self.single_calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def complete(
+        self,
+        messages: list[ChatMessage],
+        *,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+    ) -> LLMResponse:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+        finally:
+            self.in_flight -= 1
+        user = str(messages[-1].content)
+        if user.startswith("[{"):
+            self.packed_calls += 1
+            if self.garble:
+                content = "Sure! Here are your titles..."
+            else:
+                items = json.loads(user)
+                content = json.dumps(
+                    {
+                        "results": [
+                            {"id": item["id"], "output": f"{self.answer}:{item['input']}"}
+                            for item in items
+                            if item["id"] not in self.drop
+                        ]
+                    }
+                )
+        else:
+            self.single_calls += 1
+            if user in self.fail_on:
+                raise RuntimeError(f"provider rejected {user}")
+            content = f"{self.answer}:{user}"
+        return LLMResponse(content=content, model=model, prompt_tokens=10, completion_tokens=10)
+
+
+def _batcher(provider: _StubProvider, **kwargs: Any) -> UtilityBatcher:
+    return UtilityBatcher(ModelRouter(providers={"ollama": provider}), **kwargs)
+
+
+class TestUtilityBatcher:
+    async def test_packs_items_and_demultiplexes_in_order(self) -> None:
+        provider = _StubProvider()
+        batcher = _batcher(provider, max_batch_size=4)
+        inputs = [f"item-{i}" for i in range(10)]
+
+        results = await batcher.run("Title it.", inputs, model="llama3.2")
+
+        assert [r.content for r in results] == [f"out:item-{i}" for i in range(10)]
+        assert provider.packed_calls == 3
+        assert provider.single_calls == 0
+
+    async def test_missing_packed_items_are_retried_individually(self) -> None:
+        metrics = MetricsCollector()
+        provider = _StubProvider(drop={1})
+        batcher = _batcher(provider, metrics=metrics)
+
+        results = await batcher.run("Title it.", ["a", "b", "c"], model="llama3.2")
+
+        assert [r.content for r in results] == ["out:a", "out:b", "out:c"]
+        assert provider.single_calls == 1
+        assert metrics.get_summary()["llm_utility_batch_items_total"] == {
+            "outcome=packed": 2,
+            "outcome=single": 1,
+            "outcome=unpacked": 1,
+        }
+
+    async def test_failures_are_isolated_per_item(self) -> None:
+        provider = _StubProvider(garble=True, fail_on={"b"})
+        batcher = _batcher(provider)
+
+        results = await batcher.run("Title it.", ["a", "b", "c"], model="llama3.2")
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].error is not None and "provider rejected b" in results[1].error
+
+    async def test_auto_mode_stops_packing_for_model_that_cannot(self) -> None:
+        provider = _StubProvider(garble=True)
+        batcher = _batcher(provider, max_pack_failures=2)
+
+        for _ in range(3):
+            await batcher.run("Title it.", ["a", "b"], model="tiny")
+
+        assert provider.packed_calls == 2
+        assert not batcher.packs("tiny")
+        assert batcher.packs("llama3.2")
+
+    async def test_concurrent_mode_bounds_in_flight_requests(self) -> None:
+        provider = _StubProvider()
+        batcher = _batcher(provider, mode="concurrent", max_concurrency=3)
+
+        results = await batcher.run("Title it.", [str(i) for i in range(12)], model="llama3.2")
+
+        assert all(r.ok for r in results)
+        assert provider.packed_calls == 0
+        assert provider.peak <= 3
+
+    def test_unknown_mode_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            _batcher(_StubProvider(), mode="eager")
+
+
+class TestBulkEntryPoints:
+    async def test_session_titles_fall_back_per_item(self) -> None:
+        provider = _StubProvider(garble=True, fail_on={"First message: bad one"})
+        router = ModelRouter(providers={"ollama": provider})
+        generator = TitleGenerator(router=router)
+
+        titles = await generator.generate_many(["good one", "bad one", ""])
+
+        assert titles == ["out:First message: good one", "bad one", ""]
+
+    async def test_exchange_titles(self) -> None:
+        provider = _StubProvider(answer="Deploy fix\n")
+        titles = await generate_titles(
+            [("fix the deploy", "done"), ("and the tests", "done too")], _batcher(provider)
+        )
+        # The stub echoes the exchange after the title; only the first line is kept.
+        assert titles == ["Deploy fix", "Deploy fix"]
+        assert provider.packed_calls == 1
+
+    async def test_query_expansion_many(self) -> None:
+        class _ExpansionProvider(_StubProvider):
+            async def complete(self, messages: list[ChatMessage], **kwargs: Any) -> LLMResponse:
+                items = json.loads(str(messages[-1].content))
+                rows = [
+                    {"id": item["id"], "output": {"keywords": ["k"], "sub_queries": ["alt"]}}
+                    for item in items
+                ]
+                return LLMResponse(
+                    content=json.dumps({"results": rows}),
+                    model=kwargs["model"],
+                    prompt_tokens=30,
+                    completion_tokens=30,
+                )
+
+        router = ModelRouter(providers={"ollama": _ExpansionProvider()})
+        expander = QueryExpander(_router=router)
+
+        expanded = await expander.expand_many(["how do I rotate keys", "short", "vault setup?"])
+
+        assert expanded[0].expanded_text == "how do I rotate keys alt"
+        assert expanded[0].keywords == ["k"]
+        assert expanded[0].expansion_tokens_used == 30
+        assert expanded[1].expanded_text == "short"
+
+    async def test_session_summaries_many(self) -> None:
+        provider = _StubProvider(garble=True, fail_on=set())
+        router = ModelRouter(providers={"ollama": provider})
+        summarizer = SessionSummarizer(router)
+        sessions = [
+            [Observation(session_id="s1", agent_name="a", event_type="tool", content="ran ls")],
+            [Observation(session_id="s2", agent_name="b", event_type="tool", content="ran pwd")],
+        ]
+
+        summaries = await summarizer.summarize_many(sessions)
+
+        assert len(summaries) == 2
+        assert "ran ls" in summaries[0]["summary"]
+        assert "ran pwd" in summaries[1]["summary"]
@@ -0,0 +1,255 @@
+"""Structure and analysis logic of the multi-replica scaling suite (load-tests/scaling.py).
+
+These tests do not start engine replicas or run Locust. They load the runner
+module directly to exercise its CSV parsing, curve building and budget
+checks, and parse the scaling locustfile via AST (see
+test_load_harness_structure.py for why Locust is not imported in-process).
+"""
+
+from __future__ import annotations
+
+import ast
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from agent33.state_paths import RuntimeStatePaths
+from agent33.workflows.definition import WorkflowDefinition
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+LOAD_TESTS_DIR = REPO_ROOT / "load-tests"
+ENGINE_DIR = REPO_ROOT / "engine"
+
+SCALING_USER_CLASSES = [
+    "WorkflowExecutionUser",
+    "MemorySearchUser",
+    "StreamingUser",
+    "WebhookIngestionUser",
+]
+
+_STATS_HEADER = (
+    "Type,Name,Request Count,Failure Count,Median Response Time,Average Response Time,"
+    "Min Response Time,Max Response Time,Average Content Size,Requests/s,Failures/s,"
+    "50%,66%,75%,80%,90%,95%,98%,99%,99.9%,99.99%,100%"
+)
+
+
+@pytest.fixture(scope="module")
+def scaling() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("scaling", LOAD_TESTS_DIR / "scaling.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["scaling"] = module  # dataclasses resolve annotations through sys.modules
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write_stats(path: Path, rows: list[tuple[str, str, int, int, float, int, int, int]]) -> Path:
+    lines = [_STATS_HEADER]
+    for kind, name, requests, failures, rps, p50, p95, p99 in rows:
+        lines.append(
+            f"{kind},{name},{requests},{failures},{p50},{p50},1,{p99},10,{rps},0.0,"
+            f"{p50},{p50},{p50},{p50},{p95},{p95},{p99},{p99},{p99},{p99},{p99}"
+        )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _result(
+    scaling: ModuleType,
+    name: str,
+    replicas: int,
+    rps: float,
+    p99: float = 100.0,
+    failures: int = 0,
+) -> object:
+    return scaling.ScenarioResult(name, replicas, 1000, failures, rps, 50.0, 80.0, p99)
+
+
+class TestScenarioFile:
+    def test_scaling_scenario_loads(self, scaling: ModuleType) -> None:
+        config = scaling.load_config(LOAD_TESTS_DIR / "scenarios" / "scaling.yaml")
+        assert config.replicas[0] == 1
+        assert len(config.replicas) >= 2
+        assert config.users_per_replica > 0
+        assert config.budgets.max_failure_rate < 0.05
+        assert 0 < config.budgets.min_scaling_efficiency <= 1
+
+    def test_profile_and_readme_document_the_suite(self) -> None:
+        profile = (LOAD_TESTS_DIR / "profiles" / "multi-replica-scaling.md").read_text("utf-8")
+        readme = (LOAD_TESTS_DIR / "README.md").read_text(encoding="utf-8")
+        assert "p99-regression-pct" in profile
+        assert "scaling.py --update-baseline" in readme
+
+    def test_seeded_workflow_is_valid(self, scaling: ModuleType) -> None:
+        definition = WorkflowDefinition.model_validate(scaling.SCALING_WORKFLOW)
+        assert [step.action for step in definition.steps] == ["transform", "invoke-agent"]
+
+    def test_replica_state_stays_under_approved_roots(self, scaling: ModuleType) -> None:
+        env = scaling.replica_env("var/scaling/run/n2", "http://127.0.0.1:18099")
+        paths = RuntimeStatePaths.from_app_root(ENGINE_DIR)
+        for key in ("ORCHESTRATION_STATE_DB_PATH", "OPERATOR_SESSION_DB_PATH"):
+            assert paths.ensure_approved(env[key]).is_relative_to(paths.app_var_dir)
+        assert env["ORCHESTRATION_STATE_BACKEND"] == "sqlite"
+
+
+class TestAnalysis:
+    def test_locust_stats_are_parsed(self, scaling: ModuleType, tmp_path: Path) -> None:
+        stats = _write_stats(
+            tmp_path / "n2_stats.csv",
+            [
+                ("POST", "/v1/memory/search", 400, 4, 20.5, 40, 90, 120),
+                ("", "Aggregated", 400, 4, 20.5, 40, 90, 120),
+            ],
+        )
+        [search, total] = scaling.parse_locust_stats(stats, 2)
+        assert (search.name, search.replicas, search.rps, search.p99_ms) == (
+            "/v1/memory/search",
+            2,
+            20.5,
+            120.0,
+        )
+        assert search.failure_rate == pytest.approx(0.01)
+        assert total.name == scaling.AGGREGATED
+
+    def test_unmeasured_percentiles_read_as_zero(
+        self, scaling: ModuleType, tmp_path: Path
+    ) -> None:
+        stats = tmp_path / "n1_stats.csv"
+        stats.write_text(
+            _STATS_HEADER + "\nWS,/v1/stream/agent/[id],0,0,0,0,0,0,0,0.0,0.0,"
+            "N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A,N/A\n",
+            encoding="utf-8",
+        )
+        [row] = scaling.parse_locust_stats(stats, 1)
+        assert (row.requests, row.p99_ms, row.failure_rate) == (0, 0.0, 0.0)
+
+    def test_scaling_efficiency_is_relative_to_one_replica(self, scaling: ModuleType) -> None:
+        results = [
+            _result(scaling, "Aggregated", 1, 100.0),
+            _result(scaling, "Aggregated", 2, 180.0),
+            _result(scaling, "Aggregated", 4, 200.0),
+        ]
+        efficiency = scaling.scaling_efficiency(results)
+        assert efficiency[("Aggregated", 2)] == pytest.approx(0.9)
+        assert efficiency[("Aggregated", 4)] == pytest.approx(0.5)
+
+    def test_budgets_pass_for_a_run_matching_the_baseline(self, scaling: ModuleType) -> None:
+        results = [
+            _result(scaling, "Aggregated", 1, 100.0),
+            _result(scaling, "Aggregated", 2, 190.0),
+        ]
+        baseline = scaling.baseline_from(results)
+        assert scaling.check_budgets(results, scaling.Budgets(), baseline) == []
+
+    def test_regressions_and_poor_scaling_fail_the_run(self, scaling: ModuleType) -> None:
+        baseline = scaling.baseline_from(
+            [_result(scaling, "Aggregated", 1, 100.0), _result(scaling, "Aggregated", 2, 190.0)]
+        )
+        results = [
+            _result(scaling, "Aggregated", 1, 100.0, p99=140.0),
+            _result(scaling, "Aggregated", 2, 110.0, failures=50),
+        ]
+        violations = scaling.check_budgets(results, scaling.Budgets(), baseline)
+        assert any("Aggregated @ 1 replica(s): p99 140 ms" in v for v in violations)
+        assert any("110.0 req/s is below baseline 190.0" in v for v in violations)
+        assert any("failure rate 5.00%" in v for v in violations)
+        assert any("scaling efficiency 0.55" in v for v in violations)
+
+    def test_report_files_are_written(self, scaling: ModuleType, tmp_path: Path) -> None:
+        results = [
+            _result(scaling, "/v1/memory/search", 1, 50.0),
+            _result(scaling, "Aggregated", 1, 100.0),
+            _result(scaling, "Aggregated", 2, 150.0),
+        ]
+        violations = scaling.check_budgets(results, scaling.Budgets())
+        report = scaling.write_report(results, violations, tmp_path)
+
+        assert violations == []
+        curves = (tmp_path / "curves.csv").read_text(encoding="utf-8").splitlines()
+        assert curves[0].startswith("name,replicas,requests")
+        assert curves[2] == "Aggregated,2,1000,0,150.00,50,80,100,0.75"
+        assert "PASS" in report.read_text(encoding="utf-8")
+        assert (tmp_path / "results.json").is_file()
+
+
+class TestScalingLocustfile:
+    def test_defines_the_four_scenarios(self) -> None:
+        source = (LOAD_TESTS_DIR / "scaling_locustfile.py").read_text(encoding="utf-8")
+        classes = {
+            node.name: node for node in ast.parse(source).body if isinstance(node, ast.ClassDef)
+        }
+        for name in SCALING_USER_CLASSES:
+            assert name in classes, f"scaling_locustfile.py does not define {name}"
+            assert [b.id for b in classes[name].bases if isinstance(b, ast.Name)] == [
+                "ReplicaUser"
+            ]
+            assigned = {
+                target.id
+                for item in classes[name].body
+                if isinstance(item, ast.Assign)
+                for target in item.targets
+                if isinstance(target, ast.Name)
+            }
+            assert {"weight", "wait_time"} <= assigned
+
+    def test_importable_outside_pytest(self) -> None:
+        pytest.importorskip("locust")
+        locustfile = LOAD_TESTS_DIR / "scaling_locustfile.py"
+        script = (
+            "import importlib.util; "
+            f"spec = importlib.util.spec_from_file_location('mod', r'{locustfile}'); "
+            "mod = importlib.util.module_from_spec(spec); "
+            "spec.loader.exec_module(mod); "
+            "print('OK')"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env={
+                **os.environ,
+                "AGENT33_SCALING_HOSTS": "http://127.0.0.1:18100,http://127.0.0.1:18101",
+            },
+        )
+        assert result.stdout.strip() == "OK", result.stderr
+
+
+class TestStubModelServer:
+    async def test_ollama_provider_gets_deterministic_replies(self) -> None:
+        from agent33.llm.base import ChatMessage
+        from agent33.llm.ollama import OllamaProvider
+        from agent33.testing.stub_server import StubBehavior, create_app, stub_embedding
+
+        provider = OllamaProvider(base_url="http://stub")
+        await provider._client.aclose()
+        provider._client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(
+                app=create_app(StubBehavior(reply_tokens=4, embedding_dim=8))
+            )
+        )
+        messages = [ChatMessage(role="user", content="ping")]
+        try:
+            first = await provider.complete(messages)
+            again = await provider.complete(messages)
+            streamed = [chunk async for chunk in provider.stream_complete(messages)]
+            response = await provider._client.post(
+                "http://stub/api/embed", json={"model": "m", "input": ["ping"]}
+            )
+        finally:
+            await provider.close()
+
+        assert first.content == again.content
+        assert len(first.content.split()) == 4
+        assert "".join(chunk.delta_content for chunk in streamed).strip() == first.content
+        assert response.json()["embeddings"] == [stub_embedding("ping", 8)]
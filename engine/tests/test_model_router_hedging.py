@@ -0,0 +1,265 @@
+"""Latency-aware route selection and hedged completions in ModelRouter."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from typing import Any
+
+import pytest
+
+from agent33.llm.base import ChatMessage, LLMResponse
+from agent33.llm.response_cache import LLMResponseCache
+from agent33.llm.router import ModelRouter, parse_route_equivalents
+from agent33.llm.scoreboard import RouteScoreboard
+from agent33.observability.metrics import MetricsCollector
+
+
+class _FakeProvider:
+    """Provider whose latency and failures are scripted per call."""
+
+    def __init__(self, name: str, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def complete(
+        self,
+        messages: list[ChatMessage],
+        *,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int | None = None,
+        tools: list[dict[str, Any]] | None = None,
+    ) -> LLMResponse:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return LLMResponse(
+            content=f"{self.name}:{model}",
+            model=model,
+            prompt_tokens=1,
+            completion_tokens=1,
+        )
+
+
+_MESSAGES = [ChatMessage(role="user", content="hi")]
+
+
+def _router(
+    primary: _FakeProvider,
+    backup: _FakeProvider,
+    **kwargs: Any,
+) -> ModelRouter:
+    kwargs.setdefault("scoreboard", RouteScoreboard(min_samples=2))
+    return ModelRouter(
+        providers={"ollama": primary, "lmstudio": backup},
+        equivalent_routes=[["ollama/llama3", "lmstudio/llama3"]],
+        **kwargs,
+    )
+
+
+class TestParseRouteEquivalents:
+    def test_parses_groups_and_drops_singletons(self) -> None:
+        groups = parse_route_equivalents(" a , b ;c;; d,e,f ")
+        assert groups == [["a", "b"], ["d", "e", "f"]]
+
+
+class TestRouteScoreboard:
+    def test_scores_latency_penalized_by_error_rate(self) -> None:
+        board = RouteScoreboard(min_samples=1)
+        board.record("p", "fast", 0.1, success=True)
+        board.record("p", "flaky", 0.1, success=True)
+        board.record("p", "flaky", 0.0, success=False)
+        fast = board.score("p", "fast")
+        flaky = board.score("p", "flaky")
+        assert fast is not None and flaky is not None
+        assert flaky > fast
+
+    def test_quantile_needs_min_samples(self) -> None:
+        board = RouteScoreboard(min_samples=3)
+        for latency in (0.1, 0.2):
+            board.record("p", "m", latency, success=True)
+        assert board.quantile("p", "m", 0.95) is None
+        board.record("p", "m", 0.9, success=True)
+        assert board.quantile("p", "m", 0.95) == 0.9
+        assert board.snapshot()[0]["p95_latency_ms"] == 900.0
+
+
+class TestRouteSelection:
+    async def test_keeps_requested_route_until_it_is_scored(self) -> None:
+        router = _router(_FakeProvider("a"), _FakeProvider("b"))
+        routes = router.ranked_routes("ollama/llama3")
+        assert [r.provider_name for r in routes] == ["ollama", "lmstudio"]
+
+    async def test_prefers_faster_equivalent_once_scored(self) -> None:
+        router = _router(_FakeProvider("a"), _FakeProvider("b"))
+        for _ in range(3):
+            router.scoreboard.record("ollama", "llama3", 2.0, success=True)
+            router.scoreboard.record("lmstudio", "llama3", 0.2, success=True)
+
+        response = await router.complete(_MESSAGES, model="ollama/llama3")
+        assert response.content == "b:llama3"
+
+    async def test_route_that_only_fails_is_ranked_last(self) -> None:
+        router = _router(_FakeProvider("a"), _FakeProvider("b"))
+        for _ in range(3):
+            router.scoreboard.record("ollama", "llama3", 0.0, success=False)
+            router.scoreboard.record("lmstudio", "llama3", 3.0, success=True)
+
+        assert router.scoreboard.score("ollama", "llama3") == math.inf
+        routes = router.ranked_routes("ollama/llama3")
+        assert [r.provider_name for r in routes] == ["lmstudio", "ollama"]
+
+    async def test_exploration_samples_unscored_equivalents(self) -> None:
+        metrics = MetricsCollector()
+        backup = _FakeProvider("b")
+        router = _router(
+            _FakeProvider("a"), backup, exploration_rate=1.0, rng=random.Random(0), metrics=metrics
+        )
+        for _ in range(3):
+            router.scoreboard.record("ollama", "llama3", 0.1, success=True)
+
+        response = await router.complete(_MESSAGES, model="ollama/llama3")
+        assert response.content == "b:llama3"
+        assert metrics.get_summary()["llm_route_explorations_total"] == {
+            "model=llama3,provider=lmstudio": 1
+        }
+
+        steady = _router(_FakeProvider("a"), _FakeProvider("b"), rng=random.Random(0))
+        for _ in range(3):
+            steady.scoreboard.record("ollama", "llama3", 0.1, success=True)
+        assert all(
+            steady.ranked_routes("ollama/llama3")[0].provider_name == "ollama" for _ in range(50)
+        )
+
+    async def test_unregistered_equivalents_are_ignored(self) -> None:
+        router = ModelRouter(
+            providers={"ollama": _FakeProvider("a")},
+            equivalent_routes=[["ollama/llama3", "openai/gpt-4o"]],
+        )
+        assert len(router.ranked_routes("ollama/llama3")) == 1
+
+    async def test_calls_feed_scoreboard_and_routing_metrics(self) -> None:
+        metrics = MetricsCollector()
+        router = _router(_FakeProvider("a"), _FakeProvider("b"), metrics=metrics)
+        await router.complete(_MESSAGES, model="ollama/llama3")
+        assert router.scoreboard.stats("ollama", "llama3").calls == 1
+        summary = metrics.get_summary()
+        assert summary["llm_route_requests_total"] == {
+            "model=llama3,outcome=success,provider=ollama": 1
+        }
+
+
+class TestHedging:
+    async def test_fast_primary_never_fires_hedge(self) -> None:
+        primary = _FakeProvider("a")
+        backup = _FakeProvider("b")
+        router = _router(primary, backup, hedging_enabled=True, hedge_default_delay_seconds=0.5)
+        response = await router.complete(_MESSAGES, model="ollama/llama3")
+        assert response.content == "a:llama3"
+        assert backup.calls == 0
+
+    async def test_slow_primary_is_hedged_and_cancelled(self) -> None:
+        metrics = MetricsCollector()
+        primary = _FakeProvider("a", delay=5.0)
+        backup = _FakeProvider("b", delay=0.01)
+        router = _router(
+            primary,
+            backup,
+            hedging_enabled=True,
+            hedge_default_delay_seconds=0.02,
+            hedge_min_delay_seconds=0.0,
+            metrics=metrics,
+        )
+        response = await asyncio.wait_for(
+            router.complete(_MESSAGES, model="ollama/llama3"), timeout=2.0
+        )
+        assert response.content == "b:llama3"
+        assert primary.cancelled == 1
+        assert metrics.get_summary()["llm_hedge_total"] == {
+            "outcome=backup_won": 1,
+            "outcome=fired": 1,
+        }
+
+    async def test_cache_records_the_provider_that_won(self) -> None:
+        cache = LLMResponseCache()
+        router = _router(
+            _FakeProvider("a", delay=5.0),
+            _FakeProvider("b", delay=0.01),
+            hedging_enabled=True,
+            hedge_default_delay_seconds=0.02,
+            hedge_min_delay_seconds=0.0,
+            response_cache=cache,
+        )
+        response = await asyncio.wait_for(
+            router.complete(_MESSAGES, model="ollama/llama3", temperature=0.0), timeout=2.0
+        )
+        assert response.content == "b:llama3"
+        assert [entry.provider for entry in cache._entries.values()] == ["lmstudio"]
+
+    async def test_hedge_delay_tracks_primary_p95(self) -> None:
+        router = _router(
+            _FakeProvider("a"),
+            _FakeProvider("b"),
+            hedging_enabled=True,
+            hedge_min_delay_seconds=0.0,
+        )
+        for latency in (0.1, 0.2, 0.3, 0.4):
+            router.scoreboard.record("ollama", "llama3", latency, success=True)
+        primary = router.ranked_routes("ollama/llama3")[0]
+        assert router._hedge_delay(primary) == pytest.approx(0.4)
+
+    async def test_cancelled_primary_is_kept_as_a_lower_bound(self) -> None:
+        router = _router(
+            _FakeProvider("a", delay=5.0),
+            _FakeProvider("b", delay=0.01),
+            hedging_enabled=True,
+            hedge_default_delay_seconds=0.05,
+            hedge_min_delay_seconds=0.0,
+        )
+        for _ in range(3):
+            await asyncio.wait_for(router.complete(_MESSAGES, model="ollama/llama3"), timeout=2.0)
+
+        stats = router.scoreboard.stats("ollama", "llama3")
+        assert stats.calls == 0  # no call finished
+        assert stats.samples == 3
+        # The delay estimate stays at the tail the losers reached, not below it.
+        [primary] = [
+            r for r in router.ranked_routes("ollama/llama3") if r.provider_name == "ollama"
+        ]
+        assert router._hedge_delay(primary) >= 0.05
+
+    async def test_failed_backup_waits_for_primary(self) -> None:
+        primary = _FakeProvider("a", delay=0.05)
+        backup = _FakeProvider("b", error=RuntimeError("backup down"))
+        router = _router(
+            primary,
+            backup,
+            hedging_enabled=True,
+            hedge_default_delay_seconds=0.01,
+            hedge_min_delay_seconds=0.0,
+        )
+        response = await router.complete(_MESSAGES, model="ollama/llama3")
+        assert response.content == "a:llama3"
+
+    async def test_both_failing_raises_primary_error(self) -> None:
+        primary = _FakeProvider("a", delay=0.05, error=ValueError("primary down"))
+        backup = _FakeProvider("b", error=RuntimeError("backup down"))
+        router = _router(
+            primary,
+            backup,
+            hedging_enabled=True,
+            hedge_default_delay_seconds=0.01,
+            hedge_min_delay_seconds=0.0,
+        )
+        with pytest.raises(ValueError, match="primary down"):
+            await router.complete(_MESSAGES, model="ollama/llama3")
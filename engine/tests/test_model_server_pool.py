@@ -0,0 +1,163 @@
+"""Model-server pool: model affinity, least-outstanding balancing, health, metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from agent33.llm.base import ChatMessage
+from agent33.llm.model_pool import ModelServerPool, model_key
+from agent33.llm.ollama import OllamaProvider
+from agent33.memory.embeddings import EmbeddingProvider
+from agent33.observability.metrics import MetricsCollector
+
+
+class _Hosts:
+    """Fake Ollama hosts behind ``httpx.MockTransport``, keyed by host name."""
+
+    def __init__(self, loaded: dict[str, list[str]]) -> None:
+        self.loaded = loaded
+        self.down: set[str] = set()
+        self.calls: list[tuple[str, str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host in self.down:
+            raise httpx.ConnectError("refused", request=request)
+        if request.url.path == "/api/ps":
+            return httpx.Response(
+                200, json={"models": [{"name": name} for name in self.loaded.get(host, [])]}
+            )
+        self.calls.append((host, request.url.path))
+        body = json.loads(request.content) if request.content else {}
+        if request.url.path == "/api/embed":
+            return httpx.Response(200, json={"embeddings": [[1.0, 0.0] for _ in body["input"]]})
+        return httpx.Response(
+            200,
+            json={"model": body.get("model"), "message": {"content": f"from {host}"}},
+        )
+
+    def pool(self, **kwargs: Any) -> ModelServerPool:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self))
+        return ModelServerPool(
+            [f"http://{host}:11434" for host in self.loaded], client=client, **kwargs
+        )
+
+
+def test_model_key_matches_names_reported_by_ollama() -> None:
+    assert model_key("llama3.2") == "llama3.2:latest"
+    assert model_key("llama3.2:3b") == "llama3.2:3b"
+    assert model_key("hf.co/org/model") == "hf.co/org/model:latest"
+
+
+def test_pool_requires_a_backend() -> None:
+    with pytest.raises(ValueError, match="at least one base URL"):
+        ModelServerPool(["", ""])
+
+
+class TestRouting:
+    async def test_requests_go_to_the_host_with_the_model_loaded(self) -> None:
+        hosts = _Hosts({"gpu-a": ["llama3.2:latest"], "gpu-b": ["qwen3:8b"]})
+        pool = hosts.pool()
+        await pool.probe()
+        assert {pool.select("qwen3:8b").base_url for _ in range(4)} == {"http://gpu-b:11434"}
+        assert {pool.select("llama3.2").base_url for _ in range(4)} == {"http://gpu-a:11434"}
+
+    async def test_cold_model_goes_to_least_busy_host_and_sticks(self) -> None:
+        hosts = _Hosts({"gpu-a": [], "gpu-b": []})
+        pool = hosts.pool()
+        await pool.probe()
+        async with pool.lease("llama3.2") as first:
+            # select() only looks: it does not mark the model warm anywhere.
+            pool.select("mistral")
+            assert not any("mistral:latest" in b.loaded for b in pool.backends)
+            async with pool.lease("mistral") as second:
+                assert second is not first
+        # mistral is now warm on the host it was sent to.
+        assert pool.select("mistral") is second
+        assert "mistral:latest" in second.loaded
+
+    async def test_busy_warm_host_spills_to_an_idle_one(self) -> None:
+        hosts = _Hosts({"gpu-a": ["llama3.2:latest"], "gpu-b": []})
+        pool = hosts.pool(spill_threshold=2)
+        await pool.probe()
+        async with pool.lease("llama3.2") as a1, pool.lease("llama3.2") as a2:
+            assert a1 is a2
+            spilled = pool.select("llama3.2")
+        assert spilled.base_url == "http://gpu-b:11434"
+
+    async def test_unreachable_host_is_skipped_until_a_probe_succeeds(self) -> None:
+        hosts = _Hosts({"gpu-a": ["llama3.2:latest"], "gpu-b": ["llama3.2:latest"]})
+        pool = hosts.pool()
+        await pool.probe()
+        hosts.down.add("gpu-a")
+        with pytest.raises(httpx.ConnectError):
+            async with pool.lease("llama3.2") as backend:
+                await pool.client.post(f"{backend.base_url}/api/chat")
+        await pool.probe()
+        assert [b.healthy for b in pool.backends] == [False, True]
+        assert pool.select("llama3.2").base_url == "http://gpu-b:11434"
+
+        hosts.down.clear()
+        await pool.probe()
+        assert all(b.healthy for b in pool.backends)
+
+    async def test_failed_stream_through_the_boundary_marks_host_unhealthy(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("agent33.config.settings.connector_boundary_enabled", True)
+        hosts = _Hosts({"gpu-a": ["llama3.2:latest"], "gpu-b": []})
+        pool = hosts.pool()
+        await pool.probe()
+        hosts.down.add("gpu-a")
+        chat = OllamaProvider(default_model="llama3.2", pool=pool)
+        assert chat._boundary_executor is not None
+        with pytest.raises(RuntimeError):
+            async for _ in chat.stream_complete([ChatMessage(role="user", content="hi")]):
+                pass
+        assert [b.healthy for b in pool.backends] == [False, True]
+        await pool.client.aclose()
+
+    async def test_queue_depth_and_affinity_are_reported(self) -> None:
+        hosts = _Hosts({"gpu-a": ["llama3.2:latest"]})
+        metrics = MetricsCollector()
+        pool = hosts.pool(metrics=metrics)
+        await pool.probe()
+        async with pool.lease("llama3.2"):
+            assert pool.snapshot()[0]["outstanding"] == 1
+        async with pool.lease("other"):
+            pass
+
+        summary = metrics.get_summary()
+        assert summary["llm_backend_requests_total"] == {
+            "affinity=warm,backend=http://gpu-a:11434,pool=ollama": 1,
+            "affinity=cold,backend=http://gpu-a:11434,pool=ollama": 1,
+        }
+        depth = summary["llm_backend_queue_depth(backend=http://gpu-a:11434,pool=ollama)"]
+        assert depth["max"] == 1
+        assert "llm_backend_queue_depth" in metrics.render_prometheus()
+
+
+class TestProviders:
+    async def test_chat_and_embeddings_share_the_pool(self) -> None:
+        hosts = _Hosts({"gpu-a": ["llama3.2:latest"], "gpu-b": ["nomic-embed-text:latest"]})
+        pool = hosts.pool()
+        await pool.probe()
+        chat = OllamaProvider(default_model="llama3.2", pool=pool)
+        embedder = EmbeddingProvider(model="nomic-embed-text", pool=pool)
+
+        replies = await asyncio.gather(
+            *(chat.complete([ChatMessage(role="user", content="hi")]) for _ in range(3))
+        )
+        await embedder.embed_batch(["a", "b"])
+        await chat.close()
+        await embedder.close()
+
+        assert [r.content for r in replies] == ["from gpu-a"] * 3
+        assert hosts.calls.count(("gpu-b", "/api/embed")) == 1
+        assert not pool.client.is_closed  # providers leave the pool's client open
+        await pool.client.aclose()
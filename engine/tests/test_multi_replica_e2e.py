@@ -134,6 +134,11 @@ class _FakeRedis:
                 return 1
         return 0
 
+    async def incr(self, key: str) -> int:
+        value = int(self._store.get(key, "0")) + 1
+        self._store[key] = str(value)
+        return value
+
     async def expire(self, key: str, seconds: int) -> bool:
         if key in self._store:
             self._ttls[key] = float(seconds)
@@ -0,0 +1,382 @@
+"""Shared orchestration state: versioned records, conflict merges, invalidation.
+
+Replicas are simulated with one :class:`OrchestrationStateStore` per replica,
+each over its own backend connection to the same database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+import pytest
+
+from agent33.autonomy.service import AutonomyService
+from agent33.observability.metrics import MetricsCollector
+from agent33.security.approval_tokens import ApprovalTokenError, ApprovalTokenManager
+from agent33.services import orchestration_state
+from agent33.services.orchestration_state import OrchestrationStateStore, merge_record
+from agent33.services.pg_orchestration_state import (
+    RedisStateBackend,
+    SqliteStateBackend,
+    create_state_backend,
+)
+from agent33.tools.approvals import ApprovalReason, ApprovalStatus, ToolApprovalRequest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+_REDIS_TEST_URL = os.environ.get("AGENT33_REDIS_TEST_URL", "redis://127.0.0.1:6379/15")
+_POLL = 0.01
+
+
+class _CountingBackend(SqliteStateBackend):
+    def __init__(self, db_path: str) -> None:
+        super().__init__(db_path, poll_interval_seconds=_POLL)
+        self.loads = 0
+        self.writes = 0
+
+    def load_namespace(self, namespace: str) -> Any:
+        self.loads += 1
+        return super().load_namespace(namespace)
+
+    def compare_and_set(self, *args: Any, **kwargs: Any) -> dict[str, int] | None:
+        self.writes += 1
+        return super().compare_and_set(*args, **kwargs)
+
+
+@pytest.fixture()
+def replicas(tmp_path: Path) -> Iterator[tuple[OrchestrationStateStore, OrchestrationStateStore]]:
+    db = str(tmp_path / "state.db")
+    a = OrchestrationStateStore(backend=_CountingBackend(db))
+    b = OrchestrationStateStore(backend=_CountingBackend(db))
+    yield a, b
+    a.close()
+    b.close()
+
+
+def _backend(store: OrchestrationStateStore) -> _CountingBackend:
+    backend = store._backend
+    assert isinstance(backend, _CountingBackend)
+    return backend
+
+
+def _wait(event: threading.Event) -> None:
+    assert event.wait(timeout=2.0), "change notification not received"
+
+
+def _wait_until(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 2.0
+    while not condition():
+        assert time.monotonic() < deadline, "change not visible on the other replica"
+        time.sleep(_POLL)
+
+
+def _listen(namespace: str, *stores: OrchestrationStateStore) -> None:
+    # Raw stores stand in for services, which must reload on remote changes.
+    for store in stores:
+        store.add_listener(namespace, lambda: None)
+
+
+class TestSharedStore:
+    def test_concurrent_writers_of_different_entries_both_win(
+        self,
+        replicas: tuple[OrchestrationStateStore, OrchestrationStateStore],
+        tmp_path: Path,
+    ) -> None:
+        a, b = replicas
+        _listen("autonomy", a, b)
+        a.write_namespace("autonomy", {"budgets": {}, "mode": "strict"})
+        base = b.read_namespace("autonomy")
+
+        a.write_namespace("autonomy", {"budgets": {"ba": 1}, "mode": "strict"})
+        # b still holds the old snapshot and writes on top of it.
+        b.write_namespace("autonomy", {**base, "budgets": {"bb": 2}, "mode": "relaxed"})
+
+        fresh = OrchestrationStateStore(backend=SqliteStateBackend(str(tmp_path / "state.db")))
+        assert fresh.read_namespace("autonomy") == {
+            "budgets": {"ba": 1, "bb": 2},
+            "mode": "relaxed",
+        }
+        fresh.close()
+
+    def test_only_changed_records_are_written(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, _ = replicas
+        _listen("traces", a)
+        a.write_namespace("traces", {"traces": {"t1": {}}, "failures": {}})
+        writes = _backend(a).writes
+        a.write_namespace("traces", {"traces": {"t1": {}}, "failures": {"f1": {}}})
+        assert _backend(a).writes == writes + 1
+        a.write_namespace("traces", {"traces": {"t1": {}}})
+        assert _backend(a).writes == writes + 2
+        assert a.read_namespace("traces") == {"traces": {"t1": {}}}
+
+    def test_namespace_records_are_committed_together(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        _listen("autonomy", a)
+        seen: list[dict[str, Any]] = []
+        b.add_listener("autonomy", lambda: seen.append(b.read_namespace("autonomy")))
+        writes = _backend(a).writes
+        a.write_namespace(
+            "autonomy", {"budgets": {"b1": 1}, "enforcers": {"b1": {}}, "mode": "strict"}
+        )
+        assert _backend(a).writes == writes + 1
+        _wait_until(lambda: bool(seen))
+        # The first notification already carries every record of the write.
+        assert seen[0] == {"budgets": {"b1": 1}, "enforcers": {"b1": {}}, "mode": "strict"}
+
+    def test_reads_are_cached_until_another_replica_writes(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        changed = threading.Event()
+        a.add_listener("reviews", changed.set)
+        a.read_namespace("reviews")
+        for _ in range(5):
+            a.read_namespace("reviews")
+        assert _backend(a).loads == 1
+
+        _listen("reviews", b)
+        b.write_namespace("reviews", {"reviews": {"r1": {"state": "open"}}})
+        _wait(changed)
+        assert a.read_namespace("reviews") == {"reviews": {"r1": {"state": "open"}}}
+        assert _backend(a).loads == 2
+
+    def test_own_writes_do_not_notify(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        changed = threading.Event()
+        a.add_listener("release", changed.set)
+        _listen("other", b)
+        a.write_namespace("release", {"releases": {"r": 1}})
+        b.write_namespace("other", {"x": 1})
+        assert not changed.wait(timeout=10 * _POLL)
+
+    def test_stale_writer_keeps_entries_written_since_its_last_read(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        _listen("autonomy", a, b)
+        b.read_namespace("autonomy")
+        a.write_namespace("autonomy", {"budgets": {"a1": 1}})
+        # b's service did not reload, so its payload lacks a1.
+        b.write_namespace("autonomy", {"budgets": {"b1": 2}})
+        assert b.read_namespace("autonomy") == {"budgets": {"a1": 1, "b1": 2}}
+
+    def test_stale_list_writer_keeps_items_appended_elsewhere(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        _listen("tool_mutations", b)
+        changed = threading.Event()
+        a.add_listener("tool_mutations", changed.set)
+        a.write_namespace("tool_mutations", {"records": [{"id": 1}]})
+        stale = b.read_namespace("tool_mutations")
+        a.write_namespace("tool_mutations", {"records": [{"id": 1}, {"id": 2}]})
+        b.write_namespace("tool_mutations", {"records": [*stale["records"], {"id": 3}]})
+        _wait(changed)
+        assert a.read_namespace("tool_mutations") == {"records": [{"id": 1}, {"id": 2}, {"id": 3}]}
+
+    def test_writing_without_a_reload_listener_is_rejected(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, _ = replicas
+        with pytest.raises(RuntimeError, match="without a reload listener"):
+            a.write_namespace("autonomy", {"budgets": {}})
+
+    def test_store_requires_a_path_or_backend(self) -> None:
+        with pytest.raises(ValueError, match="file path or a backend"):
+            OrchestrationStateStore()
+
+    def test_unknown_backend_is_rejected(self) -> None:
+        with pytest.raises(ValueError, match="Unknown orchestration state backend"):
+            create_state_backend("postgres")
+
+
+class _ThreadRecordingBackend(SqliteStateBackend):
+    def __init__(self, db_path: str) -> None:
+        super().__init__(db_path, poll_interval_seconds=_POLL)
+        self.write_threads: set[int] = set()
+
+    def compare_and_set(self, *args: Any, **kwargs: Any) -> dict[str, int] | None:
+        self.write_threads.add(threading.get_ident())
+        return super().compare_and_set(*args, **kwargs)
+
+
+async def test_store_on_a_loop_commits_off_it_and_reloads_on_it(tmp_path: Path) -> None:
+    db = str(tmp_path / "state.db")
+    a_backend = _ThreadRecordingBackend(db)
+    a = OrchestrationStateStore(backend=a_backend)
+    b = OrchestrationStateStore(backend=SqliteStateBackend(db, poll_interval_seconds=_POLL))
+    loop_thread = threading.get_ident()
+    reloads: list[tuple[bool, dict[str, Any]]] = []
+    a.add_listener("autonomy", lambda: None)
+    b.add_listener(
+        "autonomy",
+        lambda: reloads.append(
+            (threading.get_ident() == loop_thread, b.read_namespace("autonomy"))
+        ),
+    )
+    try:
+        b.read_namespace("autonomy")
+        a.write_namespace("autonomy", {"budgets": {"a1": 1}})
+        # Queued writes are visible to this replica's reads before they commit.
+        assert a.read_namespace("autonomy") == {"budgets": {"a1": 1}}
+        a.write_namespace("autonomy", {"budgets": {"a1": 1, "a2": 2}})
+        await asyncio.to_thread(a.flush)
+        assert a._pending == {}
+        assert loop_thread not in a_backend.write_threads
+
+        deadline = time.monotonic() + 2.0
+        while not reloads or reloads[-1][1] != {"budgets": {"a1": 1, "a2": 2}}:
+            assert time.monotonic() < deadline, "change not reloaded on the other replica"
+            await asyncio.sleep(_POLL)
+        assert all(on_loop for on_loop, _ in reloads)
+    finally:
+        a.close()
+        b.close()
+
+
+class _RejectingBackend(SqliteStateBackend):
+    def compare_and_set(self, *args: Any, **kwargs: Any) -> dict[str, int] | None:
+        return None  # every commit loses to a (simulated) concurrent writer
+
+
+async def test_failed_queued_write_resyncs_listeners_and_is_counted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    metrics = MetricsCollector()
+    monkeypatch.setattr(orchestration_state, "_metrics", metrics)
+    store = OrchestrationStateStore(backend=_RejectingBackend(str(tmp_path / "state.db")))
+    loop_thread = threading.get_ident()
+    reloads: list[tuple[bool, dict[str, Any]]] = []
+    store.add_listener(
+        "autonomy",
+        lambda: reloads.append(
+            (threading.get_ident() == loop_thread, store.read_namespace("autonomy"))
+        ),
+    )
+    try:
+        store.read_namespace("autonomy")
+        store.write_namespace("autonomy", {"budgets": {"b1": 1}})
+        await asyncio.to_thread(store.flush)
+        await asyncio.sleep(0)
+        assert reloads == [(True, {})]
+        assert metrics.get_summary()["orchestration_state_write_failures_total"] == {
+            "namespace=autonomy": 1
+        }
+    finally:
+        store.close()
+
+
+def test_merge_record_applies_our_entry_changes_on_theirs() -> None:
+    base = {"keep": 1, "drop": 2, "edit": 3}
+    ours = {"keep": 1, "edit": 30, "add": 4}
+    theirs = {"keep": 1, "drop": 2, "edit": 3, "remote": 5}
+    assert merge_record(base, ours, theirs) == {"keep": 1, "edit": 30, "add": 4, "remote": 5}
+    assert merge_record(1, 2, 3) == 2
+    assert merge_record([1, 2], [2, 4], [1, 2, 3]) == [2, 3, 4]
+
+
+class TestServicesAcrossReplicas:
+    def test_budgets_created_on_two_replicas_survive_restart(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        on_a = AutonomyService(state_store=a)
+        on_b = AutonomyService(state_store=b)
+        first = on_a.create_budget(task_id="t1", agent_id="agent-a")
+        second = on_b.create_budget(task_id="t2", agent_id="agent-b")
+
+        restarted = AutonomyService(state_store=OrchestrationStateStore(backend=_backend(a)))
+        assert {budget.budget_id for budget in restarted.list_budgets()} == {
+            first.budget_id,
+            second.budget_id,
+        }
+
+    def test_services_reload_changes_made_on_another_replica(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        on_a = AutonomyService(state_store=a)
+        on_b = AutonomyService(state_store=b)
+        budget = on_a.create_budget(task_id="t1", agent_id="agent-a")
+        _wait_until(lambda: budget.budget_id in {item.budget_id for item in on_b.list_budgets()})
+
+        # b's next write starts from the reloaded copy and keeps a's budget.
+        on_b.create_budget(task_id="t2", agent_id="agent-b")
+        _wait_until(lambda: len(on_a.list_budgets()) == 2)
+
+    def test_token_consumed_on_one_replica_is_rejected_on_another(
+        self, replicas: tuple[OrchestrationStateStore, OrchestrationStateStore]
+    ) -> None:
+        a, b = replicas
+        on_a = ApprovalTokenManager(secret="replica-shared-secret-0123456789ab", state_store=a)
+        on_b = ApprovalTokenManager(secret="replica-shared-secret-0123456789ab", state_store=b)
+        reloaded = threading.Event()
+        b.add_listener("approval_tokens", reloaded.set)
+        approval = ToolApprovalRequest(
+            reason=ApprovalReason.SUPERVISED_DESTRUCTIVE,
+            tool_name="shell",
+            status=ApprovalStatus.APPROVED,
+            tenant_id="tenant",
+        )
+        token = on_a.issue(approval, arguments={"command": "ls"})
+
+        on_a.validate(token, "shell", {"command": "ls"}, tenant_id="tenant")
+        _wait(reloaded)
+        with pytest.raises(ApprovalTokenError, match="already been consumed"):
+            on_b.validate(token, "shell", {"command": "ls"}, tenant_id="tenant")
+
+
+def _redis_reachable() -> bool:
+    parsed = urlparse(_REDIS_TEST_URL)
+    try:
+        with socket.create_connection((parsed.hostname or "127.0.0.1", parsed.port or 6379), 0.5):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not _redis_reachable(), reason=f"Redis not reachable at {_REDIS_TEST_URL}")
+def test_redis_backend_compare_and_set_and_invalidation() -> None:
+    import redis as redis_sync
+
+    prefix = f"agent33:test-state:{uuid.uuid4().hex}:"
+    channel = f"{prefix}changes"
+    clients = [redis_sync.Redis.from_url(_REDIS_TEST_URL) for _ in range(2)]
+    a, b = (
+        OrchestrationStateStore(
+            backend=RedisStateBackend(client, origin=name, prefix=prefix, channel=channel)
+        )
+        for name, client in zip(("a", "b"), clients, strict=True)
+    )
+    try:
+        changed = threading.Event()
+        a.add_listener("autonomy", changed.set)
+        b.add_listener("autonomy", lambda: None)
+        a.write_namespace("autonomy", {"budgets": {"ba": 1}})
+        stale = b.read_namespace("autonomy")
+        a.write_namespace("autonomy", {"budgets": {"ba": 1, "bc": 3}})
+        b.write_namespace("autonomy", {"budgets": {**stale["budgets"], "bb": 2}})
+        _wait(changed)
+        assert a.read_namespace("autonomy") == {"budgets": {"ba": 1, "bb": 2, "bc": 3}}
+    finally:
+        a.close()
+        b.close()
+        leftovers = clients[0].keys(f"{prefix}*")
+        if leftovers:
+            clients[0].delete(*leftovers)
@@ -29,7 +29,7 @@ from agent33.knowledge.ingestion import (
 )
 from agent33.knowledge.models import KnowledgeSource, SourceType
 from agent33.knowledge.scheduler import KnowledgeIngestionScheduler
-from agent33.knowledge.service import KnowledgeIngestionService, _slugify
+from agent33.knowledge.service import KnowledgeIngestionService, _chunk_hash, _slugify
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -239,6 +239,49 @@ class TestGitHubAdapter:
         assert len(chunks) == 1
         assert "Test README" in chunks[0]
 
+    async def test_github_fetches_markdown_files_concurrently(self) -> None:
+        import asyncio
+        import base64
+
+        source = _make_source(
+            source_type=SourceType.GITHUB,
+            url="https://github.com/test/repo",
+        )
+        paths = [f"doc{i}.md" for i in range(6)]
+        in_flight = 0
+        peak = 0
+
+        def _response(payload: dict[str, Any]) -> MagicMock:
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = payload
+            return response
+
+        async def _get(url: str, headers: dict[str, str]) -> MagicMock:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if url.endswith("/readme"):
+                return _response({"content": base64.b64encode(b"readme").decode()})
+            if "/git/trees/" in url:
+                return _response({"tree": [{"type": "blob", "path": p} for p in paths]})
+            name = url.rsplit("/", 1)[-1]
+            return _response({"content": base64.b64encode(name.encode()).decode()})
+
+        with patch("agent33.knowledge.ingestion.httpx.AsyncClient") as mock_client_cls:
+            mock_client = AsyncMock()
+            mock_client.get = AsyncMock(side_effect=_get)
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            mock_client_cls.return_value = mock_client
+
+            chunks = await GitHubAdapter(max_concurrency=3).fetch(source)
+
+        assert chunks == ["readme", *paths]
+        assert 1 < peak <= 3
+
     async def test_github_parses_owner_repo_from_url(self) -> None:
         adapter = GitHubAdapter()
         owner, repo = adapter._parse_owner_repo("https://github.com/octocat/hello-world")
@@ -451,9 +494,10 @@ class TestKnowledgeIngestionService:
 
     async def test_ingest_source_calls_adapter_and_stores(self) -> None:
         mock_ltm = AsyncMock()
-        mock_ltm.store = AsyncMock(return_value=1)
+        mock_ltm.find_by_metadata = AsyncMock(return_value={})
+        mock_ltm.store_many = AsyncMock(return_value=[1, 2])
         mock_embedder = AsyncMock()
-        mock_embedder.embed = AsyncMock(return_value=[0.1, 0.2, 0.3])
+        mock_embedder.embed_batch = AsyncMock(return_value=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
 
         svc = KnowledgeIngestionService(
             long_term_memory=mock_ltm,
@@ -470,8 +514,12 @@ class TestKnowledgeIngestionService:
 
         assert result.status == "success"
         assert result.chunks_ingested == 2
-        assert mock_ltm.store.call_count == 2
-        assert mock_embedder.embed.call_count == 2
+        # Both chunks are embedded and stored in a single batch.
+        assert mock_embedder.embed_batch.call_count == 1
+        assert mock_ltm.store_many.call_count == 1
+        stored = mock_ltm.store_many.call_args.args[0]
+        assert [content for content, _, _ in stored] == ["chunk one", "chunk two"]
+        assert all("chunk_hash" in metadata for _, _, metadata in stored)
 
     async def test_ingest_source_skips_stale_content(self) -> None:
         mock_ltm = AsyncMock()
@@ -505,6 +553,7 @@ class TestKnowledgeIngestionService:
         assert result.chunks_ingested == 0
         # Store should NOT have been called
         mock_ltm.store.assert_not_called()
+        mock_ltm.store_many.assert_not_called()
 
     async def test_ingest_unknown_source_returns_error(self) -> None:
         svc = KnowledgeIngestionService(
@@ -533,9 +582,10 @@ class TestKnowledgeIngestionService:
 
     async def test_ingest_updates_last_ingested_at(self) -> None:
         mock_ltm = AsyncMock()
-        mock_ltm.store = AsyncMock(return_value=1)
+        mock_ltm.find_by_metadata = AsyncMock(return_value={})
+        mock_ltm.store_many = AsyncMock(return_value=[1])
         mock_embedder = AsyncMock()
-        mock_embedder.embed = AsyncMock(return_value=[0.5])
+        mock_embedder.embed_batch = AsyncMock(return_value=[[0.5]])
 
         svc = KnowledgeIngestionService(
             long_term_memory=mock_ltm,
@@ -594,6 +644,179 @@ class TestKnowledgeIngestionService:
         assert last.source_id == "res"
 
 
+class _FakeLongTermMemory:
+    """In-memory stand-in for the pgvector-backed store."""
+
+    def __init__(self) -> None:
+        self.records: dict[int, tuple[str, dict[str, Any]]] = {}
+        self._next_id = 1
+        self.fail_deletes = False
+
+    async def store_many(self, items: list[tuple[str, list[float], dict[str, Any]]]) -> list[int]:
+        ids: list[int] = []
+        for content, _embedding, metadata in items:
+            self.records[self._next_id] = (content, metadata)
+            ids.append(self._next_id)
+            self._next_id += 1
+        return ids
+
+    async def find_by_metadata(self, match: dict[str, Any]) -> dict[int, dict[str, Any]]:
+        return {
+            record_id: metadata
+            for record_id, (_, metadata) in self.records.items()
+            if all(metadata.get(key) == value for key, value in match.items())
+        }
+
+    async def delete(self, record_ids: list[int]) -> int:
+        if self.fail_deletes:
+            raise RuntimeError("db down")
+        for record_id in record_ids:
+            self.records.pop(record_id, None)
+        return len(record_ids)
+
+    def contents(self) -> list[str]:
+        return sorted(content for content, _ in self.records.values())
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+async def _ingest(svc: KnowledgeIngestionService, source_id: str, chunks: list[str]) -> Any:
+    with patch("agent33.knowledge.service.get_adapter") as mock_get_adapter:
+        mock_adapter = AsyncMock()
+        mock_adapter.fetch = AsyncMock(return_value=chunks)
+        mock_get_adapter.return_value = mock_adapter
+        return await svc.ingest_source(source_id)
+
+
+class TestIncrementalIngestion:
+    def _service(self, **kwargs: Any) -> tuple[Any, _FakeLongTermMemory, _CountingEmbedder]:
+        ltm = _FakeLongTermMemory()
+        embedder = _CountingEmbedder()
+        svc = KnowledgeIngestionService(
+            long_term_memory=ltm,  # type: ignore[arg-type]
+            embedding_provider=embedder,  # type: ignore[arg-type]
+            **kwargs,
+        )
+        svc.add_source(name="feed", source_type="rss", url="https://example.com/rss")
+        return svc, ltm, embedder
+
+    async def test_only_changed_chunks_are_embedded(self) -> None:
+        svc, ltm, embedder = self._service()
+        await _ingest(svc, "feed", ["a", "b", "c"])
+        result = await _ingest(svc, "feed", ["a", "b", "d"])
+
+        assert embedder.batches == [["a", "b", "c"], ["d"]]
+        assert result.chunks_ingested == 1
+        assert result.chunks_skipped == 2
+        assert result.chunks_removed == 1
+        assert result.skip_ratio == pytest.approx(2 / 3, abs=1e-3)
+        # The removed chunk is gone, so no stale duplicates are left behind.
+        assert ltm.contents() == ["a", "b", "d"]
+
+    async def test_embeds_in_batches(self) -> None:
+        svc, ltm, embedder = self._service(embed_batch_size=2)
+        result = await _ingest(svc, "feed", ["a", "b", "c", "d", "e"])
+        assert [len(batch) for batch in embedder.batches] == [2, 2, 1]
+        assert result.chunks_ingested == 5
+        assert len(ltm.records) == 5
+
+    async def test_duplicate_and_blank_chunks_are_stored_once(self) -> None:
+        svc, ltm, _ = self._service()
+        result = await _ingest(svc, "feed", ["same", "same", "   ", "other"])
+        assert result.chunks_ingested == 2
+        assert ltm.contents() == ["other", "same"]
+
+    async def test_index_is_rebuilt_from_stored_metadata(self) -> None:
+        svc, ltm, _ = self._service()
+        await _ingest(svc, "feed", ["a", "b"])
+
+        # A fresh service (e.g. after restart) sharing the same store.
+        embedder = _CountingEmbedder()
+        restarted = KnowledgeIngestionService(
+            long_term_memory=ltm,  # type: ignore[arg-type]
+            embedding_provider=embedder,  # type: ignore[arg-type]
+        )
+        restarted.add_source(name="feed", source_type="rss", url="https://example.com/rss")
+        result = await _ingest(restarted, "feed", ["a", "b", "c"])
+
+        assert embedder.batches == [["c"]]
+        assert result.chunks_skipped == 2
+        assert ltm.contents() == ["a", "b", "c"]
+
+    async def test_failed_tombstone_is_retried_next_run(self) -> None:
+        svc, ltm, _ = self._service()
+        await _ingest(svc, "feed", ["a", "b"])
+        ltm.fail_deletes = True
+        first = await _ingest(svc, "feed", ["a"])
+        assert first.chunks_removed == 0
+        source = svc.get_source("feed")
+        assert source is not None
+        # Partial sync keeps the old hash so the same content is retried.
+        assert source.last_content_hash != hashlib.sha256(b"a").hexdigest()
+
+        ltm.fail_deletes = False
+        second = await _ingest(svc, "feed", ["a"])
+        assert second.chunks_removed == 1
+        assert ltm.contents() == ["a"]
+
+    async def test_unreadable_index_aborts_instead_of_duplicating(self) -> None:
+        svc, ltm, embedder = self._service()
+        await _ingest(svc, "feed", ["a", "b"])
+
+        restarted = KnowledgeIngestionService(
+            long_term_memory=ltm,  # type: ignore[arg-type]
+            embedding_provider=embedder,  # type: ignore[arg-type]
+        )
+        restarted.add_source(name="feed", source_type="rss", url="https://example.com/rss")
+        with patch.object(ltm, "find_by_metadata", AsyncMock(side_effect=RuntimeError("db"))):
+            failed = await _ingest(restarted, "feed", ["a", "b", "c"])
+        assert failed.status == "error"
+        assert ltm.contents() == ["a", "b"]
+
+        retried = await _ingest(restarted, "feed", ["a", "b", "c"])
+        assert retried.chunks_ingested == 1
+        assert ltm.contents() == ["a", "b", "c"]
+
+    async def test_records_without_chunk_hash_are_replaced(self) -> None:
+        svc, ltm, _ = self._service()
+        source = svc.get_source("feed")
+        assert source is not None
+        # Stored by an ingest that predates chunk hashes, plus a duplicate.
+        legacy = {"source_id": source.id, "tenant_id": source.tenant_id}
+        ltm.records[100] = ("a", dict(legacy))
+        ltm.records[101] = ("b", {**legacy, "chunk_hash": _chunk_hash("b")})
+        ltm.records[102] = ("b", {**legacy, "chunk_hash": _chunk_hash("b")})
+
+        result = await _ingest(svc, "feed", ["a", "b"])
+        assert result.chunks_ingested == 1
+        assert result.chunks_removed == 2
+        assert ltm.contents() == ["a", "b"]
+        assert all("chunk_hash" in metadata for _, metadata in ltm.records.values())
+
+    async def test_records_per_source_metrics(self) -> None:
+        from agent33.observability.metrics import MetricsCollector
+
+        metrics = MetricsCollector()
+        svc, _, _ = self._service(metrics=metrics)
+        await _ingest(svc, "feed", ["a", "b"])
+        await _ingest(svc, "feed", ["a", "b", "c"])
+
+        summary = metrics.get_summary()
+        duration = summary["knowledge_ingestion_duration_seconds(source_id=feed,status=success)"]
+        assert duration["count"] == 2
+        skip_ratio = summary["knowledge_ingestion_skip_ratio(source_id=feed)"]
+        assert skip_ratio["max"] == pytest.approx(2 / 3, abs=1e-3)
+        assert summary["knowledge_ingestion_chunks_per_second(source_id=feed)"]["count"] == 2
+        assert "knowledge_ingestion_skip_ratio" in metrics.render_prometheus()
+
+
 # ---------------------------------------------------------------------------
 # API Routes
 # ---------------------------------------------------------------------------
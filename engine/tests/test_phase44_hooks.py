@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 from agent33.hooks.models import HookContext, HookEventType
 from agent33.hooks.protocol import BaseHook
@@ -398,6 +399,189 @@ class TestScriptHook:
         assert "bash is required" in hook.execution_log[0]["error"]
 
 
+_WORKER_SCRIPT = (
+    "# agent33-hook-protocol: jsonl\n"
+    "import json, os, sys\n"
+    "for line in sys.stdin:\n"
+    "    req = json.loads(line)\n"
+    "    meta = req['metadata']\n"
+    "    if meta.get('crash'):\n"
+    "        sys.exit(3)\n"
+    "    if meta.get('hang'):\n"
+    "        import time; time.sleep(30)\n"
+    "    out = {'id': req['id'], 'metadata': {'pid': os.getpid(),\n"
+    "           'session': req['env'].get('AGENT33_SESSION_ID', '')}}\n"
+    "    if meta.get('fail'):\n"
+    "        out = {'id': req['id'], 'error': 'boom'}\n"
+    "    print(json.dumps(out), flush=True)\n"
+)
+
+
+class TestScriptHookWorkerMode:
+    """Tests for persistent JSONL worker execution of script hooks."""
+
+    async def _call_next(self, c: HookContext) -> HookContext:
+        return c
+
+    def _make_hook(
+        self,
+        tmp_path: Path,
+        *,
+        timeout_ms: float = 5000.0,
+        worker_pool_size: int = 1,
+        fail_mode: Literal["open", "closed"] = "open",
+    ) -> ScriptHook:
+        script = tmp_path / "worker_hook.py"
+        script.write_text(_WORKER_SCRIPT, encoding="utf-8")
+        return ScriptHook(
+            name="worker",
+            event_type="tool.execute.pre",
+            script_path=script,
+            timeout_ms=timeout_ms,
+            fail_mode=fail_mode,
+            worker_pool_size=worker_pool_size,
+        )
+
+    async def test_worker_is_reused_across_events(self, tmp_path: Path) -> None:
+        hook = self._make_hook(tmp_path)
+        try:
+            first = await hook.execute(
+                HookContext(
+                    event_type="tool.execute.pre",
+                    tenant_id="t1",
+                    metadata={"session_id": "s-1"},
+                ),
+                self._call_next,
+            )
+            second = await hook.execute(
+                HookContext(event_type="tool.execute.pre", tenant_id="t1"), self._call_next
+            )
+        finally:
+            await hook.aclose()
+
+        assert first.metadata["session"] == "s-1"
+        assert first.metadata["pid"] == second.metadata["pid"]
+        stats = hook.stats()
+        assert stats["mode"] == "worker"
+        assert stats["calls"] == 2
+        assert stats["pool"]["workers_started"] == 1
+
+    async def test_worker_error_response_fails_closed(self, tmp_path: Path) -> None:
+        hook = self._make_hook(tmp_path, fail_mode="closed")
+        try:
+            result = await hook.execute(
+                HookContext(event_type="tool.execute.pre", tenant_id="", metadata={"fail": True}),
+                self._call_next,
+            )
+        finally:
+            await hook.aclose()
+
+        assert result.abort
+        assert hook.execution_log[0]["stderr"] == "boom"
+
+    async def test_crashed_worker_is_restarted(self, tmp_path: Path) -> None:
+        hook = self._make_hook(tmp_path)
+        try:
+            crashed = await hook.execute(
+                HookContext(event_type="tool.execute.pre", tenant_id="", metadata={"crash": True}),
+                self._call_next,
+            )
+            recovered = await hook.execute(
+                HookContext(event_type="tool.execute.pre", tenant_id=""), self._call_next
+            )
+        finally:
+            await hook.aclose()
+
+        assert not crashed.abort
+        assert hook.execution_log[0]["success"] is False
+        assert "pid" in recovered.metadata
+        pool_stats = hook.stats()["pool"]
+        assert pool_stats["worker_crashes"] == 1
+        assert pool_stats["worker_restarts"] == 1
+
+    async def test_hung_worker_times_out_and_is_replaced(self, tmp_path: Path) -> None:
+        hook = self._make_hook(tmp_path, timeout_ms=300)
+        try:
+            await hook.execute(
+                HookContext(event_type="tool.execute.pre", tenant_id="", metadata={"hang": True}),
+                self._call_next,
+            )
+            assert hook.execution_log[0]["error"] == "timeout"
+            hook_ok = await hook.execute(
+                HookContext(event_type="tool.execute.pre", tenant_id=""), self._call_next
+            )
+        finally:
+            await hook.aclose()
+
+        assert "pid" in hook_ok.metadata
+        assert hook.stats()["timeouts"] == 1
+
+    async def test_pool_limits_concurrency(self, tmp_path: Path) -> None:
+        import asyncio
+
+        hook = self._make_hook(tmp_path, worker_pool_size=2)
+        try:
+            results = await asyncio.gather(
+                *(
+                    hook.execute(
+                        HookContext(event_type="tool.execute.pre", tenant_id=""),
+                        self._call_next,
+                    )
+                    for _ in range(6)
+                )
+            )
+        finally:
+            await hook.aclose()
+
+        assert len({r.metadata["pid"] for r in results}) <= 2
+        assert hook.stats()["pool"]["workers_started"] <= 2
+
+    async def test_rediscover_closes_replaced_worker_pools(self, tmp_path: Path) -> None:
+        hooks_dir = tmp_path / "hooks"
+        hooks_dir.mkdir()
+        (hooks_dir / "tool.execute.pre--fast.py").write_text(_WORKER_SCRIPT, encoding="utf-8")
+        discovery = ScriptHookDiscovery(HookRegistry(), project_hooks_dir=hooks_dir)
+        discovery.discover()
+        old_hook = discovery.discovered_hooks["fast"]
+        await old_hook.execute(
+            HookContext(event_type="tool.execute.pre", tenant_id=""), self._call_next
+        )
+        old_pool = old_hook.worker_pool
+        assert old_pool is not None
+        workers = list(old_pool._idle)
+        assert workers
+
+        discovery.rediscover()
+        await discovery.aclose()
+
+        assert all(worker._proc.returncode is not None for worker in workers)
+        assert old_pool.stats()["idle_workers"] == 0
+
+    def test_discovery_enables_worker_mode_from_marker(self, tmp_path: Path) -> None:
+        hooks_dir = tmp_path / "hooks"
+        hooks_dir.mkdir()
+        (hooks_dir / "tool.execute.pre--fast.py").write_text(_WORKER_SCRIPT, encoding="utf-8")
+        (hooks_dir / "tool.execute.pre--classic.py").write_text("print('{}')\n", encoding="utf-8")
+        registry = HookRegistry()
+        discovery = ScriptHookDiscovery(registry, project_hooks_dir=hooks_dir)
+        discovery.discover()
+
+        stats = registry.stats()["script_hooks"]
+        assert stats["script.fast"]["mode"] == "worker"
+        assert stats["script.classic"]["mode"] == "spawn"
+
+    def test_discovery_respects_worker_mode_disabled(self, tmp_path: Path) -> None:
+        hooks_dir = tmp_path / "hooks"
+        hooks_dir.mkdir()
+        (hooks_dir / "tool.execute.pre--fast.py").write_text(_WORKER_SCRIPT, encoding="utf-8")
+        registry = HookRegistry()
+        ScriptHookDiscovery(
+            registry, project_hooks_dir=hooks_dir, worker_mode_enabled=False
+        ).discover()
+
+        assert registry.stats()["script_hooks"]["script.fast"]["mode"] == "spawn"
+
+
 class TestScriptHookInChain:
     """Tests for ScriptHook integration with HookChainRunner."""
 
@@ -7,6 +7,7 @@ from threading import RLock
 from typing import Any
 from unittest.mock import MagicMock
 
+from agent33.agents.definition import AgentDefinition
 from agent33.agents.runtime import AgentRuntime
 from agent33.packs.models import InstalledPack, PackSkillEntry, PackStatus
 from agent33.packs.sharing import PackShareRequest, PackSharingService
@@ -136,22 +137,26 @@ def test_ppack_v3_treatment_applies_explicit_tool_config_last() -> None:
     assert config["web_fetch"]["retries"] == 2
 
 
-def test_runtime_passes_treatment_variant_to_pack_registry() -> None:
+async def test_runtime_passes_treatment_variant_to_pack_registry() -> None:
     pack_registry = MagicMock()
-    pack_registry.get_session_prompt_addenda.return_value = []
+    pack_registry.get_session_prompt_addenda.return_value = ["Treatment guidance."]
     pack_registry.get_session_tool_config.return_value = {}
 
     runtime = AgentRuntime(
-        definition=MagicMock(),
+        definition=AgentDefinition.model_validate(
+            {"name": "test-agent", "version": "0.1.0", "role": "worker"}
+        ),
         router=MagicMock(),
         session_id="sess-001",
         pack_registry=pack_registry,
         ppack_variant="treatment",
     )
 
-    runtime._inject_pack_addenda("Base prompt")
+    prompt = await runtime._assemble_system_prompt({})
     runtime._get_pack_tool_config()
 
+    assert "# Pack Addenda\nTreatment guidance." in prompt
+
     pack_registry.get_session_prompt_addenda.assert_called_once_with(
         "sess-001",
         ppack_variant="treatment",
@@ -0,0 +1,293 @@
+"""Cache-friendly prompt layout, provider caching hints and cached-token accounting."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from agent33.agents.definition import AgentDefinition
+from agent33.agents.runtime import AgentRuntime
+from agent33.llm.base import ChatMessage, LLMResponse, LLMStreamChunk
+from agent33.llm.ollama import OllamaProvider
+from agent33.llm.openai import OpenAIProvider
+from agent33.llm.prompt_caching import (
+    PromptSection,
+    assemble_prompt,
+    cached_prompt_tokens,
+    sort_tool_schemas,
+    stable_prefix_hash,
+)
+from agent33.llm.router import ModelRouter
+from agent33.observability.metrics import MetricsCollector
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+_MESSAGES = [
+    ChatMessage(role="system", content="You are a helpful assistant."),
+    ChatMessage(role="user", content="Summarise quantum computing."),
+]
+
+
+class TestAssemblePrompt:
+    def test_stable_sections_precede_volatile_ones(self) -> None:
+        assembled = assemble_prompt(
+            [
+                PromptSection("definition"),
+                PromptSection("memory", stable=False),
+                PromptSection(""),
+                PromptSection("addenda"),
+            ]
+        )
+        assert assembled.text == "definition\n\naddenda\n\nmemory"
+        assert assembled.stable_length == len("definition\n\naddenda")
+
+    def test_prefix_hash_ignores_volatile_content(self) -> None:
+        first = assemble_prompt([PromptSection("base"), PromptSection("a", stable=False)])
+        second = assemble_prompt([PromptSection("base"), PromptSection("b", stable=False)])
+        changed = assemble_prompt([PromptSection("base v2"), PromptSection("a", stable=False)])
+        assert first.prefix_hash == second.prefix_hash
+        assert first.prefix_hash != changed.prefix_hash
+
+    def test_stable_prefix_hash_covers_system_and_tools_only(self) -> None:
+        system = {"role": "system", "content": "rules"}
+        tools = sort_tool_schemas([{"name": "write"}, {"name": "read"}])
+        assert [tool["name"] for tool in tools] == ["read", "write"]
+        base = stable_prefix_hash([system, {"role": "user", "content": "a"}], tools)
+        assert base == stable_prefix_hash([system, {"role": "user", "content": "b"}], tools)
+        assert base != stable_prefix_hash([system], tools[:1])
+
+    @pytest.mark.parametrize(
+        ("usage", "expected"),
+        [
+            ({"prompt_tokens": 10, "prompt_tokens_details": {"cached_tokens": 8}}, 8),
+            ({"prompt_tokens": 10, "cache_read_input_tokens": 6}, 6),
+            ({"prompt_tokens": 10}, None),
+            (None, None),
+        ],
+    )
+    def test_cached_prompt_tokens(
+        self, usage: dict[str, Any] | None, expected: int | None
+    ) -> None:
+        assert cached_prompt_tokens(usage) == expected
+
+
+def _openai_response(usage: dict[str, Any]) -> httpx.Response:
+    body = {
+        "model": "gpt-4o",
+        "choices": [{"message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+        "usage": usage,
+    }
+    return httpx.Response(
+        200,
+        content=json.dumps(body).encode(),
+        headers={"content-type": "application/json"},
+        request=httpx.Request("POST", "http://localhost:9999/chat/completions"),
+    )
+
+
+async def _capture_openai(
+    provider: OpenAIProvider, usage: dict[str, Any]
+) -> tuple[dict[str, Any], LLMResponse]:
+    captured: list[dict[str, Any]] = []
+
+    async def _post(url: str, *, json: dict[str, Any], **_kwargs: Any) -> httpx.Response:  # noqa: A002
+        captured.append(json)
+        return _openai_response(usage)
+
+    with patch.object(provider._client, "post", side_effect=_post):
+        response = await provider.complete(_MESSAGES, model="gpt-4o")
+    await provider.close()
+    return captured[0], response
+
+
+class TestProviderHints:
+    async def test_openai_sends_prompt_cache_key_and_reads_cached_tokens(self) -> None:
+        provider = OpenAIProvider(
+            api_key="k", base_url="http://localhost:9999", prompt_cache_hints="openai"
+        )
+        usage = {
+            "prompt_tokens": 1200,
+            "completion_tokens": 5,
+            "prompt_tokens_details": {"cached_tokens": 1024},
+        }
+        payload, response = await _capture_openai(provider, usage)
+
+        assert payload["prompt_cache_key"] == stable_prefix_hash(payload["messages"])
+        assert "cache_prompt" not in payload
+        assert response.cached_prompt_tokens == 1024
+
+    async def test_llamacpp_requests_kv_cache_reuse(self) -> None:
+        provider = OpenAIProvider(
+            api_key="local", base_url="http://localhost:9999", prompt_cache_hints="llamacpp"
+        )
+        payload, response = await _capture_openai(
+            provider, {"prompt_tokens": 10, "completion_tokens": 5}
+        )
+        assert payload["cache_prompt"] is True
+        assert "prompt_cache_key" not in payload
+        assert response.cached_prompt_tokens is None
+
+    async def test_generic_openai_compatible_backend_is_untouched(self) -> None:
+        provider = OpenAIProvider(api_key="local", base_url="http://localhost:9999")
+        payload, _ = await _capture_openai(provider, {"prompt_tokens": 10, "completion_tokens": 5})
+        assert "prompt_cache_key" not in payload
+        assert "cache_prompt" not in payload
+
+    def test_unknown_hint_style_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            OpenAIProvider(api_key="k", prompt_cache_hints="vllm")
+
+    async def test_ollama_keeps_model_resident(self) -> None:
+        provider = OllamaProvider(base_url="http://localhost:11434", keep_alive="30m")
+        provider._post = AsyncMock(  # type: ignore[method-assign]
+            return_value={"message": {"content": "ok"}, "prompt_eval_count": 3, "eval_count": 1}
+        )
+        await provider.complete(_MESSAGES, model="llama3.2")
+        payload = provider._post.call_args[0][1]
+        assert payload["keep_alive"] == "30m"
+        await provider.close()
+
+
+class _CachingProvider:
+    def __init__(self, cached: list[int | None]) -> None:
+        self._cached = list(cached)
+
+    async def complete(self, messages: list[ChatMessage], **kwargs: Any) -> LLMResponse:
+        return LLMResponse(
+            content="ok",
+            model=kwargs["model"],
+            prompt_tokens=1000,
+            completion_tokens=10,
+            cached_prompt_tokens=self._cached.pop(0),
+        )
+
+
+class _StreamingCachingProvider:
+    async def stream_complete(
+        self, messages: list[ChatMessage], **kwargs: Any
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
+        yield LLMStreamChunk(delta_content="o", model=kwargs["model"])
+        yield LLMStreamChunk(delta_content="k", finish_reason="stop", model=kwargs["model"])
+        yield LLMStreamChunk(
+            model=kwargs["model"],
+            prompt_tokens=1000,
+            completion_tokens=2,
+            usage_available=True,
+            cached_prompt_tokens=512,
+        )
+
+
+class TestRouterAccounting:
+    async def test_cached_tokens_are_aggregated_per_provider(self) -> None:
+        metrics = MetricsCollector()
+        router = ModelRouter(
+            providers={"openai": _CachingProvider([0, 768, None])}, metrics=metrics
+        )
+        for _ in range(3):
+            await router.complete(_MESSAGES, model="openai/gpt-4o", temperature=0.7)
+
+        stats = router.prompt_cache_stats()["openai"]
+        assert stats["requests"] == 2
+        assert stats["cached_tokens"] == 768
+        assert stats["hit_rate"] == pytest.approx(768 / 2000)
+        assert metrics.get_summary()["llm_prompt_cache_requests_total"] == {
+            "model=gpt-4o,outcome=hit,provider=openai": 1,
+            "model=gpt-4o,outcome=miss,provider=openai": 1,
+        }
+
+    async def test_streamed_completions_report_cached_tokens(self) -> None:
+        router = ModelRouter(providers={"openai": _StreamingCachingProvider()})
+        chunks = [
+            chunk async for chunk in router.stream_complete(_MESSAGES, model="openai/gpt-4o")
+        ]
+
+        assert "".join(chunk.delta_content for chunk in chunks) == "ok"
+        stats = router.prompt_cache_stats()["openai"]
+        assert (stats["requests"], stats["cached_tokens"]) == (1, 512)
+
+
+@dataclass
+class _Recall:
+    content: str
+
+
+class TestAgentRuntimeLayout:
+    def _runtime(
+        self, router: Any, *, model: str = "mock-model", memories: list[str] | None = None
+    ) -> AgentRuntime:
+        registry = MagicMock()
+        registry.get_session_prompt_addenda.return_value = ["Always use metric units."]
+        registry.get_session_tool_config.return_value = {}
+        recall = MagicMock()
+        if memories is None:
+            recall.search = AsyncMock(
+                side_effect=lambda query, **_: [_Recall(f"memory for {query}")]
+            )
+        else:
+            recall.search = AsyncMock(side_effect=[[_Recall(text)] for text in memories])
+        definition = AgentDefinition.model_validate(
+            {"name": "test-agent", "version": "0.1.0", "role": "worker"}
+        )
+        return AgentRuntime(
+            definition=definition,
+            router=router,
+            model=model,
+            session_id="sess-1",
+            pack_registry=registry,
+            progressive_recall=recall,
+        )
+
+    async def test_memory_follows_pack_addenda_and_prefix_is_stable(self) -> None:
+        router = MagicMock()
+        router.complete = AsyncMock(
+            return_value=LLMResponse(
+                content='{"result": "ok"}',
+                model="mock-model",
+                prompt_tokens=1,
+                completion_tokens=1,
+            )
+        )
+        runtime = self._runtime(router)
+
+        await runtime.invoke({"task": "first"})
+        first_prompt = router.complete.call_args[0][0][0].content
+        first_hash = runtime.prompt_prefix_hash
+        await runtime.invoke({"task": "second"})
+        second_prompt = router.complete.call_args[0][0][0].content
+
+        assert first_prompt.index("# Pack Addenda") < first_prompt.index("# Prior Context")
+        assert first_hash and runtime.prompt_prefix_hash == first_hash
+        stable_prefix = first_prompt[: first_prompt.index("# Prior Context")]
+        assert second_prompt.startswith(stable_prefix)
+        assert first_prompt != second_prompt
+
+    async def test_prompt_cache_key_ignores_recalled_memory(self) -> None:
+        provider = OpenAIProvider(
+            api_key="k", base_url="http://localhost:9999", prompt_cache_hints="openai"
+        )
+        captured: list[dict[str, Any]] = []
+
+        async def _post(url: str, *, json: dict[str, Any], **_kwargs: Any) -> httpx.Response:  # noqa: A002
+            captured.append(json)
+            return _openai_response({"prompt_tokens": 10, "completion_tokens": 1})
+
+        runtime = self._runtime(
+            ModelRouter(providers={"openai": provider}),
+            model="openai/gpt-4o",
+            memories=["deploys happen on Tuesdays", "the staging cluster is in eu-west"],
+        )
+        with patch.object(provider._client, "post", side_effect=_post):
+            await runtime.invoke({"task": "same"})
+            await runtime.invoke({"task": "same"})
+        await provider.close()
+
+        first, second = captured
+        assert first["messages"][0]["content"] != second["messages"][0]["content"]
+        assert first["prompt_cache_key"] == second["prompt_cache_key"]
+        assert first["prompt_cache_key"] != stable_prefix_hash(first["messages"])
@@ -5,7 +5,22 @@ from __future__ import annotations
 import time
 from unittest.mock import patch
 
-from agent33.observability.metrics import MetricsCollector
+import pytest
+
+from agent33.observability.metrics import MetricsCollector, QuantileSketch
+
+
+def _observe_at(
+    collector: MetricsCollector,
+    name: str,
+    value: float,
+    timestamp: float,
+    labels: dict[str, str] | None = None,
+) -> None:
+    """Record an observation as if it happened at *timestamp*."""
+    with patch("agent33.observability.metrics.time") as mock_time:
+        mock_time.time.return_value = timestamp
+        collector.observe(name, value, labels)
 
 
 class TestRollingWindowObservations:
@@ -29,10 +44,7 @@ class TestRollingWindowObservations:
 
         # Inject an observation that appears to be 120 seconds old
         old_ts = time.time() - 120
-        from agent33.observability.metrics import _TimestampedValue
-
-        obs = collector._observations["latency"][""]
-        obs.values.append(_TimestampedValue(timestamp=old_ts, value=10.0))
+        _observe_at(collector, "latency", 10.0, old_ts)
 
         # Add a recent observation normally
         collector.observe("latency", 2.0)
@@ -52,13 +64,10 @@ class TestRollingWindowObservations:
     def test_lifetime_stats_always_include_all_observations(self) -> None:
         collector = MetricsCollector(window_seconds=10)
 
-        from agent33.observability.metrics import _TimestampedValue
-
-        obs = collector._observations["cost"][""]
         # Add 3 old observations
         old_ts = time.time() - 100
         for v in [1.0, 2.0, 3.0]:
-            obs.values.append(_TimestampedValue(timestamp=old_ts, value=v))
+            _observe_at(collector, "cost", v, old_ts)
 
         # Add 1 recent
         collector.observe("cost", 4.0)
@@ -74,11 +83,8 @@ class TestRollingWindowObservations:
     def test_zero_observations_in_window(self) -> None:
         collector = MetricsCollector(window_seconds=10)
 
-        from agent33.observability.metrics import _TimestampedValue
-
-        obs = collector._observations["cost"][""]
         old_ts = time.time() - 100
-        obs.values.append(_TimestampedValue(timestamp=old_ts, value=5.0))
+        _observe_at(collector, "cost", 5.0, old_ts)
 
         summary = collector.get_summary()
 
@@ -109,16 +115,13 @@ class TestRollingWindowConfig:
         """An observation exactly at the window edge should be included."""
         collector = MetricsCollector(window_seconds=30)
 
-        from agent33.observability.metrics import _TimestampedValue
-
-        obs = collector._observations["metric"][""]
         # Observation at exactly 29 seconds ago (inside 30s window)
         inside_ts = time.time() - 29
-        obs.values.append(_TimestampedValue(timestamp=inside_ts, value=7.0))
+        _observe_at(collector, "metric", 7.0, inside_ts)
 
         # Observation at 31 seconds ago (outside 30s window)
         outside_ts = time.time() - 31
-        obs.values.append(_TimestampedValue(timestamp=outside_ts, value=99.0))
+        _observe_at(collector, "metric", 99.0, outside_ts)
 
         summary = collector.get_summary()
         assert summary["metric"]["window_count"] == 1
@@ -202,11 +205,8 @@ class TestPrometheusRenderingWithWindow:
     def test_prometheus_window_values_exclude_old_observations(self) -> None:
         collector = MetricsCollector(window_seconds=60)
 
-        from agent33.observability.metrics import _TimestampedValue
-
-        obs = collector._observations["effort_routing_estimated_cost_usd"][""]
         old_ts = time.time() - 120
-        obs.values.append(_TimestampedValue(timestamp=old_ts, value=10.0))
+        _observe_at(collector, "effort_routing_estimated_cost_usd", 10.0, old_ts)
         collector.observe("effort_routing_estimated_cost_usd", 2.0)
 
         output = collector.render_prometheus()
@@ -236,40 +236,42 @@ class TestPrometheusRenderingWithWindow:
         assert "effort_routing_decisions_total_window" not in output
 
 
-class TestPruneWindow:
-    """Verify the _prune_window method works correctly."""
+class TestWindowRingBuffer:
+    """Verify the rolling window is a fixed-size ring buffer of slot aggregates."""
 
-    def test_prune_removes_old_entries(self) -> None:
-        collector = MetricsCollector(window_seconds=60)
+    def test_expired_slots_are_excluded_and_reused(self) -> None:
+        collector = MetricsCollector(window_seconds=60, window_slots=6)
+        now = time.time()
+        for offset, value in [(120, 1.0), (90, 2.0), (30, 3.0), (10, 4.0)]:
+            _observe_at(collector, "latency", value, now - offset)
 
-        from agent33.observability.metrics import _Observation, _TimestampedValue
+        obs = collector._observations["latency"][""]
+        live = obs.live_slots(now)
+        assert sum(slot.count for slot in live) == 2
+        assert sorted(slot.total for slot in live) == [3.0, 4.0]
+        # Lifetime aggregates still include everything.
+        assert obs.count == 4
+
+    def test_memory_is_bounded_by_slot_count(self) -> None:
+        collector = MetricsCollector(window_seconds=60, window_slots=6)
+        start = time.time() - 3600
+        for second in range(0, 3600, 5):
+            _observe_at(collector, "latency", 0.01 * (second % 7), start + second)
 
-        obs = _Observation()
-        now = time.time()
-        obs.values = [
-            _TimestampedValue(timestamp=now - 120, value=1.0),
-            _TimestampedValue(timestamp=now - 90, value=2.0),
-            _TimestampedValue(timestamp=now - 30, value=3.0),
-            _TimestampedValue(timestamp=now - 10, value=4.0),
-        ]
-
-        surviving = collector._prune_window(obs)
-
-        assert len(surviving) == 2
-        assert surviving[0].value == 3.0
-        assert surviving[1].value == 4.0
-        # Also modified in-place
-        assert len(obs.values) == 2
-
-    def test_prune_empty_observation(self) -> None:
-        collector = MetricsCollector(window_seconds=60)
+        obs = collector._observations["latency"][""]
+        assert len(obs.slots) == 6
+        assert obs.count == 720
+        summary = collector.get_summary()["latency"]
+        assert summary["count"] == 720
+        assert summary["window_count"] <= 12
 
-        from agent33.observability.metrics import _Observation
+    def test_empty_observation_window(self) -> None:
+        collector = MetricsCollector(window_seconds=60)
+        _observe_at(collector, "latency", 1.0, time.time() - 600)
 
-        obs = _Observation()
-        surviving = collector._prune_window(obs)
-        assert surviving == []
-        assert obs.values == []
+        obs = collector._observations["latency"][""]
+        assert obs.live_slots(time.time()) == []
+        assert obs.window_stats(time.time())["window_count"] == 0
 
 
 class TestLabelledObservationsWithWindow:
@@ -341,26 +343,82 @@ class TestBackwardsCompatibility:
 
 
 class TestTimestampedObserve:
-    """Verify observe() stores timestamped values."""
+    """Verify observe() files values under the slot for their timestamp."""
 
-    def test_observe_stores_timestamp(self) -> None:
+    def test_observe_lands_in_current_slot(self) -> None:
         collector = MetricsCollector()
-        before = time.time()
         collector.observe("metric", 42.0)
-        after = time.time()
 
         obs = collector._observations["metric"][""]
-        assert len(obs.values) == 1
-        assert before <= obs.values[0].timestamp <= after
-        assert obs.values[0].value == 42.0
+        live = obs.live_slots(time.time())
+        assert len(live) == 1
+        assert live[0].count == 1
+        assert live[0].total == 42.0
 
     def test_observe_with_mocked_time(self) -> None:
-        collector = MetricsCollector()
+        collector = MetricsCollector(window_seconds=60)
         fixed_time = 1000000.0
-        with patch("agent33.observability.metrics.time") as mock_time:
-            mock_time.time.return_value = fixed_time
-            collector.observe("metric", 7.0)
+        _observe_at(collector, "metric", 7.0, fixed_time)
 
         obs = collector._observations["metric"][""]
-        assert obs.values[0].timestamp == fixed_time
-        assert obs.values[0].value == 7.0
+        assert obs.window_stats(fixed_time)["window_count"] == 1
+        assert obs.window_stats(fixed_time)["window_max"] == 7.0
+        assert obs.window_stats(fixed_time + 61)["window_count"] == 0
+
+
+class TestQuantilesAndHistograms:
+    """Verify sketch-backed quantiles and fixed-bucket histogram rendering."""
+
+    def test_summary_quantiles_within_sketch_accuracy(self) -> None:
+        collector = MetricsCollector()
+        for i in range(1, 1001):
+            collector.observe("latency", i / 1000.0)
+
+        entry = collector.get_summary()["latency"]
+        assert entry["p50"] == pytest.approx(0.5, rel=0.02)
+        assert entry["p99"] == pytest.approx(0.99, rel=0.02)
+        assert entry["window_p95"] == pytest.approx(0.95, rel=0.04)
+
+    def test_quantile_sketch_merge_and_collapse(self) -> None:
+        left = QuantileSketch(max_bins=16)
+        right = QuantileSketch(max_bins=16)
+        for i in range(1, 501):
+            left.add(float(i))
+            right.add(float(i + 500))
+        left.merge(right)
+
+        assert left.count == 1000
+        assert len(left._bins) <= 16
+        # The high end keeps full accuracy even after collapsing low bins.
+        assert left.quantile(0.99) == pytest.approx(990.0, rel=0.02)
+
+    def test_sketch_handles_zero_and_negative_values(self) -> None:
+        sketch = QuantileSketch()
+        for value in (-2.0, 0.0, 0.0, 3.0):
+            sketch.add(value)
+        assert sketch.quantile(0.0) == pytest.approx(-2.0, rel=0.02)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(3.0, rel=0.02)
+
+    def test_seconds_metrics_render_cumulative_histogram(self) -> None:
+        collector = MetricsCollector()
+        for value in (0.004, 0.03, 0.03, 20.0):
+            collector.observe("http_request_duration_seconds", value, {"path": "/x"})
+
+        output = collector.render_prometheus()
+        assert "# TYPE http_request_duration_seconds histogram" in output
+        assert "# TYPE http_request_duration_seconds_count gauge" not in output
+        assert 'http_request_duration_seconds_bucket{path="/x",le="0.005"} 1' in output
+        assert 'http_request_duration_seconds_bucket{path="/x",le="0.05"} 3' in output
+        assert 'http_request_duration_seconds_bucket{path="/x",le="10.0"} 3' in output
+        assert 'http_request_duration_seconds_bucket{path="/x",le="+Inf"} 4' in output
+        assert 'http_request_duration_seconds_count{path="/x"} 4' in output
+        assert 'http_request_duration_seconds_window_p99{path="/x"}' in output
+
+    def test_custom_histogram_buckets(self) -> None:
+        collector = MetricsCollector(histogram_buckets={"evaluation_score": (0.5, 0.9)})
+        collector.observe("evaluation_score", 0.7)
+
+        output = collector.render_prometheus()
+        assert 'evaluation_score_bucket{le="0.5"} 0' in output
+        assert 'evaluation_score_bucket{le="0.9"} 1' in output
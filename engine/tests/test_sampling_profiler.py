@@ -0,0 +1,299 @@
+"""Tests for the hot-path sampling profiler, loop watchdog and admin routes."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from agent33.api.routes.profiling import router as profiling_router
+from agent33.observability.sampling_profiler import (
+    ProfilingError,
+    ProfilingMiddleware,
+    SamplingProfiler,
+    configure_sampling_profiler,
+    profile_scope,
+    profiled,
+)
+from agent33.security.auth import TokenPayload
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+def _burn_cpu(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+
+
+async def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        _burn_cpu(0.005)
+        await asyncio.sleep(0)
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.fixture
+async def profiler() -> AsyncIterator[SamplingProfiler]:
+    instance = SamplingProfiler(
+        default_interval_ms=1.0,
+        slow_callback_ms=50.0,
+        lag_interval_ms=10.0,
+    )
+    await instance.start()
+    configure_sampling_profiler(instance)
+    try:
+        yield instance
+    finally:
+        configure_sampling_profiler(None)
+        await instance.aclose()
+
+
+class TestSamplingSessions:
+    async def test_untargeted_session_collects_loop_stacks(
+        self, profiler: SamplingProfiler
+    ) -> None:
+        session = profiler.start_session(duration_seconds=10)
+        await _busy(0.3)
+        profiler.stop_session(session.session_id)
+
+        summary = session.summary()
+        assert summary["state"] == "stopped"
+        assert summary["mode"] == "signal"
+        assert summary["matched_samples"] > 0
+        collapsed = session.collapsed()
+        assert "test_sampling_profiler:_burn_cpu" in collapsed
+        line = collapsed.splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) >= 1
+        assert ";" in stack
+
+    async def test_targets_keep_only_matching_tags(self, profiler: SamplingProfiler) -> None:
+        session = profiler.start_session(duration_seconds=10, targets=["agent:hot-*"])
+
+        async def _tagged() -> None:
+            with profile_scope("agent", "hot-path"):
+                await _busy(0.3)
+
+        await asyncio.gather(_tagged(), _busy(0.3))
+        profiler.stop_session(session.session_id)
+
+        labels = session.summary()["labels"]
+        assert set(labels) == {"agent:hot-path"}
+        assert all(line.startswith("agent:hot-path;") for line in session.collapsed().splitlines())
+
+    async def test_child_tasks_inherit_scope_label(self, profiler: SamplingProfiler) -> None:
+        session = profiler.start_session(duration_seconds=10, targets=["workflow:*"])
+
+        with profile_scope("workflow", "nightly"):
+            child = asyncio.create_task(_busy(0.3))
+        await child
+        profiler.stop_session(session.session_id)
+
+        assert session.summary()["labels"].get("workflow:nightly", 0) > 0
+
+    async def test_task_factory_removed_after_session(self, profiler: SamplingProfiler) -> None:
+        loop = asyncio.get_running_loop()
+        before = loop.get_task_factory()
+        session = profiler.start_session(duration_seconds=10)
+        assert loop.get_task_factory() is not before
+        profiler.stop_session(session.session_id)
+        await asyncio.sleep(0.01)
+        assert loop.get_task_factory() is before
+
+    async def test_only_one_session_at_a_time(self, profiler: SamplingProfiler) -> None:
+        first = profiler.start_session(duration_seconds=10)
+        with pytest.raises(ProfilingError):
+            profiler.start_session(duration_seconds=10)
+        profiler.stop_session(first.session_id)
+        second = profiler.start_session(duration_seconds=10)
+        assert [s.session_id for s in profiler.list_sessions()] == [
+            second.session_id,
+            first.session_id,
+        ]
+
+    async def test_session_completes_after_window(self, profiler: SamplingProfiler) -> None:
+        session = profiler.start_session(duration_seconds=0.1)
+        await asyncio.sleep(0.3)
+        assert session.state == "completed"
+        assert profiler.active_session is None
+
+    async def test_duration_is_capped(self) -> None:
+        instance = SamplingProfiler(max_duration_seconds=5)
+        await instance.start()
+        try:
+            session = instance.start_session(duration_seconds=3600)
+            assert session.duration_seconds == 5
+        finally:
+            await instance.aclose()
+        assert session.state == "stopped"
+
+    async def test_thread_mode_fallback_samples_loop_thread(self) -> None:
+        instance = SamplingProfiler(default_interval_ms=1.0, signal_mode=False)
+        await instance.start()
+        try:
+            session = instance.start_session(duration_seconds=10)
+            await _busy(0.3)
+            instance.stop_session(session.session_id)
+        finally:
+            await instance.aclose()
+        assert session.mode == "thread"
+        assert session.total_samples > 0
+        assert session.matched_samples + session.idle_samples == session.total_samples
+
+    async def test_unknown_session_raises(self, profiler: SamplingProfiler) -> None:
+        with pytest.raises(ProfilingError):
+            profiler.get_session("missing")
+
+    async def test_start_requires_running_profiler(self) -> None:
+        with pytest.raises(ProfilingError):
+            SamplingProfiler().start_session(duration_seconds=1)
+
+    async def test_stack_cardinality_is_bounded(self) -> None:
+        instance = SamplingProfiler(default_interval_ms=1.0, max_stacks=1)
+        await instance.start()
+        try:
+            session = instance.start_session(duration_seconds=10)
+            await _busy(0.1)
+            _burn_cpu(0.1)  # same leaf, different caller -> a second stack
+            instance.stop_session(session.session_id)
+        finally:
+            await instance.aclose()
+        assert len(session.stacks) <= 2
+        assert session.dropped_stacks > 0
+
+
+class TestEventLoopWatchdog:
+    async def test_blocking_call_is_reported_with_stack(self, profiler: SamplingProfiler) -> None:
+        await asyncio.sleep(0.05)
+        _block_loop(0.3)
+        await asyncio.sleep(0.05)
+
+        stats = profiler.loop_stats()
+        assert stats["slow_callbacks_total"] >= 1
+        assert stats["lag_max_ms"] >= 200
+        slow = stats["slow_callbacks"][-1]
+        assert slow["blocked_ms"] >= 200
+        assert "test_sampling_profiler:_block_loop" in slow["stack"]
+
+    async def test_idle_loop_reports_no_slow_callbacks(self, profiler: SamplingProfiler) -> None:
+        await asyncio.sleep(0.1)
+        stats = profiler.loop_stats()
+        assert stats["running"] is True
+        assert stats["slow_callbacks_total"] == 0
+        assert stats["lag_p50_ms"] < 50
+
+
+class TestProfiledDecorator:
+    async def test_decorator_is_transparent_without_profiler(self) -> None:
+        class Worker:
+            name = "w1"
+
+            @profiled("agent", "name")
+            async def run(self, value: int) -> int:
+                return value * 2
+
+        configure_sampling_profiler(None)
+        assert await Worker().run(21) == 42
+        assert Worker.run.__name__ == "run"
+
+    async def test_decorator_tags_samples(self, profiler: SamplingProfiler) -> None:
+        class Worker:
+            name = "w1"
+
+            @profiled("agent", "name")
+            async def run(self) -> None:
+                await _busy(0.3)
+
+        session = profiler.start_session(duration_seconds=10, targets=["agent:w1"])
+        await Worker().run()
+        profiler.stop_session(session.session_id)
+        assert session.summary()["labels"].get("agent:w1", 0) > 0
+
+
+# ---------------------------------------------------------------------------
+# Admin routes
+# ---------------------------------------------------------------------------
+
+
+def _build_app(profiler: SamplingProfiler | None) -> FastAPI:
+    app = FastAPI()
+
+    class FakeAuthMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):  # type: ignore[no-untyped-def]
+            request.state.user = TokenPayload(
+                sub="admin-user", scopes=["admin"], tenant_id="test-tenant"
+            )
+            return await call_next(request)
+
+    app.add_middleware(FakeAuthMiddleware)
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/v1/hot/{item_id}")
+    async def hot_endpoint(item_id: int) -> dict[str, int]:
+        await _busy(0.2)
+        return {"item_id": item_id}
+
+    app.include_router(profiling_router)
+    if profiler is not None:
+        app.state.sampling_profiler = profiler
+    return app
+
+
+class TestProfilingRoutes:
+    async def test_session_lifecycle_and_route_scoping(self, profiler: SamplingProfiler) -> None:
+        app = _build_app(profiler)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.post(
+                "/v1/admin/profiling/sessions",
+                json={"duration_seconds": 10, "interval_ms": 1, "targets": ["route:/v1/hot/*"]},
+            )
+            assert resp.status_code == 201
+            session_id = resp.json()["session_id"]
+
+            conflict = await client.post("/v1/admin/profiling/sessions", json={})
+            assert conflict.status_code == 409
+
+            assert (await client.get("/v1/hot/7")).status_code == 200
+
+            stopped = await client.post(f"/v1/admin/profiling/sessions/{session_id}/stop")
+            assert stopped.status_code == 200
+            assert stopped.json()["state"] == "stopped"
+
+            summary = await client.get(f"/v1/admin/profiling/sessions/{session_id}")
+            assert summary.json()["labels"].get("route:/v1/hot/{id}", 0) > 0
+
+            collapsed = await client.get(f"/v1/admin/profiling/sessions/{session_id}/collapsed")
+            assert collapsed.status_code == 200
+            assert collapsed.headers["content-type"].startswith("text/plain")
+            assert "_burn_cpu" in collapsed.text
+
+            listing = await client.get("/v1/admin/profiling/sessions")
+            assert [item["session_id"] for item in listing.json()["sessions"]] == [session_id]
+
+            loop = await client.get("/v1/admin/profiling/event-loop")
+            assert loop.status_code == 200
+            assert loop.json()["running"] is True
+
+    async def test_unknown_session_returns_404(self, profiler: SamplingProfiler) -> None:
+        app = _build_app(profiler)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.get("/v1/admin/profiling/sessions/nope/collapsed")
+        assert resp.status_code == 404
+
+    async def test_returns_503_when_disabled(self) -> None:
+        app = _build_app(None)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.get("/v1/admin/profiling/event-loop")
+        assert resp.status_code == 503
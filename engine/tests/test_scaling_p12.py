@@ -30,7 +30,7 @@ from agent33.scaling.state_guards import (
 
 
 class FakeRedis:
-    """Minimal async Redis mock that simulates SETNX, GET, DEL, EXPIRE, EVAL."""
+    """Minimal async Redis mock that simulates SETNX, GET, DEL, INCR, EXPIRE, EVAL."""
 
     def __init__(self) -> None:
         self._store: dict[str, tuple[str, float | None]] = {}
@@ -68,6 +68,12 @@ class FakeRedis:
                 removed += 1
         return removed
 
+    async def incr(self, key: str) -> int:
+        entry = self._store.get(key)
+        value = int(entry[0]) + 1 if entry is not None else 1
+        self._store[key] = (str(value), None)
+        return value
+
     async def expire(self, key: str, ttl: int) -> bool:
         if key in self._store:
             value, _ = self._store[key]
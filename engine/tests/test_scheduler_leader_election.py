@@ -0,0 +1,327 @@
+"""Leader-elected scheduler ownership, fencing tokens and job-fire dispatch.
+
+Replicas are simulated in one process: each has its own
+:class:`LeaderElection` over a shared fake Redis, and its own scheduler
+instances over a shared job repository.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from agent33.automation.job_dispatch import (
+    InProcessJobFireQueue,
+    JobFire,
+    ScheduledJobDispatcher,
+)
+from agent33.automation.pg_scheduler_repository import SqliteSchedulerJobRepository
+from agent33.automation.scheduler import WorkflowScheduler
+from agent33.automation.scheduler_repository import InMemorySchedulerJobRepository
+from agent33.evaluation.scheduled_gates import (
+    ScheduledGateConfig,
+    ScheduledGateService,
+    ScheduleType,
+)
+from agent33.evaluation.service import EvaluationService
+from agent33.observability.metrics import MetricsCollector
+from agent33.scaling.distributed_lock import InProcessLock, RedisDistributedLock
+from agent33.scaling.leader_election import LeaderElection
+
+_INTERVAL = 0.02
+
+
+class _FakeRedis:
+    """SET NX / GET / INCR / DEL and the lock's release and extend scripts."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.store:
+            return False
+        self.store[key] = value
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return self.store.get(key)
+
+    async def incr(self, key: str) -> int:
+        value = int(self.store.get(key, "0")) + 1
+        self.store[key] = str(value)
+        return value
+
+    async def eval(self, script: str, num_keys: int, key: str, token: str, *args: str) -> int:
+        if self.store.get(key) != token:
+            return 0
+        if "del" in script:
+            del self.store[key]
+        return 1
+
+    def expire_lock(self, name: str) -> None:
+        """Simulate the lease running out."""
+        self.store.pop(f"agent33:lock:{name}", None)
+
+
+def _election(redis: _FakeRedis, instance_id: str) -> LeaderElection:
+    lock = RedisDistributedLock(redis, "scheduler", ttl_seconds=15)
+    return LeaderElection(
+        lock, lease_seconds=15, renew_interval_seconds=_INTERVAL, instance_id=instance_id
+    )
+
+
+async def _wait_for(predicate: Any, timeout: float = 1.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(_INTERVAL / 4)
+
+
+class TestLeaderElection:
+    async def test_standby_takes_over_after_leader_crash(self) -> None:
+        redis = _FakeRedis()
+        leader, standby = _election(redis, "a"), _election(redis, "b")
+        assert await leader.start() is True
+        assert await standby.start() is False
+        first_term = leader.fencing_token
+
+        # Crash: the leader stops renewing without releasing, then the lease lapses.
+        assert leader._task is not None
+        leader._task.cancel()
+        redis.expire_lock("scheduler")
+
+        started = asyncio.get_running_loop().time()
+        await _wait_for(lambda: standby.is_leader)
+        assert asyncio.get_running_loop().time() - started <= 3 * _INTERVAL
+        assert standby.fencing_token is not None and first_term is not None
+        assert standby.fencing_token > first_term
+        assert not await standby.is_current(first_term)
+        assert await standby.is_current(standby.fencing_token)
+        await standby.stop()
+
+    async def test_lost_lease_demotes_and_notifies(self) -> None:
+        redis = _FakeRedis()
+        election = _election(redis, "a")
+        events: list[str] = []
+        election.add_listener(
+            on_elected=lambda: events.append("elected"),
+            on_demoted=lambda: events.append("demoted"),
+        )
+        await election.start()
+
+        # Another holder took the key (e.g. after a long pause on this replica).
+        redis.store["agent33:lock:scheduler"] = "someone-else"
+        await _wait_for(lambda: not election.is_leader)
+        assert events == ["elected", "demoted"]
+        await election.stop()
+        assert redis.store["agent33:lock:scheduler"] == "someone-else"
+
+    async def test_clean_shutdown_hands_over_within_one_retry(self) -> None:
+        redis = _FakeRedis()
+        leader, standby = _election(redis, "a"), _election(redis, "b")
+        await leader.start()
+        await standby.start()
+
+        await leader.stop()
+        await _wait_for(lambda: standby.is_leader, timeout=3 * _INTERVAL)
+        assert standby.terms == 1
+        await standby.stop()
+
+    async def test_in_process_lock_supports_election(self) -> None:
+        election = LeaderElection(InProcessLock("scheduler"), lease_seconds=15)
+        assert await election.start()
+        assert election.fencing_token == 1
+        assert await election.is_current(1)
+        await election.stop()
+        assert not election.is_leader
+
+
+class TestJobDispatch:
+    async def test_fire_runs_on_a_consumer_replica(self) -> None:
+        redis = _FakeRedis()
+        queue = InProcessJobFireQueue()
+        metrics = MetricsCollector()
+        leader, standby = _election(redis, "a"), _election(redis, "b")
+        await leader.start()
+        await standby.start()
+        on_leader = ScheduledJobDispatcher(queue, leader, metrics=metrics)
+        on_standby = ScheduledJobDispatcher(queue, standby, metrics=metrics)
+        ran: list[tuple[str, dict[str, Any]]] = []
+
+        async def _handler(job_id: str, payload: dict[str, Any]) -> None:
+            ran.append((job_id, payload))
+
+        on_standby.register("workflow", _handler)
+        on_standby.start()
+        try:
+            assert await on_leader.dispatch("workflow", "job-1", {"n": 1})
+            assert not await on_standby.dispatch("workflow", "job-2", {})
+            await _wait_for(lambda: bool(ran))
+        finally:
+            await on_standby.stop()
+            await leader.stop()
+            await standby.stop()
+
+        assert ran == [("job-1", {"n": 1})]
+        assert metrics.get_summary()["scheduler_job_fires_total"] == {
+            "outcome=executed,surface=workflow": 1,
+            "outcome=not_leader,surface=workflow": 1,
+            "outcome=queued,surface=workflow": 1,
+        }
+
+    async def test_fire_from_replaced_leader_is_rejected(self) -> None:
+        redis = _FakeRedis()
+        old, new = _election(redis, "a"), _election(redis, "b")
+        await old.start()
+        stale_token = old.fencing_token
+        assert old._task is not None
+        old._task.cancel()
+        redis.expire_lock("scheduler")
+        await new.start()
+
+        ran: list[str] = []
+
+        async def _handler(job_id: str, payload: dict[str, Any]) -> None:
+            ran.append(job_id)
+
+        dispatcher = ScheduledJobDispatcher(InProcessJobFireQueue(), new)
+        dispatcher.register("workflow", _handler)
+        await dispatcher.handle(JobFire("workflow", "stale", {}, stale_token))
+        await dispatcher.handle(JobFire("workflow", "fresh", {}, new.fencing_token))
+        await new.stop()
+        assert ran == ["fresh"]
+
+    def test_fire_round_trips_through_json(self) -> None:
+        fire = JobFire("evaluation_gate", "g1", {"a": [1]}, 7)
+        assert JobFire.from_json(fire.to_json()) == fire
+
+
+class TestWorkflowSchedulerLeadership:
+    async def test_standby_jobs_reach_the_leader_and_fire_elsewhere(self) -> None:
+        redis = _FakeRedis()
+        repo = InMemorySchedulerJobRepository()
+        queue = InProcessJobFireQueue()
+        elections = {name: _election(redis, name) for name in ("a", "b")}
+        triggered: list[tuple[str, str, str]] = []
+        schedulers: dict[str, WorkflowScheduler] = {}
+        dispatchers: dict[str, ScheduledJobDispatcher] = {}
+        for name, election in elections.items():
+
+            async def _on_trigger(job_id: str, workflow: str, inputs: Any, _n: str = name) -> None:
+                triggered.append((_n, job_id, workflow))
+
+            dispatchers[name] = ScheduledJobDispatcher(queue, election)
+            scheduler = WorkflowScheduler(_on_trigger, repo, dispatcher=dispatchers[name])
+            scheduler.start(paused=True)
+            election.add_listener(on_elected=scheduler.resume, on_demoted=scheduler.pause)
+            schedulers[name] = scheduler
+        try:
+            await elections["a"].start()
+            await elections["b"].start()
+            assert schedulers["a"].active and not schedulers["b"].active
+
+            # Created through the standby replica's API: only the repository knows it.
+            job_id = schedulers["b"].schedule_interval("nightly", seconds=3600)
+            assert schedulers["a"]._scheduler.get_job(job_id) is None
+            assert schedulers["a"].sync_jobs() == 1
+            assert schedulers["a"]._scheduler.get_job(job_id) is not None
+
+            # The leader only queues the fire; the standby's consumer runs it.
+            dispatchers["b"].start()
+            await schedulers["a"]._execute(job_id, "nightly", {})
+            await _wait_for(lambda: bool(triggered))
+            assert triggered == [("b", job_id, "nightly")]
+
+            assert schedulers["b"].remove(job_id)
+            assert schedulers["a"].sync_jobs() == 1
+            assert schedulers["a"]._scheduler.get_job(job_id) is None
+        finally:
+            for dispatcher in dispatchers.values():
+                await dispatcher.stop()
+            for election in elections.values():
+                await election.stop()
+            for scheduler in schedulers.values():
+                scheduler.stop()
+
+    async def test_start_loads_persisted_jobs(self, tmp_path: Any) -> None:
+        db = str(tmp_path / "control.db")
+        first = WorkflowScheduler(job_repository=SqliteSchedulerJobRepository(db))
+        cron_id = first.schedule_cron("report", "0 6 * * 1")
+        interval_id = first.schedule_interval("poll", seconds=90)
+
+        restarted = WorkflowScheduler(job_repository=SqliteSchedulerJobRepository(db))
+        restarted.start(paused=True)
+        try:
+            assert {job.id for job in restarted._scheduler.get_jobs()} == {cron_id, interval_id}
+            assert not restarted.active
+            restarted.resume()
+            assert restarted.active
+        finally:
+            restarted.stop()
+
+    async def test_run_due_during_failover_fires_once_on_resume(self) -> None:
+        fired: list[str] = []
+
+        async def _on_trigger(job_id: str, workflow: str, inputs: Any) -> None:
+            fired.append(job_id)
+
+        scheduler = WorkflowScheduler(_on_trigger, InMemorySchedulerJobRepository())
+        scheduler.start(paused=True)
+        try:
+            job_id = scheduler.schedule_interval("poll", seconds=3600)
+            job = scheduler._scheduler.get_job(job_id)
+            # Due well past APScheduler's default one-second misfire grace.
+            job.modify(next_run_time=job.next_run_time - timedelta(seconds=3630))
+            scheduler.resume()
+            await _wait_for(lambda: bool(fired))
+            await asyncio.sleep(_INTERVAL)
+            assert fired == [job_id]
+        finally:
+            scheduler.stop()
+
+
+class TestScheduledGatesLeadership:
+    async def test_schedules_are_shared_and_registered_on_start(self, tmp_path: Any) -> None:
+        db = str(tmp_path / "control.db")
+        creator = ScheduledGateService(
+            EvaluationService(),
+            job_repository=SqliteSchedulerJobRepository(db, table="scheduled_gate_jobs"),
+        )
+        config = creator.create_schedule(
+            ScheduledGateConfig(schedule_type=ScheduleType.INTERVAL, interval_seconds=300)
+        )
+        assert SqliteSchedulerJobRepository(db).list_jobs() == []
+
+        leader = ScheduledGateService(
+            EvaluationService(),
+            job_repository=SqliteSchedulerJobRepository(db, table="scheduled_gate_jobs"),
+        )
+        await leader.start(paused=True)
+        try:
+            assert leader._scheduler.get_job(config.schedule_id) is not None
+            assert [s.schedule_id for s in leader.list_schedules()] == [config.schedule_id]
+            result = await leader.trigger_now(config.schedule_id)
+            assert result.error is None
+
+            assert creator.remove_schedule(config.schedule_id)
+            leader.sync_schedules()
+            assert leader._scheduler.get_job(config.schedule_id) is None
+        finally:
+            await leader.stop()
+
+    async def test_start_registers_schedules_created_before_start(self) -> None:
+        service = ScheduledGateService(EvaluationService())
+        config = service.create_schedule(ScheduledGateConfig(cron_expr="0 * * * *"))
+        await service.start()
+        try:
+            assert service._scheduler.get_job(config.schedule_id) is not None
+        finally:
+            await service.stop()
+
+
+def test_sqlite_repository_rejects_unsafe_table_name() -> None:
+    with pytest.raises(ValueError, match="Invalid table name"):
+        SqliteSchedulerJobRepository(":memory:", table="jobs; DROP TABLE x")
@@ -0,0 +1,217 @@
+"""Tests for concurrent multi-provider search with quorum and rank fusion."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from agent33.observability.metrics import MetricsCollector
+from agent33.web_research.models import (
+    ProviderAuthState,
+    ResearchProviderKind,
+    ResearchProviderStatus,
+    WebResearchResult,
+)
+from agent33.web_research.service import (
+    SearchProviderRegistry,
+    WebResearchService,
+    _build_result,
+    fuse_rankings,
+)
+
+
+class _FakeProvider:
+    def __init__(
+        self,
+        provider_id: str,
+        urls: list[str],
+        *,
+        delay: float = 0.0,
+        error: Exception | None = None,
+        configured: bool = True,
+    ) -> None:
+        self.provider_id = provider_id
+        self._urls = urls
+        self._delay = delay
+        self._error = error
+        self._configured = configured
+        self.cancelled = False
+
+    def diagnostics(self) -> ResearchProviderStatus:
+        return ResearchProviderStatus(
+            provider_id=self.provider_id,
+            display_name=self.provider_id,
+            kind=ResearchProviderKind.SEARCH,
+            status="ok",
+            auth_state=ProviderAuthState.NOT_REQUIRED,
+            configured=self._configured,
+        )
+
+    async def search(self, query: str, *, limit: int, categories: str) -> list[WebResearchResult]:
+        try:
+            await asyncio.sleep(self._delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self._error is not None:
+            raise self._error
+        return _results(self.provider_id, self._urls)[:limit]
+
+
+def _results(provider_id: str, urls: list[str]) -> list[WebResearchResult]:
+    return [
+        _build_result(title=url, url=url, snippet="", provider_id=provider_id, rank=index)
+        for index, url in enumerate(urls, start=1)
+    ]
+
+
+def _registry(*providers: _FakeProvider, metrics: MetricsCollector | None = None):  # type: ignore[no-untyped-def]
+    registry = SearchProviderRegistry(metrics=metrics)
+    for provider in providers:
+        registry.register(provider)
+    return registry
+
+
+class TestConcurrentFanOut:
+    async def test_providers_run_concurrently(self) -> None:
+        registry = _registry(
+            _FakeProvider("a", ["https://a.example/1"], delay=0.2),
+            _FakeProvider("b", ["https://b.example/1"], delay=0.2),
+            _FakeProvider("c", ["https://c.example/1"], delay=0.2),
+        )
+        started = time.perf_counter()
+        results = await registry.search_all("q", limit=10)
+        elapsed = time.perf_counter() - started
+        assert len(results) == 3
+        assert elapsed < 0.45
+
+    async def test_slow_provider_hits_its_own_timeout(self) -> None:
+        slow = _FakeProvider("slow", ["https://slow.example/1"], delay=5.0)
+        registry = _registry(_FakeProvider("fast", ["https://fast.example/1"]), slow)
+        fan_out = await registry.search_fan_out("q", provider_timeout_seconds=0.05)
+        assert [r.url for r in fan_out.results] == ["https://fast.example/1"]
+        statuses = {o.provider_id: o.status for o in fan_out.outcomes}
+        assert statuses == {"fast": "ok", "slow": "timeout"}
+        assert slow.cancelled
+
+    async def test_quorum_returns_early_and_cancels_stragglers(self) -> None:
+        slow = _FakeProvider("slow", ["https://slow.example/1"], delay=5.0)
+        registry = _registry(slow, _FakeProvider("fast", ["https://fast.example/1"]))
+        started = time.perf_counter()
+        fan_out = await registry.search_fan_out("q", quorum=1, provider_timeout_seconds=10)
+        assert time.perf_counter() - started < 1.0
+        assert [r.provider_id for r in fan_out.results] == ["fast"]
+        # Outcomes keep registration order.
+        assert [(o.provider_id, o.status) for o in fan_out.outcomes] == [
+            ("slow", "cancelled"),
+            ("fast", "ok"),
+        ]
+        assert slow.cancelled
+
+    async def test_failed_providers_do_not_count_towards_quorum(self) -> None:
+        registry = _registry(
+            _FakeProvider("broken", [], error=ValueError("boom")),
+            _FakeProvider("ok", ["https://ok.example/1"], delay=0.05),
+        )
+        fan_out = await registry.search_fan_out("q", quorum=1)
+        assert [r.url for r in fan_out.results] == ["https://ok.example/1"]
+        broken = next(o for o in fan_out.outcomes if o.provider_id == "broken")
+        assert broken.status == "error"
+        assert broken.error == "boom"
+
+    async def test_overall_deadline_bounds_the_call(self) -> None:
+        registry = _registry(
+            _FakeProvider("a", ["https://a.example/1"], delay=5.0),
+            _FakeProvider("b", ["https://b.example/1"], delay=5.0),
+        )
+        started = time.perf_counter()
+        fan_out = await registry.search_fan_out(
+            "q", provider_timeout_seconds=10, deadline_seconds=0.1
+        )
+        assert time.perf_counter() - started < 1.0
+        assert fan_out.results == []
+        assert {o.status for o in fan_out.outcomes} == {"timeout"}
+
+    async def test_unconfigured_providers_are_skipped(self) -> None:
+        registry = _registry(
+            _FakeProvider("off", ["https://off.example/1"], configured=False),
+        )
+        fan_out = await registry.search_fan_out("q")
+        assert fan_out.results == []
+        assert fan_out.outcomes == []
+
+    async def test_latency_histogram_per_provider(self) -> None:
+        metrics = MetricsCollector()
+        registry = _registry(
+            _FakeProvider("a", ["https://a.example/1"]),
+            _FakeProvider("b", [], error=RuntimeError("down")),
+            metrics=metrics,
+        )
+        await registry.search_all("q")
+        summary = metrics.get_summary()
+        assert summary["web_search_provider_duration_seconds(outcome=ok,provider=a)"]["count"] == 1
+        assert (
+            summary["web_search_provider_duration_seconds(outcome=error,provider=b)"]["count"] == 1
+        )
+        assert "web_search_provider_duration_seconds_bucket" in metrics.render_prometheus()
+
+    async def test_research_service_records_provider_latency(self) -> None:
+        metrics = MetricsCollector()
+        service = WebResearchService(
+            search_providers=[
+                _FakeProvider("a", ["https://a.example/1"]),
+                _FakeProvider("b", [], error=RuntimeError("down")),
+            ],
+            fetch_providers=[],
+            default_search_provider="a",
+            default_fetch_provider="none",
+            metrics=metrics,
+        )
+        await service.search("latency histogram query")
+        with pytest.raises(RuntimeError):
+            await service.search("latency histogram query", provider_id="b")
+        summary = metrics.get_summary()
+        assert summary["web_search_provider_duration_seconds(outcome=ok,provider=a)"]["count"] == 1
+        assert (
+            summary["web_search_provider_duration_seconds(outcome=error,provider=b)"]["count"] == 1
+        )
+
+
+class TestRankFusion:
+    def test_agreement_across_providers_outranks_single_top_hit(self) -> None:
+        fused = fuse_rankings(
+            [
+                _results("a", ["https://solo.example", "https://shared.example"]),
+                _results("b", ["https://other.example", "https://shared.example/"]),
+            ],
+            limit=10,
+        )
+        assert [r.url for r in fused][0] == "https://shared.example"
+        assert fused[0].providers == ["a", "b"]
+        assert fused[0].provider_id == "a"
+        assert [r.rank for r in fused] == [1, 2, 3]
+        assert fused[0].fused_score > fused[1].fused_score
+
+    def test_ties_keep_provider_order_and_limit_applies(self) -> None:
+        fused = fuse_rankings(
+            [
+                _results("a", ["https://a.example/1", "https://a.example/2"]),
+                _results("b", ["https://b.example/1", "https://b.example/2"]),
+            ],
+            limit=3,
+        )
+        assert [r.url for r in fused] == [
+            "https://a.example/1",
+            "https://b.example/1",
+            "https://a.example/2",
+        ]
+
+    def test_duplicate_urls_within_one_provider_count_once(self) -> None:
+        fused = fuse_rankings(
+            [_results("a", ["https://x.example", "https://X.example/"])],
+            limit=10,
+        )
+        assert len(fused) == 1
+        assert fused[0].providers == ["a"]
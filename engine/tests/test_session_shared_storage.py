@@ -0,0 +1,291 @@
+"""Shared operator-session storage: leases, batched events, hot-cache coherence.
+
+Replicas are simulated with one :class:`OperatorSessionService` per replica,
+each over its own :class:`SqliteSessionStorage` connection to the same database
+(or its own :class:`RedisSessionStorage` client when a Redis server is reachable).
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+import pytest
+
+from agent33.sessions.models import OperatorSessionStatus, SessionEvent, SessionEventType
+from agent33.sessions.pg_storage import SqliteSessionStorage
+from agent33.sessions.service import OperatorSessionService
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+_POLL = 0.01
+_REDIS_TEST_URL = os.environ.get("AGENT33_REDIS_TEST_URL", "redis://127.0.0.1:6379/15")
+
+
+class _CountingStorage(SqliteSessionStorage):
+    def __init__(self, db_path: str, owner: str, **kwargs: Any) -> None:
+        kwargs.setdefault("event_flush_interval_seconds", _POLL)
+        kwargs.setdefault("poll_interval_seconds", _POLL)
+        super().__init__(db_path, owner=owner, **kwargs)
+        self.loads = 0
+        self.counts = 0
+        self.load_threads: set[int] = set()
+
+    def load_session(self, session_id: str) -> Any:
+        self.loads += 1
+        self.load_threads.add(threading.get_ident())
+        return super().load_session(session_id)
+
+    def event_count(self, session_id: str) -> int:
+        self.counts += 1
+        return super().event_count(session_id)
+
+
+@pytest.fixture()
+def db(tmp_path: Path) -> str:
+    return str(tmp_path / "sessions.db")
+
+
+@pytest.fixture()
+def replicas(db: str) -> Iterator[tuple[OperatorSessionService, OperatorSessionService]]:
+    a = OperatorSessionService(_CountingStorage(db, "replica-a"))
+    b = OperatorSessionService(_CountingStorage(db, "replica-b"))
+    yield a, b
+    a.storage.close()
+    b.storage.close()
+
+
+def _storage(service: OperatorSessionService) -> _CountingStorage:
+    storage = service.storage
+    assert isinstance(storage, _CountingStorage)
+    return storage
+
+
+def _event(session_id: str, n: int) -> SessionEvent:
+    return SessionEvent(
+        event_type=SessionEventType.TOOL_EXECUTED, session_id=session_id, data={"n": n}
+    )
+
+
+def _wait_for(condition: Any) -> None:
+    deadline = time.monotonic() + 2.0
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(_POLL)
+
+
+class TestSqliteSessionStorage:
+    async def test_events_are_appended_in_batches(self, db: str) -> None:
+        storage = SqliteSessionStorage(db, owner="a", event_flush_interval_seconds=60.0)
+        try:
+            session = await OperatorSessionService(storage).start_session(purpose="batch")
+            for n in range(20):
+                storage.append_event(session.session_id, _event(session.session_id, n))
+
+            with sqlite3.connect(db) as other:
+                (rows,) = other.execute("SELECT COUNT(*) FROM operator_session_events").fetchone()
+            assert rows == 0  # nothing written until a read or the flush interval
+            events = storage.read_events(session.session_id, offset=1, limit=100)
+            assert [e.data["n"] for e in events] == list(range(20))
+            assert storage.flush_events() == 0
+        finally:
+            storage.close()
+
+    async def test_close_flushes_buffered_events(self, db: str) -> None:
+        storage = SqliteSessionStorage(db, owner="a", event_flush_interval_seconds=60.0)
+        session = await OperatorSessionService(storage).start_session()
+        storage.append_event(session.session_id, _event(session.session_id, 1))
+        storage.close()
+
+        reopened = SqliteSessionStorage(db, owner="a")
+        try:
+            assert reopened.event_count(session.session_id) == 2
+        finally:
+            reopened.close()
+
+    async def test_list_sessions_filters_newest_first(self, db: str) -> None:
+        storage = SqliteSessionStorage(db, owner="a")
+        service = OperatorSessionService(storage)
+        try:
+            first = await service.start_session(tenant_id="t1")
+            second = await service.start_session(tenant_id="t1")
+            other = await service.start_session(tenant_id="t2")
+            await service.end_session(second.session_id)
+
+            assert [s.session_id for s in storage.list_sessions(tenant_id="t1")] == [
+                second.session_id,
+                first.session_id,
+            ]
+            active = storage.list_sessions(status=OperatorSessionStatus.ACTIVE)
+            assert {s.session_id for s in active} == {first.session_id, other.session_id}
+            assert storage.cleanup_old_sessions(1) == 2
+            assert storage.list_session_ids() == [other.session_id]
+        finally:
+            storage.close()
+
+
+class TestLeases:
+    async def test_live_lease_blocks_other_replicas(
+        self, replicas: tuple[OperatorSessionService, OperatorSessionService]
+    ) -> None:
+        a, b = replicas
+        session = await a.start_session()
+        assert not _storage(b).write_lock(session.session_id)
+        assert _storage(b).is_process_alive(session.session_id)
+        assert await b.detect_incomplete_sessions() == []
+        assert _storage(b).read_lock(session.session_id)["owner"] == "replica-a"
+
+    async def test_expired_lease_is_detected_as_crash_and_resumed_elsewhere(self, db: str) -> None:
+        gone = SqliteSessionStorage(db, owner="gone", lease_seconds=0.05)
+        session = await OperatorSessionService(gone).start_session(purpose="survive")
+        gone.close()  # the replica dies without releasing its lease
+
+        storage = SqliteSessionStorage(db, owner="b")
+        service = OperatorSessionService(storage)
+        try:
+            _wait_for(lambda: not storage.is_process_alive(session.session_id))
+            [crashed] = await service.detect_incomplete_sessions()
+            assert crashed.session_id == session.session_id
+
+            resumed = await service.resume_session(session.session_id)
+            assert resumed.status == OperatorSessionStatus.ACTIVE
+            assert storage.read_lock(session.session_id)["owner"] == "b"
+        finally:
+            storage.close()
+
+    async def test_ending_a_session_releases_its_lease(
+        self, replicas: tuple[OperatorSessionService, OperatorSessionService]
+    ) -> None:
+        a, b = replicas
+        session = await a.start_session()
+        await a.end_session(session.session_id, OperatorSessionStatus.SUSPENDED)
+        assert _storage(a).read_lock(session.session_id) is None
+        assert _storage(b).write_lock(session.session_id)
+        assert _storage(a).renew_leases() == []
+
+    async def test_resume_conflicts_while_another_replica_holds_the_lease(
+        self, replicas: tuple[OperatorSessionService, OperatorSessionService]
+    ) -> None:
+        a, b = replicas
+        session = await a.start_session()
+        await a.end_session(session.session_id, OperatorSessionStatus.SUSPENDED)
+        assert _storage(b).write_lock(session.session_id)
+
+        with pytest.raises(ValueError, match="another replica"):
+            await a.resume_session(session.session_id)
+        stored = _storage(a).load_session(session.session_id)
+        assert stored is not None and stored.status == OperatorSessionStatus.SUSPENDED
+        assert _storage(a).read_lock(session.session_id)["owner"] == "replica-b"
+
+
+class TestHotCache:
+    async def test_inactive_sessions_are_served_from_cache(
+        self, replicas: tuple[OperatorSessionService, OperatorSessionService]
+    ) -> None:
+        a, b = replicas
+        session = await a.start_session()
+        loads = _storage(b).loads
+        for _ in range(5):
+            assert await b.get_session(session.session_id) is not None
+        assert _storage(b).loads == loads + 1
+
+    async def test_remote_writes_invalidate_cached_copies(
+        self, replicas: tuple[OperatorSessionService, OperatorSessionService]
+    ) -> None:
+        a, b = replicas
+        changed = threading.Event()
+        _storage(b).subscribe(lambda _sid: changed.set())
+        session = await a.start_session()
+        await b.get_session(session.session_id)
+        changed.clear()
+
+        await a.add_task(session.session_id, "remote task")
+        assert changed.wait(timeout=2.0)
+        cached = await b.get_session(session.session_id)
+        assert cached is not None
+        assert [t.description for t in cached.tasks] == ["remote task"]
+
+    async def test_storage_round_trips_run_off_the_event_loop(
+        self, replicas: tuple[OperatorSessionService, OperatorSessionService]
+    ) -> None:
+        a, b = replicas
+        session = await a.start_session()
+        assert await b.get_session(session.session_id) is not None
+        assert _storage(b).load_threads
+        assert threading.get_ident() not in _storage(b).load_threads
+
+    async def test_event_appends_do_not_recount_the_log(
+        self, replicas: tuple[OperatorSessionService, OperatorSessionService]
+    ) -> None:
+        a, _ = replicas
+        session = await a.start_session()
+        counts = _storage(a).counts
+        for n in range(10):
+            await a.append_event(session.session_id, _event(session.session_id, n))
+        assert _storage(a).counts == counts
+        assert session.event_count == 11
+        assert _storage(a).event_count(session.session_id) == 11
+
+
+def _redis_reachable() -> bool:
+    parsed = urlparse(_REDIS_TEST_URL)
+    try:
+        with socket.create_connection((parsed.hostname or "127.0.0.1", parsed.port or 6379), 0.5):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not _redis_reachable(), reason=f"Redis not reachable at {_REDIS_TEST_URL}")
+async def test_redis_storage_leases_events_and_invalidation() -> None:
+    import redis as redis_sync
+
+    from agent33.sessions.redis_storage import RedisSessionStorage
+
+    prefix = f"agent33:test-sessions:{uuid.uuid4().hex}:"
+    clients = [redis_sync.Redis.from_url(_REDIS_TEST_URL) for _ in range(2)]
+    sa, sb = (
+        RedisSessionStorage(client, owner=name, prefix=prefix, event_flush_interval_seconds=_POLL)
+        for name, client in zip(("a", "b"), clients, strict=True)
+    )
+    a, b = OperatorSessionService(sa), OperatorSessionService(sb)
+    try:
+        session = await a.start_session(purpose="shared", tenant_id="t1")
+        assert not sb.write_lock(session.session_id)
+        assert sb.read_lock(session.session_id)["owner"] == "a"
+
+        changed = threading.Event()
+        sb.subscribe(lambda _sid: changed.set())
+        await b.get_session(session.session_id)
+        await a.add_task(session.session_id, "remote task")
+        assert changed.wait(timeout=2.0)
+        cached = await b.get_session(session.session_id)
+        assert cached is not None and [t.description for t in cached.tasks] == ["remote task"]
+
+        for n in range(5):
+            sa.append_event(session.session_id, _event(session.session_id, n))
+        sa.flush_events()
+        events = sb.read_events(session.session_id, offset=2, limit=10)
+        assert [e.data["n"] for e in events] == list(range(5))
+
+        await a.end_session(session.session_id, OperatorSessionStatus.SUSPENDED)
+        assert sa.read_lock(session.session_id) is None
+        await b.resume_session(session.session_id)
+        with pytest.raises(ValueError):
+            await a.resume_session(session.session_id)
+        assert [s.session_id for s in sa.list_sessions(tenant_id="t1")] == [session.session_id]
+    finally:
+        await a.shutdown()
+        await b.shutdown()
+        leftovers = clients[0].keys(f"{prefix}*")
+        if leftovers:
+            clients[0].delete(*leftovers)
@@ -726,6 +726,54 @@ class TestTrajectoryAPI:
         assert data["title"] == "My Custom Title"
         assert data["source"] == "stored"
 
+    async def test_generate_missing_titles(
+        self,
+        tracker: SessionTrajectoryTracker,
+        title_gen: TitleGenerator,
+        _wired_phase59: Any,
+    ) -> None:
+        """POST /v1/sessions/titles titles only untitled sessions with a message."""
+        import httpx
+
+        from agent33.main import app
+
+        tracker.record_event(
+            "test-sess-a",
+            TrajectoryEventKind.USER_MESSAGE,
+            detail="Set up a Postgres replica",
+        )
+        tracker.record_event(
+            "test-sess-b",
+            TrajectoryEventKind.USER_MESSAGE,
+            detail="Tune the Redis eviction policy",
+        )
+        tracker.start_session("test-sess-empty")
+        tracker.start_session("test-sess-titled")
+        tracker.set_title("test-sess-titled", "Already Titled")
+
+        app.state.trajectory_tracker = tracker
+        app.state.title_generator = title_gen
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            headers={"X-API-Key": "test-key"},
+        ) as client:
+            resp = await client.post("/v1/sessions/titles")
+
+        if resp.status_code == 401:
+            pytest.skip("Auth middleware active")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 2
+        assert data["generated"] == {
+            "test-sess-a": "Set up a Postgres replica",
+            "test-sess-b": "Tune the Redis eviction policy",
+        }
+        assert tracker.get("test-sess-a").title == "Set up a Postgres replica"
+        assert tracker.get("test-sess-titled").title == "Already Titled"
+        assert tracker.get("test-sess-empty").title == ""
+
     async def test_patch_title(
         self, tracker: SessionTrajectoryTracker, _wired_phase59: Any
     ) -> None:
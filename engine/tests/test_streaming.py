@@ -367,6 +367,36 @@ async def test_tool_loop_stream_uses_token_streaming_before_tool_execution() ->
     assert router.complete.await_count == 0
 
 
+@pytest.mark.asyncio
+async def test_tool_loop_stream_redacts_secrets_split_across_tokens() -> None:
+    from agent33.agents.tool_loop import ToolLoop, ToolLoopConfig
+
+    router = MagicMock()
+    router.complete = AsyncMock()
+    secret = "sk-" + "a" * 30
+
+    async def _stream_complete(*args: Any, **kwargs: Any):  # noqa: ARG001
+        for token in ["Your key is ", secret[:5], secret[5:20], secret[20:], " ok"]:
+            yield LLMStreamChunk(delta_content=token)
+        yield LLMStreamChunk(finish_reason="stop", model="test-model")
+
+    router.stream_complete = _stream_complete
+
+    loop = ToolLoop(
+        router=router,
+        tool_registry=_make_registry(),
+        config=ToolLoopConfig(max_iterations=1, enable_double_confirmation=False),
+    )
+
+    events = [event async for event in loop.run_stream(_messages(), model="test-model")]
+    tokens = [event.data["token"] for event in events if event.event_type == "llm_token"]
+
+    assert tokens[0] == "Your key is "
+    streamed = "".join(tokens)
+    assert "aaaaaaaaaaaaaaaaaaaa" not in streamed
+    assert streamed.endswith(" ok")
+
+
 @pytest.mark.asyncio
 async def test_tool_loop_stream_falls_back_to_complete_when_streaming_unsupported() -> None:
     from agent33.agents.tool_loop import ToolLoop, ToolLoopConfig
@@ -0,0 +1,254 @@
+"""Tests for the deterministic stub model server (agent33.testing.stub_server)."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from agent33.llm.base import ChatMessage
+from agent33.llm.ollama import OllamaProvider
+from agent33.llm.openai import OpenAIProvider
+from agent33.testing.stub_server import (
+    LatencyDistribution,
+    ScriptStep,
+    StubBehavior,
+    behavior_from_args,
+    build_parser,
+    create_app,
+    load_tool_script,
+    running_stub_server,
+    stub_reply,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_MESSAGES = [ChatMessage(role="user", content="summarize the release notes")]
+_SCRIPT = (
+    ScriptStep(tool_calls=(("search", {"query": "release notes"}),)),
+    ScriptStep(content="All done."),
+)
+
+
+def _client(behavior: StubBehavior | None = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(behavior)), base_url="http://stub"
+    )
+
+
+async def _ollama(behavior: StubBehavior) -> OllamaProvider:
+    provider = OllamaProvider(base_url="http://stub")
+    await provider._client.aclose()
+    provider._client = _client(behavior)
+    return provider
+
+
+async def _openai(behavior: StubBehavior) -> OpenAIProvider:
+    provider = OpenAIProvider(api_key="stub", base_url="http://stub/v1")
+    await provider._client.aclose()
+    provider._client = _client(behavior)
+    return provider
+
+
+class TestLatencyDistribution:
+    @pytest.mark.parametrize(
+        ("spec", "kind", "params"),
+        [
+            ("50", "fixed", (50.0,)),
+            ("fixed:50", "fixed", (50.0,)),
+            ("uniform:20:80", "uniform", (20.0, 80.0)),
+            ("lognormal:200:0.5", "lognormal", (200.0, 0.5)),
+        ],
+    )
+    def test_parse(self, spec: str, kind: str, params: tuple[float, ...]) -> None:
+        assert LatencyDistribution.parse(spec) == LatencyDistribution(kind, params)
+
+    @pytest.mark.parametrize("spec", ["gamma:1", "uniform:20", "fixed:-1", "fixed:soon"])
+    def test_invalid_specs_are_rejected(self, spec: str) -> None:
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse(spec)
+
+    def test_samples_are_reproducible_and_in_range(self) -> None:
+        uniform = LatencyDistribution.parse("uniform:20:80")
+        first = [uniform.sample(random.Random(7)) for _ in range(3)]
+        assert first == [uniform.sample(random.Random(7)) for _ in range(3)]
+        rng = random.Random(1)
+        assert all(20 <= uniform.sample(rng) <= 80 for _ in range(200))
+        normal = LatencyDistribution.parse("normal:1:50")
+        assert min(normal.sample(rng) for _ in range(200)) == 0.0
+
+
+class TestOllamaApi:
+    async def test_complete_and_stream_agree(self) -> None:
+        provider = await _ollama(StubBehavior(reply_tokens=6))
+        try:
+            response = await provider.complete(_MESSAGES)
+            streamed = [chunk async for chunk in provider.stream_complete(_MESSAGES)]
+        finally:
+            await provider.close()
+
+        assert response.content == " ".join(stub_reply("summarize the release notes", 6))
+        assert "".join(chunk.delta_content for chunk in streamed) == response.content
+        assert streamed[-1].finish_reason == "stop"
+        assert response.prompt_tokens == 4
+
+    async def test_tool_script_drives_the_turns(self) -> None:
+        provider = await _ollama(StubBehavior(tool_script=_SCRIPT))
+        try:
+            first = await provider.complete(_MESSAGES)
+            assert first.tool_calls is not None
+            followup = [
+                *_MESSAGES,
+                ChatMessage(role="assistant", content="", tool_calls=first.tool_calls),
+                ChatMessage(role="tool", content="3 results", tool_call_id="call_0"),
+            ]
+            second = await provider.complete(followup)
+        finally:
+            await provider.close()
+
+        [call] = first.tool_calls
+        assert call.function.name == "search"
+        assert json.loads(call.function.arguments) == {"query": "release notes"}
+        assert first.finish_reason == "tool_calls"
+        assert second.content == "All done."
+        assert not second.tool_calls
+
+    async def test_embed(self) -> None:
+        async with _client(StubBehavior(embedding_dim=16)) as client:
+            response = await client.post("/api/embed", json={"input": ["a", "b", "a"]})
+        vectors = response.json()["embeddings"]
+        assert len(vectors) == 3
+        assert vectors[0] == vectors[2] != vectors[1]
+        assert sum(v * v for v in vectors[0]) == pytest.approx(1.0)
+
+
+class TestOpenAIApi:
+    async def test_complete_and_sse_stream_agree(self) -> None:
+        provider = await _openai(StubBehavior(reply_tokens=5))
+        try:
+            response = await provider.complete(_MESSAGES)
+            streamed = [chunk async for chunk in provider.stream_complete(_MESSAGES)]
+        finally:
+            await provider.close()
+
+        assert response.content == " ".join(stub_reply("summarize the release notes", 5))
+        assert (response.prompt_tokens, response.completion_tokens) == (4, 5)
+        assert "".join(chunk.delta_content for chunk in streamed) == response.content
+        assert streamed[-1].finish_reason == "stop"
+        assert streamed[-1].usage_available
+
+    async def test_streamed_tool_calls(self) -> None:
+        provider = await _openai(StubBehavior(tool_script=_SCRIPT))
+        try:
+            streamed = [chunk async for chunk in provider.stream_complete(_MESSAGES)]
+        finally:
+            await provider.close()
+
+        deltas = [chunk.tool_call_delta for chunk in streamed if chunk.tool_call_delta]
+        assert [(d.name, d.arguments_fragment) for d in deltas] == [
+            ("search", '{"query": "release notes"}')
+        ]
+        assert streamed[-1].finish_reason == "tool_calls"
+
+    async def test_sse_framing_and_models(self) -> None:
+        async with _client() as client:
+            stream = await client.post(
+                "/v1/chat/completions", json={"messages": [], "stream": True}
+            )
+            models = await client.get("/v1/models")
+        events = [line for line in stream.text.split("\n\n") if line]
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        assert all(event.startswith("data: ") for event in events)
+        assert events[-1] == "data: [DONE]"
+        assert [m["id"] for m in models.json()["data"]] == [
+            "llama3.2:3b",
+            "nomic-embed-text:latest",
+        ]
+
+    async def test_embeddings(self) -> None:
+        async with _client(StubBehavior(embedding_dim=8)) as client:
+            response = await client.post("/v1/embeddings", json={"input": "one two"})
+        body = response.json()
+        assert [item["index"] for item in body["data"]] == [0]
+        assert len(body["data"][0]["embedding"]) == 8
+        assert body["usage"]["prompt_tokens"] == 2
+
+
+class TestPacingAndFailures:
+    async def test_latency_and_token_rate_are_applied(self) -> None:
+        behavior = StubBehavior(
+            latency=LatencyDistribution.parse("fixed:40"), tokens_per_second=200, reply_tokens=5
+        )
+        async with _client(behavior) as client:
+            started = time.perf_counter()
+            await client.post("/api/chat", json={"messages": [], "stream": False})
+            elapsed = time.perf_counter() - started
+        # 40 ms to the first token, then four more tokens at 5 ms each.
+        assert elapsed >= 0.058
+
+    async def test_injected_errors_follow_the_protocol(self) -> None:
+        behavior = StubBehavior(error_rate=1.0, error_status=429)
+        async with _client(behavior) as client:
+            ollama = await client.post("/api/chat", json={"messages": []})
+            openai = await client.post("/v1/embeddings", json={"input": "x"})
+            stats = (await client.get("/stub/stats")).json()
+        assert ollama.status_code == openai.status_code == 429
+        assert ollama.headers["retry-after"] == "1"
+        assert isinstance(ollama.json()["error"], str)
+        assert openai.json()["error"]["code"] == 429
+        assert stats == {"/api/chat": 1, "/v1/embeddings": 1, "injected_errors": 2}
+
+    async def test_error_rate_is_reproducible(self) -> None:
+        async def statuses() -> list[int]:
+            async with _client(StubBehavior(error_rate=0.5, seed=3)) as client:
+                return [
+                    (await client.post("/api/embed", json={"input": "x"})).status_code
+                    for _ in range(20)
+                ]
+
+        first = await statuses()
+        assert first == await statuses()
+        assert {200, 503} == set(first)
+
+    async def test_aborted_stream_has_no_terminator(self) -> None:
+        async with _client(StubBehavior(abort_rate=1.0, reply_tokens=8)) as client:
+            sse = await client.post("/v1/chat/completions", json={"messages": [], "stream": True})
+            ndjson = await client.post("/api/chat", json={"messages": []})
+        assert "[DONE]" not in sse.text
+        assert sse.text.count("data: ") == 4
+        lines = [json.loads(line) for line in ndjson.text.splitlines()]
+        assert len(lines) == 4
+        assert not any(line["done"] for line in lines)
+
+
+class TestConfiguration:
+    def test_command_line_builds_the_behavior(self, tmp_path: Path) -> None:
+        script = tmp_path / "script.json"
+        script.write_text(
+            json.dumps([{"tool_calls": [{"name": "search", "arguments": {"q": "x"}}]}]),
+            encoding="utf-8",
+        )
+        args = build_parser().parse_args(
+            ["--latency", "uniform:10:30", "--tool-script", str(script), "--error-rate", "0.1"]
+        )
+        behavior = behavior_from_args(args)
+        assert behavior.latency == LatencyDistribution("uniform", (10.0, 30.0))
+        assert behavior.tool_script == load_tool_script(script)
+        assert behavior.tool_script[0].tool_calls == (("search", {"q": "x"}),)
+        assert behavior.error_rate == 0.1
+
+    def test_rates_are_validated(self) -> None:
+        with pytest.raises(ValueError, match="error_rate"):
+            StubBehavior(error_rate=1.5)
+
+    def test_running_stub_server_serves_over_loopback(self) -> None:
+        with running_stub_server(StubBehavior(reply_tokens=3)) as url:
+            response = httpx.post(
+                f"{url}/v1/chat/completions", json={"messages": [{"role": "user", "content": "x"}]}
+            )
+        assert response.json()["choices"][0]["message"]["content"] == " ".join(stub_reply("x", 3))
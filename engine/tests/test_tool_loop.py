@@ -821,6 +821,18 @@ class TestEdgeCases:
         assert result.termination_reason == "completed"
         assert result.tool_calls_made == 0
 
+    async def test_tool_schemas_are_sent_in_name_order(self) -> None:
+        """Registration order does not change the cacheable tool-schema prefix."""
+        router = _make_router(_text_response("done"))
+        registry = _make_registry(_make_mock_tool("write"), _make_mock_tool("read"))
+        config = ToolLoopConfig(enable_double_confirmation=False)
+        loop = ToolLoop(router=router, tool_registry=registry, config=config)
+
+        await loop.run(_initial_messages(), model="m")
+
+        tools = router.complete.call_args.kwargs["tools"]
+        assert [tool["name"] for tool in tools] == ["read", "write"]
+
     async def test_no_tools_available(self) -> None:
         """When no tools are registered, the loop still works (text only)."""
         router = _make_router(_text_response("no tools needed"))
@@ -292,6 +292,7 @@ class TestGovernedFetchProvider:
         mock_response.status_code = 200
         mock_response.text = "<html>OK</html>"
         mock_response.content = b"<html>OK</html>"
+        mock_response.headers = httpx.Headers()
         mock_response.raise_for_status = lambda: None
 
         with patch("agent33.web_research.service.build_connector_boundary_executor") as mock_bce:
@@ -0,0 +1,427 @@
+"""Tests for the web research TTL cache and conditional revalidation."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+from agent33.lifespan.fallbacks import InProcessCache
+from agent33.web_research.cache import (
+    CachedResult,
+    RedisCacheTier,
+    SQLiteCacheTier,
+    WebResearchCache,
+    configure_web_research_cache,
+    fetch_cache_policy,
+    normalize_url,
+    parse_cache_control,
+)
+from agent33.web_research.models import (
+    ProviderAuthState,
+    ResearchProviderKind,
+    ResearchProviderStatus,
+    ResearchTrustLevel,
+    WebFetchArtifact,
+    WebResearchCitation,
+    WebResearchResult,
+)
+from agent33.web_research.service import WebResearchService, _build_result
+
+_ALLOWED = ["example.com"]
+
+
+class _CountingSearch:
+    provider_id = "fake-search"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def diagnostics(self) -> ResearchProviderStatus:
+        return ResearchProviderStatus(
+            provider_id=self.provider_id,
+            display_name="Fake Search",
+            kind=ResearchProviderKind.SEARCH,
+            status="ok",
+            auth_state=ProviderAuthState.NOT_REQUIRED,
+            configured=True,
+        )
+
+    async def search(self, query: str, *, limit: int, categories: str) -> list[WebResearchResult]:
+        self.calls += 1
+        return [
+            _build_result(
+                title=query,
+                url=f"https://example.com/{self.calls}",
+                snippet="",
+                provider_id=self.provider_id,
+                rank=1,
+            )
+        ]
+
+
+class _ScriptedFetch:
+    """Fetch provider that honours If-None-Match like an origin server would."""
+
+    provider_id = "fake-fetch"
+
+    def __init__(self, *, cache_control: str | None = "max-age=60", etag: str | None = '"v1"'):
+        self.cache_control = cache_control
+        self.etag = etag
+        self.body = "hello"
+        self.vary: str | None = None
+        self.requests: list[dict[str, str]] = []
+
+    def diagnostics(self) -> ResearchProviderStatus:
+        return ResearchProviderStatus(
+            provider_id=self.provider_id,
+            display_name="Fake Fetch",
+            kind=ResearchProviderKind.FETCH,
+            status="ok",
+            auth_state=ProviderAuthState.NOT_REQUIRED,
+            configured=True,
+        )
+
+    async def fetch(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str],
+        body: str | None,
+        method: str,
+        timeout: int,
+        allowed_domains: Any,
+    ) -> WebFetchArtifact:
+        self.requests.append(dict(headers))
+        not_modified = self.etag is not None and headers.get("If-None-Match") == self.etag
+        content = "" if not_modified else self.body
+        return WebFetchArtifact(
+            url=url,
+            provider_id=self.provider_id,
+            status_code=304 if not_modified else 200,
+            content=content,
+            content_preview=content,
+            trust_level=ResearchTrustLevel.FETCH_VERIFIED,
+            trust_reason="test",
+            citation=WebResearchCitation(
+                title=url,
+                url=url,
+                display_url=url,
+                domain="example.com",
+                provider_id=self.provider_id,
+                trust_level=ResearchTrustLevel.FETCH_VERIFIED,
+                trust_reason="test",
+            ),
+            etag=self.etag,
+            cache_control=self.cache_control,
+            vary=self.vary,
+        )
+
+
+def _service(
+    cache: WebResearchCache,
+    *,
+    search: _CountingSearch | None = None,
+    fetch: _ScriptedFetch | None = None,
+) -> WebResearchService:
+    return WebResearchService(
+        search_providers=[search or _CountingSearch()],
+        fetch_providers=[fetch or _ScriptedFetch()],
+        default_search_provider="fake-search",
+        default_fetch_provider="fake-fetch",
+        cache=cache,
+    )
+
+
+def _expire_all(cache: WebResearchCache) -> None:
+    for entry in cache._entries.values():
+        entry.result.expires_at = time.time() - 1
+
+
+class TestSearchCaching:
+    async def test_identical_queries_hit_cache(self) -> None:
+        provider = _CountingSearch()
+        service = _service(WebResearchCache(), search=provider)
+        first = await service.search("Python  Asyncio", limit=5)
+        second = await service.search("python asyncio", limit=5)
+        assert provider.calls == 1
+        assert first.cached is False
+        assert second.cached is True
+        assert second.results[0].url == first.results[0].url
+        assert second.query == "python asyncio"
+
+    async def test_different_limit_or_category_misses(self) -> None:
+        provider = _CountingSearch()
+        service = _service(WebResearchCache(), search=provider)
+        await service.search("q", limit=5)
+        await service.search("q", limit=10)
+        await service.search("q", limit=5, categories="news")
+        assert provider.calls == 3
+
+    async def test_expired_search_entry_refetches(self) -> None:
+        provider = _CountingSearch()
+        cache = WebResearchCache(search_ttl_seconds=60)
+        service = _service(cache, search=provider)
+        await service.search("q")
+        _expire_all(cache)
+        await service.search("q")
+        assert provider.calls == 2
+
+    async def test_tenant_isolation_when_cross_tenant_disabled(self) -> None:
+        provider = _CountingSearch()
+        service = _service(WebResearchCache(cross_tenant=False), search=provider)
+        await service.search("q", tenant_id="t1")
+        await service.search("q", tenant_id="t2")
+        await service.search("q", tenant_id="t1")
+        assert provider.calls == 2
+
+    async def test_cross_tenant_sharing_by_default(self) -> None:
+        provider = _CountingSearch()
+        service = _service(WebResearchCache(), search=provider)
+        await service.search("q", tenant_id="t1")
+        await service.search("q", tenant_id="t2")
+        assert provider.calls == 1
+
+    async def test_hit_rate_in_provider_status_summary(self) -> None:
+        service = _service(WebResearchCache())
+        await service.search("q")
+        await service.search("q")
+        await service.search("q")
+        summary = {item.name: item for item in service.provider_status_summary()}
+        search = summary["Fake Search"]
+        assert search.total_calls == 1
+        assert search.cache_hits == 2
+        assert search.cache_misses == 1
+        assert search.cache_hit_rate == pytest.approx(2 / 3, abs=1e-3)
+
+    async def test_uses_process_wide_cache_when_not_injected(self) -> None:
+        provider = _CountingSearch()
+        cache = WebResearchCache()
+        configure_web_research_cache(cache)
+        try:
+            for _ in range(2):
+                service = WebResearchService(
+                    search_providers=[provider],
+                    fetch_providers=[],
+                    default_search_provider="fake-search",
+                    default_fetch_provider="fake-fetch",
+                )
+                await service.search("q")
+        finally:
+            configure_web_research_cache(None)
+        assert provider.calls == 1
+
+
+class TestFetchCaching:
+    async def test_fresh_entry_served_without_network(self) -> None:
+        fetch = _ScriptedFetch()
+        service = _service(WebResearchCache(), fetch=fetch)
+        first = await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        second = await service.fetch("https://EXAMPLE.com/page#frag", allowed_domains=_ALLOWED)
+        assert len(fetch.requests) == 1
+        assert first.cache_status == "miss"
+        assert second.cache_status == "hit"
+        assert second.content == "hello"
+
+    async def test_stale_entry_revalidates_with_conditional_get(self) -> None:
+        fetch = _ScriptedFetch()
+        cache = WebResearchCache()
+        service = _service(cache, fetch=fetch)
+        await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        _expire_all(cache)
+
+        revalidated = await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        assert fetch.requests[1]["If-None-Match"] == '"v1"'
+        assert revalidated.cache_status == "revalidated"
+        assert revalidated.status_code == 200
+        assert revalidated.content == "hello"
+
+        # The 304 refreshed the entry's freshness window.
+        third = await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        assert third.cache_status == "hit"
+        assert len(fetch.requests) == 2
+
+    async def test_changed_resource_replaces_entry(self) -> None:
+        fetch = _ScriptedFetch()
+        cache = WebResearchCache()
+        service = _service(cache, fetch=fetch)
+        await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        _expire_all(cache)
+        fetch.etag = '"v2"'
+        fetch.body = "updated"
+        refreshed = await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        assert refreshed.cache_status == "miss"
+        assert refreshed.content == "updated"
+        cached = await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        assert cached.content == "updated"
+        assert cached.cache_status == "hit"
+
+    async def test_no_store_is_never_cached(self) -> None:
+        fetch = _ScriptedFetch(cache_control="no-store")
+        service = _service(WebResearchCache(), fetch=fetch)
+        await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        assert len(fetch.requests) == 2
+
+    async def test_no_cache_always_revalidates(self) -> None:
+        fetch = _ScriptedFetch(cache_control="no-cache")
+        service = _service(WebResearchCache(), fetch=fetch)
+        await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        second = await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        assert second.cache_status == "revalidated"
+        assert len(fetch.requests) == 2
+
+    async def test_credentialed_and_private_responses_are_tenant_scoped(self) -> None:
+        fetch = _ScriptedFetch(cache_control="private, max-age=60")
+        service = _service(WebResearchCache(), fetch=fetch)
+        await service.fetch("https://example.com/me", allowed_domains=_ALLOWED, tenant_id="t1")
+        t1_again = await service.fetch(
+            "https://example.com/me", allowed_domains=_ALLOWED, tenant_id="t1"
+        )
+        t2 = await service.fetch(
+            "https://example.com/me", allowed_domains=_ALLOWED, tenant_id="t2"
+        )
+        assert t1_again.cache_status == "hit"
+        assert t2.cache_status == "miss"
+
+        authed = _ScriptedFetch()
+        service = _service(WebResearchCache(), fetch=authed)
+        headers = {"Authorization": "Bearer secret"}
+        await service.fetch(
+            "https://example.com/a", allowed_domains=_ALLOWED, headers=headers, tenant_id="t1"
+        )
+        anonymous = await service.fetch("https://example.com/a", allowed_domains=_ALLOWED)
+        assert anonymous.cache_status == "miss"
+
+    async def test_unknown_request_headers_are_tenant_scoped(self) -> None:
+        fetch = _ScriptedFetch()
+        service = _service(WebResearchCache(), fetch=fetch)
+        await service.fetch(
+            "https://example.com/a",
+            allowed_domains=_ALLOWED,
+            headers={"X-Auth-Token": "tenant-1-secret"},
+            tenant_id="t1",
+        )
+        other_tenant = await service.fetch(
+            "https://example.com/a",
+            allowed_domains=_ALLOWED,
+            headers={"X-Auth-Token": "tenant-1-secret"},
+            tenant_id="t2",
+        )
+        anonymous = await service.fetch("https://example.com/a", allowed_domains=_ALLOWED)
+        assert other_tenant.cache_status == "miss"
+        assert anonymous.cache_status == "miss"
+
+    async def test_responses_are_stored_per_request_variant(self) -> None:
+        fetch = _ScriptedFetch()
+        fetch.vary = "Accept-Language"
+        service = _service(WebResearchCache(), fetch=fetch)
+        url = "https://example.com/page"
+        await service.fetch(url, allowed_domains=_ALLOWED, headers={"Accept-Language": "de"})
+        german = await service.fetch(
+            url, allowed_domains=_ALLOWED, headers={"accept-language": " de "}
+        )
+        english = await service.fetch(
+            url, allowed_domains=_ALLOWED, headers={"Accept-Language": "en"}
+        )
+        assert german.cache_status == "hit"
+        assert english.cache_status == "miss"
+
+    async def test_vary_star_is_never_cached(self) -> None:
+        fetch = _ScriptedFetch()
+        fetch.vary = "*"
+        service = _service(WebResearchCache(), fetch=fetch)
+        await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        again = await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        assert again.cache_status == "miss"
+
+    async def test_post_and_bodies_bypass_cache(self) -> None:
+        fetch = _ScriptedFetch()
+        service = _service(WebResearchCache(), fetch=fetch)
+        for _ in range(2):
+            result = await service.fetch(
+                "https://example.com/api", allowed_domains=_ALLOWED, method="POST", body="{}"
+            )
+            assert result.cache_status == "bypass"
+        assert len(fetch.requests) == 2
+
+    async def test_cache_hit_still_enforces_allowlist(self) -> None:
+        service = _service(WebResearchCache())
+        await service.fetch("https://example.com/page", allowed_domains=_ALLOWED)
+        with pytest.raises(ValueError, match="allowlist"):
+            await service.fetch("https://example.com/page", allowed_domains=["other.org"])
+
+
+class TestCachePolicyHelpers:
+    def test_parse_cache_control(self) -> None:
+        assert parse_cache_control('public, max-age="120", no-transform') == {
+            "public": None,
+            "max-age": "120",
+            "no-transform": None,
+        }
+
+    def test_fetch_policy_prefers_s_maxage_for_shared_entries(self) -> None:
+        policy = fetch_cache_policy(
+            "max-age=10, s-maxage=90", default_ttl_seconds=300, max_ttl_seconds=3600
+        )
+        assert policy.ttl_seconds == 90
+        capped = fetch_cache_policy("max-age=999999", default_ttl_seconds=1, max_ttl_seconds=60)
+        assert capped.ttl_seconds == 60
+        private = fetch_cache_policy(
+            "private, s-maxage=90, max-age=5", default_ttl_seconds=300, max_ttl_seconds=3600
+        )
+        assert private.tenant_scoped is True
+        assert private.ttl_seconds == 5
+
+    def test_normalize_url(self) -> None:
+        assert normalize_url("HTTPS://Example.COM/?q=1#x") == "https://example.com?q=1"
+        assert normalize_url("https://example.com/Path/") == "https://example.com/Path/"
+
+
+class TestCacheBoundsAndTiers:
+    async def test_memory_tier_is_bounded(self) -> None:
+        cache = WebResearchCache(max_entries=3)
+        now = time.time()
+        for index in range(10):
+            await cache.put(
+                f"k{index}", CachedResult(payload={"i": index}, stored_at=now, expires_at=now + 60)
+            )
+        assert cache.snapshot()["entries"] == 3
+        assert await cache.get("k0") is None
+        assert (await cache.get("k9")) is not None
+
+    async def test_byte_budget_evicts(self) -> None:
+        cache = WebResearchCache(max_bytes=400)
+        now = time.time()
+        for index in range(10):
+            await cache.put(
+                f"k{index}",
+                CachedResult(payload={"blob": "x" * 100}, stored_at=now, expires_at=now + 60),
+            )
+        assert cache.snapshot()["bytes"] <= 400
+
+    async def test_redis_tier_shares_entries_between_instances(self) -> None:
+        redis = InProcessCache()
+        writer = _service(WebResearchCache(tier=RedisCacheTier(redis)))
+        provider = _CountingSearch()
+        reader = _service(WebResearchCache(tier=RedisCacheTier(redis)), search=provider)
+        await writer.search("shared query")
+        result = await reader.search("shared query")
+        assert result.cached is True
+        assert provider.calls == 0
+
+    async def test_sqlite_tier_survives_restart(self, tmp_path: Any) -> None:
+        path = tmp_path / "cache.sqlite3"
+        first = WebResearchCache(tier=SQLiteCacheTier(path))
+        await _service(first).search("persisted")
+        await first.aclose()
+
+        provider = _CountingSearch()
+        second = WebResearchCache(tier=SQLiteCacheTier(path))
+        try:
+            result = await _service(second, search=provider).search("persisted")
+        finally:
+            await second.aclose()
+        assert result.cached is True
+        assert provider.calls == 0
@@ -0,0 +1,281 @@
+"""HTTP webhook delivery: workers, endpoint lanes, timer-wheel retries, durable store."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+
+from agent33.automation.pg_webhook_repository import SqliteWebhookDeliveryStore
+from agent33.automation.webhook_delivery import (
+    DeliveryAttempt,
+    WebhookDeliveryManager,
+    WebhookDeliveryRecord,
+    WebhookDeliveryStatus,
+)
+from agent33.automation.webhook_engine import TimerWheel, WebhookDeliveryEngine
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from pathlib import Path
+
+
+class _Receiver:
+    """Scripted HTTP receiver behind ``httpx.MockTransport``."""
+
+    def __init__(self, statuses: dict[str, list[int]] | None = None, delay: float = 0.0) -> None:
+        self.statuses = statuses or {}
+        self.delay = delay
+        self.received: list[tuple[str, dict[str, Any]]] = []
+        self.in_flight: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            body = json.loads(request.content)
+            self.received.append((host, body))
+            script = self.statuses.get(host)
+            status = script.pop(0) if script else 200
+            return httpx.Response(status, json={"ok": status < 300})
+        finally:
+            self.in_flight[host] -= 1
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+def _manager(**kwargs: Any) -> WebhookDeliveryManager:
+    kwargs.setdefault("base_delay_seconds", 0.02)
+    kwargs.setdefault("max_delay_seconds", 0.05)
+    return WebhookDeliveryManager(**kwargs)
+
+
+async def _run(
+    engine: WebhookDeliveryEngine, body: Callable[[], Awaitable[None]] | None = None
+) -> None:
+    await engine.start()
+    try:
+        if body is not None:
+            await body()
+        await engine.wait_idle(timeout=5.0)
+    finally:
+        await engine.stop()
+
+
+class TestTimerWheel:
+    def test_items_fire_in_due_order_across_rotations(self) -> None:
+        wheel: TimerWheel[str] = TimerWheel(tick_seconds=1.0, slots=4)
+        wheel.schedule("late", due_at=10.0, now=0.0)
+        wheel.schedule("soon", due_at=2.0, now=0.0)
+        wheel.schedule("overdue", due_at=-5.0, now=0.0)
+
+        assert wheel.advance(0.0) == ["overdue"]
+        assert wheel.next_due_in(0.5) == pytest.approx(1.5)
+        assert wheel.advance(2.0) == ["soon"]
+        assert wheel.advance(9.0) == []
+        assert wheel.advance(10.0) == ["late"]
+        assert len(wheel) == 0
+        assert wheel.next_due_in(10.0) is None
+
+
+class TestWebhookDeliveryEngine:
+    async def test_delivers_json_payload_and_records_receipt(self) -> None:
+        receiver = _Receiver()
+        manager = _manager()
+        engine = WebhookDeliveryEngine(manager, client=receiver.client())
+
+        async def _enqueue() -> None:
+            manager.enqueue("wh", "http://hooks.test/a", {"event": "done"}, {"X-Sig": "s"})
+
+        await _run(engine, _enqueue)
+        assert receiver.received == [("hooks.test", {"event": "done"})]
+        [record] = manager.list_deliveries()
+        assert record.status == WebhookDeliveryStatus.DELIVERED
+        assert record.attempts[0].status_code == 200
+        assert record.attempts[0].attempt_number == 1
+
+    async def test_failed_attempts_retry_through_timer_wheel(self) -> None:
+        receiver = _Receiver({"flaky.test": [503, 500]})
+        manager = _manager()
+        engine = WebhookDeliveryEngine(manager, client=receiver.client(), tick_seconds=0.005)
+
+        async def _enqueue() -> None:
+            manager.enqueue("wh", "http://flaky.test/", {"n": 1})
+
+        await _run(engine, _enqueue)
+        [record] = manager.list_deliveries()
+        assert record.status == WebhookDeliveryStatus.DELIVERED
+        assert [a.status_code for a in record.attempts] == [503, 500, 200]
+
+    async def test_exhausted_retries_are_dead_lettered(self) -> None:
+        receiver = _Receiver({"down.test": [500] * 3})
+        manager = _manager(max_retries=3)
+        engine = WebhookDeliveryEngine(manager, client=receiver.client(), tick_seconds=0.005)
+
+        async def _enqueue() -> None:
+            manager.enqueue("wh", "http://down.test/", {})
+
+        await _run(engine, _enqueue)
+        assert [r.current_retry for r in manager.get_dead_letters()] == [3]
+
+    async def test_connection_errors_are_recorded_as_failures(self) -> None:
+        def _refuse(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        manager = _manager(max_retries=1)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_refuse))
+        engine = WebhookDeliveryEngine(manager, client=client)
+
+        async def _enqueue() -> None:
+            manager.enqueue("wh", "http://gone.test/", {})
+
+        await _run(engine, _enqueue)
+        [record] = manager.get_dead_letters()
+        assert record.attempts[0].status_code == 0
+        assert "ConnectError" in record.attempts[0].error_message
+
+    async def test_endpoint_concurrency_is_capped_per_url(self) -> None:
+        receiver = _Receiver(delay=0.02)
+        manager = _manager()
+        engine = WebhookDeliveryEngine(
+            manager, client=receiver.client(), workers=8, endpoint_concurrency=2
+        )
+
+        async def _enqueue() -> None:
+            for i in range(6):
+                manager.enqueue("wh", "http://slow.test/", {"i": i})
+                manager.enqueue("wh", "http://fast.test/", {"i": i})
+
+        await _run(engine, _enqueue)
+        assert len(receiver.received) == 12
+        assert receiver.peak == {"slow.test": 2, "fast.test": 2}
+
+    async def test_ordered_lane_holds_later_deliveries_behind_a_retry(self) -> None:
+        receiver = _Receiver({"ordered.test": [500]})
+        manager = _manager()
+        engine = WebhookDeliveryEngine(
+            manager, client=receiver.client(), ordered=True, tick_seconds=0.005
+        )
+
+        async def _enqueue() -> None:
+            for i in range(3):
+                manager.enqueue("wh", "http://ordered.test/", {"seq": i})
+
+        await _run(engine, _enqueue)
+        assert [body["seq"] for _, body in receiver.received] == [0, 0, 1, 2]
+
+    async def test_retried_dead_letter_is_sent_again(self) -> None:
+        receiver = _Receiver({"dl.test": [500]})
+        manager = _manager(max_retries=1)
+        engine = WebhookDeliveryEngine(manager, client=receiver.client())
+
+        async def _body() -> None:
+            delivery_id = manager.enqueue("wh", "http://dl.test/", {})
+            await engine.wait_idle(timeout=5.0)
+            assert manager.is_terminal(delivery_id)
+            manager.retry_dead_letter(delivery_id)
+
+        await _run(engine, _body)
+        [record] = manager.list_deliveries()
+        assert record.status == WebhookDeliveryStatus.DELIVERED
+        assert len(receiver.received) == 2
+
+
+class TestTargetValidation:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://127.0.0.1:8080/hook",
+            "http://localhost/hook",
+            "http://169.254.169.254/latest/meta-data",
+            "http://[::1]/hook",
+            "http://10.1.2.3/hook",
+            "file:///etc/passwd",
+        ],
+    )
+    def test_private_and_non_http_targets_are_rejected_on_enqueue(self, url: str) -> None:
+        manager = _manager()
+        with pytest.raises(ValueError):
+            manager.enqueue("wh", url, {})
+        assert manager.list_deliveries() == []
+
+    async def test_private_target_recovered_from_store_is_dead_lettered_unsent(
+        self, tmp_path: Path
+    ) -> None:
+        db = str(tmp_path / "cp.db")
+        # Written before the check existed (or by a replica configured to allow it).
+        SqliteWebhookDeliveryStore(db, owner="a").save_many(
+            [WebhookDeliveryRecord(url="http://127.0.0.1:9/hook", payload={})]
+        )
+        receiver = _Receiver()
+        manager = _manager(store=SqliteWebhookDeliveryStore(db, owner="a"))
+        await _run(WebhookDeliveryEngine(manager, client=receiver.client()))
+
+        assert receiver.received == []
+        [record] = manager.get_dead_letters()
+        assert len(record.attempts) == 1
+        assert "SSRF protection" in record.attempts[0].error_message
+
+    def test_private_targets_can_be_allowed_explicitly(self) -> None:
+        manager = _manager(allow_private_targets=True)
+        assert manager.enqueue("wh", "http://127.0.0.1:8080/hook", {})
+
+
+class TestDurableDelivery:
+    async def test_receipts_are_flushed_in_batches(self, tmp_path: Path) -> None:
+        store = SqliteWebhookDeliveryStore(str(tmp_path / "cp.db"), owner="a")
+        manager = _manager(store=store)
+        for i in range(5):
+            manager.enqueue("wh", "http://hooks.test/", {"i": i})
+
+        assert manager.flush() == 5
+        assert manager.flush() == 0
+        assert [r.status for r in store.claim_unfinished()] == [WebhookDeliveryStatus.PENDING] * 5
+
+    async def test_restart_resumes_pending_and_keeps_dead_letters(self, tmp_path: Path) -> None:
+        db = str(tmp_path / "cp.db")
+        first = _manager(store=SqliteWebhookDeliveryStore(db, owner="a"), max_retries=1)
+        pending_id = first.enqueue("wh", "http://hooks.test/", {"keep": True})
+        dead_id = first.enqueue("wh", "http://hooks.test/", {})
+        first.begin_attempt(pending_id)  # crashed mid-request
+        first.process_result(dead_id, DeliveryAttempt(attempt_number=1, status_code=500))
+        first.flush()
+
+        receiver = _Receiver()
+        restarted = _manager(store=SqliteWebhookDeliveryStore(db, owner="a"))
+        await _run(WebhookDeliveryEngine(restarted, client=receiver.client()))
+
+        assert receiver.received == [("hooks.test", {"keep": True})]
+        record = restarted.get_delivery(pending_id)
+        assert record is not None and record.status == WebhookDeliveryStatus.DELIVERED
+        assert [r.delivery_id for r in restarted.get_dead_letters()] == [dead_id]
+        assert SqliteWebhookDeliveryStore(db, owner="a").claim_unfinished() == []
+
+    async def test_stale_replica_deliveries_are_adopted(self, tmp_path: Path) -> None:
+        db = str(tmp_path / "cp.db")
+        gone = SqliteWebhookDeliveryStore(db, owner="gone", lease_seconds=0.0)
+        gone.save_many([WebhookDeliveryRecord(url="http://hooks.test/", payload={"x": 1})])
+
+        receiver = _Receiver()
+        manager = _manager(store=SqliteWebhookDeliveryStore(db, owner="b"))
+        engine = WebhookDeliveryEngine(
+            manager,
+            client=receiver.client(),
+            flush_interval_seconds=0.01,
+            lease_refresh_seconds=0.01,
+        )
+        await engine.start()
+        try:
+            # Recovery on start already takes the expired lease.
+            await engine.wait_idle(timeout=5.0)
+        finally:
+            await engine.stop()
+        assert receiver.received == [("hooks.test", {"x": 1})]
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import shutil
+import threading
 from typing import TYPE_CHECKING
 
 import pytest
@@ -156,3 +160,242 @@ def test_run_archive_rejects_unsafe_run_ids(tmp_path, run_id: str) -> None:
 
     with pytest.raises(ValueError):
         service.has_run(run_id)
+
+
+def _event(run_id: str, index: int) -> WorkflowEvent:
+    return WorkflowEvent(
+        event_type=WorkflowEventType.STEP_COMPLETED,
+        run_id=run_id,
+        workflow_name="batched-workflow",
+        step_id=f"step-{index}",
+        data={"index": index},
+    )
+
+
+async def test_batch_writer_queues_events_and_reads_merge_pending(tmp_path) -> None:
+    service = WorkflowRunArchiveService(
+        tmp_path / "archives",
+        batch_interval_seconds=60.0,
+        fsync_interval_seconds=None,
+    )
+    service.start_run("run-batch", "batched-workflow")
+    await service.start_writer()
+    try:
+        for index in range(5):
+            service.submit_event("run-batch", _event("run-batch", index))
+
+        # Nothing has been written yet, but reads observe the queued events.
+        events_file = tmp_path / "archives" / "run-batch" / "events.jsonl"
+        assert events_file.read_text(encoding="utf-8") == ""
+        assert [e["step_id"] for e in service.list_events("run-batch")] == [
+            f"step-{i}" for i in range(5)
+        ]
+        assert service.list_events("run-batch", offset=3, limit=1)[0]["step_id"] == "step-3"
+        assert service.load_summary("run-batch")["event_count"] == 5
+
+        await service.flush()
+        assert len(events_file.read_text(encoding="utf-8").splitlines()) == 5
+        stats = service.writer_stats()
+        assert stats["batches"] == 1
+        assert stats["events_written"] == 5
+        assert stats["pending_events"] == 0
+    finally:
+        await service.aclose()
+
+    reloaded = WorkflowRunArchiveService(tmp_path / "archives")
+    assert reloaded.load_summary("run-batch")["event_count"] == 5
+    assert reloaded.list_events("run-batch")[0]["workflow_name"] == "batched-workflow"
+
+
+async def test_batch_writer_drains_on_close_and_fsyncs(tmp_path) -> None:
+    service = WorkflowRunArchiveService(tmp_path / "archives", fsync_interval_seconds=0.0)
+    service.start_run("run-close", "batched-workflow")
+    await service.start_writer()
+    service.submit_event("run-close", _event("run-close", 1))
+    await service.aclose()
+
+    assert not service.writer_running
+    assert service.writer_stats()["fsyncs"] >= 1
+    assert len(service.list_events("run-close")) == 1
+
+
+async def test_record_result_async_keeps_event_count_from_writer(tmp_path) -> None:
+    service = WorkflowRunArchiveService(tmp_path / "archives", batch_interval_seconds=0.0)
+    service.start_run("run-result", "batched-workflow")
+    await service.start_writer()
+    try:
+        for index in range(3):
+            service.submit_event("run-result", _event("run-result", index))
+        await service.flush()
+        await service.record_result_async("run-result", _sample_result())
+    finally:
+        await service.aclose()
+
+    summary = service.load_summary("run-result")
+    assert summary["event_count"] == 3
+    assert summary["artifact_count"] == 1
+    assert summary["status"] == "success"
+
+
+async def test_submit_event_does_not_wait_for_writer_io_lock(tmp_path) -> None:
+    service = WorkflowRunArchiveService(tmp_path / "archives", batch_interval_seconds=60.0)
+    service.start_run("run-locked", "batched-workflow")
+    await service.start_writer()
+    held = threading.Event()
+    release = threading.Event()
+
+    def _hold_io_lock() -> None:
+        # Stand-in for the writer thread sitting in an append + fsync.
+        with service._io_lock:
+            held.set()
+            release.wait()
+
+    holder = threading.Thread(target=_hold_io_lock)
+    holder.start()
+    try:
+        held.wait()
+        await asyncio.wait_for(
+            asyncio.to_thread(service.submit_event, "run-locked", _event("run-locked", 0)),
+            timeout=2.0,
+        )
+        assert service.writer_stats()["pending_events"] == 1
+    finally:
+        release.set()
+        holder.join()
+        await service.aclose()
+
+    assert len(service.list_events("run-locked")) == 1
+
+
+async def test_failed_batch_is_requeued_in_order(tmp_path, monkeypatch) -> None:
+    service = WorkflowRunArchiveService(
+        tmp_path / "archives",
+        batch_interval_seconds=60.0,
+        fsync_interval_seconds=None,
+    )
+    service.start_run("run-retry", "batched-workflow")
+    await service.start_writer()
+    try:
+        for index in range(2):
+            service.submit_event("run-retry", _event("run-retry", index))
+
+        original = service._load_required_run
+        calls = {"count": 0}
+
+        def _flaky_load(run_id: str):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise OSError("transient read failure")
+            return original(run_id)
+
+        monkeypatch.setattr(service, "_load_required_run", _flaky_load)
+        await service.flush()
+        assert service.writer_stats()["pending_events"] == 2
+
+        service.submit_event("run-retry", _event("run-retry", 2))
+        await service.flush()
+    finally:
+        await service.aclose()
+
+    assert [e["step_id"] for e in service.list_events("run-retry")] == [
+        "step-0",
+        "step-1",
+        "step-2",
+    ]
+    assert service.load_summary("run-retry")["event_count"] == 3
+
+
+async def test_idle_run_is_fsynced_once_the_interval_passes(tmp_path) -> None:
+    service = WorkflowRunArchiveService(
+        tmp_path / "archives",
+        batch_interval_seconds=0.0,
+        fsync_interval_seconds=0.3,
+    )
+    service.start_run("run-idle", "batched-workflow")
+    await service.start_writer()
+    try:
+        for index in range(2):
+            service.submit_event("run-idle", _event("run-idle", index))
+            while service.writer_stats()["events_written"] < index + 1:
+                await asyncio.sleep(0.005)
+        # The first batch was synced; the second one arrived inside the interval.
+        assert service.writer_stats()["fsyncs"] == 1
+
+        deadline = asyncio.get_running_loop().time() + 3.0
+        while service.writer_stats()["fsyncs"] < 2:
+            assert asyncio.get_running_loop().time() < deadline, "idle run never fsynced"
+            await asyncio.sleep(0.01)
+    finally:
+        await service.aclose()
+
+
+async def test_submit_event_rejects_unknown_run_like_append_event(tmp_path) -> None:
+    service = WorkflowRunArchiveService(tmp_path / "archives", batch_interval_seconds=60.0)
+    with pytest.raises(FileNotFoundError):
+        service.append_event("run-ghost", _event("run-ghost", 0))
+    await service.start_writer()
+    try:
+        with pytest.raises(FileNotFoundError):
+            service.submit_event("run-ghost", _event("run-ghost", 0))
+        assert service.writer_stats()["pending_events"] == 0
+    finally:
+        await service.aclose()
+
+
+async def test_events_for_a_removed_run_are_dropped_not_requeued(tmp_path) -> None:
+    service = WorkflowRunArchiveService(tmp_path / "archives", batch_interval_seconds=60.0)
+    service.start_run("run-gone", "batched-workflow")
+    await service.start_writer()
+    try:
+        service.submit_event("run-gone", _event("run-gone", 0))
+        shutil.rmtree(tmp_path / "archives" / "run-gone")
+        await service.flush()
+        stats = service.writer_stats()
+        assert stats["pending_events"] == 0
+        assert stats["events_dropped"] == 1
+    finally:
+        await asyncio.wait_for(service.aclose(), timeout=2.0)
+
+
+async def test_reads_do_not_wait_for_writer_fsync(tmp_path, monkeypatch) -> None:
+    service = WorkflowRunArchiveService(
+        tmp_path / "archives",
+        batch_interval_seconds=0.0,
+        fsync_interval_seconds=0.0,
+    )
+    service.start_run("run-fsync", "batched-workflow")
+    entered = threading.Event()
+    release = threading.Event()
+    real_fsync = os.fsync
+
+    def _slow_fsync(fd: int) -> None:
+        entered.set()
+        release.wait(timeout=5.0)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", _slow_fsync)
+    await service.start_writer()
+    try:
+        service.submit_event("run-fsync", _event("run-fsync", 0))
+        assert await asyncio.to_thread(entered.wait, 2.0)
+        summary = await asyncio.wait_for(
+            asyncio.to_thread(service.load_summary, "run-fsync"), timeout=2.0
+        )
+        events = await asyncio.wait_for(
+            asyncio.to_thread(service.list_events, "run-fsync"), timeout=2.0
+        )
+        assert summary is not None
+        assert summary["event_count"] == 1
+        assert len(events) == 1
+    finally:
+        release.set()
+        await service.aclose()
+
+
+def test_submit_event_without_writer_appends_inline(tmp_path) -> None:
+    service = WorkflowRunArchiveService(tmp_path / "archives")
+    service.start_run("run-inline", "batched-workflow")
+    service.submit_event("run-inline", _event("run-inline", 0))
+
+    events_file = tmp_path / "archives" / "run-inline" / "events.jsonl"
+    assert len(events_file.read_text(encoding="utf-8").splitlines()) == 1
@@ -0,0 +1,206 @@
+"""Distributed workflow step execution through leased step queues."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from agent33.observability.metrics import MetricsCollector
+from agent33.workflows.actions import invoke_agent
+from agent33.workflows.definition import WorkflowDefinition
+from agent33.workflows.executor import WorkflowExecutor, WorkflowStatus
+from agent33.workflows.step_queue import InProcessStepQueue, StepOutcome, StepTask
+from agent33.workflows.step_workers import StepDispatcher, StepWorker
+
+if TYPE_CHECKING:
+    from agent33.workflows.events import WorkflowEvent
+
+_FAN_OUT = 4
+
+
+@pytest.fixture()
+def calls() -> Any:
+    seen: list[int] = []
+
+    async def _square(inputs: dict[str, Any]) -> dict[str, Any]:
+        await asyncio.sleep(0.01)
+        seen.append(inputs["n"])
+        return {"value": inputs["n"] ** 2}
+
+    invoke_agent.register_agent("square", _square)
+    yield seen
+    invoke_agent._agent_registry.pop("square", None)
+
+
+def _definition() -> WorkflowDefinition:
+    steps: list[dict[str, Any]] = [
+        {"id": f"sq{i}", "action": "invoke-agent", "agent": "square", "inputs": {"n": i}}
+        for i in range(_FAN_OUT)
+    ]
+    steps.append(
+        {
+            "id": "total",
+            "action": "transform",
+            "depends_on": [f"sq{i}" for i in range(_FAN_OUT)],
+            "inputs": {"data": " + ".join(f"{{{{ sq{i}.value }}}}" for i in range(_FAN_OUT))},
+        }
+    )
+    return WorkflowDefinition.model_validate(
+        {
+            "name": "squares",
+            "version": "1.0.0",
+            "steps": steps,
+            "execution": {"mode": "dependency-aware", "parallel_limit": 8},
+        }
+    )
+
+
+def _task(step_id: str = "sq1", run_id: str = "run-1") -> StepTask:
+    return StepTask(
+        run_id=run_id,
+        step_id=step_id,
+        definition=_definition().model_dump(mode="json"),
+        state={},
+    )
+
+
+class TestDistributedExecution:
+    async def test_distributed_run_matches_local_run(self, calls: list[int]) -> None:
+        local = await WorkflowExecutor(_definition(), run_id="local").execute({})
+
+        queue = InProcessStepQueue()
+        metrics = MetricsCollector()
+        workers = [StepWorker(queue, worker_id=f"w{i}", metrics=metrics) for i in range(2)]
+        for worker in workers:
+            worker.start()
+        events: list[WorkflowEvent] = []
+        try:
+            remote = await WorkflowExecutor(
+                _definition(),
+                run_id="remote",
+                event_sink=events.append,
+                step_dispatcher=StepDispatcher(queue),
+            ).execute({})
+        finally:
+            for worker in workers:
+                await worker.stop()
+
+        assert remote.status == WorkflowStatus.SUCCESS
+        assert remote.outputs == local.outputs
+        assert [r.outputs for r in remote.step_results] == [r.outputs for r in local.step_results]
+        assert sum(worker.executed for worker in workers) == _FAN_OUT + 1
+        completed = [e.step_id for e in events if e.event_type.value == "step_completed"]
+        assert sorted(completed) == sorted(remote.steps_executed)
+        assert metrics.get_summary()["workflow_distributed_steps_total"] == {
+            "outcome=executed": _FAN_OUT + 1
+        }
+
+    async def test_expired_lease_is_redelivered_and_first_result_wins(self) -> None:
+        queue = InProcessStepQueue(lease_seconds=0.05)
+        await queue.submit(_task())
+        stalled = await queue.claim("stalled", block_seconds=0)
+        assert stalled is not None
+
+        redelivered = await queue.claim("healthy", block_seconds=1.0)
+        assert redelivered is not None and redelivered.deliveries == 2
+        assert not await queue.extend(stalled)
+
+        assert await queue.complete(redelivered, StepOutcome(result={"status": "success"}))
+        assert not await queue.complete(stalled, StepOutcome(result={"status": "failed"}))
+        outcome = await queue.get_outcome(_task().key)
+        assert outcome is not None and outcome.result["status"] == "success"
+
+    async def test_worker_renews_lease_for_long_steps(self, calls: list[int]) -> None:
+        queue = InProcessStepQueue(lease_seconds=0.03)
+        worker = StepWorker(queue, lease_seconds=0.03)
+        await queue.submit(_task())
+        lease = await queue.claim("w", block_seconds=0)
+        assert lease is not None
+
+        slow = asyncio.create_task(worker.handle(lease))
+        # Another worker polling during the step must not steal it.
+        assert await queue.claim("other", block_seconds=0.06) is None
+        await slow
+        assert calls == [1]
+
+    async def test_finished_step_is_not_executed_again(self, calls: list[int]) -> None:
+        queue = InProcessStepQueue()
+        worker = StepWorker(queue)
+        worker.start()
+        dispatcher = StepDispatcher(queue)
+        try:
+            first = await dispatcher.dispatch(_task())
+            second = await dispatcher.dispatch(_task())
+        finally:
+            await worker.stop()
+
+        assert first == second
+        assert first.result["outputs"] == {"value": 1}
+        assert calls == [1]
+
+    async def test_outcomes_are_scoped_by_tenant_and_run_nonce(self, calls: list[int]) -> None:
+        task = _task()
+        keys = {
+            task.key,
+            dataclasses.replace(task, tenant_id="acme").key,
+            dataclasses.replace(task, run_nonce="other-run").key,
+        }
+        assert len(keys) == 3
+
+        queue = InProcessStepQueue()
+        worker = StepWorker(queue)
+        worker.start()
+        try:
+            # Two executions with the same run id (e.g. the definition name).
+            for _ in range(2):
+                result = await WorkflowExecutor(
+                    _definition(), step_dispatcher=StepDispatcher(queue)
+                ).execute({})
+                assert result.status == WorkflowStatus.SUCCESS
+        finally:
+            await worker.stop()
+        assert sorted(calls) == sorted(list(range(_FAN_OUT)) * 2)
+
+    async def test_worker_slot_survives_a_failed_handle(self, calls: list[int]) -> None:
+        class _FlakyQueue(InProcessStepQueue):
+            failures = 1
+
+            async def get_outcome(self, key: str) -> StepOutcome | None:
+                if self.failures:
+                    self.failures -= 1
+                    raise ConnectionError("backend unavailable")
+                return await super().get_outcome(key)
+
+        queue = _FlakyQueue(lease_seconds=0.05)
+        worker = StepWorker(queue, concurrency=1)
+        worker.start()
+        try:
+            await queue.submit(_task())
+            outcome = await queue.wait_outcome(_task().key, timeout_seconds=5.0)
+            assert not worker._tasks[0].done()
+        finally:
+            await worker.stop()
+
+        assert outcome is not None
+        assert outcome.result["outputs"] == {"value": 1}
+        assert calls == [1]
+
+    async def test_step_is_abandoned_after_max_deliveries(self) -> None:
+        queue = InProcessStepQueue(lease_seconds=0.01, max_deliveries=2)
+        await queue.submit(_task())
+        assert await queue.claim("a", block_seconds=0) is not None
+        assert await queue.claim("b", block_seconds=0.5) is not None
+        assert await queue.claim("c", block_seconds=0.05) is None
+
+        outcome = await queue.get_outcome(_task().key)
+        assert outcome is not None
+        assert outcome.result["status"] == "failed"
+        assert "abandoned after 2" in outcome.result["error"]
+
+    async def test_dispatch_times_out_without_workers(self) -> None:
+        dispatcher = StepDispatcher(InProcessStepQueue(), result_timeout_seconds=0.01)
+        outcome = await dispatcher.dispatch(_task())
+        assert outcome.result["status"] == "failed"
@@ -0,0 +1,312 @@
+"""Cross-replica workflow event fan-out and per-run lock sharding.
+
+The CI tests wire two :class:`WorkflowWSManager` replicas to an in-memory bus
+that mimics the JetStream helpers of :class:`NATSMessageBus`.  The
+integration test runs the second replica in a separate process against a real
+NATS server (``AGENT33_NATS_TEST_URL``) and reports delivery latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any
+from urllib.parse import urlparse
+
+import pytest
+
+from agent33.workflows.events import WorkflowEvent, WorkflowEventType
+from agent33.workflows.ws_fanout import (
+    WorkflowEventFanout,
+    event_from_payload,
+    event_to_payload,
+    run_subject_token,
+)
+from agent33.workflows.ws_manager import WorkflowWSManager
+
+
+class _FakeJetStreamBus:
+    """Shared in-memory stand-in for the NATS bus used by several replicas."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, int] = {}
+        self.retained: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.handlers: list[tuple[str, Any]] = []
+
+    async def ensure_stream(
+        self,
+        name: str,
+        subjects: list[str],
+        *,
+        max_msgs_per_subject: int = -1,
+        max_age_seconds: float | None = None,
+    ) -> None:
+        self.streams[name] = max_msgs_per_subject
+
+    async def subscribe(self, subject: str, handler: Any) -> None:
+        self.handlers.append((subject.rstrip(">"), handler))
+
+    async def stream_publish(self, subject: str, data: dict[str, Any]) -> int:
+        # Round-trip through JSON like the real bus does.
+        decoded = json.loads(json.dumps(data))
+        retained = self.retained[subject]
+        retained.append(decoded)
+        limit = max(self.streams.values(), default=-1)
+        if limit > 0:
+            del retained[:-limit]
+        for prefix, handler in list(self.handlers):
+            if subject.startswith(prefix):
+                await handler(json.loads(json.dumps(data)))
+        return len(retained)
+
+    async def stream_messages(
+        self, stream: str, subject: str, *, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        return list(self.retained.get(subject, []))
+
+
+def _event(run_id: str, event_type: WorkflowEventType, **kwargs: Any) -> WorkflowEvent:
+    return WorkflowEvent(event_type=event_type, run_id=run_id, workflow_name="deploy", **kwargs)
+
+
+async def _replica(bus: _FakeJetStreamBus, instance_id: str) -> WorkflowWSManager:
+    manager = WorkflowWSManager(lock_shards=8)
+    await WorkflowEventFanout(bus, instance_id=instance_id, replay_limit=50).start(manager)  # type: ignore[arg-type]
+    return manager
+
+
+class TestCrossReplicaFanout:
+    async def test_event_reaches_sse_subscriber_on_other_replica(self) -> None:
+        bus = _FakeJetStreamBus()
+        origin = await _replica(bus, "a")
+        remote = await _replica(bus, "b")
+        await origin.register_run("run-1", "deploy", owner_subject="alice", tenant_id="t1")
+        await origin.publish_event(_event("run-1", WorkflowEventType.WORKFLOW_STARTED))
+
+        queue = await remote.subscribe_sse_if_allowed("run-1", subject="alice", tenant_id="t1")
+        assert queue is not None
+        await origin.publish_event(_event("run-1", WorkflowEventType.STEP_STARTED, step_id="s1"))
+
+        received = queue.get_nowait()
+        assert received.event_type is WorkflowEventType.STEP_STARTED
+        assert received.event_id == "2"
+        sync = await remote.build_sync_event("run-1")
+        assert sync is not None and sync.data["step_statuses"] == {"s1": "running"}
+
+    async def test_unknown_run_is_hydrated_with_access_control_and_replay(self) -> None:
+        bus = _FakeJetStreamBus()
+        origin = await _replica(bus, "a")
+        await origin.register_run("run-2", "deploy", owner_subject="alice", tenant_id="t1")
+        for step in ("s1", "s2", "s3"):
+            await origin.publish_event(
+                _event("run-2", WorkflowEventType.STEP_STARTED, step_id=step)
+            )
+
+        # Started after the events were published: only the stream has them.
+        late = await _replica(bus, "c")
+        assert not await late.can_access_run("run-2", subject="mallory", tenant_id="t2")
+        assert await late.can_access_run("run-2", subject="alice", tenant_id="t1")
+        replay = await late.replay_sse_events("run-2", "1")
+        assert [event.step_id for event in replay] == ["s2", "s3"]
+
+    async def test_replicas_ignore_their_own_and_stale_events(self) -> None:
+        bus = _FakeJetStreamBus()
+        origin = await _replica(bus, "a")
+        remote = await _replica(bus, "b")
+        await origin.register_run("run-3", "deploy")
+        published = await origin.publish_event(_event("run-3", WorkflowEventType.WORKFLOW_STARTED))
+
+        # The origin's own message comes back through the subscription but is skipped.
+        assert len(await origin.replay_sse_events("run-3", "0")) == 1
+        assert len(await remote.replay_sse_events("run-3", "0")) == 1
+        redelivered = await remote.ingest_remote_event(
+            published, {"run_id": "run-3", "last_event_id": 1}
+        )
+        assert redelivered is False
+        assert len(await remote.replay_sse_events("run-3", "0")) == 1
+
+    async def test_parallel_steps_reach_other_replicas_in_cursor_order(self) -> None:
+        bus = _FakeJetStreamBus()
+        original_publish = bus.stream_publish
+
+        async def jittery_publish(subject: str, data: dict[str, Any]) -> int:
+            # Earlier events take longer to publish, as under network jitter.
+            await asyncio.sleep(0.02 / int(data["event"]["event_id"]))
+            return await original_publish(subject, data)
+
+        bus.stream_publish = jittery_publish  # type: ignore[method-assign]
+        origin = await _replica(bus, "a")
+        remote = await _replica(bus, "b")
+        await origin.register_run("run-4", "deploy")
+        await asyncio.gather(
+            *(
+                origin.publish_event(
+                    _event("run-4", WorkflowEventType.STEP_STARTED, step_id=f"s{i}")
+                )
+                for i in range(5)
+            )
+        )
+
+        replayed = await remote.replay_sse_events("run-4", "0")
+        assert [event.event_id for event in replayed] == ["1", "2", "3", "4", "5"]
+        assert origin._publish_tails == {}
+
+    async def test_unknown_run_lookups_are_cached(self) -> None:
+        bus = _FakeJetStreamBus()
+        replica = await _replica(bus, "a")
+        lookups = 0
+        original = bus.stream_messages
+
+        async def counting(stream: str, subject: str, *, limit: int | None = None) -> Any:
+            nonlocal lookups
+            lookups += 1
+            return await original(stream, subject, limit=limit)
+
+        bus.stream_messages = counting  # type: ignore[method-assign]
+        for _ in range(3):
+            assert not await replica.has_run("missing")
+        assert lookups == 1
+
+    def test_payload_round_trip_keeps_cursor(self) -> None:
+        event = _event(
+            "r", WorkflowEventType.STEP_FAILED, step_id="s", data={"e": 1}, event_id="7"
+        )
+        assert event_from_payload(json.loads(json.dumps(event_to_payload(event)))) == event
+        assert run_subject_token("run-abc_1") == "run-abc_1"
+        assert "." not in run_subject_token("tenant.run*1")
+
+
+class TestShardedLocks:
+    async def test_publishing_to_one_run_does_not_block_others(self) -> None:
+        manager = WorkflowWSManager(lock_shards=16)
+        await manager.register_run("busy", "deploy")
+        await manager.register_run("idle", "deploy")
+        busy_lock = manager._run_lock("busy")
+        if busy_lock is manager._run_lock("idle"):
+            pytest.skip("run ids hash to the same shard")
+
+        async with busy_lock:
+            event = await asyncio.wait_for(
+                manager.publish_event(_event("idle", WorkflowEventType.WORKFLOW_STARTED)),
+                timeout=1.0,
+            )
+        assert event.event_id == "1"
+
+    async def test_concurrent_publishes_keep_per_run_ordering(self) -> None:
+        manager = WorkflowWSManager(lock_shards=4)
+        run_ids = [f"run-{i}" for i in range(20)]
+        for run_id in run_ids:
+            await manager.register_run(run_id, "deploy")
+
+        await asyncio.gather(
+            *(
+                manager.publish_event(_event(run_id, WorkflowEventType.HEARTBEAT))
+                for run_id in run_ids
+                for _ in range(10)
+            )
+        )
+
+        for run_id in run_ids:
+            cursors = [e.event_id for e in await manager.replay_sse_events(run_id, "0")]
+            assert cursors == [str(i) for i in range(1, 11)]
+
+
+# ---------------------------------------------------------------------------
+# Two-process test against a real NATS server
+# ---------------------------------------------------------------------------
+
+_NATS_TEST_URL = os.environ.get("AGENT33_NATS_TEST_URL", "nats://127.0.0.1:4222")
+
+_REMOTE_REPLICA = """
+import asyncio, json, sys, time
+from agent33.messaging.bus import NATSMessageBus
+from agent33.workflows.ws_fanout import WorkflowEventFanout
+from agent33.workflows.ws_manager import WorkflowWSManager
+
+async def main(url, prefix, stream, run_id, count):
+    bus = NATSMessageBus(url)
+    await bus.connect()
+    manager = WorkflowWSManager()
+    await WorkflowEventFanout(
+        bus, instance_id="remote", subject_prefix=prefix, stream_name=stream
+    ).start(manager)
+    queue = None
+    while queue is None:
+        queue = await manager.subscribe_sse(run_id)
+        if queue is None:
+            await asyncio.sleep(0.01)
+    print("ready", flush=True)
+    latencies = []
+    while len(latencies) < count:
+        event = await queue.get()
+        if "sent_at" in event.data:
+            latencies.append(time.time() - event.data["sent_at"])
+    print(json.dumps(latencies), flush=True)
+    await bus.close()
+
+asyncio.run(main(*sys.argv[1:5], int(sys.argv[5])))
+"""
+
+
+def _nats_reachable() -> bool:
+    parsed = urlparse(_NATS_TEST_URL)
+    try:
+        with socket.create_connection((parsed.hostname or "127.0.0.1", parsed.port or 4222), 0.5):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not _nats_reachable(), reason=f"NATS not reachable at {_NATS_TEST_URL}")
+async def test_two_process_cross_replica_delivery_latency() -> None:
+    from agent33.messaging.bus import NATSMessageBus
+
+    suffix = f"{os.getpid()}{int(time.time())}"
+    prefix, stream, run_id, count = f"test.wf.{suffix}", f"TEST_WF_{suffix}", "run-x", 50
+    bus = NATSMessageBus(_NATS_TEST_URL)
+    await bus.connect()
+    origin = WorkflowWSManager()
+    await WorkflowEventFanout(
+        bus, instance_id="origin", subject_prefix=prefix, stream_name=stream
+    ).start(origin)
+    await origin.register_run(run_id, "deploy")
+    await origin.publish_event(_event(run_id, WorkflowEventType.WORKFLOW_STARTED))
+
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        _REMOTE_REPLICA,
+        _NATS_TEST_URL,
+        prefix,
+        stream,
+        run_id,
+        str(count),
+        stdout=subprocess.PIPE,
+    )
+    try:
+        assert proc.stdout is not None
+        ready = await asyncio.wait_for(proc.stdout.readline(), timeout=20)
+        assert ready.strip() == b"ready"
+        for _ in range(count):
+            await origin.publish_event(
+                _event(run_id, WorkflowEventType.HEARTBEAT, data={"sent_at": time.time()})
+            )
+            await asyncio.sleep(0.005)
+        latencies = json.loads(await asyncio.wait_for(proc.stdout.readline(), timeout=20))
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        await bus.close()
+
+    latencies.sort()
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1]
+    assert len(latencies) == count
+    assert p50 <= p99 < 1.0, f"cross-replica delivery p50={p50:.4f}s p99={p99:.4f}s"
@@ -9,15 +9,22 @@ Scenarios:
 All scenarios require a running AGENT-33 instance with auth configured.
 Set AUTH_TOKEN as an environment variable or pass --auth-token via Locust
 custom arguments.
+
+Pass --stub-llm-port to start the deterministic stub model server
+(``agent33.testing.stub_server``) alongside the run; start the engine with
+OLLAMA_BASE_URL pointing at it to measure engine latency without a model.
 """
 
 from __future__ import annotations
 
 import os
 import random
+import subprocess
+import sys
 import uuid
 
 from locust import HttpUser, between, events, tag, task
+from locust.runners import WorkerRunner
 
 # ---------------------------------------------------------------------------
 # Configuration helpers
@@ -46,9 +53,13 @@ INVOKE_PAYLOADS: list[dict[str, str]] = [
 ]
 
 
+# Stub model server started for this run (see start_stub_llm)
+_stub_llm: subprocess.Popen[bytes] | None = None
+
+
 @events.init_command_line_parser.add_listener
 def add_custom_arguments(parser):  # type: ignore[no-untyped-def]
-    """Register --auth-token custom argument for Locust CLI."""
+    """Register --auth-token and stub model server arguments for Locust CLI."""
     parser.add_argument(
         "--auth-token",
         type=str,
@@ -56,6 +67,58 @@ def add_custom_arguments(parser):  # type: ignore[no-untyped-def]
         env_var="AUTH_TOKEN",
         help="Bearer token for authenticated AGENT-33 endpoints",
     )
+    parser.add_argument(
+        "--stub-llm-port",
+        type=int,
+        default=0,
+        env_var="AGENT33_STUB_LLM_PORT",
+        help="Start the stub model server on this port (0 = do not start)",
+    )
+    parser.add_argument(
+        "--stub-llm-latency",
+        type=str,
+        default="0",
+        env_var="AGENT33_STUB_LLM_LATENCY",
+        help="Stub time to first token in ms, e.g. 50 or lognormal:200:0.5",
+    )
+    parser.add_argument(
+        "--stub-llm-tokens-per-second",
+        type=float,
+        default=0.0,
+        env_var="AGENT33_STUB_LLM_TOKENS_PER_SECOND",
+        help="Stub token rate after the first token (0 = instant)",
+    )
+
+
+@events.init.add_listener
+def start_stub_llm(environment, **kwargs):  # type: ignore[no-untyped-def]
+    """Start the stub model server once per run (never on distributed workers)."""
+    global _stub_llm  # noqa: PLW0603
+    parsed = getattr(environment, "parsed_options", None)
+    port = getattr(parsed, "stub_llm_port", 0) if parsed else 0
+    if not port or isinstance(environment.runner, WorkerRunner):
+        return
+    _stub_llm = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "agent33.testing.stub_server",
+            "--port",
+            str(port),
+            "--latency",
+            parsed.stub_llm_latency,
+            "--tokens-per-second",
+            str(parsed.stub_llm_tokens_per_second),
+        ]
+    )
+
+
+@events.quitting.add_listener
+def stop_stub_llm(environment, **kwargs):  # type: ignore[no-untyped-def]
+    """Stop the stub model server started by start_stub_llm."""
+    if _stub_llm is not None:
+        _stub_llm.terminate()
+        _stub_llm.wait(timeout=10)
 
 
 @events.test_start.add_listener
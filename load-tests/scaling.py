@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""Multi-replica scaling benchmark for AGENT-33.
+
+For each replica count in the scaling scenario this script:
+
+1. starts the stub model server (``agent33.testing.stub_server``) so model
+   latency is fixed and known;
+2. starts N engine processes sharing orchestration state, operator sessions
+   and the control plane through SQLite files under ``engine/var/scaling/``;
+3. seeds the scaling workflow and a small memory corpus;
+4. runs ``scaling_locustfile.py`` headless with ``users-per-replica * N`` users;
+5. stops everything and parses Locust's CSV stats.
+
+It then writes throughput/latency-vs-replica-count curves
+(``curves.csv``, ``results.json``, ``report.md``) and checks them against the
+budgets in the scenario and the recorded baseline. The exit code is 1 when a
+budget is exceeded.
+
+Usage:
+    cd load-tests
+    python scaling.py
+    python scaling.py --config scenarios/scaling.yaml --replicas 1,2,4
+    python scaling.py --update-baseline
+
+Environment:
+    DATABASE_URL, REDIS_URL, NATS_URL   Passed through to every replica
+                                        (default: the engine's own defaults)
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# ---------------------------------------------------------------------------
+# Paths and fixed inputs
+# ---------------------------------------------------------------------------
+
+LOAD_TESTS_DIR = Path(__file__).resolve().parent
+ENGINE_DIR = LOAD_TESTS_DIR.parent / "engine"
+DEFAULT_CONFIG = LOAD_TESTS_DIR / "scenarios" / "scaling.yaml"
+DEFAULT_BASELINE = LOAD_TESTS_DIR / "profiles" / "scaling-baseline.json"
+DEFAULT_RESULTS_DIR = LOAD_TESTS_DIR / "results"
+
+# Locust's name for the all-requests row of the stats CSV
+AGGREGATED = "Aggregated"
+
+JWT_SECRET = "agent33-scaling-benchmark-secret"
+TOKEN_SCOPES = [
+    "agents:read",
+    "agents:write",
+    "agents:invoke",
+    "workflows:read",
+    "workflows:execute",
+    "ingestion:read",
+    "ingestion:write",
+    "sessions:read",
+    "sessions:write",
+]
+
+SCALING_WORKFLOW: dict[str, Any] = {
+    "name": "scaling-probe",
+    "version": "1.0.0",
+    "description": "Scaling benchmark: a transform step feeding one agent invocation",
+    "inputs": {"topic": {"type": "string", "required": True}},
+    "steps": [
+        {
+            "id": "prepare",
+            "action": "transform",
+            "inputs": {"template": {"question": "{{ topic }}"}, "topic": "{{ inputs.topic }}"},
+        },
+        {
+            "id": "answer",
+            "action": "invoke-agent",
+            "agent": "qa",
+            "depends_on": ["prepare"],
+            "inputs": {"question": "{{ steps['prepare'].question }}"},
+        },
+    ],
+}
+
+MEMORY_CORPUS: list[str] = [
+    "Replicas share orchestration state through versioned records with compare-and-set.",
+    "The qa agent reviews code changes and reports defects with reproduction steps.",
+    "The scheduler leader holds a fenced lease; standbys take over within one lease.",
+    "Operator sessions live in shared storage with renewable ownership leases.",
+    "Webhook deliveries are retried with backoff and dead-lettered after the last attempt.",
+]
+
+
+# ---------------------------------------------------------------------------
+# Scenario configuration
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Budgets:
+    """Regression thresholds; a run that exceeds any of them fails."""
+
+    p99_regression_pct: float = 25.0
+    rps_regression_pct: float = 15.0
+    min_scaling_efficiency: float = 0.6
+    max_failure_rate: float = 0.01
+
+
+@dataclass
+class ScalingConfig:
+    """Parameters of one scaling run (``scenarios/scaling.yaml``)."""
+
+    replicas: list[int]
+    users_per_replica: int
+    spawn_rate_per_replica: float
+    run_time: str
+    stub_latency_ms: float = 50.0
+    base_port: int = 18100
+    startup_timeout_seconds: float = 180.0
+    budgets: Budgets = field(default_factory=Budgets)
+
+
+def load_config(path: Path) -> ScalingConfig:
+    """Read a scaling scenario YAML file."""
+    with open(path, encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+    return ScalingConfig(
+        replicas=sorted({int(n) for n in raw["replicas"]}),
+        users_per_replica=int(raw["users-per-replica"]),
+        spawn_rate_per_replica=float(raw["spawn-rate-per-replica"]),
+        run_time=str(raw["run-time"]),
+        stub_latency_ms=float(raw.get("stub-latency-ms", 50.0)),
+        base_port=int(raw.get("base-port", 18100)),
+        startup_timeout_seconds=float(raw.get("startup-timeout-seconds", 180.0)),
+        budgets=Budgets(**{k.replace("-", "_"): v for k, v in raw.get("budgets", {}).items()}),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Results, curves and budgets
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ScenarioResult:
+    """Locust stats of one request name at one replica count."""
+
+    name: str
+    replicas: int
+    requests: int
+    failures: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.requests if self.requests else 0.0
+
+
+def _number(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:  # "N/A" when a name saw no requests
+        return 0.0
+
+
+def parse_locust_stats(path: Path, replicas: int) -> list[ScenarioResult]:
+    """Parse a Locust ``<prefix>_stats.csv`` file."""
+    with open(path, encoding="utf-8", newline="") as f:
+        return [
+            ScenarioResult(
+                name=row["Name"],
+                replicas=replicas,
+                requests=int(row["Request Count"]),
+                failures=int(row["Failure Count"]),
+                rps=_number(row["Requests/s"]),
+                p50_ms=_number(row["50%"]),
+                p95_ms=_number(row["95%"]),
+                p99_ms=_number(row["99%"]),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def scaling_efficiency(results: list[ScenarioResult]) -> dict[tuple[str, int], float]:
+    """Return ``rps(N) / (N * rps(1))`` per request name and replica count.
+
+    1.0 is linear scaling. Names without a single-replica measurement are
+    left out.
+    """
+    single = {r.name: r.rps for r in results if r.replicas == 1 and r.rps > 0}
+    return {
+        (r.name, r.replicas): r.rps / (r.replicas * single[r.name])
+        for r in results
+        if r.name in single
+    }
+
+
+def baseline_from(results: list[ScenarioResult]) -> dict[str, dict[str, dict[str, float]]]:
+    """Build the baseline document: ``{name: {replicas: {rps, p99_ms}}}``."""
+    baseline: dict[str, dict[str, dict[str, float]]] = {}
+    for r in results:
+        baseline.setdefault(r.name, {})[str(r.replicas)] = {"rps": r.rps, "p99_ms": r.p99_ms}
+    return baseline
+
+
+def check_budgets(
+    results: list[ScenarioResult],
+    budgets: Budgets,
+    baseline: dict[str, dict[str, dict[str, float]]] | None = None,
+) -> list[str]:
+    """Return one message per exceeded budget (empty when the run passes).
+
+    Failure rates are checked for every request name, scaling efficiency for
+    the aggregated row, and p99/RPS regressions wherever the baseline has a
+    value for the same name and replica count.
+    """
+    violations: list[str] = []
+    for r in results:
+        where = f"{r.name} @ {r.replicas} replica(s)"
+        if r.failure_rate > budgets.max_failure_rate:
+            violations.append(
+                f"{where}: failure rate {r.failure_rate:.2%} exceeds "
+                f"{budgets.max_failure_rate:.2%}"
+            )
+        reference = (baseline or {}).get(r.name, {}).get(str(r.replicas))
+        if not reference:
+            continue
+        p99_limit = reference["p99_ms"] * (1 + budgets.p99_regression_pct / 100)
+        if reference["p99_ms"] > 0 and r.p99_ms > p99_limit:
+            violations.append(
+                f"{where}: p99 {r.p99_ms:.0f} ms exceeds baseline "
+                f"{reference['p99_ms']:.0f} ms + {budgets.p99_regression_pct:g}%"
+            )
+        rps_floor = reference["rps"] * (1 - budgets.rps_regression_pct / 100)
+        if r.rps < rps_floor:
+            violations.append(
+                f"{where}: {r.rps:.1f} req/s is below baseline "
+                f"{reference['rps']:.1f} req/s - {budgets.rps_regression_pct:g}%"
+            )
+    for (name, replicas), efficiency in sorted(scaling_efficiency(results).items()):
+        if name == AGGREGATED and replicas > 1 and efficiency < budgets.min_scaling_efficiency:
+            violations.append(
+                f"{name} @ {replicas} replica(s): scaling efficiency {efficiency:.2f} "
+                f"is below {budgets.min_scaling_efficiency:.2f}"
+            )
+    return violations
+
+
+def write_report(
+    results: list[ScenarioResult],
+    violations: list[str],
+    out_dir: Path,
+) -> Path:
+    """Write ``curves.csv``, ``results.json`` and ``report.md``; return the report path."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    efficiency = scaling_efficiency(results)
+    ordered = sorted(results, key=lambda r: (r.name != AGGREGATED, r.name, r.replicas))
+
+    with open(out_dir / "curves.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "name",
+                "replicas",
+                "requests",
+                "failures",
+                "rps",
+                "p50_ms",
+                "p95_ms",
+                "p99_ms",
+                "efficiency",
+            ]
+        )
+        for r in ordered:
+            eff = efficiency.get((r.name, r.replicas))
+            writer.writerow(
+                [
+                    r.name,
+                    r.replicas,
+                    r.requests,
+                    r.failures,
+                    f"{r.rps:.2f}",
+                    f"{r.p50_ms:.0f}",
+                    f"{r.p95_ms:.0f}",
+                    f"{r.p99_ms:.0f}",
+                    "" if eff is None else f"{eff:.2f}",
+                ]
+            )
+
+    (out_dir / "results.json").write_text(
+        json.dumps({"results": [asdict(r) for r in ordered], "violations": violations}, indent=2),
+        encoding="utf-8",
+    )
+
+    lines = ["# AGENT-33 Scaling Run", ""]
+    current = None
+    for r in ordered:
+        if r.name != current:
+            current = r.name
+            lines += [
+                "",
+                f"## {r.name}",
+                "",
+                "| Replicas | Req/s | p50 ms | p95 ms | p99 ms | Failures | Efficiency |",
+                "| --- | --- | --- | --- | --- | --- | --- |",
+            ]
+        eff = efficiency.get((r.name, r.replicas))
+        lines.append(
+            f"| {r.replicas} | {r.rps:.1f} | {r.p50_ms:.0f} | {r.p95_ms:.0f} | "
+            f"{r.p99_ms:.0f} | {r.failure_rate:.2%} | {'-' if eff is None else f'{eff:.2f}'} |"
+        )
+    lines += ["", "## Budget check", ""]
+    lines += [f"- FAIL: {v}" for v in violations] or ["- PASS: all budgets met"]
+    report = out_dir / "report.md"
+    report.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Process management
+# ---------------------------------------------------------------------------
+
+
+def mint_token() -> str:
+    """Return a JWT the replicas accept (they share JWT_SECRET)."""
+    import jwt
+
+    now = int(time.time())
+    claims = {"sub": "scaling-benchmark", "scopes": TOKEN_SCOPES, "iat": now, "exp": now + 86400}
+    return jwt.encode(claims, JWT_SECRET, algorithm="HS256")
+
+
+def replica_env(state_dir: str, stub_url: str) -> dict[str, str]:
+    """Environment shared by every replica of one run.
+
+    *state_dir* is relative to ``engine/`` (runtime state must stay under an
+    approved root such as ``engine/var``).
+    """
+    return {
+        **os.environ,
+        "JWT_SECRET": JWT_SECRET,
+        "OLLAMA_BASE_URL": stub_url,
+        "RATE_LIMIT_ENABLED": "false",
+        "ORCHESTRATION_STATE_BACKEND": "sqlite",
+        "ORCHESTRATION_STATE_DB_PATH": f"{state_dir}/orchestration_state.db",
+        "ORCHESTRATION_STATE_POLL_INTERVAL_SECONDS": "0.2",
+        "OPERATOR_SESSION_BACKEND": "sqlite",
+        "OPERATOR_SESSION_DB_PATH": f"{state_dir}/operator_sessions.db",
+        "CONTROL_PLANE_BACKEND": "sqlite",
+        "CONTROL_PLANE_DB_PATH": f"{state_dir}/control_plane.db",
+        "INGESTION_MAILBOX_DB_PATH": f"{state_dir}/ingestion_mailbox.db",
+        "WORKFLOW_RUN_ARCHIVE_DIR": f"{state_dir}/workflow-runs",
+    }
+
+
+def seed_workflow(db_path: Path) -> None:
+    """Register the scaling workflow in the replicas' shared orchestration state."""
+    from agent33.services.orchestration_state import OrchestrationStateStore
+    from agent33.services.pg_orchestration_state import create_state_backend
+    from agent33.workflows.state import WorkflowStateService
+
+    backend = create_state_backend("sqlite", db_path=str(db_path))
+    try:
+        WorkflowStateService(OrchestrationStateStore(backend=backend)).register_workflow(
+            SCALING_WORKFLOW
+        )
+    finally:
+        backend.close()
+
+
+def _request(url: str, *, token: str = "", body: Any = None, timeout: float = 10.0) -> int:
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method="POST" if data else "GET")  # noqa: S310
+    request.add_header("Content-Type", "application/json")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+            return int(response.status)
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+def seed_memory(host: str, token: str) -> int:
+    """Ingest the memory corpus through one replica; return how many documents stored."""
+    stored = 0
+    for document in MEMORY_CORPUS:
+        body = {"content": document, "metadata": {"source": "scaling-benchmark"}}
+        with contextlib.suppress(OSError):
+            stored += _request(f"{host}/v1/memory/ingest", token=token, body=body) == 201
+    return stored
+
+
+def wait_healthy(host: str, timeout: float) -> None:
+    """Poll ``/healthz`` until it answers 200 or *timeout* elapses."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError):
+            if _request(f"{host}/healthz", timeout=2.0) == 200:
+                return
+        time.sleep(0.5)
+    raise TimeoutError(f"{host} did not become healthy within {timeout:.0f}s")
+
+
+class Cluster:
+    """The stub model server plus N engine replicas on consecutive ports."""
+
+    def __init__(self, config: ScalingConfig, replicas: int, state_dir: str) -> None:
+        self._config = config
+        self._replicas = replicas
+        self._state_dir = state_dir
+        self._log_dir = ENGINE_DIR / state_dir
+        self._processes: list[subprocess.Popen[bytes]] = []
+        self.stub_url = f"http://127.0.0.1:{config.base_port - 1}"
+        self.hosts = [f"http://127.0.0.1:{config.base_port + i}" for i in range(replicas)]
+
+    def _spawn(self, name: str, args: list[str], env: dict[str, str]) -> None:
+        log = open(self._log_dir / f"{name}.log", "wb")  # noqa: SIM115 -- owned by the child
+        self._processes.append(
+            subprocess.Popen(  # noqa: S603
+                [sys.executable, "-m", *args],
+                cwd=ENGINE_DIR,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        )
+
+    def __enter__(self) -> Cluster:
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        env = replica_env(self._state_dir, self.stub_url)
+        self._spawn(
+            "stub",
+            [
+                "agent33.testing.stub_server",
+                "--port",
+                str(self._config.base_port - 1),
+                "--latency",
+                f"fixed:{self._config.stub_latency_ms}",
+            ],
+            env,
+        )
+        seed_workflow(self._log_dir / "orchestration_state.db")
+        for index, host in enumerate(self.hosts):
+            port = host.rsplit(":", 1)[1]
+            self._spawn(
+                f"replica-{index}",
+                [
+                    "uvicorn",
+                    "agent33.main:app",
+                    "--host",
+                    "127.0.0.1",
+                    "--port",
+                    port,
+                    "--log-level",
+                    "warning",
+                ],
+                env,
+            )
+        for host in self.hosts:
+            wait_healthy(host, self._config.startup_timeout_seconds)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes.clear()
+
+
+def run_locust(
+    hosts: list[str],
+    token: str,
+    *,
+    users: int,
+    spawn_rate: float,
+    run_time: str,
+    csv_prefix: Path,
+) -> Path:
+    """Run ``scaling_locustfile.py`` headless; return the stats CSV path."""
+    subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "locust",
+            "-f",
+            str(LOAD_TESTS_DIR / "scaling_locustfile.py"),
+            "--headless",
+            "--host",
+            hosts[0],
+            "--users",
+            str(users),
+            "--spawn-rate",
+            str(spawn_rate),
+            "--run-time",
+            run_time,
+            "--csv",
+            str(csv_prefix),
+            "--only-summary",
+            "--exit-code-on-error",
+            "0",
+        ],
+        env={
+            **os.environ,
+            "AUTH_TOKEN": token,
+            "AGENT33_SCALING_HOSTS": ",".join(hosts),
+            "AGENT33_SCALING_WORKFLOW": SCALING_WORKFLOW["name"],
+        },
+        check=True,
+    )
+    return csv_prefix.with_name(f"{csv_prefix.name}_stats.csv")
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="AGENT-33 multi-replica scaling benchmark",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG)
+    parser.add_argument(
+        "--replicas",
+        default="",
+        help="Comma-separated replica counts (overrides the scenario file)",
+    )
+    parser.add_argument("--run-time", default="", help="Per replica count, e.g. 30s")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Record this run as the new baseline instead of comparing against it",
+    )
+    parser.add_argument("--results-dir", type=Path, default=DEFAULT_RESULTS_DIR)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the scaling benchmark and return the process exit code."""
+    args = parse_args(argv)
+    config = load_config(args.config)
+    if args.replicas:
+        config.replicas = sorted({int(n) for n in args.replicas.split(",")})
+    if args.run_time:
+        config.run_time = args.run_time
+
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+    out_dir = args.results_dir / f"scaling-{stamp}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    token = mint_token()
+
+    results: list[ScenarioResult] = []
+    for replicas in config.replicas:
+        print(f"== {replicas} replica(s): {config.users_per_replica * replicas} users")
+        with Cluster(config, replicas, f"var/scaling/{stamp}/n{replicas}") as cluster:
+            stored = seed_memory(cluster.hosts[0], token)
+            if stored < len(MEMORY_CORPUS):
+                print(f"   memory corpus: {stored}/{len(MEMORY_CORPUS)} documents stored")
+            stats = run_locust(
+                cluster.hosts,
+                token,
+                users=config.users_per_replica * replicas,
+                spawn_rate=config.spawn_rate_per_replica * replicas,
+                run_time=config.run_time,
+                csv_prefix=out_dir / f"n{replicas}",
+            )
+        results.extend(parse_locust_stats(stats, replicas))
+
+    baseline = None
+    if not args.update_baseline and args.baseline.is_file():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    violations = check_budgets(results, config.budgets, baseline)
+    report = write_report(results, violations, out_dir)
+    print(report.read_text(encoding="utf-8"))
+
+    if args.update_baseline:
+        args.baseline.write_text(
+            json.dumps(baseline_from(results), indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Baseline written to {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline}; only failure-rate and efficiency budgets apply.")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""AGENT-33 multi-replica scaling scenarios using Locust.
+
+Driven by ``scaling.py``, which starts N engine replicas against a stub model
+server and runs this file once per replica count. Every simulated user is
+pinned to one replica (round-robin over AGENT33_SCALING_HOSTS), the way a
+keep-alive connection through a load balancer would be.
+
+Scenarios:
+  1. WorkflowExecutionUser  -- POST /v1/workflows/{name}/execute (transform + agent step)
+  2. MemorySearchUser       -- POST /v1/memory/search (embedding + pgvector recall)
+  3. StreamingUser          -- WebSocket /v1/stream/agent/{id} until the "done" event
+  4. WebhookIngestionUser   -- POST /v1/ingestion/mailbox, draining the inbox periodically
+
+Users have little think time, so throughput reflects what the replicas can
+serve rather than how fast users click.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+import time
+import uuid
+
+from locust import HttpUser, between, events, tag, task
+
+# ---------------------------------------------------------------------------
+# Configuration helpers
+# ---------------------------------------------------------------------------
+
+_AUTH_TOKEN: str = os.environ.get("AUTH_TOKEN", "")
+
+# Replica base URLs, comma-separated (set by scaling.py)
+REPLICA_HOSTS: list[str] = [
+    host.strip().rstrip("/")
+    for host in os.environ.get("AGENT33_SCALING_HOSTS", "").split(",")
+    if host.strip()
+]
+
+# Workflow seeded into the shared orchestration state by scaling.py
+SCALING_WORKFLOW: str = os.environ.get("AGENT33_SCALING_WORKFLOW", "scaling-probe")
+
+STREAM_AGENT: str = os.environ.get("AGENT33_SCALING_STREAM_AGENT", "qa")
+
+SEARCH_QUERIES: list[str] = [
+    "How are replicas kept consistent?",
+    "Which agent handles code review?",
+    "What does the scheduler lease protect?",
+    "Where are operator sessions stored?",
+    "How are webhook deliveries retried?",
+]
+
+DRAIN_EVERY: int = 50
+
+_replica_counter = itertools.count()
+
+
+@events.init_command_line_parser.add_listener
+def add_custom_arguments(parser):  # type: ignore[no-untyped-def]
+    """Register --auth-token custom argument for Locust CLI."""
+    parser.add_argument(
+        "--auth-token",
+        type=str,
+        default="",
+        env_var="AUTH_TOKEN",
+        help="Bearer token for authenticated AGENT-33 endpoints",
+    )
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):  # type: ignore[no-untyped-def]
+    """Capture the auth token from parsed arguments at test start."""
+    global _AUTH_TOKEN  # noqa: PLW0603
+    parsed = getattr(environment, "parsed_options", None)
+    if parsed and getattr(parsed, "auth_token", ""):
+        _AUTH_TOKEN = parsed.auth_token
+
+
+def _auth_headers() -> dict[str, str]:
+    """Return Authorization header dict if a token is configured."""
+    if _AUTH_TOKEN:
+        return {"Authorization": f"Bearer {_AUTH_TOKEN}"}
+    return {}
+
+
+class ReplicaUser(HttpUser):
+    """Base user pinned to one replica for its whole life."""
+
+    abstract = True
+    host = REPLICA_HOSTS[0] if REPLICA_HOSTS else "http://localhost:8000"
+
+    def on_start(self) -> None:
+        if REPLICA_HOSTS:
+            self.client.base_url = REPLICA_HOSTS[next(_replica_counter) % len(REPLICA_HOSTS)]
+
+
+# ---------------------------------------------------------------------------
+# Scenario 1: Workflow execution
+# ---------------------------------------------------------------------------
+
+
+class WorkflowExecutionUser(ReplicaUser):
+    """Executes the seeded workflow: a transform step feeding an agent step.
+
+    Exercises the workflow executor, the shared orchestration state, the run
+    archive and one model call per run.
+    """
+
+    weight = 3
+    wait_time = between(0.05, 0.2)
+
+    @tag("workflow")
+    @task
+    def execute_workflow(self) -> None:
+        """Run the scaling workflow once."""
+        with self.client.post(
+            f"/v1/workflows/{SCALING_WORKFLOW}/execute",
+            json={"inputs": {"topic": random.choice(SEARCH_QUERIES)}},  # noqa: S311
+            headers=_auth_headers(),
+            catch_response=True,
+            name="/v1/workflows/[name]/execute",
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"Workflow execute returned {response.status_code}")
+            elif response.json().get("status") != "success":
+                response.failure(f"Workflow run ended with {response.json().get('status')}")
+
+
+# ---------------------------------------------------------------------------
+# Scenario 2: Memory search
+# ---------------------------------------------------------------------------
+
+
+class MemorySearchUser(ReplicaUser):
+    """Searches long-term memory (query embedding, vector + BM25 recall)."""
+
+    weight = 3
+    wait_time = between(0.05, 0.2)
+
+    @tag("memory")
+    @task
+    def search_memory(self) -> None:
+        """Search memory at the index level."""
+        with self.client.post(
+            "/v1/memory/search",
+            json={
+                "query": random.choice(SEARCH_QUERIES),  # noqa: S311
+                "level": "index",
+                "top_k": 5,
+            },
+            headers=_auth_headers(),
+            catch_response=True,
+            name="/v1/memory/search",
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"Memory search returned {response.status_code}")
+            elif "results" not in response.json():
+                response.failure("Memory search response missing 'results'")
+
+
+# ---------------------------------------------------------------------------
+# Scenario 3: WebSocket streaming
+# ---------------------------------------------------------------------------
+
+
+class StreamingUser(ReplicaUser):
+    """Streams one agent invocation per connection and times it to ``done``.
+
+    Locust has no WebSocket client, so the timing is reported through the
+    request event with request type ``WS``.
+    """
+
+    weight = 1
+    wait_time = between(0.1, 0.3)
+
+    @tag("streaming")
+    @task
+    def stream_agent(self) -> None:
+        """Connect, send one input, read events until ``done``."""
+        from websockets.sync.client import connect
+
+        url = self.client.base_url.replace("http", "ws", 1)
+        name = "/v1/stream/agent/[id]"
+        start = time.perf_counter()
+        received = 0
+        exception: Exception | None = None
+        try:
+            with connect(
+                f"{url}/v1/stream/agent/{STREAM_AGENT}",
+                additional_headers=_auth_headers(),
+                open_timeout=10,
+            ) as ws:
+                ws.send(json.dumps({"input": random.choice(SEARCH_QUERIES), "context": {}}))  # noqa: S311
+                while True:
+                    event = json.loads(ws.recv(timeout=60))
+                    received += 1
+                    if event.get("event") == "error":
+                        raise RuntimeError(f"stream error: {event.get('data')}")
+                    if event.get("event") == "done":
+                        break
+        except Exception as exc:
+            exception = exc
+        self.environment.events.request.fire(
+            request_type="WS",
+            name=name,
+            response_time=(time.perf_counter() - start) * 1000,
+            response_length=received,
+            exception=exception,
+            context={},
+        )
+
+
+# ---------------------------------------------------------------------------
+# Scenario 4: Webhook ingestion
+# ---------------------------------------------------------------------------
+
+
+class WebhookIngestionUser(ReplicaUser):
+    """Posts external events into the ingestion mailbox, as a webhook relay would."""
+
+    weight = 2
+    wait_time = between(0.02, 0.1)
+
+    def on_start(self) -> None:
+        super().on_start()
+        self.posted = 0
+
+    @tag("webhook")
+    @task
+    def post_event(self) -> None:
+        """Deposit one event; drain the tenant inbox every DRAIN_EVERY posts."""
+        with self.client.post(
+            "/v1/ingestion/mailbox",
+            json={
+                "event_type": "webhook.received",
+                "sender": "scaling-load-test",
+                "payload": {"delivery_id": uuid.uuid4().hex, "body": {"ok": True}},
+            },
+            headers=_auth_headers(),
+            catch_response=True,
+            name="/v1/ingestion/mailbox",
+        ) as response:
+            if response.status_code != 202:
+                response.failure(f"Mailbox post returned {response.status_code}")
+        self.posted += 1
+        if self.posted % DRAIN_EVERY == 0:
+            self.client.get(
+                "/v1/ingestion/mailbox/drain",
+                headers=_auth_headers(),
+                name="/v1/ingestion/mailbox/drain",
+            )